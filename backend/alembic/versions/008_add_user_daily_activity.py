@@ -0,0 +1,36 @@
+"""add user daily activity rollup
+
+Revision ID: 008_add_user_daily_activity
+Revises: 007_add_title_column
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_user_daily_activity'
+down_revision = '007_add_title_column'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per (user, day, hour, story type, language); the primary key is
+    # also the index for the per-user read. Fill with scripts/backfill_reading_activity.py
+    op.create_table(
+        'user_daily_activity',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user_profiles.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('hour', sa.SmallInteger(), nullable=False),
+        sa.Column('story_type', sa.String(length=50), nullable=False),
+        sa.Column('language', sa.String(length=10), nullable=False),
+        sa.Column('story_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'hour', 'story_type', 'language'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_daily_activity')
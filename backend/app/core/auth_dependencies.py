@@ -1,11 +1,12 @@
-import httpx
 from fastapi import Header, HTTPException, Depends
 from typing import Optional, Dict
-from app.core.config import settings
+from app.core.exceptions import AuthenticationError, ExternalServiceError
+from app.core.supabase_jwt import token_verifier
 
 async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict:
     """
-    Verifies the JWT token by calling Supabase Auth API.
+    Verifies the Supabase JWT locally (signature, expiry, revocation) and
+    returns the user; see app.core.supabase_jwt.
     Usage:
         @router.get("/me")
         async def me(user: dict = Depends(get_current_user)):
@@ -16,28 +17,12 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict:
 
     token = authorization.split(" ", 1)[1]
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.SUPABASE_URL}/auth/v1/user",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "apikey": settings.SUPABASE_ANON_KEY,
-                },
-                timeout=10.0,
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid token")
-            
-            user_data = response.json()
-            # Backward compatibility for existing code
-            user_data["user_id"] = user_data.get("id")
-            user_data["role"] = user_data.get("app_metadata", {}).get("role", "user")
-            
-            return user_data
-        except httpx.RequestError:
-            raise HTTPException(status_code=503, detail="Authentication service unavailable")
+    try:
+        return await token_verifier.verify(token)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=401, detail=e.message)
+    except ExternalServiceError:
+        raise HTTPException(status_code=503, detail="Authentication service unavailable")
 
 async def get_current_active_user(
     current_user: dict = Depends(get_current_user)
@@ -0,0 +1,523 @@
+"""
+Collaborative Documents
+
+In-memory operational-transform engine for realtime story editing sessions:
+
+- Text operations are ot.js-style component lists: a positive int retains,
+  a negative int deletes, a string inserts. ``transform`` makes concurrent
+  operations converge; on equal insert positions the op applied first wins
+- One ``CollabDocument`` per session holds the current text and version.
+  Clients send ops against the version they last saw; the server transforms
+  them over the ops applied since, so editors never block each other
+- A version vector (last sequence number per client) makes resends idempotent
+- Persistence is a snapshot file plus an append-only JSONL op log per
+  session. Ops are appended in batches every ``COLLAB_FLUSH_MS``; after
+  ``COLLAB_COMPACT_OPS`` ops the oldest are folded into a new snapshot,
+  keeping the last ``COLLAB_HISTORY_OPS`` ops as the replay/transform window
+- Late joiners get the snapshot plus the op tail, or only the ops after the
+  version they already have
+
+Documents live in the worker that serves the session (Socket.IO already
+needs sticky sessions); op broadcasts reach clients on other workers through
+the Redis client manager.
+"""
+import atexit
+import collections
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+Component = Union[int, str]
+Operation = List[Component]
+
+
+class CollabResyncRequired(ValueError):
+    """The client's base version is outside the transform window."""
+
+
+# ---------------------------------------------------------------------- #
+# Text operations
+# ---------------------------------------------------------------------- #
+
+def _push(op: Operation, component: Component):
+    """Appends a component, merging it with the previous one of the same kind."""
+    if component == 0 or component == "":
+        return
+    if op:
+        last = op[-1]
+        if isinstance(component, str) and isinstance(last, str):
+            op[-1] = last + component
+            return
+        if isinstance(component, int) and isinstance(last, int) and (component > 0) == (last > 0):
+            op[-1] = last + component
+            return
+    op.append(component)
+
+
+def normalize(op: Any) -> Operation:
+    """Validates a client-supplied operation and merges adjacent components."""
+    if not isinstance(op, list):
+        raise ValueError("Operation must be a list")
+    result: Operation = []
+    for component in op:
+        if isinstance(component, bool) or not isinstance(component, (int, str)):
+            raise ValueError(f"Invalid operation component: {component!r}")
+        _push(result, component)
+    return result
+
+
+def base_length(op: Operation) -> int:
+    return sum(abs(c) for c in op if isinstance(c, int))
+
+
+def apply(text: str, op: Operation) -> str:
+    """Applies ``op`` to ``text``; the op must span the whole text."""
+    if base_length(op) != len(text):
+        raise ValueError(f"Operation base length {base_length(op)} != document length {len(text)}")
+    parts: List[str] = []
+    cursor = 0
+    for component in op:
+        if isinstance(component, str):
+            parts.append(component)
+        elif component > 0:
+            parts.append(text[cursor:cursor + component])
+            cursor += component
+        else:
+            cursor -= component
+    return "".join(parts)
+
+
+def transform(a: Operation, b: Operation) -> Tuple[Operation, Operation]:
+    """
+    Transforms concurrent ops ``a`` and ``b`` (same base) into ``(a', b')``
+    with ``apply(apply(s, a), b') == apply(apply(s, b), a')``. ``a``'s
+    inserts go first when both insert at the same position.
+    """
+    if base_length(a) != base_length(b):
+        raise ValueError("Concurrent operations must have the same base length")
+    a_prime: Operation = []
+    b_prime: Operation = []
+    ia, ib = iter(a), iter(b)
+    op1, op2 = next(ia, None), next(ib, None)
+    while op1 is not None or op2 is not None:
+        if isinstance(op1, str):
+            _push(a_prime, op1)
+            _push(b_prime, len(op1))
+            op1 = next(ia, None)
+            continue
+        if isinstance(op2, str):
+            _push(a_prime, len(op2))
+            _push(b_prime, op2)
+            op2 = next(ib, None)
+            continue
+        if op1 is None or op2 is None:
+            raise ValueError("Operations do not span the same text")
+
+        if op1 > 0 and op2 > 0:
+            size = min(op1, op2)
+            _push(a_prime, size)
+            _push(b_prime, size)
+        elif op1 < 0 and op2 < 0:
+            # Both deleted the same range
+            size = min(-op1, -op2)
+        elif op1 < 0:
+            size = min(-op1, op2)
+            _push(a_prime, -size)
+        else:
+            size = min(op1, -op2)
+            _push(b_prime, -size)
+
+        op1 = op1 - size if op1 > 0 else op1 + size
+        op2 = op2 - size if op2 > 0 else op2 + size
+        if op1 == 0:
+            op1 = next(ia, None)
+        if op2 == 0:
+            op2 = next(ib, None)
+    return a_prime, b_prime
+
+
+def operation_from_change(change_type: str, data: Dict[str, Any], length: int) -> Operation:
+    """
+    Builds an operation for a document of ``length`` characters from the
+    simple change forms (``insert``, ``delete``, ``update``/``replace``,
+    ``format``) or an explicit ``operation`` list.
+    """
+    if data.get("operation") is not None:
+        return normalize(data["operation"])
+
+    position = int(data.get("position", 0))
+    if change_type == "format":
+        return normalize([length])
+    if change_type == "insert":
+        text = str(data.get("text", ""))
+        delete = 0
+    elif change_type == "delete":
+        text = ""
+        delete = int(data.get("length", 0))
+    elif change_type in ("update", "replace"):
+        text = str(data.get("text", ""))
+        delete = int(data.get("length", 0))
+    else:
+        raise ValueError(f"Unknown change type: {change_type}")
+
+    if position < 0 or delete < 0 or position + delete > length:
+        raise ValueError("Change is outside the document")
+    return normalize([position, text, -delete, length - position - delete])
+
+
+# ---------------------------------------------------------------------- #
+# Documents
+# ---------------------------------------------------------------------- #
+
+class CollabDocument:
+    """Text, version, op tail and version vector of one editing session."""
+
+    def __init__(
+        self,
+        session_id: str,
+        storage_dir: str,
+        text: str = "",
+        compact_ops: Optional[int] = None,
+        history_ops: Optional[int] = None,
+    ):
+        if not _SESSION_ID_RE.match(session_id or ""):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        self.session_id = session_id
+        self.snapshot_path = os.path.join(storage_dir, f"{session_id}.json")
+        self.log_path = os.path.join(storage_dir, f"{session_id}.log")
+        self.compact_ops = compact_ops if compact_ops is not None else settings.COLLAB_COMPACT_OPS
+        self.history_ops = history_ops if history_ops is not None else settings.COLLAB_HISTORY_OPS
+
+        self.text = text
+        self.version = 0
+        self.snapshot_text = text
+        self.snapshot_version = 0
+        self.ops: List[Dict[str, Any]] = []   # entries after snapshot_version
+        self.vector: Dict[str, int] = {}
+        self.last_activity = time.time()
+
+        self._lock = threading.RLock()
+        self._unflushed: List[Dict[str, Any]] = []
+        self._needs_snapshot = True
+
+    # ------------------------------------------------------------------ #
+    # Editing
+    # ------------------------------------------------------------------ #
+
+    def submit(
+        self,
+        user_id: str,
+        operation: Operation,
+        base_version: Optional[int] = None,
+        client_seq: Optional[int] = None,
+        client_id: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Transforms ``operation`` from ``base_version`` to the current version
+        and applies it. ``client_seq`` numbers the ops of one client
+        (``client_id``, default the user) so resends are applied once.
+
+        Returns:
+            (op log entry, whether it was a duplicate resend)
+        """
+        client_id = client_id or user_id
+        with self._lock:
+            if client_seq is not None and client_seq <= self.vector.get(client_id, 0):
+                for entry in reversed(self.ops):
+                    if entry["client_id"] == client_id and entry.get("client_seq") == client_seq:
+                        return entry, True
+                return {"client_id": client_id, "client_seq": client_seq, "version": self.version}, True
+
+            base = self.version if base_version is None else int(base_version)
+            if base > self.version or base < self.snapshot_version:
+                raise CollabResyncRequired(
+                    f"Version {base} is outside {self.snapshot_version}..{self.version}"
+                )
+            for entry in self.ops[base - self.snapshot_version:]:
+                _, operation = transform(entry["operation"], operation)
+
+            self.text = apply(self.text, operation)
+            self.version += 1
+            entry = {
+                **(meta or {}),
+                "change_id": str(uuid.uuid4()),
+                "session_id": self.session_id,
+                "user_id": user_id,
+                "client_id": client_id,
+                "client_seq": client_seq,
+                "base_version": base,
+                "version": self.version,
+                "operation": operation,
+                "length": len(self.text),
+                "timestamp": time.time(),
+            }
+            self.ops.append(entry)
+            self._unflushed.append(entry)
+            if client_seq is not None:
+                self.vector[client_id] = client_seq
+            self.last_activity = time.time()
+            if len(self.ops) >= self.compact_ops:
+                self._compact()
+            return entry, False
+
+    def length_at(self, version: int) -> int:
+        """Text length at ``version``; the current length outside the op window."""
+        with self._lock:
+            if version <= self.snapshot_version or version > self.version:
+                return len(self.snapshot_text) if version == self.snapshot_version else len(self.text)
+            return self.ops[version - self.snapshot_version - 1]["length"]
+
+    def _compact(self):
+        """Folds all but the newest ``history_ops`` ops into the snapshot."""
+        fold = len(self.ops) - min(self.history_ops, len(self.ops))
+        if fold <= 0:
+            return
+        text = self.snapshot_text
+        for entry in self.ops[:fold]:
+            text = apply(text, entry["operation"])
+        self.snapshot_text = text
+        self.snapshot_version += fold
+        self.ops = self.ops[fold:]
+        self._needs_snapshot = True
+
+    def state(self, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Catch-up payload. With ``since`` inside the op window only the ops
+        after it are returned; otherwise the snapshot plus the whole tail.
+        """
+        with self._lock:
+            state: Dict[str, Any] = {
+                "session_id": self.session_id,
+                "version": self.version,
+                "vector": dict(self.vector),
+            }
+            if since is not None and self.snapshot_version <= since <= self.version:
+                state["since"] = since
+                state["ops"] = self.ops[since - self.snapshot_version:]
+            else:
+                state["snapshot"] = {"text": self.snapshot_text, "version": self.snapshot_version}
+                state["ops"] = list(self.ops)
+            return state
+
+    def recent_ops(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest ``limit`` op log entries."""
+        with self._lock:
+            return self.ops[-limit:] if limit > 0 else []
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    @property
+    def dirty(self) -> bool:
+        return self._needs_snapshot or bool(self._unflushed)
+
+    def flush(self):
+        """Appends pending ops to the log, or rewrites snapshot + log after compaction."""
+        with self._lock:
+            if self._needs_snapshot:
+                snapshot = {
+                    "session_id": self.session_id,
+                    "text": self.snapshot_text,
+                    "version": self.snapshot_version,
+                    "vector": self.vector,
+                }
+                tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.snapshot_path)
+                self._write_log(self.ops, mode="w")
+                self._needs_snapshot = False
+            elif self._unflushed:
+                self._write_log(self._unflushed, mode="a")
+            self._unflushed = []
+
+    def _write_log(self, entries: List[Dict[str, Any]], mode: str):
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with open(self.log_path, mode, encoding="utf-8") as f:
+            f.write(data)
+
+    @staticmethod
+    def read_log_tail(log_path: str, limit: int) -> List[Dict[str, Any]]:
+        """The last ``limit`` entries of a persisted op log, without loading the document."""
+        if limit <= 0:
+            return []
+        try:
+            with open(log_path, "r", encoding="utf-8") as f:
+                lines = collections.deque(f, maxlen=limit)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+    @classmethod
+    def load(cls, session_id: str, storage_dir: str, **kwargs) -> Optional["CollabDocument"]:
+        """Rebuilds a document from its snapshot and op log."""
+        doc = cls(session_id, storage_dir, **kwargs)
+        try:
+            with open(doc.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        doc.text = doc.snapshot_text = snapshot.get("text", "")
+        doc.version = doc.snapshot_version = int(snapshot.get("version", 0))
+        doc.vector = dict(snapshot.get("vector") or {})
+        try:
+            with open(doc.log_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final line from a crash mid-append
+                continue
+            if entry.get("version") != doc.version + 1:
+                continue
+            doc.text = apply(doc.text, entry["operation"])
+            doc.version += 1
+            doc.ops.append(entry)
+            client_id = entry.get("client_id")
+            if client_id and entry.get("client_seq") is not None:
+                doc.vector[client_id] = max(doc.vector.get(client_id, 0), entry["client_seq"])
+        doc._needs_snapshot = False
+        return doc
+
+
+class CollabHub:
+    """Live collaborative documents of this worker, with batched persistence."""
+
+    def __init__(
+        self,
+        storage_dir: str,
+        flush_interval: Optional[float] = None,
+        compact_ops: Optional[int] = None,
+        history_ops: Optional[int] = None,
+    ):
+        self.storage_dir = storage_dir
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.COLLAB_FLUSH_MS / 1000
+        )
+        self._doc_options = {"compact_ops": compact_ops, "history_ops": history_ops}
+        self._docs: Dict[str, CollabDocument] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        os.makedirs(storage_dir, exist_ok=True)
+
+    def get(self, session_id: str) -> Optional[CollabDocument]:
+        """Returns the live document, loading it from disk if needed."""
+        with self._lock:
+            doc = self._docs.get(session_id)
+            if doc is None:
+                doc = CollabDocument.load(session_id, self.storage_dir, **self._doc_options)
+                if doc is not None:
+                    self._docs[session_id] = doc
+            return doc
+
+    def recent_ops(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        The newest ``limit`` ops of a session. Live documents are read under
+        their lock; others come from the persisted op log and stay unloaded.
+        """
+        with self._lock:
+            doc = self._docs.get(session_id)
+        if doc is not None:
+            return doc.recent_ops(limit)
+        if not _SESSION_ID_RE.match(session_id or ""):
+            return []
+        return CollabDocument.read_log_tail(os.path.join(self.storage_dir, f"{session_id}.log"), limit)
+
+    def open(self, session_id: str, text: str = "") -> CollabDocument:
+        """Returns the session's document, creating it from ``text`` if it has none."""
+        doc = self.get(session_id)
+        if doc is not None:
+            return doc
+        with self._lock:
+            doc = self._docs.get(session_id)
+            if doc is None:
+                doc = CollabDocument(session_id, self.storage_dir, text, **self._doc_options)
+                self._docs[session_id] = doc
+        self._schedule_flush()
+        return doc
+
+    def submit(self, session_id: str, user_id: str, operation: Operation, **kwargs) -> Tuple[Dict[str, Any], bool]:
+        doc = self.get(session_id)
+        if doc is None:
+            raise ValueError(f"No collaboration document for session {session_id}")
+        entry, duplicate = doc.submit(user_id, operation, **kwargs)
+        if not duplicate:
+            self._schedule_flush()
+        return entry, duplicate
+
+    def release(self, session_id: str):
+        """Flushes and drops a document nobody is editing."""
+        with self._lock:
+            doc = self._docs.pop(session_id, None)
+        if doc is not None:
+            doc.flush()
+
+    def _schedule_flush(self):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_interval, self.flush_all)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush_all(self):
+        with self._lock:
+            self._timer = None
+            docs = [doc for doc in self._docs.values() if doc.dirty]
+        for doc in docs:
+            try:
+                doc.flush()
+            except OSError as e:
+                logger.error(f"Collaboration op log flush failed for {doc.session_id}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+_hubs: Dict[str, CollabHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_collab_hub(storage_dir: Optional[str] = None) -> CollabHub:
+    """Returns the process-wide hub for ``storage_dir`` (default STORAGE_PATH/collab)."""
+    storage_dir = storage_dir or os.path.join(settings.STORAGE_PATH, "collab")
+    key = os.path.abspath(storage_dir)
+    with _hubs_lock:
+        hub = _hubs.get(key)
+        if hub is None:
+            hub = CollabHub(storage_dir)
+            _hubs[key] = hub
+        return hub
+
+
+def flush_all_collab_documents():
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+    for hub in hubs:
+        hub.flush_all()
+
+
+atexit.register(flush_all_collab_documents)
@@ -34,10 +34,12 @@ async_engine = create_async_engine(
     max_overflow=10 if "sqlite" not in DATABASE_URL else 0,
 )
 
-# Setup query performance monitoring
-if os.getenv("ENABLE_QUERY_LOGGING", "false").lower() == "true":
+# Setup query performance monitoring (slow query log + per-request profiling)
+from app.core.config import settings
+if settings.QUERY_PROFILING or os.getenv("ENABLE_QUERY_LOGGING", "false").lower() == "true":
     from app.core.query_monitor import setup_query_logging
     setup_query_logging(engine)
+    setup_query_logging(async_engine.sync_engine)
 
 # Session makers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,412 @@
+"""
+Shared JSON Document Store
+
+File-backed services keep their data in small JSON documents under STORAGE_PATH.
+This module gives them one shared access layer instead of re-reading and
+re-dumping the whole file on every call:
+
+- One store per file per process (``get_document_store``)
+- In-process read cache, invalidated when the file's mtime/size/inode changes
+- Keyed get/put/delete/scan for dict documents, append/items for list
+  documents, and get_item/update_item/remove_items for list documents whose
+  items carry an id field (``item_key``)
+- Write-behind: mutations update the cache immediately and are flushed in
+  batches by a background thread (tmp file + fsync + atomic replace), so
+  request handlers never wait on disk writes
+- Per-file locking: a thread lock per store plus an flock'd lock file so
+  concurrent workers merge their pending changes key-by-key instead of
+  overwriting each other
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_DELETED = object()
+
+
+class JSONDocumentStore:
+    """
+    Cached, write-behind access to a single JSON document (dict or list).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_factory: Callable[[], Any] = dict,
+        flush_delay: float = 0.05,
+        item_key: Optional[str] = None,
+    ):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.default_factory = default_factory
+        self.flush_delay = flush_delay
+        self.item_key = item_key
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._data: Any = None
+        self._sig: Optional[Tuple[int, int, int]] = None
+        # Pending changes not yet on disk
+        self._pending_keys: Dict[str, Any] = {}
+        self._pending_appends: List[Any] = []
+        # List items changed or removed in place, by their item_key value
+        self._pending_items: Dict[Any, Any] = {}
+        self._pending_replace = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not os.path.exists(path):
+            self._data = default_factory()
+            self._pending_replace = True
+            self.flush()
+
+    # ------------------------------------------------------------------ #
+    # Disk I/O
+    # ------------------------------------------------------------------ #
+
+    def _file_sig(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read_disk(self) -> Any:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self.default_factory()
+
+    def _apply_pending(self, data: Any) -> Any:
+        if self._pending_replace:
+            return self._data
+        if isinstance(data, dict):
+            for key, value in self._pending_keys.items():
+                if value is _DELETED:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+        elif isinstance(data, list):
+            data.extend(self._pending_appends)
+            if self._pending_items:
+                merged = []
+                for item in data:
+                    item = self._pending_items.get(self._item_id(item), item)
+                    if item is not _DELETED:
+                        merged.append(item)
+                data[:] = merged
+        return data
+
+    def _has_pending(self) -> bool:
+        return (
+            self._pending_replace
+            or bool(self._pending_keys)
+            or bool(self._pending_appends)
+            or bool(self._pending_items)
+        )
+
+    def _sync(self):
+        """Reload from disk if another writer changed the file, keeping pending changes."""
+        sig = self._file_sig()
+        if self._data is not None and sig == self._sig:
+            return
+        self._data = self._apply_pending(self._read_disk())
+        self._sig = sig
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_fp:
+            fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+
+    def flush(self):
+        """
+        Write pending changes to disk, merging with changes from other processes.
+        The document is serialized under the store lock; the file write and
+        fsync happen outside it, so readers and writers are not held up by disk I/O.
+        """
+        with self._flush_lock, self._file_lock():
+            with self._lock:
+                if not self._has_pending():
+                    return
+                if self._file_sig() != self._sig:
+                    self._data = self._apply_pending(self._read_disk())
+                payload = json.dumps(self._data, ensure_ascii=False, indent=2)
+                flushed = (self._pending_keys, self._pending_appends, self._pending_items, self._pending_replace)
+                self._pending_keys, self._pending_appends, self._pending_items = {}, [], {}
+                self._pending_replace = False
+            try:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception:
+                with self._lock:
+                    self._restore_pending(*flushed)
+                raise
+            with self._lock:
+                # Changes made meanwhile are still pending on top of the written file
+                self._sig = self._file_sig()
+
+    def _restore_pending(self, keys: Dict[str, Any], appends: List[Any], items: Dict[Any, Any], replace: bool):
+        """Puts back the changes of a failed flush, under newer ones."""
+        self._pending_replace = self._pending_replace or replace
+        if self._pending_replace:
+            self._pending_keys.clear()
+            self._pending_appends.clear()
+            self._pending_items.clear()
+            return
+        self._pending_keys = {**keys, **self._pending_keys}
+        self._pending_appends = appends + self._pending_appends
+        self._pending_items = {**items, **self._pending_items}
+
+    def _mark_dirty(self):
+        _flusher.schedule(self)
+
+    # ------------------------------------------------------------------ #
+    # Whole-document access
+    # ------------------------------------------------------------------ #
+
+    def read(self) -> Any:
+        """Returns a copy of the whole document."""
+        with self._lock:
+            self._sync()
+            return copy.deepcopy(self._data)
+
+    def write(self, data: Any):
+        """Replaces the whole document."""
+        with self._lock:
+            self._data = copy.deepcopy(data)
+            self._pending_replace = True
+            self._pending_keys.clear()
+            self._pending_appends.clear()
+            self._pending_items.clear()
+        self._mark_dirty()
+
+    # ------------------------------------------------------------------ #
+    # Keyed access (dict documents)
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self._sync()
+            if key not in self._data:
+                return default
+            return copy.deepcopy(self._data[key])
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            self._sync()
+            return key in self._data
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._sync()
+            value = copy.deepcopy(value)
+            self._data[key] = value
+            if not self._pending_replace:
+                self._pending_keys[key] = value
+        self._mark_dirty()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._sync()
+            if key not in self._data:
+                return False
+            del self._data[key]
+            if not self._pending_replace:
+                self._pending_keys[key] = _DELETED
+        self._mark_dirty()
+        return True
+
+    def update(self, key: str, mutate: Callable[[Any], Any], default: Any = None) -> Any:
+        """
+        Atomic read-modify-write of one key. ``mutate`` receives a copy of the
+        current value (or ``default``) and returns the new value; returning
+        None for a missing key leaves the document unchanged.
+        """
+        with self._lock:
+            self._sync()
+            current = copy.deepcopy(self._data.get(key, default))
+            value = mutate(current)
+            if value is None and key not in self._data:
+                return None
+            self._data[key] = value
+            if not self._pending_replace:
+                self._pending_keys[key] = value
+        self._mark_dirty()
+        return copy.deepcopy(value)
+
+    def scan(self, predicate: Optional[Callable[[Any], bool]] = None) -> Iterator[Tuple[str, Any]]:
+        """Yields (key, value) copies for dict documents."""
+        with self._lock:
+            self._sync()
+            items = [
+                (key, copy.deepcopy(value))
+                for key, value in self._data.items()
+                if predicate is None or predicate(value)
+            ]
+        return iter(items)
+
+    # ------------------------------------------------------------------ #
+    # List documents
+    # ------------------------------------------------------------------ #
+
+    def append(self, item: Any):
+        with self._lock:
+            self._sync()
+            item = copy.deepcopy(item)
+            self._data.append(item)
+            if not self._pending_replace:
+                self._pending_appends.append(item)
+        self._mark_dirty()
+
+    def items(self, predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """Returns copies of list items matching ``predicate``."""
+        with self._lock:
+            self._sync()
+            return [copy.deepcopy(item) for item in self._data if predicate is None or predicate(item)]
+
+    def _item_id(self, item: Any) -> Any:
+        return item.get(self.item_key) if isinstance(item, dict) else None
+
+    def _item_index(self, item_id: Any) -> Optional[int]:
+        if self.item_key is None:
+            raise ValueError(f"{self.path} has no item_key")
+        for index, item in enumerate(self._data):
+            if self._item_id(item) == item_id:
+                return index
+        return None
+
+    def get_item(self, item_id: Any, default: Any = None) -> Any:
+        """Returns a copy of the list item whose ``item_key`` is ``item_id``."""
+        with self._lock:
+            self._sync()
+            index = self._item_index(item_id)
+            if index is None:
+                return default
+            return copy.deepcopy(self._data[index])
+
+    def update_item(self, item_id: Any, mutate: Callable[[Any], Any]) -> Any:
+        """
+        Atomic read-modify-write of one list item. ``mutate`` receives a copy of
+        the item and returns the new one; exceptions it raises leave the item
+        unchanged. Returns None if there is no such item.
+        """
+        with self._lock:
+            self._sync()
+            index = self._item_index(item_id)
+            if index is None:
+                return None
+            value = mutate(copy.deepcopy(self._data[index]))
+            self._data[index] = value
+            if not self._pending_replace:
+                self._pending_items[item_id] = value
+        self._mark_dirty()
+        return copy.deepcopy(value)
+
+    def remove_items(self, predicate: Callable[[Any], bool]) -> int:
+        """Removes the list items matching ``predicate``; returns how many."""
+        with self._lock:
+            self._sync()
+            if self.item_key is None:
+                raise ValueError(f"{self.path} has no item_key")
+            kept, removed = [], []
+            for item in self._data:
+                (removed if predicate(item) else kept).append(item)
+            if not removed:
+                return 0
+            self._data[:] = kept
+            if not self._pending_replace:
+                for item in removed:
+                    self._pending_items[self._item_id(item)] = _DELETED
+        self._mark_dirty()
+        return len(removed)
+
+
+class _BatchFlusher:
+    """Background thread that flushes dirty stores in batches."""
+
+    def __init__(self):
+        self._dirty: Dict[int, JSONDocumentStore] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, store: JSONDocumentStore):
+        with self._cond:
+            self._dirty[id(store)] = store
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="document-store-flusher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                delay = max(store.flush_delay for store in self._dirty.values())
+            # Let more writes accumulate before touching the disk
+            time.sleep(delay)
+            self.flush_all()
+
+    def flush_all(self):
+        with self._cond:
+            stores = list(self._dirty.values())
+            self._dirty.clear()
+        for store in stores:
+            try:
+                store.flush()
+            except Exception as e:
+                logger.error(f"Document store flush failed for {store.path}: {e}")
+
+
+_flusher = _BatchFlusher()
+_stores: Dict[str, JSONDocumentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_document_store(
+    path: str,
+    default_factory: Callable[[], Any] = dict,
+    item_key: Optional[str] = None,
+) -> JSONDocumentStore:
+    """Returns the process-wide store for ``path``, creating the file if needed."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = JSONDocumentStore(path, default_factory, item_key=item_key)
+            _stores[key] = store
+        elif item_key is not None:
+            store.item_key = item_key
+        return store
+
+
+def flush_all_document_stores():
+    """Flushes every pending write (used on shutdown and in tests)."""
+    _flusher.flush_all()
+
+
+atexit.register(flush_all_document_stores)
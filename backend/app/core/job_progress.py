@@ -0,0 +1,401 @@
+"""
+Job Progress Bus
+
+Background jobs publish their progress once per step to ``job_progress``; the
+bus fans the latest state of each job out to:
+
+- the hot state cache (Redis when reachable, in-process otherwise), written on
+  every publish and read by ``GET /jobs/{job_id}`` instead of Postgres
+- Socket.IO job rooms, at most every ``JOB_PROGRESS_EMIT_MS`` per job
+- Postgres (``JobRepository``) and Supabase realtime, at most every
+  ``JOB_PROGRESS_PERSIST_MS`` per job
+
+Delivery runs on one background thread per process. Updates published between
+two deliveries are coalesced: only the latest state is sent, with per-stage
+results merged so no stage result is lost. The first update of a job goes out
+immediately, terminal states (succeeded / failed / cancelled) are delivered
+synchronously before ``publish`` returns, and a failed sink is retried with
+the latest state on the next tick.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Status names used by the Supabase "jobs" table
+SUPABASE_STATUSES = {"running": "processing", "succeeded": "completed"}
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+class JobStateCache:
+    """
+    Latest job state by job id; Redis (``backend="auto"``) with an in-process fallback.
+
+    An unreachable Redis is retried every ``retry_seconds`` instead of latching
+    the fallback for the life of the process. Keys whose write failed (or that
+    were written to the fallback meanwhile) are deleted from Redis so a stale
+    entry never overrides the job row in Postgres.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 prefix: str = "job_state", backend: str = "auto", client=None,
+                 retry_seconds: float = 30.0):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.backend = backend
+        self.ttl_seconds = settings.JOB_STATE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.prefix = prefix
+        self.retry_seconds = retry_seconds
+        self._client = client
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._memory: Dict[str, tuple] = {}
+        # Job ids whose Redis entry may be stale (failed write / written to the fallback)
+        self._stale: set = set()
+
+    def _connect(self):
+        import redis
+
+        client = redis.from_url(self.redis_url, decode_responses=True, socket_connect_timeout=1)
+        client.ping()
+        return client
+
+    def _redis(self):
+        if self._client is not None or self.backend == "memory":
+            return self._client
+        with self._lock:
+            if self._client is None and time.monotonic() >= self._retry_at:
+                try:
+                    self._client = self._connect()
+                except Exception as e:
+                    self._retry_at = time.monotonic() + self.retry_seconds
+                    logger.warning(f"Job state cache: Redis unavailable ({e}), using in-process fallback")
+            return self._client
+
+    def _fall_back(self, error: Exception):
+        """Drops the Redis client after an error; reconnecting is retried after the backoff."""
+        logger.warning(f"Job state cache: Redis error ({error}), retrying in {self.retry_seconds:.0f}s")
+        with self._lock:
+            self._client = None
+            self._retry_at = time.monotonic() + self.retry_seconds
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def set(self, state: Dict[str, Any]):
+        job_id = state["job_id"]
+        client = self._redis()
+        if client is not None:
+            try:
+                with self._lock:
+                    stale, self._stale = self._stale, set()
+                stale.discard(job_id)
+                pipe = client.pipeline()
+                if stale:
+                    pipe.delete(*(self._key(stale_id) for stale_id in stale))
+                pipe.setex(self._key(job_id), self.ttl_seconds, json.dumps(state, default=str))
+                pipe.execute()
+                with self._lock:
+                    self._memory.pop(job_id, None)
+                return
+            except Exception as e:
+                with self._lock:
+                    self._stale |= stale
+                self._forget(client, job_id)
+                self._fall_back(e)
+        with self._lock:
+            self._stale.add(job_id)
+            self._memory[job_id] = (time.monotonic() + self.ttl_seconds, state)
+
+    def _forget(self, client, job_id: str):
+        """Deletes a key whose write failed; if that fails too it stays marked stale."""
+        try:
+            client.delete(self._key(job_id))
+        except Exception:
+            pass
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            expires_at, state = self._memory.get(job_id, (0.0, None))
+            if state is not None and expires_at < time.monotonic():
+                del self._memory[job_id]
+                state = None
+        if state is not None:
+            return state
+        client = self._redis()
+        if client is not None:
+            with self._lock:
+                stale = job_id in self._stale
+            if stale:
+                return None
+            try:
+                data = client.get(self._key(job_id))
+                return json.loads(data) if data else None
+            except Exception as e:
+                self._fall_back(e)
+        return None
+
+
+# ---------------------------------------------------------------------- #
+# Default sinks
+# ---------------------------------------------------------------------- #
+
+_socket_manager = None
+_socket_pid = None
+
+
+def emit_to_socket(state: Dict[str, Any]):
+    """Emits job_progress to the job's room through one RedisManager per process."""
+    global _socket_manager, _socket_pid
+    if _socket_manager is None or _socket_pid != os.getpid():
+        import socketio
+
+        _socket_manager = socketio.RedisManager(settings.REDIS_URL, write_only=True)
+        _socket_pid = os.getpid()
+    _socket_manager.emit("job_progress", socket_payload(state), room=state["job_id"])
+
+
+def persist_to_database(state: Dict[str, Any]):
+    from app.models import JobStatus
+    from app.repositories.job_repository import JobRepository
+
+    job_repo = JobRepository()
+    try:
+        job_repo.update_job_status(
+            uuid.UUID(state["job_id"]),
+            JobStatus(state["status"]),
+            result_data=state.get("result_data"),
+            error_message=state.get("error_message"),
+            percent=state.get("percent"),
+            celery_task_id=state.get("celery_task_id"),
+            step=state.get("message"),
+        )
+    finally:
+        job_repo.close()
+
+
+def persist_to_supabase(state: Dict[str, Any]):
+    from app.services.supabase_job_service import supabase_job_service
+
+    status = state["status"]
+    if status == "failed":
+        supabase_job_service.update_progress(state["job_id"], 0, f"Hata: {state.get('error_message')}", status="failed")
+    else:
+        supabase_job_service.update_progress(
+            state["job_id"], state.get("percent") or 0, state.get("message") or "",
+            status=SUPABASE_STATUSES.get(status, status),
+        )
+
+
+def socket_payload(state: Dict[str, Any]) -> Dict[str, Any]:
+    """job_progress event body (status in upper case, as clients expect)."""
+    payload = {
+        "job_id": state["job_id"],
+        "status": state["status"].upper(),
+        "percent": state.get("percent"),
+        "message": state.get("error_message") or state.get("message"),
+        "data": state.get("result_data") or state.get("data"),
+    }
+    if state.get("stages"):
+        payload["stages"] = state["stages"]
+    return payload
+
+
+class _Entry:
+    __slots__ = ("state", "emitted", "persisted", "persisted_at")
+
+    def __init__(self):
+        self.state: Dict[str, Any] = {}
+        self.emitted = 0
+        self.persisted = 0
+        self.persisted_at = float("-inf")
+
+
+class JobProgressBus:
+    """Coalescing fan-out of job progress to socket rooms, Postgres and Supabase."""
+
+    def __init__(
+        self,
+        emitters: Optional[List[Sink]] = None,
+        persisters: Optional[List[Sink]] = None,
+        state_cache: Optional[JobStateCache] = None,
+        emit_interval: Optional[float] = None,
+        persist_interval: Optional[float] = None,
+    ):
+        self.emitters = emitters if emitters is not None else [emit_to_socket]
+        self.persisters = persisters if persisters is not None else [persist_to_database, persist_to_supabase]
+        self.state_cache = state_cache or JobStateCache()
+        self.emit_interval = (
+            settings.JOB_PROGRESS_EMIT_MS / 1000 if emit_interval is None else emit_interval
+        )
+        self.persist_interval = (
+            settings.JOB_PROGRESS_PERSIST_MS / 1000 if persist_interval is None else persist_interval
+        )
+        self._jobs: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        # Deliveries are serialized so a version is never sent twice
+        self._deliver_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------ #
+    # Publishing
+    # ------------------------------------------------------------------ #
+
+    def publish(
+        self,
+        job_id: str,
+        status: str,
+        percent: Optional[int] = None,
+        message: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+        result_data: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+        celery_task_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Records the job's new state and schedules delivery; returns the merged state."""
+        job_id = str(job_id)
+        status = getattr(status, "value", status)
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                entry = self._jobs[job_id] = _Entry()
+            state = dict(entry.state) or {"job_id": job_id, "version": 0, "stages": {}}
+            state["status"] = status
+            for field, value in (
+                ("percent", percent), ("message", message), ("data", data), ("result_data", result_data),
+                ("error_message", error_message), ("celery_task_id", celery_task_id),
+            ):
+                if value is not None:
+                    state[field] = value
+            if data and data.get("stage"):
+                # Keep every stage result even when updates are coalesced
+                stages = dict(state["stages"])
+                stages[data["stage"]] = {**stages.get(data["stage"], {}), **data}
+                state["stages"] = stages
+            if status in TERMINAL_STATUSES:
+                state["completed_at"] = datetime.now().isoformat()
+                if status == "succeeded":
+                    state["percent"] = 100
+            state["version"] += 1
+            state["updated_at"] = datetime.now().isoformat()
+            entry.state = state
+
+        self.state_cache.set(state)
+        if status in TERMINAL_STATUSES:
+            self.flush(job_id)
+        else:
+            self._ensure_thread()
+            with self._wake:
+                self._wake.notify()
+        return state
+
+    def state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Hot state of the job, or None when it is not cached (read Postgres then)."""
+        return self.state_cache.get(str(job_id))
+
+    # ------------------------------------------------------------------ #
+    # Delivery
+    # ------------------------------------------------------------------ #
+
+    def flush(self, job_id: Optional[str] = None):
+        """Delivers pending states now, ignoring the rate limits."""
+        with self._lock:
+            job_ids = [str(job_id)] if job_id is not None else list(self._jobs)
+        for pending in job_ids:
+            self._deliver(pending, force=True)
+
+    def _pending(self) -> List[str]:
+        return [
+            job_id for job_id, entry in self._jobs.items()
+            if entry.state["version"] > min(entry.emitted, entry.persisted)
+        ]
+
+    def _deliver(self, job_id: str, force: bool = False):
+        with self._deliver_lock:
+            with self._lock:
+                entry = self._jobs.get(job_id)
+                if entry is None:
+                    return
+                state = entry.state
+                now = time.monotonic()
+                emit = state["version"] > entry.emitted
+                persist = state["version"] > entry.persisted and (
+                    force or now - entry.persisted_at >= self.persist_interval
+                )
+
+            if emit:
+                if self._send(self.emitters, state):
+                    entry.emitted = state["version"]
+            if persist:
+                entry.persisted_at = now
+                if self._send(self.persisters, state):
+                    entry.persisted = state["version"]
+
+            with self._lock:
+                done = entry.state["version"] == entry.emitted == entry.persisted
+                if done and entry.state["status"] in TERMINAL_STATUSES:
+                    self._jobs.pop(job_id, None)
+
+    def _send(self, sinks: List[Sink], state: Dict[str, Any]) -> bool:
+        ok = True
+        for sink in sinks:
+            try:
+                sink(state)
+            except Exception as e:
+                ok = False
+                logger.warning(f"Job progress delivery to {getattr(sink, '__name__', sink)} failed: {e}")
+        return ok
+
+    def _ensure_thread(self):
+        # Celery prefork: the thread is restarted in the forked child
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._closed = False
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="job-progress-bus", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while not self._closed and not self._pending():
+                    self._wake.wait()
+                if self._closed:
+                    return
+                pending = self._pending()
+            for job_id in pending:
+                self._deliver(job_id)
+            # Updates pile up during this interval; only the latest state goes out
+            time.sleep(self.emit_interval)
+
+    def close(self):
+        """Stops the delivery thread and flushes everything still pending."""
+        with self._wake:
+            self._closed = True
+            self._wake.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and self._pid == os.getpid():
+            thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+
+
+job_progress = JobProgressBus()
+atexit.register(job_progress.close)
@@ -0,0 +1,352 @@
+"""
+Incremental Leaderboards
+
+Leaderboards are sorted sets (member = user_id, score = story count, likes
+received or XP) that are updated in place when the underlying data changes
+instead of being recomputed from every user and story on each request:
+
+- Redis sorted sets when Redis is reachable (shared by all workers)
+- In-process sorted sets otherwise; each worker re-seeds from storage every
+  LEADERBOARD_MEMORY_RESEED_SECONDS to pick up writes made by other workers
+
+Top-N, rank-of-member and around-member windows are O(log N) (+ window size).
+The store uses the synchronous Redis client: async routes call the read side
+through ``asyncio.to_thread``, and updates issued from an event loop (story
+saves, likes, XP) are handed to a single writer thread so they neither block
+the loop nor get reordered.
+A board that has never been filled is seeded once through a loader supplied
+by the caller (``ensure_seeded``); updates made before that are folded in by
+the seed itself.
+"""
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STORIES_BOARD = "stories"
+LIKES_BOARD = "likes"
+XP_BOARD = "xp"
+BOARDS = (STORIES_BOARD, LIKES_BOARD, XP_BOARD)
+
+Entry = Tuple[str, float]
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class MemorySortedSet:
+    """
+    In-process sorted set ordered by score (highest first), ties by member.
+    Lookups are binary searches over a sorted list of ``(-score, member)``.
+    """
+
+    def __init__(self):
+        self._scores: Dict[str, float] = {}
+        self._order: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _unlink(self, member: str) -> Optional[float]:
+        score = self._scores.pop(member, None)
+        if score is not None:
+            index = bisect.bisect_left(self._order, (-score, member))
+            del self._order[index]
+        return score
+
+    def set(self, member: str, score: float):
+        self._unlink(member)
+        self._scores[member] = score
+        bisect.insort(self._order, (-score, member))
+
+    def incr(self, member: str, delta: float) -> float:
+        score = (self._unlink(member) or 0.0) + delta
+        self._scores[member] = score
+        bisect.insort(self._order, (-score, member))
+        return score
+
+    def remove(self, member: str):
+        self._unlink(member)
+
+    def score(self, member: str) -> Optional[float]:
+        return self._scores.get(member)
+
+    def rank(self, member: str) -> Optional[int]:
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order, (-score, member))
+
+    def range(self, start: int, stop: int) -> List[Entry]:
+        """Entries from ``start`` to ``stop`` (inclusive), like ZREVRANGE."""
+        return [(member, -neg) for neg, member in self._order[max(start, 0):stop + 1]]
+
+    def replace(self, scores: Dict[str, float]):
+        self._scores = dict(scores)
+        self._order = sorted((-score, member) for member, score in self._scores.items())
+
+
+class LeaderboardStore:
+    """Sorted-set leaderboards on Redis with an in-process fallback."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        backend: Optional[str] = None,
+        prefix: str = "leaderboard",
+        reseed_seconds: Optional[int] = None,
+        client=None,
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.backend = backend or settings.LEADERBOARD_BACKEND
+        self.prefix = prefix
+        self.reseed_seconds = (
+            settings.LEADERBOARD_MEMORY_RESEED_SECONDS if reseed_seconds is None else reseed_seconds
+        )
+        self._client = client
+        self._resolved = client is not None
+        self._lock = threading.RLock()
+        self._boards: Dict[str, MemorySortedSet] = {}
+        self._seeded_at: Dict[str, float] = {}
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------ #
+    # Backend selection
+    # ------------------------------------------------------------------ #
+
+    def _redis(self):
+        """Redis client, or None when the in-process fallback is in use."""
+        if self._resolved:
+            return self._client
+        with self._lock:
+            if self._resolved:
+                return self._client
+            self._resolved = True
+            if self.backend == "memory":
+                return None
+            try:
+                import redis
+
+                client = redis.from_url(self.redis_url, decode_responses=True, socket_connect_timeout=1)
+                client.ping()
+                self._client = client
+                logger.info("Leaderboards: Redis sorted sets")
+            except Exception as e:
+                if self.backend == "redis":
+                    raise
+                logger.warning(f"Leaderboards: Redis unavailable ({e}), using in-process fallback")
+            return self._client
+
+    def _fall_back(self, error: Exception):
+        """Switches to the in-process boards after a Redis failure; they re-seed on next read."""
+        logger.warning(f"Leaderboards: Redis error ({error}), switching to in-process fallback")
+        with self._lock:
+            self._client = None
+            self._boards.clear()
+            self._seeded_at.clear()
+
+    def _key(self, board: str) -> str:
+        return f"{self.prefix}:{board}"
+
+    def _board(self, board: str) -> MemorySortedSet:
+        sorted_set = self._boards.get(board)
+        if sorted_set is None:
+            sorted_set = self._boards[board] = MemorySortedSet()
+        return sorted_set
+
+    @property
+    def using_redis(self) -> bool:
+        return self._redis() is not None
+
+    # ------------------------------------------------------------------ #
+    # Seeding
+    # ------------------------------------------------------------------ #
+
+    def ensure_seeded(self, board: str, loader: Callable[[], Dict[str, float]]):
+        """Fills ``board`` from ``loader()`` if it was never seeded (or, in memory, has gone stale)."""
+        client = self._redis()
+        if client is not None:
+            try:
+                if client.exists(f"{self._key(board)}:seeded"):
+                    return
+                self._write_redis(client, board, loader())
+                return
+            except Exception as e:
+                self._fall_back(e)
+
+        with self._lock:
+            seeded_at = self._seeded_at.get(board)
+            if seeded_at is not None and time.monotonic() - seeded_at < self.reseed_seconds:
+                return
+            self._board(board).replace(loader())
+            self._seeded_at[board] = time.monotonic()
+
+    def rebuild(self, board: str, loader: Callable[[], Dict[str, float]]):
+        """Replaces ``board`` with freshly computed scores (reconcile after drift)."""
+        client = self._redis()
+        if client is not None:
+            try:
+                self._write_redis(client, board, loader())
+                return
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            self._board(board).replace(loader())
+            self._seeded_at[board] = time.monotonic()
+
+    def _write_redis(self, client, board: str, scores: Dict[str, float]):
+        key = self._key(board)
+        tmp_key = f"{key}:rebuild"
+        pipe = client.pipeline()
+        pipe.delete(tmp_key)
+        if scores:
+            pipe.zadd(tmp_key, scores)
+            pipe.rename(tmp_key, key)
+        else:
+            pipe.delete(key)
+        pipe.set(f"{key}:seeded", int(time.time()))
+        pipe.execute()
+
+    # ------------------------------------------------------------------ #
+    # Updates
+    # ------------------------------------------------------------------ #
+
+    def _update(self, apply: Callable[[], None]):
+        """
+        Runs an update inline, or on the writer thread when called from an
+        event loop with Redis possibly in use (one worker keeps updates ordered).
+        """
+        if not _on_event_loop() or (self._resolved and self._client is None):
+            apply()
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-writer")
+        self._writer.submit(apply)
+
+    def incr(self, board: str, member: str, delta: float, drop_non_positive: bool = True):
+        """Adds ``delta`` to the member's score; members that reach 0 leave the board."""
+        if not member or not delta:
+            return
+        self._update(lambda: self._incr(board, member, delta, drop_non_positive))
+
+    def _incr(self, board: str, member: str, delta: float, drop_non_positive: bool):
+        client = self._redis()
+        if client is not None:
+            try:
+                score = client.zincrby(self._key(board), delta, member)
+                if drop_non_positive and score <= 0:
+                    client.zrem(self._key(board), member)
+                return
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            # Unseeded boards pick the change up from storage when seeded
+            if board not in self._seeded_at:
+                return
+            sorted_set = self._board(board)
+            if sorted_set.incr(member, delta) <= 0 and drop_non_positive:
+                sorted_set.remove(member)
+
+    def set(self, board: str, member: str, score: float):
+        if not member:
+            return
+        self._update(lambda: self._set(board, member, score))
+
+    def _set(self, board: str, member: str, score: float):
+        client = self._redis()
+        if client is not None:
+            try:
+                client.zadd(self._key(board), {member: score})
+                return
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            if board in self._seeded_at:
+                self._board(board).set(member, score)
+
+    def remove(self, board: str, member: str):
+        self._update(lambda: self._remove(board, member))
+
+    def _remove(self, board: str, member: str):
+        client = self._redis()
+        if client is not None:
+            try:
+                client.zrem(self._key(board), member)
+                return
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            self._board(board).remove(member)
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def top(self, board: str, limit: int, offset: int = 0) -> List[Entry]:
+        return self.range(board, offset, offset + limit - 1)
+
+    def range(self, board: str, start: int, stop: int) -> List[Entry]:
+        client = self._redis()
+        if client is not None:
+            try:
+                return [(m, float(s)) for m, s in client.zrevrange(self._key(board), max(start, 0), stop, withscores=True)]
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            return self._board(board).range(start, stop)
+
+    def rank(self, board: str, member: str) -> Optional[int]:
+        """0-based rank (highest score first), or None if not on the board."""
+        client = self._redis()
+        if client is not None:
+            try:
+                return client.zrevrank(self._key(board), member)
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            return self._board(board).rank(member)
+
+    def score(self, board: str, member: str) -> Optional[float]:
+        client = self._redis()
+        if client is not None:
+            try:
+                score = client.zscore(self._key(board), member)
+                return float(score) if score is not None else None
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            return self._board(board).score(member)
+
+    def size(self, board: str) -> int:
+        client = self._redis()
+        if client is not None:
+            try:
+                return client.zcard(self._key(board))
+            except Exception as e:
+                self._fall_back(e)
+        with self._lock:
+            return len(self._board(board))
+
+    def around(self, board: str, member: str, radius: int) -> Tuple[Optional[int], List[Entry]]:
+        """Returns ``(rank, entries)`` for the ``radius`` members above and below ``member``."""
+        rank = self.rank(board, member)
+        if rank is None:
+            return None, []
+        start = max(rank - radius, 0)
+        return rank, self.range(board, start, rank + radius)
+
+
+leaderboards = LeaderboardStore()
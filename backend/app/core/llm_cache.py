@@ -0,0 +1,119 @@
+"""
+Content-addressed LLM Response Cache
+
+Deterministic story transformations ("analyze readability", "add irony", ...)
+send the same prompt and story text to the same model again and again. Their
+responses are cached under a hash of everything that affects the output
+(namespace, model, messages, sampling parameters):
+
+- Tier 1: in-process LRU bounded by total payload bytes
+- Tier 2: Redis via ``app.core.cache.CacheService`` (shared by all workers)
+
+Creative calls opt out with ``cache=False`` on the gateway call.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import llm_cache_requests_total
+
+logger = logging.getLogger(__name__)
+
+# Parameters that change the completion and therefore belong in the key
+_KEY_PARAMS = ("temperature", "max_tokens", "top_p", "n", "stop", "presence_penalty",
+               "frequency_penalty", "response_format", "seed", "tools", "tool_choice")
+
+
+class _SizedLRU:
+    """LRU map whose capacity is a byte budget instead of an entry count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(value)
+        # A single oversized entry would flush the whole tier
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._entries[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMResponseCache:
+    """Two-tier (memory + Redis) cache of serialized chat completion payloads."""
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl_seconds: Optional[int] = None, redis_cache=None):
+        self.memory = _SizedLRU(max_bytes or settings.LLM_CACHE_MEMORY_MB * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds or settings.LLM_CACHE_TTL_SECONDS
+        self._redis_cache = redis_cache
+
+    @property
+    def redis_cache(self):
+        if self._redis_cache is None:
+            from app.core.cache import cache_service
+            self._redis_cache = cache_service
+        return self._redis_cache
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any], namespace: str = "") -> str:
+        material = {
+            "ns": namespace,
+            "model": model,
+            "messages": messages,
+            "params": {k: params[k] for k in _KEY_PARAMS if k in params},
+        }
+        digest = hashlib.sha256(
+            json.dumps(material, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"llm:v1:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.memory.get(key)
+        if raw is not None:
+            llm_cache_requests_total.labels(result="memory_hit").inc()
+            return json.loads(raw)
+
+        payload = await self.redis_cache.get(key)
+        if payload is not None:
+            llm_cache_requests_total.labels(result="redis_hit").inc()
+            self.memory.set(key, json.dumps(payload, ensure_ascii=False))
+            return payload
+
+        llm_cache_requests_total.labels(result="miss").inc()
+        return None
+
+    async def set(self, key: str, payload: Dict[str, Any]):
+        self.memory.set(key, json.dumps(payload, ensure_ascii=False))
+        await self.redis_cache.set(key, payload, expire=self.ttl_seconds)
+
+
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,169 @@
+"""
+Async LLM Gateway
+
+Shared entry point for chat completions. All feature services route through
+one pooled ``AsyncOpenAI`` client so a slow completion only occupies its own
+request instead of blocking the event loop:
+
+- One httpx connection pool per event loop (keep-alive, bounded connections)
+- A semaphore bounding in-flight completions per worker
+- Per-model timeouts (``LLM_MODEL_TIMEOUTS``) with a default fallback
+- Content-addressed response cache for deterministic calls (``app.core.llm_cache``)
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from app.core.config import settings
+from app.core.llm_cache import llm_response_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_model_timeouts(raw: str) -> Dict[str, float]:
+    """Parses "model=seconds,model=seconds" into a dict."""
+    timeouts = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        model, seconds = item.split("=", 1)
+        try:
+            timeouts[model.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Invalid LLM timeout entry ignored: {item}")
+    return timeouts
+
+
+class LLMGateway:
+    """
+    Pooled, concurrency-bounded async client for chat completions.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        model_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.api_key = api_key if api_key is not None else settings.OPENAI_API_KEY
+        self.base_url = base_url if base_url is not None else settings.OPENAI_BASE_URL
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_connections = max_connections or settings.LLM_MAX_CONNECTIONS
+        self.default_timeout = default_timeout or settings.LLM_DEFAULT_TIMEOUT_SECONDS
+        self.model_timeouts = (
+            model_timeouts if model_timeouts is not None
+            else _parse_model_timeouts(settings.LLM_MODEL_TIMEOUTS)
+        )
+
+        # Clients and semaphores are bound to the loop that created them
+        # (uvicorn has one loop, Celery tasks may create a fresh loop per run)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _ensure_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.default_timeout,
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.api_key or "missing-api-key",
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=1,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The pooled client for the running loop (for non-chat endpoints)."""
+        return self._ensure_client()
+
+    def timeout_for(self, model: str) -> float:
+        return self.model_timeouts.get(model, self.default_timeout)
+
+    def should_cache(self, cache: Optional[bool], kwargs: Dict[str, Any]) -> bool:
+        """
+        Explicit ``cache=True/False`` wins; otherwise cache when enabled and the
+        call is not sampling-heavy (temperature above LLM_CACHE_MAX_TEMPERATURE
+        or several choices requested).
+        """
+        if cache is not None:
+            return cache and settings.LLM_CACHE_ENABLED
+        if not settings.LLM_CACHE_ENABLED or kwargs.get("stream") or kwargs.get("n", 1) != 1:
+            return False
+        return kwargs.get("temperature", 1.0) <= settings.LLM_CACHE_MAX_TEMPERATURE
+
+    async def chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        cache: Optional[bool] = None,
+        cache_namespace: str = "",
+        **kwargs,
+    ) -> Any:
+        """
+        Runs a chat completion and returns the raw response object
+        (same shape as ``client.chat.completions.create``).
+
+        Identical deterministic requests are served from the response cache;
+        pass ``cache=False`` for creative generations that must vary, and the
+        calling service as ``cache_namespace`` so services sharing a prompt
+        keep separate entries.
+        """
+        cache_key = None
+        if self.should_cache(cache, kwargs):
+            cache_key = llm_response_cache.make_key(model, messages, kwargs, cache_namespace)
+            cached = await llm_response_cache.get(cache_key)
+            if cached is not None:
+                return ChatCompletion.model_validate(cached)
+
+        response = await self._create(model, messages, **kwargs)
+
+        if cache_key is not None and isinstance(response, ChatCompletion):
+            await llm_response_cache.set(cache_key, response.model_dump(mode="json"))
+        return response
+
+    async def _create(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Any:
+        client = self._ensure_client()
+        timeout = kwargs.pop("timeout", None) or self.timeout_for(model)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                return await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=timeout,
+                    **kwargs,
+                )
+            finally:
+                logger.debug(f"LLM {model} completed in {time.perf_counter() - started:.2f}s")
+
+    async def chat(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> str:
+        """Runs a chat completion and returns the first choice's text."""
+        response = await self.chat_completion(model, messages, **kwargs)
+        return response.choices[0].message.content
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._loop = None
+
+
+llm_gateway = LLMGateway()
@@ -1,11 +1,14 @@
 """
 Structured JSON Logging Configuration
 """
+import atexit
 import logging
 import json
+import queue
 import sys
 from datetime import datetime
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Tuple
 import traceback
 
 
@@ -164,3 +167,44 @@ class RequestLogger:
 def get_logger(name: str) -> logging.Logger:
     """Get a child logger"""
     return logging.getLogger(f"masal_fabrikasi.{name}")
+
+
+# Non-blocking handlers
+class _LocalQueueHandler(QueueHandler):
+    """In-process queue handler: keeps exc_info and extras for the real formatter."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_queue_listeners: List[Tuple[logging.Logger, QueueListener]] = []
+
+
+def enable_async_logging(*logger_names: str) -> None:
+    """
+    Move the handlers of the given loggers (default: root and "masal_fabrikasi")
+    behind a queue, so request paths only enqueue records and formatting / I/O
+    happens on a listener thread. Calling it again is a no-op.
+    """
+    if _queue_listeners:
+        return
+    for name in logger_names or ("", "masal_fabrikasi"):
+        target = logging.getLogger(name or None)
+        if not target.handlers:
+            continue
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        listener = QueueListener(records, *target.handlers, respect_handler_level=True)
+        target.handlers = [_LocalQueueHandler(records)]
+        listener.start()
+        _queue_listeners.append((target, listener))
+    atexit.register(disable_async_logging)
+
+
+def disable_async_logging() -> None:
+    """Drain the queues and put the original handlers back."""
+    while _queue_listeners:
+        target, listener = _queue_listeners.pop()
+        listener.stop()
+        target.handlers = list(listener.handlers)
@@ -62,6 +62,14 @@ background_jobs_duration_seconds = Histogram(
     registry=registry
 )
 
+story_pipeline_stage_duration_seconds = Histogram(
+    'story_pipeline_stage_duration_seconds',
+    'Duration of individual story pipeline stages in seconds',
+    ['pipeline', 'stage'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+    registry=registry
+)
+
 # Database metrics
 database_queries_total = Counter(
     'database_queries_total',
@@ -77,6 +85,30 @@ database_query_duration_seconds = Histogram(
     registry=registry
 )
 
+# Per-request database accounting (see app/core/query_monitor.py)
+db_queries_per_request = Histogram(
+    'db_queries_per_request',
+    'SQL statements executed per HTTP request',
+    ['endpoint'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    registry=registry
+)
+
+db_time_per_request_seconds = Histogram(
+    'db_time_per_request_seconds',
+    'Total SQL time per HTTP request in seconds',
+    ['endpoint'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    registry=registry
+)
+
+db_n_plus_one_total = Counter(
+    'db_n_plus_one_total',
+    'Repeated statement fingerprints (N+1 suspects) detected per endpoint',
+    ['endpoint'],
+    registry=registry
+)
+
 # Cache metrics
 cache_hits_total = Counter(
     'cache_hits_total',
@@ -90,6 +122,20 @@ cache_misses_total = Counter(
     registry=registry
 )
 
+llm_cache_requests_total = Counter(
+    'llm_cache_requests_total',
+    'LLM response cache lookups',
+    ['result'],
+    registry=registry
+)
+
+auth_token_verifications_total = Counter(
+    'auth_token_verifications_total',
+    'Bearer token verifications by method (cache, local, remote) and result',
+    ['method', 'result'],
+    registry=registry
+)
+
 
 class MetricsCollector:
     """Helper class for metrics collection"""
@@ -133,6 +179,20 @@ class MetricsCollector:
             job_type=job_type
         ).observe(duration)
     
+    @staticmethod
+    def track_query(operation: str, duration: float):
+        """Track a single SQL statement"""
+        database_queries_total.labels(operation=operation).inc()
+        database_query_duration_seconds.labels(operation=operation).observe(duration)
+    
+    @staticmethod
+    def track_request_queries(endpoint: str, count: int, duration: float, n_plus_one: int):
+        """Track SQL statements issued while serving one request"""
+        db_queries_per_request.labels(endpoint=endpoint).observe(count)
+        db_time_per_request_seconds.labels(endpoint=endpoint).observe(duration)
+        if n_plus_one:
+            db_n_plus_one_total.labels(endpoint=endpoint).inc(n_plus_one)
+    
     @staticmethod
     def track_cache_hit(hit: bool):
         """Track cache hit/miss"""
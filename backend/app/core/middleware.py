@@ -1,54 +1,161 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-import uuid
+"""
+Request observability middleware (pure ASGI)
+
+One layer replaces the former request-ID, request-logging, request-tracking and
+pagination-enforcement middlewares:
+
+- Assigns the request ID (a safe incoming ``X-Request-ID`` is kept) and exposes it
+  as ``request.state.request_id``
+- Rejects oversized ``limit`` / ``page_size`` GET parameters with a 400 response
+- Adds ``X-Request-ID`` / ``X-Process-Time`` headers without buffering the body,
+  so streaming responses pass through untouched
+- Records Prometheus request metrics labelled by route template
+- Emits one structured access log record per request; with
+  ``enable_async_logging`` the handlers run on a background thread
+- Opens the request's SQL profile (``app.core.query_monitor``): query count,
+  DB time and N+1 suspects go to metrics and the ``X-Query-Profile`` header
+"""
+import asyncio
+import logging
+import re
 import time
+import uuid
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qsl
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """
-    Adds a unique request ID to each request for tracking.
-    """
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Add to response headers
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
-
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import MetricsCollector
+from app.core.query_monitor import begin_request_profile, explain_slowest, finish_request_profile
+
+logger = logging.getLogger("masal_fabrikasi.access")
+
+# Maximum items per page
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 20
+
+PAGE_SIZE_PARAMS = ("limit", "page_size")
+UNMATCHED_ROUTE = "<unmatched>"
+
+_REQUEST_ID_HEADER = b"x-request-id"
+_SAFE_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def _incoming_request_id(headers) -> Optional[str]:
+    for name, value in headers:
+        if name == _REQUEST_ID_HEADER:
+            candidate = value.decode("latin-1")
+            return candidate if _SAFE_REQUEST_ID.match(candidate) else None
+    return None
+
+
+def _oversized_page_param(query_string: bytes, max_page_size: int) -> Optional[str]:
+    """Return the name of a page-size parameter above ``max_page_size``, if any."""
+    # Cheap byte check first: most requests carry no paging parameters
+    if b"limit=" not in query_string and b"page_size=" not in query_string:
+        return None
+    for name, value in parse_qsl(query_string.decode("latin-1")):
+        if name in PAGE_SIZE_PARAMS:
+            try:
+                if int(value) > max_page_size:
+                    return name
+            except ValueError:
+                continue
+    return None
+
+
+def _client_host(scope: Scope) -> Optional[str]:
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+class ObservabilityMiddleware:
     """
-    Logs all incoming requests.
+    Request ID, timing, metrics, access logging and pagination limits in a single
+    pass over each HTTP request.
     """
-    async def dispatch(self, request: Request, call_next):
-        from app.core.logging_config import logger
-        
-        start_time = time.time()
-        request_id = getattr(request.state, "request_id", "unknown")
-        
-        # Log request
-        logger.info(
-            f"{request.method} {request.url.path}",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "client_host": request.client.host if request.client else None
-            }
-        )
-        
-        response = await call_next(request)
-        
-        # Log response
-        duration = time.time() - start_time
-        logger.info(
-            f"Response {response.status_code}",
-            extra={
-                "request_id": request_id,
-                "status_code": response.status_code,
-                "duration_ms": round(duration * 1000, 2)
-            }
-        )
-        
-        return response
+
+    def __init__(self, app: ASGIApp, max_page_size: int = MAX_PAGE_SIZE):
+        self.app = app
+        self.max_page_size = max_page_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request_id = _incoming_request_id(scope["headers"]) or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        status_code = 500
+        profile, profile_token = begin_request_profile(request_id) if settings.QUERY_PROFILING else (None, None)
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - started
+                headers = [
+                    *message.get("headers", ()),
+                    (_REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                    (b"x-process-time", f"{elapsed:.6f}".encode("latin-1")),
+                ]
+                if profile is not None and settings.QUERY_PROFILE_HEADER:
+                    # Statements issued after the headers (streaming bodies) are not included
+                    headers.append((b"x-query-profile", profile.header_value().encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            if method == "GET":
+                param = _oversized_page_param(scope.get("query_string", b""), self.max_page_size)
+                if param is not None:
+                    logger.warning(
+                        f"Requested {param} exceeds max {self.max_page_size}",
+                        extra={"request_id": request_id, "path": scope["path"]},
+                    )
+                    response = JSONResponse(
+                        status_code=400,
+                        content={
+                            "success": False,
+                            "error": {
+                                "code": "HTTP_ERROR",
+                                "message": f"{param} cannot exceed {self.max_page_size}",
+                                "details": {"max_page_size": self.max_page_size},
+                                "request_id": request_id,
+                                "timestamp": datetime.utcnow().isoformat(),
+                            },
+                        },
+                    )
+                    await response(scope, receive, send_with_headers)
+                    return
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            duration = time.perf_counter() - started
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or UNMATCHED_ROUTE
+            MetricsCollector.track_request(method, endpoint, status_code, duration)
+            if profile is not None:
+                finish_request_profile(profile, profile_token, endpoint)
+            level = logging.INFO if status_code < 500 else logging.ERROR
+            if logger.isEnabledFor(level):
+                extra = {
+                    "request_id": request_id,
+                    "method": method,
+                    "path": scope["path"],
+                    "route": endpoint,
+                    "status_code": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "client_host": _client_host(scope),
+                }
+                if profile is not None and profile.count:
+                    extra["db_queries"] = profile.count
+                    extra["db_ms"] = round(profile.total_time * 1000, 2)
+                logger.log(level, f"{method} {scope['path']} {status_code}", extra=extra)
+            if profile is not None and profile.slowest:
+                # The response is already sent; plans are captured off the event loop
+                await asyncio.to_thread(explain_slowest, profile)
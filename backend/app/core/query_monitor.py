@@ -1,30 +1,202 @@
 """
 Database Query Performance Monitor
-Logs slow queries for debugging and optimization
+
+- Slow statements are logged (with the request ID when inside a request)
+- Request-scoped accounting: the observability middleware opens a
+  ``QueryProfile`` per request; engine events add every statement's count,
+  time and fingerprint to it
+- Statements repeated with the same fingerprint within one request
+  (``QUERY_N_PLUS_ONE_THRESHOLD`` times or more) are flagged as N+1 patterns
+- Optional EXPLAIN capture for the slowest SELECTs of a request
+  (``QUERY_EXPLAIN_SLOWEST``), run after the response on a separate connection
+- Results feed Prometheus through ``MetricsCollector`` and, when
+  ``QUERY_PROFILE_HEADER`` is on, the ``X-Query-Profile`` response header
 """
+import contextvars
+import heapq
+import itertools
 import logging
+import re
 import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
+from app.core.config import settings
+from app.core.metrics import MetricsCollector
+
 logger = logging.getLogger("query_performance")
 
 # Set threshold for slow queries (in seconds)
 SLOW_QUERY_THRESHOLD = 1.0
 
+_current_profile: contextvars.ContextVar[Optional["QueryProfile"]] = contextvars.ContextVar(
+    "query_profile", default=None
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s|\$\d+|:\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes a statement so executions that differ only in literal values or
+    IN-list length share one fingerprint.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:10].split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+class QueryProfile:
+    """Per-request query accounting."""
+
+    def __init__(self, request_id: Optional[str] = None, explain_slowest: int = 0):
+        self.request_id = request_id
+        self.count = 0
+        self.total_time = 0.0
+        # fingerprint -> [count, total seconds, sample statement]
+        self.fingerprints: Dict[str, List[Any]] = {}
+        self.explain_slowest = explain_slowest
+        self.slowest: List[Tuple[float, int, str, Any, Engine]] = []
+        self.explains: List[Dict] = []
+        self._seq = itertools.count()
+
+    def record(self, statement: str, parameters: Any, duration: float, engine: Optional[Engine] = None):
+        self.count += 1
+        self.total_time += duration
+        key = fingerprint(statement)
+        entry = self.fingerprints.get(key)
+        if entry is None:
+            self.fingerprints[key] = [1, duration, statement]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+
+        if self.explain_slowest and engine is not None and _operation(statement) == "SELECT":
+            item = (duration, next(self._seq), statement, parameters, engine)
+            if len(self.slowest) < self.explain_slowest:
+                heapq.heappush(self.slowest, item)
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, item)
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> List[Dict]:
+        """Fingerprints repeated at least ``threshold`` times, most repeated first."""
+        threshold = threshold or settings.QUERY_N_PLUS_ONE_THRESHOLD
+        suspects = [
+            {
+                "fingerprint": key,
+                "count": count,
+                "total_ms": round(total * 1000, 2),
+                "sample": sample[:300],
+            }
+            for key, (count, total, sample) in self.fingerprints.items()
+            if count >= threshold
+        ]
+        return sorted(suspects, key=lambda s: -s["count"])
+
+    def summary(self) -> Dict:
+        return {
+            "request_id": self.request_id,
+            "queries": self.count,
+            "db_ms": round(self.total_time * 1000, 2),
+            "distinct": len(self.fingerprints),
+            "n_plus_one": self.n_plus_one(),
+            "explains": self.explains,
+        }
+
+    def header_value(self) -> str:
+        return (
+            f"queries={self.count};db_ms={self.total_time * 1000:.2f};"
+            f"distinct={len(self.fingerprints)};n_plus_one={len(self.n_plus_one())}"
+        )
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+def begin_request_profile(request_id: Optional[str] = None) -> Tuple[QueryProfile, contextvars.Token]:
+    """Opens a profile for the current request context."""
+    profile = QueryProfile(request_id, explain_slowest=settings.QUERY_EXPLAIN_SLOWEST)
+    return profile, _current_profile.set(profile)
+
+
+def finish_request_profile(profile: QueryProfile, token: contextvars.Token, endpoint: str) -> None:
+    """Closes the profile: exports metrics and logs N+1 suspects."""
+    _current_profile.reset(token)
+    if not profile.count:
+        return
+    suspects = profile.n_plus_one()
+    MetricsCollector.track_request_queries(endpoint, profile.count, profile.total_time, len(suspects))
+    for suspect in suspects:
+        logger.warning(
+            f"N+1 suspect on {endpoint}: {suspect['count']}x {suspect['fingerprint'][:200]}",
+            extra={"request_id": profile.request_id, "endpoint": endpoint, **suspect},
+        )
+
+
+def explain_slowest(profile: QueryProfile) -> List[Dict]:
+    """
+    Runs EXPLAIN for the profile's slowest SELECTs on a fresh connection and
+    logs the plans. Blocking; call it off the event loop.
+    """
+    # EXPLAIN statements must not count towards the profile they describe
+    token = _current_profile.set(None)
+    try:
+        for duration, _, statement, parameters, engine in sorted(profile.slowest, reverse=True):
+            if duration * 1000 < settings.QUERY_EXPLAIN_MIN_MS or engine.dialect.is_async:
+                continue
+            prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+            try:
+                with engine.connect() as conn:
+                    rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+            except Exception as e:
+                logger.debug(f"EXPLAIN failed: {e}")
+                continue
+            plan = {
+                "statement": statement[:300],
+                "duration_ms": round(duration * 1000, 2),
+                "plan": [" ".join(str(col) for col in row) for row in rows],
+            }
+            profile.explains.append(plan)
+            logger.info("Slow query plan", extra={"request_id": profile.request_id, **plan})
+    finally:
+        _current_profile.reset(token)
+        profile.slowest.clear()
+    return profile.explains
+
 
 def setup_query_logging(engine: Engine):
-    """Setup query performance logging on SQLAlchemy engine."""
-    
+    """Setup query performance logging and request profiling on a SQLAlchemy engine."""
+
     @event.listens_for(engine, "before_cursor_execute")
     def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-        conn.info.setdefault("query_start_time", []).append(time.time())
-    
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
     @event.listens_for(engine, "after_cursor_execute")
     def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-        total_time = time.time() - conn.info["query_start_time"].pop(-1)
-        
+        total_time = time.perf_counter() - conn.info["query_start_time"].pop(-1)
+        MetricsCollector.track_query(_operation(statement), total_time)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, parameters, total_time, conn.engine)
+
         if total_time > SLOW_QUERY_THRESHOLD:
             logger.warning(
-                f"⚠️ SLOW QUERY ({total_time:.2f}s): {statement[:200]}..."
+                f"⚠️ SLOW QUERY ({total_time:.2f}s): {statement[:200]}...",
+                extra={"request_id": profile.request_id if profile else None},
             )
@@ -0,0 +1,129 @@
+"""
+Lazy Service Registry
+
+Routers used to import and instantiate every feature service at import time,
+so cold start and per-worker memory grew with each feature (every service
+module, its file setup in ``_ensure_files`` and its own API client).
+
+Services are now registered by import path and resolved by name on first use:
+
+    story_readability_analyzer_service = lazy_service(
+        "app.services.story_readability_analyzer_service:StoryReadabilityAnalyzerService"
+    )
+
+The returned proxy behaves like the instance; the module is imported and the
+class instantiated the first time an attribute is accessed. Services share the
+process-wide LLM gateway and document stores, so nothing is duplicated per
+instance. ``PRELOAD_SERVICES`` (comma-separated names, or ``*``) warms
+selected services during startup.
+"""
+import importlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Maps service names to "module:Class" targets and caches the instances."""
+
+    def __init__(self):
+        self._targets: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, target: str) -> str:
+        if ":" not in target:
+            raise ValueError(f"Service target must look like 'module.path:ClassName', got {target!r}")
+        with self._lock:
+            existing = self._targets.get(name)
+            if existing is not None and existing != target:
+                raise ValueError(f"Service name {name!r} already registered for {existing}")
+            self._targets[name] = target
+        return name
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                target = self._targets.get(name)
+                if target is None:
+                    raise KeyError(f"Unknown service: {name}")
+                module_path, class_name = target.split(":", 1)
+                cls = getattr(importlib.import_module(module_path), class_name)
+                instance = cls()
+                self._instances[name] = instance
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def names(self) -> List[str]:
+        return sorted(self._targets)
+
+    def loaded_names(self) -> List[str]:
+        return sorted(self._instances)
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Resolves the given services now (all registered ones when ``names`` is
+        None). Failures are logged, not raised, so one broken optional service
+        does not stop startup.
+        """
+        targets = self.names() if names is None else list(names)
+        loaded = []
+        for name in targets:
+            try:
+                self.get(name)
+                loaded.append(name)
+            except Exception as e:
+                logger.error(f"Service preload failed for {name}: {e}")
+        return loaded
+
+    def preload_from_setting(self, value: str) -> List[str]:
+        """Applies a PRELOAD_SERVICES style value ("", "*" or "a,b,c")."""
+        value = (value or "").strip()
+        if not value:
+            return []
+        if value == "*":
+            return self.preload()
+        return self.preload(name.strip() for name in value.split(",") if name.strip())
+
+
+class LazyService:
+    """Proxy that resolves the registered service on first attribute access."""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._registry.is_loaded(self._name) else "lazy"
+        return f"<LazyService {self._name} ({state})>"
+
+
+service_registry = ServiceRegistry()
+
+
+def lazy_service(target: str, name: Optional[str] = None) -> LazyService:
+    """
+    Registers ``target`` ("module.path:ClassName") and returns a lazy proxy.
+    The default name is the module's last component, e.g.
+    ``story_readability_analyzer_service``.
+    """
+    if name is None:
+        name = target.split(":", 1)[0].rsplit(".", 1)[-1]
+    service_registry.register(name, target)
+    return LazyService(service_registry, name)
@@ -2,6 +2,8 @@ import socketio
 from typing import Any
 import logging
 
+from app.core.service_registry import lazy_service
+
 logger = logging.getLogger(__name__)
 
 class SocketManager:
@@ -65,3 +67,81 @@ async def join_job_room(sid, job_id):
     """
     logger.info(f"Client {sid} joined room {job_id}")
     await socket_manager.sio.enter_room(sid, job_id)
+
+@socket_manager.sio.event
+async def join_story_stream(sid, stream_id):
+    """
+    Client joins a streamed story generation. The text generated so far is
+    sent to the joining client first so deltas emitted before the join are
+    not lost; subsequent story_delta events carry seq > snapshot seq.
+    """
+    from app.core.story_stream import story_stream_hub
+
+    await socket_manager.sio.enter_room(sid, stream_id)
+    stream = story_stream_hub.get(stream_id)
+    if stream is not None:
+        await socket_manager.sio.emit('story_snapshot', stream.snapshot(), to=sid)
+
+realtime_collaboration_service = lazy_service(
+    "app.services.realtime_collaboration_service:RealtimeCollaborationService"
+)
+
+@socket_manager.sio.event
+async def join_collab_session(sid, data):
+    """
+    Client joins a realtime collaboration session ({session_id, user_id,
+    since?}). The joiner first gets collab_state (snapshot + op tail, or only
+    the ops after ``since``); collab_op events follow for every change.
+    """
+    from app.services.realtime_collaboration_service import collab_room
+
+    try:
+        session_id = data["session_id"]
+        realtime_collaboration_service.join_session(session_id, data["user_id"])
+        # Join the room before reading the state so no op falls in between;
+        # clients skip ops at or below the state's version
+        await socket_manager.sio.enter_room(sid, collab_room(session_id))
+        state = realtime_collaboration_service.get_document(session_id, data.get("since"))
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+    await socket_manager.sio.emit('collab_state', state, to=sid)
+    return {"ok": True, "version": state["version"]}
+
+@socket_manager.sio.event
+async def collab_op(sid, data):
+    """
+    Applies an edit ({session_id, user_id, change_type, change_data}) and
+    acks with the new version. The transformed op is broadcast to the room
+    as collab_op; ``resync: true`` means the client must re-join.
+    """
+    from app.core.collab_documents import CollabResyncRequired
+
+    try:
+        change = realtime_collaboration_service.apply_change(
+            data["session_id"],
+            data["user_id"],
+            data.get("change_type", "operation"),
+            data.get("change_data") or {},
+        )
+    except CollabResyncRequired as e:
+        return {"error": str(e), "resync": True}
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+    return {
+        "ok": True,
+        "change_id": change.get("change_id"),
+        "version": change["version"],
+        "duplicate": change["duplicate"],
+    }
+
+@socket_manager.sio.event
+async def leave_collab_session(sid, data):
+    from app.services.realtime_collaboration_service import collab_room
+
+    try:
+        session_id = data["session_id"]
+        await socket_manager.sio.leave_room(sid, collab_room(session_id))
+        realtime_collaboration_service.leave_session(session_id, data["user_id"])
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+    return {"ok": True}
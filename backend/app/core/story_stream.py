@@ -0,0 +1,148 @@
+"""
+Story Streams
+
+In-process buffer for streamed story generation. Token deltas are coalesced
+(first delta immediately, then at most every ``STORY_STREAM_FLUSH_MS`` or on a
+line break) and each flushed chunk is:
+
+- pushed to the Socket.IO room named after the stream id
+- appended to the stream's event log, which the SSE fallback endpoint and
+  late Socket.IO joiners replay from any sequence number
+
+Streams live in the worker that runs the generation; Socket.IO delivery works
+across workers through the Redis client manager, SSE subscribers must reach
+the same worker (sticky sessions). Finished streams are dropped after
+``STORY_STREAM_RETENTION_SECONDS``.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = ("story_completed", "story_failed")
+
+
+class StoryStream:
+    """Event log and coalescing buffer for a single streamed generation."""
+
+    def __init__(self, stream_id: str, user_id: Optional[str] = None, flush_interval: Optional[float] = None):
+        self.stream_id = stream_id
+        self.user_id = user_id
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.STORY_STREAM_FLUSH_MS / 1000
+        )
+        self.events: List[Dict[str, Any]] = []
+        self.text_parts: List[str] = []
+        self.done = False
+        self.created_at = time.time()
+
+        self._pending = ""
+        self._last_flush = 0.0
+        self._changed = asyncio.Event()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.text_parts) + self._pending
+
+    async def push_delta(self, delta: str):
+        """Buffers a token delta and flushes it when due."""
+        self._pending += delta
+        now = time.monotonic()
+        first = not self.text_parts
+        if first or "\n" in delta or now - self._last_flush >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        delta, self._pending = self._pending, ""
+        self.text_parts.append(delta)
+        self._last_flush = time.monotonic()
+        await self.publish("story_delta", {"delta": delta})
+
+    async def publish(self, event: str, data: Dict[str, Any]):
+        """Appends an event to the log and emits it to the stream's room."""
+        seq = len(self.events)
+        payload = {"stream_id": self.stream_id, "seq": seq, **data}
+        self.events.append({"event": event, "seq": seq, "data": payload})
+        if event in TERMINAL_EVENTS:
+            self.done = True
+
+        # Wake SSE subscribers
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+        from app.core.socket_manager import socket_manager
+        await socket_manager.emit(event, payload, room=self.stream_id)
+
+    async def subscribe(self, last_seq: int = -1, keepalive: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yields events after ``last_seq`` until the stream finishes. ``None`` is
+        yielded when nothing happened for ``keepalive`` seconds.
+        """
+        cursor = last_seq + 1
+        while True:
+            while cursor < len(self.events):
+                yield self.events[cursor]
+                cursor += 1
+            if self.done:
+                return
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Text so far plus the last sequence number, for late joiners."""
+        return {
+            "stream_id": self.stream_id,
+            "seq": len(self.events) - 1,
+            "story_text": "".join(self.text_parts),
+            "done": self.done,
+        }
+
+
+class StoryStreamHub:
+    """Registry of live story streams in this worker."""
+
+    def __init__(self, retention_seconds: Optional[int] = None):
+        self.retention_seconds = (
+            retention_seconds if retention_seconds is not None else settings.STORY_STREAM_RETENTION_SECONDS
+        )
+        self._streams: Dict[str, StoryStream] = {}
+
+    def create(self, user_id: Optional[str] = None) -> StoryStream:
+        self._expire()
+        stream = StoryStream(str(uuid.uuid4()), user_id=user_id)
+        self._streams[stream.stream_id] = stream
+        return stream
+
+    def get(self, stream_id: str) -> Optional[StoryStream]:
+        self._expire()
+        return self._streams.get(stream_id)
+
+    def _expire(self):
+        cutoff = time.time() - self.retention_seconds
+        for stream_id in [sid for sid, s in self._streams.items() if s.done and s.created_at < cutoff]:
+            del self._streams[stream_id]
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    """Serializes a stream event (or a keepalive for ``None``) as an SSE frame."""
+    if event is None:
+        return ": keepalive\n\n"
+    data = json.dumps(event["data"], ensure_ascii=False)
+    return f"id: {event['seq']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+story_stream_hub = StoryStreamHub()
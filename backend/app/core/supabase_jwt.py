@@ -0,0 +1,399 @@
+"""
+Local Supabase JWT Verification
+
+Authenticated requests used to call Supabase ``/auth/v1/user`` on every
+request. Access tokens are JWTs, so they are verified here instead:
+
+- HS256 tokens with the project's JWT secret (SUPABASE_JWT_SECRET)
+- RS256/ES256 tokens with the project's JWKS, cached for
+  AUTH_JWKS_CACHE_SECONDS and re-fetched (rate limited) on an unknown ``kid``
+- Verified claims are cached per token (bounded LRU) for
+  AUTH_CLAIMS_CACHE_TTL_SECONDS, never past the token's ``exp``
+- ``revoke_token`` / ``revoke_user`` reject tokens before they expire; the
+  revocation is stored locally and in Redis, and other workers see it on
+  their next claims-cache miss (at most one cache TTL later)
+- ``/auth/v1/user`` is only called when no key is available for a token
+  (no secret configured and the JWKS cannot be fetched)
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+import jwt
+
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError, ExternalServiceError
+from app.core.metrics import auth_token_verifications_total
+
+logger = logging.getLogger(__name__)
+
+_ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+# Clock skew tolerated on exp/iat/nbf
+_LEEWAY_SECONDS = 30
+# Longest lifetime of a Supabase access token; revocations are kept this long
+_REVOCATION_TTL_SECONDS = 7 * 24 * 3600
+
+RevocationCheck = Callable[[Dict], Union[bool, Awaitable[bool]]]
+
+
+def claims_to_user(claims: Dict) -> Dict:
+    """Maps JWT claims to the user dict shape returned by ``/auth/v1/user``."""
+    app_metadata = claims.get("app_metadata") or {}
+    return {
+        "id": claims.get("sub"),
+        "user_id": claims.get("sub"),
+        "email": claims.get("email"),
+        "phone": claims.get("phone"),
+        "aud": claims.get("aud"),
+        "app_metadata": app_metadata,
+        "user_metadata": claims.get("user_metadata") or {},
+        "role": app_metadata.get("role", "user"),
+        "session_id": claims.get("session_id"),
+        "is_anonymous": claims.get("is_anonymous", False),
+    }
+
+
+class _ClaimsCache:
+    """Token-hash keyed LRU of verified users with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Dict, float]]:
+        """Returns ``(user, issued_at)`` or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, issued_at, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user, issued_at
+
+    def put(self, key: str, user: Dict, issued_at: float, expires_at: float):
+        with self._lock:
+            self._entries[key] = (user, issued_at, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def drop_user(self, user_id: str):
+        with self._lock:
+            for key in [k for k, (user, _, _) in self._entries.items() if user.get("id") == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SupabaseTokenVerifier:
+    """Verifies Supabase access tokens locally, with a claims cache and revocation."""
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        jwt_secret: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        audience: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+        jwks_ttl: Optional[int] = None,
+        remote_fallback: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        shared_revocations: bool = True,
+    ):
+        self.supabase_url = (supabase_url if supabase_url is not None else settings.SUPABASE_URL).rstrip("/")
+        self.jwt_secret = jwt_secret if jwt_secret is not None else settings.SUPABASE_JWT_SECRET
+        self.jwks_url = jwks_url or settings.SUPABASE_JWKS_URL or (
+            f"{self.supabase_url}/auth/v1/.well-known/jwks.json" if self.supabase_url else ""
+        )
+        self.audience = audience if audience is not None else settings.SUPABASE_JWT_AUDIENCE
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.AUTH_CLAIMS_CACHE_TTL_SECONDS
+        self.jwks_ttl = jwks_ttl if jwks_ttl is not None else settings.AUTH_JWKS_CACHE_SECONDS
+        self.remote_fallback = settings.AUTH_REMOTE_FALLBACK if remote_fallback is None else remote_fallback
+        self.transport = transport
+        self.shared_revocations = shared_revocations
+
+        self.cache = _ClaimsCache(cache_size or settings.AUTH_CLAIMS_CACHE_SIZE)
+        self._jwks: Dict[str, jwt.PyJWK] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_failed_at = 0.0
+        self._revoked_tokens: Dict[str, float] = {}
+        self._revoked_users: Dict[str, float] = {}
+        self._revocation_checks: List[RevocationCheck] = []
+
+        # One HTTP client and JWKS lock per event loop (tests and Celery run several)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._jwks_lock: Optional[asyncio.Lock] = None
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    async def verify(self, token: str) -> Dict:
+        """
+        Returns the user dict for ``token``.
+
+        Raises AuthenticationError for invalid, expired or revoked tokens and
+        ExternalServiceError when the token cannot be checked at all.
+        """
+        key = self._token_key(token)
+        cached = self.cache.get(key)
+        if cached is not None:
+            user, issued_at = cached
+            if not self._locally_revoked(key, user.get("id"), issued_at):
+                auth_token_verifications_total.labels(method="cache", result="ok").inc()
+                return dict(user)
+            self.cache.pop(key)
+            auth_token_verifications_total.labels(method="cache", result="revoked").inc()
+            raise AuthenticationError("Token revoked")
+
+        try:
+            signing_key, algorithm = await self._signing_key(token)
+        except AuthenticationError:
+            auth_token_verifications_total.labels(method="local", result="invalid").inc()
+            raise
+
+        if signing_key is None:
+            user, claims = await self._verify_remote(token), None
+            # Supabase vouched for the token; its own iat/exp are still what
+            # revocation and the cache lifetime must be measured against
+            token_claims = self._unverified_claims(token)
+            method = "remote"
+        else:
+            claims = token_claims = self._decode(token, signing_key, algorithm)
+            user = claims_to_user(claims)
+            method = "local"
+
+        iat = token_claims.get("iat")
+        issued_at = float(iat) if iat else time.time()
+        if await self._is_revoked(key, user, issued_at, claims):
+            auth_token_verifications_total.labels(method=method, result="revoked").inc()
+            raise AuthenticationError("Token revoked")
+
+        # Without iat a later revoke_user() could not be applied to a cached entry
+        if iat:
+            expires_at = time.time() + self.cache_ttl
+            if token_claims.get("exp"):
+                expires_at = min(expires_at, float(token_claims["exp"]))
+            self.cache.put(key, user, issued_at, expires_at)
+        auth_token_verifications_total.labels(method=method, result="ok").inc()
+        return dict(user)
+
+    async def revoke_token(self, token: str):
+        """Rejects ``token`` from now on (e.g. on logout)."""
+        key = self._token_key(token)
+        self._revoked_tokens[key] = time.time() + _REVOCATION_TTL_SECONDS
+        self.cache.pop(key)
+        await self._share_revocation(f"auth:revoked:token:{key}", time.time())
+
+    async def revoke_user(self, user_id: str, before: Optional[float] = None):
+        """Rejects every token of ``user_id`` issued before ``before`` (default: now)."""
+        revoked_at = before or time.time()
+        self._revoked_users[user_id] = revoked_at
+        self.cache.drop_user(user_id)
+        await self._share_revocation(f"auth:revoked:user:{user_id}", revoked_at)
+
+    def add_revocation_check(self, check: RevocationCheck):
+        """
+        Registers ``check(claims_or_user) -> bool`` (sync or async), consulted on
+        every claims-cache miss; returning True rejects the token.
+        """
+        self._revocation_checks.append(check)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+    # ------------------------------------------------------------------ #
+    # Keys
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _ensure_loop_state(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._client is None:
+            self._loop = loop
+            self._client = httpx.AsyncClient(transport=self.transport, timeout=10.0)
+            self._jwks_lock = asyncio.Lock()
+        return self._client
+
+    async def _signing_key(self, token: str) -> Tuple[Optional[object], Optional[str]]:
+        """Key and algorithm for local verification, or (None, None) to use the remote check."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError:
+            raise AuthenticationError("Invalid token")
+        algorithm = header.get("alg")
+
+        if algorithm == "HS256":
+            return (self.jwt_secret or None), algorithm
+        if algorithm not in _ASYMMETRIC_ALGORITHMS:
+            raise AuthenticationError("Unsupported token algorithm")
+
+        kid = header.get("kid")
+        jwk = await self._jwk(kid)
+        if jwk is None:
+            return None, None
+        return jwk.key, algorithm
+
+    async def _jwk(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """Cached JWKS lookup; raises if the JWKS is available but lacks ``kid``."""
+        now = time.monotonic()
+        fresh = self._jwks and now - self._jwks_fetched_at < self.jwks_ttl
+        if fresh and kid in self._jwks:
+            return self._jwks[kid]
+
+        self._ensure_loop_state()
+        async with self._jwks_lock:
+            now = time.monotonic()
+            stale = not self._jwks or now - self._jwks_fetched_at >= self.jwks_ttl
+            # Unknown kid: re-fetch at most once a minute (key rotation)
+            unknown = kid not in self._jwks and now - self._jwks_fetched_at >= 60
+            if (stale or unknown) and now - self._jwks_failed_at >= 30:
+                await self._fetch_jwks()
+
+        if kid in self._jwks:
+            return self._jwks[kid]
+        if self._jwks:
+            raise AuthenticationError("Unknown signing key")
+        return None
+
+    async def _fetch_jwks(self):
+        if not self.jwks_url:
+            self._jwks_failed_at = time.monotonic()
+            return
+        try:
+            response = await self._client.get(self.jwks_url, timeout=5.0)
+            response.raise_for_status()
+            keys = {}
+            for data in response.json().get("keys", []):
+                try:
+                    keys[data.get("kid")] = jwt.PyJWK(data)
+                except jwt.PyJWTError as e:
+                    logger.warning(f"Skipping unusable JWKS key {data.get('kid')}: {e}")
+            if keys:
+                self._jwks = keys
+                self._jwks_fetched_at = time.monotonic()
+            else:
+                self._jwks_failed_at = time.monotonic()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"JWKS fetch failed: {e}")
+            self._jwks_failed_at = time.monotonic()
+
+    # ------------------------------------------------------------------ #
+    # Verification
+    # ------------------------------------------------------------------ #
+
+    def _decode(self, token: str, key, algorithm: str) -> Dict:
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience or None,
+                leeway=_LEEWAY_SECONDS,
+                options={"require": ["exp", "sub"], "verify_aud": bool(self.audience)},
+            )
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationError("Token expired")
+        except jwt.PyJWTError:
+            raise AuthenticationError("Invalid token")
+
+    @staticmethod
+    def _unverified_claims(token: str) -> Dict:
+        """Payload of a token already verified elsewhere (signature not checked here)."""
+        try:
+            return jwt.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return {}
+
+    async def _verify_remote(self, token: str) -> Dict:
+        if not self.remote_fallback or not self.supabase_url:
+            raise ExternalServiceError("supabase-auth", "No key available to verify token")
+        client = self._ensure_loop_state()
+        try:
+            response = await client.get(
+                f"{self.supabase_url}/auth/v1/user",
+                headers={"Authorization": f"Bearer {token}", "apikey": settings.SUPABASE_ANON_KEY},
+            )
+        except httpx.RequestError as e:
+            auth_token_verifications_total.labels(method="remote", result="unavailable").inc()
+            raise ExternalServiceError("supabase-auth", str(e))
+        if response.status_code != 200:
+            auth_token_verifications_total.labels(method="remote", result="invalid").inc()
+            raise AuthenticationError("Invalid token")
+
+        user_data = response.json()
+        # Backward compatibility for existing code
+        user_data["user_id"] = user_data.get("id")
+        user_data["role"] = (user_data.get("app_metadata") or {}).get("role", "user")
+        return user_data
+
+    # ------------------------------------------------------------------ #
+    # Revocation
+    # ------------------------------------------------------------------ #
+
+    def _locally_revoked(self, key: str, user_id: Optional[str], issued_at: float) -> bool:
+        expires_at = self._revoked_tokens.get(key)
+        if expires_at is not None:
+            if expires_at > time.time():
+                return True
+            del self._revoked_tokens[key]
+        revoked_at = self._revoked_users.get(user_id) if user_id else None
+        return revoked_at is not None and issued_at <= revoked_at
+
+    async def _is_revoked(self, key: str, user: Dict, issued_at: float, claims: Optional[Dict]) -> bool:
+        user_id = user.get("id")
+        if self._locally_revoked(key, user_id, issued_at):
+            return True
+        if self.shared_revocations:
+            from app.core.cache import cache_service
+
+            if await cache_service.get(f"auth:revoked:token:{key}") is not None:
+                self._revoked_tokens[key] = time.time() + _REVOCATION_TTL_SECONDS
+                return True
+            revoked_at = await cache_service.get(f"auth:revoked:user:{user_id}") if user_id else None
+            if revoked_at is not None:
+                self._revoked_users[user_id] = max(float(revoked_at), self._revoked_users.get(user_id, 0))
+                if issued_at <= float(revoked_at):
+                    return True
+        for check in self._revocation_checks:
+            result = check(claims or user)
+            if asyncio.iscoroutine(result):
+                result = await result
+            if result:
+                return True
+        return False
+
+    async def _share_revocation(self, key: str, value: float):
+        if self.shared_revocations:
+            from app.core.cache import cache_service
+
+            await cache_service.set(key, value, expire=_REVOCATION_TTL_SECONDS)
+
+
+token_verifier = SupabaseTokenVerifier()
@@ -6,10 +6,12 @@ SQLAlchemy Database Models - Unified Package
 
 import sys
 from sqlalchemy import (
-    Column, String, Integer, Float, Boolean, DateTime, Text, 
-    ForeignKey, Enum, Index, CheckConstraint, DECIMAL, func
+    Column, String, Integer, SmallInteger, Float, Boolean, Date, DateTime, Text, 
+    ForeignKey, Enum, Index, CheckConstraint, DECIMAL, func, event, update, delete, inspect
 )
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime, timezone
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import uuid
@@ -186,6 +188,82 @@ class Story(Base):
         return f"<Story(id={self.id}, theme='{self.theme[:30]}...')>"
 
 
+class UserDailyActivity(Base):
+    """
+    Per-user daily activity rollup (one row per day/hour/story type/language).
+    Kept in sync by the Story insert/delete hooks below; streaks, weekly and
+    monthly counts and distributions are computed from one indexed read.
+    """
+    __tablename__ = "user_daily_activity"
+    __table_args__ = {'extend_existing': True}
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    hour = Column(SmallInteger, primary_key=True)
+    story_type = Column(String(50), primary_key=True)
+    language = Column(String(10), primary_key=True)
+    story_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<UserDailyActivity(user_id={self.user_id}, day={self.day}, count={self.story_count})>"
+
+
+def activity_key(user_id, created_at, story_type, language) -> dict:
+    """
+    Rollup primary key for a story created at ``created_at``.
+
+    Days and hours are UTC (naive values are taken as UTC, as timestamptz
+    stores them), matching ReadingAnalyticsService's notion of "today".
+    """
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return {
+        "user_id": user_id,
+        "day": created_at.date(),
+        "hour": created_at.hour,
+        "story_type": story_type or "masal",
+        "language": language or "tr",
+    }
+
+
+def bump_daily_activity(connection, key: dict, delta: int) -> None:
+    """Adds ``delta`` stories to the rollup row for ``key`` (upsert; rows reaching 0 are removed)."""
+    table = UserDailyActivity.__table__
+    match = [table.c[name] == value for name, value in key.items()]
+    if delta > 0 and connection.dialect.name in ("postgresql", "sqlite"):
+        insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        stmt = insert(table).values(**key, story_count=delta)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={"story_count": table.c.story_count + delta},
+        ))
+        return
+    result = connection.execute(update(table).where(*match).values(story_count=table.c.story_count + delta))
+    if delta > 0 and result.rowcount == 0:
+        connection.execute(table.insert().values(**key, story_count=delta))
+    elif delta < 0:
+        connection.execute(delete(table).where(*match, table.c.story_count <= 0))
+
+
+@event.listens_for(Story, "after_insert")
+def _story_inserted(mapper, connection, story):
+    # created_at server default'tan geliyorsa flush sırasında henüz yüklenmemiştir
+    created_at = inspect(story).dict.get("created_at") or datetime.now(timezone.utc)
+    bump_daily_activity(connection, activity_key(story.user_id, created_at, story.story_type, story.language), 1)
+
+
+@event.listens_for(Story, "before_delete")
+def _story_deleting(mapper, connection, story):
+    # Nesnedeki değerler süresi dolmuş/değiştirilmiş olabilir: kayıtlı satırı oku
+    table = Story.__table__
+    row = connection.execute(
+        table.select().with_only_columns(table.c.user_id, table.c.created_at, table.c.story_type, table.c.language)
+        .where(table.c.id == story.id)
+    ).first()
+    if row is not None:
+        bump_daily_activity(connection, activity_key(*row), -1)
+
+
 class Job(Base):
     """Job queue"""
     __tablename__ = "jobs"
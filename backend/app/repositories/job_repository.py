@@ -49,7 +49,8 @@ class JobRepository:
         result_data: Dict = None,
         error_message: str = None,
         percent: int = None,
-        celery_task_id: str = None
+        celery_task_id: str = None,
+        step: str = None
     ) -> Optional[Job]:
         """Update job status and results."""
         job = self.get_job_by_id(job_id)
@@ -70,6 +71,9 @@ class JobRepository:
         if celery_task_id:
             job.celery_task_id = celery_task_id
             
+        if step:
+            job.current_step = step[:100]
+            
         if status == JobStatus.RUNNING and not job.started_at:
             job.started_at = datetime.now()
             
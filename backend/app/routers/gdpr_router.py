@@ -8,6 +8,7 @@ import io
 
 from app.services.gdpr_service import GDPRService
 from app.core.auth_dependencies import get_current_user
+from app.core.supabase_jwt import token_verifier
 
 router = APIRouter()
 
@@ -125,6 +126,9 @@ async def delete_user_data(
         # Silme isteğini logla
         await gdpr_service.log_data_deletion(user_id, "User Requested Deletion")
 
+        # Mevcut oturum token'ları süresi dolmadan geçersiz olsun
+        await token_verifier.revoke_user(user_id)
+
         return {
             "message": "Veri silme işlemi başlatıldı. İşlem tamamlandığında email ile bilgilendirileceksiniz.",
             "estimated_completion": "24 saat içinde",
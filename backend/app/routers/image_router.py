@@ -0,0 +1,31 @@
+"""
+Responsive image derivatives - content-hashed thumbnails for story cards
+"""
+import os
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.services.image_derivatives import MEDIA_TYPES, get_image_derivative_store
+
+router = APIRouter()
+
+# URL içerik özetini taşır: aynı URL'nin içeriği asla değişmez
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{digest}/{name}")
+async def get_image(digest: str, name: str):
+    """
+    Görselin bir boyutunu döndürür (ör. /api/images/{özet}/320w.webp).
+    Eksik ama izinli bir boyut ilk istekte üretilir.
+    """
+    path = await get_image_derivative_store().resolve(digest, name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Görsel bulunamadı")
+    extension = os.path.splitext(path)[1].lstrip(".")
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES.get(extension, "application/octet-stream"),
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
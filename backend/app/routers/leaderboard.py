@@ -1,7 +1,11 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Query
 from app.services.leaderboard_service import LeaderboardService
 
 router = APIRouter()
+# Servis senkron Redis istemcisi ve dosya okumaları kullanır; event loop'u
+# bloklamamak için çağrılar iş parçacığında yürütülür.
 leaderboard_service = LeaderboardService()
 
 
@@ -11,7 +15,7 @@ async def get_stories_leaderboard(limit: int = Query(10, ge=1, le=100)):
     Hikâye sayısına göre liderlik tablosu.
     """
     try:
-        leaderboard = leaderboard_service.get_stories_leaderboard(limit)
+        leaderboard = await asyncio.to_thread(leaderboard_service.get_stories_leaderboard, limit)
         return {"leaderboard": leaderboard}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Liderlik tablosu yüklenirken hata oluştu: {str(e)}")
@@ -23,7 +27,7 @@ async def get_likes_leaderboard(limit: int = Query(10, ge=1, le=100)):
     Beğeni sayısına göre liderlik tablosu.
     """
     try:
-        leaderboard = leaderboard_service.get_likes_leaderboard(limit)
+        leaderboard = await asyncio.to_thread(leaderboard_service.get_likes_leaderboard, limit)
         return {"leaderboard": leaderboard}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Liderlik tablosu yüklenirken hata oluştu: {str(e)}")
@@ -35,8 +39,34 @@ async def get_xp_leaderboard(limit: int = Query(10, ge=1, le=100)):
     XP'ye göre liderlik tablosu.
     """
     try:
-        leaderboard = leaderboard_service.get_xp_leaderboard(limit)
+        leaderboard = await asyncio.to_thread(leaderboard_service.get_xp_leaderboard, limit)
         return {"leaderboard": leaderboard}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Liderlik tablosu yüklenirken hata oluştu: {str(e)}")
 
+
+
+@router.get("/leaderboard/{board}/users/{user_id}")
+async def get_user_rank(board: str, user_id: str):
+    """
+    Kullanıcının liderlik tablosundaki sırası (board: stories, likes, xp).
+    """
+    try:
+        return await asyncio.to_thread(leaderboard_service.get_user_rank, board, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sıralama yüklenirken hata oluştu: {str(e)}")
+
+
+@router.get("/leaderboard/{board}/around/{user_id}")
+async def get_around_user(board: str, user_id: str, radius: int = Query(5, ge=1, le=50)):
+    """
+    Kullanıcının çevresindeki sıralama (üstündeki ve altındaki `radius` kişi).
+    """
+    try:
+        return await asyncio.to_thread(leaderboard_service.get_around_user, board, user_id, radius)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Liderlik tablosu yüklenirken hata oluştu: {str(e)}")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from typing import Optional, List, Dict
 from pydantic import BaseModel
 
+from app.core.collab_documents import CollabResyncRequired
 from app.services.marketplace_service import MarketplaceService
 from app.services.realtime_collaboration_service import RealtimeCollaborationService
 from app.services.social_features_service import SocialFeaturesService
@@ -51,6 +52,32 @@ async def create_session(story_id: str, user_id: str):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+class CollaborationChangeRequest(BaseModel):
+    user_id: str
+    change_type: str = "operation"
+    change_data: Dict = {}
+
+
+@router.get("/collaboration-sessions/{session_id}/document")
+async def get_collaboration_document(session_id: str, since: Optional[int] = None):
+    try:
+        return realtime_collaboration_service.get_document(session_id, since)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/collaboration-sessions/{session_id}/changes")
+async def apply_collaboration_change(session_id: str, request: CollaborationChangeRequest):
+    try:
+        return realtime_collaboration_service.apply_change(
+            session_id, request.user_id, request.change_type, request.change_data
+        )
+    except CollabResyncRequired as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ========== Sosyal Özellikler (Temel) ==========
 @router.post("/clubs")
 async def create_club(name: str, description: str, created_by: str, is_public: bool = True):
@@ -3,8 +3,8 @@ import uuid
 from datetime import datetime
 from typing import List, Optional, Union
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -12,135 +12,87 @@ from app.core.auth_dependencies import get_current_user
 from app.core.cache import cache
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.job_progress import job_progress
 from app.core.rate_limiter import limiter
+from app.core.service_registry import lazy_service
+from app.core.story_stream import format_sse, story_stream_hub
 from app.models import JobStatus, JobType
 from app.repositories.job_repository import JobRepository
-from app.services.advanced_analytics_service import AdvancedAnalyticsService
-from app.services.advanced_export_service import AdvancedExportService
-from app.services.advanced_translation_service import AdvancedTranslationService
-from app.services.ai_chatbot_service import AIChatbotService
-from app.services.analytics_service import AnalyticsService
-from app.services.api_webhook_service import APIWebhookService
-from app.services.ar_vr_service import ARVRService
-from app.services.audio_recording_service import AudioRecordingService
-from app.services.backup_sync_service import BackupSyncService
-from app.services.character_service import CharacterService
-from app.services.collaboration_service import CollaborationService
-from app.services.collection_service import CollectionService
-from app.services.comment_service import CommentService
-from app.services.community_service import CommunityService
-from app.services.content_moderation_service import ContentModerationService
-from app.services.curated_collections_service import CuratedCollectionsService
-from app.services.dialogue_service import DialogueService
-from app.services.ebook_service import EbookService
-from app.services.export_service import ExportService
-from app.services.filter_service import FilterService
-from app.services.geolocation_service import GeolocationService
-from app.services.image_service import ImageService
-from app.services.interactive_story_service import InteractiveStoryService
-from app.services.like_service import LikeService
-from app.services.marketplace_service import MarketplaceService
-from app.services.mood_recommendation_service import MoodRecommendationService
-from app.services.multi_image_service import MultiImageService
-from app.services.music_service import MusicService
-from app.services.offline_service import OfflineService
-from app.services.parental_control_service import ParentalControlService
-from app.services.performance_metrics_service import PerformanceMetricsService
-from app.services.plagiarism_service import PlagiarismService
-from app.services.platform_integration_service import PlatformIntegrationService
-from app.services.reading_goals_service import ReadingGoalsService
-from app.services.realtime_collaboration_service import RealtimeCollaborationService
-from app.services.recommendation_service import RecommendationService
-from app.services.reporting_service import ReportingService
+from app.services.image_derivatives import get_image_derivative_store
 from app.services.search_service import SearchService
-from app.services.sharing_service import SharingService
-from app.services.social_features_service import SocialFeaturesService
-from app.services.sound_effect_service import SoundEffectService
-from app.services.statistics_service import StatisticsService
-from app.services.story_analysis_service import StoryAnalysisService
-from app.services.story_comparison_service import StoryComparisonService
-from app.services.story_editor import StoryEditor
-from app.services.story_improvement_service import StoryImprovementService
-from app.services.story_outline_service import StoryOutlineService
-from app.services.story_rating_service import StoryRatingService
-from app.services.story_series_service import StorySeriesService
-from app.services.story_service import StoryService
-from app.services.story_storage import StoryStorage
-from app.services.story_versioning_service import StoryVersioningService
-from app.services.template_marketplace_service import TemplateMarketplaceService
-from app.services.template_service import TemplateService
-from app.services.timeline_service import TimelineService
-from app.services.translation_service import TranslationService
-from app.services.tts_service import TTSService
-from app.services.user_profile_service import UserProfileService
-from app.services.voice_acting_service import VoiceActingService
-from app.services.voice_command_service import VoiceCommandService
-from app.services.voice_story_creation_service import VoiceStoryCreationService
+from app.services.story_stream_service import StoryStreamService
 from app.tasks.story_tasks import generate_full_story_task
 
 router = APIRouter()
-story_service = StoryService()
-image_service = ImageService()
-tts_service = TTSService()
-story_storage = StoryStorage()
-story_editor = StoryEditor()
-multi_image_service = MultiImageService()
-statistics_service = StatisticsService()
-template_service = TemplateService()
-collection_service = CollectionService()
-export_service = ExportService()
-interactive_story_service = InteractiveStoryService()
-translation_service = TranslationService()
-user_profile_service = UserProfileService()
-dialogue_service = DialogueService()
-character_service = CharacterService()
-story_outline_service = StoryOutlineService()
-comment_service = CommentService()
-like_service = LikeService()
-collaboration_service = CollaborationService()
-voice_acting_service = VoiceActingService()
-sound_effect_service = SoundEffectService()
-story_versioning_service = StoryVersioningService()
-story_analysis_service = StoryAnalysisService()
-recommendation_service = RecommendationService()
-music_service = MusicService()
-story_comparison_service = StoryComparisonService()
-community_service = CommunityService()
+story_service = lazy_service("app.services.story_service:StoryService")
+image_service = lazy_service("app.services.image_service:ImageService")
+tts_service = lazy_service("app.services.tts_service:TTSService")
+story_storage = lazy_service("app.services.story_storage:StoryStorage")
+story_editor = lazy_service("app.services.story_editor:StoryEditor")
+multi_image_service = lazy_service("app.services.multi_image_service:MultiImageService")
+statistics_service = lazy_service("app.services.statistics_service:StatisticsService")
+template_service = lazy_service("app.services.template_service:TemplateService")
+collection_service = lazy_service("app.services.collection_service:CollectionService")
+export_service = lazy_service("app.services.export_service:ExportService")
+interactive_story_service = lazy_service("app.services.interactive_story_service:InteractiveStoryService")
+translation_service = lazy_service("app.services.translation_service:TranslationService")
+user_profile_service = lazy_service("app.services.user_profile_service:UserProfileService")
+dialogue_service = lazy_service("app.services.dialogue_service:DialogueService")
+character_service = lazy_service("app.services.character_service:CharacterService")
+story_outline_service = lazy_service("app.services.story_outline_service:StoryOutlineService")
+comment_service = lazy_service("app.services.comment_service:CommentService")
+like_service = lazy_service("app.services.like_service:LikeService")
+collaboration_service = lazy_service("app.services.collaboration_service:CollaborationService")
+voice_acting_service = lazy_service("app.services.voice_acting_service:VoiceActingService")
+sound_effect_service = lazy_service("app.services.sound_effect_service:SoundEffectService")
+story_versioning_service = lazy_service("app.services.story_versioning_service:StoryVersioningService")
+story_analysis_service = lazy_service("app.services.story_analysis_service:StoryAnalysisService")
+recommendation_service = lazy_service("app.services.recommendation_service:RecommendationService")
+music_service = lazy_service("app.services.music_service:MusicService")
+story_comparison_service = lazy_service("app.services.story_comparison_service:StoryComparisonService")
+community_service = lazy_service("app.services.community_service:CommunityService")
 # search_service = SearchService() # Requires DB session, instantiated in endpoints
-analytics_service = AnalyticsService()
-story_series_service = StorySeriesService()
-story_improvement_service = StoryImprovementService()
-parental_control_service = ParentalControlService()
-audio_recording_service = AudioRecordingService()
-sharing_service = SharingService()
-ebook_service = EbookService()
-performance_metrics_service = PerformanceMetricsService()
-ai_chatbot_service = AIChatbotService()
-advanced_translation_service = AdvancedTranslationService()
-voice_command_service = VoiceCommandService()
-marketplace_service = MarketplaceService()
-realtime_collaboration_service = RealtimeCollaborationService()
-advanced_analytics_service = AdvancedAnalyticsService()
-social_features_service = SocialFeaturesService()
+analytics_service = lazy_service("app.services.analytics_service:AnalyticsService")
+story_series_service = lazy_service("app.services.story_series_service:StorySeriesService")
+story_improvement_service = lazy_service("app.services.story_improvement_service:StoryImprovementService")
+parental_control_service = lazy_service("app.services.parental_control_service:ParentalControlService")
+audio_recording_service = lazy_service("app.services.audio_recording_service:AudioRecordingService")
+sharing_service = lazy_service("app.services.sharing_service:SharingService")
+ebook_service = lazy_service("app.services.ebook_service:EbookService")
+performance_metrics_service = lazy_service("app.services.performance_metrics_service:PerformanceMetricsService")
+ai_chatbot_service = lazy_service("app.services.ai_chatbot_service:AIChatbotService")
+advanced_translation_service = lazy_service("app.services.advanced_translation_service:AdvancedTranslationService")
+voice_command_service = lazy_service("app.services.voice_command_service:VoiceCommandService")
+marketplace_service = lazy_service("app.services.marketplace_service:MarketplaceService")
+realtime_collaboration_service = lazy_service("app.services.realtime_collaboration_service:RealtimeCollaborationService")
+advanced_analytics_service = lazy_service("app.services.advanced_analytics_service:AdvancedAnalyticsService")
+social_features_service = lazy_service("app.services.social_features_service:SocialFeaturesService")
 # story_scheduler_service = StorySchedulerService() # Requires DB session
-content_moderation_service = ContentModerationService()
-plagiarism_service = PlagiarismService()
-story_rating_service = StoryRatingService()
-curated_collections_service = CuratedCollectionsService()
-reading_goals_service = ReadingGoalsService()
-mood_recommendation_service = MoodRecommendationService()
-advanced_export_service = AdvancedExportService()
-platform_integration_service = PlatformIntegrationService()
-api_webhook_service = APIWebhookService()
-template_marketplace_service = TemplateMarketplaceService()
-voice_story_creation_service = VoiceStoryCreationService()
-ar_vr_service = ARVRService()
-timeline_service = TimelineService()
-geolocation_service = GeolocationService()
-backup_sync_service = BackupSyncService()
-filter_service = FilterService()
-reporting_service = ReportingService()
-offline_service = OfflineService()
+content_moderation_service = lazy_service("app.services.content_moderation_service:ContentModerationService")
+plagiarism_service = lazy_service("app.services.plagiarism_service:PlagiarismService")
+story_rating_service = lazy_service("app.services.story_rating_service:StoryRatingService")
+curated_collections_service = lazy_service("app.services.curated_collections_service:CuratedCollectionsService")
+reading_goals_service = lazy_service("app.services.reading_goals_service:ReadingGoalsService")
+mood_recommendation_service = lazy_service("app.services.mood_recommendation_service:MoodRecommendationService")
+advanced_export_service = lazy_service("app.services.advanced_export_service:AdvancedExportService")
+platform_integration_service = lazy_service("app.services.platform_integration_service:PlatformIntegrationService")
+api_webhook_service = lazy_service("app.services.api_webhook_service:APIWebhookService")
+template_marketplace_service = lazy_service("app.services.template_marketplace_service:TemplateMarketplaceService")
+voice_story_creation_service = lazy_service("app.services.voice_story_creation_service:VoiceStoryCreationService")
+ar_vr_service = lazy_service("app.services.ar_vr_service:ARVRService")
+timeline_service = lazy_service("app.services.timeline_service:TimelineService")
+geolocation_service = lazy_service("app.services.geolocation_service:GeolocationService")
+backup_sync_service = lazy_service("app.services.backup_sync_service:BackupSyncService")
+filter_service = lazy_service("app.services.filter_service:FilterService")
+reporting_service = lazy_service("app.services.reporting_service:ReportingService")
+offline_service = lazy_service("app.services.offline_service:OfflineService")
+story_stream_service = StoryStreamService(
+    story_service=story_service,
+    image_service=image_service,
+    tts_service=tts_service,
+    story_storage=story_storage,
+    user_profile_service=user_profile_service,
+)
 
 
 class StoryRequest(BaseModel):
@@ -187,6 +139,12 @@ class StoryResponse(BaseModel):
     level_message: Optional[str] = None
 
 
+class StoryStreamResponse(BaseModel):
+    stream_id: str
+    room: str  # Socket.IO room (join with "join_story_stream")
+    sse_url: str  # EventSource fallback
+
+
 class StoryListItem(BaseModel):
     story_id: str
     theme: str
@@ -195,6 +153,9 @@ class StoryListItem(BaseModel):
     created_at: str
     story_type: str
     is_favorite: bool
+    # Kartlar için küçük boyutlar (HTML srcset biçiminde); türevi olmayan görsellerde None
+    image_srcset: Optional[str] = None
+    image_srcset_avif: Optional[str] = None
 
 
 @router.post("/generate-story", response_model=Union[StoryResponse, JobResponse])
@@ -213,7 +174,7 @@ async def generate_story(
     try:
         user_id = current_user.get("id")
 
-        if request.use_async:
+        if story_request.use_async:
             # --- ASYNC JOB FLOW ---
             job_repo = JobRepository(db)
 
@@ -319,36 +280,109 @@ async def generate_story(
 def get_job_status(job_id: str, db: Session = Depends(get_db)):
     """
     Job durumunu sorgular. Job tamamlanmışsa sonucu döndürür.
+    Çalışan/yeni biten işlerin durumu önbellekten (job progress bus) okunur;
+    önbellekte yoksa veritabanına gidilir.
     """
     try:
+        job_uuid = uuid.UUID(job_id)
+        state = job_progress.state(job_id)
+        if state is not None:
+            return _job_status_response(
+                job_id, state["status"], state.get("message"), state.get("percent"),
+                state.get("result_data"), state.get("completed_at")
+            )
+
         job_repo = JobRepository(db)
-        job = job_repo.get_job_by_id(uuid.UUID(job_id))
+        job = job_repo.get_job_by_id(job_uuid)
 
         if not job:
             raise HTTPException(status_code=404, detail="İşlem bulunamadı")
 
-        if job.status == JobStatus.SUCCEEDED:
-            # Sonuç verisini döndür
-            result = job.result_data
-            return StoryResponse(
-                story_id=result.get("story_id"),
-                story_text="Hikaye tamamlandı", # Detaylı veriyi story endpointinden çekmek gerekebilir
-                image_url=result.get("image_url"),
-                audio_url=result.get("audio_url"),
-                created_at=str(job.completed_at),
-                is_favorite=False
-            )
-
-        return JobResponse(
-            job_id=str(job.id),
-            status=job.status,
-            message=f"{job.current_step} (%{job.progress_percent})",
-            position=0
+        return _job_status_response(
+            str(job.id), job.status, job.current_step, job.progress_percent,
+            job.result_data, str(job.completed_at)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _job_status_response(job_id, status, step, percent, result, completed_at):
+    if status == JobStatus.SUCCEEDED:
+        # Sonuç verisini döndür
+        return StoryResponse(
+            story_id=result.get("story_id"),
+            story_text="Hikaye tamamlandı", # Detaylı veriyi story endpointinden çekmek gerekebilir
+            image_url=result.get("image_url"),
+            audio_url=result.get("audio_url"),
+            created_at=completed_at,
+            is_favorite=False
+        )
+
+    return JobResponse(
+        job_id=job_id,
+        status=status,
+        message=f"{step} (%{percent})",
+        position=0
+    )
+
+
+@router.post("/generate-story/stream", response_model=StoryStreamResponse)
+@limiter.limit("5/minute")
+async def generate_story_stream(
+    request: Request, # Required for limiter
+    story_request: StoryRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Hikâyeyi akış (streaming) modunda üretir. Metin parçaları üretildikçe
+    Socket.IO odasına (``room``) gönderilir; Socket.IO kullanılamıyorsa
+    ``sse_url`` EventSource ile dinlenebilir. Görsel ve ses metin bittikten
+    sonra paralel üretilir.
+    """
+    stream = story_stream_service.start(
+        story_request.dict(exclude={"use_async"}),
+        user_id=current_user.get("id")
+    )
+    return StoryStreamResponse(
+        stream_id=stream.stream_id,
+        room=stream.stream_id,
+        sse_url=request.url_for("stream_story_events", stream_id=stream.stream_id).path
+    )
+
+
+@router.get("/stories/stream/{stream_id}", name="stream_story_events")
+async def stream_story_events(
+    stream_id: str,
+    last_event_id: Optional[int] = Query(None, ge=-1),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Akış olaylarını Server-Sent Events olarak verir (Socket.IO yedeği).
+    Yeniden bağlanan istemci ``Last-Event-ID`` ile kaldığı yerden devam eder.
+    Stream id tahmin edilemez (uuid4) olduğundan EventSource başlık
+    gönderemese de akışa yalnızca başlatan istemci erişebilir.
+    """
+    stream = story_stream_hub.get(stream_id)
+    if not stream:
+        raise HTTPException(status_code=404, detail="Akış bulunamadı")
+
+    last_seq = last_event_id if last_event_id is not None else -1
+    if last_event_id_header and last_event_id_header.lstrip("-").isdigit():
+        last_seq = int(last_event_id_header)
+
+    async def event_source():
+        async for event in stream.subscribe(last_seq):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/stories", response_model=List[StoryListItem])
 @cache(expire_seconds=60)
 async def get_stories(
@@ -356,10 +390,11 @@ async def get_stories(
     favorite_only: bool = Query(False),
     search: Optional[str] = Query(None),
     story_type: Optional[str] = Query(None),
-    sort_by: str = Query("date_desc")
+    sort_by: Optional[str] = Query(None)
 ):
     """
     Tüm hikâyeleri listeler (arama ve filtreleme ile).
+    Arama varken varsayılan sıralama alaka düzeyidir (BM25).
     """
     try:
         stories = story_storage.get_all_stories(
@@ -369,11 +404,46 @@ async def get_stories(
             story_type=story_type,
             sort_by=sort_by
         )
-        return stories
+        derivatives = get_image_derivative_store()
+        return [{**story, **derivatives.srcsets_for_url(story.get("image_url"))} for story in stories]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Hikâyeler yüklenirken hata oluştu: {str(e)}")
 
 
+@router.get("/stories/public")
+async def get_public_stories(skip: int = 0, limit: int = 20, q: Optional[str] = None):
+    """
+    Herkese açık hikâyeleri getirir. `q` verilirse alaka düzeyine göre arar.
+    """
+    try:
+        # En yeni önce (is_public indeksinden) ya da arama skoruna göre
+        public_stories = story_storage.get_all_stories(public_only=True, search_query=q)
+        return {"stories": public_stories[skip:skip+limit], "total": len(public_stories)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Public hikâyeler yüklenirken hata oluştu: {str(e)}")
+
+
+@router.get("/stories/trending")
+async def get_trending_stories(limit: int = 10, q: Optional[str] = None):
+    """
+    Trend hikâyeleri getirir (beğeni sayısına göre). `q` ile arama sonuçlarıyla sınırlanır.
+    """
+    try:
+        public_stories = story_storage.get_all_stories(public_only=True, search_query=q)
+
+        # Her hikâye için beğeni sayısını al
+        for story in public_stories:
+            likes_data = like_service.get_story_likes(story.get('story_id'))
+            story['like_count'] = likes_data.get('like_count', 0)
+
+        # Beğeni sayısına göre sırala
+        public_stories.sort(key=lambda x: x.get('like_count', 0), reverse=True)
+
+        return {"stories": public_stories[:limit]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Trend hikâyeler yüklenirken hata oluştu: {str(e)}")
+
+
 @router.get("/stories/{story_id}", response_model=StoryResponse)
 @cache(expire_seconds=300)
 async def get_story(story_id: str):
@@ -604,7 +674,7 @@ async def export_story_to_pdf(story_id: str):
             raise HTTPException(status_code=404, detail="Hikâye bulunamadı")
 
         pdf_path = await export_service.export_to_pdf(story)
-        full_path = f"{settings.STORAGE_PATH}{pdf_path}"
+        full_path = os.path.join(settings.STORAGE_PATH, pdf_path.removeprefix("/storage/"))
 
         if not os.path.exists(full_path):
             raise HTTPException(status_code=500, detail="PDF oluşturulamadı")
@@ -631,7 +701,7 @@ async def export_story_to_epub(story_id: str):
             raise HTTPException(status_code=404, detail="Hikâye bulunamadı")
 
         epub_path = await export_service.export_to_epub(story)
-        full_path = f"{settings.STORAGE_PATH}{epub_path}"
+        full_path = os.path.join(settings.STORAGE_PATH, epub_path.removeprefix("/storage/"))
 
         if not os.path.exists(full_path):
             raise HTTPException(status_code=500, detail="EPUB oluşturulamadı")
@@ -804,18 +874,22 @@ async def update_user_preferences(request: PreferencesRequest):
 
 
 @router.get("/stories/search/semantic", response_model=List[StoryListItem])
-def search_stories_semantic(
+async def search_stories_semantic(
     q: str,
-    limit: int = 5,
+    limit: int = Query(5, ge=1, le=50),
+    language: Optional[str] = None,
+    story_type: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Semantic search for stories using vector embeddings (OpenAI & pgvector).
+    Semantic search for stories using Gemini embeddings (pgvector or the
+    in-process vector index), optionally filtered by language / story_type.
     """
     service = SearchService(db)
-    results = service.search_stories(q, limit)
+    results = await service.asearch_stories(q, limit, language=language, story_type=story_type)
 
     # Convert to StoryListItem
+    derivatives = get_image_derivative_store()
     return [
         StoryListItem(
             story_id=str(story.id),
@@ -824,7 +898,8 @@ def search_stories_semantic(
             image_url=story.image_url or "",
             created_at=str(story.created_at),
             story_type=story.story_type,
-            is_favorite=story.is_favorite
+            is_favorite=story.is_favorite,
+            **derivatives.srcsets_for_url(story.image_url)
         ) for story in results
     ]
 
@@ -1353,43 +1428,6 @@ async def set_story_visibility(story_id: str, is_public: bool = Query(...)):
         raise HTTPException(status_code=500, detail=f"Görünürlük güncellenirken hata oluştu: {str(e)}")
 
 
-@router.get("/stories/public")
-async def get_public_stories(skip: int = 0, limit: int = 20):
-    """
-    Herkese açık hikâyeleri getirir.
-    """
-    try:
-        all_stories = story_storage.get_all_stories()
-        public_stories = [s for s in all_stories if s.get('is_public', False)]
-        # En yeni önce
-        public_stories.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return {"stories": public_stories[skip:skip+limit], "total": len(public_stories)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Public hikâyeler yüklenirken hata oluştu: {str(e)}")
-
-
-@router.get("/stories/trending")
-async def get_trending_stories(limit: int = 10):
-    """
-    Trend hikâyeleri getirir (beğeni sayısına göre).
-    """
-    try:
-        all_stories = story_storage.get_all_stories()
-        public_stories = [s for s in all_stories if s.get('is_public', False)]
-
-        # Her hikâye için beğeni sayısını al
-        for story in public_stories:
-            likes_data = like_service.get_story_likes(story.get('story_id'))
-            story['like_count'] = likes_data.get('like_count', 0)
-
-        # Beğeni sayısına göre sırala
-        public_stories.sort(key=lambda x: x.get('like_count', 0), reverse=True)
-
-        return {"stories": public_stories[:limit]}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Trend hikâyeler yüklenirken hata oluştu: {str(e)}")
-
-
 class AddCollaboratorRequest(BaseModel):
     user_id: str
     role: str = "writer"
@@ -2391,7 +2429,7 @@ async def export_story_epub(story_id: str, title: Optional[str] = None, author:
     Hikâyeyi EPUB formatında oluşturur.
     """
     try:
-        ebook = ebook_service.create_epub(story_id, title, author)
+        ebook = await ebook_service.create_epub(story_id, title, author)
         return ebook
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -2405,7 +2443,7 @@ async def export_story_mobi(story_id: str, title: Optional[str] = None, author:
     Hikâyeyi MOBI formatında oluşturur.
     """
     try:
-        ebook = ebook_service.create_mobi(story_id, title, author)
+        ebook = await ebook_service.create_mobi(story_id, title, author)
         return ebook
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -2425,7 +2463,7 @@ async def export_collection_epub(request: CreateCollectionEbookRequest):
     Birden fazla hikâyeyi bir e-kitap olarak birleştirir.
     """
     try:
-        ebook = ebook_service.create_collection_ebook(
+        ebook = await ebook_service.create_collection_ebook(
             request.story_ids,
             request.collection_title,
             request.author
@@ -2,251 +2,131 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
 
-# Services Imports
-from app.services.story_character_depth_service import StoryCharacterDepthService
-from app.services.story_world_detail_service import StoryWorldDetailService
-from app.services.story_plot_complexity_service import StoryPlotComplexityService
-from app.services.story_dialogue_realism_service import StoryDialogueRealismService
-from app.services.story_setting_richness_service import StorySettingRichnessService
-from app.services.story_atmosphere_creator_service import StoryAtmosphereCreatorService
-from app.services.story_mood_setter_service import StoryMoodSetterService
-from app.services.story_tone_consistency_service import StoryToneConsistencyService
-from app.services.story_pace_variation_service import StoryPaceVariationService
-from app.services.story_rhythm_flow_service import StoryRhythmFlowService
-from app.services.story_readability_analyzer_service import StoryReadabilityAnalyzerService
-from app.services.story_complexity_analyzer_service import StoryComplexityAnalyzerService
-from app.services.story_engagement_analyzer_service import StoryEngagementAnalyzerService
-from app.services.story_emotional_impact_service import StoryEmotionalImpactService
-from app.services.story_character_consistency_service import StoryCharacterConsistencyService
-from app.services.story_plot_hole_detector_service import StoryPlotHoleDetectorService
-from app.services.story_timeline_analyzer_service import StoryTimelineAnalyzerService
-from app.services.story_theme_strength_service import StoryThemeStrengthService
-from app.services.story_symbol_analyzer_service import StorySymbolAnalyzerService
-from app.services.story_metaphor_analyzer_service import StoryMetaphorAnalyzerService
-from app.services.story_age_adaptation_service import StoryAgeAdaptationService
-from app.services.story_culture_adaptation_service import StoryCultureAdaptationService
-from app.services.story_length_adapter_service import StoryLengthAdapterService
-from app.services.story_style_adapter_service import StoryStyleAdapterService
-from app.services.story_genre_converter_service import StoryGenreConverterService
-from app.services.story_format_converter_service import StoryFormatConverterService
-from app.services.story_medium_adapter_service import StoryMediumAdapterService
-from app.services.story_audience_adapter_service import StoryAudienceAdapterService
-from app.services.story_language_level_service import StoryLanguageLevelService
-from app.services.story_complexity_adapter_service import StoryComplexityAdapterService
-from app.services.story_flow_optimizer_service import StoryFlowOptimizerService
-from app.services.story_structure_optimizer_service import StoryStructureOptimizerService
-from app.services.story_balance_optimizer_service import StoryBalanceOptimizerService
-from app.services.story_clarity_optimizer_service import StoryClarityOptimizerService
-from app.services.story_impact_optimizer_service import StoryImpactOptimizerService
-from app.services.story_engagement_optimizer_service import StoryEngagementOptimizerService
-from app.services.story_retention_optimizer_service import StoryRetentionOptimizerService
-from app.services.story_comprehension_optimizer_service import StoryComprehensionOptimizerService
-from app.services.story_memory_optimizer_service import StoryMemoryOptimizerService
-from app.services.story_learning_optimizer_service import StoryLearningOptimizerService
-from app.services.story_twist_creator_service import StoryTwistCreatorService
-from app.services.story_surprise_adder_service import StorySurpriseAdderService
-from app.services.story_revelation_creator_service import StoryRevelationCreatorService
-from app.services.story_irony_adder_service import StoryIronyAdderService
-from app.services.story_paradox_creator_service import StoryParadoxCreatorService
-from app.services.story_contrast_enhancer_service import StoryContrastEnhancerService
-from app.services.story_parallel_creator_service import StoryParallelCreatorService
-from app.services.story_mirror_creator_service import StoryMirrorCreatorService
-from app.services.story_echo_creator_service import StoryEchoCreatorService
-from app.services.story_callback_creator_service import StoryCallbackCreatorService
-from app.services.story_sentence_variety_service import StorySentenceVarietyService
-from app.services.story_word_choice_optimizer_service import StoryWordChoiceOptimizerService
-from app.services.story_paragraph_structure_service import StoryParagraphStructureService
-from app.services.story_chapter_structure_service import StoryChapterStructureService
-from app.services.story_transition_smoother_service import StoryTransitionSmootherService
-from app.services.story_connection_enhancer_service import StoryConnectionEnhancerService
-from app.services.story_coherence_enhancer_service import StoryCoherenceEnhancerService
-from app.services.story_consistency_checker_service import StoryConsistencyCheckerService
-from app.services.story_continuity_checker_service import StoryContinuityCheckerService
-from app.services.story_accuracy_checker_service import StoryAccuracyCheckerService
-from app.services.story_empathy_builder_service import StoryEmpathyBuilderService
-from app.services.story_connection_builder_service import StoryConnectionBuilderService
-from app.services.story_identification_enhancer_service import StoryIdentificationEnhancerService
-from app.services.story_catharsis_creator_service import StoryCatharsisCreatorService
-from app.services.story_healing_enhancer_service import StoryHealingEnhancerService
-from app.services.story_comfort_provider_service import StoryComfortProviderService
-from app.services.story_inspiration_enhancer_service import StoryInspirationEnhancerService
-from app.services.story_motivation_enhancer_service import StoryMotivationEnhancerService
-from app.services.story_confidence_builder_service import StoryConfidenceBuilderService
-from app.services.story_hope_enhancer_service import StoryHopeEnhancerService
-from app.services.story_lesson_enhancer_service import StoryLessonEnhancerService
-from app.services.story_value_embedder_service import StoryValueEmbedderService
-from app.services.story_principle_teacher_service import StoryPrincipleTeacherService
-from app.services.story_skill_builder_service import StorySkillBuilderService
-from app.services.story_knowledge_embedder_service import StoryKnowledgeEmbedderService
-from app.services.story_wisdom_sharer_service import StoryWisdomSharerService
-from app.services.story_understanding_builder_service import StoryUnderstandingBuilderService
-from app.services.story_awareness_enhancer_service import StoryAwarenessEnhancerService
-from app.services.story_perspective_broadener_service import StoryPerspectiveBroadenerService
-from app.services.story_critical_thinking_service import StoryCriticalThinkingService
-from app.services.story_interactivity_enhancer_service import StoryInteractivityEnhancerService
-from app.services.story_participation_creator_service import StoryParticipationCreatorService
-from app.services.story_engagement_builder_service import StoryEngagementBuilderService
-from app.services.story_interest_maintainer_service import StoryInterestMaintainerService
-from app.services.story_curiosity_sparker_service import StoryCuriositySparkerService
-from app.services.story_wonder_creator_service import StoryWonderCreatorService
-from app.services.story_amazement_enhancer_service import StoryAmazementEnhancerService
-from app.services.story_joy_enhancer_service import StoryJoyEnhancerService
-from app.services.story_laughter_creator_service import StoryLaughterCreatorService
-from app.services.story_playfulness_adder_service import StoryPlayfulnessAdderService
-from app.services.story_arc_builder_service import StoryArcBuilderService
-from app.services.story_three_act_structure_service import StoryThreeActStructureService
-from app.services.story_hero_journey_service import StoryHeroJourneyService
-from app.services.story_quest_builder_service import StoryQuestBuilderService
-from app.services.story_mission_creator_service import StoryMissionCreatorService
-from app.services.story_goal_setter_service import StoryGoalSetterService
-from app.services.story_obstacle_creator_service import StoryObstacleCreatorService
-from app.services.story_challenge_builder_service import StoryChallengeBuilderService
-from app.services.story_test_creator_service import StoryTestCreatorService
-from app.services.story_trial_builder_service import StoryTrialBuilderService
-from app.services.story_character_arc_service import StoryCharacterArcService
-from app.services.story_character_growth_service import StoryCharacterGrowthService
-from app.services.story_character_change_service import StoryCharacterChangeService
-from app.services.story_character_motivation_service import StoryCharacterMotivationService
-from app.services.story_character_backstory_service import StoryCharacterBackstoryService
-from app.services.story_character_relationship_service import StoryCharacterRelationshipService
-from app.services.story_character_dynamic_service import StoryCharacterDynamicService
-from app.services.story_character_voice_service import StoryCharacterVoiceService
-from app.services.story_character_quirk_service import StoryCharacterQuirkService
-from app.services.story_character_flaw_service import StoryCharacterFlawService
-from app.services.story_world_rules_service import StoryWorldRulesService
-from app.services.story_world_history_service import StoryWorldHistoryService
-from app.services.story_world_geography_service import StoryWorldGeographyService
-from app.services.story_world_culture_service import StoryWorldCultureService
-from app.services.story_world_magic_service import StoryWorldMagicService
-from app.services.story_world_technology_service import StoryWorldTechnologyService
-from app.services.story_world_society_service import StoryWorldSocietyService
-from app.services.story_world_economy_service import StoryWorldEconomyService
-from app.services.story_world_politics_service import StoryWorldPoliticsService
-from app.services.story_world_religion_service import StoryWorldReligionService
+from app.core.service_registry import lazy_service
 
 router = APIRouter()
 
-# Service Instantiation
-story_character_depth_service = StoryCharacterDepthService()
-story_world_detail_service = StoryWorldDetailService()
-story_plot_complexity_service = StoryPlotComplexityService()
-story_dialogue_realism_service = StoryDialogueRealismService()
-story_setting_richness_service = StorySettingRichnessService()
-story_atmosphere_creator_service = StoryAtmosphereCreatorService()
-story_mood_setter_service = StoryMoodSetterService()
-story_tone_consistency_service = StoryToneConsistencyService()
-story_pace_variation_service = StoryPaceVariationService()
-story_rhythm_flow_service = StoryRhythmFlowService()
-story_readability_analyzer_service = StoryReadabilityAnalyzerService()
-story_complexity_analyzer_service = StoryComplexityAnalyzerService()
-story_engagement_analyzer_service = StoryEngagementAnalyzerService()
-story_emotional_impact_service = StoryEmotionalImpactService()
-story_character_consistency_service = StoryCharacterConsistencyService()
-story_plot_hole_detector_service = StoryPlotHoleDetectorService()
-story_timeline_analyzer_service = StoryTimelineAnalyzerService()
-story_theme_strength_service = StoryThemeStrengthService()
-story_symbol_analyzer_service = StorySymbolAnalyzerService()
-story_metaphor_analyzer_service = StoryMetaphorAnalyzerService()
-story_age_adaptation_service = StoryAgeAdaptationService()
-story_culture_adaptation_service = StoryCultureAdaptationService()
-story_length_adapter_service = StoryLengthAdapterService()
-story_style_adapter_service = StoryStyleAdapterService()
-story_genre_converter_service = StoryGenreConverterService()
-story_format_converter_service = StoryFormatConverterService()
-story_medium_adapter_service = StoryMediumAdapterService()
-story_audience_adapter_service = StoryAudienceAdapterService()
-story_language_level_service = StoryLanguageLevelService()
-story_complexity_adapter_service = StoryComplexityAdapterService()
-story_flow_optimizer_service = StoryFlowOptimizerService()
-story_structure_optimizer_service = StoryStructureOptimizerService()
-story_balance_optimizer_service = StoryBalanceOptimizerService()
-story_clarity_optimizer_service = StoryClarityOptimizerService()
-story_impact_optimizer_service = StoryImpactOptimizerService()
-story_engagement_optimizer_service = StoryEngagementOptimizerService()
-story_retention_optimizer_service = StoryRetentionOptimizerService()
-story_comprehension_optimizer_service = StoryComprehensionOptimizerService()
-story_memory_optimizer_service = StoryMemoryOptimizerService()
-story_learning_optimizer_service = StoryLearningOptimizerService()
-story_twist_creator_service = StoryTwistCreatorService()
-story_surprise_adder_service = StorySurpriseAdderService()
-story_revelation_creator_service = StoryRevelationCreatorService()
-story_irony_adder_service = StoryIronyAdderService()
-story_paradox_creator_service = StoryParadoxCreatorService()
-story_contrast_enhancer_service = StoryContrastEnhancerService()
-story_parallel_creator_service = StoryParallelCreatorService()
-story_mirror_creator_service = StoryMirrorCreatorService()
-story_echo_creator_service = StoryEchoCreatorService()
-story_callback_creator_service = StoryCallbackCreatorService()
-story_sentence_variety_service = StorySentenceVarietyService()
-story_word_choice_optimizer_service = StoryWordChoiceOptimizerService()
-story_paragraph_structure_service = StoryParagraphStructureService()
-story_chapter_structure_service = StoryChapterStructureService()
-story_transition_smoother_service = StoryTransitionSmootherService()
-story_connection_enhancer_service = StoryConnectionEnhancerService()
-story_coherence_enhancer_service = StoryCoherenceEnhancerService()
-story_consistency_checker_service = StoryConsistencyCheckerService()
-story_continuity_checker_service = StoryContinuityCheckerService()
-story_accuracy_checker_service = StoryAccuracyCheckerService()
-story_empathy_builder_service = StoryEmpathyBuilderService()
-story_connection_builder_service = StoryConnectionBuilderService()
-story_identification_enhancer_service = StoryIdentificationEnhancerService()
-story_catharsis_creator_service = StoryCatharsisCreatorService()
-story_healing_enhancer_service = StoryHealingEnhancerService()
-story_comfort_provider_service = StoryComfortProviderService()
-story_inspiration_enhancer_service = StoryInspirationEnhancerService()
-story_motivation_enhancer_service = StoryMotivationEnhancerService()
-story_confidence_builder_service = StoryConfidenceBuilderService()
-story_hope_enhancer_service = StoryHopeEnhancerService()
-story_lesson_enhancer_service = StoryLessonEnhancerService()
-story_value_embedder_service = StoryValueEmbedderService()
-story_principle_teacher_service = StoryPrincipleTeacherService()
-story_skill_builder_service = StorySkillBuilderService()
-story_knowledge_embedder_service = StoryKnowledgeEmbedderService()
-story_wisdom_sharer_service = StoryWisdomSharerService()
-story_understanding_builder_service = StoryUnderstandingBuilderService()
-story_awareness_enhancer_service = StoryAwarenessEnhancerService()
-story_perspective_broadener_service = StoryPerspectiveBroadenerService()
-story_critical_thinking_service = StoryCriticalThinkingService()
-story_interactivity_enhancer_service = StoryInteractivityEnhancerService()
-story_participation_creator_service = StoryParticipationCreatorService()
-story_engagement_builder_service = StoryEngagementBuilderService()
-story_interest_maintainer_service = StoryInterestMaintainerService()
-story_curiosity_sparker_service = StoryCuriositySparkerService()
-story_wonder_creator_service = StoryWonderCreatorService()
-story_amazement_enhancer_service = StoryAmazementEnhancerService()
-story_joy_enhancer_service = StoryJoyEnhancerService()
-story_laughter_creator_service = StoryLaughterCreatorService()
-story_playfulness_adder_service = StoryPlayfulnessAdderService()
-story_arc_builder_service = StoryArcBuilderService()
-story_three_act_structure_service = StoryThreeActStructureService()
-story_hero_journey_service = StoryHeroJourneyService()
-story_quest_builder_service = StoryQuestBuilderService()
-story_mission_creator_service = StoryMissionCreatorService()
-story_goal_setter_service = StoryGoalSetterService()
-story_obstacle_creator_service = StoryObstacleCreatorService()
-story_challenge_builder_service = StoryChallengeBuilderService()
-story_test_creator_service = StoryTestCreatorService()
-story_trial_builder_service = StoryTrialBuilderService()
-story_character_arc_service = StoryCharacterArcService()
-story_character_growth_service = StoryCharacterGrowthService()
-story_character_change_service = StoryCharacterChangeService()
-story_character_motivation_service = StoryCharacterMotivationService()
-story_character_backstory_service = StoryCharacterBackstoryService()
-story_character_relationship_service = StoryCharacterRelationshipService()
-story_character_dynamic_service = StoryCharacterDynamicService()
-story_character_voice_service = StoryCharacterVoiceService()
-story_character_quirk_service = StoryCharacterQuirkService()
-story_character_flaw_service = StoryCharacterFlawService()
-story_world_rules_service = StoryWorldRulesService()
-story_world_history_service = StoryWorldHistoryService()
-story_world_geography_service = StoryWorldGeographyService()
-story_world_culture_service = StoryWorldCultureService()
-story_world_magic_service = StoryWorldMagicService()
-story_world_technology_service = StoryWorldTechnologyService()
-story_world_society_service = StoryWorldSocietyService()
-story_world_economy_service = StoryWorldEconomyService()
-story_world_politics_service = StoryWorldPoliticsService()
-story_world_religion_service = StoryWorldReligionService()
+# Services are resolved lazily on first request (see app/core/service_registry.py)
+story_character_depth_service = lazy_service("app.services.story_character_depth_service:StoryCharacterDepthService")
+story_world_detail_service = lazy_service("app.services.story_world_detail_service:StoryWorldDetailService")
+story_plot_complexity_service = lazy_service("app.services.story_plot_complexity_service:StoryPlotComplexityService")
+story_dialogue_realism_service = lazy_service("app.services.story_dialogue_realism_service:StoryDialogueRealismService")
+story_setting_richness_service = lazy_service("app.services.story_setting_richness_service:StorySettingRichnessService")
+story_atmosphere_creator_service = lazy_service("app.services.story_atmosphere_creator_service:StoryAtmosphereCreatorService")
+story_mood_setter_service = lazy_service("app.services.story_mood_setter_service:StoryMoodSetterService")
+story_tone_consistency_service = lazy_service("app.services.story_tone_consistency_service:StoryToneConsistencyService")
+story_pace_variation_service = lazy_service("app.services.story_pace_variation_service:StoryPaceVariationService")
+story_rhythm_flow_service = lazy_service("app.services.story_rhythm_flow_service:StoryRhythmFlowService")
+story_readability_analyzer_service = lazy_service("app.services.story_readability_analyzer_service:StoryReadabilityAnalyzerService")
+story_complexity_analyzer_service = lazy_service("app.services.story_complexity_analyzer_service:StoryComplexityAnalyzerService")
+story_engagement_analyzer_service = lazy_service("app.services.story_engagement_analyzer_service:StoryEngagementAnalyzerService")
+story_emotional_impact_service = lazy_service("app.services.story_emotional_impact_service:StoryEmotionalImpactService")
+story_character_consistency_service = lazy_service("app.services.story_character_consistency_service:StoryCharacterConsistencyService")
+story_plot_hole_detector_service = lazy_service("app.services.story_plot_hole_detector_service:StoryPlotHoleDetectorService")
+story_timeline_analyzer_service = lazy_service("app.services.story_timeline_analyzer_service:StoryTimelineAnalyzerService")
+story_theme_strength_service = lazy_service("app.services.story_theme_strength_service:StoryThemeStrengthService")
+story_symbol_analyzer_service = lazy_service("app.services.story_symbol_analyzer_service:StorySymbolAnalyzerService")
+story_metaphor_analyzer_service = lazy_service("app.services.story_metaphor_analyzer_service:StoryMetaphorAnalyzerService")
+story_age_adaptation_service = lazy_service("app.services.story_age_adaptation_service:StoryAgeAdaptationService")
+story_culture_adaptation_service = lazy_service("app.services.story_culture_adaptation_service:StoryCultureAdaptationService")
+story_length_adapter_service = lazy_service("app.services.story_length_adapter_service:StoryLengthAdapterService")
+story_style_adapter_service = lazy_service("app.services.story_style_adapter_service:StoryStyleAdapterService")
+story_genre_converter_service = lazy_service("app.services.story_genre_converter_service:StoryGenreConverterService")
+story_format_converter_service = lazy_service("app.services.story_format_converter_service:StoryFormatConverterService")
+story_medium_adapter_service = lazy_service("app.services.story_medium_adapter_service:StoryMediumAdapterService")
+story_audience_adapter_service = lazy_service("app.services.story_audience_adapter_service:StoryAudienceAdapterService")
+story_language_level_service = lazy_service("app.services.story_language_level_service:StoryLanguageLevelService")
+story_complexity_adapter_service = lazy_service("app.services.story_complexity_adapter_service:StoryComplexityAdapterService")
+story_flow_optimizer_service = lazy_service("app.services.story_flow_optimizer_service:StoryFlowOptimizerService")
+story_structure_optimizer_service = lazy_service("app.services.story_structure_optimizer_service:StoryStructureOptimizerService")
+story_balance_optimizer_service = lazy_service("app.services.story_balance_optimizer_service:StoryBalanceOptimizerService")
+story_clarity_optimizer_service = lazy_service("app.services.story_clarity_optimizer_service:StoryClarityOptimizerService")
+story_impact_optimizer_service = lazy_service("app.services.story_impact_optimizer_service:StoryImpactOptimizerService")
+story_engagement_optimizer_service = lazy_service("app.services.story_engagement_optimizer_service:StoryEngagementOptimizerService")
+story_retention_optimizer_service = lazy_service("app.services.story_retention_optimizer_service:StoryRetentionOptimizerService")
+story_comprehension_optimizer_service = lazy_service("app.services.story_comprehension_optimizer_service:StoryComprehensionOptimizerService")
+story_memory_optimizer_service = lazy_service("app.services.story_memory_optimizer_service:StoryMemoryOptimizerService")
+story_learning_optimizer_service = lazy_service("app.services.story_learning_optimizer_service:StoryLearningOptimizerService")
+story_twist_creator_service = lazy_service("app.services.story_twist_creator_service:StoryTwistCreatorService")
+story_surprise_adder_service = lazy_service("app.services.story_surprise_adder_service:StorySurpriseAdderService")
+story_revelation_creator_service = lazy_service("app.services.story_revelation_creator_service:StoryRevelationCreatorService")
+story_irony_adder_service = lazy_service("app.services.story_irony_adder_service:StoryIronyAdderService")
+story_paradox_creator_service = lazy_service("app.services.story_paradox_creator_service:StoryParadoxCreatorService")
+story_contrast_enhancer_service = lazy_service("app.services.story_contrast_enhancer_service:StoryContrastEnhancerService")
+story_parallel_creator_service = lazy_service("app.services.story_parallel_creator_service:StoryParallelCreatorService")
+story_mirror_creator_service = lazy_service("app.services.story_mirror_creator_service:StoryMirrorCreatorService")
+story_echo_creator_service = lazy_service("app.services.story_echo_creator_service:StoryEchoCreatorService")
+story_callback_creator_service = lazy_service("app.services.story_callback_creator_service:StoryCallbackCreatorService")
+story_sentence_variety_service = lazy_service("app.services.story_sentence_variety_service:StorySentenceVarietyService")
+story_word_choice_optimizer_service = lazy_service("app.services.story_word_choice_optimizer_service:StoryWordChoiceOptimizerService")
+story_paragraph_structure_service = lazy_service("app.services.story_paragraph_structure_service:StoryParagraphStructureService")
+story_chapter_structure_service = lazy_service("app.services.story_chapter_structure_service:StoryChapterStructureService")
+story_transition_smoother_service = lazy_service("app.services.story_transition_smoother_service:StoryTransitionSmootherService")
+story_connection_enhancer_service = lazy_service("app.services.story_connection_enhancer_service:StoryConnectionEnhancerService")
+story_coherence_enhancer_service = lazy_service("app.services.story_coherence_enhancer_service:StoryCoherenceEnhancerService")
+story_consistency_checker_service = lazy_service("app.services.story_consistency_checker_service:StoryConsistencyCheckerService")
+story_continuity_checker_service = lazy_service("app.services.story_continuity_checker_service:StoryContinuityCheckerService")
+story_accuracy_checker_service = lazy_service("app.services.story_accuracy_checker_service:StoryAccuracyCheckerService")
+story_empathy_builder_service = lazy_service("app.services.story_empathy_builder_service:StoryEmpathyBuilderService")
+story_connection_builder_service = lazy_service("app.services.story_connection_builder_service:StoryConnectionBuilderService")
+story_identification_enhancer_service = lazy_service("app.services.story_identification_enhancer_service:StoryIdentificationEnhancerService")
+story_catharsis_creator_service = lazy_service("app.services.story_catharsis_creator_service:StoryCatharsisCreatorService")
+story_healing_enhancer_service = lazy_service("app.services.story_healing_enhancer_service:StoryHealingEnhancerService")
+story_comfort_provider_service = lazy_service("app.services.story_comfort_provider_service:StoryComfortProviderService")
+story_inspiration_enhancer_service = lazy_service("app.services.story_inspiration_enhancer_service:StoryInspirationEnhancerService")
+story_motivation_enhancer_service = lazy_service("app.services.story_motivation_enhancer_service:StoryMotivationEnhancerService")
+story_confidence_builder_service = lazy_service("app.services.story_confidence_builder_service:StoryConfidenceBuilderService")
+story_hope_enhancer_service = lazy_service("app.services.story_hope_enhancer_service:StoryHopeEnhancerService")
+story_lesson_enhancer_service = lazy_service("app.services.story_lesson_enhancer_service:StoryLessonEnhancerService")
+story_value_embedder_service = lazy_service("app.services.story_value_embedder_service:StoryValueEmbedderService")
+story_principle_teacher_service = lazy_service("app.services.story_principle_teacher_service:StoryPrincipleTeacherService")
+story_skill_builder_service = lazy_service("app.services.story_skill_builder_service:StorySkillBuilderService")
+story_knowledge_embedder_service = lazy_service("app.services.story_knowledge_embedder_service:StoryKnowledgeEmbedderService")
+story_wisdom_sharer_service = lazy_service("app.services.story_wisdom_sharer_service:StoryWisdomSharerService")
+story_understanding_builder_service = lazy_service("app.services.story_understanding_builder_service:StoryUnderstandingBuilderService")
+story_awareness_enhancer_service = lazy_service("app.services.story_awareness_enhancer_service:StoryAwarenessEnhancerService")
+story_perspective_broadener_service = lazy_service("app.services.story_perspective_broadener_service:StoryPerspectiveBroadenerService")
+story_critical_thinking_service = lazy_service("app.services.story_critical_thinking_service:StoryCriticalThinkingService")
+story_interactivity_enhancer_service = lazy_service("app.services.story_interactivity_enhancer_service:StoryInteractivityEnhancerService")
+story_participation_creator_service = lazy_service("app.services.story_participation_creator_service:StoryParticipationCreatorService")
+story_engagement_builder_service = lazy_service("app.services.story_engagement_builder_service:StoryEngagementBuilderService")
+story_interest_maintainer_service = lazy_service("app.services.story_interest_maintainer_service:StoryInterestMaintainerService")
+story_curiosity_sparker_service = lazy_service("app.services.story_curiosity_sparker_service:StoryCuriositySparkerService")
+story_wonder_creator_service = lazy_service("app.services.story_wonder_creator_service:StoryWonderCreatorService")
+story_amazement_enhancer_service = lazy_service("app.services.story_amazement_enhancer_service:StoryAmazementEnhancerService")
+story_joy_enhancer_service = lazy_service("app.services.story_joy_enhancer_service:StoryJoyEnhancerService")
+story_laughter_creator_service = lazy_service("app.services.story_laughter_creator_service:StoryLaughterCreatorService")
+story_playfulness_adder_service = lazy_service("app.services.story_playfulness_adder_service:StoryPlayfulnessAdderService")
+story_arc_builder_service = lazy_service("app.services.story_arc_builder_service:StoryArcBuilderService")
+story_three_act_structure_service = lazy_service("app.services.story_three_act_structure_service:StoryThreeActStructureService")
+story_hero_journey_service = lazy_service("app.services.story_hero_journey_service:StoryHeroJourneyService")
+story_quest_builder_service = lazy_service("app.services.story_quest_builder_service:StoryQuestBuilderService")
+story_mission_creator_service = lazy_service("app.services.story_mission_creator_service:StoryMissionCreatorService")
+story_goal_setter_service = lazy_service("app.services.story_goal_setter_service:StoryGoalSetterService")
+story_obstacle_creator_service = lazy_service("app.services.story_obstacle_creator_service:StoryObstacleCreatorService")
+story_challenge_builder_service = lazy_service("app.services.story_challenge_builder_service:StoryChallengeBuilderService")
+story_test_creator_service = lazy_service("app.services.story_test_creator_service:StoryTestCreatorService")
+story_trial_builder_service = lazy_service("app.services.story_trial_builder_service:StoryTrialBuilderService")
+story_character_arc_service = lazy_service("app.services.story_character_arc_service:StoryCharacterArcService")
+story_character_growth_service = lazy_service("app.services.story_character_growth_service:StoryCharacterGrowthService")
+story_character_change_service = lazy_service("app.services.story_character_change_service:StoryCharacterChangeService")
+story_character_motivation_service = lazy_service("app.services.story_character_motivation_service:StoryCharacterMotivationService")
+story_character_backstory_service = lazy_service("app.services.story_character_backstory_service:StoryCharacterBackstoryService")
+story_character_relationship_service = lazy_service("app.services.story_character_relationship_service:StoryCharacterRelationshipService")
+story_character_dynamic_service = lazy_service("app.services.story_character_dynamic_service:StoryCharacterDynamicService")
+story_character_voice_service = lazy_service("app.services.story_character_voice_service:StoryCharacterVoiceService")
+story_character_quirk_service = lazy_service("app.services.story_character_quirk_service:StoryCharacterQuirkService")
+story_character_flaw_service = lazy_service("app.services.story_character_flaw_service:StoryCharacterFlawService")
+story_world_rules_service = lazy_service("app.services.story_world_rules_service:StoryWorldRulesService")
+story_world_history_service = lazy_service("app.services.story_world_history_service:StoryWorldHistoryService")
+story_world_geography_service = lazy_service("app.services.story_world_geography_service:StoryWorldGeographyService")
+story_world_culture_service = lazy_service("app.services.story_world_culture_service:StoryWorldCultureService")
+story_world_magic_service = lazy_service("app.services.story_world_magic_service:StoryWorldMagicService")
+story_world_technology_service = lazy_service("app.services.story_world_technology_service:StoryWorldTechnologyService")
+story_world_society_service = lazy_service("app.services.story_world_society_service:StoryWorldSocietyService")
+story_world_economy_service = lazy_service("app.services.story_world_economy_service:StoryWorldEconomyService")
+story_world_politics_service = lazy_service("app.services.story_world_politics_service:StoryWorldPoliticsService")
+story_world_religion_service = lazy_service("app.services.story_world_religion_service:StoryWorldReligionService")
 
 
 class StoryProcessRequest(BaseModel):
@@ -734,163 +614,84 @@ async def process_world_politics(request: StoryProcessRequest):
 async def process_world_religion(request: StoryProcessRequest):
     return await story_world_religion_service.process(request.story_id, request.story_text)
 
-# Additional Imports
-from app.services.story_plot_point_service import StoryPlotPointService
-from app.services.story_plot_twist_service import StoryPlotTwistService
-from app.services.story_plot_revelation_service import StoryPlotRevelationService
-from app.services.story_plot_complication_service import StoryPlotComplicationService
-from app.services.story_plot_resolution_service import StoryPlotResolutionService
-from app.services.story_subplot_creator_service import StorySubplotCreatorService
-from app.services.story_parallel_plot_service import StoryParallelPlotService
-from app.services.story_plot_thread_service import StoryPlotThreadService
-from app.services.story_plot_weaver_service import StoryPlotWeaverService
-from app.services.story_plot_balancer_service import StoryPlotBalancerService
-from app.services.story_dialogue_naturalness_service import StoryDialogueNaturalnessService
-from app.services.story_dialogue_purpose_service import StoryDialoguePurposeService
-from app.services.story_dialogue_subtext_service import StoryDialogueSubtextService
-from app.services.story_dialogue_voice_service import StoryDialogueVoiceService
-from app.services.story_dialogue_rhythm_service import StoryDialogueRhythmService
-from app.services.story_dialogue_pace_service import StoryDialoguePaceService
-from app.services.story_dialogue_variety_service import StoryDialogueVarietyService
-from app.services.story_dialogue_impact_service import StoryDialogueImpactService
-from app.services.story_description_vividness_service import StoryDescriptionVividnessService
-from app.services.story_description_detail_service import StoryDescriptionDetailService
-from app.services.story_description_sensory_service import StoryDescriptionSensoryService
-from app.services.story_description_emotional_service import StoryDescriptionEmotionalService
-from app.services.story_description_atmospheric_service import StoryDescriptionAtmosphericService
-from app.services.story_description_selective_service import StoryDescriptionSelectiveService
-from app.services.story_description_purposeful_service import StoryDescriptionPurposefulService
-from app.services.story_description_balanced_service import StoryDescriptionBalancedService
-from app.services.story_description_flowing_service import StoryDescriptionFlowingService
-from app.services.story_description_engaging_service import StoryDescriptionEngagingService
-from app.services.story_show_dont_tell_service import StoryShowDontTellService
-from app.services.story_active_voice_service import StoryActiveVoiceService
-from app.services.story_variety_creator_service import StoryVarietyCreatorService
-from app.services.story_rhythm_creator_service import StoryRhythmCreatorService
-from app.services.story_flow_creator_service import StoryFlowCreatorService
-from app.services.story_pace_creator_service import StoryPaceCreatorService
-from app.services.story_balance_creator_service import StoryBalanceCreatorService
-from app.services.story_harmony_creator_service import StoryHarmonyCreatorService
-from app.services.story_unity_creator_service import StoryUnityCreatorService
-from app.services.story_coherence_creator_service import StoryCoherenceCreatorService
-from app.services.story_framing_technique_service import StoryFramingTechniqueService
-from app.services.story_mirroring_technique_service import StoryMirroringTechniqueService
-from app.services.story_echoing_technique_service import StoryEchoingTechniqueService
-from app.services.story_callback_technique_service import StoryCallbackTechniqueService
-from app.services.story_parallelism_technique_service import StoryParallelismTechniqueService
-from app.services.story_contrast_technique_service import StoryContrastTechniqueService
-from app.services.story_juxtaposition_service import StoryJuxtapositionService
-from app.services.story_foreshadowing_technique_service import StoryForeshadowingTechniqueService
-from app.services.story_red_herring_service import StoryRedHerringService
-from app.services.story_chekhov_gun_service import StoryChekhovGunService
-from app.services.story_emotional_layers_service import StoryEmotionalLayersService
-from app.services.story_emotional_arc_service import StoryEmotionalArcService
-from app.services.story_emotional_journey_service import StoryEmotionalJourneyService
-from app.services.story_emotional_resonance_service import StoryEmotionalResonanceService
-from app.services.story_emotional_connection_service import StoryEmotionalConnectionService
-from app.services.story_emotional_authenticity_service import StoryEmotionalAuthenticityService
-from app.services.story_emotional_depth_service import StoryEmotionalDepthService
-from app.services.story_emotional_range_service import StoryEmotionalRangeService
-from app.services.story_emotional_balance_service import StoryEmotionalBalanceService
-from app.services.story_learning_curve_service import StoryLearningCurveService
-from app.services.story_progression_builder_service import StoryProgressionBuilderService
-from app.services.story_development_tracker_service import StoryDevelopmentTrackerService
-from app.services.story_growth_marker_service import StoryGrowthMarkerService
-from app.services.story_achievement_celebrator_service import StoryAchievementCelebratorService
-from app.services.story_milestone_marker_service import StoryMilestoneMarkerService
-from app.services.story_progress_tracker_service import StoryProgressTrackerService
-from app.services.story_improvement_shower_service import StoryImprovementShowerService
-from app.services.story_transformation_shower_service import StoryTransformationShowerService
-from app.services.story_evolution_tracker_service import StoryEvolutionTrackerService
-from app.services.story_polish_applier_service import StoryPolishApplierService
-from app.services.story_refinement_service import StoryRefinementService
-from app.services.story_perfection_seeker_service import StoryPerfectionSeekerService
-from app.services.story_final_touch_service import StoryFinalTouchService
-from app.services.story_quality_ensurer_service import StoryQualityEnsurerService
-from app.services.story_excellence_achiever_service import StoryExcellenceAchieverService
-from app.services.story_masterpiece_creator_service import StoryMasterpieceCreatorService
-from app.services.story_artistry_enhancer_service import StoryArtistryEnhancerService
-from app.services.story_beauty_creator_service import StoryBeautyCreatorService
-from app.services.story_brilliance_achiever_service import StoryBrillianceAchieverService
-
-# Additional Service Instantiations
-story_plot_point_service = StoryPlotPointService()
-story_plot_twist_service = StoryPlotTwistService()
-story_plot_revelation_service = StoryPlotRevelationService()
-story_plot_complication_service = StoryPlotComplicationService()
-story_plot_resolution_service = StoryPlotResolutionService()
-story_subplot_creator_service = StorySubplotCreatorService()
-story_parallel_plot_service = StoryParallelPlotService()
-story_plot_thread_service = StoryPlotThreadService()
-story_plot_weaver_service = StoryPlotWeaverService()
-story_plot_balancer_service = StoryPlotBalancerService()
-story_dialogue_naturalness_service = StoryDialogueNaturalnessService()
-story_dialogue_purpose_service = StoryDialoguePurposeService()
-story_dialogue_subtext_service = StoryDialogueSubtextService()
-story_dialogue_voice_service = StoryDialogueVoiceService()
-story_dialogue_rhythm_service = StoryDialogueRhythmService()
-story_dialogue_pace_service = StoryDialoguePaceService()
-story_dialogue_variety_service = StoryDialogueVarietyService()
-story_dialogue_impact_service = StoryDialogueImpactService()
-story_description_vividness_service = StoryDescriptionVividnessService()
-story_description_detail_service = StoryDescriptionDetailService()
-story_description_sensory_service = StoryDescriptionSensoryService()
-story_description_emotional_service = StoryDescriptionEmotionalService()
-story_description_atmospheric_service = StoryDescriptionAtmosphericService()
-story_description_selective_service = StoryDescriptionSelectiveService()
-story_description_purposeful_service = StoryDescriptionPurposefulService()
-story_description_balanced_service = StoryDescriptionBalancedService()
-story_description_flowing_service = StoryDescriptionFlowingService()
-story_description_engaging_service = StoryDescriptionEngagingService()
-story_show_dont_tell_service = StoryShowDontTellService()
-story_active_voice_service = StoryActiveVoiceService()
-story_variety_creator_service = StoryVarietyCreatorService()
-story_rhythm_creator_service = StoryRhythmCreatorService()
-story_flow_creator_service = StoryFlowCreatorService()
-story_pace_creator_service = StoryPaceCreatorService()
-story_balance_creator_service = StoryBalanceCreatorService()
-story_harmony_creator_service = StoryHarmonyCreatorService()
-story_unity_creator_service = StoryUnityCreatorService()
-story_coherence_creator_service = StoryCoherenceCreatorService()
-story_framing_technique_service = StoryFramingTechniqueService()
-story_mirroring_technique_service = StoryMirroringTechniqueService()
-story_echoing_technique_service = StoryEchoingTechniqueService()
-story_callback_technique_service = StoryCallbackTechniqueService()
-story_parallelism_technique_service = StoryParallelismTechniqueService()
-story_contrast_technique_service = StoryContrastTechniqueService()
-story_juxtaposition_service = StoryJuxtapositionService()
-story_foreshadowing_technique_service = StoryForeshadowingTechniqueService()
-story_red_herring_service = StoryRedHerringService()
-story_chekhov_gun_service = StoryChekhovGunService()
-story_emotional_layers_service = StoryEmotionalLayersService()
-story_emotional_arc_service = StoryEmotionalArcService()
-story_emotional_journey_service = StoryEmotionalJourneyService()
-story_emotional_resonance_service = StoryEmotionalResonanceService()
-story_emotional_connection_service = StoryEmotionalConnectionService()
-story_emotional_authenticity_service = StoryEmotionalAuthenticityService()
-story_emotional_depth_service = StoryEmotionalDepthService()
-story_emotional_range_service = StoryEmotionalRangeService()
-story_emotional_balance_service = StoryEmotionalBalanceService()
-story_learning_curve_service = StoryLearningCurveService()
-story_progression_builder_service = StoryProgressionBuilderService()
-story_development_tracker_service = StoryDevelopmentTrackerService()
-story_growth_marker_service = StoryGrowthMarkerService()
-story_achievement_celebrator_service = StoryAchievementCelebratorService()
-story_milestone_marker_service = StoryMilestoneMarkerService()
-story_progress_tracker_service = StoryProgressTrackerService()
-story_improvement_shower_service = StoryImprovementShowerService()
-story_transformation_shower_service = StoryTransformationShowerService()
-story_evolution_tracker_service = StoryEvolutionTrackerService()
-story_polish_applier_service = StoryPolishApplierService()
-story_refinement_service = StoryRefinementService()
-story_perfection_seeker_service = StoryPerfectionSeekerService()
-story_final_touch_service = StoryFinalTouchService()
-story_quality_ensurer_service = StoryQualityEnsurerService()
-story_excellence_achiever_service = StoryExcellenceAchieverService()
-story_masterpiece_creator_service = StoryMasterpieceCreatorService()
-story_artistry_enhancer_service = StoryArtistryEnhancerService()
-story_beauty_creator_service = StoryBeautyCreatorService()
-story_brilliance_achiever_service = StoryBrillianceAchieverService()
+# Additional Services
+story_plot_point_service = lazy_service("app.services.story_plot_point_service:StoryPlotPointService")
+story_plot_twist_service = lazy_service("app.services.story_plot_twist_service:StoryPlotTwistService")
+story_plot_revelation_service = lazy_service("app.services.story_plot_revelation_service:StoryPlotRevelationService")
+story_plot_complication_service = lazy_service("app.services.story_plot_complication_service:StoryPlotComplicationService")
+story_plot_resolution_service = lazy_service("app.services.story_plot_resolution_service:StoryPlotResolutionService")
+story_subplot_creator_service = lazy_service("app.services.story_subplot_creator_service:StorySubplotCreatorService")
+story_parallel_plot_service = lazy_service("app.services.story_parallel_plot_service:StoryParallelPlotService")
+story_plot_thread_service = lazy_service("app.services.story_plot_thread_service:StoryPlotThreadService")
+story_plot_weaver_service = lazy_service("app.services.story_plot_weaver_service:StoryPlotWeaverService")
+story_plot_balancer_service = lazy_service("app.services.story_plot_balancer_service:StoryPlotBalancerService")
+story_dialogue_naturalness_service = lazy_service("app.services.story_dialogue_naturalness_service:StoryDialogueNaturalnessService")
+story_dialogue_purpose_service = lazy_service("app.services.story_dialogue_purpose_service:StoryDialoguePurposeService")
+story_dialogue_subtext_service = lazy_service("app.services.story_dialogue_subtext_service:StoryDialogueSubtextService")
+story_dialogue_voice_service = lazy_service("app.services.story_dialogue_voice_service:StoryDialogueVoiceService")
+story_dialogue_rhythm_service = lazy_service("app.services.story_dialogue_rhythm_service:StoryDialogueRhythmService")
+story_dialogue_pace_service = lazy_service("app.services.story_dialogue_pace_service:StoryDialoguePaceService")
+story_dialogue_variety_service = lazy_service("app.services.story_dialogue_variety_service:StoryDialogueVarietyService")
+story_dialogue_impact_service = lazy_service("app.services.story_dialogue_impact_service:StoryDialogueImpactService")
+story_description_vividness_service = lazy_service("app.services.story_description_vividness_service:StoryDescriptionVividnessService")
+story_description_detail_service = lazy_service("app.services.story_description_detail_service:StoryDescriptionDetailService")
+story_description_sensory_service = lazy_service("app.services.story_description_sensory_service:StoryDescriptionSensoryService")
+story_description_emotional_service = lazy_service("app.services.story_description_emotional_service:StoryDescriptionEmotionalService")
+story_description_atmospheric_service = lazy_service("app.services.story_description_atmospheric_service:StoryDescriptionAtmosphericService")
+story_description_selective_service = lazy_service("app.services.story_description_selective_service:StoryDescriptionSelectiveService")
+story_description_purposeful_service = lazy_service("app.services.story_description_purposeful_service:StoryDescriptionPurposefulService")
+story_description_balanced_service = lazy_service("app.services.story_description_balanced_service:StoryDescriptionBalancedService")
+story_description_flowing_service = lazy_service("app.services.story_description_flowing_service:StoryDescriptionFlowingService")
+story_description_engaging_service = lazy_service("app.services.story_description_engaging_service:StoryDescriptionEngagingService")
+story_show_dont_tell_service = lazy_service("app.services.story_show_dont_tell_service:StoryShowDontTellService")
+story_active_voice_service = lazy_service("app.services.story_active_voice_service:StoryActiveVoiceService")
+story_variety_creator_service = lazy_service("app.services.story_variety_creator_service:StoryVarietyCreatorService")
+story_rhythm_creator_service = lazy_service("app.services.story_rhythm_creator_service:StoryRhythmCreatorService")
+story_flow_creator_service = lazy_service("app.services.story_flow_creator_service:StoryFlowCreatorService")
+story_pace_creator_service = lazy_service("app.services.story_pace_creator_service:StoryPaceCreatorService")
+story_balance_creator_service = lazy_service("app.services.story_balance_creator_service:StoryBalanceCreatorService")
+story_harmony_creator_service = lazy_service("app.services.story_harmony_creator_service:StoryHarmonyCreatorService")
+story_unity_creator_service = lazy_service("app.services.story_unity_creator_service:StoryUnityCreatorService")
+story_coherence_creator_service = lazy_service("app.services.story_coherence_creator_service:StoryCoherenceCreatorService")
+story_framing_technique_service = lazy_service("app.services.story_framing_technique_service:StoryFramingTechniqueService")
+story_mirroring_technique_service = lazy_service("app.services.story_mirroring_technique_service:StoryMirroringTechniqueService")
+story_echoing_technique_service = lazy_service("app.services.story_echoing_technique_service:StoryEchoingTechniqueService")
+story_callback_technique_service = lazy_service("app.services.story_callback_technique_service:StoryCallbackTechniqueService")
+story_parallelism_technique_service = lazy_service("app.services.story_parallelism_technique_service:StoryParallelismTechniqueService")
+story_contrast_technique_service = lazy_service("app.services.story_contrast_technique_service:StoryContrastTechniqueService")
+story_juxtaposition_service = lazy_service("app.services.story_juxtaposition_service:StoryJuxtapositionService")
+story_foreshadowing_technique_service = lazy_service("app.services.story_foreshadowing_technique_service:StoryForeshadowingTechniqueService")
+story_red_herring_service = lazy_service("app.services.story_red_herring_service:StoryRedHerringService")
+story_chekhov_gun_service = lazy_service("app.services.story_chekhov_gun_service:StoryChekhovGunService")
+story_emotional_layers_service = lazy_service("app.services.story_emotional_layers_service:StoryEmotionalLayersService")
+story_emotional_arc_service = lazy_service("app.services.story_emotional_arc_service:StoryEmotionalArcService")
+story_emotional_journey_service = lazy_service("app.services.story_emotional_journey_service:StoryEmotionalJourneyService")
+story_emotional_resonance_service = lazy_service("app.services.story_emotional_resonance_service:StoryEmotionalResonanceService")
+story_emotional_connection_service = lazy_service("app.services.story_emotional_connection_service:StoryEmotionalConnectionService")
+story_emotional_authenticity_service = lazy_service("app.services.story_emotional_authenticity_service:StoryEmotionalAuthenticityService")
+story_emotional_depth_service = lazy_service("app.services.story_emotional_depth_service:StoryEmotionalDepthService")
+story_emotional_range_service = lazy_service("app.services.story_emotional_range_service:StoryEmotionalRangeService")
+story_emotional_balance_service = lazy_service("app.services.story_emotional_balance_service:StoryEmotionalBalanceService")
+story_learning_curve_service = lazy_service("app.services.story_learning_curve_service:StoryLearningCurveService")
+story_progression_builder_service = lazy_service("app.services.story_progression_builder_service:StoryProgressionBuilderService")
+story_development_tracker_service = lazy_service("app.services.story_development_tracker_service:StoryDevelopmentTrackerService")
+story_growth_marker_service = lazy_service("app.services.story_growth_marker_service:StoryGrowthMarkerService")
+story_achievement_celebrator_service = lazy_service("app.services.story_achievement_celebrator_service:StoryAchievementCelebratorService")
+story_milestone_marker_service = lazy_service("app.services.story_milestone_marker_service:StoryMilestoneMarkerService")
+story_progress_tracker_service = lazy_service("app.services.story_progress_tracker_service:StoryProgressTrackerService")
+story_improvement_shower_service = lazy_service("app.services.story_improvement_shower_service:StoryImprovementShowerService")
+story_transformation_shower_service = lazy_service("app.services.story_transformation_shower_service:StoryTransformationShowerService")
+story_evolution_tracker_service = lazy_service("app.services.story_evolution_tracker_service:StoryEvolutionTrackerService")
+story_polish_applier_service = lazy_service("app.services.story_polish_applier_service:StoryPolishApplierService")
+story_refinement_service = lazy_service("app.services.story_refinement_service:StoryRefinementService")
+story_perfection_seeker_service = lazy_service("app.services.story_perfection_seeker_service:StoryPerfectionSeekerService")
+story_final_touch_service = lazy_service("app.services.story_final_touch_service:StoryFinalTouchService")
+story_quality_ensurer_service = lazy_service("app.services.story_quality_ensurer_service:StoryQualityEnsurerService")
+story_excellence_achiever_service = lazy_service("app.services.story_excellence_achiever_service:StoryExcellenceAchieverService")
+story_masterpiece_creator_service = lazy_service("app.services.story_masterpiece_creator_service:StoryMasterpieceCreatorService")
+story_artistry_enhancer_service = lazy_service("app.services.story_artistry_enhancer_service:StoryArtistryEnhancerService")
+story_beauty_creator_service = lazy_service("app.services.story_beauty_creator_service:StoryBeautyCreatorService")
+story_brilliance_achiever_service = lazy_service("app.services.story_brilliance_achiever_service:StoryBrillianceAchieverService")
 
 @router.post("/plot-point/process")
 async def process_plot_point(request: StoryProcessRequest):
@@ -2,95 +2,53 @@ from fastapi import APIRouter, HTTPException
 from typing import Optional, List, Dict
 from pydantic import BaseModel
 
-from app.services.education_learning_service import EducationLearningService
-from app.services.story_scheduler_service import StorySchedulerService
-from app.services.story_automation_service import StoryAutomationService
-from app.services.ai_story_creation_advanced_service import AIStoryCreationAdvancedService
-from app.services.timeline_service import TimelineService
-from app.services.geolocation_service import GeolocationService
-from app.services.offline_service import OfflineService
-from app.services.story_smart_scheduling_service import StorySmartSchedulingService
-from app.services.story_auto_categorization_service import StoryAutoCategorizationService
-from app.services.story_content_verification_service import StoryContentVerificationService
-from app.services.story_smart_tagging_service import StorySmartTaggingService
-from app.services.story_version_control_service import StoryVersionControlService
-from app.services.story_content_enrichment_service import StoryContentEnrichmentService
-from app.services.story_auto_title_service import StoryAutoTitleService
-from app.services.story_content_expansion_service import StoryContentExpansionService
-from app.services.story_content_compression_service import StoryContentCompressionService
-from app.services.story_resolution_adder_service import StoryResolutionAdderService
-from app.services.story_moral_adder_service import StoryMoralAdderService
-from app.services.story_entertainment_adder_service import StoryEntertainmentAdderService
-from app.services.story_excitement_adder_service import StoryExcitementAdderService
-from app.services.story_mystery_adder_service import StoryMysteryAdderService
-from app.services.story_romance_adder_service import StoryRomanceAdderService
-from app.services.story_ai_rewriter_service import StoryAiRewriterService
-from app.services.story_plagiarism_checker_service import StoryPlagiarismCheckerService
-from app.services.story_quality_scorer_service import StoryQualityScorerService
-from app.services.story_language_simplifier_service import StoryLanguageSimplifierService
-from app.services.story_vocabulary_enhancer_service import StoryVocabularyEnhancerService
-from app.services.story_rhythm_enhancer_service import StoryRhythmEnhancerService
-from app.services.story_pacing_optimizer_service import StoryPacingOptimizerService
-from app.services.story_climax_enhancer_service import StoryClimaxEnhancerService
-from app.services.story_foreshadowing_adder_service import StoryForeshadowingAdderService
-from app.services.story_symbolism_adder_service import StorySymbolismAdderService
-from app.services.story_metaphor_enhancer_service import StoryMetaphorEnhancerService
-from app.services.story_alliteration_enhancer_service import StoryAlliterationEnhancerService
-from app.services.story_repetition_optimizer_service import StoryRepetitionOptimizerService
-from app.services.story_transition_enhancer_service import StoryTransitionEnhancerService
-from app.services.story_hook_creator_service import StoryHookCreatorService
-from app.services.story_theme_enhancer_service import StoryThemeEnhancerService
-from app.services.story_imagery_enhancer_service import StoryImageryEnhancerService
-from app.services.story_voice_enhancer_service import StoryVoiceEnhancerService
-from app.services.story_dialogue_balance_service import StoryDialogueBalanceService
-from app.services.story_storage import StoryStorage
-from app.services.plagiarism_service import PlagiarismService
+from app.core.service_registry import lazy_service
 
 router = APIRouter()
 
-education_learning_service = EducationLearningService()
-story_scheduler_service = StorySchedulerService()
-story_automation_service = StoryAutomationService()
-ai_story_creation_advanced_service = AIStoryCreationAdvancedService()
-timeline_service = TimelineService()
-geolocation_service = GeolocationService()
-offline_service = OfflineService()
-story_smart_scheduling_service = StorySmartSchedulingService()
-story_auto_categorization_service = StoryAutoCategorizationService()
-story_content_verification_service = StoryContentVerificationService()
-story_smart_tagging_service = StorySmartTaggingService()
-story_version_control_service = StoryVersionControlService()
-story_content_enrichment_service = StoryContentEnrichmentService()
-story_auto_title_service = StoryAutoTitleService()
-story_content_expansion_service = StoryContentExpansionService()
-story_content_compression_service = StoryContentCompressionService()
-story_resolution_adder_service = StoryResolutionAdderService()
-story_moral_adder_service = StoryMoralAdderService()
-story_entertainment_adder_service = StoryEntertainmentAdderService()
-story_excitement_adder_service = StoryExcitementAdderService()
-story_mystery_adder_service = StoryMysteryAdderService()
-story_romance_adder_service = StoryRomanceAdderService()
-story_ai_rewriter_service = StoryAiRewriterService()
-story_plagiarism_checker_service = StoryPlagiarismCheckerService()
-story_quality_scorer_service = StoryQualityScorerService()
-story_language_simplifier_service = StoryLanguageSimplifierService()
-story_vocabulary_enhancer_service = StoryVocabularyEnhancerService()
-story_rhythm_enhancer_service = StoryRhythmEnhancerService()
-story_pacing_optimizer_service = StoryPacingOptimizerService()
-story_climax_enhancer_service = StoryClimaxEnhancerService()
-story_foreshadowing_adder_service = StoryForeshadowingAdderService()
-story_symbolism_adder_service = StorySymbolismAdderService()
-story_metaphor_enhancer_service = StoryMetaphorEnhancerService()
-story_alliteration_enhancer_service = StoryAlliterationEnhancerService()
-story_repetition_optimizer_service = StoryRepetitionOptimizerService()
-story_transition_enhancer_service = StoryTransitionEnhancerService()
-story_hook_creator_service = StoryHookCreatorService()
-story_theme_enhancer_service = StoryThemeEnhancerService()
-story_imagery_enhancer_service = StoryImageryEnhancerService()
-story_voice_enhancer_service = StoryVoiceEnhancerService()
-story_dialogue_balance_service = StoryDialogueBalanceService()
-story_storage = StoryStorage()
-plagiarism_service = PlagiarismService()
+education_learning_service = lazy_service("app.services.education_learning_service:EducationLearningService")
+story_scheduler_service = lazy_service("app.services.story_scheduler_service:StorySchedulerService")
+story_automation_service = lazy_service("app.services.story_automation_service:StoryAutomationService")
+ai_story_creation_advanced_service = lazy_service("app.services.ai_story_creation_advanced_service:AIStoryCreationAdvancedService")
+timeline_service = lazy_service("app.services.timeline_service:TimelineService")
+geolocation_service = lazy_service("app.services.geolocation_service:GeolocationService")
+offline_service = lazy_service("app.services.offline_service:OfflineService")
+story_smart_scheduling_service = lazy_service("app.services.story_smart_scheduling_service:StorySmartSchedulingService")
+story_auto_categorization_service = lazy_service("app.services.story_auto_categorization_service:StoryAutoCategorizationService")
+story_content_verification_service = lazy_service("app.services.story_content_verification_service:StoryContentVerificationService")
+story_smart_tagging_service = lazy_service("app.services.story_smart_tagging_service:StorySmartTaggingService")
+story_version_control_service = lazy_service("app.services.story_version_control_service:StoryVersionControlService")
+story_content_enrichment_service = lazy_service("app.services.story_content_enrichment_service:StoryContentEnrichmentService")
+story_auto_title_service = lazy_service("app.services.story_auto_title_service:StoryAutoTitleService")
+story_content_expansion_service = lazy_service("app.services.story_content_expansion_service:StoryContentExpansionService")
+story_content_compression_service = lazy_service("app.services.story_content_compression_service:StoryContentCompressionService")
+story_resolution_adder_service = lazy_service("app.services.story_resolution_adder_service:StoryResolutionAdderService")
+story_moral_adder_service = lazy_service("app.services.story_moral_adder_service:StoryMoralAdderService")
+story_entertainment_adder_service = lazy_service("app.services.story_entertainment_adder_service:StoryEntertainmentAdderService")
+story_excitement_adder_service = lazy_service("app.services.story_excitement_adder_service:StoryExcitementAdderService")
+story_mystery_adder_service = lazy_service("app.services.story_mystery_adder_service:StoryMysteryAdderService")
+story_romance_adder_service = lazy_service("app.services.story_romance_adder_service:StoryRomanceAdderService")
+story_ai_rewriter_service = lazy_service("app.services.story_ai_rewriter_service:StoryAiRewriterService")
+story_plagiarism_checker_service = lazy_service("app.services.story_plagiarism_checker_service:StoryPlagiarismCheckerService")
+story_quality_scorer_service = lazy_service("app.services.story_quality_scorer_service:StoryQualityScorerService")
+story_language_simplifier_service = lazy_service("app.services.story_language_simplifier_service:StoryLanguageSimplifierService")
+story_vocabulary_enhancer_service = lazy_service("app.services.story_vocabulary_enhancer_service:StoryVocabularyEnhancerService")
+story_rhythm_enhancer_service = lazy_service("app.services.story_rhythm_enhancer_service:StoryRhythmEnhancerService")
+story_pacing_optimizer_service = lazy_service("app.services.story_pacing_optimizer_service:StoryPacingOptimizerService")
+story_climax_enhancer_service = lazy_service("app.services.story_climax_enhancer_service:StoryClimaxEnhancerService")
+story_foreshadowing_adder_service = lazy_service("app.services.story_foreshadowing_adder_service:StoryForeshadowingAdderService")
+story_symbolism_adder_service = lazy_service("app.services.story_symbolism_adder_service:StorySymbolismAdderService")
+story_metaphor_enhancer_service = lazy_service("app.services.story_metaphor_enhancer_service:StoryMetaphorEnhancerService")
+story_alliteration_enhancer_service = lazy_service("app.services.story_alliteration_enhancer_service:StoryAlliterationEnhancerService")
+story_repetition_optimizer_service = lazy_service("app.services.story_repetition_optimizer_service:StoryRepetitionOptimizerService")
+story_transition_enhancer_service = lazy_service("app.services.story_transition_enhancer_service:StoryTransitionEnhancerService")
+story_hook_creator_service = lazy_service("app.services.story_hook_creator_service:StoryHookCreatorService")
+story_theme_enhancer_service = lazy_service("app.services.story_theme_enhancer_service:StoryThemeEnhancerService")
+story_imagery_enhancer_service = lazy_service("app.services.story_imagery_enhancer_service:StoryImageryEnhancerService")
+story_voice_enhancer_service = lazy_service("app.services.story_voice_enhancer_service:StoryVoiceEnhancerService")
+story_dialogue_balance_service = lazy_service("app.services.story_dialogue_balance_service:StoryDialogueBalanceService")
+story_storage = lazy_service("app.services.story_storage:StoryStorage")
+plagiarism_service = lazy_service("app.services.plagiarism_service:PlagiarismService")
 
 
 # ========== Eğitim ve Öğrenme ==========
@@ -1,13 +1,12 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.translation_service import TranslationService
 import json
 
 
 class AdvancedTranslationService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.translation_service = TranslationService()
     
     async def translate_story_realtime(
@@ -42,13 +41,14 @@ Hikâye:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen profesyonel bir çevirmensin. Hikâyeleri doğal ve akıcı bir şekilde çeviriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="advanced_translation"
             )
             
             translated_text = response.choices[0].message.content.strip()
@@ -163,13 +163,14 @@ Dil kodu:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir dil tespit uzmanısın. Metinlerin dilini tespit ediyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1
+                temperature=0.1,
+                cache_namespace="advanced_translation"
             )
             
             detected_language = response.choices[0].message.content.strip().lower()
@@ -1,13 +1,12 @@
 from typing import Dict, List
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_analysis_service import StoryAnalysisService
 import json
 
 
 class AIAnalysisAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.analysis_service = StoryAnalysisService()
     
     async def generate_emotion_chart_data(self, story_id: str) -> Dict:
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import uuid
 from datetime import datetime
@@ -9,7 +9,6 @@ import os
 
 class AIAssistantService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.conversations_file = os.path.join(settings.STORAGE_PATH, "ai_assistant_conversations.json")
         self._ensure_file()
     
@@ -54,13 +53,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir yazım asistanısın. Gerçek zamanlı öneriler sunuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="ai_assistant"
             )
             
             result_text = response.choices[0].message.content
@@ -87,14 +88,16 @@ Bağlam: {context or 'Genel hikâye'}
 Tamamlanmış Metin:
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir metin tamamlama uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=100
+                max_tokens=100,
+                cache=False,
+                cache_namespace="ai_assistant"
             )
             
             return response.choices[0].message.content.strip()
@@ -114,13 +117,15 @@ Tamamlanmış Metin:
             system_prompt += f"\n\nHikâye Bağlamı: {story_context}"
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": question}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_assistant"
             )
             
             answer = response.choices[0].message.content.strip()
@@ -149,13 +154,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir yazım eğitmenisin."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_assistant"
             )
             
             result_text = response.choices[0].message.content
@@ -170,12 +177,14 @@ JSON formatında döndür:
     async def generate_text(self, prompt: str, max_tokens: int = 1000) -> str:
         """Metin üretir (GPT-4)."""
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                cache=False,
+                cache_namespace="ai_assistant"
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
@@ -1,6 +1,6 @@
 from typing import List, Dict, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.character_service import CharacterService
 from app.services.story_storage import StoryStorage
 import json
@@ -11,7 +11,6 @@ import os
 
 class AIChatbotService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.character_service = CharacterService()
         self.story_storage = StoryStorage()
         self.conversations_file = os.path.join(settings.STORAGE_PATH, "chatbot_conversations.json")
@@ -142,11 +141,13 @@ Kullanıcının yazdığı mesajı bu bağlamda değerlendir. Eğer kullanıcı
         
         # AI'dan yanıt al
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=messages,
                 temperature=0.8,
-                max_tokens=200
+                max_tokens=200,
+                cache=False,
+                cache_namespace="ai_chatbot"
             )
             
             character_response = response.choices[0].message.content.strip()
@@ -296,13 +297,14 @@ Karakterin özelliklerini JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir karakter analiz uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="ai_chatbot"
             )
             
             character_data_text = response.choices[0].message.content
@@ -1,14 +1,11 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import re
 
 
 class AIEditorEnhancedService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
-    
     async def realtime_spell_check(
         self,
         text: str,
@@ -78,13 +75,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat editörüsün. Stil önerileri sunuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_editor_enhanced"
             )
             
             result_text = response.choices[0].message.content
@@ -1,14 +1,11 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import re
 
 
 class AIEditorService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
-    
     async def realtime_spell_check(self, text: str, language: str = "tr") -> Dict:
         """Gerçek zamanlı yazım kontrolü."""
         prompt = f"""
@@ -33,13 +30,14 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir yazım kontrol uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1
+                temperature=0.1,
+                cache_namespace="ai_editor"
             )
             
             result_text = response.choices[0].message.content
@@ -72,13 +70,14 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat editörüsün."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="ai_editor"
             )
             
             result_text = response.choices[0].message.content
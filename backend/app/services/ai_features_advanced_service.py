@@ -1,13 +1,12 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 
 
 class AIFeaturesAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
     
     async def summarize_story(
@@ -35,13 +34,14 @@ Hikâye:
 Özet:
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir özet uzmanısın. Hikâyeleri özetliyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="ai_features_advanced"
             )
             
             summary = response.choices[0].message.content.strip()
@@ -91,13 +91,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat analiz uzmanısın. Karakterleri analiz ediyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_features_advanced"
             )
             
             result_text = response.choices[0].message.content
@@ -162,13 +164,14 @@ Orijinal Hikâye ({story.get('language', 'tr')}):
 Çeviri ({target_language}):
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": f"Sen bir çevirmensin. Metinleri {target_language} diline çeviriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="ai_features_advanced"
             )
             
             translated_text = response.choices[0].message.content.strip()
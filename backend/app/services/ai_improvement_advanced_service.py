@@ -1,13 +1,12 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_improvement_service import StoryImprovementService
 import json
 
 
 class AIImprovementAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.improvement_service = StoryImprovementService()
     
     async def get_realtime_suggestions(
@@ -46,13 +45,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat editörüsün. Gerçek zamanlı öneriler sunuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_improvement_advanced"
             )
             
             result_text = response.choices[0].message.content
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.content_moderation_service import ContentModerationService
 import json
 import os
@@ -10,7 +10,6 @@ from app.core.config import settings
 
 class AIModerationAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.moderation_service = ContentModerationService()
         self.moderation_logs_file = os.path.join(settings.STORAGE_PATH, "moderation_logs.json")
         self._ensure_file()
@@ -62,13 +61,14 @@ Sorunlar: {', '.join(moderation.get('issues', []))}
 İyileştirilmiş metni döndür:
 """
             try:
-                response = self.openai_client.chat.completions.create(
+                response = await llm_gateway.chat_completion(
                     model="gpt-4",
                     messages=[
                         {"role": "system", "content": "Sen bir içerik moderatörüsün. Uygunsuz içeriği temizliyorsun."},
                         {"role": "user", "content": prompt}
                     ],
-                    temperature=0.3
+                    temperature=0.3,
+                    cache_namespace="ai_moderation_advanced"
                 )
                 improved_text = response.choices[0].message.content.strip()
             except:
@@ -1,6 +1,6 @@
 from typing import List, Dict, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.recommendation_service import RecommendationService
 from app.services.story_storage import StoryStorage
 import json
@@ -11,7 +11,6 @@ from app.core.config import settings
 
 class AIRecommendationsAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.recommendation_service = RecommendationService()
         self.story_storage = StoryStorage()
         self.learning_file = os.path.join(settings.STORAGE_PATH, "recommendation_learning.json")
@@ -52,13 +51,15 @@ Bu kullanıcı için 5 hikâye önerisi oluştur. JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir öneri sistemi uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=False,
+                cache_namespace="ai_recommendations_advanced"
             )
             
             result_text = response.choices[0].message.content
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 import uuid
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class AIStoryCreationAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
         self.universes_file = f"{settings.STORAGE_PATH}/story_universes.json"
         self.series_file = f"{settings.STORAGE_PATH}/story_series.json"
@@ -54,13 +53,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir hikâye yazarısın. Çoklu karakter hikâyeleri yazıyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.8
+                temperature=0.8,
+                cache=False,
+                cache_namespace="ai_story_creation_advanced"
             )
             
             result_text = response.choices[0].message.content
@@ -114,13 +115,15 @@ Yeni paralel evren hikâyesini yaz. JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir hikâye yazarısın. Paralel evrenler oluşturuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.9
+                temperature=0.9,
+                cache=False,
+                cache_namespace="ai_story_creation_advanced"
             )
             
             result_text = response.choices[0].message.content
@@ -222,13 +225,15 @@ Mevcut Hikâye:
 Devamını yaz. Sadece devam metnini döndür.
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir hikâye yazarısın. Hikâyeleri doğal bir şekilde devam ettiriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="ai_story_creation_advanced"
             )
             
             continuation = response.choices[0].message.content.strip()
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import BinaryIO, Iterable, List, Optional
+
+# Cümle sonu: . ! ? … (ardından tırnak/parantez gelebilir) ve boşluk
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”’)\]])\s+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n|\n")
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:])\s+")
+
+_COPY_BLOCK = 64 * 1024
+
+
+def split_into_chunks(text: str, max_chars: int = 300) -> List[str]:
+    """
+    Metni seslendirme parçalarına böler.
+
+    Parçalar paragraf sınırını asla aşmaz; paragraf içinde cümleler max_chars'a
+    kadar birleştirilir. Böylece bir paragraftaki düzenleme yalnızca o
+    paragrafın parçalarının anahtarını değiştirir, diğerleri önbellekten gelir.
+    max_chars'tan uzun cümleler virgül/noktalı virgülden, gerekirse boşluktan bölünür.
+    """
+    chunks: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text or ""):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        current = ""
+        for piece in _pieces(paragraph, max_chars):
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def _pieces(paragraph: str, max_chars: int) -> Iterable[str]:
+    for sentence in _SENTENCE_END.split(paragraph):
+        sentence = sentence.strip()
+        if len(sentence) <= max_chars:
+            if sentence:
+                yield sentence
+            continue
+        for clause in _CLAUSE_BREAK.split(sentence):
+            while len(clause) > max_chars:
+                cut = clause.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                yield clause[:cut].strip()
+                clause = clause[cut:].strip()
+            if clause:
+                yield clause
+
+
+def chunk_key(text: str, **params) -> str:
+    """Parçanın içerik adresi: metin + sesi belirleyen tüm parametrelerin SHA-256'sı."""
+    payload = json.dumps([text, params], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _frame_range(src: BinaryIO, size: int):
+    """MP3 dosyasında MPEG çerçevelerinin [başlangıç, bitiş) aralığı: ID3v2 başlığı ve ID3v1 kuyruğu hariç."""
+    start, end = 0, size
+    header = src.read(10)
+    if header[:3] == b"ID3" and len(header) == 10:
+        tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        start = min(size, 10 + tag_size + (10 if header[5] & 0x10 else 0))
+    if end - start >= 128:
+        src.seek(end - 128)
+        if src.read(3) == b"TAG":
+            end -= 128
+    return start, end
+
+
+def concat_mp3(paths: Iterable[str], output: BinaryIO) -> int:
+    """
+    MP3 dosyalarını çözmeden art arda yazar (MPEG çerçeveleri bağımsızdır).
+
+    Her dosyanın yalnız baş/son etiketleri atlanır, gövde bloklar halinde
+    kopyalanır; bellekte aynı anda en fazla bir blok tutulur.
+    Yazılan bayt sayısını döndürür.
+    """
+    written = 0
+    for path in paths:
+        with open(path, "rb") as src:
+            start, end = _frame_range(src, os.fstat(src.fileno()).st_size)
+            src.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = src.read(min(_COPY_BLOCK, remaining))
+                if not block:
+                    break
+                output.write(block)
+                written += len(block)
+                remaining -= len(block)
+    return written
+
+
+# MPEG ses başlığı tabloları: (sürüm, katman) -> kbps; sürüm -> Hz
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+_VERSIONS = {0b00: 2.5, 0b10: 2, 0b11: 1}
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+
+def _frame_info(header: bytes):
+    """4 baytlık MPEG başlığından (çerçeve uzunluğu, örnek sayısı, örnekleme hızı); geçersizse None."""
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = _VERSIONS.get((header[1] >> 3) & 0b11)
+    layer = _LAYERS.get((header[1] >> 1) & 0b11)
+    bitrate_index, rate_index = header[2] >> 4, (header[2] >> 2) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 1
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 576 if layer == 3 and version != 1 else 1152
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def mp3_duration(path: str) -> float:
+    """
+    MP3 süresini (saniye) çözmeden, çerçeve başlıklarını sayarak ölçer.
+
+    Sabit ve değişken bit hızında doğrudur; bozuk baytlar atlanıp sonraki
+    senkron kelimesinden devam edilir.
+    """
+    with open(path, "rb") as src:
+        start, end = _frame_range(src, os.fstat(src.fileno()).st_size)
+        src.seek(start)
+        data = src.read(end - start)
+    seconds = 0.0
+    pos = 0
+    while pos + 4 <= len(data):
+        info = _frame_info(data[pos:pos + 4])
+        if info is None or info[0] < 4:
+            nxt = data.find(b"\xff", pos + 1)
+            if nxt < 0:
+                break
+            pos = nxt
+            continue
+        length, samples, sample_rate = info
+        seconds += samples / sample_rate
+        pos += length
+    return seconds
+
+
+class AudioChunkCache:
+    """
+    Seslendirilmiş parçalar için içerik adresli disk önbelleği.
+
+    Disk düzeni: {directory}/{anahtarın ilk 2 hanesi}/{anahtar}.mp3
+    Yazmalar geçici dosya + os.replace ile atomiktir; aynı parçayı aynı anda
+    üreten iki worker birbirinin dosyasını bozamaz. Okunan parçaların mtime'ı
+    güncellenir, prune() toplam boyut sınırını aşınca en eski parçaları siler.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def get(self, key: str) -> Optional[str]:
+        """Parça önbellekteyse yolunu döndürür (ve LRU için dokunur)."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def prune(self) -> int:
+        """Toplam boyut max_bytes'ı aşıyorsa en uzun süre kullanılmayan parçaları siler."""
+        if not self.max_bytes:
+            return 0
+        entries = []
+        total = 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
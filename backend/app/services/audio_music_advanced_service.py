@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
 from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -9,7 +10,6 @@ from datetime import datetime
 
 class AudioMusicAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.character_voices_dir = os.path.join(settings.STORAGE_PATH, "character_voices")
         self.music_dir = os.path.join(settings.STORAGE_PATH, "music")
         self.sound_effects_dir = os.path.join(settings.STORAGE_PATH, "sound_effects")
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceError
+from app.services.audio_chunk_cache import chunk_key
+
+
+async def output_exists(audio_url: Optional[str]) -> bool:
+    """Bölümün ses çıktısı hâlâ duruyor mu: bulut URL'sine HEAD, yerel yolda dosya kontrolü."""
+    if not audio_url:
+        return False
+    if urlparse(audio_url).scheme in ("http", "https"):
+        try:
+            async with httpx.AsyncClient(timeout=5.0, follow_redirects=True) as client:
+                return (await client.head(audio_url)).status_code == 200
+        except httpx.HTTPError:
+            return False
+    path = audio_url
+    if path.startswith("/storage/"):
+        path = os.path.join(settings.STORAGE_PATH, path[len("/storage/"):])
+    return os.path.isfile(path)
+
+
+def build_key(kind: str, *parts) -> str:
+    """Yapı kimliği: aynı girdiyle tekrar istenen yapı aynı manifest'e düşer (devam edilebilir)."""
+    return chunk_key(kind, parts=list(parts))[:32]
+
+
+class ChapterSynthesisScheduler:
+    """
+    Sesli kitap / podcast bölümlerini eşzamanlı ve kaldığı yerden devam edebilir seslendirir.
+
+    - Her bölüm kendi çıktı anahtarına yazılır ({yapı}_{bölüm no}); bölümler
+      aynı hikâye ses dosyasının üzerine yazmaz
+    - Bölümler birlikte başlatılır; sağlayıcıya giden parça istekleri TTSService
+      içinde süreç genelinde sınırlanır (TTS_PROVIDER_CONCURRENCY), eşzamanlı
+      yapılar sağlayıcı yükünü katlamaz
+    - Manifest ({directory}/{yapı}.json) her bölüm bittiğinde atomik yazılır.
+      Yarıda kalan bir yapı aynı kimlikle tekrar çalıştırıldığında metni ve sesi
+      değişmemiş, çıktısı hâlâ duran bitmiş bölümler atlanır; yalnız eksikler
+      seslendirilir
+    - Süreler tahmin değil, üretilen MP3'ten ölçülür
+    """
+
+    def __init__(self, tts_service, directory: str):
+        self.tts_service = tts_service
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def manifest_path(self, build_id: str) -> str:
+        return os.path.join(self.directory, f"{build_id}.json")
+
+    def load_manifest(self, build_id: str) -> Optional[Dict]:
+        try:
+            with open(self.manifest_path(build_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save_manifest(self, manifest: Dict):
+        manifest["updated_at"] = datetime.now().isoformat()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.manifest_path(manifest["build_id"]))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    async def run(self, build_id: str, chapters: List[Dict]) -> Dict:
+        """
+        Bölümleri seslendirir ve manifest'i döndürür.
+
+        Args:
+            build_id: Yapı kimliği (manifest ve çıktı anahtarlarının öneki)
+            chapters: [{"text", "language", "voice", "emotion", "character_id"}]; eksik
+                alanlar generate_speech varsayılanlarını alır
+
+        Raises:
+            ExternalServiceError: Bir ya da daha fazla bölüm üretilemediyse. Biten
+                bölümler manifest'te kalır; aynı build_id ile tekrar çağrı devam eder.
+        """
+        previous = {
+            entry["number"]: entry
+            for entry in (self.load_manifest(build_id) or {}).get("chapters", [])
+        }
+        reusable = [
+            previous.get(number) for number in range(1, len(chapters) + 1)
+        ]
+        present = await asyncio.gather(*(
+            output_exists(done["audio_url"]) if done and done.get("status") == "done" else asyncio.sleep(0, False)
+            for done in reusable
+        ))
+        entries = []
+        for number, chapter in enumerate(chapters, 1):
+            params = {
+                "language": chapter.get("language", "tr"),
+                "voice": chapter.get("voice"),
+                "emotion": chapter.get("emotion"),
+                "character_id": chapter.get("character_id"),
+            }
+            key = chunk_key(chapter["text"], **params)
+            done = reusable[number - 1]
+            # Çıktısı silinmiş (ör. buluttan kaldırılmış) bölüm yeniden üretilir
+            if done and done.get("status") == "done" and done.get("key") == key and present[number - 1]:
+                entries.append(done)
+                continue
+            entries.append({
+                "number": number,
+                "key": key,
+                "audio_id": f"{build_id}_{number:03d}",
+                "provider": self.tts_service.provider_for(params["voice"], params["character_id"]),
+                "params": params,
+                "status": "pending",
+            })
+
+        manifest = {"build_id": build_id, "status": "running", "chapters": entries}
+        self._save_manifest(manifest)
+
+        async def produce(entry: Dict, text: str):
+            params = entry["params"]
+            try:
+                result = await self.tts_service.synthesize(
+                    text, params["language"], entry["audio_id"],
+                    voice=params["voice"], emotion=params["emotion"], character_id=params["character_id"],
+                )
+            except Exception as e:
+                entry.update(status="failed", error=str(e))
+            else:
+                entry.update(status="done", audio_url=result["audio_url"], duration=result["duration"])
+                entry.pop("error", None)
+            # Her bölümden sonra kaydedilir: süreç çökse bile bitenler kaybolmaz
+            self._save_manifest(manifest)
+
+        # Bir bölümün hatası diğerlerini iptal etmez; bitenler devam için saklanır
+        await asyncio.gather(*(
+            produce(entry, chapter["text"])
+            for entry, chapter in zip(entries, chapters)
+            if entry["status"] != "done"
+        ))
+
+        failed = [entry["number"] for entry in entries if entry["status"] != "done"]
+        manifest["status"] = "failed" if failed else "completed"
+        manifest["total_duration"] = round(sum(entry.get("duration", 0.0) for entry in entries), 2)
+        self._save_manifest(manifest)
+        if failed:
+            error = ExternalServiceError("tts", f"{len(failed)}/{len(entries)} bölüm seslendirilemedi")
+            error.details.update(build_id=build_id, failed_chapters=failed)
+            raise error
+        return manifest
@@ -6,6 +6,8 @@ from datetime import datetime
 from app.services.story_service import StoryService
 from app.services.image_service import ImageService
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.core.document_store import get_document_store
 
 
 class CharacterService:
@@ -13,6 +15,9 @@ class CharacterService:
         self.story_service = StoryService()
         self.image_service = ImageService()
         self.characters_file = f"{settings.STORAGE_PATH}/characters.json"
+        self.characters_store = get_document_store(
+            self.characters_file, default_factory=list, item_key='character_id'
+        )
         self._ensure_characters_file()
     
     def _ensure_characters_file(self):
@@ -21,19 +26,6 @@ class CharacterService:
             with open(self.characters_file, 'w', encoding='utf-8') as f:
                 json.dump([], f, ensure_ascii=False, indent=2)
     
-    def _load_characters(self) -> List[Dict]:
-        """Tüm karakterleri yükler."""
-        try:
-            with open(self.characters_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_characters(self, characters: List[Dict]):
-        """Karakterleri kaydeder."""
-        with open(self.characters_file, 'w', encoding='utf-8') as f:
-            json.dump(characters, f, ensure_ascii=False, indent=2)
-    
     async def create_character(
         self,
         name: Optional[str] = None,
@@ -98,9 +90,7 @@ class CharacterService:
         }
         
         # Karakteri kaydet
-        characters = self._load_characters()
-        characters.append(character)
-        self._save_characters(characters)
+        self.characters_store.append(character)
         
         return character
     
@@ -139,22 +129,23 @@ Please provide the following information in JSON format:
 Return only the data in JSON format, no other explanation."""
         
         try:
-            if self.story_service.openai_client:
-                response = self.story_service.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "Sen bir karakter tasarımcısısın. JSON formatında karakter bilgileri üretirsin."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.8
-                )
-                import re
-                json_str = response.choices[0].message.content.strip()
-                # JSON'u temizle
-                json_str = re.sub(r'```json\n?', '', json_str)
-                json_str = re.sub(r'```\n?', '', json_str)
-                return json.loads(json_str)
+            response = await llm_gateway.chat_completion(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "Sen bir karakter tasarımcısısın. JSON formatında karakter bilgileri üretirsin."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.8,
+                cache=False,
+                cache_namespace="character"
+            )
+            import re
+            json_str = response.choices[0].message.content.strip()
+            # JSON'u temizle
+            json_str = re.sub(r'```json\n?', '', json_str)
+            json_str = re.sub(r'```\n?', '', json_str)
+            return json.loads(json_str)
         except Exception as e:
             print(f"Karakter bilgisi üretim hatası: {e}")
         
@@ -169,37 +160,24 @@ Return only the data in JSON format, no other explanation."""
     
     def get_all_characters(self, user_id: Optional[str] = None) -> List[Dict]:
         """Tüm karakterleri getirir."""
-        characters = self._load_characters()
         if user_id:
-            characters = [c for c in characters if c.get('user_id') == user_id]
-        return characters
+            return self.characters_store.items(lambda c: c.get('user_id') == user_id)
+        return self.characters_store.items()
     
     def get_character(self, character_id: str) -> Optional[Dict]:
         """Belirli bir karakteri getirir."""
-        characters = self._load_characters()
-        return next((c for c in characters if c.get('character_id') == character_id), None)
+        return self.characters_store.get_item(character_id)
     
     def update_character(self, character_id: str, updates: Dict) -> Optional[Dict]:
         """Karakteri günceller."""
-        characters = self._load_characters()
-        character = next((c for c in characters if c.get('character_id') == character_id), None)
-        
-        if not character:
-            return None
+        def apply(character: Dict) -> Dict:
+            character.update(updates)
+            character['updated_at'] = datetime.now().isoformat()
+            return character
         
-        character.update(updates)
-        character['updated_at'] = datetime.now().isoformat()
-        self._save_characters(characters)
-        return character
+        return self.characters_store.update_item(character_id, apply)
     
     def delete_character(self, character_id: str) -> bool:
         """Karakteri siler."""
-        characters = self._load_characters()
-        initial_count = len(characters)
-        characters = [c for c in characters if c.get('character_id') != character_id]
-        
-        if len(characters) < initial_count:
-            self._save_characters(characters)
-            return True
-        return False
+        return self.characters_store.remove_items(lambda c: c.get('character_id') == character_id) > 0
 
@@ -1,13 +1,10 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 
 
 class ContentModerationService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
-    
     async def moderate_content(
         self,
         text: str,
@@ -48,13 +45,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir içerik moderasyon uzmanısın. İçerikleri güvenlik ve uygunluk açısından kontrol ediyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1
+                temperature=0.1,
+                cache_namespace="content_moderation"
             )
             
             moderation_text = response.choices[0].message.content
@@ -178,13 +176,14 @@ Orijinal Metin:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir içerik editörüsün. Metinleri uygun hale getiriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="content_moderation"
             )
             
             improved_text = response.choices[0].message.content.strip()
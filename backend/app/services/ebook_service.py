@@ -1,29 +1,44 @@
 from typing import Dict, Optional
+import asyncio
 import os
-import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.services.export_engine import ExportArtifactStore, artifact_key, epub_chapter, render_epub
 from app.services.story_storage import StoryStorage
-try:
-    from ebooklib import epub
-    EBOOKLIB_AVAILABLE = True
-except ImportError:
-    EBOOKLIB_AVAILABLE = False
-    epub = None
-import json
+
+_EBOOK_CSS = 'body { font-family: Arial, sans-serif; }'
+
+
+def _chapter_html(story: Dict) -> str:
+    story_text = story.get('story_text', '')
+    return f"""
+        <html>
+        <head>
+            <title>{story.get('theme', 'Hikâye')}</title>
+        </head>
+        <body>
+            <h1>{story.get('theme', 'Hikâye')}</h1>
+            <p>{story_text.replace(chr(10), '</p><p>')}</p>
+        </body>
+        </html>
+        """
 
 
 class EbookService:
     def __init__(self):
         self.story_storage = StoryStorage()
         self.ebooks_path = os.path.join(settings.STORAGE_PATH, "ebooks")
-        self._ensure_directory()
-    
-    def _ensure_directory(self):
-        """E-kitap dizinini oluşturur."""
-        os.makedirs(self.ebooks_path, exist_ok=True)
+        # İçerik adresli çıktılar: aynı kitap tekrar istenirse yeniden üretilmez
+        self.artifacts = ExportArtifactStore(self.ebooks_path)
+
+    async def _write_epub(self, book: Dict) -> str:
+        """Kitabı işlem havuzunda yazar (ya da hazır olanı kullanır); e-kitap ID'sini döndürür."""
+        # Büyük koleksiyonlarda özet hesabı da olay döngüsünü tutmasın
+        ebook_id = await asyncio.to_thread(artifact_key, 'epub', 'ebook', book)
+        await self.artifacts.render(ebook_id, 'epub', render_epub, {**book, 'identifier': ebook_id})
+        return ebook_id
     
-    def create_epub(
+    async def create_epub(
         self,
         story_id: str,
         title: Optional[str] = None,
@@ -44,68 +59,18 @@ class EbookService:
         if not story:
             raise ValueError("Hikâye bulunamadı")
         
-        # EPUB kitap oluştur
-        book = epub.EpubBook()
-        
-        # Metadata
-        book.set_identifier(str(uuid.uuid4()))
-        book.set_title(title or story.get('theme', 'Masal'))
-        book.set_language(story.get('language', 'tr'))
-        
-        if author:
-            book.add_author(author)
-        else:
-            book.add_author('Masal Fabrikası')
-        
-        # Kapak görseli (varsa)
-        if story.get('image_url'):
-            # Görseli ekle (gerçek uygulamada dosyadan okunmalı)
-            pass
-        
-        # Bölüm oluştur
-        chapter = epub.EpubHtml(
-            title=story.get('theme', 'Hikâye'),
-            file_name='chapter.xhtml',
-            lang=story.get('language', 'tr')
-        )
-        
-        # Hikâye metnini HTML'e çevir
-        story_text = story.get('story_text', '')
-        html_content = f"""
-        <html>
-        <head>
-            <title>{story.get('theme', 'Hikâye')}</title>
-        </head>
-        <body>
-            <h1>{story.get('theme', 'Hikâye')}</h1>
-            <p>{story_text.replace(chr(10), '</p><p>')}</p>
-        </body>
-        </html>
-        """
-        
-        chapter.content = html_content
-        book.add_item(chapter)
-        
-        # Table of contents
-        book.toc = [chapter]
-        
-        # Spine
-        book.spine = [chapter]
-        
-        # CSS (opsiyonel)
-        nav_css = epub.EpubItem(
-            uid="nav_css",
-            file_name="style/nav.css",
-            media_type="text/css",
-            content='body { font-family: Arial, sans-serif; }'
-        )
-        book.add_item(nav_css)
-        
-        # Dosyayı kaydet
-        ebook_id = str(uuid.uuid4())
-        ebook_path = os.path.join(self.ebooks_path, f"{ebook_id}.epub")
-        epub.write_epub(ebook_path, book)
-        
+        # Kapak görseli henüz eklenmiyor
+        book = {
+            'title': title or story.get('theme', 'Masal'),
+            'language': story.get('language', 'tr'),
+            'author': author or 'Masal Fabrikası',
+            'chapters': [epub_chapter(
+                story.get('theme', 'Hikâye'), 'chapter.xhtml', story.get('language', 'tr'), _chapter_html(story),
+            )],
+            'css': _EBOOK_CSS,
+        }
+        ebook_id = await self._write_epub(book)
+
         return {
             "ebook_id": ebook_id,
             "file_path": f"/storage/ebooks/{ebook_id}.epub",
@@ -114,7 +79,7 @@ class EbookService:
             "created_at": datetime.now().isoformat()
         }
     
-    def create_mobi(
+    async def create_mobi(
         self,
         story_id: str,
         title: Optional[str] = None,
@@ -126,7 +91,7 @@ class EbookService:
         Bu basit bir implementasyon, gerçek uygulamada calibre kullanılabilir.
         """
         # Önce EPUB oluştur
-        epub_result = self.create_epub(story_id, title, author)
+        epub_result = await self.create_epub(story_id, title, author)
         
         # EPUB'u MOBI'ye çevir (calibre ile)
         # Bu kısım gerçek uygulamada calibre komut satırı aracı kullanılabilir
@@ -141,7 +106,7 @@ class EbookService:
             "created_at": datetime.now().isoformat()
         }
     
-    def create_azw3(
+    async def create_azw3(
         self,
         story_id: str,
         title: Optional[str] = None,
@@ -152,7 +117,7 @@ class EbookService:
         Not: AZW3 oluşturmak için calibre gerekir.
         """
         # Önce EPUB oluştur
-        epub_result = self.create_epub(story_id, title, author)
+        epub_result = await self.create_epub(story_id, title, author)
         
         return {
             "ebook_id": epub_result["ebook_id"],
@@ -163,7 +128,7 @@ class EbookService:
             "created_at": datetime.now().isoformat()
         }
     
-    def create_collection_ebook(
+    async def create_collection_ebook(
         self,
         story_ids: list,
         collection_title: str,
@@ -180,56 +145,25 @@ class EbookService:
         Returns:
             E-kitap bilgileri
         """
-        book = epub.EpubBook()
-        book.set_identifier(str(uuid.uuid4()))
-        book.set_title(collection_title)
-        book.set_language('tr')
-        
-        if author:
-            book.add_author(author)
-        else:
-            book.add_author('Masal Fabrikası')
-        
         chapters = []
-        toc_items = []
-        
         for i, story_id in enumerate(story_ids, 1):
             story = self.story_storage.get_story(story_id)
             if not story:
                 continue
-            
-            chapter = epub.EpubHtml(
-                title=f"{i}. {story.get('theme', 'Hikâye')}",
-                file_name=f'chapter_{i}.xhtml',
-                lang=story.get('language', 'tr')
-            )
-            
-            story_text = story.get('story_text', '')
-            html_content = f"""
-            <html>
-            <head>
-                <title>{story.get('theme', 'Hikâye')}</title>
-            </head>
-            <body>
-                <h1>{story.get('theme', 'Hikâye')}</h1>
-                <p>{story_text.replace(chr(10), '</p><p>')}</p>
-            </body>
-            </html>
-            """
-            
-            chapter.content = html_content
-            book.add_item(chapter)
-            chapters.append(chapter)
-            toc_items.append(chapter)
-        
-        book.toc = toc_items
-        book.spine = chapters
-        
-        # Dosyayı kaydet
-        ebook_id = str(uuid.uuid4())
-        ebook_path = os.path.join(self.ebooks_path, f"{ebook_id}.epub")
-        epub.write_epub(ebook_path, book)
-        
+            chapters.append(epub_chapter(
+                f"{i}. {story.get('theme', 'Hikâye')}", f'chapter_{i}.xhtml',
+                story.get('language', 'tr'), _chapter_html(story),
+            ))
+
+        # EPUB derleme ve zip yazımı API worker'ında değil, işlem havuzunda
+        book = {
+            'title': collection_title,
+            'language': 'tr',
+            'author': author or 'Masal Fabrikası',
+            'chapters': chapters,
+        }
+        ebook_id = await self._write_epub(book)
+
         return {
             "ebook_id": ebook_id,
             "file_path": f"/storage/ebooks/{ebook_id}.epub",
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 import re
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class EducationLearningService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
         self.learning_progress_file = f"{settings.STORAGE_PATH}/learning_progress.json"
         self._ensure_file()
@@ -127,13 +126,15 @@ Hikâye eğlenceli, öğretici ve yaş grubuna uygun olmalı. JSON formatında d
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir eğitim uzmanısın. Eğitici hikâyeler yazıyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="education_learning"
             )
             
             result_text = response.choices[0].message.content
@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.services.image_derivatives import content_digest, digest_from_url, get_image_derivative_store
+
+logger = logging.getLogger(__name__)
+
+# Şablonlarda görünür bir değişiklik yapıldığında artırılır: eski çıktılar yeniden üretilir
+TEMPLATE_VERSION = 1
+
+
+# ---------------------------------------------------------------------- #
+# Çizimciler (işlem havuzunda çalışır; yalnızca pickle'lanabilir veri alır)
+# ---------------------------------------------------------------------- #
+
+def render_story_pdf(story: Dict, image_path: Optional[str], output_path: str) -> None:
+    """Tek hikâyelik PDF (ReportLab): başlık, tema, görsel ve paragraflar."""
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image as RLImage
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle', parent=styles['Heading1'], fontSize=24, textColor='#6200ee',
+        spaceAfter=30, alignment=TA_CENTER,
+    )
+    theme_style = ParagraphStyle(
+        'CustomTheme', parent=styles['Heading2'], fontSize=18, textColor='#333',
+        spaceAfter=20, alignment=TA_CENTER,
+    )
+    body_style = ParagraphStyle(
+        'CustomBody', parent=styles['BodyText'], fontSize=12, textColor='#000',
+        spaceAfter=12, alignment=TA_JUSTIFY, leading=18,
+    )
+
+    content = [Paragraph("Masal Fabrikası AI", title_style), Spacer(1, 0.5 * inch)]
+    if story.get('theme'):
+        content += [Paragraph(f"Tema: {story.get('theme')}", theme_style), Spacer(1, 0.3 * inch)]
+    if image_path:
+        content += [RLImage(image_path, width=5 * inch, height=3.75 * inch), Spacer(1, 0.3 * inch)]
+    for para in (story.get('story_text') or '').split('\n\n'):
+        if para.strip():
+            content += [Paragraph(para.strip().replace('\n', '<br/>'), body_style), Spacer(1, 0.2 * inch)]
+
+    SimpleDocTemplate(output_path, pagesize=A4).build(content)
+
+
+def render_epub(book_data: Dict, output_path: str) -> None:
+    """
+    EPUB yazar. book_data: identifier, title, language, author, chapters
+    ([{title, file_name, lang, content}]), isteğe bağlı css ve nav (NCX + Nav).
+    """
+    from ebooklib import epub
+
+    book = epub.EpubBook()
+    book.set_identifier(book_data['identifier'])
+    book.set_title(book_data['title'])
+    book.set_language(book_data['language'])
+    book.add_author(book_data['author'])
+
+    chapters = []
+    for data in book_data['chapters']:
+        chapter = epub.EpubHtml(title=data['title'], file_name=data['file_name'], lang=data['lang'])
+        chapter.content = data['content']
+        book.add_item(chapter)
+        chapters.append(chapter)
+
+    book.toc = list(chapters)
+    if book_data.get('nav'):
+        book.spine = ['nav'] + chapters
+        book.add_item(epub.EpubNcx())
+        book.add_item(epub.EpubNav())
+    else:
+        book.spine = chapters
+    if book_data.get('css'):
+        book.add_item(epub.EpubItem(
+            uid="nav_css", file_name="style/nav.css", media_type="text/css", content=book_data['css'],
+        ))
+    epub.write_epub(output_path, book)
+
+
+def _render_to(renderer: Callable, args: tuple, output_path: str) -> None:
+    """Geçici dosyaya çizip os.replace ile yerine taşır; yarım dosya asla görünmez."""
+    folder = os.path.dirname(output_path)
+    suffix = os.path.splitext(output_path)[1]
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=f".tmp{suffix}")
+    os.close(fd)
+    try:
+        renderer(*args, tmp)
+        os.replace(tmp, output_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# ---------------------------------------------------------------------- #
+# Yardımcılar
+# ---------------------------------------------------------------------- #
+
+def _feed(hasher, value) -> None:
+    """Yapıyı ara JSON metni üretmeden, tür ve uzunluk önekli olarak özete ekler."""
+    if isinstance(value, dict):
+        hasher.update(b"d%d:" % len(value))
+        for key in sorted(value):
+            _feed(hasher, str(key))
+            _feed(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"l%d:" % len(value))
+        for item in value:
+            _feed(hasher, item)
+    else:
+        data = value.encode("utf-8") if isinstance(value, str) else repr(value).encode("utf-8")
+        hasher.update(b"s%d:" % len(data) if isinstance(value, str) else b"r%d:" % len(data))
+        hasher.update(data)
+
+
+def artifact_key(fmt: str, template: str, payload) -> str:
+    """Çıktının içerik adresi: şablon sürümü + şablon + format + içerik (SHA-256, ilk 128 bit)."""
+    hasher = hashlib.sha256()
+    _feed(hasher, [TEMPLATE_VERSION, template, fmt, payload])
+    return hasher.hexdigest()[:32]
+
+
+def local_image_path(image_url: Optional[str]) -> Optional[str]:
+    """
+    Hikâye görselinin diskteki yolu: /storage/... URL'leri doğrudan depodan,
+    bulut URL'leri içerik özetiyle türev deposundaki orijinalden. HTTP isteği yapılmaz.
+    """
+    if not image_url:
+        return None
+    path = urlparse(image_url).path
+    if path.startswith("/storage/"):
+        root = os.path.realpath(settings.STORAGE_PATH)
+        candidate = os.path.realpath(os.path.join(root, path[len("/storage/"):]))
+        if candidate.startswith(root + os.sep) and os.path.isfile(candidate):
+            return candidate
+    digest = digest_from_url(image_url)
+    if digest:
+        return get_image_derivative_store().original_path(digest)
+    return None
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return content_digest(f.read())
+
+
+# Görsel indirmeleri döngü başına tek bir havuzlu istemciyi paylaşır
+_download_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _download_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _download_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _download_clients[loop] = httpx.AsyncClient(timeout=10.0, follow_redirects=True)
+    return client
+
+
+async def _download(image_url: str) -> Optional[bytes]:
+    try:
+        response = await _download_client().get(image_url)
+        if response.status_code == 200 and response.content:
+            return response.content
+        logger.warning(f"Görsel indirilemedi ({response.status_code}): {image_url}")
+    except httpx.HTTPError as e:
+        logger.warning(f"Görsel indirilemedi: {image_url} ({e})")
+    return None
+
+
+async def resolve_story_image(image_url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Hikâye görselinin (disk yolu, içerik özeti) çifti; görsel yoksa (None, None).
+
+    Önce depodan okunur (local_image_path). Yerel kopyası olmayan bulut
+    görselleri (ör. yüklendikten sonra yerel dosyası silinen eski UUID adlı
+    görseller) bir kez indirilip türev deposuna orijinal olarak yazılır.
+    Özet, dışa aktarma anahtarına girer: görselsiz üretilen bir çıktı görsel
+    erişilebilir olduğunda yeniden üretilir.
+    """
+    path = local_image_path(image_url)
+    if path:
+        digest = digest_from_url(image_url) or await asyncio.to_thread(_file_digest, path)
+        return path, digest
+    if not image_url or urlparse(image_url).scheme not in ("http", "https"):
+        return None, None
+    data = await _download(image_url)
+    if not data:
+        return None, None
+    extension = os.path.splitext(urlparse(image_url).path)[1].lstrip(".") or "png"
+    store = get_image_derivative_store()
+    digest = await asyncio.to_thread(store.store_original, data, extension)
+    return store.original_path(digest), digest
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _export_executor() -> Optional[ProcessPoolExecutor]:
+    """Paylaşılan çizim havuzu; EXPORT_WORKERS=0 ise varsayılan thread havuzu."""
+    global _executor
+    if settings.EXPORT_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.EXPORT_WORKERS)
+    return _executor
+
+
+def shutdown_export_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class ExportArtifactStore:
+    """
+    İçerik adresli dışa aktarma çıktıları (PDF/EPUB).
+
+    Disk düzeni: {directory}/{anahtar}.{format}
+    Anahtar içerikten türetildiği için aynı hikâye/koleksiyon aynı dosyaya düşer:
+    tekrar eden dışa aktarmalar çizim yapmadan hazır dosyayı döndürür. Çizim
+    işlem havuzunda yapılır, API worker'ının olay döngüsü bloklanmaz; aynı
+    anahtar için eşzamanlı istekler tek çizimi bekler.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._inflight: Dict[str, asyncio.Future] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    async def render(self, key: str, fmt: str, renderer: Callable, *args) -> str:
+        """Çıktı yoksa `renderer(*args, çıktı_yolu)` ile üretir; dosya yolunu döndürür."""
+        path = self.path(key, fmt)
+        if os.path.exists(path):
+            return path
+        pending = self._inflight.get(path)
+        if pending is None:
+            pending = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(
+                _export_executor(), _render_to, renderer, args, path,
+            ))
+            self._inflight[path] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(path, None))
+        await asyncio.shield(pending)
+        return path
+
+
+def epub_chapter(title: str, file_name: str, lang: str, content: str) -> Dict:
+    return {'title': title, 'file_name': file_name, 'lang': lang, 'content': content}
+
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class FamilyStoryCreationService:
     """Ebeveyn-çocuk birlikte hikaye oluşturma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.family_sessions_file = os.path.join(settings.STORAGE_PATH, "family_sessions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.family_sessions_file):
-            with open(self.family_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.family_sessions_store = get_document_store(
+            self.family_sessions_file, default_factory=list, item_key="session_id"
+        )
     
     async def start_family_session(
         self,
@@ -44,9 +38,7 @@ class FamilyStoryCreationService:
             "created_at": datetime.now().isoformat()
         }
         
-        sessions = self._load_sessions()
-        sessions.append(session)
-        self._save_sessions(sessions)
+        self.family_sessions_store.append(session)
         
         # Çocuk için uygun başlangıç önerisi
         suggestion = await self._generate_age_appropriate_suggestion(child_age, initial_idea)
@@ -65,12 +57,6 @@ class FamilyStoryCreationService:
         contributor_type: str  # "parent" or "child"
     ) -> Dict:
         """Katkı ekler."""
-        sessions = self._load_sessions()
-        session = next((s for s in sessions if s["session_id"] == session_id), None)
-        
-        if not session:
-            raise ValueError("Oturum bulunamadı")
-        
         contribution = {
             "contribution_id": str(uuid.uuid4()),
             "contributor_id": contributor_id,
@@ -79,11 +65,15 @@ class FamilyStoryCreationService:
             "timestamp": datetime.now().isoformat()
         }
         
-        session["contributions"].append(contribution)
-        session["story_text"] += " " + contribution_text
-        session["updated_at"] = datetime.now().isoformat()
+        def contribute(session: Dict) -> Dict:
+            session["contributions"].append(contribution)
+            session["story_text"] += " " + contribution_text
+            session["updated_at"] = datetime.now().isoformat()
+            return session
         
-        self._save_sessions(sessions)
+        session = self.family_sessions_store.update_item(session_id, contribute)
+        if not session:
+            raise ValueError("Oturum bulunamadı")
         
         # AI ile öneri oluştur
         next_suggestion = await self._generate_next_suggestion(
@@ -104,8 +94,7 @@ class FamilyStoryCreationService:
         parent_id: str
     ) -> Dict:
         """Hikayeyi tamamlar."""
-        sessions = self._load_sessions()
-        session = next((s for s in sessions if s["session_id"] == session_id), None)
+        session = self.family_sessions_store.get_item(session_id)
         
         if not session:
             raise ValueError("Oturum bulunamadı")
@@ -119,11 +108,14 @@ class FamilyStoryCreationService:
             session["child_age"]
         )
         
-        session["final_story"] = improved_story
-        session["status"] = "completed"
-        session["completed_at"] = datetime.now().isoformat()
+        def finalize(session: Dict) -> Dict:
+            session["final_story"] = improved_story
+            session["status"] = "completed"
+            session["completed_at"] = datetime.now().isoformat()
+            return session
         
-        self._save_sessions(sessions)
+        # Öneri beklenirken eklenen katkılar korunur
+        session = self.family_sessions_store.update_item(session_id, finalize) or session
         
         return {
             "session_id": session_id,
@@ -150,14 +142,16 @@ class FamilyStoryCreationService:
 
 Kısa, yaratıcı ve çocuğun ilgisini çekecek bir başlangıç."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir çocuk hikayesi uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=200
+            max_tokens=200,
+            cache=False,
+            cache_namespace="family_story_creation"
         )
         
         return response.choices[0].message.content
@@ -176,14 +170,16 @@ Kısa, yaratıcı ve çocuğun ilgisini çekecek bir başlangıç."""
 
 {next_person} için bir sonraki cümle önerisi yap. Kısa ve yaratıcı olsun."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=150
+            max_tokens=150,
+            cache=False,
+            cache_namespace="family_story_creation"
         )
         
         return response.choices[0].message.content
@@ -199,28 +195,17 @@ Dil basit ve anlaşılır olsun, ama hikayenin özünü koru:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir çocuk hikayesi editörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="family_story_creation"
         )
         
         return response.choices[0].message.content
-    
-    def _load_sessions(self) -> List[Dict]:
-        """Oturumları yükler."""
-        try:
-            with open(self.family_sessions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_sessions(self, sessions: List[Dict]):
-        """Oturumları kaydeder."""
-        with open(self.family_sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, ensure_ascii=False, indent=2)
 
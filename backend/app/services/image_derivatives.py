@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, features
+
+from app.core.config import settings
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{32}$")
+_DERIVATIVE_NAME_RE = re.compile(r"^(\d+)w\.([a-z0-9]+)$")
+_URL_DIGEST_RE = re.compile(r"(?:^|/)(?:story_)?([0-9a-f]{32})(?:\.[a-z0-9]+)?$")
+
+MEDIA_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+}
+
+# Kodlayıcı ayarları: AVIF'te speed yüksek = hızlı kodlama, biraz daha büyük dosya
+_SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "method": 4},
+    "avif": {"format": "AVIF", "speed": 8},
+}
+
+
+def content_digest(data: bytes) -> str:
+    """Görsel baytlarının içerik adresi (SHA-256'nın ilk 128 biti, hex)."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def digest_from_url(url: Optional[str]) -> Optional[str]:
+    """
+    Görsel URL'sinden içerik özetini çıkarır.
+
+    Hattan geçen görseller özetleriyle adlandırılır (yerel: /storage/images/{özet}.png,
+    bulut: .../story_{özet}.webp); eski UUID adlı görseller için None döner.
+    """
+    if not url:
+        return None
+    match = _URL_DIGEST_RE.search(url.split("?", 1)[0])
+    return match.group(1) if match else None
+
+
+def render_derivatives(original_path: str, out_dir: str, sizes: List[Tuple[int, str]], quality: int) -> List[str]:
+    """
+    Orijinal görselden istenen (genişlik, format) türevlerini üretir.
+
+    İşlem havuzunda çalışır: orijinal bir kez çözülür, genişlikler büyükten küçüğe
+    küçültülür. Görselden geniş türevler büyütülmez (orijinal genişlikte yazılır).
+    Dosyalar geçici dosya + os.replace ile atomik yazılır. Yazılan yolları döndürür.
+    """
+    written = []
+    with Image.open(original_path) as source:
+        source.load()
+        has_alpha = source.mode in ("RGBA", "LA", "P") and (
+            source.mode != "P" or "transparency" in source.info
+        )
+        image = source.convert("RGBA" if has_alpha else "RGB")
+
+    for width, fmt in sorted(sizes, reverse=True):
+        path = os.path.join(out_dir, f"{width}w.{fmt}")
+        if os.path.exists(path):
+            continue
+        if width < image.width:
+            resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+        else:
+            resized = image
+        fd, tmp = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                resized.save(f, quality=quality, **_SAVE_OPTIONS[fmt])
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        written.append(path)
+    return written
+
+
+class ImageDerivativeStore:
+    """
+    Hikâye görselleri için içerik adresli duyarlı (responsive) türev deposu.
+
+    Disk düzeni: {directory}/{özetin ilk 2 hanesi}/{özet}/original.{uzantı}
+                                                      /{genişlik}w.{format}
+    Aynı içerik aynı dizine düşer; bir dosya bir kez yazıldıktan sonra asla
+    değişmez, bu yüzden URL'ler süresiz önbelleklenebilir. Türevler alımda
+    işlem havuzunda üretilir; eksik kalan bir boyut ilk isteğinde üretilir.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        widths: Iterable[int],
+        formats: Iterable[str],
+        quality: int = 75,
+        workers: int = 2,
+        base_url: str = "/api/images",
+    ):
+        self.directory = directory
+        self.widths = sorted({int(w) for w in widths if int(w) > 0})
+        # AVIF kodlayıcısı olmayan Pillow kurulumlarında o format atlanır
+        self.formats = [f for f in formats if f in _SAVE_OPTIONS and features.check(f)]
+        self.quality = quality
+        self.workers = workers
+        self.base_url = base_url.rstrip("/")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _dir(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def original_path(self, digest: str) -> Optional[str]:
+        if not DIGEST_RE.match(digest or ""):
+            return None
+        folder = self._dir(digest)
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return None
+        for name in names:
+            if name.startswith("original."):
+                return os.path.join(folder, name)
+        return None
+
+    def url(self, digest: str, width: int, fmt: str) -> str:
+        return f"{self.base_url}/{digest}/{width}w.{fmt}"
+
+    def srcset(self, digest: str, fmt: str) -> str:
+        """HTML srcset biçiminde: '{url} 160w, {url} 320w, ...'."""
+        return ", ".join(f"{self.url(digest, w, fmt)} {w}w" for w in self.widths)
+
+    def srcsets_for_url(self, image_url: Optional[str]) -> Dict[str, Optional[str]]:
+        """StoryListItem alanları: image_srcset (WebP) ve image_srcset_avif; türetilemeyen görsellerde None."""
+        digest = digest_from_url(image_url)
+        if not digest or not self.original_path(digest):
+            return {"image_srcset": None, "image_srcset_avif": None}
+        return {
+            "image_srcset": self.srcset(digest, "webp") if "webp" in self.formats else None,
+            "image_srcset_avif": self.srcset(digest, "avif") if "avif" in self.formats else None,
+        }
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None  # varsayılan thread havuzu
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def _render(self, digest: str, sizes: List[Tuple[int, str]]) -> None:
+        original = self.original_path(digest)
+        await asyncio.get_running_loop().run_in_executor(
+            self._pool(), render_derivatives, original, self._dir(digest), sizes, self.quality
+        )
+
+    def store_original(self, data: bytes, extension: str = "png") -> str:
+        """Orijinali (yoksa) özetiyle saklar, türev üretmeden özeti döndürür."""
+        digest = content_digest(data)
+        folder = self._dir(digest)
+        os.makedirs(folder, exist_ok=True)
+        if not self.original_path(digest):
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, os.path.join(folder, f"original.{extension.lstrip('.').lower()}"))
+        return digest
+
+    async def ingest(self, data: bytes, extension: str = "png") -> str:
+        """
+        Orijinali özetiyle saklar ve tüm türevleri üretir; özeti döndürür.
+
+        Aynı görsel daha önce alındıysa yalnızca eksik türevler üretilir.
+        """
+        digest = self.store_original(data, extension)
+        folder = self._dir(digest)
+        missing = [
+            (w, f) for w in self.widths for f in self.formats
+            if not os.path.exists(os.path.join(folder, f"{w}w.{f}"))
+        ]
+        # Format başına bir iş: havuzdaki worker'lar formatları paralel kodlar
+        by_format: Dict[str, List[Tuple[int, str]]] = {}
+        for size in missing:
+            by_format.setdefault(size[1], []).append(size)
+        await asyncio.gather(*(self._render(digest, sizes) for sizes in by_format.values()))
+        return digest
+
+    async def resolve(self, digest: str, name: str) -> Optional[str]:
+        """
+        /{özet}/{ad} isteğinin dosya yolunu döndürür; izinli ama eksik bir
+        boyutsa önce üretir. Geçersiz ya da bilinmeyen istekte None.
+        """
+        original = self.original_path(digest)
+        if not original:
+            return None
+        if name == os.path.basename(original):
+            return original
+        match = _DERIVATIVE_NAME_RE.match(name)
+        if not match:
+            return None
+        width, fmt = int(match.group(1)), match.group(2)
+        if width not in self.widths or fmt not in self.formats:
+            return None
+        path = os.path.join(self._dir(digest), name)
+        if os.path.exists(path):
+            return path
+
+        # Aynı boyut için eşzamanlı istekler tek üretimi bekler
+        pending = self._inflight.get(path)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(digest, [(width, fmt)]))
+            self._inflight[path] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(path, None))
+        await asyncio.shield(pending)
+        return path
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_store: Optional[ImageDerivativeStore] = None
+
+
+def get_image_derivative_store() -> ImageDerivativeStore:
+    """Süreç genelinde paylaşılan türev deposu (ayarlardan)."""
+    global _store
+    if _store is None:
+        _store = ImageDerivativeStore(
+            settings.IMAGE_DERIVATIVE_PATH or os.path.join(settings.STORAGE_PATH, "images", "derived"),
+            widths=[w for w in settings.IMAGE_DERIVATIVE_WIDTHS.split(",") if w.strip()],
+            formats=[f.strip().lower() for f in settings.IMAGE_DERIVATIVE_FORMATS.split(",") if f.strip()],
+            quality=settings.IMAGE_DERIVATIVE_QUALITY,
+            workers=settings.IMAGE_DERIVATIVE_WORKERS,
+            base_url=settings.IMAGE_DERIVATIVE_BASE_URL,
+        )
+    return _store
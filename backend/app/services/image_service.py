@@ -1,6 +1,4 @@
-import time
-import uuid
-from PIL import Image
+import logging
 import time
 import uuid
 from PIL import Image
@@ -9,6 +7,9 @@ from app.core.config import settings
 from app.services.wiro_client import wiro_client
 from app.services.cloud_storage_service import cloud_storage_service
 from app.core.resilience import openai_circuit_breaker, retry_on_failure
+from app.services.image_derivatives import content_digest, get_image_derivative_store
+
+logger = logging.getLogger(__name__)
 
 class ImageService:
     def __init__(self):
@@ -260,7 +261,12 @@ class ImageService:
         import httpx
         async with httpx.AsyncClient() as client:
             response = await client.get(url)
-            image_id = str(uuid.uuid4())
+            # İçerik adresli ad: liste yanıtları küçük boyutların (srcset) URL'lerini bundan türetir
+            image_id = content_digest(response.content)
+            try:
+                await get_image_derivative_store().ingest(response.content)
+            except Exception as e:
+                logger.warning(f"Görsel türevleri üretilemedi ({image_id}): {e}")
             image_path = f"{settings.STORAGE_PATH}/images/{image_id}.png"
             
             with open(image_path, "wb") as f:
@@ -1,80 +1,141 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
+from app.core.leaderboard_store import (
+    LIKES_BOARD, STORIES_BOARD, XP_BOARD, LeaderboardStore, leaderboards,
+)
 from app.services.user_service import UserService
 from app.services.story_storage import StoryStorage
 from app.services.like_service import LikeService
 
 
 class LeaderboardService:
-    def __init__(self):
+    """
+    Liderlik tabloları. Skorlar `LeaderboardStore` sıralı kümelerinde artımlı
+    tutulur (hikâye kaydı/silme, beğeni ve XP değişikliklerinde güncellenir);
+    burada yalnızca ilk doldurma ve okuma yapılır.
+    """
+
+    def __init__(self, store: Optional[LeaderboardStore] = None):
         self.user_service = UserService()
         self.story_storage = StoryStorage()
         self.like_service = LikeService()
-    
+        self.store = store or leaderboards
+        self._loaders = {
+            STORIES_BOARD: self._load_story_counts,
+            LIKES_BOARD: self._load_like_counts,
+            XP_BOARD: self._load_xp,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Tam hesaplama (ilk doldurma ve uzlaştırma için)
+    # ------------------------------------------------------------------ #
+
+    def _load_story_counts(self) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        for story in self.story_storage.get_all_stories():
+            user_id = story.get('user_id')
+            if user_id:
+                counts[user_id] = counts.get(user_id, 0) + 1
+        return counts
+
+    def _load_like_counts(self) -> Dict[str, float]:
+        # likes.json bir kez okunur; hikâye başına dosya okuması yok
+        likes = self.like_service._load_likes()
+        counts: Dict[str, float] = {}
+        for story in self.story_storage.get_all_stories():
+            user_id = story.get('user_id')
+            like_count = len(likes.get(story.get('story_id'), []))
+            if user_id and like_count:
+                counts[user_id] = counts.get(user_id, 0) + like_count
+        return counts
+
+    def _load_xp(self) -> Dict[str, float]:
+        return {
+            user['user_id']: user.get('xp', 0)
+            for user in self.user_service._load_users().values()
+            if user.get('user_id') and user.get('xp', 0) > 0
+        }
+
+    def _board(self, board: str) -> str:
+        if board not in self._loaders:
+            raise ValueError(f"Bilinmeyen liderlik tablosu: {board}")
+        self.store.ensure_seeded(board, self._loaders[board])
+        return board
+
+    def rebuild(self, board: Optional[str] = None):
+        """Tabloları kaynak verilerden yeniden hesaplar (sapma düzeltme)."""
+        for name in ([board] if board else self._loaders):
+            self.store.rebuild(name, self._loaders[name])
+
+    # ------------------------------------------------------------------ #
+    # Okuma
+    # ------------------------------------------------------------------ #
+
+    def _users_by_id(self, user_ids: Set[str]) -> Dict[str, Dict]:
+        """İstenen kullanıcıları tek geçişte bulur."""
+        return {
+            user['user_id']: user
+            for _, user in self.user_service.store.scan(lambda u: u.get('user_id') in user_ids)
+        }
+
+    def _entries(self, board: str, entries, start_rank: int) -> List[Dict]:
+        users = self._users_by_id({user_id for user_id, _ in entries})
+        result = []
+        for offset, (user_id, score) in enumerate(entries):
+            user = users.get(user_id)
+            if not user:
+                continue
+            entry = {
+                'rank': start_rank + offset + 1,
+                'user_id': user_id,
+                'name': user.get('name', 'Unknown'),
+            }
+            if board == XP_BOARD:
+                entry['xp'] = int(score)
+                entry['level'] = self.user_service._calculate_level(int(score))
+            else:
+                entry['count'] = int(score)
+            result.append(entry)
+        return result
+
+    def get_leaderboard(self, board: str, limit: int = 10, offset: int = 0) -> List[Dict]:
+        """İlk `limit` kullanıcı (O(log N + limit))."""
+        self._board(board)
+        return self._entries(board, self.store.top(board, limit, offset), offset)
+
+    def get_user_rank(self, board: str, user_id: str) -> Dict:
+        """Kullanıcının sırası ve skoru; tabloda yoksa rank None döner."""
+        self._board(board)
+        rank = self.store.rank(board, user_id)
+        score = self.store.score(board, user_id) if rank is not None else None
+        return {
+            'board': board,
+            'user_id': user_id,
+            'rank': rank + 1 if rank is not None else None,
+            'score': int(score or 0),
+            'total': self.store.size(board),
+        }
+
+    def get_around_user(self, board: str, user_id: str, radius: int = 5) -> Dict:
+        """Kullanıcının üstündeki ve altındaki `radius` kişi."""
+        self._board(board)
+        rank, entries = self.store.around(board, user_id, radius)
+        if rank is None:
+            return {'board': board, 'user_id': user_id, 'rank': None, 'leaderboard': []}
+        return {
+            'board': board,
+            'user_id': user_id,
+            'rank': rank + 1,
+            'leaderboard': self._entries(board, entries, max(rank - radius, 0)),
+        }
+
     def get_stories_leaderboard(self, limit: int = 10) -> List[Dict]:
         """Hikâye sayısına göre liderlik tablosu."""
-        users = self.user_service._load_users()
-        stories = self.story_storage.get_all_stories()
-        
-        user_story_counts = {}
-        for story in stories:
-            user_id = story.get('user_id', 'unknown')
-            if user_id not in user_story_counts:
-                user_story_counts[user_id] = 0
-            user_story_counts[user_id] += 1
-        
-        leaderboard = []
-        for user_id, count in sorted(user_story_counts.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            user = self.user_service.get_user(user_id)
-            if user:
-                leaderboard.append({
-                    'user_id': user_id,
-                    'name': user.get('name', 'Unknown'),
-                    'count': count
-                })
-        
-        return leaderboard
-    
+        return self.get_leaderboard(STORIES_BOARD, limit)
+
     def get_likes_leaderboard(self, limit: int = 10) -> List[Dict]:
         """Toplam beğeni sayısına göre liderlik tablosu."""
-        users = self.user_service._load_users()
-        stories = self.story_storage.get_all_stories()
-        
-        user_like_counts = {}
-        for story in stories:
-            user_id = story.get('user_id', 'unknown')
-            likes_data = self.like_service.get_story_likes(story.get('story_id'))
-            like_count = likes_data.get('like_count', 0)
-            
-            if user_id not in user_like_counts:
-                user_like_counts[user_id] = 0
-            user_like_counts[user_id] += like_count
-        
-        leaderboard = []
-        for user_id, count in sorted(user_like_counts.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            user = self.user_service.get_user(user_id)
-            if user:
-                leaderboard.append({
-                    'user_id': user_id,
-                    'name': user.get('name', 'Unknown'),
-                    'count': count
-                })
-        
-        return leaderboard
-    
+        return self.get_leaderboard(LIKES_BOARD, limit)
+
     def get_xp_leaderboard(self, limit: int = 10) -> List[Dict]:
         """XP'ye göre liderlik tablosu."""
-        users = self.user_service._load_users()
-        
-        leaderboard = []
-        for user in users.values():
-            xp_info = self.user_service.get_user_xp(user.get('user_id'))
-            leaderboard.append({
-                'user_id': user.get('user_id'),
-                'name': user.get('name', 'Unknown'),
-                'xp': xp_info.get('xp', 0),
-                'level': xp_info.get('level', 1)
-            })
-        
-        leaderboard.sort(key=lambda x: x.get('xp', 0), reverse=True)
-        return leaderboard[:limit]
-
+        return self.get_leaderboard(XP_BOARD, limit)
@@ -1,59 +1,49 @@
-import json
-import os
 from typing import Dict, List
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.leaderboard_store import LIKES_BOARD, leaderboards
+from app.services.story_storage import StoryStorage
 
 
 class LikeService:
     def __init__(self):
         self.likes_file = f"{settings.STORAGE_PATH}/likes.json"
-        self._ensure_likes_file()
-    
-    def _ensure_likes_file(self):
-        """Likes dosyasının var olduğundan emin olur."""
-        if not os.path.exists(self.likes_file):
-            with open(self.likes_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.likes_file)
+        self.story_storage = StoryStorage()
     
     def _load_likes(self) -> Dict[str, List[str]]:
         """Tüm beğenileri yükler."""
-        try:
-            with open(self.likes_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_likes(self, likes: Dict[str, List[str]]):
-        """Beğenileri kaydeder."""
-        with open(self.likes_file, 'w', encoding='utf-8') as f:
-            json.dump(likes, f, ensure_ascii=False, indent=2)
+        return self.store.read()
     
     def like_story(self, story_id: str, user_id: str) -> Dict:
         """Hikâyeyi beğenir veya beğeniyi kaldırır."""
-        likes = self._load_likes()
-        
-        if story_id not in likes:
-            likes[story_id] = []
-        
-        if user_id in likes[story_id]:
-            likes[story_id].remove(user_id)
-            is_liked = False
-        else:
-            likes[story_id].append(user_id)
-            is_liked = True
-        
-        self._save_likes(likes)
+        result = {}
+
+        def toggle(user_ids: List[str]) -> List[str]:
+            if user_id in user_ids:
+                user_ids.remove(user_id)
+                result['is_liked'] = False
+            else:
+                user_ids.append(user_id)
+                result['is_liked'] = True
+            return user_ids
+
+        user_ids = self.store.update(story_id, toggle, default=[])
+
+        # Beğeni, hikâye sahibinin toplamına yansır
+        story = self.story_storage.get_story(story_id)
+        if story:
+            leaderboards.incr(LIKES_BOARD, story.get('user_id'), 1 if result['is_liked'] else -1)
         
         return {
             'story_id': story_id,
-            'like_count': len(likes[story_id]),
-            'is_liked': is_liked
+            'like_count': len(user_ids),
+            'is_liked': result['is_liked']
         }
     
     def get_story_likes(self, story_id: str) -> Dict:
         """Hikâyenin beğeni sayısını getirir."""
-        likes = self._load_likes()
-        story_likes = likes.get(story_id, [])
+        story_likes = self.store.get(story_id, [])
         return {
             'story_id': story_id,
             'like_count': len(story_likes),
@@ -62,6 +52,4 @@ class LikeService:
     
     def is_liked_by_user(self, story_id: str, user_id: str) -> bool:
         """Kullanıcının hikâyeyi beğenip beğenmediğini kontrol eder."""
-        likes = self._load_likes()
-        return user_id in likes.get(story_id, [])
-
+        return user_id in self.store.get(story_id, [])
@@ -1,99 +1,109 @@
-from typing import List, Optional, Dict
+from typing import Dict
 from datetime import datetime
 import json
 import os
+from app.core.document_store import get_document_store
 
 # Veri kalıcılığı için JSON dosyası kullanıyoruz (Gerçek DB yerine)
 MARKET_DB_PATH = "data/market_data.json"
+MARKET_USERS_PATH = "data/market_users.json"
+MARKET_TRANSACTIONS_PATH = "data/market_transactions.json"
+
+# Yeni kullanıcılara 10 kredi hediye
+NEW_USER = {"credits": 10, "is_premium": False}
 
 class MarketService:
     def __init__(self):
-        self._ensure_db()
-
-    def _ensure_db(self):
-        if not os.path.exists("data"):
-            os.makedirs("data")
-        if not os.path.exists(MARKET_DB_PATH):
-            with open(MARKET_DB_PATH, "w") as f:
-                json.dump({"users": {}, "transactions": []}, f)
+        migrate = os.path.exists(MARKET_DB_PATH) and not os.path.exists(MARKET_USERS_PATH)
+        # Kullanıcılar user_id ile tutulur, işlemler yalnızca eklenir
+        self.users_store = get_document_store(MARKET_USERS_PATH)
+        self.transactions_store = get_document_store(MARKET_TRANSACTIONS_PATH, default_factory=list)
+        if migrate:
+            self._migrate_legacy_db()
 
-    def _load_db(self):
-        with open(MARKET_DB_PATH, "r") as f:
-            return json.load(f)
+    def _migrate_legacy_db(self):
+        """Eski tek dosyalık market_data.json verisini yeni dosyalara taşır."""
+        try:
+            with open(MARKET_DB_PATH, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        for user_id, user in legacy.get("users", {}).items():
+            self.users_store.put(user_id, user)
+        for transaction in legacy.get("transactions", []):
+            self.transactions_store.append(transaction)
 
-    def _save_db(self, data):
-        with open(MARKET_DB_PATH, "w") as f:
-            json.dump(data, f, indent=2)
+    def _record_transaction(self, transaction: Dict):
+        transaction["date"] = datetime.now().isoformat()
+        self.transactions_store.append(transaction)
 
     async def get_user_balance(self, user_id: str) -> int:
-        data = self._load_db()
-        user = data["users"].get(user_id, {"credits": 10}) # Yeni kullanıcılara 10 kredi hediye
+        user = self.users_store.get(user_id, NEW_USER)
         return user.get("credits", 10)
 
     async def get_user_premium_status(self, user_id: str) -> bool:
-        data = self._load_db()
-        user = data["users"].get(user_id, {})
+        user = self.users_store.get(user_id, {})
         # Basitlik için premium hep False veya hardcoded bir logic olabilir.
         # Gerçekte bitiş tarihi kontrolü yapılır.
         return user.get("is_premium", False)
 
     async def add_credits(self, user_id: str, amount: int) -> int:
-        data = self._load_db()
-        if user_id not in data["users"]:
-            data["users"][user_id] = {"credits": 10, "is_premium": False}
-        
-        data["users"][user_id]["credits"] += amount
-        
+        def deposit(user: Dict) -> Dict:
+            user["credits"] += amount
+            return user
+
+        user = self.users_store.update(user_id, deposit, default=NEW_USER)
+
         # Transaction kaydı
-        data["transactions"].append({
+        self._record_transaction({
             "user_id": user_id,
             "type": "deposit",
             "amount": amount,
-            "date": datetime.now().isoformat()
         })
-        
-        self._save_db(data)
-        return data["users"][user_id]["credits"]
+        return user["credits"]
 
     async def spend_credits(self, user_id: str, amount: int, item_name: str) -> bool:
-        data = self._load_db()
-        if user_id not in data["users"]:
-            data["users"][user_id] = {"credits": 10, "is_premium": False}
-            
-        current_credits = data["users"][user_id]["credits"]
-        
-        if current_credits >= amount:
-            data["users"][user_id]["credits"] -= amount
-             # Transaction kaydı
-            data["transactions"].append({
-                "user_id": user_id,
-                "type": "purchase",
-                "item": item_name,
-                "amount": -amount,
-                "date": datetime.now().isoformat()
-            })
-            self._save_db(data)
-            return True
-        else:
+        result = {"spent": False}
+
+        def spend(user: Dict) -> Dict:
+            # Bakiye kontrolü ve düşüm aynı kilit altında yapılır
+            if user["credits"] >= amount:
+                user["credits"] -= amount
+                result["spent"] = True
+            return user
+
+        self.users_store.update(user_id, spend, default=NEW_USER)
+        if not result["spent"]:
             return False
 
+        # Transaction kaydı
+        self._record_transaction({
+            "user_id": user_id,
+            "type": "purchase",
+            "item": item_name,
+            "amount": -amount,
+        })
+        return True
+
     async def upgrade_to_premium(self, user_id: str) -> bool:
-        data = self._load_db()
-        if user_id not in data["users"]:
-            data["users"][user_id] = {"credits": 10, "is_premium": False}
-            
-        # Premium ücreti 100 kredi olsun
-        if data["users"][user_id]["credits"] >= 100:
-            data["users"][user_id]["credits"] -= 100
-            data["users"][user_id]["is_premium"] = True
-            
-            data["transactions"].append({
-                "user_id": user_id,
-                "type": "subscription",
-                "item": "premium_upgrade",
-                "amount": -100,
-                "date": datetime.now().isoformat()
-            })
-            self._save_db(data)
-            return True
-        return False
+        result = {"upgraded": False}
+
+        def upgrade(user: Dict) -> Dict:
+            # Premium ücreti 100 kredi olsun
+            if user["credits"] >= 100:
+                user["credits"] -= 100
+                user["is_premium"] = True
+                result["upgraded"] = True
+            return user
+
+        self.users_store.update(user_id, upgrade, default=NEW_USER)
+        if not result["upgraded"]:
+            return False
+
+        self._record_transaction({
+            "user_id": user_id,
+            "type": "subscription",
+            "item": "premium_upgrade",
+            "amount": -100,
+        })
+        return True
@@ -1,13 +1,12 @@
 from typing import List, Dict, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 
 
 class MediaSearchService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
     
     async def search_by_image(self, image_description: str, limit: int = 10) -> List[Dict]:
@@ -24,13 +23,14 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir görsel analiz uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="media_search"
             )
             
             result_text = response.choices[0].message.content
@@ -40,16 +40,10 @@ JSON formatında döndür:
             result = json.loads(result_text)
             themes = result.get('themes', [])
             
-            # Temalara göre hikâyeleri bul
-            all_stories = self.story_storage.get_all_stories()
-            matching = []
-            
-            for story in all_stories:
-                story_theme = story.get('theme', '').lower()
-                if any(theme.lower() in story_theme for theme in themes):
-                    matching.append(story)
-            
-            return matching[:limit]
+            # Temalara göre hikâyeleri bul (tam metin indeksi, herhangi bir tema)
+            if not themes:
+                return []
+            return self.story_storage.search_stories(" ".join(themes), limit=limit, match_all=False)
         except:
             return []
     
@@ -67,13 +61,14 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir ses analiz uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="media_search"
             )
             
             result_text = response.choices[0].message.content
@@ -83,16 +78,10 @@ JSON formatında döndür:
             result = json.loads(result_text)
             emotions = result.get('emotions', [])
             
-            # Duygulara göre hikâyeleri bul (basit eşleştirme)
-            all_stories = self.story_storage.get_all_stories()
-            matching = []
-            
-            for story in all_stories:
-                story_text = story.get('story_text', '').lower()
-                if any(emotion.lower() in story_text for emotion in emotions):
-                    matching.append(story)
-            
-            return matching[:limit]
+            # Duygulara göre hikâyeleri bul (tam metin indeksi, herhangi bir duygu)
+            if not emotions:
+                return []
+            return self.story_storage.search_stories(" ".join(emotions), limit=limit, match_all=False)
         except:
             return []
 
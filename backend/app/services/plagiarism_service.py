@@ -1,16 +1,18 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
+from app.services.story_minhash_index import containment, jaccard, shingles
 import json
-from difflib import SequenceMatcher
 
 
 class PlagiarismService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
     
+    # Bu oranın üzerindeki shingle benzerliği raporlanır
+    SIMILARITY_THRESHOLD = 0.3
+
     async def check_plagiarism(
         self,
         story_text: str,
@@ -26,27 +28,23 @@ class PlagiarismService:
         Returns:
             İntihal kontrolü sonuçları
         """
-        all_stories = self.story_storage.get_all_stories()
-        
+        return self._check(story_text, story_id)
+
+    def _check(self, story_text: str, story_id: Optional[str] = None) -> Dict:
+        # Tüm kütüphaneyi taramak yerine MinHash/LSH adayları gerçek benzerlikle doğrulanır
+        matches, candidates_checked = self.story_storage.find_similar_stories(
+            story_text, exclude_story_id=story_id, threshold=self.SIMILARITY_THRESHOLD
+        )
+
         similarities = []
-        
-        for story in all_stories:
-            if story.get('story_id') == story_id:
-                continue
-            
-            other_text = story.get('story_text', '')
-            similarity = self._calculate_similarity(story_text, other_text)
-            
-            if similarity > 0.3:  # %30'dan fazla benzerlik
-                similarities.append({
-                    "story_id": story.get('story_id'),
-                    "theme": story.get('theme'),
-                    "similarity": round(similarity * 100, 2),
-                    "similarity_score": similarity
-                })
-        
-        # Benzerliğe göre sırala
-        similarities.sort(key=lambda x: x['similarity_score'], reverse=True)
+        for story in matches:
+            similarity = max(story['similarity'], story['containment'])
+            similarities.append({
+                "story_id": story.get('story_id'),
+                "theme": story.get('theme'),
+                "similarity": round(similarity * 100, 2),
+                "similarity_score": similarity
+            })
         
         # Orijinallik skoru
         originality_score = 100 - (similarities[0]['similarity'] if similarities else 0)
@@ -54,31 +52,17 @@ class PlagiarismService:
         return {
             "originality_score": round(originality_score, 2),
             "similar_stories": similarities[:5],  # En benzer 5 hikâye
-            "total_comparisons": len(all_stories) - (1 if story_id else 0),
+            "total_comparisons": self.story_storage.store.count() - (1 if story_id else 0),
+            "candidates_checked": candidates_checked,
             "is_original": originality_score >= 70
         }
     
     def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """İki metin arasındaki benzerliği hesaplar."""
-        if not text1 or not text2:
+        """İki metin arasındaki benzerliği hesaplar (kelime 3-gram Jaccard'ı veya kapsama)."""
+        shingles1, shingles2 = shingles(text1), shingles(text2)
+        if not shingles1 or not shingles2:
             return 0.0
-        
-        # Basit benzerlik (SequenceMatcher)
-        similarity = SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
-        
-        # Kelime bazlı benzerlik
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        word_similarity = len(words1 & words2) / len(words1 | words2)
-        
-        # Kombine benzerlik
-        combined_similarity = (similarity * 0.6) + (word_similarity * 0.4)
-        
-        return combined_similarity
+        return max(jaccard(shingles1, shingles2), containment(shingles1, shingles2))
     
     async def check_with_ai(
         self,
@@ -103,13 +87,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir intihal tespit uzmanısın. Metinlerin orijinalliğini değerlendiriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.2
+                temperature=0.2,
+                cache_namespace="plagiarism"
             )
             
             assessment_text = response.choices[0].message.content
@@ -154,7 +139,7 @@ JSON formatında döndür:
         story_text = story.get('story_text', '')
         
         # Basit intihal kontrolü
-        plagiarism_check = self.check_plagiarism(story_text, story_id)
+        plagiarism_check = self._check(story_text, story_id)
         
         return {
             "story_id": story_id,
@@ -1,6 +1,6 @@
 from typing import List, Dict, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -10,7 +10,6 @@ from app.services.story_storage import StoryStorage
 
 class QuizService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
         self.quizzes_file = os.path.join(settings.STORAGE_PATH, "quizzes.json")
         self.quiz_results_file = os.path.join(settings.STORAGE_PATH, "quiz_results.json")
@@ -54,13 +53,15 @@ class QuizService:
         # AI ile sorular üret
         prompt = self._create_quiz_prompt(story_text, theme, num_questions, difficulty, language)
         
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir eğitim uzmanısın. Hikâyelerden anlama soruları üretiyorsun."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7
+            temperature=0.7,
+            cache=False,
+            cache_namespace="quiz"
         )
         
         quiz_data = json.loads(response.choices[0].message.content)
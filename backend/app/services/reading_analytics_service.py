@@ -4,9 +4,10 @@ Maliyet artırmayan, sadece DB tabanlı analiz servisi
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from app.models import Story, UserProfile
+from app.models import Story, UserProfile, UserDailyActivity, activity_key
 import uuid
 
 
@@ -15,6 +16,34 @@ class ReadingAnalyticsService:
     
     def __init__(self, db: Session):
         self.db = db
+        # Servis istek başına oluşturulur: istatistik + dağılım aynı okumayı paylaşır
+        self._activity_cache: Dict[uuid.UUID, List] = {}
+    
+    def _daily_activity(self, user_id: uuid.UUID) -> List:
+        """
+        Kullanıcının günlük etkinlik özetini (user_daily_activity) tek sorguyla okur.
+        Birincil anahtarın ilk kolonu user_id olduğundan okuma indekslidir.
+        """
+        if user_id not in self._activity_cache:
+            self._activity_cache[user_id] = self.db.query(
+                UserDailyActivity.day,
+                UserDailyActivity.hour,
+                UserDailyActivity.story_type,
+                UserDailyActivity.language,
+                UserDailyActivity.story_count
+            ).filter(UserDailyActivity.user_id == user_id).all()
+        return self._activity_cache[user_id]
+    
+    def _stories_per_day(self, user_id: uuid.UUID) -> Counter:
+        per_day = Counter()
+        for row in self._daily_activity(user_id):
+            per_day[row.day] += row.story_count
+        return +per_day  # sıfır sayılı günleri at
+    
+    @staticmethod
+    def _today() -> date:
+        # Özet satırları created_at'in (UTC) gününe yazılır
+        return datetime.now(timezone.utc).date()
     
     def get_reading_stats(self, user_id: uuid.UUID) -> Dict:
         """
@@ -29,34 +58,26 @@ class ReadingAnalyticsService:
             - current_streak: Günlük okuma serisi
             - longest_streak: En uzun okuma serisi
         """
-        # Toplam hikaye sayısı (user'a ait olanlar)
-        total_stories = self.db.query(func.count(Story.id)).filter(
-            Story.user_id == user_id
-        ).scalar() or 0
+        per_day = self._stories_per_day(user_id)
+        today = self._today()
+        
+        # Toplam, haftalık ve aylık sayılar günlük özetten
+        total_stories = sum(per_day.values())
+        stories_this_week = sum(c for day, c in per_day.items() if day > today - timedelta(days=7))
+        stories_this_month = sum(c for day, c in per_day.items() if day > today - timedelta(days=30))
         
-        # Favori sayısı
+        # Favori sayısı (hikâye oluşturulduktan sonra değişir, özette tutulmaz)
         favorite_count = self.db.query(func.count(Story.id)).filter(
             and_(Story.user_id == user_id, Story.is_favorite == True)
         ).scalar() or 0
         
-        # Bu hafta okunan
-        week_ago = datetime.now() - timedelta(days=7)
-        stories_this_week = self.db.query(func.count(Story.id)).filter(
-            and_(Story.user_id == user_id, Story.created_at >= week_ago)
-        ).scalar() or 0
-        
-        # Bu ay okunan
-        month_ago = datetime.now() - timedelta(days=30)
-        stories_this_month = self.db.query(func.count(Story.id)).filter(
-            and_(Story.user_id == user_id, Story.created_at >= month_ago)
-        ).scalar() or 0
-        
         # Tahmini okuma süresi (ortalama 5 dk/hikaye varsayımı)
         total_reading_time = total_stories * 5
         
         # Streak hesaplama
-        current_streak = self._calculate_current_streak(user_id)
-        longest_streak = self._calculate_longest_streak(user_id)
+        current_streak = self._calculate_current_streak(per_day, today)
+        longest_streak = self._calculate_longest_streak(per_day)
+        week_ago = datetime.now() - timedelta(days=7)
         
         return {
             "total_stories_read": total_stories,
@@ -69,51 +90,23 @@ class ReadingAnalyticsService:
             "average_per_week": round(total_stories / max(1, (datetime.now() - week_ago).days / 7), 1)
         }
     
-    def _calculate_current_streak(self, user_id: uuid.UUID) -> int:
-        """Mevcut günlük okuma serisini hesaplar"""
-        current_date = datetime.now().date()
+    @staticmethod
+    def _calculate_current_streak(per_day: Counter, today: date) -> int:
+        """Mevcut günlük okuma serisini hesaplar (bugünden geriye kesintisiz günler)"""
         streak = 0
-        
-        while True:
-            # O gün hikaye var mı kontrol et
-            story_exists = self.db.query(Story).filter(
-                and_(
-                    Story.user_id == user_id,
-                    func.date(Story.created_at) == current_date
-                )
-            ).first()
-            
-            if story_exists:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-                
-            # Max 365 gün kontrolü (performans)
-            if streak >= 365:
-                break
-        
+        current_date = today
+        while per_day.get(current_date):
+            streak += 1
+            current_date -= timedelta(days=1)
         return streak
     
-    def _calculate_longest_streak(self, user_id: uuid.UUID) -> int:
+    @staticmethod
+    def _calculate_longest_streak(per_day: Counter) -> int:
         """Şimdiye kadarki en uzun okuma serisini hesaplar"""
-        # Son 1 yıldaki tüm hikayeleri çek
-        year_ago = datetime.now() - timedelta(days=365)
-        stories = self.db.query(Story.created_at).filter(
-            and_(Story.user_id == user_id, Story.created_at >= year_ago)
-        ).order_by(Story.created_at).all()
-        
-        if not stories:
+        if not per_day:
             return 0
         
-        # Günlere göre grupla
-        reading_dates = set()
-        for story in stories:
-            reading_dates.add(story.created_at.date())
-        
-        # Sıralı listeye çevir
-        sorted_dates = sorted(reading_dates)
-        
+        sorted_dates = sorted(per_day)
         max_streak = 1
         current_streak = 1
         
@@ -136,38 +129,80 @@ class ReadingAnalyticsService:
             - by_hour: Saate göre okuma tercihi
             - by_day_of_week: Haftanın gününe göre
         """
-        # Türlere göre
-        by_type = self.db.query(
-            Story.story_type,
-            func.count(Story.id).label('count')
-        ).filter(Story.user_id == user_id).group_by(Story.story_type).all()
-        
-        # Dillere göre
-        by_language = self.db.query(
-            Story.language,
-            func.count(Story.id).label('count')
-        ).filter(Story.user_id == user_id).group_by(Story.language).all()
-        
-        # Saatlere göre (created_at'ten saat çıkar)
-        stories = self.db.query(Story.created_at).filter(Story.user_id == user_id).all()
-        
-        hour_distribution = {}
+        by_type = Counter()
+        by_language = Counter()
+        hour_distribution = Counter()
         day_distribution = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}  # Pazartesi-Pazar
         
-        for story in stories:
-            hour = story.created_at.hour
-            day = story.created_at.weekday()
-            
-            hour_distribution[hour] = hour_distribution.get(hour, 0) + 1
-            day_distribution[day] = day_distribution.get(day, 0) + 1
+        for row in self._daily_activity(user_id):
+            by_type[row.story_type] += row.story_count
+            by_language[row.language] += row.story_count
+            hour_distribution[row.hour] += row.story_count
+            day_distribution[row.day.weekday()] += row.story_count
         
         return {
-            "by_type": [{"type": t, "count": c} for t, c in by_type],
-            "by_language": [{"language": l, "count": c} for l, c in by_language],
-            "by_hour": [{"hour": h, "count": c} for h, c in sorted(hour_distribution.items())],
+            "by_type": [{"type": t, "count": c} for t, c in by_type.items() if c],
+            "by_language": [{"language": l, "count": c} for l, c in by_language.items() if c],
+            "by_hour": [{"hour": h, "count": c} for h, c in sorted(hour_distribution.items()) if c],
             "by_day_of_week": [{"day": d, "count": c} for d, c in sorted(day_distribution.items())]
         }
     
+    def rebuild_daily_activity(self, user_id: Optional[uuid.UUID] = None, users_per_batch: int = 500) -> Dict:
+        """
+        Günlük etkinlik özetini hikâyelerden yeniden kurar (ilk doldurma / onarım).
+        
+        Kullanıcılar user_id sırasıyla gruplar halinde işlenir; her grubun satırları
+        silinip yeniden yazılır ve grup başına bir commit yapılır.
+        
+        Returns:
+            - users: İşlenen kullanıcı sayısı
+            - stories: Sayılan hikâye sayısı
+            - rows: Yazılan özet satırı sayısı
+        """
+        report = {"users": 0, "stories": 0, "rows": 0}
+        after = None
+        while True:
+            if user_id is not None:
+                batch = [user_id] if after is None else []
+            else:
+                query = self.db.query(Story.user_id).distinct().order_by(Story.user_id)
+                if after is not None:
+                    query = query.filter(Story.user_id > after)
+                batch = [row.user_id for row in query.limit(users_per_batch)]
+            if not batch:
+                break
+            
+            counts = Counter()
+            stories = self.db.query(
+                Story.user_id, Story.created_at, Story.story_type, Story.language
+            ).filter(Story.user_id.in_(batch))
+            for row in stories:
+                counts[tuple(activity_key(*row).values())] += 1
+            
+            self.db.query(UserDailyActivity).filter(
+                UserDailyActivity.user_id.in_(batch)
+            ).delete(synchronize_session=False)
+            self.db.bulk_insert_mappings(UserDailyActivity, [
+                {"user_id": uid, "day": day, "hour": hour, "story_type": story_type,
+                 "language": language, "story_count": count}
+                for (uid, day, hour, story_type, language), count in counts.items()
+            ])
+            self.db.commit()
+            
+            report["users"] += len(batch)
+            report["stories"] += sum(counts.values())
+            report["rows"] += len(counts)
+            after = batch[-1]
+        
+        if user_id is None:
+            # Artık hikâyesi olmayan kullanıcıların eski satırları
+            self.db.query(UserDailyActivity).filter(
+                ~UserDailyActivity.user_id.in_(self.db.query(Story.user_id).distinct())
+            ).delete(synchronize_session=False)
+            self.db.commit()
+        self._activity_cache.clear()
+        return report
+    
     def get_reading_goals(self, user_id: uuid.UUID) -> Dict:
         """
         Okuma hedeflerini ve ilerlemesini getirir
@@ -1,30 +1,36 @@
-from typing import List, Dict, Optional
-import json
+from typing import Any, List, Dict, Optional
+import asyncio
+import logging
 import os
 import uuid
 from datetime import datetime
+from app.core.collab_documents import get_collab_hub, operation_from_change
 from app.core.config import settings
+from app.core.document_store import get_document_store
 from app.services.story_storage import StoryStorage
 from app.services.collaboration_service import CollaborationService
 
+logger = logging.getLogger(__name__)
+
+
+def collab_room(session_id: str) -> str:
+    """Oturumun Socket.IO oda adı."""
+    return f"collab:{session_id}"
+
 
 class RealtimeCollaborationService:
+    """
+    Gerçek zamanlı ortak düzenleme. Oturum kayıtları paylaşılan JSON belge
+    deposunda, metin ve işlem günlüğü bellek içi OT belgelerinde
+    (`app.core.collab_documents`) tutulur; her değişiklik oturum odasına yayınlanır.
+    """
+
     def __init__(self):
         self.story_storage = StoryStorage()
         self.collaboration_service = CollaborationService()
         self.active_sessions_file = os.path.join(settings.STORAGE_PATH, "realtime_sessions.json")
-        self.change_history_file = os.path.join(settings.STORAGE_PATH, "change_history.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.active_sessions_file):
-            with open(self.active_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
-        if not os.path.exists(self.change_history_file):
-            with open(self.change_history_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.sessions = get_document_store(self.active_sessions_file)
+        self.documents = get_collab_hub()
     
     def create_collaboration_session(
         self,
@@ -59,21 +65,31 @@ class RealtimeCollaborationService:
         }
         
         self._save_session(session)
+        self.documents.open(session_id, story.get('story_text') or '')
         
         return session
     
     def _save_session(self, session: Dict):
         """Oturumu kaydeder."""
-        try:
-            with open(self.active_sessions_file, 'r', encoding='utf-8') as f:
-                sessions = json.load(f)
-        except:
-            sessions = {}
-        
-        sessions[session['session_id']] = session
-        
-        with open(self.active_sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, ensure_ascii=False, indent=2)
+        self.sessions.put(session['session_id'], session)
+    
+    def _touch_session(self, session_id: str, mutate=None) -> Optional[Dict]:
+        """Oturumu kilit altında günceller ve son aktiviteyi işaretler."""
+        result = {}
+
+        def update(session: Optional[Dict]) -> Optional[Dict]:
+            if session is None:
+                return None
+            if mutate is not None:
+                mutate(session)
+            session['last_activity'] = datetime.now().isoformat()
+            result['session'] = session
+            return session
+
+        if not self.sessions.contains(session_id):
+            return None
+        self.sessions.update(session_id, update)
+        return result.get('session')
     
     def join_session(
         self,
@@ -83,29 +99,39 @@ class RealtimeCollaborationService:
         """
         Oturuma katılır.
         """
-        session = self.get_session(session_id)
+        def join(session: Dict):
+            if user_id not in session.setdefault('participants', []):
+                session['participants'].append(user_id)
+            if user_id not in session.setdefault('active_users', []):
+                session['active_users'].append(user_id)
+
+        session = self._touch_session(session_id, join)
         if not session:
             raise ValueError("Oturum bulunamadı")
         
-        if user_id not in session.get('participants', []):
-            session['participants'].append(user_id)
-        
-        if user_id not in session.get('active_users', []):
-            session['active_users'].append(user_id)
-        
-        session['last_activity'] = datetime.now().isoformat()
-        self._save_session(session)
-        
         return session
     
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Oturumu getirir."""
-        try:
-            with open(self.active_sessions_file, 'r', encoding='utf-8') as f:
-                sessions = json.load(f)
-            return sessions.get(session_id)
-        except:
-            return None
+        return self.sessions.get(session_id)
+    
+    def _document(self, session: Dict):
+        """Oturumun canlı belgesi; yoksa hikâye metninden açılır."""
+        doc = self.documents.get(session['session_id'])
+        if doc is None:
+            story = self.story_storage.get_story(session.get('story_id')) or {}
+            doc = self.documents.open(session['session_id'], story.get('story_text') or '')
+        return doc
+    
+    def get_document(self, session_id: str, since: Optional[int] = None) -> Dict:
+        """
+        Geç katılanlar için belge durumu: `since` işlem penceresindeyse yalnızca
+        sonraki işlemler, değilse son anlık görüntü + işlem kuyruğu.
+        """
+        session = self.get_session(session_id)
+        if not session:
+            raise ValueError("Oturum bulunamadı")
+        return self._document(session).state(since)
     
     def apply_change(
         self,
@@ -133,42 +159,48 @@ class RealtimeCollaborationService:
         if user_id not in session.get('active_users', []):
             raise ValueError("Kullanıcı oturumda aktif değil")
         
-        change = {
-            "change_id": str(uuid.uuid4()),
-            "session_id": session_id,
-            "story_id": session.get('story_id'),
-            "user_id": user_id,
-            "change_type": change_type,
-            "change_data": change_data,
-            "timestamp": datetime.now().isoformat(),
-            "applied": True
-        }
-        
-        # Değişiklik geçmişine ekle
-        self._save_change(change)
-        
-        # Oturum aktivitesini güncelle
-        session['last_activity'] = datetime.now().isoformat()
-        self._save_session(session)
-        
-        return change
+        # İşlem, istemcinin gördüğü sürümden güncel sürüme dönüştürülüp uygulanır
+        doc = self._document(session)
+        base_version = change_data.get('base_version')
+        length = len(doc.text) if base_version is None else doc.length_at(int(base_version))
+        change, duplicate = self.documents.submit(
+            session_id,
+            user_id,
+            operation_from_change(change_type, change_data, length),
+            base_version=base_version,
+            client_seq=change_data.get('client_seq'),
+            client_id=change_data.get('client_id'),
+            meta={
+                "story_id": session.get('story_id'),
+                "change_type": change_type,
+                "change_data": {k: v for k, v in change_data.items() if k != 'operation'},
+            },
+        )
+        
+        if not duplicate:
+            # Oturum kaydı her tuş vuruşunda değil, en fazla dakikada bir güncellenir
+            if self._seconds_since(session.get('last_activity')) >= 60:
+                self._touch_session(session_id)
+            self._broadcast(session_id, change)
+        
+        return {**change, "applied": True, "duplicate": duplicate}
     
-    def _save_change(self, change: Dict):
-        """Değişikliği kaydeder."""
+    @staticmethod
+    def _seconds_since(timestamp: Optional[str]) -> float:
         try:
-            with open(self.change_history_file, 'r', encoding='utf-8') as f:
-                changes = json.load(f)
-        except:
-            changes = {}
-        
-        story_id = change.get('story_id')
-        if story_id not in changes:
-            changes[story_id] = []
-        
-        changes[story_id].append(change)
-        
-        with open(self.change_history_file, 'w', encoding='utf-8') as f:
-            json.dump(changes, f, ensure_ascii=False, indent=2)
+            return (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()
+        except (TypeError, ValueError):
+            return float('inf')
+    
+    def _broadcast(self, session_id: str, change: Dict[str, Any]):
+        """Değişikliği oturum odasına yayınlar (çalışan event loop varsa)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        from app.core.socket_manager import socket_manager
+
+        loop.create_task(socket_manager.emit('collab_op', change, room=collab_room(session_id)))
     
     def get_change_history(
         self,
@@ -176,14 +208,15 @@ class RealtimeCollaborationService:
         limit: int = 50
     ) -> List[Dict]:
         """
-        Değişiklik geçmişini getirir.
+        Değişiklik geçmişini getirir (hikâyenin oturumlarındaki son işlemler).
+        Oturum başına en fazla `limit` işlem okunur; açık olmayan belgeler
+        belleğe yüklenmez, kalıcı işlem günlüğünden okunur.
         """
-        try:
-            with open(self.change_history_file, 'r', encoding='utf-8') as f:
-                changes = json.load(f)
-            return changes.get(story_id, [])[-limit:]
-        except:
-            return []
+        changes = []
+        for session_id, _ in self.sessions.scan(lambda s: s.get('story_id') == story_id):
+            changes.extend(self.documents.recent_ops(session_id, limit))
+        changes.sort(key=lambda c: c.get('timestamp', 0))
+        return changes[-limit:]
     
     def add_suggestion(
         self,
@@ -211,12 +244,7 @@ class RealtimeCollaborationService:
         }
         
         # Önerileri oturuma ekle
-        if 'suggestions' not in session:
-            session['suggestions'] = []
-        
-        session['suggestions'].append(suggestion)
-        session['last_activity'] = datetime.now().isoformat()
-        self._save_session(session)
+        self._touch_session(session_id, lambda s: s.setdefault('suggestions', []).append(suggestion))
         
         return suggestion
     
@@ -229,49 +257,41 @@ class RealtimeCollaborationService:
         """
         Öneriyi kabul eder.
         """
-        session = self.get_session(session_id)
-        if not session:
+        found = {}
+
+        def accept(session: Dict):
+            suggestions = session.get('suggestions', [])
+            suggestion = next((s for s in suggestions if s.get('suggestion_id') == suggestion_id), None)
+            if suggestion:
+                suggestion['status'] = 'accepted'
+                suggestion['accepted_by'] = user_id
+                suggestion['accepted_at'] = datetime.now().isoformat()
+                found['suggestion'] = suggestion
+
+        if not self._touch_session(session_id, accept):
             raise ValueError("Oturum bulunamadı")
         
-        suggestions = session.get('suggestions', [])
-        suggestion = next((s for s in suggestions if s.get('suggestion_id') == suggestion_id), None)
-        
-        if not suggestion:
+        if not found:
             raise ValueError("Öneri bulunamadı")
         
-        suggestion['status'] = 'accepted'
-        suggestion['accepted_by'] = user_id
-        suggestion['accepted_at'] = datetime.now().isoformat()
-        
-        session['last_activity'] = datetime.now().isoformat()
-        self._save_session(session)
-        
-        return suggestion
+        return found['suggestion']
     
     def leave_session(self, session_id: str, user_id: str):
         """Oturumdan ayrılır."""
-        session = self.get_session(session_id)
-        if not session:
-            return
-        
-        if user_id in session.get('active_users', []):
-            session['active_users'].remove(user_id)
-        
-        session['last_activity'] = datetime.now().isoformat()
-        self._save_session(session)
+        def leave(session: Dict):
+            if user_id in session.get('active_users', []):
+                session['active_users'].remove(user_id)
+
+        session = self._touch_session(session_id, leave)
+        if session is not None and not session.get('active_users'):
+            # Kimse düzenlemiyorsa belge diske yazılıp bellekten bırakılır
+            self.documents.release(session_id)
     
     def get_active_sessions(self, story_id: Optional[str] = None) -> List[Dict]:
         """Aktif oturumları getirir."""
-        try:
-            with open(self.active_sessions_file, 'r', encoding='utf-8') as f:
-                sessions = json.load(f)
-            
-            active = [s for s in sessions.values() if s.get('is_active', False)]
-            
-            if story_id:
-                active = [s for s in active if s.get('story_id') == story_id]
-            
-            return active
-        except:
-            return []
+        return [
+            session for _, session in self.sessions.scan(
+                lambda s: s.get('is_active', False) and (not story_id or s.get('story_id') == story_id)
+            )
+        ]
 
@@ -1,117 +1,459 @@
 """
 Search Service - Semantic search using Gemini embeddings (google-genai)
+
+- Query embeddings are cached per (model, normalized query)
+- Nearest neighbours come from pgvector on PostgreSQL, otherwise from the
+  in-process IVF index (``StoryVectorIndex``); both filter by language / story_type
+- ``EmbeddingBackfill`` embeds stories in batches with several requests in
+  flight, writes one commit per batch and can resume from a checkpoint file
 """
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models import Story
-from typing import List
 from google import genai
 from google.genai import types
 from app.core.config import settings
-from sqlalchemy import text
+from app.core.resilience import retry_on_failure
+from app.services.story_search_index import turkish_lower
+from app.services.story_vector_index import StoryVectorIndex, get_vector_index
+
+logger = logging.getLogger(__name__)
+
+# Gemini embedding girdisi için üst sınır (karakter)
+MAX_EMBED_CHARS = 8000
+
+EmbedBatch = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def _embedding_http_options(base_url: str) -> types.HttpOptions:
+    """EMBEDDING_BASE_URL'i (ör. https://host/v1beta) base_url + api_version olarak ayırır."""
+    root, _, version = base_url.rstrip("/").rpartition("/")
+    if root and version.startswith("v1"):
+        return types.HttpOptions(base_url=root + "/", api_version=version)
+    return types.HttpOptions(base_url=base_url)
+
+
+def _as_vector(value) -> List[float]:
+    # pgvector numpy dizisi, SQLite metin ("[0.1, ...]") döner
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+class QueryEmbeddingCache:
+    """Arama sorgusu embedding'leri için süreç içi LRU + TTL önbelleği."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, query: str) -> Tuple[str, str]:
+        # "Uzay  Macerası" ile "uzay macerası" aynı sorgudur
+        return model, " ".join(turkish_lower(query).split())
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        key = self.make_key(model, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, model: str, query: str, vector: List[float]):
+        key = self.make_key(model, query)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    settings.EMBEDDING_QUERY_CACHE_SIZE, settings.EMBEDDING_QUERY_CACHE_TTL_SECONDS
+)
+
+
+class EmbeddingBackfill:
+    """
+    Embedding'i olmayan (``reembed`` ile tüm) hikâyeleri toplu olarak doldurur.
+
+    - Hikâyeler id sırasıyla (keyset) ``batch_size``'lık sayfalar halinde okunur
+    - Aynı anda en fazla ``concurrency`` toplu embedding isteği açıktır;
+      başarısız istekler üstel beklemeyle yeniden denenir
+    - Her sayfa tek bir toplu UPDATE + commit ile yazılır, vektör indeksi
+      verilmişse ona da eklenir
+    - ``checkpoint_path`` verilirse, kesintisiz tamamlanan son sayfanın id'si
+      her sayfadan sonra yazılır; ``resume=True`` oradan devam eder
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        embed_batch: EmbedBatch,
+        index: Optional[StoryVectorIndex] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        reembed: bool = False,
+        max_stories: Optional[int] = None,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+    ):
+        self.db = db
+        self.embed_batch = embed_batch
+        self.index = index
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.concurrency = concurrency or settings.EMBEDDING_CONCURRENCY
+        self.checkpoint_path = checkpoint_path
+        self.reembed = reembed
+        self.max_stories = max_stories
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    # --- Veri erişimi (testlerde değiştirilebilir) ---
+
+    def fetch(self, after_id: Optional[str], limit: int) -> List[Tuple[str, str, str, str]]:
+        """(id, metin, dil, tür) satırları, id'ye göre sıralı."""
+        query = self.db.query(Story.id, Story.story_text, Story.language, Story.story_type)
+        if not self.reembed:
+            query = query.filter(Story.embedding.is_(None))
+        if after_id is not None:
+            query = query.filter(Story.id > uuid.UUID(str(after_id)))
+        return [(str(r[0]), r[1] or "", r[2], r[3]) for r in query.order_by(Story.id).limit(limit).all()]
+
+    def store(self, rows: List[Tuple[str, str, str, str]], vectors: List[List[float]]):
+        self.db.execute(
+            update(Story),
+            [{"id": uuid.UUID(row[0]), "embedding": list(vector)} for row, vector in zip(rows, vectors)],
+        )
+        self.db.commit()
+
+    # --- Checkpoint ---
+
+    def load_checkpoint(self) -> Dict:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {"last_id": None, "processed": 0, "updated": 0, "failed_ids": []}
+
+    def save_checkpoint(self, checkpoint: Dict):
+        if not self.checkpoint_path:
+            return
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    # --- Çalıştırma ---
+
+    async def run(self, resume: bool = False) -> Dict:
+        started = time.perf_counter()
+        checkpoint = self.load_checkpoint() if resume else {"last_id": None, "processed": 0, "updated": 0, "failed_ids": []}
+        slots = asyncio.Semaphore(self.concurrency)
+        db_lock = asyncio.Lock()  # Session thread-safe değil: okuma/yazma sırayla
+        embed = retry_on_failure(max_retries=self.retries, delay=self.retry_delay)(self.embed_batch)
+        finished: Dict[int, Tuple[str, int, int]] = {}
+        next_to_commit = 0
+        tasks = []
+
+        async def process(seq: int, rows: List[Tuple[str, str, str, str]]):
+            nonlocal next_to_commit
+            updated = 0
+            try:
+                vectors = await embed([text[:MAX_EMBED_CHARS] for _, text, _, _ in rows])
+                if len(vectors) != len(rows):
+                    raise ValueError(f"{len(rows)} metin için {len(vectors)} embedding döndü")
+                async with db_lock:
+                    await asyncio.to_thread(self.store, rows, vectors)
+                if self.index is not None:
+                    await asyncio.to_thread(
+                        self.index.add_many,
+                        [(row[0], vector, row[2], row[3]) for row, vector in zip(rows, vectors)],
+                    )
+                updated = len(rows)
+            except Exception as e:
+                logger.error(f"Embedding batch {seq} failed ({len(rows)} stories): {e}")
+                checkpoint["failed_ids"].extend(row[0] for row in rows)
+            finally:
+                finished[seq] = (rows[-1][0], len(rows), updated)
+                # Checkpoint yalnızca kesintisiz tamamlanan sayfalar kadar ilerler
+                while next_to_commit in finished:
+                    last_id, processed, done = finished.pop(next_to_commit)
+                    checkpoint["last_id"] = last_id
+                    checkpoint["processed"] += processed
+                    checkpoint["updated"] += done
+                    next_to_commit += 1
+                self.save_checkpoint(checkpoint)
+                slots.release()
+
+        after_id = checkpoint["last_id"]
+        remaining = self.max_stories
+        seq = 0
+        while remaining is None or remaining > 0:
+            await slots.acquire()
+            limit = self.batch_size if remaining is None else min(self.batch_size, remaining)
+            async with db_lock:
+                rows = await asyncio.to_thread(self.fetch, after_id, limit)
+            if not rows:
+                slots.release()
+                break
+            after_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            tasks.append(asyncio.create_task(process(seq, rows)))
+            seq += 1
+        await asyncio.gather(*tasks)
+
+        report = {**checkpoint, "batches": seq, "elapsed_seconds": round(time.perf_counter() - started, 3)}
+        logger.info(
+            f"Embedding backfill: {checkpoint['updated']}/{checkpoint['processed']} stories in {seq} batches "
+            f"({report['elapsed_seconds']}s, {len(checkpoint['failed_ids'])} failed)"
+        )
+        return report
 
 
 class SearchService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, index: Optional[StoryVectorIndex] = None):
         self.db = db
         self.client = None
-        
+        self._index = index
+
         # Configure Gemini client for embeddings
         if settings.EMBEDDING_API_KEY:
-            self.client = genai.Client(api_key=settings.EMBEDDING_API_KEY)
-        
+            self.client = genai.Client(
+                api_key=settings.EMBEDDING_API_KEY,
+                http_options=_embedding_http_options(settings.EMBEDDING_BASE_URL),
+            )
+
+    # ------------------------------------------------------------------ #
+    # Embedding
+    # ------------------------------------------------------------------ #
+
+    def _embed_config(self, task_type: str):
+        return types.EmbedContentConfig(task_type=task_type, output_dimensionality=settings.EMBEDDING_DIMENSIONS)
+
+    def embed_query(self, query: str) -> List[float]:
+        cached = query_embedding_cache.get(settings.EMBEDDING_MODEL, query)
+        if cached is not None:
+            return cached
+        response = self.client.models.embed_content(
+            model=settings.EMBEDDING_MODEL, contents=query, config=self._embed_config("RETRIEVAL_QUERY")
+        )
+        vector = list(response.embeddings[0].values)
+        query_embedding_cache.set(settings.EMBEDDING_MODEL, query, vector)
+        return vector
+
+    async def aembed_query(self, query: str) -> List[float]:
+        cached = query_embedding_cache.get(settings.EMBEDDING_MODEL, query)
+        if cached is not None:
+            return cached
+        response = await self.client.aio.models.embed_content(
+            model=settings.EMBEDDING_MODEL, contents=query, config=self._embed_config("RETRIEVAL_QUERY")
+        )
+        vector = list(response.embeddings[0].values)
+        query_embedding_cache.set(settings.EMBEDDING_MODEL, query, vector)
+        return vector
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Tek bir batchEmbedContents isteğiyle birden çok metni embed eder."""
+        response = await self.client.aio.models.embed_content(
+            model=settings.EMBEDDING_MODEL, contents=texts, config=self._embed_config("RETRIEVAL_DOCUMENT")
+        )
+        return [list(e.values) for e in response.embeddings]
+
+    # ------------------------------------------------------------------ #
+    # Vektör indeksi
+    # ------------------------------------------------------------------ #
+
+    def uses_pgvector(self) -> bool:
+        backend = settings.VECTOR_SEARCH_BACKEND.lower()
+        if backend in ("pgvector", "ann"):
+            return backend == "pgvector"
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    @property
+    def index(self) -> StoryVectorIndex:
+        if self._index is None:
+            self._index = get_vector_index()
+        return self._index
+
     def update_story_embedding(self, story_id: str):
         """
         Generate and store embedding for a story using Gemini.
         """
         if not self.client:
-            print("Embedding client not configured.")
+            logger.warning("Embedding client not configured.")
             return
 
         try:
             story = self.db.query(Story).filter(Story.id == story_id).first()
             if not story:
                 return
-            
-            # Gemini embedding API (new google-genai syntax)
+
             response = self.client.models.embed_content(
                 model=settings.EMBEDDING_MODEL,
-                contents=story.story_text[:8000],
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT"
-                )
+                contents=story.story_text[:MAX_EMBED_CHARS],
+                config=self._embed_config("RETRIEVAL_DOCUMENT"),
             )
-            
-            embedding = response.embeddings[0].values
-            
+            embedding = list(response.embeddings[0].values)
+
             # Store embedding in database
             story.embedding = embedding
             self.db.commit()
-            
-            print(f"✅ Embedding generated and saved for story {story_id} using {settings.EMBEDDING_MODEL}")
+            if not self.uses_pgvector():
+                self.index.add(str(story.id), embedding, story.language, story.story_type)
+
+            logger.info(f"Embedding saved for story {story_id} using {settings.EMBEDDING_MODEL}")
         except Exception as e:
-            print(f"❌ Embedding generation failed: {e}")
+            logger.error(f"Embedding generation failed for story {story_id}: {e}")
             self.db.rollback()
-    
-    def search_stories(self, query: str, limit: int = 5) -> List[Story]:
+
+    def rebuild_index(self, page_size: int = 1000) -> int:
+        """Vektör indeksini veritabanındaki embedding'lerden baştan kurar."""
+        self.index.clear()
+        after_id, total = None, 0
+        while True:
+            query = self.db.query(Story.id, Story.embedding, Story.language, Story.story_type).filter(
+                Story.embedding.isnot(None)
+            )
+            if after_id is not None:
+                query = query.filter(Story.id > after_id)
+            rows = query.order_by(Story.id).limit(page_size).all()
+            if not rows:
+                break
+            total += self.index.add_many((str(r[0]), _as_vector(r[1]), r[2], r[3]) for r in rows)
+            after_id = rows[-1][0]
+        if self.index.needs_training():
+            self.index.train()
+        return total
+
+    # ------------------------------------------------------------------ #
+    # Arama
+    # ------------------------------------------------------------------ #
+
+    def _text_search(self, query: str, limit: int, language: Optional[str], story_type: Optional[str]) -> List[Story]:
+        q = self.db.query(Story).filter(Story.story_text.ilike(f"%{query}%"))
+        if language:
+            q = q.filter(Story.language == language)
+        if story_type:
+            q = q.filter(Story.story_type == story_type)
+        return q.limit(limit).all()
+
+    def nearest_stories(
+        self, vector: Sequence[float], limit: int, language: Optional[str] = None, story_type: Optional[str] = None
+    ) -> List[Story]:
+        if self.uses_pgvector():
+            # pgvector kosinüs mesafesi; vektör bağlı parametre olarak gider
+            q = self.db.query(Story).filter(Story.embedding.isnot(None))
+            if language:
+                q = q.filter(Story.language == language)
+            if story_type:
+                q = q.filter(Story.story_type == story_type)
+            return q.order_by(Story.embedding.cosine_distance(list(vector))).limit(limit).all()
+
+        hits = self.index.search(vector, limit, language=language, story_type=story_type)
+        if not hits:
+            return []
+        ids = [uuid.UUID(story_id) for story_id, _ in hits]
+        stories = {str(s.id): s for s in self.db.query(Story).filter(Story.id.in_(ids)).all()}
+        return [stories[story_id] for story_id, _ in hits if story_id in stories]
+
+    def search_stories(
+        self, query: str, limit: int = 5, language: Optional[str] = None, story_type: Optional[str] = None
+    ) -> List[Story]:
         """
         Semantic search using vector similarity with Gemini embeddings.
         """
         if not self.client:
-            # Fallback to simple text search
-            print("⚠️ Embedding not configured, using text search fallback")
-            return self.db.query(Story).filter(Story.story_text.ilike(f"%{query}%")).limit(limit).all()
+            logger.warning("Embedding not configured, using text search fallback")
+            return self._text_search(query, limit, language, story_type)
 
         try:
-            # Generate query embedding
-            response = self.client.models.embed_content(
-                model=settings.EMBEDDING_MODEL,
-                contents=query,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_QUERY"
-                )
-            )
-            query_embedding = response.embeddings[0].values
-            
-            # Vector similarity search using pgvector cosine distance
-            # <=> is the cosine distance operator in pgvector
-            # Lower distance = more similar
-            results = self.db.query(Story).filter(
-                Story.embedding.isnot(None)
-            ).order_by(
-                text(f"embedding <=> '{query_embedding}'")
-            ).limit(limit).all()
-            
-            print(f"✅ Found {len(results)} similar stories for query: '{query[:50]}...'")
-            return results
-            
+            return self.nearest_stories(self.embed_query(query), limit, language, story_type)
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}, falling back to text search")
+            self.db.rollback()
+            return self._text_search(query, limit, language, story_type)
+
+    async def asearch_stories(
+        self, query: str, limit: int = 5, language: Optional[str] = None, story_type: Optional[str] = None
+    ) -> List[Story]:
+        """search_stories'in async sürümü: embedding isteği event loop'u bloklamaz."""
+        if not self.client:
+            return await asyncio.to_thread(self._text_search, query, limit, language, story_type)
+        try:
+            vector = await self.aembed_query(query)
+            return await asyncio.to_thread(self.nearest_stories, vector, limit, language, story_type)
         except Exception as e:
-            print(f"❌ Vector search failed: {e}, falling back to text search")
-            # Fallback to text search
-            return self.db.query(Story).filter(
-                Story.story_text.ilike(f"%{query}%")
-            ).limit(limit).all()
-    
+            logger.error(f"Vector search failed: {e}, falling back to text search")
+            await asyncio.to_thread(self.db.rollback)
+            return await asyncio.to_thread(self._text_search, query, limit, language, story_type)
+
+    async def semantic_search(self, query: str, limit: int = 10, language: Optional[str] = None) -> List[Dict]:
+        stories = await self.asearch_stories(query, limit, language=language)
+        return [
+            {
+                "story_id": str(story.id),
+                "theme": story.theme,
+                "language": story.language,
+                "story_type": story.story_type,
+                "preview": (story.story_text or "")[:200],
+            }
+            for story in stories
+        ]
+
+    # ------------------------------------------------------------------ #
+    # Toplu doldurma
+    # ------------------------------------------------------------------ #
+
+    def backfill(self, **options) -> EmbeddingBackfill:
+        index = None if self.uses_pgvector() else self.index
+        return EmbeddingBackfill(self.db, self.embed_documents, index=index, **options)
+
+    async def backfill_embeddings(self, resume: bool = False, **options) -> Dict:
+        if not self.client:
+            raise ValueError("Embedding istemcisi yapılandırılmamış (EMBEDDING_API_KEY)")
+        report = await self.backfill(**options).run(resume=resume)
+        if not self.uses_pgvector() and self.index.needs_training():
+            await asyncio.to_thread(self.index.train)
+        return report
+
     def update_all_embeddings(self, batch_size: int = 10):
         """
         Batch update embeddings for all stories that don't have one.
         Useful for initial setup or migration.
         """
         if not self.client:
-            print("❌ Embedding client not configured")
+            logger.error("Embedding client not configured")
             return 0
-        
-        stories_without_embedding = self.db.query(Story).filter(
-            Story.embedding.is_(None)
-        ).limit(batch_size).all()
-        
-        updated_count = 0
-        for story in stories_without_embedding:
-            try:
-                self.update_story_embedding(str(story.id))
-                updated_count += 1
-            except Exception as e:
-                print(f"⚠️ Failed to update embedding for story {story.id}: {e}")
-                continue
-        
-        print(f"✅ Updated {updated_count}/{len(stories_without_embedding)} story embeddings")
-        return updated_count
+        report = asyncio.run(self.backfill_embeddings(batch_size=batch_size, max_stories=batch_size))
+        return report["updated"]
+
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -10,7 +10,6 @@ class StoryAchievementCelebratorService:
     """Başarı kutlama servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.file = os.path.join(settings.STORAGE_PATH, "story_achievement_celebrator_service.json")
         self._ensure_files()
     
@@ -23,9 +22,9 @@ class StoryAchievementCelebratorService:
     async def process(self, story_id: str, story_text: str, **kwargs) -> Dict:
         id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeyi başarı kutlama açısından iyileştir:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir başarı kutlama uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.7, max_tokens=2000
+            temperature=0.7, max_tokens=2000, cache=False, cache_namespace="story_achievement_celebrator"
         )
         return {"id": id, "result": response.choices[0].message.content}
     
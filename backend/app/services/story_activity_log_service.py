@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryActivityLogService:
@@ -11,14 +11,7 @@ class StoryActivityLogService:
     
     def __init__(self):
         self.activity_log_file = os.path.join(settings.STORAGE_PATH, "story_activity_log.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.activity_log_file):
-            with open(self.activity_log_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.activity_log_store = get_document_store(self.activity_log_file, default_factory=list)
     
     async def log_activity(
         self,
@@ -37,9 +30,7 @@ class StoryActivityLogService:
             "timestamp": datetime.now().isoformat()
         }
         
-        logs = self._load_logs()
-        logs.append(log_entry)
-        self._save_logs(logs)
+        self.activity_log_store.append(log_entry)
         
         return {
             "log_id": log_entry["log_id"],
@@ -53,8 +44,7 @@ class StoryActivityLogService:
         limit: Optional[int] = None
     ) -> List[Dict]:
         """Hikaye aktivitelerini getirir."""
-        logs = self._load_logs()
-        story_logs = [log for log in logs if log["story_id"] == story_id]
+        story_logs = self.activity_log_store.items(lambda log: log["story_id"] == story_id)
         
         if activity_type:
             story_logs = [log for log in story_logs if log["activity_type"] == activity_type]
@@ -74,8 +64,7 @@ class StoryActivityLogService:
         limit: Optional[int] = None
     ) -> List[Dict]:
         """Kullanıcı aktivitelerini getirir."""
-        logs = self._load_logs()
-        user_logs = [log for log in logs if log["user_id"] == user_id]
+        user_logs = self.activity_log_store.items(lambda log: log["user_id"] == user_id)
         
         if activity_type:
             user_logs = [log for log in user_logs if log["activity_type"] == activity_type]
@@ -95,13 +84,11 @@ class StoryActivityLogService:
         days: int = 30
     ) -> Dict:
         """Aktivite istatistiklerini getirir."""
-        logs = self._load_logs()
-        
         # Filtrele
-        if story_id:
-            logs = [log for log in logs if log["story_id"] == story_id]
-        if user_id:
-            logs = [log for log in logs if log["user_id"] == user_id]
+        logs = self.activity_log_store.items(
+            lambda log: (not story_id or log["story_id"] == story_id)
+            and (not user_id or log["user_id"] == user_id)
+        )
         
         # Tarih filtresi
         cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -122,17 +109,3 @@ class StoryActivityLogService:
             "activity_breakdown": activity_counts,
             "period_days": days
         }
-    
-    def _load_logs(self) -> List[Dict]:
-        """Logları yükler."""
-        try:
-            with open(self.activity_log_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_logs(self, logs: List[Dict]):
-        """Logları kaydeder."""
-        with open(self.activity_log_file, 'w', encoding='utf-8') as f:
-            json.dump(logs, f, ensure_ascii=False, indent=2)
-
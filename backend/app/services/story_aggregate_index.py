@@ -0,0 +1,176 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+def story_day(value) -> Optional[date]:
+    """ISO tarihinin gün kısmı (kaydın kendi saat diliminde); okunamazsa None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except (TypeError, ValueError):
+        return None
+
+
+class _Entry(NamedTuple):
+    """Bir hikâyenin sayaçlara katkısı (silme/güncellemede aynen geri alınır)."""
+    story_type: str
+    language: str
+    image_style: str
+    theme: Optional[str]
+    length: int
+    favorite: bool
+    day: Optional[date]
+
+
+def _entry(story: Dict) -> _Entry:
+    return _Entry(
+        story_type=story.get("story_type", "masal"),
+        language=story.get("language", "tr"),
+        image_style=story.get("image_style", "fantasy"),
+        theme=story.get("theme") or None,
+        length=len(story.get("story_text") or ""),
+        favorite=bool(story.get("is_favorite", False)),
+        day=story_day(story.get("created_at")),
+    )
+
+
+def _bump(counter: Counter, key, delta: int):
+    count = counter[key] + delta
+    if count > 0:
+        counter[key] = count
+    else:
+        del counter[key]
+
+
+class StoryAggregateIndex:
+    """
+    Kütüphane istatistikleri için yazma anında güncellenen sayaçlar.
+
+    - Tür, dil ve görsel stili başına sayım, favori sayısı, toplam metin uzunluğu
+    - Tema sayıları ve önbelleklenen ilk 10 tema (yalnızca tema sayısı değişince
+      yeniden seçilir); silmeler desteklendiği için yaklaşık bir sketch yerine
+      kesin sayım tutulur, boyutu farklı tema sayısıyla sınırlıdır
+    - Gün başına hikâye histogramı: 7/30 günlük pencereler pencere uzunluğu
+      kadar sözlük okumasıyla hesaplanır, kütüphane boyutundan bağımsızdır
+
+    Her hikâyenin katkısı ayrıca saklanır; güncelleme ve silmede tam olarak o
+    katkı geri alınır. Sayaçlar yalnızca bellektedir (açılışta snapshot + log'dan
+    kurulur); eşzamanlılık `StoryLogStore` kilidiyle sağlanır. `reconcile()`
+    sayaçları hikâyelerden baştan sayıp sapmayı düzeltir.
+    """
+
+    TOP_THEMES = 10
+
+    def __init__(self):
+        self._clear()
+        self.dirty = False
+
+    def _clear(self):
+        self._entries: Dict[str, _Entry] = {}
+        self.favorites = 0
+        self.length_sum = 0
+        self.types: Counter = Counter()
+        self.languages: Counter = Counter()
+        self.image_styles: Counter = Counter()
+        self.themes: Counter = Counter()
+        self.days: Counter = Counter()
+        self._top_themes: Optional[List[Tuple[str, int]]] = None
+
+    def _apply(self, entry: _Entry, delta: int):
+        self.favorites += delta if entry.favorite else 0
+        self.length_sum += delta * entry.length
+        _bump(self.types, entry.story_type, delta)
+        _bump(self.languages, entry.language, delta)
+        _bump(self.image_styles, entry.image_style, delta)
+        if entry.theme is not None:
+            _bump(self.themes, entry.theme, delta)
+            self._top_themes = None
+        if entry.day is not None:
+            _bump(self.days, entry.day, delta)
+
+    # ------------------------------------------------------------------ #
+    # Bakım (StoryLogStore indeks arayüzü)
+    # ------------------------------------------------------------------ #
+
+    def add(self, story: Dict, previous: Optional[Dict] = None):
+        story_id = story.get("story_id")
+        if story_id is None:
+            return
+        entry = _entry(story)
+        old = self._entries.get(story_id)
+        if old == entry:
+            return
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(entry, 1)
+        self._entries[story_id] = entry
+
+    def remove(self, story_id: str, story: Optional[Dict] = None):
+        entry = self._entries.pop(story_id, None)
+        if entry is not None:
+            self._apply(entry, -1)
+
+    def begin_rebuild(self):
+        # Sayaçlar ucuzdur: tam yeniden yüklemede baştan kurulur
+        self._clear()
+
+    def end_rebuild(self):
+        pass
+
+    def save(self):
+        """Sayaçlar kalıcı değildir; `StoryLogStore` arayüzü için."""
+
+    def load(self) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def reconcile(self, stories: Iterable[Dict]) -> List[str]:
+        """
+        Sayaçları verilen hikâyelerden baştan kurar ve önceki durumdan farklı
+        çıkan alanların adlarını döndürür (sapma yoksa boş liste).
+        """
+        fresh = StoryAggregateIndex()
+        for story in stories:
+            fresh.add(story)
+        fields = ("favorites", "length_sum", "types", "languages", "image_styles", "themes", "days")
+        drift = [name for name in fields if getattr(self, name) != getattr(fresh, name)]
+        if len(self._entries) != len(fresh._entries):
+            drift.insert(0, "total")
+        for name in ("_entries", "_top_themes") + fields:
+            setattr(self, name, getattr(fresh, name))
+        return drift
+
+    # ------------------------------------------------------------------ #
+    # Okuma
+    # ------------------------------------------------------------------ #
+
+    def top_themes(self, limit: int = TOP_THEMES) -> List[Tuple[str, int]]:
+        if limit != self.TOP_THEMES:
+            return self.themes.most_common(limit)
+        if self._top_themes is None:
+            self._top_themes = self.themes.most_common(self.TOP_THEMES)
+        return list(self._top_themes)
+
+    def count_since(self, start: date, today: date) -> int:
+        """start ile today (dahil) arasındaki günlerde oluşturulan hikâye sayısı."""
+        days = (today - start).days
+        return sum(self.days.get(start + timedelta(days=offset), 0) for offset in range(days + 1))
+
+    def snapshot(self, today: date) -> Dict:
+        """Sayaçların kopyası ve bugüne göre 1/7/30 günlük pencereler."""
+        return {
+            "total": len(self._entries),
+            "favorites": self.favorites,
+            "length_sum": self.length_sum,
+            "story_types": dict(self.types),
+            "languages": dict(self.languages),
+            "image_styles": dict(self.image_styles),
+            "top_themes": self.top_themes(),
+            "today": self.days.get(today, 0),
+            "last_7_days": self.count_since(today - timedelta(days=7), today),
+            "last_30_days": self.count_since(today - timedelta(days=30), today),
+        }
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryAiCharacterChatAdvancedService:
     """Hikaye AI karakter sohbetleri geliştirmeleri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.chat_sessions_file = os.path.join(settings.STORAGE_PATH, "character_chat_sessions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.chat_sessions_file):
-            with open(self.chat_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.chat_sessions_store = get_document_store(
+            self.chat_sessions_file, default_factory=list, item_key="chatbot_id"
+        )
     
     async def create_character_chatbot(
         self,
@@ -42,9 +36,7 @@ class StoryAiCharacterChatAdvancedService:
             "created_at": datetime.now().isoformat()
         }
         
-        chatbots = self._load_chatbots()
-        chatbots.append(chatbot)
-        self._save_chatbots(chatbots)
+        self.chat_sessions_store.append(chatbot)
         
         return {
             "chatbot_id": chatbot_id,
@@ -59,8 +51,7 @@ class StoryAiCharacterChatAdvancedService:
         user_id: Optional[str] = None
     ) -> Dict:
         """Karakterle sohbet eder."""
-        chatbots = self._load_chatbots()
-        chatbot = next((c for c in chatbots if c["chatbot_id"] == chatbot_id), None)
+        chatbot = self.chat_sessions_store.get_item(chatbot_id)
         
         if not chatbot:
             raise ValueError("Chatbot bulunamadı")
@@ -88,14 +79,16 @@ Bu karakter gibi konuş ve cevap ver."""
 Kullanıcı: {user_message}
 Karakter:"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": personality_prompt},
                 {"role": "user", "content": user_message}
             ],
             temperature=0.8,
-            max_tokens=300
+            max_tokens=300,
+            cache=False,
+            cache_namespace="story_ai_character_chat_advanced"
         )
         
         character_response = response.choices[0].message.content
@@ -109,10 +102,13 @@ Karakter:"""
             "timestamp": datetime.now().isoformat()
         }
         
-        chatbot["conversation_history"].append(conversation_entry)
-        chatbot["updated_at"] = datetime.now().isoformat()
+        def record(chatbot: Dict) -> Dict:
+            chatbot["conversation_history"].append(conversation_entry)
+            chatbot["updated_at"] = datetime.now().isoformat()
+            return chatbot
         
-        self._save_chatbots(chatbots)
+        # Yanıt beklenirken gelen diğer mesajlar korunur
+        self.chat_sessions_store.update_item(chatbot_id, record)
         
         return {
             "character_response": character_response,
@@ -128,11 +124,7 @@ Karakter:"""
         """Grup sohbeti oluşturur."""
         group_chat_id = str(uuid.uuid4())
         
-        chatbots = self._load_chatbots()
-        characters = [
-            c for c in chatbots
-            if c["chatbot_id"] in character_ids
-        ]
+        characters = self.chat_sessions_store.items(lambda c: c["chatbot_id"] in character_ids)
         
         if len(characters) != len(character_ids):
             raise ValueError("Bazı karakterler bulunamadı")
@@ -156,17 +148,3 @@ Karakter:"""
             "characters_count": len(characters),
             "message": "Grup sohbeti oluşturuldu"
         }
-    
-    def _load_chatbots(self) -> List[Dict]:
-        """Chatbot'ları yükler."""
-        try:
-            with open(self.chat_sessions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_chatbots(self, chatbots: List[Dict]):
-        """Chatbot'ları kaydeder."""
-        with open(self.chat_sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(chatbots, f, ensure_ascii=False, indent=2)
-
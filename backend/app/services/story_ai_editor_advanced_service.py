@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryAiEditorAdvancedService:
     """Hikaye AI editör servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.edits_file = os.path.join(settings.STORAGE_PATH, "ai_edits.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.edits_file):
-            with open(self.edits_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.edits_store = get_document_store(self.edits_file, default_factory=list)
     
     async def edit_story(
         self,
@@ -40,14 +32,16 @@ Hikaye:
 
 Düzenlenmiş versiyonu ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye editörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_ai_editor_advanced"
         )
         
         edited_text = response.choices[0].message.content
@@ -62,9 +56,7 @@ Düzenlenmiş versiyonu ver."""
             "created_at": datetime.now().isoformat()
         }
         
-        edits = self._load_edits()
-        edits.append(edit_record)
-        self._save_edits(edits)
+        self.edits_store.append(edit_record)
         
         return {
             "edit_id": edit_id,
@@ -83,14 +75,16 @@ Geçişleri daha yumuşak, olay örgüsünü daha tutarlı yap:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye akış uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_ai_editor_advanced"
         )
         
         improved_text = response.choices[0].message.content
@@ -111,14 +105,16 @@ Geçişleri daha yumuşak, olay örgüsünü daha tutarlı yap:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir diyalog uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_ai_editor_advanced"
         )
         
         enhanced_text = response.choices[0].message.content
@@ -146,17 +142,3 @@ Geçişleri daha yumuşak, olay örgüsünü daha tutarlı yap:
             changes.append("Yeni kelimeler eklendi")
         
         return changes if changes else ["Metin düzenlendi"]
-    
-    def _load_edits(self) -> List[Dict]:
-        """Düzenlemeleri yükler."""
-        try:
-            with open(self.edits_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_edits(self, edits: List[Dict]):
-        """Düzenlemeleri kaydeder."""
-        with open(self.edits_file, 'w', encoding='utf-8') as f:
-            json.dump(edits, f, ensure_ascii=False, indent=2)
-
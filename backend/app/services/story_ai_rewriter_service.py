@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryAiRewriterService:
     """Hikaye AI yeniden yazma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.rewrites_file = os.path.join(settings.STORAGE_PATH, "ai_rewrites.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryAiRewriterService:
     async def rewrite_story(self, story_id: str, story_text: str, rewrite_style: str = "improved") -> Dict:
         rewrite_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeyi {rewrite_style} şekilde yeniden yaz:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir hikaye yazarısın."}, {"role": "user", "content": prompt}],
-            temperature=0.7, max_tokens=2000
+            temperature=0.7, max_tokens=2000, cache=False, cache_namespace="story_ai_rewriter"
         )
         rewritten = response.choices[0].message.content
         return {"rewrite_id": rewrite_id, "rewritten_text": rewritten}
@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,9 @@ class StoryAiVisualizationService:
     """Hikaye AI görselleştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.visualizations_file = os.path.join(settings.STORAGE_PATH, "ai_visualizations.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.visualizations_file):
-            with open(self.visualizations_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.visualizations_store = get_document_store(self.visualizations_file, default_factory=list)
     
     async def create_story_visualization(
         self,
@@ -61,9 +53,7 @@ class StoryAiVisualizationService:
             "created_at": datetime.now().isoformat()
         }
         
-        visualizations_list = self._load_visualizations()
-        visualizations_list.append(visualization)
-        self._save_visualizations(visualizations_list)
+        self.visualizations_store.append(visualization)
         
         return {
             "visualization_id": visualization_id,
@@ -166,17 +156,3 @@ class StoryAiVisualizationService:
                 break
         
         return panels if panels else [text]
-    
-    def _load_visualizations(self) -> List[Dict]:
-        """Görselleştirmeleri yükler."""
-        try:
-            with open(self.visualizations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_visualizations(self, visualizations: List[Dict]):
-        """Görselleştirmeleri kaydeder."""
-        with open(self.visualizations_file, 'w', encoding='utf-8') as f:
-            json.dump(visualizations, f, ensure_ascii=False, indent=2)
-
@@ -1,14 +1,11 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import re
 
 
 class StoryAnalysisService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
-    
     async def analyze_story(
         self,
         story_text: str,
@@ -78,13 +75,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat analiz uzmanısın. Hikâyeleri detaylı analiz ediyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="story_analysis"
             )
             
             analysis_text = response.choices[0].message.content
@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
 import json
 import os
@@ -12,11 +13,13 @@ class StoryAnimationService:
     """Hikaye animasyon ve video oluşturma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.animations_file = os.path.join(settings.STORAGE_PATH, "story_animations.json")
         self.animations_path = os.path.join(settings.STORAGE_PATH, "animations")
         self._ensure_files()
+        self.animations_store = get_document_store(
+            self.animations_file, default_factory=list, item_key="animation_id"
+        )
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -62,9 +65,7 @@ class StoryAnimationService:
             "created_at": datetime.now().isoformat()
         }
         
-        animations = self._load_animations()
-        animations.append(animation)
-        self._save_animations(animations)
+        self.animations_store.append(animation)
         
         return {
             "animation_id": animation_id,
@@ -148,19 +149,4 @@ class StoryAnimationService:
     
     async def get_animation(self, animation_id: str) -> Optional[Dict]:
         """Animasyonu getirir."""
-        animations = self._load_animations()
-        return next((a for a in animations if a["animation_id"] == animation_id), None)
-    
-    def _load_animations(self) -> List[Dict]:
-        """Animasyonları yükler."""
-        try:
-            with open(self.animations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_animations(self, animations: List[Dict]):
-        """Animasyonları kaydeder."""
-        with open(self.animations_file, 'w', encoding='utf-8') as f:
-            json.dump(animations, f, ensure_ascii=False, indent=2)
-
+        return self.animations_store.get_item(animation_id)
@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.sound_effect_service import SoundEffectService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,11 @@ class StoryAtmosphereService:
     """Hikaye ses efektleri ve atmosfer servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.sound_effect_service = SoundEffectService()
         self.atmospheres_file = os.path.join(settings.STORAGE_PATH, "story_atmospheres.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.atmospheres_file):
-            with open(self.atmospheres_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.atmospheres_store = get_document_store(
+            self.atmospheres_file, default_factory=list, item_key="atmosphere_id"
+        )
     
     async def create_atmosphere(
         self,
@@ -60,9 +54,7 @@ class StoryAtmosphereService:
             "created_at": datetime.now().isoformat()
         }
         
-        atmospheres = self._load_atmospheres()
-        atmospheres.append(atmosphere)
-        self._save_atmospheres(atmospheres)
+        self.atmospheres_store.append(atmosphere)
         
         return {
             "atmosphere_id": atmosphere_id,
@@ -77,12 +69,6 @@ class StoryAtmosphereService:
         volume: float = 0.3
     ) -> Dict:
         """Arka plan atmosferi ekler."""
-        atmospheres = self._load_atmospheres()
-        atmosphere = next((a for a in atmospheres if a["atmosphere_id"] == atmosphere_id), None)
-        
-        if not atmosphere:
-            raise ValueError("Atmosfer bulunamadı")
-        
         ambience_mapping = {
             "forest": ["wind", "birds", "leaves"],
             "ocean": ["waves", "seagulls", "wind"],
@@ -93,13 +79,16 @@ class StoryAtmosphereService:
         
         sounds = ambience_mapping.get(ambience_type, ["ambient"])
         
-        atmosphere["background_ambience"] = {
-            "type": ambience_type,
-            "sounds": sounds,
-            "volume": volume
-        }
+        def set_ambience(atmosphere: Dict) -> Dict:
+            atmosphere["background_ambience"] = {
+                "type": ambience_type,
+                "sounds": sounds,
+                "volume": volume
+            }
+            return atmosphere
         
-        self._save_atmospheres(atmospheres)
+        if not self.atmospheres_store.update_item(atmosphere_id, set_ambience):
+            raise ValueError("Atmosfer bulunamadı")
         
         return {
             "message": "Arka plan atmosferi eklendi",
@@ -155,17 +144,3 @@ class StoryAtmosphereService:
         }
         
         return effect_mapping.get(emotion, ["ambient"])
-    
-    def _load_atmospheres(self) -> List[Dict]:
-        """Atmosferleri yükler."""
-        try:
-            with open(self.atmospheres_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_atmospheres(self, atmospheres: List[Dict]):
-        """Atmosferleri kaydeder."""
-        with open(self.atmospheres_file, 'w', encoding='utf-8') as f:
-            json.dump(atmospheres, f, ensure_ascii=False, indent=2)
-
@@ -1,10 +1,11 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.tts_service import TTSService
+from app.services.chapter_synthesis import ChapterSynthesisScheduler, build_key
 import json
 import os
-import uuid
 from datetime import datetime
 
 
@@ -12,11 +13,16 @@ class StoryAudiobookService:
     """Hikaye sesli kitap formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.tts_service = TTSService()
         self.audiobooks_file = os.path.join(settings.STORAGE_PATH, "story_audiobooks.json")
         self.audiobooks_path = os.path.join(settings.STORAGE_PATH, "audiobooks")
         self._ensure_files()
+        self.audiobooks_store = get_document_store(
+            self.audiobooks_file, default_factory=list, item_key="audiobook_id"
+        )
+        self.scheduler = ChapterSynthesisScheduler(
+            self.tts_service, os.path.join(self.audiobooks_path, "manifests")
+        )
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -35,32 +41,33 @@ class StoryAudiobookService:
         chapter_breaks: bool = True,
         background_music: bool = False
     ) -> Dict:
-        """Hikayeden sesli kitap oluşturur."""
-        audiobook_id = str(uuid.uuid4())
+        """
+        Hikayeden sesli kitap oluşturur.
         
+        Bölümler eşzamanlı seslendirilir; aynı girdiyle tekrar çağrı, yarıda
+        kalan yapının bitmiş bölümlerini yeniden üretmeden devam eder.
+        """
         # Hikayeyi bölümlere ayır
         if chapter_breaks:
             chapters = self._split_into_chapters(story_text)
         else:
             chapters = [story_text]
         
-        # Her bölüm için ses oluştur
-        audio_chapters = []
-        for i, chapter in enumerate(chapters):
-            audio_url = await self.tts_service.generate_speech(
-                text=chapter,
-                language="tr",
-                story_id=story_id,
-                voice=narrator_voice,
-                emotion="neutral"
-            )
-            audio_chapters.append({
-                "chapter_number": i + 1,
-                "title": f"Bölüm {i + 1}",
+        audiobook_id = build_key("audiobook", story_id, chapters, narrator_voice)
+        manifest = await self.scheduler.run(audiobook_id, [
+            {"text": chapter, "language": "tr", "voice": narrator_voice, "emotion": "neutral"}
+            for chapter in chapters
+        ])
+        audio_chapters = [
+            {
+                "chapter_number": entry["number"],
+                "title": f"Bölüm {entry['number']}",
                 "text": chapter,
-                "audio_url": audio_url,
-                "duration": len(chapter) * 0.1  # Tahmini süre
-            })
+                "audio_url": entry["audio_url"],
+                "duration": entry["duration"]
+            }
+            for entry, chapter in zip(manifest["chapters"], chapters)
+        ]
         
         audiobook = {
             "audiobook_id": audiobook_id,
@@ -69,13 +76,13 @@ class StoryAudiobookService:
             "chapters": audio_chapters,
             "narrator_voice": narrator_voice,
             "background_music": background_music,
-            "total_duration": sum(ch["duration"] for ch in audio_chapters),
+            "total_duration": manifest["total_duration"],
             "created_at": datetime.now().isoformat()
         }
         
-        audiobooks = self._load_audiobooks()
-        audiobooks.append(audiobook)
-        self._save_audiobooks(audiobooks)
+        # Aynı yapı tekrar oluşturulduysa eski kayıt yenisiyle değişir
+        if not self.audiobooks_store.update_item(audiobook_id, lambda _: audiobook):
+            self.audiobooks_store.append(audiobook)
         
         return {
             "audiobook_id": audiobook_id,
@@ -91,29 +98,29 @@ class StoryAudiobookService:
         character_voices: Dict[str, str]
     ) -> Dict:
         """Karakter sesleriyle sesli kitap oluşturur."""
-        audiobook_id = str(uuid.uuid4())
-        
         # Hikayeyi diyaloglara ayır
         dialogues = self._extract_dialogues(story_text)
         
-        audio_segments = []
-        for dialogue in dialogues:
-            character = dialogue.get("character", "narrator")
-            voice = character_voices.get(character, "alloy")
-            
-            audio_url = await self.tts_service.generate_speech(
-                text=dialogue["text"],
-                language="tr",
-                story_id=story_id,
-                voice=voice,
-                character_id=character
-            )
-            
-            audio_segments.append({
-                "character": character,
+        segments = [
+            {
                 "text": dialogue["text"],
-                "audio_url": audio_url
-            })
+                "language": "tr",
+                "voice": character_voices.get(dialogue.get("character", "narrator"), "alloy"),
+                "character_id": dialogue.get("character", "narrator"),
+            }
+            for dialogue in dialogues
+        ]
+        audiobook_id = build_key("character_audiobook", story_id, segments)
+        manifest = await self.scheduler.run(audiobook_id, segments)
+        audio_segments = [
+            {
+                "character": segment["character_id"],
+                "text": segment["text"],
+                "audio_url": entry["audio_url"],
+                "duration": entry["duration"]
+            }
+            for entry, segment in zip(manifest["chapters"], segments)
+        ]
         
         audiobook = {
             "audiobook_id": audiobook_id,
@@ -126,6 +133,7 @@ class StoryAudiobookService:
         return {
             "audiobook_id": audiobook_id,
             "segments_count": len(audio_segments),
+            "total_duration": manifest["total_duration"],
             "message": "Karakter sesli kitap oluşturuldu"
         }
     
@@ -169,19 +177,4 @@ class StoryAudiobookService:
     
     async def get_audiobook(self, audiobook_id: str) -> Optional[Dict]:
         """Sesli kitabı getirir."""
-        audiobooks = self._load_audiobooks()
-        return next((a for a in audiobooks if a["audiobook_id"] == audiobook_id), None)
-    
-    def _load_audiobooks(self) -> List[Dict]:
-        """Sesli kitapları yükler."""
-        try:
-            with open(self.audiobooks_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_audiobooks(self, audiobooks: List[Dict]):
-        """Sesli kitapları kaydeder."""
-        with open(self.audiobooks_file, 'w', encoding='utf-8') as f:
-            json.dump(audiobooks, f, ensure_ascii=False, indent=2)
-
+        return self.audiobooks_store.get_item(audiobook_id)
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryAutoCategorizationService:
     """Hikaye otomatik kategorizasyon servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.categories_file = os.path.join(settings.STORAGE_PATH, "story_categories.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.categories_file):
-            with open(self.categories_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.categories_store = get_document_store(self.categories_file, default_factory=list)
     
     async def categorize_story(
         self,
@@ -35,14 +27,16 @@ Ana kategori, alt kategori, yaş grubu ve temaları belirle:
 
 JSON formatında döndür."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik kategorizasyon uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_auto_categorization"
         )
         
         categorization_text = response.choices[0].message.content
@@ -58,9 +52,7 @@ JSON formatında döndür."""
             "created_at": datetime.now().isoformat()
         }
         
-        categories_list = self._load_categories()
-        categories_list.append(category_record)
-        self._save_categories(categories_list)
+        self.categories_store.append(category_record)
         
         return {
             "story_id": story_id,
@@ -110,7 +102,7 @@ JSON formatında döndür."""
         limit: int = 5
     ) -> List[str]:
         """Benzer hikayeleri getirir."""
-        categories_list = self._load_categories()
+        categories_list = self.categories_store.items()
         story_categories = next(
             (c for c in categories_list if c["story_id"] == story_id),
             None
@@ -127,17 +119,3 @@ JSON formatında döndür."""
         ]
         
         return similar[:limit]
-    
-    def _load_categories(self) -> List[Dict]:
-        """Kategorileri yükler."""
-        try:
-            with open(self.categories_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_categories(self, categories: List[Dict]):
-        """Kategorileri kaydeder."""
-        with open(self.categories_file, 'w', encoding='utf-8') as f:
-            json.dump(categories, f, ensure_ascii=False, indent=2)
-
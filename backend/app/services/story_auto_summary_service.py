@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryAutoSummaryService:
     """Hikaye otomatik özetleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.summaries_file = os.path.join(settings.STORAGE_PATH, "story_summaries.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.summaries_file):
-            with open(self.summaries_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.summaries_store = get_document_store(self.summaries_file, default_factory=list)
     
     async def create_summary(
         self,
@@ -41,14 +33,16 @@ class StoryAutoSummaryService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir özet uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=300
+            max_tokens=300,
+            cache=True,
+            cache_namespace="story_auto_summary"
         )
         
         summary_text = response.choices[0].message.content
@@ -62,9 +56,7 @@ class StoryAutoSummaryService:
             "created_at": datetime.now().isoformat()
         }
         
-        summaries = self._load_summaries()
-        summaries.append(summary)
-        self._save_summaries(summaries)
+        self.summaries_store.append(summary)
         
         return {
             "summary_id": summary_id,
@@ -83,14 +75,16 @@ class StoryAutoSummaryService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=500
+            max_tokens=500,
+            cache=True,
+            cache_namespace="story_auto_summary"
         )
         
         key_points_text = response.choices[0].message.content
@@ -114,14 +108,15 @@ class StoryAutoSummaryService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir özet uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=100
+            max_tokens=100,
+            cache_namespace="story_auto_summary"
         )
         
         tldr_text = response.choices[0].message.content
@@ -131,17 +126,3 @@ class StoryAutoSummaryService:
             "tldr": tldr_text,
             "message": "TL;DR oluşturuldu"
         }
-    
-    def _load_summaries(self) -> List[Dict]:
-        """Özetleri yükler."""
-        try:
-            with open(self.summaries_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_summaries(self, summaries: List[Dict]):
-        """Özetleri kaydeder."""
-        with open(self.summaries_file, 'w', encoding='utf-8') as f:
-            json.dump(summaries, f, ensure_ascii=False, indent=2)
-
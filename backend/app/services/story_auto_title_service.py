@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryAutoTitleService:
     """Hikaye otomatik başlık önerileri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.titles_file = os.path.join(settings.STORAGE_PATH, "story_titles.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.titles_file):
-            with open(self.titles_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.titles_store = get_document_store(self.titles_file, default_factory=list)
     
     async def generate_titles(
         self,
@@ -46,14 +38,16 @@ class StoryAutoTitleService:
 
 Her başlık farklı bir açıdan yaklaşsın."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir başlık yazım uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=300
+            max_tokens=300,
+            cache=False,
+            cache_namespace="story_auto_title"
         )
         
         titles_text = response.choices[0].message.content
@@ -69,9 +63,7 @@ Her başlık farklı bir açıdan yaklaşsın."""
             "created_at": datetime.now().isoformat()
         }
         
-        titles_list = self._load_titles()
-        titles_list.append(title_record)
-        self._save_titles(titles_list)
+        self.titles_store.append(title_record)
         
         return {
             "title_id": title_id,
@@ -94,14 +86,16 @@ Hikaye:
 
 3 farklı optimize edilmiş versiyon öner."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir başlık optimizasyon uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=200
+            max_tokens=200,
+            cache=False,
+            cache_namespace="story_auto_title"
         )
         
         optimized_titles = response.choices[0].message.content
@@ -124,17 +118,3 @@ Hikaye:
                     titles.append(title)
         
         return titles[:num_titles] if titles else ["Başlıksız Hikaye"]
-    
-    def _load_titles(self) -> List[Dict]:
-        """Başlıkları yükler."""
-        try:
-            with open(self.titles_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_titles(self, titles: List[Dict]):
-        """Başlıkları kaydeder."""
-        with open(self.titles_file, 'w', encoding='utf-8') as f:
-            json.dump(titles, f, ensure_ascii=False, indent=2)
-
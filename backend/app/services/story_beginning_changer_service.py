@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryBeginningChangerService:
     """Hikaye içerik başlangıç değiştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.beginning_changes_file = os.path.join(settings.STORAGE_PATH, "beginning_changes.json")
         self._ensure_files()
     
@@ -43,14 +42,16 @@ class StoryBeginningChangerService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye başlangıcı uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_beginning_changer"
         )
         
         new_beginning_text = response.choices[0].message.content
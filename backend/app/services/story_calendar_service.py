@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryCalendarService:
@@ -11,14 +11,9 @@ class StoryCalendarService:
     
     def __init__(self):
         self.calendar_file = os.path.join(settings.STORAGE_PATH, "story_calendar.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.calendar_file):
-            with open(self.calendar_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.calendar_store = get_document_store(
+            self.calendar_file, default_factory=list, item_key="schedule_id"
+        )
     
     async def schedule_story(
         self,
@@ -44,9 +39,7 @@ class StoryCalendarService:
             "created_at": datetime.now().isoformat()
         }
         
-        schedules = self._load_schedules()
-        schedules.append(schedule)
-        self._save_schedules(schedules)
+        self.calendar_store.append(schedule)
         
         return {
             "schedule_id": schedule_id,
@@ -59,8 +52,7 @@ class StoryCalendarService:
         date: Optional[str] = None
     ) -> List[Dict]:
         """Planlanmış hikayeleri getirir."""
-        schedules = self._load_schedules()
-        user_schedules = [s for s in schedules if s["user_id"] == user_id]
+        user_schedules = self.calendar_store.items(lambda s: s["user_id"] == user_id)
         
         if date:
             user_schedules = [s for s in user_schedules if s["scheduled_date"] == date]
@@ -79,19 +71,16 @@ class StoryCalendarService:
         user_id: str
     ) -> Dict:
         """Planlanmış hikayeyi tamamlandı olarak işaretler."""
-        schedules = self._load_schedules()
-        schedule = next((s for s in schedules if s["schedule_id"] == schedule_id), None)
-        
-        if not schedule:
+        def complete(schedule: Dict) -> Dict:
+            if schedule["user_id"] != user_id:
+                raise ValueError("Bu planı düzenleme yetkiniz yok")
+            schedule["completed"] = True
+            schedule["completed_at"] = datetime.now().isoformat()
+            return schedule
+        
+        if not self.calendar_store.update_item(schedule_id, complete):
             raise ValueError("Plan bulunamadı")
         
-        if schedule["user_id"] != user_id:
-            raise ValueError("Bu planı düzenleme yetkiniz yok")
-        
-        schedule["completed"] = True
-        schedule["completed_at"] = datetime.now().isoformat()
-        self._save_schedules(schedules)
-        
         return {"message": "Hikaye tamamlandı olarak işaretlendi"}
     
     async def get_upcoming_stories(
@@ -100,16 +89,14 @@ class StoryCalendarService:
         days_ahead: int = 7
     ) -> List[Dict]:
         """Yaklaşan hikayeleri getirir."""
-        schedules = self._load_schedules()
         today = datetime.now().date()
         end_date = today + timedelta(days=days_ahead)
         
-        upcoming = [
-            s for s in schedules
-            if s["user_id"] == user_id
+        upcoming = self.calendar_store.items(
+            lambda s: s["user_id"] == user_id
             and not s.get("completed", False)
             and datetime.fromisoformat(s["scheduled_date"]).date() <= end_date
-        ]
+        )
         
         upcoming.sort(key=lambda x: x.get("scheduled_date", ""))
         
@@ -122,8 +109,7 @@ class StoryCalendarService:
         year: Optional[int] = None
     ) -> Dict:
         """Takvim istatistiklerini getirir."""
-        schedules = self._load_schedules()
-        user_schedules = [s for s in schedules if s["user_id"] == user_id]
+        user_schedules = self.calendar_store.items(lambda s: s["user_id"] == user_id)
         
         if month and year:
             user_schedules = [
@@ -141,17 +127,3 @@ class StoryCalendarService:
             "pending": total - completed,
             "completion_rate": round((completed / total * 100) if total > 0 else 0, 2)
         }
-    
-    def _load_schedules(self) -> List[Dict]:
-        """Planları yükler."""
-        try:
-            with open(self.calendar_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_schedules(self, schedules: List[Dict]):
-        """Planları kaydeder."""
-        with open(self.calendar_file, 'w', encoding='utf-8') as f:
-            json.dump(schedules, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryCharacterDevelopmentService:
     """Hikaye karakter geliştirme araçları servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.characters_file = os.path.join(settings.STORAGE_PATH, "developed_characters.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.characters_file):
-            with open(self.characters_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.characters_store = get_document_store(
+            self.characters_file, default_factory=list, item_key="character_id"
+        )
     
     async def create_character_profile(
         self,
@@ -43,14 +37,16 @@ Tür: {character_type}
 4. Motivasyonlar ve hedefler
 5. Güçlü ve zayıf yönler"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir karakter geliştirme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_character_development"
         )
         
         profile = response.choices[0].message.content
@@ -65,9 +61,7 @@ Tür: {character_type}
             "created_at": datetime.now().isoformat()
         }
         
-        characters = self._load_characters()
-        characters.append(character)
-        self._save_characters(characters)
+        self.characters_store.append(character)
         
         return {
             "character_id": character_id,
@@ -81,8 +75,7 @@ Tür: {character_type}
         story_context: str
     ) -> Dict:
         """Karakter gelişim yayı oluşturur."""
-        characters = self._load_characters()
-        character = next((c for c in characters if c["character_id"] == character_id), None)
+        character = self.characters_store.get_item(character_id)
         
         if not character:
             raise ValueError("Karakter bulunamadı")
@@ -95,22 +88,26 @@ Hikaye bağlamı: {story_context}
 
 Karakterin başlangıç, orta ve son durumunu göster."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye yapısı uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_character_development"
         )
         
         character_arc = response.choices[0].message.content
         
-        character["character_arc"] = character_arc
-        character["updated_at"] = datetime.now().isoformat()
+        def set_arc(character: Dict) -> Dict:
+            character["character_arc"] = character_arc
+            character["updated_at"] = datetime.now().isoformat()
+            return character
         
-        self._save_characters(characters)
+        self.characters_store.update_item(character_id, set_arc)
         
         return {
             "character_id": character_id,
@@ -124,12 +121,6 @@ Karakterin başlangıç, orta ve son durumunu göster."""
         trait_description: str
     ) -> Dict:
         """Karaktere özellik ekler."""
-        characters = self._load_characters()
-        character = next((c for c in characters if c["character_id"] == character_id), None)
-        
-        if not character:
-            raise ValueError("Karakter bulunamadı")
-        
         trait = {
             "trait_id": str(uuid.uuid4()),
             "name": trait_name,
@@ -137,10 +128,13 @@ Karakterin başlangıç, orta ve son durumunu göster."""
             "added_at": datetime.now().isoformat()
         }
         
-        character["traits"].append(trait)
-        character["updated_at"] = datetime.now().isoformat()
+        def add_trait(character: Dict) -> Dict:
+            character["traits"].append(trait)
+            character["updated_at"] = datetime.now().isoformat()
+            return character
         
-        self._save_characters(characters)
+        if not self.characters_store.update_item(character_id, add_trait):
+            raise ValueError("Karakter bulunamadı")
         
         return {
             "trait_id": trait["trait_id"],
@@ -155,9 +149,8 @@ Karakterin başlangıç, orta ve son durumunu göster."""
         description: str
     ) -> Dict:
         """Karakter ilişkisi oluşturur."""
-        characters = self._load_characters()
-        char1 = next((c for c in characters if c["character_id"] == character1_id), None)
-        char2 = next((c for c in characters if c["character_id"] == character2_id), None)
+        char1 = self.characters_store.get_item(character1_id)
+        char2 = self.characters_store.get_item(character2_id)
         
         if not char1 or not char2:
             raise ValueError("Karakter bulunamadı")
@@ -171,10 +164,12 @@ Karakterin başlangıç, orta ve son durumunu göster."""
             "created_at": datetime.now().isoformat()
         }
         
-        char1["relationships"].append(relationship)
-        char2["relationships"].append(relationship)
+        def relate(character: Dict) -> Dict:
+            character["relationships"].append(relationship)
+            return character
         
-        self._save_characters(characters)
+        self.characters_store.update_item(character1_id, relate)
+        self.characters_store.update_item(character2_id, relate)
         
         return {
             "relationship_id": relationship["relationship_id"],
@@ -183,19 +178,4 @@ Karakterin başlangıç, orta ve son durumunu göster."""
     
     async def get_character(self, character_id: str) -> Optional[Dict]:
         """Karakteri getirir."""
-        characters = self._load_characters()
-        return next((c for c in characters if c["character_id"] == character_id), None)
-    
-    def _load_characters(self) -> List[Dict]:
-        """Karakterleri yükler."""
-        try:
-            with open(self.characters_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_characters(self, characters: List[Dict]):
-        """Karakterleri kaydeder."""
-        with open(self.characters_file, 'w', encoding='utf-8') as f:
-            json.dump(characters, f, ensure_ascii=False, indent=2)
-
+        return self.characters_store.get_item(character_id)
@@ -1,28 +1,20 @@
-import json
 import os
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from openai import OpenAI
 
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 
 
 class StoryCharacterMapService:
     """Hikaye karakterleri ve ilişkiler haritası servisi"""
 
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.character_maps_file = os.path.join(settings.STORAGE_PATH, "character_maps.json")
-        self._ensure_files()
-
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.character_maps_file):
-            with open(self.character_maps_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.character_maps_store = get_document_store(self.character_maps_file, default_factory=dict)
 
     async def analyze_characters(
         self,
@@ -41,14 +33,16 @@ Hikaye:
 
 JSON formatında döndür."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_character_map"
         )
 
         # Basit parse (gerçek uygulamada daha gelişmiş olmalı)
@@ -65,9 +59,7 @@ JSON formatında döndür."""
             "analyzed_at": datetime.now().isoformat()
         }
 
-        maps = self._load_maps()
-        maps[story_id] = character_map
-        self._save_maps(maps)
+        self.character_maps_store.put(story_id, character_map)
 
         return character_map
 
@@ -124,8 +116,7 @@ JSON formatında döndür."""
 
     async def get_character_map(self, story_id: str) -> Optional[Dict]:
         """Karakter haritasını getirir."""
-        maps = self._load_maps()
-        return maps.get(story_id)
+        return self.character_maps_store.get(story_id)
 
     async def update_character(
         self,
@@ -134,37 +125,26 @@ JSON formatında döndür."""
         updates: Dict
     ) -> Dict:
         """Karakter bilgilerini günceller."""
-        maps = self._load_maps()
-        character_map = maps.get(story_id)
+        updated = {}
 
-        if not character_map:
-            raise ValueError("Karakter haritası bulunamadı")
+        def apply(character_map: Optional[Dict]) -> Dict:
+            if not character_map:
+                raise ValueError("Karakter haritası bulunamadı")
 
-        character = next(
-            (c for c in character_map["characters"] if c["character_id"] == character_id),
-            None
-        )
+            character = next(
+                (c for c in character_map["characters"] if c["character_id"] == character_id),
+                None
+            )
 
-        if not character:
-            raise ValueError("Karakter bulunamadı")
+            if not character:
+                raise ValueError("Karakter bulunamadı")
 
-        character.update(updates)
-        character_map["updated_at"] = datetime.now().isoformat()
+            character.update(updates)
+            character_map["updated_at"] = datetime.now().isoformat()
+            updated["character"] = character
+            return character_map
 
-        self._save_maps(maps)
+        self.character_maps_store.update(story_id, apply)
+        character = updated["character"]
 
         return {"message": "Karakter güncellendi", "character": character}
-
-    def _load_maps(self) -> Dict:
-        """Haritaları yükler."""
-        try:
-            with open(self.character_maps_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_maps(self, maps: Dict):
-        """Haritaları kaydeder."""
-        with open(self.character_maps_file, 'w', encoding='utf-8') as f:
-            json.dump(maps, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryCharacterReplacerService:
     """Hikaye içerik karakter değiştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.character_replacements_file = os.path.join(settings.STORAGE_PATH, "character_replacements.json")
         self._ensure_files()
     
@@ -37,14 +36,16 @@ Karakterin özelliklerini ve rollerini yeni karaktere uyarla:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir karakter değiştirme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_character_replacer"
         )
         
         replaced_text = response.choices[0].message.content
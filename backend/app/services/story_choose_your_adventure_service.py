@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryChooseYourAdventureService:
     """Hikaye interaktif seçimler ve dallanma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.adventures_file = os.path.join(settings.STORAGE_PATH, "choose_adventures.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.adventures_file):
-            with open(self.adventures_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.adventures_store = get_document_store(
+            self.adventures_file, default_factory=list, item_key="adventure_id"
+        )
     
     async def create_choose_adventure(
         self,
@@ -46,9 +40,7 @@ class StoryChooseYourAdventureService:
             "created_at": datetime.now().isoformat()
         }
         
-        adventures = self._load_adventures()
-        adventures.append(adventure)
-        self._save_adventures(adventures)
+        self.adventures_store.append(adventure)
         
         return {
             "adventure_id": adventure_id,
@@ -72,14 +64,16 @@ Her seçenek farklı bir sonuca götürmeli:
 
 Seçenekleri ve her seçeneğin kısa açıklamasını ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir interaktif hikaye uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_choose_your_adventure"
         )
         
         choices_text = response.choices[0].message.content
@@ -105,14 +99,12 @@ Seçenekleri ve her seçeneğin kısa açıklamasını ver."""
         continuation_story: str
     ) -> Dict:
         """Seçim yolunu genişletir."""
-        adventures = self._load_adventures()
-        adventure = next((a for a in adventures if a["adventure_id"] == adventure_id), None)
+        adventure = self.adventures_store.get_item(adventure_id)
         
         if not adventure:
             raise ValueError("Macera bulunamadı")
         
-        from_node = next((n for n in adventure["nodes"] if n["node_id"] == from_node_id), None)
-        if not from_node:
+        if not any(n["node_id"] == from_node_id for n in adventure["nodes"]):
             raise ValueError("Düğüm bulunamadı")
         
         # Yeni düğüm oluştur
@@ -122,12 +114,15 @@ Seçenekleri ve her seçeneğin kısa açıklamasını ver."""
             from_node_id
         )
         
-        # Seçeneği bağla
-        if choice_index < len(from_node["choices"]):
-            from_node["choices"][choice_index]["next_node_id"] = new_node["node_id"]
+        def link(adventure: Dict) -> Dict:
+            # Seçeneği bağla
+            from_node = next(n for n in adventure["nodes"] if n["node_id"] == from_node_id)
+            if choice_index < len(from_node["choices"]):
+                from_node["choices"][choice_index]["next_node_id"] = new_node["node_id"]
+            adventure["nodes"].append(new_node)
+            return adventure
         
-        adventure["nodes"].append(new_node)
-        self._save_adventures(adventures)
+        self.adventures_store.update_item(adventure_id, link)
         
         return {
             "new_node_id": new_node["node_id"],
@@ -141,8 +136,7 @@ Seçenekleri ve her seçeneğin kısa açıklamasını ver."""
         choice_index: int
     ) -> Dict:
         """Seçim yapar ve sonraki düğüme geçer."""
-        adventures = self._load_adventures()
-        adventure = next((a for a in adventures if a["adventure_id"] == adventure_id), None)
+        adventure = self.adventures_store.get_item(adventure_id)
         
         if not adventure:
             raise ValueError("Macera bulunamadı")
@@ -199,17 +193,3 @@ Seçenekleri ve her seçeneğin kısa açıklamasını ver."""
             {"choice_id": str(uuid.uuid4()), "description": f"Seçenek {i+1}", "next_node_id": None}
             for i in range(num_choices)
         ]
-    
-    def _load_adventures(self) -> List[Dict]:
-        """Maceraları yükler."""
-        try:
-            with open(self.adventures_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_adventures(self, adventures: List[Dict]):
-        """Maceraları kaydeder."""
-        with open(self.adventures_file, 'w', encoding='utf-8') as f:
-            json.dump(adventures, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryClimaxEnhancerService:
     """Hikaye doruk noktası geliştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.climaxes_file = os.path.join(settings.STORAGE_PATH, "climax_enhancements.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryClimaxEnhancerService:
     async def enhance_climax(self, story_id: str, story_text: str) -> Dict:
         climax_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayenin doruk noktasını güçlendir:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir doruk noktası uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.8, max_tokens=2000
+            temperature=0.8, max_tokens=2000, cache=False, cache_namespace="story_climax_enhancer"
         )
         enhanced = response.choices[0].message.content
         return {"climax_id": climax_id, "enhanced_text": enhanced}
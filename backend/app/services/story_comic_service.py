@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
 import json
 import os
@@ -12,11 +13,11 @@ class StoryComicService:
     """Hikaye çizgi roman formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.comics_file = os.path.join(settings.STORAGE_PATH, "story_comics.json")
         self.comics_path = os.path.join(settings.STORAGE_PATH, "comics")
         self._ensure_files()
+        self.comics_store = get_document_store(self.comics_file, default_factory=list, item_key="comic_id")
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -74,9 +75,7 @@ class StoryComicService:
             "created_at": datetime.now().isoformat()
         }
         
-        comics = self._load_comics()
-        comics.append(comic)
-        self._save_comics(comics)
+        self.comics_store.append(comic)
         
         return {
             "comic_id": comic_id,
@@ -167,19 +166,4 @@ class StoryComicService:
     
     async def get_comic(self, comic_id: str) -> Optional[Dict]:
         """Çizgi romanı getirir."""
-        comics = self._load_comics()
-        return next((c for c in comics if c["comic_id"] == comic_id), None)
-    
-    def _load_comics(self) -> List[Dict]:
-        """Çizgi romanları yükler."""
-        try:
-            with open(self.comics_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_comics(self, comics: List[Dict]):
-        """Çizgi romanları kaydeder."""
-        with open(self.comics_file, 'w', encoding='utf-8') as f:
-            json.dump(comics, f, ensure_ascii=False, indent=2)
-
+        return self.comics_store.get_item(comic_id)
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryCommentAnalysisService:
     """Hikaye yorum ve analiz araçları servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.analyses_file = os.path.join(settings.STORAGE_PATH, "comment_analyses.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.analyses_file):
-            with open(self.analyses_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.analyses_store = get_document_store(self.analyses_file, default_factory=list)
     
     async def analyze_comments(
         self,
@@ -41,14 +33,16 @@ class StoryCommentAnalysisService:
 3. Öneriler ve geri bildirimler
 4. En çok bahsedilen özellikler"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir yorum analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_comment_analysis"
         )
         
         analysis_text = response.choices[0].message.content
@@ -66,9 +60,7 @@ class StoryCommentAnalysisService:
             "created_at": datetime.now().isoformat()
         }
         
-        analyses = self._load_analyses()
-        analyses.append(analysis)
-        self._save_analyses(analyses)
+        self.analyses_store.append(analysis)
         
         return {
             "analysis_id": analysis_id,
@@ -90,14 +82,16 @@ Yorum: {comment}
 
 3 farklı yanıt seçeneği sun."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir müşteri hizmetleri uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_comment_analysis"
         )
         
         suggestions = response.choices[0].message.content
@@ -140,17 +134,3 @@ Yorum: {comment}
                 themes.append(theme)
         
         return themes
-    
-    def _load_analyses(self) -> List[Dict]:
-        """Analizleri yükler."""
-        try:
-            with open(self.analyses_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_analyses(self, analyses: List[Dict]):
-        """Analizleri kaydeder."""
-        with open(self.analyses_file, 'w', encoding='utf-8') as f:
-            json.dump(analyses, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryCommunityFeaturesService:
     """Hikaye topluluk özellikleri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.communities_file = os.path.join(settings.STORAGE_PATH, "communities.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.communities_file):
-            with open(self.communities_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.communities_store = get_document_store(
+            self.communities_file, default_factory=list, item_key="community_id"
+        )
     
     async def create_community(
         self,
@@ -43,9 +37,7 @@ class StoryCommunityFeaturesService:
             "created_at": datetime.now().isoformat()
         }
         
-        communities = self._load_communities()
-        communities.append(community)
-        self._save_communities(communities)
+        self.communities_store.append(community)
         
         return {
             "community_id": community_id,
@@ -59,18 +51,22 @@ class StoryCommunityFeaturesService:
         user_id: str
     ) -> Dict:
         """Topluluğa katıl."""
-        communities = self._load_communities()
-        community = next((c for c in communities if c["community_id"] == community_id), None)
+        result = {"joined": False}
+        
+        def join(community: Dict) -> Dict:
+            if user_id not in community["members"]:
+                community["members"].append(user_id)
+                result["joined"] = True
+            return community
+        
+        community = self.communities_store.update_item(community_id, join)
         
         if not community:
             raise ValueError("Topluluk bulunamadı")
         
-        if user_id in community["members"]:
+        if not result["joined"]:
             return {"message": "Zaten topluluk üyesisiniz"}
         
-        community["members"].append(user_id)
-        self._save_communities(communities)
-        
         return {
             "message": "Topluluğa katıldınız",
             "members_count": len(community["members"])
@@ -83,18 +79,20 @@ class StoryCommunityFeaturesService:
         user_id: str
     ) -> Dict:
         """Hikayeyi topluluğa paylaş."""
-        communities = self._load_communities()
-        community = next((c for c in communities if c["community_id"] == community_id), None)
+        result = {"shared": False}
         
-        if not community:
-            raise ValueError("Topluluk bulunamadı")
+        def share(community: Dict) -> Dict:
+            if user_id not in community["members"]:
+                raise ValueError("Topluluk üyesi değilsiniz")
+            if story_id not in community["stories"]:
+                community["stories"].append(story_id)
+                result["shared"] = True
+            return community
         
-        if user_id not in community["members"]:
-            raise ValueError("Topluluk üyesi değilsiniz")
+        if not self.communities_store.update_item(community_id, share):
+            raise ValueError("Topluluk bulunamadı")
         
-        if story_id not in community["stories"]:
-            community["stories"].append(story_id)
-            self._save_communities(communities)
+        if result["shared"]:
             return {"message": "Hikaye topluluğa paylaşıldı"}
         else:
             return {"message": "Hikaye zaten paylaşılmış"}
@@ -104,8 +102,7 @@ class StoryCommunityFeaturesService:
         community_id: str
     ) -> List[str]:
         """Topluluk hikayelerini getirir."""
-        communities = self._load_communities()
-        community = next((c for c in communities if c["community_id"] == community_id), None)
+        community = self.communities_store.get_item(community_id)
         
         if not community:
             raise ValueError("Topluluk bulunamadı")
@@ -117,7 +114,7 @@ class StoryCommunityFeaturesService:
         limit: int = 10
     ) -> List[Dict]:
         """Popüler toplulukları getirir."""
-        communities = self._load_communities()
+        communities = self.communities_store.items()
         
         # Üye sayısına göre sırala
         communities.sort(key=lambda x: len(x.get("members", [])), reverse=True)
@@ -131,17 +128,3 @@ class StoryCommunityFeaturesService:
             }
             for c in communities[:limit]
         ]
-    
-    def _load_communities(self) -> List[Dict]:
-        """Toplulukları yükler."""
-        try:
-            with open(self.communities_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_communities(self, communities: List[Dict]):
-        """Toplulukları kaydeder."""
-        with open(self.communities_file, 'w', encoding='utf-8') as f:
-            json.dump(communities, f, ensure_ascii=False, indent=2)
-
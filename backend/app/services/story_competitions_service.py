@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -11,20 +11,14 @@ class StoryCompetitionsService:
     """Hikaye yarışmaları ve etkinlikler servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.competitions_file = os.path.join(settings.STORAGE_PATH, "story_competitions.json")
         self.submissions_file = os.path.join(settings.STORAGE_PATH, "competition_submissions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.competitions_file):
-            with open(self.competitions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-        if not os.path.exists(self.submissions_file):
-            with open(self.submissions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.competitions_store = get_document_store(
+            self.competitions_file, default_factory=list, item_key="competition_id"
+        )
+        self.submissions_store = get_document_store(
+            self.submissions_file, default_factory=list, item_key="submission_id"
+        )
     
     async def create_competition(
         self,
@@ -57,9 +51,7 @@ class StoryCompetitionsService:
             "created_at": datetime.now().isoformat()
         }
         
-        competitions = self._load_competitions()
-        competitions.append(competition)
-        self._save_competitions(competitions)
+        self.competitions_store.append(competition)
         
         return {
             "competition_id": competition_id,
@@ -74,8 +66,7 @@ class StoryCompetitionsService:
         story_text: str
     ) -> Dict:
         """Yarışmaya hikaye gönderir."""
-        competitions = self._load_competitions()
-        competition = next((c for c in competitions if c["competition_id"] == competition_id), None)
+        competition = self.competitions_store.get_item(competition_id)
         
         if not competition:
             raise ValueError("Yarışma bulunamadı")
@@ -105,12 +96,13 @@ class StoryCompetitionsService:
             "judge_comments": []
         }
         
-        submissions = self._load_submissions()
-        submissions.append(submission)
-        self._save_submissions(submissions)
+        self.submissions_store.append(submission)
+        
+        def add_submission(competition: Dict) -> Dict:
+            competition["submissions"].append(submission["submission_id"])
+            return competition
         
-        competition["submissions"].append(submission["submission_id"])
-        self._save_competitions(competitions)
+        self.competitions_store.update_item(competition_id, add_submission)
         
         return {
             "submission_id": submission["submission_id"],
@@ -125,12 +117,6 @@ class StoryCompetitionsService:
         comments: str
     ) -> Dict:
         """Gönderimi değerlendirir."""
-        submissions = self._load_submissions()
-        submission = next((s for s in submissions if s["submission_id"] == submission_id), None)
-        
-        if not submission:
-            raise ValueError("Gönderim bulunamadı")
-        
         judge_comment = {
             "judge_id": judge_id,
             "score": score,
@@ -138,10 +124,13 @@ class StoryCompetitionsService:
             "judged_at": datetime.now().isoformat()
         }
         
-        submission["judge_comments"].append(judge_comment)
-        submission["score"] = sum(c["score"] for c in submission["judge_comments"]) / len(submission["judge_comments"])
+        def judge(submission: Dict) -> Dict:
+            submission["judge_comments"].append(judge_comment)
+            submission["score"] = sum(c["score"] for c in submission["judge_comments"]) / len(submission["judge_comments"])
+            return submission
         
-        self._save_submissions(submissions)
+        if not self.submissions_store.update_item(submission_id, judge):
+            raise ValueError("Gönderim bulunamadı")
         
         return {"message": "Değerlendirme kaydedildi"}
     
@@ -150,10 +139,10 @@ class StoryCompetitionsService:
         status: Optional[str] = None
     ) -> List[Dict]:
         """Yarışmaları getirir."""
-        competitions = self._load_competitions()
-        
         if status:
-            competitions = [c for c in competitions if c["status"] == status]
+            competitions = self.competitions_store.items(lambda c: c["status"] == status)
+        else:
+            competitions = self.competitions_store.items()
         
         # Tarihe göre sırala
         competitions.sort(key=lambda x: x.get("start_date", ""))
@@ -165,39 +154,11 @@ class StoryCompetitionsService:
         competition_id: str
     ) -> List[Dict]:
         """Yarışma liderlik tablosunu getirir."""
-        submissions = self._load_submissions()
-        competition_submissions = [
-            s for s in submissions if s["competition_id"] == competition_id
-        ]
+        competition_submissions = self.submissions_store.items(
+            lambda s: s["competition_id"] == competition_id
+        )
         
         # Skora göre sırala
         competition_submissions.sort(key=lambda x: x.get("score", 0), reverse=True)
         
         return competition_submissions
-    
-    def _load_competitions(self) -> List[Dict]:
-        """Yarışmaları yükler."""
-        try:
-            with open(self.competitions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_competitions(self, competitions: List[Dict]):
-        """Yarışmaları kaydeder."""
-        with open(self.competitions_file, 'w', encoding='utf-8') as f:
-            json.dump(competitions, f, ensure_ascii=False, indent=2)
-    
-    def _load_submissions(self) -> List[Dict]:
-        """Gönderimleri yükler."""
-        try:
-            with open(self.submissions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_submissions(self, submissions: List[Dict]):
-        """Gönderimleri kaydeder."""
-        with open(self.submissions_file, 'w', encoding='utf-8') as f:
-            json.dump(submissions, f, ensure_ascii=False, indent=2)
-
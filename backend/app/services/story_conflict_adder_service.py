@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryConflictAdderService:
     """Hikaye içerik çatışma ekleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.conflicts_file = os.path.join(settings.STORAGE_PATH, "story_conflicts.json")
         self._ensure_files()
     
@@ -45,14 +44,16 @@ class StoryConflictAdderService:
 
 Çatışmayı hikayeye doğal bir şekilde entegre et."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye çatışma uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_conflict_adder"
         )
         
         conflict_text = response.choices[0].message.content
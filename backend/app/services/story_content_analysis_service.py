@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentAnalysisService:
     """Hikaye içerik analizi servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.analyses_file = os.path.join(settings.STORAGE_PATH, "content_analyses.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.analyses_file):
-            with open(self.analyses_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.analyses_store = get_document_store(self.analyses_file, default_factory=list)
     
     async def analyze_story(
         self,
@@ -41,14 +33,16 @@ class StoryContentAnalysisService:
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_content_analysis"
         )
         
         analysis_text = response.choices[0].message.content
@@ -65,9 +59,7 @@ Hikaye:
             "created_at": datetime.now().isoformat()
         }
         
-        analyses = self._load_analyses()
-        analyses.append(analysis)
-        self._save_analyses(analyses)
+        self.analyses_store.append(analysis)
         
         return {
             "analysis_id": analysis_id,
@@ -115,17 +107,3 @@ Hikaye:
             "character_count_no_spaces": len(text.replace(" ", "")),
             "avg_words_per_sentence": round(len(words) / len(sentences), 2) if sentences else 0
         }
-    
-    def _load_analyses(self) -> List[Dict]:
-        """Analizleri yükler."""
-        try:
-            with open(self.analyses_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_analyses(self, analyses: List[Dict]):
-        """Analizleri kaydeder."""
-        with open(self.analyses_file, 'w', encoding='utf-8') as f:
-            json.dump(analyses, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentComparisonService:
     """Hikaye içerik karşılaştırma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.comparisons_file = os.path.join(settings.STORAGE_PATH, "content_comparisons.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.comparisons_file):
-            with open(self.comparisons_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.comparisons_store = get_document_store(self.comparisons_file, default_factory=list)
     
     async def compare_stories(
         self,
@@ -44,14 +36,16 @@ Hikaye 1:
 Hikaye 2:
 {story2_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye karşılaştırma uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_content_comparison"
         )
         
         comparison_text = response.choices[0].message.content
@@ -68,9 +62,7 @@ Hikaye 2:
             "created_at": datetime.now().isoformat()
         }
         
-        comparisons = self._load_comparisons()
-        comparisons.append(comparison)
-        self._save_comparisons(comparisons)
+        self.comparisons_store.append(comparison)
         
         return {
             "comparison_id": comparison_id,
@@ -115,17 +107,3 @@ Hikaye 2:
         union = words1.union(words2)
         
         return len(intersection) / len(union) if union else 0.0
-    
-    def _load_comparisons(self) -> List[Dict]:
-        """Karşılaştırmaları yükler."""
-        try:
-            with open(self.comparisons_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_comparisons(self, comparisons: List[Dict]):
-        """Karşılaştırmaları kaydeder."""
-        with open(self.comparisons_file, 'w', encoding='utf-8') as f:
-            json.dump(comparisons, f, ensure_ascii=False, indent=2)
-
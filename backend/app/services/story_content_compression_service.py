@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentCompressionService:
     """Hikaye içerik sıkıştırma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.compressions_file = os.path.join(settings.STORAGE_PATH, "content_compressions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.compressions_file):
-            with open(self.compressions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.compressions_store = get_document_store(self.compressions_file, default_factory=list)
     
     async def compress_story(
         self,
@@ -38,14 +30,16 @@ class StoryContentCompressionService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik sıkıştırma uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_content_compression"
         )
         
         compressed_text = response.choices[0].message.content
@@ -60,9 +54,7 @@ class StoryContentCompressionService:
             "created_at": datetime.now().isoformat()
         }
         
-        compressions = self._load_compressions()
-        compressions.append(compression)
-        self._save_compressions(compressions)
+        self.compressions_store.append(compression)
         
         return {
             "compression_id": compression_id,
@@ -84,14 +76,16 @@ class StoryContentCompressionService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir özet uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.4,
-            max_tokens=200
+            max_tokens=200,
+            cache=True,
+            cache_namespace="story_content_compression"
         )
         
         short_version = response.choices[0].message.content
@@ -102,17 +96,3 @@ class StoryContentCompressionService:
             "word_count": len(short_version.split()),
             "max_words": max_words
         }
-    
-    def _load_compressions(self) -> List[Dict]:
-        """Sıkıştırmaları yükler."""
-        try:
-            with open(self.compressions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_compressions(self, compressions: List[Dict]):
-        """Sıkıştırmaları kaydeder."""
-        with open(self.compressions_file, 'w', encoding='utf-8') as f:
-            json.dump(compressions, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentConverterService:
     """Hikaye içerik dönüştürme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.conversions_file = os.path.join(settings.STORAGE_PATH, "content_conversions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.conversions_file):
-            with open(self.conversions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.conversions_store = get_document_store(self.conversions_file, default_factory=list)
     
     async def convert_format(
         self,
@@ -43,14 +35,16 @@ class StoryContentConverterService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir format dönüştürme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_content_converter"
         )
         
         converted_text = response.choices[0].message.content
@@ -64,26 +58,10 @@ class StoryContentConverterService:
             "created_at": datetime.now().isoformat()
         }
         
-        conversions = self._load_conversions()
-        conversions.append(conversion)
-        self._save_conversions(conversions)
+        self.conversions_store.append(conversion)
         
         return {
             "conversion_id": conversion_id,
             "converted_text": converted_text,
             "target_format": target_format
         }
-    
-    def _load_conversions(self) -> List[Dict]:
-        """Dönüştürmeleri yükler."""
-        try:
-            with open(self.conversions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_conversions(self, conversions: List[Dict]):
-        """Dönüştürmeleri kaydeder."""
-        with open(self.conversions_file, 'w', encoding='utf-8') as f:
-            json.dump(conversions, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentEnrichmentService:
     """Hikaye içerik zenginleştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.enrichments_file = os.path.join(settings.STORAGE_PATH, "content_enrichments.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.enrichments_file):
-            with open(self.enrichments_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.enrichments_store = get_document_store(self.enrichments_file, default_factory=list)
     
     async def enrich_story(
         self,
@@ -44,14 +36,16 @@ class StoryContentEnrichmentService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye zenginleştirme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_content_enrichment"
         )
         
         enriched_text = response.choices[0].message.content
@@ -65,9 +59,7 @@ class StoryContentEnrichmentService:
             "created_at": datetime.now().isoformat()
         }
         
-        enrichments = self._load_enrichments()
-        enrichments.append(enrichment)
-        self._save_enrichments(enrichments)
+        self.enrichments_store.append(enrichment)
         
         return {
             "enrichment_id": enrichment_id,
@@ -87,14 +79,16 @@ class StoryContentEnrichmentService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir duyusal betimleme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_content_enrichment"
         )
         
         enriched_text = response.choices[0].message.content
@@ -104,17 +98,3 @@ class StoryContentEnrichmentService:
             "enriched_text": enriched_text,
             "enrichment_type": "sensory"
         }
-    
-    def _load_enrichments(self) -> List[Dict]:
-        """Zenginleştirmeleri yükler."""
-        try:
-            with open(self.enrichments_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_enrichments(self, enrichments: List[Dict]):
-        """Zenginleştirmeleri kaydeder."""
-        with open(self.enrichments_file, 'w', encoding='utf-8') as f:
-            json.dump(enrichments, f, ensure_ascii=False, indent=2)
-
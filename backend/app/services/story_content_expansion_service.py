@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentExpansionService:
     """Hikaye içerik genişletme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.expansions_file = os.path.join(settings.STORAGE_PATH, "content_expansions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.expansions_file):
-            with open(self.expansions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.expansions_store = get_document_store(self.expansions_file, default_factory=list)
     
     async def expand_story(
         self,
@@ -47,14 +39,16 @@ class StoryContentExpansionService:
 
 {f"Hedef uzunluk: {target_length} kelime" if target_length else ""}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye genişletme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=3000
+            max_tokens=3000,
+            cache=False,
+            cache_namespace="story_content_expansion"
         )
         
         expanded_text = response.choices[0].message.content
@@ -69,9 +63,7 @@ class StoryContentExpansionService:
             "created_at": datetime.now().isoformat()
         }
         
-        expansions = self._load_expansions()
-        expansions.append(expansion)
-        self._save_expansions(expansions)
+        self.expansions_store.append(expansion)
         
         return {
             "expansion_id": expansion_id,
@@ -95,14 +87,16 @@ class StoryContentExpansionService:
 
 Yeni bölüm hikayenin devamı olmalı."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_content_expansion"
         )
         
         new_chapter = response.choices[0].message.content
@@ -113,17 +107,3 @@ Yeni bölüm hikayenin devamı olmalı."""
             "chapter_theme": chapter_theme,
             "message": "Yeni bölüm eklendi"
         }
-    
-    def _load_expansions(self) -> List[Dict]:
-        """Genişletmeleri yükler."""
-        try:
-            with open(self.expansions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_expansions(self, expansions: List[Dict]):
-        """Genişletmeleri kaydeder."""
-        with open(self.expansions_file, 'w', encoding='utf-8') as f:
-            json.dump(expansions, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentFilteringService:
     """Hikaye içerik filtreleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.filters_file = os.path.join(settings.STORAGE_PATH, "content_filters.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.filters_file):
-            with open(self.filters_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.filters_store = get_document_store(self.filters_file, default_factory=list)
     
     async def filter_content(
         self,
@@ -38,14 +30,15 @@ Uygunsuz içerik, şiddet, korku veya zararlı mesajlar var mı kontrol et:
 
 Sadece uygun olup olmadığını ve varsa sorunlu bölümleri belirt."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik moderatörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=500
+            max_tokens=500,
+            cache_namespace="story_content_filtering"
         )
         
         filter_result = response.choices[0].message.content
@@ -63,9 +56,7 @@ Sadece uygun olup olmadığını ve varsa sorunlu bölümleri belirt."""
             "created_at": datetime.now().isoformat()
         }
         
-        filters = self._load_filters()
-        filters.append(result)
-        self._save_filters(filters)
+        self.filters_store.append(result)
         
         return result
     
@@ -81,14 +72,16 @@ Sadece uygun olup olmadığını ve varsa sorunlu bölümleri belirt."""
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik editörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=True,
+            cache_namespace="story_content_filtering"
         )
         
         safe_text = response.choices[0].message.content
@@ -111,17 +104,3 @@ Hikaye:
                 flagged.append(line.strip())
         
         return flagged[:5]  # İlk 5
-    
-    def _load_filters(self) -> List[Dict]:
-        """Filtreleri yükler."""
-        try:
-            with open(self.filters_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_filters(self, filters: List[Dict]):
-        """Filtreleri kaydeder."""
-        with open(self.filters_file, 'w', encoding='utf-8') as f:
-            json.dump(filters, f, ensure_ascii=False, indent=2)
-
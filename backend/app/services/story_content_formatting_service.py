@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryContentFormattingService:
     """Hikaye içerik formatlama servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.formattings_file = os.path.join(settings.STORAGE_PATH, "content_formattings.json")
         self._ensure_files()
     
@@ -42,14 +41,16 @@ class StoryContentFormattingService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir formatlama uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_content_formatting"
         )
         
         formatted_text = response.choices[0].message.content
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentMergerService:
     """Hikaye içerik birleştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.mergers_file = os.path.join(settings.STORAGE_PATH, "content_mergers.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.mergers_file):
-            with open(self.mergers_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.mergers_store = get_document_store(self.mergers_file, default_factory=list)
     
     async def merge_stories(
         self,
@@ -48,14 +40,16 @@ class StoryContentMergerService:
 
 Tutarlı ve akıcı bir hikaye oluştur."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye birleştirme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=3000
+            max_tokens=3000,
+            cache=False,
+            cache_namespace="story_content_merger"
         )
         
         merged_text = response.choices[0].message.content
@@ -68,9 +62,7 @@ Tutarlı ve akıcı bir hikaye oluştur."""
             "created_at": datetime.now().isoformat()
         }
         
-        mergers = self._load_mergers()
-        mergers.append(merger)
-        self._save_mergers(mergers)
+        self.mergers_store.append(merger)
         
         return {
             "merger_id": merger_id,
@@ -94,14 +86,16 @@ Hikaye 1:
 Hikaye 2:
 {story2_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye harmanlama uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_content_merger"
         )
         
         blended_text = response.choices[0].message.content
@@ -111,17 +105,3 @@ Hikaye 2:
             "blend_ratio": blend_ratio,
             "message": "Hikayeler harmanlandı"
         }
-    
-    def _load_mergers(self) -> List[Dict]:
-        """Birleştirmeleri yükler."""
-        try:
-            with open(self.mergers_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_mergers(self, mergers: List[Dict]):
-        """Birleştirmeleri kaydeder."""
-        with open(self.mergers_file, 'w', encoding='utf-8') as f:
-            json.dump(mergers, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentSplitterService:
     """Hikaye içerik bölme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.splits_file = os.path.join(settings.STORAGE_PATH, "content_splits.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.splits_file):
-            with open(self.splits_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.splits_store = get_document_store(self.splits_file, default_factory=list)
     
     async def split_into_chapters(
         self,
@@ -38,14 +30,16 @@ Her bölüm bağımsız ama birbirine bağlı olsun:
 
 Her bölüm için başlık ve içerik ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye bölme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
-            max_tokens=3000
+            max_tokens=3000,
+            cache=False,
+            cache_namespace="story_content_splitter"
         )
         
         chapters_text = response.choices[0].message.content
@@ -61,9 +55,7 @@ Her bölüm için başlık ve içerik ver."""
             "created_at": datetime.now().isoformat()
         }
         
-        splits = self._load_splits()
-        splits.append(split)
-        self._save_splits(splits)
+        self.splits_store.append(split)
         
         return {
             "split_id": split_id,
@@ -109,9 +101,7 @@ Her bölüm için başlık ve içerik ver."""
             "created_at": datetime.now().isoformat()
         }
         
-        splits = self._load_splits()
-        splits.append(split)
-        self._save_splits(splits)
+        self.splits_store.append(split)
         
         return {
             "split_id": split_id,
@@ -144,17 +134,3 @@ Her bölüm için başlık ve içerik ver."""
             {"chapter_number": i+1, "title": f"Bölüm {i+1}", "content": ""}
             for i in range(num_chapters)
         ]
-    
-    def _load_splits(self) -> List[Dict]:
-        """Bölmeleri yükler."""
-        try:
-            with open(self.splits_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_splits(self, splits: List[Dict]):
-        """Bölmeleri kaydeder."""
-        with open(self.splits_file, 'w', encoding='utf-8') as f:
-            json.dump(splits, f, ensure_ascii=False, indent=2)
-
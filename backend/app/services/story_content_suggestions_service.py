@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentSuggestionsService:
     """Hikaye içerik önerileri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.suggestions_file = os.path.join(settings.STORAGE_PATH, "content_suggestions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.suggestions_file):
-            with open(self.suggestions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.suggestions_store = get_document_store(self.suggestions_file, default_factory=list)
     
     async def suggest_next_content(
         self,
@@ -37,14 +29,16 @@ class StoryContentSuggestionsService:
 
 Her öneri farklı bir yöne gitsin."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye yazım asistanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=600
+            max_tokens=600,
+            cache=False,
+            cache_namespace="story_content_suggestions"
         )
         
         suggestions_text = response.choices[0].message.content
@@ -60,9 +54,7 @@ Her öneri farklı bir yöne gitsin."""
             "created_at": datetime.now().isoformat()
         }
         
-        suggestions_list = self._load_suggestions()
-        suggestions_list.append(suggestion)
-        self._save_suggestions(suggestions_list)
+        self.suggestions_store.append(suggestion)
         
         return {
             "suggestion_id": suggestion_id,
@@ -82,14 +74,16 @@ Her öneri farklı bir yöne gitsin."""
 
 5 farklı iyileştirme önerisi ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
-            max_tokens=800
+            max_tokens=800,
+            cache=False,
+            cache_namespace="story_content_suggestions"
         )
         
         improvements_text = response.choices[0].message.content
@@ -114,14 +108,16 @@ Her öneri farklı bir yöne gitsin."""
 
 Her karakter için kısa bir açıklama ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir karakter yaratma uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_content_suggestions"
         )
         
         characters_text = response.choices[0].message.content
@@ -146,17 +142,3 @@ Her karakter için kısa bir açıklama ver."""
                     suggestions.append(suggestion)
         
         return suggestions[:10] if suggestions else [text[:200]]
-    
-    def _load_suggestions(self) -> List[Dict]:
-        """Önerileri yükler."""
-        try:
-            with open(self.suggestions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_suggestions(self, suggestions: List[Dict]):
-        """Önerileri kaydeder."""
-        with open(self.suggestions_file, 'w', encoding='utf-8') as f:
-            json.dump(suggestions, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryContentVerificationService:
     """Hikaye içerik doğrulama servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.verifications_file = os.path.join(settings.STORAGE_PATH, "content_verifications.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.verifications_file):
-            with open(self.verifications_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.verifications_store = get_document_store(self.verifications_file, default_factory=list)
     
     async def verify_content(
         self,
@@ -42,14 +34,15 @@ Hikaye:
 
 Her kontrol için sonuç ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik doğrulama uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            cache_namespace="story_content_verification"
         )
         
         verification_result = response.choices[0].message.content
@@ -75,9 +68,7 @@ Her kontrol için sonuç ver."""
             "created_at": datetime.now().isoformat()
         }
         
-        verifications = self._load_verifications()
-        verifications.append(verification)
-        self._save_verifications(verifications)
+        self.verifications_store.append(verification)
         
         return verification
     
@@ -111,17 +102,3 @@ Her kontrol için sonuç ver."""
         inappropriate_words = ["şiddet", "korku", "ölüm"]
         inappropriate_count = sum(1 for word in inappropriate_words if word in text.lower())
         return max(0.0, 1.0 - (inappropriate_count * 0.3))
-    
-    def _load_verifications(self) -> List[Dict]:
-        """Doğrulamaları yükler."""
-        try:
-            with open(self.verifications_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_verifications(self, verifications: List[Dict]):
-        """Doğrulamaları kaydeder."""
-        with open(self.verifications_file, 'w', encoding='utf-8') as f:
-            json.dump(verifications, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryEducationalContentService:
     """Hikaye eğitim içeriği ve öğrenme materyalleri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.educational_content_file = os.path.join(settings.STORAGE_PATH, "educational_content.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.educational_content_file):
-            with open(self.educational_content_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.educational_content_store = get_document_store(self.educational_content_file, default_factory=list)
     
     async def create_learning_materials(
         self,
@@ -42,14 +34,16 @@ class StoryEducationalContentService:
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir eğitim uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_educational_content"
         )
         
         materials = response.choices[0].message.content
@@ -63,9 +57,7 @@ Hikaye:
             "created_at": datetime.now().isoformat()
         }
         
-        contents = self._load_contents()
-        contents.append(content)
-        self._save_contents(contents)
+        self.educational_content_store.append(content)
         
         return {
             "material_id": material_id,
@@ -92,14 +84,16 @@ Her kelime için:
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir dil öğretmenisin."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=True,
+            cache_namespace="story_educational_content"
         )
         
         vocabulary = response.choices[0].message.content
@@ -135,14 +129,16 @@ Hikaye:
 
 Her soru için doğru cevabı da ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir eğitim uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_educational_content"
         )
         
         questions = response.choices[0].message.content
@@ -160,17 +156,3 @@ Her soru için doğru cevabı da ver."""
             "questions_count": len(questions.split('?')),
             "message": "Anlama soruları oluşturuldu"
         }
-    
-    def _load_contents(self) -> List[Dict]:
-        """İçerikleri yükler."""
-        try:
-            with open(self.educational_content_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_contents(self, contents: List[Dict]):
-        """İçerikleri kaydeder."""
-        with open(self.educational_content_file, 'w', encoding='utf-8') as f:
-            json.dump(contents, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryEmotionAnalysisService:
     """Hikaye duygu analizi servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.emotion_analyses_file = os.path.join(settings.STORAGE_PATH, "emotion_analyses.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.emotion_analyses_file):
-            with open(self.emotion_analyses_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.emotion_analyses_store = get_document_store(self.emotion_analyses_file, default_factory=dict)
     
     async def analyze_emotions(
         self,
@@ -38,14 +30,16 @@ Hikaye:
 
 JSON formatında döndür."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir duygu analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_emotion_analysis"
         )
         
         # Basit duygu analizi
@@ -58,9 +52,7 @@ JSON formatında döndür."""
             "analyzed_at": datetime.now().isoformat()
         }
         
-        analyses = self._load_analyses()
-        analyses[story_id] = analysis
-        self._save_analyses(analyses)
+        self.emotion_analyses_store.put(story_id, analysis)
         
         return analysis
     
@@ -111,19 +103,4 @@ JSON formatında döndür."""
     
     async def get_emotion_analysis(self, story_id: str) -> Optional[Dict]:
         """Duygu analizini getirir."""
-        analyses = self._load_analyses()
-        return analyses.get(story_id)
-    
-    def _load_analyses(self) -> Dict:
-        """Analizleri yükler."""
-        try:
-            with open(self.emotion_analyses_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_analyses(self, analyses: Dict):
-        """Analizleri kaydeder."""
-        with open(self.emotion_analyses_file, 'w', encoding='utf-8') as f:
-            json.dump(analyses, f, ensure_ascii=False, indent=2)
-
+        return self.emotion_analyses_store.get(story_id)
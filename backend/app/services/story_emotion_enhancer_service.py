@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -8,7 +8,6 @@ from datetime import datetime
 
 class StoryEmotionEnhancerService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.file = os.path.join(settings.STORAGE_PATH, "emotion_enhancements.json")
         self._ensure_files()
     def _ensure_files(self):
@@ -19,9 +18,9 @@ class StoryEmotionEnhancerService:
     async def enhance_emotions(self, story_id: str, story_text: str) -> Dict:
         id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeye duygusal derinlik ekle:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir duygu uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.8, max_tokens=2000
+            temperature=0.8, max_tokens=2000, cache=False, cache_namespace="story_emotion_enhancer"
         )
         return {"id": id, "enhanced_text": response.choices[0].message.content}
     def _load(self) -> List[Dict]:
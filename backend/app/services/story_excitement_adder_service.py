@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryExcitementAdderService:
     """Hikaye içerik heyecan ekleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.excitements_file = os.path.join(settings.STORAGE_PATH, "story_excitements.json")
         self._ensure_files()
     
@@ -44,14 +43,16 @@ class StoryExcitementAdderService:
 
 Heyecanı hikayeye doğal bir şekilde entegre et."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir heyecan yaratma uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_excitement_adder"
         )
         
         excitement_text = response.choices[0].message.content
@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryFavoritesService:
@@ -12,17 +12,10 @@ class StoryFavoritesService:
     def __init__(self):
         self.favorites_file = os.path.join(settings.STORAGE_PATH, "story_favorites.json")
         self.collections_file = os.path.join(settings.STORAGE_PATH, "story_collections.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.favorites_file):
-            with open(self.favorites_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
-        if not os.path.exists(self.collections_file):
-            with open(self.collections_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.favorites_store = get_document_store(self.favorites_file, default_factory=dict)
+        self.collections_store = get_document_store(
+            self.collections_file, default_factory=list, item_key="collection_id"
+        )
     
     async def add_to_favorites(
         self,
@@ -31,27 +24,27 @@ class StoryFavoritesService:
         category: Optional[str] = None
     ) -> Dict:
         """Hikayeyi favorilere ekler."""
-        favorites = self._load_favorites()
-        
-        if user_id not in favorites:
-            favorites[user_id] = []
-        
-        # Zaten favorilerde mi kontrol et
-        if any(f["story_id"] == story_id for f in favorites[user_id]):
+        result = {"added": False}
+        
+        def add(user_favorites: List[Dict]) -> List[Dict]:
+            # Zaten favorilerde mi kontrol et
+            if not any(f["story_id"] == story_id for f in user_favorites):
+                user_favorites.append({
+                    "story_id": story_id,
+                    "category": category,
+                    "added_at": datetime.now().isoformat()
+                })
+                result["added"] = True
+            return user_favorites
+        
+        user_favorites = self.favorites_store.update(user_id, add, default=[])
+        
+        if not result["added"]:
             return {"message": "Hikaye zaten favorilerde"}
         
-        favorite = {
-            "story_id": story_id,
-            "category": category,
-            "added_at": datetime.now().isoformat()
-        }
-        
-        favorites[user_id].append(favorite)
-        self._save_favorites(favorites)
-        
         return {
             "message": "Favorilere eklendi",
-            "total_favorites": len(favorites[user_id])
+            "total_favorites": len(user_favorites)
         }
     
     async def remove_from_favorites(
@@ -60,17 +53,19 @@ class StoryFavoritesService:
         user_id: str
     ) -> Dict:
         """Hikayeyi favorilerden çıkarır."""
-        favorites = self._load_favorites()
+        def remove(user_favorites: Optional[List[Dict]]) -> Optional[List[Dict]]:
+            if user_favorites is None:
+                return None
+            return [f for f in user_favorites if f["story_id"] != story_id]
         
-        if user_id not in favorites:
-            return {"message": "Favori bulunamadı"}
+        user_favorites = self.favorites_store.update(user_id, remove)
         
-        favorites[user_id] = [f for f in favorites[user_id] if f["story_id"] != story_id]
-        self._save_favorites(favorites)
+        if user_favorites is None:
+            return {"message": "Favori bulunamadı"}
         
         return {
             "message": "Favorilerden çıkarıldı",
-            "total_favorites": len(favorites.get(user_id, []))
+            "total_favorites": len(user_favorites)
         }
     
     async def get_user_favorites(
@@ -79,8 +74,7 @@ class StoryFavoritesService:
         category: Optional[str] = None
     ) -> List[Dict]:
         """Kullanıcının favorilerini getirir."""
-        favorites = self._load_favorites()
-        user_favorites = favorites.get(user_id, [])
+        user_favorites = self.favorites_store.get(user_id, [])
         
         if category:
             user_favorites = [f for f in user_favorites if f.get("category") == category]
@@ -98,8 +92,6 @@ class StoryFavoritesService:
         is_public: bool = False
     ) -> Dict:
         """Yeni koleksiyon oluşturur."""
-        collections = self._load_collections()
-        
         collection = {
             "collection_id": str(uuid.uuid4()),
             "user_id": user_id,
@@ -111,8 +103,7 @@ class StoryFavoritesService:
             "updated_at": datetime.now().isoformat()
         }
         
-        collections.append(collection)
-        self._save_collections(collections)
+        self.collections_store.append(collection)
         
         return {
             "collection_id": collection["collection_id"],
@@ -126,19 +117,21 @@ class StoryFavoritesService:
         user_id: str
     ) -> Dict:
         """Hikayeyi koleksiyona ekler."""
-        collections = self._load_collections()
-        collection = next((c for c in collections if c["collection_id"] == collection_id), None)
-        
-        if not collection:
+        result = {"added": False}
+        
+        def add_story(collection: Dict) -> Dict:
+            if collection["user_id"] != user_id:
+                raise ValueError("Bu koleksiyonu düzenleme yetkiniz yok")
+            if story_id not in collection["stories"]:
+                collection["stories"].append(story_id)
+                collection["updated_at"] = datetime.now().isoformat()
+                result["added"] = True
+            return collection
+        
+        if not self.collections_store.update_item(collection_id, add_story):
             raise ValueError("Koleksiyon bulunamadı")
         
-        if collection["user_id"] != user_id:
-            raise ValueError("Bu koleksiyonu düzenleme yetkiniz yok")
-        
-        if story_id not in collection["stories"]:
-            collection["stories"].append(story_id)
-            collection["updated_at"] = datetime.now().isoformat()
-            self._save_collections(collections)
+        if result["added"]:
             return {"message": "Hikaye koleksiyona eklendi"}
         else:
             return {"message": "Hikaye zaten koleksiyonda"}
@@ -149,37 +142,8 @@ class StoryFavoritesService:
         include_public: bool = True
     ) -> List[Dict]:
         """Kullanıcının koleksiyonlarını getirir."""
-        collections = self._load_collections()
-        user_collections = [
-            c for c in collections
-            if c["user_id"] == user_id or (include_public and c.get("is_public", False))
-        ]
+        user_collections = self.collections_store.items(
+            lambda c: c["user_id"] == user_id or (include_public and c.get("is_public", False))
+        )
         
         return user_collections
-    
-    def _load_favorites(self) -> Dict:
-        """Favorileri yükler."""
-        try:
-            with open(self.favorites_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_favorites(self, favorites: Dict):
-        """Favorileri kaydeder."""
-        with open(self.favorites_file, 'w', encoding='utf-8') as f:
-            json.dump(favorites, f, ensure_ascii=False, indent=2)
-    
-    def _load_collections(self) -> List[Dict]:
-        """Koleksiyonları yükler."""
-        try:
-            with open(self.collections_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_collections(self, collections: List[Dict]):
-        """Koleksiyonları kaydeder."""
-        with open(self.collections_file, 'w', encoding='utf-8') as f:
-            json.dump(collections, f, ensure_ascii=False, indent=2)
-
@@ -0,0 +1,331 @@
+import math
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.story_search_index import analyze_terms, turkish_lower
+
+# ---------------------------------------------------------------------- #
+# Skor ağırlıkları
+# ---------------------------------------------------------------------- #
+
+PREFERRED_THEME_SCORE = 20.0
+PREFERRED_TYPE_SCORE = 15.0
+POPULARITY_PER_LIKE = 2.0
+POPULARITY_MAX = 30.0
+RECENT_SCORE = 10.0
+RECENT_SECONDS = 7 * 24 * 3600
+READ_THEME_SCORE = 15.0
+TRENDING_SCORE = 25.0
+
+SIMILAR_THEME_SCORE = 30.0
+SIMILAR_TYPE_SCORE = 20.0
+SIMILAR_LANGUAGE_SCORE = 10.0
+
+
+def normalize(value) -> str:
+    return turkish_lower(str(value or "")).strip()
+
+
+def theme_terms(theme) -> Set[str]:
+    """Tema metninin kök + aksansız terimleri ("Ejderhalar" ile "ejderha" eşleşir)."""
+    return set(analyze_terms(str(theme or "")))
+
+
+def theme_matches(theme, preferred: Iterable[str]) -> bool:
+    """Tercih edilen temalardan birinin tüm terimleri hikâye temasında geçiyor mu."""
+    terms = theme_terms(theme)
+    for pref in preferred:
+        wanted = theme_terms(pref)
+        if wanted and wanted <= terms:
+            return True
+    return False
+
+
+def parse_timestamp(value) -> float:
+    """ISO tarihini epoch saniyesine çevirir; okunamazsa -inf."""
+    if not value:
+        return -math.inf
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return -math.inf
+
+
+class _Vocabulary:
+    """Metin değerlerini kalıcı tamsayı kodlarına çevirir (kod 0 = boş değer)."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {"": 0}
+        self.values: List[str] = [""]
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class StoryFeatureIndex:
+    """
+    Öneri skorlaması için hikâye başına önceden hesaplanmış özellik dizileri.
+
+    - Her hikâye bir satır: tür, tema, dil ve sahip kodları, oluşturulma zamanı
+      (epoch), beğeni sayısı ve trend bayrağı; tarih bir kez, yazmada ayrıştırılır
+    - Metin alanları sözlük kodlarına çevrilir; tema terimleri için
+      terim -> tema kodları ters indeksi tutulur. Tercih eşleştirmesi hikâye
+      başına değil, ilgili tema kodları için bir kez yapılıp satırlara yayılır
+    - Skorlama NumPy ile vektörel; ilk k seçimi `argpartition` ile O(n)
+    - Silinen satırlar boş listeye alınır ve yeni hikâyelerce yeniden kullanılır
+
+    Diziler yalnızca bellektedir (açılışta snapshot + log'dan kurulur);
+    eşzamanlılık `StoryLogStore` kilidiyle sağlanır.
+    """
+
+    INITIAL_CAPACITY = 256
+
+    def __init__(self):
+        self._types = _Vocabulary()
+        self._themes = _Vocabulary()
+        self._languages = _Vocabulary()
+        self._owners = _Vocabulary()
+        self._theme_postings: Dict[str, Set[int]] = {}
+
+        self._rows: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._allocate(self.INITIAL_CAPACITY)
+
+        self._stale: Optional[Set[str]] = None
+        self.dirty = False
+
+    def _allocate(self, capacity: int):
+        size = len(self._ids)
+        columns = {
+            "_type": np.int32, "_theme": np.int32, "_language": np.int32, "_owner": np.int32,
+            "_likes": np.float64, "_trending": np.bool_, "_alive": np.bool_,
+        }
+        for name, dtype in columns.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if size:
+                column[:size] = getattr(self, name)[:size]
+            setattr(self, name, column)
+        created = np.full(capacity, -np.inf)
+        if size:
+            created[:size] = self._created[:size]
+        self._created = created
+
+    def _theme_code(self, theme) -> int:
+        key = normalize(theme)
+        known = key in self._themes.codes
+        code = self._themes.code(key)
+        if not known:
+            for term in theme_terms(key):
+                self._theme_postings.setdefault(term, set()).add(code)
+        return code
+
+    # ------------------------------------------------------------------ #
+    # Bakım
+    # ------------------------------------------------------------------ #
+
+    def add(self, story: Dict, previous: Optional[Dict] = None):
+        story_id = story.get("story_id")
+        if story_id is None:
+            return
+        if self._stale is not None:
+            self._stale.discard(story_id)
+        row = self._rows.get(story_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self._ids)
+                if row >= len(self._alive):
+                    self._allocate(len(self._alive) * 2)
+                self._ids.append(None)
+            self._rows[story_id] = row
+            self._ids[row] = story_id
+
+        try:
+            likes = float(story.get("like_count") or 0)
+        except (TypeError, ValueError):
+            likes = 0.0
+        self._type[row] = self._types.code(normalize(story.get("story_type", "masal")))
+        self._theme[row] = self._theme_code(story.get("theme"))
+        self._language[row] = self._languages.code(normalize(story.get("language")))
+        self._owner[row] = self._owners.code(str(story.get("user_id") or ""))
+        self._created[row] = parse_timestamp(story.get("created_at"))
+        self._likes[row] = likes
+        self._trending[row] = bool(story.get("is_trending", False))
+        self._alive[row] = True
+
+    def remove(self, story_id: str, story: Optional[Dict] = None):
+        row = self._rows.pop(story_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+
+    def begin_rebuild(self):
+        self._stale = set(self._rows)
+
+    def end_rebuild(self):
+        stale, self._stale = self._stale or set(), None
+        for story_id in stale:
+            self.remove(story_id)
+
+    def save(self):
+        """Diziler kalıcı değildir; `StoryLogStore` arayüzü için."""
+
+    def load(self) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ------------------------------------------------------------------ #
+    # Vektörel yardımcılar
+    # ------------------------------------------------------------------ #
+
+    def _view(self, name: str) -> np.ndarray:
+        return getattr(self, name)[:len(self._ids)]
+
+    def _theme_mask(self, preferred: Iterable[str]) -> np.ndarray:
+        """Tema kodu başına: tercih edilen temalardan biri bu temada geçiyor mu."""
+        mask = np.zeros(len(self._themes), dtype=np.bool_)
+        for pref in preferred:
+            terms = theme_terms(pref)
+            if not terms:
+                continue
+            codes: Optional[Set[int]] = None
+            for term in sorted(terms, key=lambda t: len(self._theme_postings.get(t, ()))):
+                postings = self._theme_postings.get(term)
+                if not postings:
+                    codes = set()
+                    break
+                codes = set(postings) if codes is None else codes & postings
+                if not codes:
+                    break
+            if codes:
+                mask[list(codes)] = True
+        return mask
+
+    def _code_mask(self, vocabulary: _Vocabulary, values: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(vocabulary), dtype=np.bool_)
+        codes = [vocabulary.codes[v] for v in map(normalize, values) if v in vocabulary.codes]
+        mask[codes] = True
+        return mask
+
+    def _owner_rows(self, user_id: str) -> np.ndarray:
+        code = self._owners.codes.get(str(user_id or ""))
+        if not code:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._view("_alive") & (self._view("_owner") == code))
+
+    def top_k(self, scores: np.ndarray, eligible: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Uygun satırlardan en yüksek skorlu k tanesi; eşitlikte yeni hikâye önce.
+        `argpartition` k. değeri O(n) bulur, yalnızca eşiği geçenler sıralanır.
+        """
+        rows = np.flatnonzero(eligible)
+        if k <= 0 or rows.size == 0:
+            return []
+        values = scores[rows]
+        if rows.size > k:
+            kth = values[np.argpartition(-values, k - 1)[k - 1]]
+            keep = values >= kth
+            rows, values = rows[keep], values[keep]
+        order = np.lexsort((-self._created[rows], -values))[:k]
+        return [(self._ids[row], float(values[i])) for i, row in zip(order, rows[order])]
+
+    # ------------------------------------------------------------------ #
+    # Sorgu
+    # ------------------------------------------------------------------ #
+
+    def user_story_ids(self, user_id: str) -> List[str]:
+        """Kullanıcının hikâyeleri, yeniden eskiye."""
+        rows = self._owner_rows(user_id)
+        rows = rows[np.argsort(-self._created[rows], kind="stable")]
+        return [self._ids[row] for row in rows]
+
+    def user_themes(self, user_id: str) -> List[Tuple[str, int]]:
+        """Kullanıcının hikâye temaları ve sayıları (çoktan aza)."""
+        themes = self._theme[self._owner_rows(user_id)]
+        counts = np.bincount(themes, minlength=len(self._themes))
+        counts[0] = 0
+        codes = np.flatnonzero(counts)
+        codes = codes[np.argsort(-counts[codes], kind="stable")]
+        return [(self._themes.values[code], int(counts[code])) for code in codes]
+
+    def recommendation_scores(
+        self,
+        user_id: str,
+        themes: Iterable[str] = (),
+        story_types: Iterable[str] = (),
+        now: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Kullanıcı için tüm hikâyelerin öneri skorları.
+
+        Returns:
+            (skorlar, uygun satırlar maskesi, tercih edilen tema maskesi)
+            Kullanıcının kendi hikâyeleri uygun sayılmaz.
+        """
+        now = time.time() if now is None else now
+        theme = self._view("_theme")
+        owner_rows = self._owner_rows(user_id)
+
+        preferred_theme = self._theme_mask(themes)[theme]
+        read_codes = np.unique(self._theme[owner_rows])
+        read_theme = self._theme_mask(self._themes.values[code] for code in read_codes if code)[theme]
+
+        scores = PREFERRED_THEME_SCORE * preferred_theme
+        scores += PREFERRED_TYPE_SCORE * self._code_mask(self._types, story_types)[self._view("_type")]
+        scores += np.minimum(self._view("_likes") * POPULARITY_PER_LIKE, POPULARITY_MAX)
+        scores += RECENT_SCORE * (self._view("_created") > now - RECENT_SECONDS)
+        scores += READ_THEME_SCORE * read_theme
+        scores += TRENDING_SCORE * self._view("_trending")
+
+        eligible = self._view("_alive").copy()
+        eligible[owner_rows] = False
+        return scores, eligible, preferred_theme
+
+    def recommend(
+        self,
+        user_id: str,
+        themes: Iterable[str] = (),
+        story_types: Iterable[str] = (),
+        limit: int = 10,
+        require_theme: bool = False,
+        now: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """Kullanıcıya en uygun `limit` hikâye; `require_theme` ile yalnızca tercih edilen temalardakiler."""
+        scores, eligible, theme_match = self.recommendation_scores(user_id, themes, story_types, now)
+        if require_theme:
+            eligible &= theme_match
+        return self.top_k(scores, eligible, limit)
+
+    def similar(self, story_id: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Tema, tür ve dil benzerliğine göre hikâyeler (referansın kendisi hariç)."""
+        row = self._rows.get(story_id)
+        if row is None:
+            return []
+        theme_code = int(self._theme[row])
+        scores = np.zeros(len(self._ids))
+        if theme_code:
+            # Referans temanın tüm terimlerini içeren temalar
+            scores += SIMILAR_THEME_SCORE * self._theme_mask([self._themes.values[theme_code]])[self._view("_theme")]
+        scores += SIMILAR_TYPE_SCORE * (self._view("_type") == self._type[row])
+        scores += SIMILAR_LANGUAGE_SCORE * (self._view("_language") == self._language[row])
+
+        eligible = self._view("_alive") & (scores > 0)
+        eligible[row] = False
+        return self.top_k(scores, eligible, limit)
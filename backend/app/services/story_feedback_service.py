@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryFeedbackService:
@@ -11,14 +11,9 @@ class StoryFeedbackService:
     
     def __init__(self):
         self.feedback_file = os.path.join(settings.STORAGE_PATH, "story_feedback.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.feedback_file):
-            with open(self.feedback_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.feedback_store = get_document_store(
+            self.feedback_file, default_factory=list, item_key="feedback_id"
+        )
     
     async def add_feedback(
         self,
@@ -43,9 +38,7 @@ class StoryFeedbackService:
             "replies": []
         }
         
-        feedbacks = self._load_feedbacks()
-        feedbacks.append(feedback)
-        self._save_feedbacks(feedbacks)
+        self.feedback_store.append(feedback)
         
         return {
             "feedback_id": feedback_id,
@@ -59,12 +52,6 @@ class StoryFeedbackService:
         reply_content: str
     ) -> Dict:
         """Geri bildirime yanıt verir."""
-        feedbacks = self._load_feedbacks()
-        feedback = next((f for f in feedbacks if f["feedback_id"] == feedback_id), None)
-        
-        if not feedback:
-            raise ValueError("Geri bildirim bulunamadı")
-        
         reply = {
             "reply_id": str(uuid.uuid4()),
             "user_id": user_id,
@@ -72,9 +59,13 @@ class StoryFeedbackService:
             "created_at": datetime.now().isoformat()
         }
         
-        feedback["replies"].append(reply)
-        feedback["updated_at"] = datetime.now().isoformat()
-        self._save_feedbacks(feedbacks)
+        def add_reply(feedback: Dict) -> Dict:
+            feedback["replies"].append(reply)
+            feedback["updated_at"] = datetime.now().isoformat()
+            return feedback
+        
+        if not self.feedback_store.update_item(feedback_id, add_reply):
+            raise ValueError("Geri bildirim bulunamadı")
         
         return {
             "reply_id": reply["reply_id"],
@@ -87,20 +78,24 @@ class StoryFeedbackService:
         user_id: str
     ) -> Dict:
         """Geri bildirimi beğenir."""
-        feedbacks = self._load_feedbacks()
-        feedback = next((f for f in feedbacks if f["feedback_id"] == feedback_id), None)
+        result = {"liked": False}
+        
+        def like(feedback: Dict) -> Dict:
+            if "liked_by" not in feedback:
+                feedback["liked_by"] = []
+            if user_id not in feedback["liked_by"]:
+                feedback["liked_by"].append(user_id)
+                feedback["likes"] = len(feedback["liked_by"])
+                feedback["updated_at"] = datetime.now().isoformat()
+                result["liked"] = True
+            return feedback
+        
+        feedback = self.feedback_store.update_item(feedback_id, like)
         
         if not feedback:
             raise ValueError("Geri bildirim bulunamadı")
         
-        if "liked_by" not in feedback:
-            feedback["liked_by"] = []
-        
-        if user_id not in feedback["liked_by"]:
-            feedback["liked_by"].append(user_id)
-            feedback["likes"] = len(feedback["liked_by"])
-            feedback["updated_at"] = datetime.now().isoformat()
-            self._save_feedbacks(feedbacks)
+        if result["liked"]:
             return {"message": "Beğenildi", "likes": feedback["likes"]}
         else:
             return {"message": "Zaten beğenilmiş"}
@@ -111,8 +106,7 @@ class StoryFeedbackService:
         feedback_type: Optional[str] = None
     ) -> List[Dict]:
         """Hikaye geri bildirimlerini getirir."""
-        feedbacks = self._load_feedbacks()
-        story_feedbacks = [f for f in feedbacks if f["story_id"] == story_id]
+        story_feedbacks = self.feedback_store.items(lambda f: f["story_id"] == story_id)
         
         if feedback_type:
             story_feedbacks = [f for f in story_feedbacks if f["feedback_type"] == feedback_type]
@@ -124,8 +118,7 @@ class StoryFeedbackService:
     
     async def get_feedback_stats(self, story_id: str) -> Dict:
         """Hikaye geri bildirim istatistiklerini getirir."""
-        feedbacks = self._load_feedbacks()
-        story_feedbacks = [f for f in feedbacks if f["story_id"] == story_id]
+        story_feedbacks = self.feedback_store.items(lambda f: f["story_id"] == story_id)
         
         ratings = [f["rating"] for f in story_feedbacks if f.get("rating")]
         avg_rating = sum(ratings) / len(ratings) if ratings else 0
@@ -138,17 +131,3 @@ class StoryFeedbackService:
             "average_rating": round(avg_rating, 2),
             "total_likes": sum(f.get("likes", 0) for f in story_feedbacks)
         }
-    
-    def _load_feedbacks(self) -> List[Dict]:
-        """Geri bildirimleri yükler."""
-        try:
-            with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_feedbacks(self, feedbacks: List[Dict]):
-        """Geri bildirimleri kaydeder."""
-        with open(self.feedback_file, 'w', encoding='utf-8') as f:
-            json.dump(feedbacks, f, ensure_ascii=False, indent=2)
-
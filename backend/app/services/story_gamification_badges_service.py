@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,20 +11,10 @@ class StoryGamificationBadgesService:
     """Hikaye oyunlaştırma ve rozetler servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.badges_file = os.path.join(settings.STORAGE_PATH, "user_badges.json")
         self.achievements_file = os.path.join(settings.STORAGE_PATH, "achievements.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.badges_file):
-            with open(self.badges_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
-        if not os.path.exists(self.achievements_file):
-            with open(self.achievements_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.badges_store = get_document_store(self.badges_file, default_factory=dict)
+        self.achievements_store = get_document_store(self.achievements_file, default_factory=list)
     
     async def check_and_award_badge(
         self,
@@ -33,18 +23,16 @@ class StoryGamificationBadgesService:
         action_data: Dict
     ) -> Dict:
         """Rozet kontrolü ve ödül verme."""
-        badges = self._load_badges()
+        earned_badges = []
         
-        if user_id not in badges:
-            badges[user_id] = []
+        def award(user_badges: List[Dict]) -> List[Dict]:
+            # Rozet kriterlerini kontrol et
+            earned_badges[:] = self._check_badge_criteria(user_id, action_type, action_data, user_badges)
+            return user_badges + earned_badges
         
-        # Rozet kriterlerini kontrol et
-        earned_badges = self._check_badge_criteria(user_id, action_type, action_data, badges[user_id])
+        self.badges_store.update(user_id, award, default=[])
         
         if earned_badges:
-            badges[user_id].extend(earned_badges)
-            self._save_badges(badges)
-            
             return {
                 "badges_earned": earned_badges,
                 "message": f"{len(earned_badges)} yeni rozet kazandınız!"
@@ -112,8 +100,7 @@ class StoryGamificationBadgesService:
         user_id: str
     ) -> Dict:
         """Kullanıcının rozetlerini getirir."""
-        badges = self._load_badges()
-        user_badges = badges.get(user_id, [])
+        user_badges = self.badges_store.get(user_id, [])
         
         # Rozet kategorilerine göre grupla
         categories = {
@@ -148,38 +135,9 @@ class StoryGamificationBadgesService:
             "created_at": datetime.now().isoformat()
         }
         
-        achievements = self._load_achievements()
-        achievements.append(badge)
-        self._save_achievements(achievements)
+        self.achievements_store.append(badge)
         
         return {
             "badge_id": badge_id,
             "message": "Özel rozet oluşturuldu"
         }
-    
-    def _load_badges(self) -> Dict:
-        """Rozetleri yükler."""
-        try:
-            with open(self.badges_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_badges(self, badges: Dict):
-        """Rozetleri kaydeder."""
-        with open(self.badges_file, 'w', encoding='utf-8') as f:
-            json.dump(badges, f, ensure_ascii=False, indent=2)
-    
-    def _load_achievements(self) -> List[Dict]:
-        """Başarımları yükler."""
-        try:
-            with open(self.achievements_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_achievements(self, achievements: List[Dict]):
-        """Başarımları kaydeder."""
-        with open(self.achievements_file, 'w', encoding='utf-8') as f:
-            json.dump(achievements, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryHookCreatorService:
     """Hikaye kanca (hook) oluşturma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.hooks_file = os.path.join(settings.STORAGE_PATH, "hooks.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryHookCreatorService:
     async def create_hook(self, story_id: str, story_text: str, hook_type: str = "question") -> Dict:
         hook_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeye {hook_type} tipinde ilgi çekici bir başlangıç ekle:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir kanca yaratma uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.8, max_tokens=500
+            temperature=0.8, max_tokens=500, cache=False, cache_namespace="story_hook_creator"
         )
         hook = response.choices[0].message.content
         return {"hook_id": hook_id, "hook": hook, "hook_type": hook_type}
@@ -1,14 +1,11 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import re
 
 
 class StoryImprovementService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
-    
     async def analyze_story_quality(
         self,
         story_text: str,
@@ -72,13 +69,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat editörüsün. Hikâyeleri analiz edip iyileştirme önerileri sunuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="story_improvement"
             )
             
             analysis_text = response.choices[0].message.content
@@ -185,13 +183,15 @@ Orijinal Hikâye:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir edebiyat editörüsün. Hikâyeleri iyileştiriyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="story_improvement"
             )
             
             return response.choices[0].message.content.strip()
@@ -1,28 +1,21 @@
-import json
 import os
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from openai import OpenAI
 
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
+from app.services.story_search_index import analyze_terms
 
 
 class StoryInlineSearchService:
     """Hikaye içi arama servisi"""
 
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.search_index_file = os.path.join(settings.STORAGE_PATH, "story_search_index.json")
-        self._ensure_files()
-
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.search_index_file):
-            with open(self.search_index_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.search_index_store = get_document_store(self.search_index_file, default_factory=dict)
 
     async def index_story(
         self,
@@ -31,8 +24,6 @@ class StoryInlineSearchService:
         metadata: Optional[Dict] = None
     ) -> Dict:
         """Hikayeyi arama indeksine ekler."""
-        index = self._load_index()
-
         # Hikayeyi parçalara böl (cümleler veya paragraflar)
         sentences = story_text.split('.')
         indexed_segments = []
@@ -46,14 +37,12 @@ class StoryInlineSearchService:
                     "position": i
                 })
 
-        index[story_id] = {
+        self.search_index_store.put(story_id, {
             "story_id": story_id,
             "metadata": metadata or {},
             "segments": indexed_segments,
             "indexed_at": datetime.now().isoformat()
-        }
-
-        self._save_index(index)
+        })
 
         return {
             "story_id": story_id,
@@ -68,17 +57,16 @@ class StoryInlineSearchService:
         context_lines: int = 2
     ) -> List[Dict]:
         """Hikaye içinde arama yapar."""
-        index = self._load_index()
-        story_index = index.get(story_id)
+        story_index = self.search_index_store.get(story_id)
 
         if not story_index:
             return []
 
         results = []
-        query_lower = query.lower()
+        match = self._segment_matcher(query)
 
         for segment in story_index["segments"]:
-            if query_lower in segment["text"].lower():
+            if match(segment["text"]) >= 1.0:
                 result = {
                     "segment_id": segment["segment_id"],
                     "text": segment["text"],
@@ -100,8 +88,7 @@ class StoryInlineSearchService:
         limit: int = 5
     ) -> List[Dict]:
         """AI ile anlamsal arama yapar."""
-        index = self._load_index()
-        story_index = index.get(story_id)
+        story_index = self.search_index_store.get(story_id)
 
         if not story_index:
             return []
@@ -115,35 +102,54 @@ class StoryInlineSearchService:
 
 Sadece ilgili bölümleri ve pozisyonlarını ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir metin analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            cache_namespace="story_inline_search"
         )
 
         # Sonuçları parse et (basit bir yaklaşım)
         _ = response.choices[0].message.content
         results = []
 
-        # Basit eşleştirme (gerçek uygulamada daha gelişmiş olmalı)
-        query_lower = query.lower()
+        # Gövdelenmiş terim eşleştirmesi; skor = eşleşen sorgu terimi oranı
+        match = self._segment_matcher(query)
         for segment in story_index["segments"]:
-            if query_lower in segment["text"].lower():
+            score = match(segment["text"])
+            if score > 0:
                 results.append({
                     "segment_id": segment["segment_id"],
                     "text": segment["text"],
                     "position": segment["position"],
-                    "relevance_score": 0.8  # Basit skor
+                    "relevance_score": round(score, 2)
                 })
 
         # Skora göre sırala ve limit uygula
         results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
         return results[:limit]
 
+    @staticmethod
+    def _segment_matcher(query: str):
+        """
+        Sorguyu Türkçe gövdelenmiş terimlere ayırır ve bir segment için eşleşen
+        terim oranını (0-1) döndüren fonksiyon üretir ("kedinin" -> "kediler").
+        Sorgu yalnızca durak kelimelerden oluşuyorsa alt dize aramasına düşer.
+        """
+        terms = set(analyze_terms(query))
+        if not terms:
+            query_lower = query.lower()
+            return lambda text: 1.0 if query_lower in text.lower() else 0.0
+
+        def match(text: str) -> float:
+            return len(terms & set(analyze_terms(text))) / len(terms)
+
+        return match
+
     def _get_context(
         self,
         segments: List[Dict],
@@ -161,17 +167,3 @@ Sadece ilgili bölümleri ve pozisyonlarını ver."""
             "current": segments[position]["text"] if position < len(segments) else "",
             "after": [s["text"] for s in context_segments[context_lines+1:]]
         }
-
-    def _load_index(self) -> Dict:
-        """İndeksi yükler."""
-        try:
-            with open(self.search_index_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_index(self, index: Dict):
-        """İndeksi kaydeder."""
-        with open(self.search_index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 from app.services.story_analysis_service import StoryAnalysisService
 import json
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class StoryInsightsService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
         self.analysis_service = StoryAnalysisService()
     
@@ -43,13 +42,15 @@ JSON formatında döndür:
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir hikâye analiz uzmanısın. Derinlemesine içgörüler sunuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5
+                temperature=0.5,
+                cache=True,
+                cache_namespace="story_insights"
             )
             
             insights_text = response.choices[0].message.content
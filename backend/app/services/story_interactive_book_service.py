@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
 from app.services.tts_service import TTSService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -13,18 +13,12 @@ class StoryInteractiveBookService:
     """Hikaye interaktif kitap formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.tts_service = TTSService()
         self.interactive_books_file = os.path.join(settings.STORAGE_PATH, "interactive_books.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.interactive_books_file):
-            with open(self.interactive_books_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.interactive_books_store = get_document_store(
+            self.interactive_books_file, default_factory=list, item_key="book_id"
+        )
     
     async def create_interactive_book(
         self,
@@ -80,9 +74,7 @@ class StoryInteractiveBookService:
             "created_at": datetime.now().isoformat()
         }
         
-        books = self._load_books()
-        books.append(book)
-        self._save_books(books)
+        self.interactive_books_store.append(book)
         
         return {
             "book_id": book_id,
@@ -97,24 +89,21 @@ class StoryInteractiveBookService:
         animation_type: str = "fade"
     ) -> Dict:
         """Sayfaya animasyon ekler."""
-        books = self._load_books()
-        book = next((b for b in books if b["book_id"] == book_id), None)
+        def animate(book: Dict) -> Dict:
+            if page_number > len(book["pages"]):
+                raise ValueError("Sayfa bulunamadı")
+            
+            page = book["pages"][page_number - 1]
+            page["animation"] = {
+                "type": animation_type,
+                "duration": 1.0,
+                "enabled": True
+            }
+            return book
         
-        if not book:
+        if not self.interactive_books_store.update_item(book_id, animate):
             raise ValueError("Kitap bulunamadı")
         
-        if page_number > len(book["pages"]):
-            raise ValueError("Sayfa bulunamadı")
-        
-        page = book["pages"][page_number - 1]
-        page["animation"] = {
-            "type": animation_type,
-            "duration": 1.0,
-            "enabled": True
-        }
-        
-        self._save_books(books)
-        
         return {"message": "Animasyon eklendi"}
     
     def _split_into_pages(self, text: str, max_length: int = 500) -> List[str]:
@@ -152,17 +141,3 @@ class StoryInteractiveBookService:
                 })
         
         return elements[:5]  # İlk 5 öğe
-    
-    def _load_books(self) -> List[Dict]:
-        """Kitapları yükler."""
-        try:
-            with open(self.interactive_books_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_books(self, books: List[Dict]):
-        """Kitapları kaydeder."""
-        with open(self.interactive_books_file, 'w', encoding='utf-8') as f:
-            json.dump(books, f, ensure_ascii=False, indent=2)
-
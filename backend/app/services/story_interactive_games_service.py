@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryInteractiveGamesService:
     """Çocuklar için interaktif oyunlar servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.games_file = os.path.join(settings.STORAGE_PATH, "story_games.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.games_file):
-            with open(self.games_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.games_store = get_document_store(self.games_file, default_factory=list)
     
     async def create_memory_game(
         self,
@@ -58,9 +50,7 @@ class StoryInteractiveGamesService:
             "created_at": datetime.now().isoformat()
         }
         
-        games = self._load_games()
-        games.append(game)
-        self._save_games(games)
+        self.games_store.append(game)
         
         return {
             "game_id": game_id,
@@ -89,9 +79,7 @@ class StoryInteractiveGamesService:
             "created_at": datetime.now().isoformat()
         }
         
-        games = self._load_games()
-        games.append(game)
-        self._save_games(games)
+        self.games_store.append(game)
         
         return {
             "game_id": game_id,
@@ -114,14 +102,16 @@ class StoryInteractiveGamesService:
 
 Her soru için 4 seçenek ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir eğitim uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_interactive_games"
         )
         
         # Basit parse (gerçek uygulamada daha gelişmiş olmalı)
@@ -135,9 +125,7 @@ Her soru için 4 seçenek ver."""
             "created_at": datetime.now().isoformat()
         }
         
-        games = self._load_games()
-        games.append(game)
-        self._save_games(games)
+        self.games_store.append(game)
         
         return {
             "game_id": game_id,
@@ -196,17 +184,3 @@ Her soru için 4 seçenek ver."""
             questions.append(current_question)
         
         return questions
-    
-    def _load_games(self) -> List[Dict]:
-        """Oyunları yükler."""
-        try:
-            with open(self.games_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_games(self, games: List[Dict]):
-        """Oyunları kaydeder."""
-        with open(self.games_file, 'w', encoding='utf-8') as f:
-            json.dump(games, f, ensure_ascii=False, indent=2)
-
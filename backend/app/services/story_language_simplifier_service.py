@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryLanguageSimplifierService:
     """Hikaye dil basitleştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.simplifications_file = os.path.join(settings.STORAGE_PATH, "language_simplifications.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryLanguageSimplifierService:
     async def simplify_language(self, story_id: str, story_text: str, target_age: int = 7) -> Dict:
         simp_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeyi {target_age} yaşındaki çocuklar için basitleştir:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir dil basitleştirme uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.6, max_tokens=2000
+            temperature=0.6, max_tokens=2000, cache=False, cache_namespace="story_language_simplifier"
         )
         simplified = response.choices[0].message.content
         return {"simp_id": simp_id, "simplified_text": simplified, "target_age": target_age}
@@ -0,0 +1,477 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.services.story_aggregate_index import StoryAggregateIndex
+from app.services.story_feature_index import StoryFeatureIndex
+from app.services.story_minhash_index import StoryMinHashIndex, containment, jaccard, shingles, signature
+from app.services.story_search_index import StorySearchIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, thread kilidi yeterli
+    fcntl = None
+
+
+class StoryLogStore:
+    """
+    Hikâyeler için append-only log + bellek içi indeksli depolama motoru.
+
+    Disk düzeni:
+        stories.json -> son sıkıştırmadaki snapshot (eski format ile aynı JSON listesi)
+        stories.log  -> snapshot'tan sonraki işlemler (satır başına bir JSON kaydı)
+        stories.idx  -> tam metin arama indeksi (sıkıştırmada ve çıkışta yazılır)
+        stories.mh   -> yakın kopya (MinHash/LSH) imzaları (aynı şekilde)
+
+    Her yazma log'a tek bir satır ekler; okumalar bellekteki indekslerden yapılır.
+    Diğer worker süreçlerinin eklediği satırlar her işlemden önce log'un
+    kuyruğundan okunur, böylece süreçler tutarlı kalır.
+    """
+
+    # Log'daki kayıt sayısı bu eşiği ve canlı hikâye sayısını geçince sıkıştır
+    COMPACT_MIN_RECORDS = 1000
+
+    def __init__(self, storage_dir: str):
+        self.snapshot_file = os.path.join(storage_dir, "stories.json")
+        self.log_file = os.path.join(storage_dir, "stories.log")
+        self.lock_file = os.path.join(storage_dir, "stories.lock")
+        self._lock = threading.RLock()
+
+        self._stories: Dict[str, Dict] = {}
+        self._by_type: Dict[str, Set[str]] = defaultdict(set)
+        self._favorites: Set[str] = set()
+        self._public: Set[str] = set()
+        self._by_created: List[Tuple[str, str]] = []  # (created_at, story_id), sıralı
+
+        self._snapshot_sig: Optional[Tuple[int, int, int]] = None
+        self._log_offset = 0
+        self._log_records = 0
+
+        os.makedirs(storage_dir, exist_ok=True)
+        # Türetilmiş indeksler: her put/remove ile güncellenir, diske ayrıca yazılır
+        self._search = StorySearchIndex(os.path.join(storage_dir, "stories.idx"))
+        self._near_dups = StoryMinHashIndex(os.path.join(storage_dir, "stories.mh"))
+        self._features = StoryFeatureIndex()
+        self._aggregates = StoryAggregateIndex()
+        self._indexes = (self._search, self._near_dups, self._features, self._aggregates)
+        for index in self._indexes:
+            index.load()
+        with self._lock:
+            self._reload()
+        atexit.register(self.save_indexes)
+
+    # ------------------------------------------------------------------ #
+    # Disk senkronizasyonu
+    # ------------------------------------------------------------------ #
+
+    @contextmanager
+    def _write_lock(self):
+        """Thread ve (destekleniyorsa) süreçler arası yazma kilidi."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_file, "a") as lock_fp:
+                fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+
+    def _file_sig(self, path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _reload(self):
+        """Snapshot'ı ve log'u baştan yükleyip indeksleri yeniden kurar."""
+        # Türetilmiş indeksler korunur: değişmeyen hikâyeler yeniden işlenmez
+        for index in self._indexes:
+            index.begin_rebuild()
+        self._stories.clear()
+        self._by_type.clear()
+        self._favorites.clear()
+        self._public.clear()
+        self._by_created = []
+        self._log_offset = 0
+        self._log_records = 0
+
+        self._snapshot_sig = self._file_sig(self.snapshot_file)
+        if self._snapshot_sig is not None:
+            try:
+                with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                    stories = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                stories = []
+            for story in stories:
+                if story.get("story_id") is not None:
+                    self._put(story)
+
+        self._read_log_tail()
+        for index in self._indexes:
+            index.end_rebuild()
+
+    def _read_log_tail(self):
+        """Log'da son okunan konumdan sonraki tam satırları uygular."""
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Yazılmakta olan yarım satırı bir sonraki okumaya bırak
+        end = data.rfind(b"\n")
+        if end < 0:
+            return
+        for line in data[: end + 1].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._apply(record)
+            self._log_records += 1
+        self._log_offset += end + 1
+
+    def _refresh(self):
+        """Başka süreçlerin yaptığı değişiklikleri bellekteki duruma yansıtır."""
+        if self._file_sig(self.snapshot_file) != self._snapshot_sig:
+            self._reload()
+            return
+        try:
+            log_size = os.path.getsize(self.log_file)
+        except FileNotFoundError:
+            log_size = 0
+        if log_size < self._log_offset:
+            # Log başka bir süreç tarafından sıkıştırıldı
+            self._reload()
+        elif log_size > self._log_offset:
+            self._read_log_tail()
+
+    def _append(self, record: Dict):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.log_file, "ab") as f:
+            f.write(line)
+            f.flush()
+        self._log_offset += len(line)
+        self._log_records += 1
+
+    def _maybe_compact(self):
+        if self._log_records >= max(self.COMPACT_MIN_RECORDS, len(self._stories)):
+            self._compact()
+
+    def _compact(self):
+        """Canlı hikâyeleri yeni snapshot'a yazar ve log'u sıfırlar."""
+        stories = [self._stories[story_id] for _, story_id in self._by_created]
+        tmp_file = f"{self.snapshot_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(stories, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.snapshot_file)
+        open(self.log_file, "wb").close()
+
+        self._snapshot_sig = self._file_sig(self.snapshot_file)
+        self._log_offset = 0
+        self._log_records = 0
+        # Sıkıştırma zaten tüm hikâyeleri dolaşıyor: sayaçlar da burada doğrulanır
+        self._aggregates.reconcile(stories)
+        self.save_indexes()
+
+    # ------------------------------------------------------------------ #
+    # İndeks bakımı
+    # ------------------------------------------------------------------ #
+
+    def _apply(self, record: Dict):
+        op = record.get("op")
+        if op == "put":
+            self._put(record["story"])
+        elif op == "del":
+            self._remove(record["story_id"])
+
+    def _put(self, story: Dict):
+        story_id = story["story_id"]
+        previous = self._remove(story_id, unindex=False)
+        for index in self._indexes:
+            index.add(story, previous)
+        self._stories[story_id] = story
+        self._by_type[story.get("story_type", "masal")].add(story_id)
+        if story.get("is_favorite", False):
+            self._favorites.add(story_id)
+        if story.get("is_public", False):
+            self._public.add(story_id)
+        bisect.insort(self._by_created, (story.get("created_at", ""), story_id))
+
+    def _remove(self, story_id: str, unindex: bool = True) -> Optional[Dict]:
+        story = self._stories.pop(story_id, None)
+        if story is None:
+            return None
+        if unindex:
+            for index in self._indexes:
+                index.remove(story_id, story)
+        story_type = story.get("story_type", "masal")
+        ids = self._by_type.get(story_type)
+        if ids is not None:
+            ids.discard(story_id)
+            if not ids:
+                del self._by_type[story_type]
+        self._favorites.discard(story_id)
+        self._public.discard(story_id)
+        key = (story.get("created_at", ""), story_id)
+        index = bisect.bisect_left(self._by_created, key)
+        if index < len(self._by_created) and self._by_created[index] == key:
+            del self._by_created[index]
+        return story
+
+    # ------------------------------------------------------------------ #
+    # Genel API
+    # ------------------------------------------------------------------ #
+
+    def get(self, story_id: str) -> Optional[Dict]:
+        """Hikâyeyi O(1) ile getirir (kopya döner)."""
+        with self._lock:
+            self._refresh()
+            story = self._stories.get(story_id)
+            return dict(story) if story is not None else None
+
+    def put(self, story: Dict, merge=None) -> Dict:
+        """
+        Hikâyeyi yazar. `merge(existing, story)` verilirse mevcut kayıt ile
+        birleştirme aynı kilit altında yapılır.
+        """
+        with self._write_lock():
+            self._refresh()
+            if merge is not None:
+                story = merge(self._stories.get(story["story_id"]), story)
+            story = dict(story)
+            self._put(story)
+            self._append({"op": "put", "story": story})
+            self._maybe_compact()
+            return dict(story)
+
+    def update(self, story_id: str, mutate) -> Optional[Dict]:
+        """Mevcut hikâyenin kopyasını `mutate` ile değiştirip yazar."""
+        with self._write_lock():
+            self._refresh()
+            existing = self._stories.get(story_id)
+            if existing is None:
+                return None
+            story = dict(existing)
+            mutate(story)
+            self._put(story)
+            self._append({"op": "put", "story": story})
+            self._maybe_compact()
+            return dict(story)
+
+    def delete(self, story_id: str) -> bool:
+        with self._write_lock():
+            self._refresh()
+            if self._remove(story_id) is None:
+                return False
+            self._append({"op": "del", "story_id": story_id})
+            self._maybe_compact()
+            return True
+
+    def compact(self):
+        """Log'u elle sıkıştırır (bakım görevleri için)."""
+        with self._write_lock():
+            self._refresh()
+            self._compact()
+
+    def save_indexes(self):
+        """Değişen türetilmiş indeksleri diske yazar."""
+        with self._lock:
+            for index in self._indexes:
+                if not index.dirty:
+                    continue
+                try:
+                    index.save()
+                except OSError:
+                    # İndeksler her zaman snapshot + log'dan yeniden kurulabilir
+                    pass
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._stories)
+
+    def favorite_count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._favorites)
+
+    def type_counts(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {story_type: len(ids) for story_type, ids in self._by_type.items()}
+
+    def aggregates(self, today: date) -> Dict:
+        """Yazmada güncellenen kütüphane sayaçları (bkz. `StoryAggregateIndex.snapshot`)."""
+        with self._lock:
+            self._refresh()
+            return self._aggregates.snapshot(today)
+
+    def reconcile_aggregates(self) -> List[str]:
+        """Sayaçları canlı hikâyelerden yeniden sayar; sapan alanları döndürür."""
+        with self._lock:
+            self._refresh()
+            return self._aggregates.reconcile(self._stories.values())
+
+    def query(
+        self,
+        story_type: Optional[str] = None,
+        favorite_only: bool = False,
+        public_only: bool = False,
+        predicate=None,
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        İkincil indekslerle filtreleyip `created_at` sırasıyla döner.
+        Sıralama indeksten geldiği için `limit` verildiğinde erken durur.
+        """
+        with self._lock:
+            self._refresh()
+            candidates: Optional[Set[str]] = None
+            for flag, ids in (
+                (favorite_only, self._favorites),
+                (public_only, self._public),
+                (story_type is not None, self._by_type.get(story_type, set())),
+            ):
+                if flag:
+                    candidates = set(ids) if candidates is None else candidates & ids
+
+            ordered: Iterator[Tuple[str, str]] = (
+                reversed(self._by_created) if newest_first else iter(self._by_created)
+            )
+            results = []
+            for _, story_id in ordered:
+                if candidates is not None and story_id not in candidates:
+                    continue
+                story = self._stories[story_id]
+                if predicate is not None and not predicate(story):
+                    continue
+                results.append(dict(story))
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    def search(
+        self,
+        query: str,
+        story_type: Optional[str] = None,
+        favorite_only: bool = False,
+        public_only: bool = False,
+        limit: Optional[int] = None,
+        match_all: bool = True,
+    ) -> List[Dict]:
+        """Tam metin arama; sonuçlar BM25 skoruna göre sıralı döner."""
+        with self._lock:
+            self._refresh()
+            allowed: Optional[Set[str]] = None
+            for flag, ids in (
+                (favorite_only, self._favorites),
+                (public_only, self._public),
+                (story_type is not None, self._by_type.get(story_type, set())),
+            ):
+                if flag:
+                    allowed = set(ids) if allowed is None else allowed & ids
+            hits = self._search.search(query, limit=limit, match_all=match_all, allowed=allowed)
+            return [dict(self._stories[story_id]) for story_id, _ in hits if story_id in self._stories]
+
+    def near_duplicates(
+        self,
+        text: str,
+        exclude_id: Optional[str] = None,
+        threshold: float = 0.3,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Tuple[Dict, float, float]], int]:
+        """
+        Metne benzeyen hikâyeler: LSH ve kapsama (örneklenmiş shingle)
+        adayları gerçek shingle Jaccard'ı ve kapsaması ile doğrulanır. ``(hikâye, jaccard, kapsama)`` listesi (benzerliğe göre
+        azalan) ve doğrulanan aday sayısı döner.
+        """
+        query = shingles(text)
+        if not query:
+            return [], 0
+        sig = signature(query)
+        with self._lock:
+            self._refresh()
+            candidates = self._near_dups.candidates(
+                sig, exclude=exclude_id, query=query, min_containment=threshold,
+            )
+            texts = {
+                story_id: self._stories[story_id]
+                for story_id in candidates
+                if story_id in self._stories
+            }
+        matches = []
+        for story_id, story in texts.items():
+            other = shingles(story.get("story_text") or "")
+            similarity = jaccard(query, other)
+            covered = containment(query, other)
+            if max(similarity, covered) >= threshold:
+                matches.append((dict(story), similarity, covered))
+        matches.sort(key=lambda m: max(m[1], m[2]), reverse=True)
+        return (matches[:limit] if limit else matches), len(texts)
+
+
+    def user_stories(self, user_id: str) -> List[Dict]:
+        """Kullanıcının hikâyeleri, yeniden eskiye."""
+        with self._lock:
+            self._refresh()
+            return [dict(self._stories[story_id]) for story_id in self._features.user_story_ids(user_id)]
+
+    def user_themes(self, user_id: str) -> List[Tuple[str, int]]:
+        """Kullanıcının hikâye temaları ve sayıları (çoktan aza)."""
+        with self._lock:
+            self._refresh()
+            return self._features.user_themes(user_id)
+
+    def recommend(
+        self,
+        user_id: str,
+        themes: Iterable[str] = (),
+        story_types: Iterable[str] = (),
+        limit: int = 10,
+        require_theme: bool = False,
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Önceden hesaplanmış özelliklerle vektörel öneri skorlaması.
+        Kullanıcının kendi hikâyeleri hariç ``(hikâye, skor)`` listesi döner.
+        """
+        with self._lock:
+            self._refresh()
+            ranked = self._features.recommend(
+                user_id, themes, story_types, limit=limit, require_theme=require_theme,
+            )
+            return [(dict(self._stories[story_id]), score) for story_id, score in ranked]
+
+    def similar(self, story_id: str, limit: int = 5) -> List[Tuple[Dict, float]]:
+        """Tema, tür ve dil benzerliğine göre ``(hikâye, skor)`` listesi."""
+        with self._lock:
+            self._refresh()
+            ranked = self._features.similar(story_id, limit=limit)
+            return [(dict(self._stories[sid]), score) for sid, score in ranked]
+
+_stores: Dict[str, StoryLogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_story_store(storage_dir: str) -> StoryLogStore:
+    """Aynı dizin için süreç içinde tek bir StoryLogStore örneği döner."""
+    key = os.path.abspath(storage_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = StoryLogStore(storage_dir)
+            _stores[key] = store
+        return store
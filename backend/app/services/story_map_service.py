@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
 import json
 import os
@@ -12,11 +13,11 @@ class StoryMapService:
     """Hikaye coğrafya ve harita oluşturma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.maps_file = os.path.join(settings.STORAGE_PATH, "story_maps.json")
         self.maps_path = os.path.join(settings.STORAGE_PATH, "maps")
         self._ensure_files()
+        self.maps_store = get_document_store(self.maps_file, default_factory=list, item_key="map_id")
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -56,9 +57,7 @@ class StoryMapService:
             "created_at": datetime.now().isoformat()
         }
         
-        maps = self._load_maps()
-        maps.append(story_map)
-        self._save_maps(maps)
+        self.maps_store.append(story_map)
         
         return {
             "map_id": map_id,
@@ -74,12 +73,6 @@ class StoryMapService:
         location_type: str = "city"
     ) -> Dict:
         """Haritaya yer ekler."""
-        maps = self._load_maps()
-        story_map = next((m for m in maps if m["map_id"] == map_id), None)
-        
-        if not story_map:
-            raise ValueError("Harita bulunamadı")
-        
         location = {
             "location_id": str(uuid.uuid4()),
             "name": location_name,
@@ -88,8 +81,12 @@ class StoryMapService:
             "created_at": datetime.now().isoformat()
         }
         
-        story_map["locations"].append(location)
-        self._save_maps(maps)
+        def add_location(story_map: Dict) -> Dict:
+            story_map["locations"].append(location)
+            return story_map
+        
+        if not self.maps_store.update_item(map_id, add_location):
+            raise ValueError("Harita bulunamadı")
         
         return {
             "location_id": location["location_id"],
@@ -160,19 +157,4 @@ class StoryMapService:
     
     async def get_map(self, map_id: str) -> Optional[Dict]:
         """Haritayı getirir."""
-        maps = self._load_maps()
-        return next((m for m in maps if m["map_id"] == map_id), None)
-    
-    def _load_maps(self) -> List[Dict]:
-        """Haritaları yükler."""
-        try:
-            with open(self.maps_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_maps(self, maps: List[Dict]):
-        """Haritaları kaydeder."""
-        with open(self.maps_file, 'w', encoding='utf-8') as f:
-            json.dump(maps, f, ensure_ascii=False, indent=2)
-
+        return self.maps_store.get_item(map_id)
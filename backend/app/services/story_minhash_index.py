@@ -0,0 +1,281 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.story_search_index import fold, turkish_lower
+
+# ---------------------------------------------------------------------- #
+# Shingle ve imza
+# ---------------------------------------------------------------------- #
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+SHINGLE_SIZE = 3
+NUM_BINS = 128
+_BIN_BITS = 7                      # 2**7 = NUM_BINS
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 63
+# Kapsama adayları için shingle'ların ~1/8'i örneklenir (alt 3 bit sıfır olanlar)
+SAMPLE_MASK = 0x7
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Kelime n-gram'larının 64 bit özetleri (büyük/küçük harf ve Türkçe karakter duyarsız)."""
+    words = [fold(w) for w in _WORD_RE.findall(turkish_lower(text or ""))]
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+        for gram in grams
+    }
+
+
+def signature(shingle_hashes: Iterable[int]) -> array:
+    """
+    Tek permütasyonlu MinHash (OPH): her shingle bir kez özetlenir, üst bitler
+    kutuyu seçer, kutuda en küçük değer kalır. Boş kutular sağdaki ilk dolu
+    kutudan (dönüşlü yoğunlaştırma) doldurulur; böylece 128 permütasyon
+    yerine O(n) maliyetle 128 değerlik imza çıkar.
+    """
+    bins = [_EMPTY] * NUM_BINS
+    for h in shingle_hashes:
+        b = h >> _VALUE_BITS
+        v = h & _VALUE_MASK
+        if v < bins[b]:
+            bins[b] = v
+    if all(v == _EMPTY for v in bins):
+        return array("Q", bins)
+    for i in range(NUM_BINS):
+        if bins[i] != _EMPTY:
+            continue
+        step = 1
+        while bins[(i + step) % NUM_BINS] == _EMPTY:
+            step += 1
+        # Ödünç alınan değer mesafeyle kaydırılır (kutular arası çakışmayı önler)
+        bins[i] = (bins[(i + step) % NUM_BINS] + step * 0x9E3779B97F4A7C15) & _VALUE_MASK | (1 << 62)
+    return array("Q", bins)
+
+
+def sample(shingle_hashes: Iterable[int]) -> Set[int]:
+    """
+    Sabit oranlı shingle örneği. Örnekleme metinden bağımsız olduğu için bir
+    alıntının örneği, kaynağın örneğinin alt kümesidir; ortak örnek oranı
+    kapsamanın yansız tahminidir.
+    """
+    return {h for h in shingle_hashes if not h & SAMPLE_MASK}
+
+
+def estimate_jaccard(a: array, b: array) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def containment(a: Set[int], b: Set[int]) -> float:
+    """a'nın b içinde kalan oranı (uzun bir metne gömülü kopya için)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a)
+
+
+# ---------------------------------------------------------------------- #
+# LSH indeksi
+# ---------------------------------------------------------------------- #
+
+class StoryMinHashIndex:
+    """
+    Hikâye metinleri için MinHash imzaları + LSH bantlama ile yakın kopya indeksi.
+
+    - İmza 128 değer, BANDS x ROWS bantlara bölünür; herhangi bir bandı aynı
+      olan hikâyeler adaydır (Jaccard ~0.3 için kaçırma olasılığı < %0.5)
+    - Jaccard'ı düşük ama kapsaması yüksek eşleşmeler (uzun bir hikâyeden kısa
+      bir alıntı) için örneklenmiş shingle -> hikâye listeleri tutulur; sorgunun
+      örneğinin yeterli kısmını içeren hikâyeler de adaydır
+    - Adaylar çağıran tarafından gerçek shingle Jaccard'ı / kapsaması ile doğrulanır
+    - İmzalar ve örnekler içerik parmak iziyle saklanır (`save`/`load`); kovalar
+      ve listeler yüklemede bunlardan yeniden kurulur
+
+    Eşzamanlılık `StoryLogStore` kilidiyle sağlanır.
+    """
+
+    FORMAT_VERSION = 2
+    BANDS = 64
+    ROWS = NUM_BINS // BANDS
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._signatures: Dict[str, array] = {}
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+        self._samples: Dict[str, array] = {}
+        self._postings: Dict[int, Set[str]] = defaultdict(set)
+        self._stale: Optional[Set[str]] = None
+        self.dirty = False
+
+    @staticmethod
+    def fingerprint(story: Dict) -> int:
+        return zlib.crc32((story.get("story_text") or "").encode("utf-8"))
+
+    def _band_keys(self, sig: array) -> List[Tuple[int, bytes]]:
+        rows = self.ROWS
+        return [(band, sig[band * rows:(band + 1) * rows].tobytes()) for band in range(self.BANDS)]
+
+    def _link(self, story_id: str, sig: array, sampled: array):
+        self._signatures[story_id] = sig
+        for key in self._band_keys(sig):
+            self._buckets[key].add(story_id)
+        self._samples[story_id] = sampled
+        for h in sampled:
+            self._postings[h].add(story_id)
+
+    def _unlink(self, story_id: str):
+        sig = self._signatures.pop(story_id, None)
+        if sig is None:
+            return
+        for key in self._band_keys(sig):
+            ids = self._buckets.get(key)
+            if ids is not None:
+                ids.discard(story_id)
+                if not ids:
+                    del self._buckets[key]
+        for h in self._samples.pop(story_id, ()):
+            ids = self._postings.get(h)
+            if ids is not None:
+                ids.discard(story_id)
+                if not ids:
+                    del self._postings[h]
+
+    # ------------------------------------------------------------------ #
+    # Bakım
+    # ------------------------------------------------------------------ #
+
+    def add(self, story: Dict, previous: Optional[Dict] = None):
+        story_id = story.get("story_id")
+        if story_id is None:
+            return
+        if self._stale is not None:
+            self._stale.discard(story_id)
+        fp = self.fingerprint(story)
+        if self._fingerprints.get(story_id) == fp:
+            return
+        self._unlink(story_id)
+        self._fingerprints[story_id] = fp
+        shingle_set = shingles(story.get("story_text") or "")
+        if shingle_set:
+            self._link(story_id, signature(shingle_set), array("Q", sorted(sample(shingle_set))))
+        self.dirty = True
+
+    def remove(self, story_id: str, story: Optional[Dict] = None):
+        if self._fingerprints.pop(story_id, None) is None:
+            return
+        self._unlink(story_id)
+        self.dirty = True
+
+    def begin_rebuild(self):
+        self._stale = set(self._fingerprints)
+
+    def end_rebuild(self):
+        stale, self._stale = self._stale or set(), None
+        for story_id in stale:
+            self.remove(story_id)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    # ------------------------------------------------------------------ #
+    # Sorgu
+    # ------------------------------------------------------------------ #
+
+    def candidates(
+        self,
+        sig: array,
+        exclude: Optional[str] = None,
+        query: Optional[Set[int]] = None,
+        min_containment: float = 0.0,
+    ) -> Dict[str, float]:
+        """
+        LSH adayları ve imzadan tahmini Jaccard değerleri. ``query`` (sorgu
+        shingle'ları) verilirse örneğinin en az ``min_containment / 2``
+        kadarını içeren hikâyeler de eklenir (kapsama adayları).
+        """
+        found: Set[str] = set()
+        for key in self._band_keys(sig):
+            ids = self._buckets.get(key)
+            if ids:
+                found |= ids
+        if query:
+            query_sample = sample(query)
+            hits: Dict[str, int] = defaultdict(int)
+            for h in query_sample:
+                for story_id in self._postings.get(h, ()):
+                    hits[story_id] += 1
+            needed = max(1, min_containment / 2 * len(query_sample))
+            found.update(story_id for story_id, count in hits.items() if count >= needed)
+        found.discard(exclude)
+        return {story_id: estimate_jaccard(sig, self._signatures[story_id]) for story_id in found}
+
+    # ------------------------------------------------------------------ #
+    # Kalıcılık
+    # ------------------------------------------------------------------ #
+
+    def save(self):
+        if not self.path:
+            return
+        payload = {
+            "version": self.FORMAT_VERSION,
+            "fingerprints": self._fingerprints,
+            "signatures": {
+                story_id: base64.b64encode(sig.tobytes()).decode("ascii")
+                for story_id, sig in self._signatures.items()
+            },
+            "samples": {
+                story_id: base64.b64encode(sampled.tobytes()).decode("ascii")
+                for story_id, sampled in self._samples.items()
+            },
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def load(self) -> bool:
+        if not self.path:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if payload.get("version") != self.FORMAT_VERSION:
+            return False
+
+        self._signatures.clear()
+        self._buckets.clear()
+        self._samples.clear()
+        self._postings.clear()
+        self._fingerprints = dict(payload["fingerprints"])
+        samples = payload.get("samples", {})
+        for story_id, data in payload["signatures"].items():
+            sig = array("Q")
+            sig.frombytes(base64.b64decode(data))
+            sampled = array("Q")
+            sampled.frombytes(base64.b64decode(samples.get(story_id, "")))
+            if len(sig) == NUM_BINS:
+                self._link(story_id, sig, sampled)
+        self.dirty = False
+        return True
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryMultilangAdvancedService:
     """Hikaye çeviri ve çoklu dil geliştirmeleri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.translations_file = os.path.join(settings.STORAGE_PATH, "story_translations.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.translations_file):
-            with open(self.translations_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.translations_store = get_document_store(self.translations_file, default_factory=list)
     
     async def translate_story(
         self,
@@ -38,14 +30,16 @@ class StoryMultilangAdvancedService:
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"Sen bir {target_language} çevirmenisin."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_multilang_advanced"
         )
         
         translated_text = response.choices[0].message.content
@@ -61,9 +55,7 @@ Hikaye:
             "created_at": datetime.now().isoformat()
         }
         
-        translations = self._load_translations()
-        translations.append(translation)
-        self._save_translations(translations)
+        self.translations_store.append(translation)
         
         return {
             "translation_id": translation_id,
@@ -109,11 +101,9 @@ Hikaye:
         language2: str
     ) -> Dict:
         """Çevirileri karşılaştırır."""
-        translations = self._load_translations()
-        story_translations = [
-            t for t in translations
-            if t["story_id"] == story_id and t["target_language"] in [language1, language2]
-        ]
+        story_translations = self.translations_store.items(
+            lambda t: t["story_id"] == story_id and t["target_language"] in [language1, language2]
+        )
         
         trans1 = next((t for t in story_translations if t["target_language"] == language1), None)
         trans2 = next((t for t in story_translations if t["target_language"] == language2), None)
@@ -149,17 +139,3 @@ Hikaye:
         union = words1.union(words2)
         
         return len(intersection) / len(union) if union else 0.0
-    
-    def _load_translations(self) -> List[Dict]:
-        """Çevirileri yükler."""
-        try:
-            with open(self.translations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_translations(self, translations: List[Dict]):
-        """Çevirileri kaydeder."""
-        with open(self.translations_file, 'w', encoding='utf-8') as f:
-            json.dump(translations, f, ensure_ascii=False, indent=2)
-
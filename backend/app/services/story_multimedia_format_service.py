@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
 from app.services.tts_service import TTSService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -13,18 +13,10 @@ class StoryMultimediaFormatService:
     """Hikaye çoklu medya formatları servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.tts_service = TTSService()
         self.multimedia_file = os.path.join(settings.STORAGE_PATH, "multimedia_stories.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.multimedia_file):
-            with open(self.multimedia_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.multimedia_store = get_document_store(self.multimedia_file, default_factory=list)
     
     async def create_multimedia_story(
         self,
@@ -80,9 +72,7 @@ class StoryMultimediaFormatService:
             "created_at": datetime.now().isoformat()
         }
         
-        stories = self._load_stories()
-        stories.append(multimedia_story)
-        self._save_stories(stories)
+        self.multimedia_store.append(multimedia_story)
         
         return {
             "multimedia_id": multimedia_id,
@@ -179,17 +169,3 @@ class StoryMultimediaFormatService:
             })
         
         return slides
-    
-    def _load_stories(self) -> List[Dict]:
-        """Hikayeleri yükler."""
-        try:
-            with open(self.multimedia_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_stories(self, stories: List[Dict]):
-        """Hikayeleri kaydeder."""
-        with open(self.multimedia_file, 'w', encoding='utf-8') as f:
-            json.dump(stories, f, ensure_ascii=False, indent=2)
-
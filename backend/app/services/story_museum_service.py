@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,9 @@ class StoryMuseumService:
     """Hikaye müze ve sergi formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.museums_file = os.path.join(settings.STORAGE_PATH, "story_museums.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.museums_file):
-            with open(self.museums_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.museums_store = get_document_store(self.museums_file, default_factory=list, item_key="museum_id")
     
     async def create_museum_exhibition(
         self,
@@ -63,9 +55,7 @@ class StoryMuseumService:
             "created_at": datetime.now().isoformat()
         }
         
-        museums = self._load_museums()
-        museums.append(museum)
-        self._save_museums(museums)
+        self.museums_store.append(museum)
         
         return {
             "museum_id": museum_id,
@@ -81,8 +71,7 @@ class StoryMuseumService:
         """Sanal tur oluşturur."""
         tour_id = str(uuid.uuid4())
         
-        museums = self._load_museums()
-        museum = next((m for m in museums if m["museum_id"] == museum_id), None)
+        museum = self.museums_store.get_item(museum_id)
         
         if not museum:
             raise ValueError("Müze bulunamadı")
@@ -118,14 +107,16 @@ Her biri için kısa bir açıklama yap:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir müze küratörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_museum"
         )
         
         # Basit parse
@@ -144,17 +135,3 @@ Her biri için kısa bir açıklama yap:
         return artifacts[:10] if artifacts else [
             {"name": "Hikaye Eseri", "description": story_text[:200], "era": "unknown", "significance": ""}
         ]
-    
-    def _load_museums(self) -> List[Dict]:
-        """Müzeleri yükler."""
-        try:
-            with open(self.museums_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_museums(self, museums: List[Dict]):
-        """Müzeleri kaydeder."""
-        with open(self.museums_file, 'w', encoding='utf-8') as f:
-            json.dump(museums, f, ensure_ascii=False, indent=2)
-
@@ -1,8 +1,8 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.music_service import MusicService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,9 @@ class StoryMusicIntegrationService:
     """Hikaye müzik ve şarkı entegrasyonu servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.music_service = MusicService()
         self.music_integrations_file = os.path.join(settings.STORAGE_PATH, "music_integrations.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.music_integrations_file):
-            with open(self.music_integrations_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.music_integrations_store = get_document_store(self.music_integrations_file, default_factory=list)
     
     async def create_story_song(
         self,
@@ -40,14 +32,16 @@ Melodik, eğlenceli ve akılda kalıcı olsun:
 
 Şarkı sözlerini verse-chorus formatında ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir şarkı sözü yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_music_integration"
         )
         
         lyrics = response.choices[0].message.content
@@ -60,9 +54,7 @@ Melodik, eğlenceli ve akılda kalıcı olsun:
             "created_at": datetime.now().isoformat()
         }
         
-        integrations = self._load_integrations()
-        integrations.append(song)
-        self._save_integrations(integrations)
+        self.music_integrations_store.append(song)
         
         return {
             "song_id": song_id,
@@ -101,9 +93,7 @@ Melodik, eğlenceli ve akılda kalıcı olsun:
             "created_at": datetime.now().isoformat()
         }
         
-        integrations = self._load_integrations()
-        integrations.append(integration)
-        self._save_integrations(integrations)
+        self.music_integrations_store.append(integration)
         
         return {
             "integration_id": integration_id,
@@ -157,17 +147,3 @@ Melodik, eğlenceli ve akılda kalıcı olsun:
         
         pattern = "|".join(["X" for _ in range(beats)])
         return pattern
-    
-    def _load_integrations(self) -> List[Dict]:
-        """Entegrasyonları yükler."""
-        try:
-            with open(self.music_integrations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_integrations(self, integrations: List[Dict]):
-        """Entegrasyonları kaydeder."""
-        with open(self.music_integrations_file, 'w', encoding='utf-8') as f:
-            json.dump(integrations, f, ensure_ascii=False, indent=2)
-
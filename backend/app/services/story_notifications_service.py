@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryNotificationsService:
@@ -11,14 +11,7 @@ class StoryNotificationsService:
     
     def __init__(self):
         self.notifications_file = os.path.join(settings.STORAGE_PATH, "story_notifications.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.notifications_file):
-            with open(self.notifications_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.notifications_store = get_document_store(self.notifications_file, default_factory=dict)
     
     async def create_notification(
         self,
@@ -30,11 +23,6 @@ class StoryNotificationsService:
         action_url: Optional[str] = None
     ) -> Dict:
         """Bildirim oluşturur."""
-        notifications = self._load_notifications()
-        
-        if user_id not in notifications:
-            notifications[user_id] = []
-        
         notification = {
             "notification_id": str(uuid.uuid4()),
             "type": notification_type,
@@ -46,8 +34,9 @@ class StoryNotificationsService:
             "created_at": datetime.now().isoformat()
         }
         
-        notifications[user_id].append(notification)
-        self._save_notifications(notifications)
+        self.notifications_store.update(
+            user_id, lambda user_notifications: user_notifications + [notification], default=[]
+        )
         
         return {
             "notification_id": notification["notification_id"],
@@ -61,8 +50,7 @@ class StoryNotificationsService:
         limit: Optional[int] = None
     ) -> List[Dict]:
         """Kullanıcının bildirimlerini getirir."""
-        notifications = self._load_notifications()
-        user_notifications = notifications.get(user_id, [])
+        user_notifications = self.notifications_store.get(user_id, [])
         
         if unread_only:
             user_notifications = [n for n in user_notifications if not n.get("read", False)]
@@ -81,23 +69,26 @@ class StoryNotificationsService:
         user_id: str
     ) -> Dict:
         """Bildirimi okundu olarak işaretler."""
-        notifications = self._load_notifications()
-        
-        if user_id not in notifications:
-            return {"message": "Bildirim bulunamadı"}
+        result = {"found": False}
+        
+        def mark_read(user_notifications: Optional[List[Dict]]) -> Optional[List[Dict]]:
+            if user_notifications is None:
+                return None
+            notification = next(
+                (n for n in user_notifications if n["notification_id"] == notification_id),
+                None
+            )
+            if notification:
+                notification["read"] = True
+                notification["read_at"] = datetime.now().isoformat()
+                result["found"] = True
+            return user_notifications
         
-        notification = next(
-            (n for n in notifications[user_id] if n["notification_id"] == notification_id),
-            None
-        )
+        self.notifications_store.update(user_id, mark_read)
         
-        if not notification:
+        if not result["found"]:
             return {"message": "Bildirim bulunamadı"}
         
-        notification["read"] = True
-        notification["read_at"] = datetime.now().isoformat()
-        self._save_notifications(notifications)
-        
         return {"message": "Bildirim okundu olarak işaretlendi"}
     
     async def mark_all_read(
@@ -105,18 +96,18 @@ class StoryNotificationsService:
         user_id: str
     ) -> Dict:
         """Tüm bildirimleri okundu olarak işaretler."""
-        notifications = self._load_notifications()
-        
-        if user_id not in notifications:
+        def mark_all(user_notifications: Optional[List[Dict]]) -> Optional[List[Dict]]:
+            if user_notifications is None:
+                return None
+            for notification in user_notifications:
+                if not notification.get("read", False):
+                    notification["read"] = True
+                    notification["read_at"] = datetime.now().isoformat()
+            return user_notifications
+        
+        if self.notifications_store.update(user_id, mark_all) is None:
             return {"message": "Bildirim bulunamadı"}
         
-        for notification in notifications[user_id]:
-            if not notification.get("read", False):
-                notification["read"] = True
-                notification["read_at"] = datetime.now().isoformat()
-        
-        self._save_notifications(notifications)
-        
         return {"message": "Tüm bildirimler okundu olarak işaretlendi"}
     
     async def delete_notification(
@@ -125,18 +116,17 @@ class StoryNotificationsService:
         user_id: str
     ) -> Dict:
         """Bildirimi siler."""
-        notifications = self._load_notifications()
-        
-        if user_id not in notifications:
+        def remove(user_notifications: Optional[List[Dict]]) -> Optional[List[Dict]]:
+            if user_notifications is None:
+                return None
+            return [
+                n for n in user_notifications
+                if n["notification_id"] != notification_id
+            ]
+        
+        if self.notifications_store.update(user_id, remove) is None:
             return {"message": "Bildirim bulunamadı"}
         
-        notifications[user_id] = [
-            n for n in notifications[user_id]
-            if n["notification_id"] != notification_id
-        ]
-        
-        self._save_notifications(notifications)
-        
         return {"message": "Bildirim silindi"}
     
     async def get_notification_stats(
@@ -144,8 +134,7 @@ class StoryNotificationsService:
         user_id: str
     ) -> Dict:
         """Bildirim istatistiklerini getirir."""
-        notifications = self._load_notifications()
-        user_notifications = notifications.get(user_id, [])
+        user_notifications = self.notifications_store.get(user_id, [])
         
         total = len(user_notifications)
         unread = len([n for n in user_notifications if not n.get("read", False)])
@@ -155,17 +144,3 @@ class StoryNotificationsService:
             "unread": unread,
             "read": total - unread
         }
-    
-    def _load_notifications(self) -> Dict:
-        """Bildirimleri yükler."""
-        try:
-            with open(self.notifications_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_notifications(self, notifications: Dict):
-        """Bildirimleri kaydeder."""
-        with open(self.notifications_file, 'w', encoding='utf-8') as f:
-            json.dump(notifications, f, ensure_ascii=False, indent=2)
-
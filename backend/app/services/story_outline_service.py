@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
 from app.services.story_service import StoryService
 from app.services.character_service import CharacterService
+from app.core.llm_gateway import llm_gateway
 import json
 
 
@@ -69,17 +70,18 @@ Theme: {theme}
 The summary should be 2-3 paragraphs long and include the main plot, characters, and storyline."""
         
         try:
-            if self.story_service.openai_client:
-                response = self.story_service.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "Sen bir hikâye planlamacısısın. Hikâyeler için özet ve plan oluşturursun."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
+            response = await llm_gateway.chat_completion(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "Sen bir hikâye planlamacısısın. Hikâyeler için özet ve plan oluşturursun."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.7,
+                cache=False,
+                cache_namespace="story_outline"
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Özet üretim hatası: {e}")
         
@@ -123,21 +125,22 @@ Return in JSON format:
 ]"""
         
         try:
-            if self.story_service.openai_client:
-                response = self.story_service.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "Sen bir hikâye planlamacısısın. JSON formatında bölüm planları oluşturursun."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.7
-                )
-                import re
-                json_str = response.choices[0].message.content.strip()
-                json_str = re.sub(r'```json\n?', '', json_str)
-                json_str = re.sub(r'```\n?', '', json_str)
-                return json.loads(json_str)
+            response = await llm_gateway.chat_completion(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "Sen bir hikâye planlamacısısın. JSON formatında bölüm planları oluşturursun."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.7,
+                cache=False,
+                cache_namespace="story_outline"
+            )
+            import re
+            json_str = response.choices[0].message.content.strip()
+            json_str = re.sub(r'```json\n?', '', json_str)
+            json_str = re.sub(r'```\n?', '', json_str)
+            return json.loads(json_str)
         except Exception as e:
             print(f"Bölüm planı üretim hatası: {e}")
         
@@ -186,21 +189,21 @@ Return in JSON format:
 ]"""
         
         try:
-            if self.story_service.openai_client:
-                response = self.story_service.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "Sen bir karakter analizcisisin. Hikâye özetlerinden karakterleri çıkarırsın."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.7
-                )
-                import re
-                json_str = response.choices[0].message.content.strip()
-                json_str = re.sub(r'```json\n?', '', json_str)
-                json_str = re.sub(r'```\n?', '', json_str)
-                return json.loads(json_str)
+            response = await llm_gateway.chat_completion(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "Sen bir karakter analizcisisin. Hikâye özetlerinden karakterleri çıkarırsın."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=400,
+                temperature=0.7,
+                cache_namespace="story_outline"
+            )
+            import re
+            json_str = response.choices[0].message.content.strip()
+            json_str = re.sub(r'```json\n?', '', json_str)
+            json_str = re.sub(r'```\n?', '', json_str)
+            return json.loads(json_str)
         except Exception as e:
             print(f"Karakter çıkarma hatası: {e}")
         
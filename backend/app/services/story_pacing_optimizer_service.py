@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryPacingOptimizerService:
     """Hikaye tempo optimizasyonu servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.pacings_file = os.path.join(settings.STORAGE_PATH, "pacing_optimizations.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryPacingOptimizerService:
     async def optimize_pacing(self, story_id: str, story_text: str, pacing_type: str = "balanced") -> Dict:
         pacing_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayenin temposunu {pacing_type} şekilde optimize et:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir tempo uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.7, max_tokens=2000
+            temperature=0.7, max_tokens=2000, cache=False, cache_namespace="story_pacing_optimizer"
         )
         optimized = response.choices[0].message.content
         return {"pacing_id": pacing_id, "optimized_text": optimized, "pacing_type": pacing_type}
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -11,16 +11,8 @@ class StoryPerformanceMetricsService:
     """Hikaye performans ve metrikler servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.metrics_file = os.path.join(settings.STORAGE_PATH, "story_metrics.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.metrics_file):
-            with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.metrics_store = get_document_store(self.metrics_file, default_factory=dict)
     
     async def track_story_performance(
         self,
@@ -30,35 +22,27 @@ class StoryPerformanceMetricsService:
         metadata: Optional[Dict] = None
     ) -> Dict:
         """Hikaye performansını takip eder."""
-        metrics = self._load_metrics()
-        
-        if story_id not in metrics:
-            metrics[story_id] = {
-                "story_id": story_id,
-                "metrics": {},
-                "timeline": []
-            }
-        
         timestamp = datetime.now().isoformat()
         
-        # Metrik kaydı
-        if metric_type not in metrics[story_id]["metrics"]:
-            metrics[story_id]["metrics"][metric_type] = []
-        
         metric_entry = {
             "value": value,
             "timestamp": timestamp,
             "metadata": metadata or {}
         }
         
-        metrics[story_id]["metrics"][metric_type].append(metric_entry)
-        metrics[story_id]["timeline"].append({
-            "metric_type": metric_type,
-            "value": value,
-            "timestamp": timestamp
-        })
+        def track(story_metrics: Dict) -> Dict:
+            # Metrik kaydı
+            story_metrics["metrics"].setdefault(metric_type, []).append(metric_entry)
+            story_metrics["timeline"].append({
+                "metric_type": metric_type,
+                "value": value,
+                "timestamp": timestamp
+            })
+            return story_metrics
         
-        self._save_metrics(metrics)
+        self.metrics_store.update(
+            story_id, track, default={"story_id": story_id, "metrics": {}, "timeline": []}
+        )
         
         return {
             "message": "Metrik kaydedildi",
@@ -72,8 +56,7 @@ class StoryPerformanceMetricsService:
         metric_types: Optional[List[str]] = None
     ) -> Dict:
         """Hikaye performansını getirir."""
-        metrics = self._load_metrics()
-        story_metrics = metrics.get(story_id, {})
+        story_metrics = self.metrics_store.get(story_id, {})
         
         if not story_metrics:
             return {
@@ -108,8 +91,7 @@ class StoryPerformanceMetricsService:
         story_id: str
     ) -> Dict:
         """Performans içgörüleri oluşturur."""
-        metrics = self._load_metrics()
-        story_metrics = metrics.get(story_id, {})
+        story_metrics = self.metrics_store.get(story_id, {})
         
         if not story_metrics:
             return {"message": "Metrik bulunamadı"}
@@ -162,17 +144,3 @@ class StoryPerformanceMetricsService:
                 insights.append(f"Hikayeniz {share_count} kez paylaşıldı!")
         
         return insights
-    
-    def _load_metrics(self) -> Dict:
-        """Metrikleri yükler."""
-        try:
-            with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_metrics(self, metrics: Dict):
-        """Metrikleri kaydeder."""
-        with open(self.metrics_file, 'w', encoding='utf-8') as f:
-            json.dump(metrics, f, ensure_ascii=False, indent=2)
-
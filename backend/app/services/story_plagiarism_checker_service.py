@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.story_storage import StoryStorage
 import json
 import os
 import uuid
@@ -11,8 +12,8 @@ class StoryPlagiarismCheckerService:
     """Hikaye intihal kontrolü servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.checks_file = os.path.join(settings.STORAGE_PATH, "plagiarism_checks.json")
+        self.story_storage = StoryStorage()
         self._ensure_files()
     
     def _ensure_files(self):
@@ -24,16 +25,24 @@ class StoryPlagiarismCheckerService:
     async def check_plagiarism(self, story_id: str, story_text: str) -> Dict:
         check_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki metinde intihal var mı kontrol et:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir intihal kontrol uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.3, max_tokens=500
+            temperature=0.3, max_tokens=500, cache_namespace="story_plagiarism_checker"
         )
         result = response.choices[0].message.content
-        similarity = self._calculate_similarity(story_text)
-        return {"check_id": check_id, "is_original": similarity < 0.7, "similarity": similarity, "result": result}
+        similarity, similar_story_id = self._calculate_similarity(story_text, story_id)
+        return {
+            "check_id": check_id, "is_original": similarity < 0.7, "similarity": similarity,
+            "most_similar_story_id": similar_story_id, "result": result,
+        }
     
-    def _calculate_similarity(self, text: str) -> float:
-        return 0.3  # Basit implementasyon
+    def _calculate_similarity(self, text: str, story_id: Optional[str] = None):
+        """Kütüphanedeki en yakın hikâyeye benzerlik (MinHash/LSH adayları, gerçek shingle ölçüsü)."""
+        matches, _ = self.story_storage.find_similar_stories(text, exclude_story_id=story_id, threshold=0.1, limit=1)
+        if not matches:
+            return 0.0, None
+        best = matches[0]
+        return round(max(best['similarity'], best['containment']), 4), best.get('story_id')
     
     def _load_checks(self) -> List[Dict]:
         try:
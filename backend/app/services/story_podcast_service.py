@@ -1,7 +1,9 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.tts_service import TTSService
+from app.services.chapter_synthesis import ChapterSynthesisScheduler, build_key
 import json
 import os
 import uuid
@@ -12,11 +14,16 @@ class StoryPodcastService:
     """Hikaye podcast/radyo formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.tts_service = TTSService()
         self.podcasts_file = os.path.join(settings.STORAGE_PATH, "story_podcasts.json")
         self.podcasts_path = os.path.join(settings.STORAGE_PATH, "podcasts")
         self._ensure_files()
+        self.podcasts_store = get_document_store(
+            self.podcasts_file, default_factory=list, item_key="podcast_id"
+        )
+        self.scheduler = ChapterSynthesisScheduler(
+            self.tts_service, os.path.join(self.podcasts_path, "manifests")
+        )
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -36,26 +43,29 @@ class StoryPodcastService:
         narrator_voice: str = "alloy",
         background_music: bool = True
     ) -> Dict:
-        """Hikayeden podcast oluşturur."""
-        podcast_id = str(uuid.uuid4())
+        """
+        Hikayeden podcast oluşturur.
         
+        Bölümler eşzamanlı seslendirilir; aynı girdiyle tekrar çağrı, yarıda
+        kalan yapının bitmiş bölümlerini yeniden üretmeden devam eder.
+        """
         # Hikayeyi bölümlere ayır
         chapters = self._split_into_chapters(story_text)
         
-        # Her bölüm için ses oluştur
-        audio_files = []
-        for i, chapter in enumerate(chapters):
-            audio_url = await self.tts_service.generate_speech(
-                text=chapter,
-                language="tr",
-                story_id=story_id,
-                voice=narrator_voice
-            )
-            audio_files.append({
-                "chapter": i + 1,
+        podcast_id = build_key("podcast", story_id, chapters, narrator_voice)
+        manifest = await self.scheduler.run(podcast_id, [
+            {"text": chapter, "language": "tr", "voice": narrator_voice}
+            for chapter in chapters
+        ])
+        audio_files = [
+            {
+                "chapter": entry["number"],
                 "text": chapter,
-                "audio_url": audio_url
-            })
+                "audio_url": entry["audio_url"],
+                "duration": entry["duration"]
+            }
+            for entry, chapter in zip(manifest["chapters"], chapters)
+        ]
         
         podcast = {
             "podcast_id": podcast_id,
@@ -65,13 +75,13 @@ class StoryPodcastService:
             "intro_music": intro_music,
             "outro_music": outro_music,
             "background_music": background_music,
-            "duration": sum(len(ch["text"]) * 0.1 for ch in audio_files),  # Tahmini süre
+            "duration": manifest["total_duration"],
             "created_at": datetime.now().isoformat()
         }
         
-        podcasts = self._load_podcasts()
-        podcasts.append(podcast)
-        self._save_podcasts(podcasts)
+        # Aynı yapı tekrar oluşturulduysa eski kayıt yenisiyle değişir
+        if not self.podcasts_store.update_item(podcast_id, lambda _: podcast):
+            self.podcasts_store.append(podcast)
         
         return {
             "podcast_id": podcast_id,
@@ -159,19 +169,4 @@ class StoryPodcastService:
     
     async def get_podcast(self, podcast_id: str) -> Optional[Dict]:
         """Podcast'i getirir."""
-        podcasts = self._load_podcasts()
-        return next((p for p in podcasts if p["podcast_id"] == podcast_id), None)
-    
-    def _load_podcasts(self) -> List[Dict]:
-        """Podcast'leri yükler."""
-        try:
-            with open(self.podcasts_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_podcasts(self, podcasts: List[Dict]):
-        """Podcast'leri kaydeder."""
-        with open(self.podcasts_file, 'w', encoding='utf-8') as f:
-            json.dump(podcasts, f, ensure_ascii=False, indent=2)
-
+        return self.podcasts_store.get_item(podcast_id)
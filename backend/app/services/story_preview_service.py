@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryPreviewService:
     """Hikaye önizleme ve canlı düzenleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.previews_file = os.path.join(settings.STORAGE_PATH, "story_previews.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.previews_file):
-            with open(self.previews_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.previews_store = get_document_store(
+            self.previews_file, default_factory=list, item_key="preview_id"
+        )
     
     async def create_preview(
         self,
@@ -41,9 +35,7 @@ class StoryPreviewService:
             "updated_at": datetime.now().isoformat()
         }
         
-        previews = self._load_previews()
-        previews.append(preview)
-        self._save_previews(previews)
+        self.previews_store.append(preview)
         
         return {
             "preview_id": preview_id,
@@ -57,24 +49,23 @@ class StoryPreviewService:
         new_text: str
     ) -> Dict:
         """Önizlemeyi günceller."""
-        previews = self._load_previews()
-        preview = next((p for p in previews if p["preview_id"] == preview_id), None)
+        def apply(preview: Dict) -> Dict:
+            change = {
+                "timestamp": datetime.now().isoformat(),
+                "old_text": preview["preview_text"],
+                "new_text": new_text
+            }
+            
+            preview["preview_text"] = new_text
+            preview["changes"].append(change)
+            preview["updated_at"] = datetime.now().isoformat()
+            return preview
+        
+        preview = self.previews_store.update_item(preview_id, apply)
         
         if not preview:
             raise ValueError("Önizleme bulunamadı")
         
-        change = {
-            "timestamp": datetime.now().isoformat(),
-            "old_text": preview["preview_text"],
-            "new_text": new_text
-        }
-        
-        preview["preview_text"] = new_text
-        preview["changes"].append(change)
-        preview["updated_at"] = datetime.now().isoformat()
-        
-        self._save_previews(previews)
-        
         return {
             "preview_id": preview_id,
             "preview_text": new_text,
@@ -86,8 +77,7 @@ class StoryPreviewService:
         preview_id: str
     ) -> Dict:
         """Önizlemeyi hikayeye uygular."""
-        previews = self._load_previews()
-        preview = next((p for p in previews if p["preview_id"] == preview_id), None)
+        preview = self.previews_store.get_item(preview_id)
         
         if not preview:
             raise ValueError("Önizleme bulunamadı")
@@ -104,8 +94,7 @@ class StoryPreviewService:
         suggestion_type: str = "improvement"
     ) -> List[Dict]:
         """AI ile önizleme önerileri alır."""
-        previews = self._load_previews()
-        preview = next((p for p in previews if p["preview_id"] == preview_id), None)
+        preview = self.previews_store.get_item(preview_id)
         
         if not preview:
             raise ValueError("Önizleme bulunamadı")
@@ -116,14 +105,16 @@ class StoryPreviewService:
 
 Önerileri liste halinde ver."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye editörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_preview"
         )
         
         suggestions_text = response.choices[0].message.content
@@ -139,21 +130,6 @@ class StoryPreviewService:
         
         return suggestions
     
-    def _load_previews(self) -> List[Dict]:
-        """Önizlemeleri yükler."""
-        try:
-            with open(self.previews_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_previews(self, previews: List[Dict]):
-        """Önizlemeleri kaydeder."""
-        with open(self.previews_file, 'w', encoding='utf-8') as f:
-            json.dump(previews, f, ensure_ascii=False, indent=2)
-    
     async def get_preview(self, preview_id: str) -> Optional[Dict]:
         """Önizlemeyi getirir."""
-        previews = self._load_previews()
-        return next((p for p in previews if p["preview_id"] == preview_id), None)
-
+        return self.previews_store.get_item(preview_id)
@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,9 @@ class StoryPrintService:
     """Hikaye yazdırma ve fiziksel kitap oluşturma servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.print_orders_file = os.path.join(settings.STORAGE_PATH, "print_orders.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.print_orders_file):
-            with open(self.print_orders_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.print_orders_store = get_document_store(self.print_orders_file, default_factory=list)
     
     async def create_printable_book(
         self,
@@ -138,9 +130,7 @@ class StoryPrintService:
             "created_at": datetime.now().isoformat()
         }
         
-        orders = self._load_orders()
-        orders.append(order)
-        self._save_orders(orders)
+        self.print_orders_store.append(order)
         
         return {
             "order_id": order_id,
@@ -191,17 +181,3 @@ class StoryPrintService:
             scenes = [s.strip() + '.' for s in sentences if s.strip()][:10]
         
         return scenes
-    
-    def _load_orders(self) -> List[Dict]:
-        """Siparişleri yükler."""
-        try:
-            with open(self.print_orders_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_orders(self, orders: List[Dict]):
-        """Siparişleri kaydeder."""
-        with open(self.print_orders_file, 'w', encoding='utf-8') as f:
-            json.dump(orders, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryQualityScorerService:
     """Hikaye kalite skorlama servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.scores_file = os.path.join(settings.STORAGE_PATH, "quality_scores.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryQualityScorerService:
     async def score_story(self, story_id: str, story_text: str) -> Dict:
         score_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayeyi 1-10 arası puanla:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir hikaye değerlendirme uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.5, max_tokens=500
+            temperature=0.5, max_tokens=500, cache=False, cache_namespace="story_quality_scorer"
         )
         score_text = response.choices[0].message.content
         score = self._extract_score(score_text)
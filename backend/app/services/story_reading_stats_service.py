@@ -1,9 +1,9 @@
 from typing import Dict, List, Optional
-import json
 import os
 import uuid
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StoryReadingStatsService:
@@ -11,14 +11,7 @@ class StoryReadingStatsService:
     
     def __init__(self):
         self.reading_stats_file = os.path.join(settings.STORAGE_PATH, "reading_stats.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.reading_stats_file):
-            with open(self.reading_stats_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.reading_stats_store = get_document_store(self.reading_stats_file)
     
     async def record_reading_session(
         self,
@@ -29,17 +22,6 @@ class StoryReadingStatsService:
         completion_percentage: Optional[float] = None
     ) -> Dict:
         """Okuma oturumunu kaydeder."""
-        stats = self._load_stats()
-        
-        if story_id not in stats:
-            stats[story_id] = {
-                "story_id": story_id,
-                "total_reads": 0,
-                "total_duration": 0,
-                "unique_readers": set(),
-                "reading_sessions": []
-            }
-        
         session = {
             "session_id": str(uuid.uuid4()),
             "user_id": user_id,
@@ -49,15 +31,22 @@ class StoryReadingStatsService:
             "timestamp": datetime.now().isoformat()
         }
         
-        stats[story_id]["reading_sessions"].append(session)
-        stats[story_id]["total_reads"] += 1
-        stats[story_id]["total_duration"] += duration_seconds
-        stats[story_id]["unique_readers"].add(user_id)
+        def record(story_stats: Dict) -> Dict:
+            story_stats["reading_sessions"].append(session)
+            story_stats["total_reads"] += 1
+            story_stats["total_duration"] += duration_seconds
+            # Okuyucular JSON'a uygun olarak liste halinde tutulur
+            if user_id not in story_stats["unique_readers"]:
+                story_stats["unique_readers"].append(user_id)
+            return story_stats
         
-        # Set'i JSON'a uygun hale getir
-        stats[story_id]["unique_readers"] = list(stats[story_id]["unique_readers"])
-        
-        self._save_stats(stats)
+        self.reading_stats_store.update(story_id, record, default={
+            "story_id": story_id,
+            "total_reads": 0,
+            "total_duration": 0,
+            "unique_readers": [],
+            "reading_sessions": []
+        })
         
         return {
             "session_id": session["session_id"],
@@ -69,8 +58,7 @@ class StoryReadingStatsService:
         story_id: str
     ) -> Dict:
         """Hikaye okuma istatistiklerini getirir."""
-        stats = self._load_stats()
-        story_stats = stats.get(story_id, {})
+        story_stats = self.reading_stats_store.get(story_id, {})
         
         if not story_stats:
             return {
@@ -100,11 +88,10 @@ class StoryReadingStatsService:
         days: int = 30
     ) -> Dict:
         """Kullanıcı okuma istatistiklerini getirir."""
-        stats = self._load_stats()
         cutoff_date = datetime.now() - timedelta(days=days)
         
         user_sessions = []
-        for story_id, story_stats in stats.items():
+        for story_id, story_stats in self.reading_stats_store.scan():
             for session in story_stats.get("reading_sessions", []):
                 if session["user_id"] == user_id:
                     session_date = datetime.fromisoformat(session["timestamp"])
@@ -130,29 +117,3 @@ class StoryReadingStatsService:
         
         completed = len([s for s in sessions if s.get("completion_percentage", 0) >= 90])
         return round((completed / len(sessions)) * 100, 2)
-    
-    def _load_stats(self) -> Dict:
-        """İstatistikleri yükler."""
-        try:
-            with open(self.reading_stats_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Set'leri geri yükle
-                for story_id, story_stats in data.items():
-                    if "unique_readers" in story_stats and isinstance(story_stats["unique_readers"], list):
-                        story_stats["unique_readers"] = set(story_stats["unique_readers"])
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_stats(self, stats: Dict):
-        """İstatistikleri kaydeder."""
-        # Set'leri listeye çevir
-        stats_copy = {}
-        for story_id, story_stats in stats.items():
-            stats_copy[story_id] = story_stats.copy()
-            if "unique_readers" in stats_copy[story_id]:
-                stats_copy[story_id]["unique_readers"] = list(stats_copy[story_id]["unique_readers"])
-        
-        with open(self.reading_stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats_copy, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 import os
@@ -12,7 +12,6 @@ class StoryRecommendationEngineService:
     """Gelişmiş hikaye öneri motoru servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
         self.recommendations_file = os.path.join(settings.STORAGE_PATH, "story_recommendations.json")
         self._ensure_files()
@@ -46,30 +45,22 @@ class StoryRecommendationEngineService:
         limit: int
     ) -> List[Dict]:
         """Okuma geçmişine göre önerir."""
-        # Kullanıcının okuduğu hikayeleri al
-        all_stories = self.story_storage.get_all_stories()
-        user_stories = [s for s in all_stories if s.get("user_id") == user_id]
+        # Kullanıcının hikayelerindeki temalar (çoktan aza)
+        themes = self.story_storage.get_user_themes(user_id)
         
-        if not user_stories:
+        if not themes:
             # İlk kullanıcı için popüler hikayeler
-            return all_stories[:limit]
-        
-        # Okunan hikayelerin temalarını analiz et
-        themes = {}
-        for story in user_stories:
-            theme = story.get("theme", "genel")
-            themes[theme] = themes.get(theme, 0) + 1
+            return self.story_storage.recommend_stories(user_id, limit=limit)
         
         # En çok okunan temaya göre öner
-        favorite_theme = max(themes, key=themes.get) if themes else "genel"
-        
-        recommendations = [
-            s for s in all_stories
-            if s.get("theme") == favorite_theme
-            and s.get("story_id") not in [us.get("story_id") for us in user_stories]
-        ]
+        favorite_theme = themes[0][0]
         
-        return recommendations[:limit]
+        return self.story_storage.recommend_stories(
+            user_id,
+            themes=[favorite_theme],
+            limit=limit,
+            require_theme=True
+        )
     
     async def _recommend_based_on_preferences(
         self,
@@ -77,14 +68,11 @@ class StoryRecommendationEngineService:
         limit: int
     ) -> List[Dict]:
         """Tercihlere göre önerir."""
-        # Kullanıcı tercihlerini al (varsa)
-        all_stories = self.story_storage.get_all_stories()
-        
-        # AI ile öneri oluştur
-        user_stories = [s for s in all_stories if s.get("user_id") == user_id]
+        # Kullanıcının hikayeleri (yeniden eskiye)
+        user_stories = self.story_storage.get_user_stories(user_id)
         
         if not user_stories:
-            return all_stories[:limit]
+            return self.story_storage.recommend_stories(user_id, limit=limit)
         
         # Kullanıcının hikayelerini analiz et
         themes_text = ", ".join([s.get("theme", "") for s in user_stories[:5]])
@@ -92,23 +80,20 @@ class StoryRecommendationEngineService:
         prompt = f"""Kullanıcı şu temalarda hikayeler okumuş: {themes_text}
 Bu kullanıcıya benzer temalarda yeni hikaye önerileri yap."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye öneri uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_recommendation_engine"
         )
         
-        # Basit eşleştirme
-        recommendations = [
-            s for s in all_stories
-            if s.get("story_id") not in [us.get("story_id") for us in user_stories]
-        ]
-        
-        return recommendations[:limit]
+        # Okunan temalar skorda öne çıkar
+        return self.story_storage.recommend_stories(user_id, limit=limit)
     
     async def _recommend_similar_stories(
         self,
@@ -116,25 +101,14 @@ Bu kullanıcıya benzer temalarda yeni hikaye önerileri yap."""
         limit: int
     ) -> List[Dict]:
         """Benzer hikayeler önerir."""
-        all_stories = self.story_storage.get_all_stories()
-        user_stories = [s for s in all_stories if s.get("user_id") == user_id]
+        user_stories = self.story_storage.get_user_stories(user_id)
         
         if not user_stories:
-            return all_stories[:limit]
+            return self.story_storage.recommend_stories(user_id, limit=limit)
         
-        # En son okunan hikayeyi al
-        latest_story = user_stories[-1]
-        theme = latest_story.get("theme", "")
-        story_type = latest_story.get("story_type", "")
-        
-        # Benzer temalı hikayeleri bul
-        similar = [
-            s for s in all_stories
-            if (s.get("theme") == theme or s.get("story_type") == story_type)
-            and s.get("story_id") != latest_story.get("story_id")
-        ]
-        
-        return similar[:limit]
+        # En son okunan hikayeye benzerler
+        latest_story = user_stories[0]
+        return self.story_storage.get_similar_stories(latest_story.get("story_id"), limit=limit)
     
     async def get_trending_stories(
         self,
@@ -142,16 +116,8 @@ Bu kullanıcıya benzer temalarda yeni hikaye önerileri yap."""
         limit: int = 10
     ) -> List[Dict]:
         """Trend hikayeleri getirir."""
-        all_stories = self.story_storage.get_all_stories()
-        
         # Basit trending (son oluşturulanlar)
-        recent_stories = sorted(
-            all_stories,
-            key=lambda x: x.get("created_at", ""),
-            reverse=True
-        )
-        
-        return recent_stories[:limit]
+        return self.story_storage.get_all_stories(limit=limit)
     
     def _load_recommendations(self) -> Dict:
         """Önerileri yükler."""
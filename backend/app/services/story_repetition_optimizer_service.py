@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryRepetitionOptimizerService:
     """Hikaye tekrar optimizasyonu servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.repetitions_file = os.path.join(settings.STORAGE_PATH, "repetitions.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryRepetitionOptimizerService:
     async def optimize_repetition(self, story_id: str, story_text: str) -> Dict:
         rep_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayedeki gereksiz tekrarları azalt, gerekli tekrarları koru:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir tekrar optimizasyon uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.6, max_tokens=2000
+            temperature=0.6, max_tokens=2000, cache=False, cache_namespace="story_repetition_optimizer"
         )
         optimized = response.choices[0].message.content
         return {"rep_id": rep_id, "optimized_text": optimized}
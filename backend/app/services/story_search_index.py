@@ -0,0 +1,496 @@
+import base64
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+# ---------------------------------------------------------------------- #
+# Türkçe metin analizi
+# ---------------------------------------------------------------------- #
+
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+_APOSTROPHE_SUFFIX_RE = re.compile(r"['’][^\W\d_]+", re.UNICODE)
+_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+STOPWORDS = frozenset("""
+acaba ama ancak bana bazı belki ben beni benim bir biri birkaç birşey biz bize
+bizi bu buna bunda bundan bunu bunun çok çünkü da daha de defa diye en gibi
+hem hep hepsi her hiç için ile ise kadar ki kim mı mi mu mü nasıl ne neden
+nerde nerede nereye niye o ona ondan onlar onları onu onun sanki şey siz şu
+tüm ve veya ya yani
+""".split())
+
+# Çekim ekleri (çoğul, hâl, iyelik, ile); en uzundan kısaya denenir
+_SUFFIXES = sorted("""
+larından lerinden larında lerinde larına lerine larını lerini ların lerin
+ları leri lar ler
+ından inden undan ünden dan den tan ten
+ında inde unda ünde da de ta te
+daki deki taki teki
+ının inin unun ünün ın in un ün
+yla yle la le yı yi yu yü ya ye
+sı si su sü ı i u ü a e
+""".split(), key=len, reverse=True)
+
+MIN_STEM = 3
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe küçük harf dönüşümü (I -> ı, İ -> i)."""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def fold(token: str) -> str:
+    """Türkçe karakterleri ASCII karşılığına indirger (çocuk -> cocuk)."""
+    return token.translate(_FOLD)
+
+
+def stem(token: str) -> str:
+    """
+    Sözlüksüz hafif gövdeleme: çekim eklerini en fazla üç tur soyar, gövde en
+    az MIN_STEM harf kalır. Sorgu ve doküman aynı fonksiyondan geçtiği için
+    aşırı gövdeleme eşleşmeyi bozmaz (kediler / kedinin / kediyi -> ked).
+    Sondaki ğ, k'ye döndürülür (çocuğun -> çocuk).
+    """
+    for _ in range(3):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+                token = token[: -len(suffix)]
+                break
+        else:
+            break
+    # Ünsüz yumuşaması: çocuğ(un) -> çocuk (ç/c farkını fold zaten giderir)
+    if token.endswith("ğ"):
+        token = token[:-1] + "k"
+    return token
+
+
+def analyze(text: str) -> List[Tuple[str, str]]:
+    """Metni (yüzey, terim) çiftlerine ayırır; yüzey = fold(kelime), terim = fold(stem(kelime))."""
+    # Özel isimlerdeki ekler: "Ali'nin" -> "Ali"
+    text = _APOSTROPHE_SUFFIX_RE.sub("", turkish_lower(text or ""))
+    pairs = []
+    for token in _WORD_RE.findall(text):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        pairs.append(_analyze_token(token))
+    return pairs
+
+
+@lru_cache(maxsize=200_000)
+def _analyze_token(token: str) -> Tuple[str, str]:
+    # Kelime dağılımı Zipf'e uyduğu için önbellek isabeti çok yüksek
+    return fold(token), fold(stem(token))
+
+
+def analyze_terms(text: str) -> List[str]:
+    return [term for _, term in analyze(text)]
+
+
+def _deletes(term: str) -> Set[str]:
+    """Tek harf silinmiş varyantlar (1 düzenleme mesafesi için SymSpell anahtarı)."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _edit_distance_le1(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        # Yer değiştirme (transpozisyon)
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    return any(b[:i] + b[i + 1:] == a for i in range(len(b)))
+
+
+# ---------------------------------------------------------------------- #
+# İndeks
+# ---------------------------------------------------------------------- #
+
+class StorySearchIndex:
+    """
+    Hikâyeler için artımlı ters indeks (BM25, önek ve bulanık eşleşme).
+
+    - Terimler `analyze` ile üretilir; tema kelimeleri THEME_BOOST ile ağırlıklanır
+    - Postings terim başına sıralı `array` (doc no, tf) çiftleridir; silinen ve
+      güncellenen dokümanlar mezar taşı ile işaretlenir, oran yükselince
+      postings sıkıştırılır
+    - Önek: katlanmış yüzey biçimlerinin sıralı listesi üzerinde ikili arama
+    - Bulanık: terim sözlüğünde 1 düzenleme mesafesi (silme komşuluğu)
+    - Kalıcılık: `save`/`load`; her doküman içerik parmak iziyle saklanır,
+      yeniden başlatmada yalnızca değişen hikâyeler yeniden analiz edilir
+
+    Eşzamanlılık `StoryLogStore` kilidiyle sağlanır.
+    """
+
+    FORMAT_VERSION = 1
+    THEME_BOOST = 3
+    K1 = 1.2
+    B = 0.75
+    PREFIX_WEIGHT = 0.8
+    FUZZY_WEIGHT = 0.6
+    MAX_EXPANSIONS = 32
+    COMPACT_DEAD_RATIO = 0.2
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._clear()
+        self._stale: Optional[Set[str]] = None
+        self.dirty = False
+
+    def _clear(self):
+        self._doc_ids: Dict[str, int] = {}        # story_id -> doc no
+        self._doc_story: Dict[int, str] = {}      # doc no -> story_id
+        self._doc_fp: Dict[str, int] = {}         # story_id -> içerik parmak izi
+        self._doc_len = array("I")                # doc no -> terim sayısı
+        self._next_doc = 0
+        self._dead: Set[int] = set()
+        self._total_len = 0
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._df: Dict[str, int] = defaultdict(int)
+        self._surfaces: Dict[str, str] = {}       # yüzey -> terim
+        self._sorted_surfaces: List[str] = []
+        self._delete_map: Dict[str, Set[str]] = defaultdict(set)
+
+    # ------------------------------------------------------------------ #
+    # Bakım
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def fingerprint(story: Dict) -> int:
+        content = f"{story.get('theme') or ''}\x00{story.get('story_text') or ''}"
+        return zlib.crc32(content.encode("utf-8"))
+
+    def _term_counts(self, story: Dict) -> Tuple[Dict[str, int], Dict[str, str]]:
+        counts: Dict[str, int] = defaultdict(int)
+        surfaces: Dict[str, str] = {}
+        for weight, field in ((self.THEME_BOOST, story.get("theme")), (1, story.get("story_text"))):
+            for surface, term in analyze(field or ""):
+                counts[term] += weight
+                surfaces[surface] = term
+        return counts, surfaces
+
+    def _add_term(self, term: str):
+        for variant in _deletes(term):
+            self._delete_map[variant].add(term)
+
+    def _drop_term(self, term: str):
+        for variant in _deletes(term):
+            terms = self._delete_map.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._delete_map[variant]
+
+    def add(self, story: Dict, previous: Optional[Dict] = None):
+        """
+        Hikâyeyi indeksler ya da günceller; içerik değişmediyse hiçbir şey yapmaz.
+        ``previous`` eski kayıttır, df değerlerini doğrudan düşmek için kullanılır.
+        """
+        story_id = story.get("story_id")
+        if story_id is None:
+            return
+        if self._stale is not None:
+            self._stale.discard(story_id)
+        fp = self.fingerprint(story)
+        if self._doc_fp.get(story_id) == fp:
+            return
+        self.remove(story_id, previous)
+
+        counts, surfaces = self._term_counts(story)
+        doc = self._next_doc
+        self._next_doc += 1
+        self._doc_ids[story_id] = doc
+        self._doc_story[doc] = story_id
+        self._doc_fp[story_id] = fp
+        length = sum(counts.values())
+        self._doc_len.append(length)
+        self._total_len += length
+
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = (array("I"), array("I"))
+                self._postings[term] = postings
+                self._add_term(term)
+            # Doc numaraları artan verildiği için append sıralı kalır
+            postings[0].append(doc)
+            postings[1].append(tf)
+            self._df[term] += 1
+
+        for surface, term in surfaces.items():
+            if surface not in self._surfaces:
+                bisect.insort(self._sorted_surfaces, surface)
+            self._surfaces[surface] = term
+        self.dirty = True
+
+    def remove(self, story_id: str, story: Optional[Dict] = None):
+        """
+        Hikâyeyi indeksten düşer. ``story`` (eski içerik) verilirse df değerleri
+        hemen güncellenir; verilmezse bir sonraki sıkıştırmada düzelir.
+        """
+        doc = self._doc_ids.pop(story_id, None)
+        if doc is None:
+            return
+        del self._doc_story[doc]
+        indexed_fp = self._doc_fp.pop(story_id, None)
+        self._dead.add(doc)
+        self._total_len -= self._doc_len[doc]
+        # Eski içerik indekslenenle aynıysa terimleri yeniden üretilebilir
+        if story is not None and self.fingerprint(story) == indexed_fp:
+            for term in self._term_counts(story)[0]:
+                if self._df.get(term, 0) > 0:
+                    self._df[term] -= 1
+        self.dirty = True
+        if len(self._dead) > self.COMPACT_DEAD_RATIO * max(len(self._doc_ids), 1000):
+            self.compact()
+
+    def compact(self):
+        """Mezar taşlı dokümanları postings'ten temizler ve df'yi yeniden sayar."""
+        if not self._dead:
+            return
+        dead = self._dead
+        for term in list(self._postings):
+            docs, tfs = self._postings[term]
+            keep_docs, keep_tfs = array("I"), array("I")
+            for doc, tf in zip(docs, tfs):
+                if doc not in dead:
+                    keep_docs.append(doc)
+                    keep_tfs.append(tf)
+            if keep_docs:
+                self._postings[term] = (keep_docs, keep_tfs)
+                self._df[term] = len(keep_docs)
+            else:
+                del self._postings[term]
+                self._df.pop(term, None)
+                self._drop_term(term)
+        self._dead = set()
+        # Artık hiçbir terime işaret etmeyen yüzey biçimlerini at
+        stale = [s for s, t in self._surfaces.items() if t not in self._postings]
+        if stale:
+            for surface in stale:
+                del self._surfaces[surface]
+            self._sorted_surfaces = sorted(self._surfaces)
+        self.dirty = True
+
+    def begin_rebuild(self):
+        """Tam yeniden yüklemeden önce çağrılır; add() ile görülmeyenler end_rebuild'de silinir."""
+        self._stale = set(self._doc_ids)
+
+    def end_rebuild(self):
+        stale, self._stale = self._stale or set(), None
+        for story_id in stale:
+            self.remove(story_id)
+        if stale:
+            self.compact()
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self._doc_ids
+
+    # ------------------------------------------------------------------ #
+    # Sorgu
+    # ------------------------------------------------------------------ #
+
+    def _expand(self, surface: str, term: str, prefix: bool, fuzzy: bool) -> Dict[str, float]:
+        """Bir sorgu kelimesini ağırlıklı indeks terimlerine genişletir."""
+        expansions: Dict[str, float] = {}
+        if term in self._postings:
+            expansions[term] = 1.0
+        if prefix and len(surface) >= 2:
+            start = bisect.bisect_left(self._sorted_surfaces, surface)
+            for candidate in self._sorted_surfaces[start:start + self.MAX_EXPANSIONS * 4]:
+                if not candidate.startswith(surface):
+                    break
+                mapped = self._surfaces[candidate]
+                if mapped in self._postings and mapped not in expansions:
+                    expansions[mapped] = self.PREFIX_WEIGHT
+                if len(expansions) >= self.MAX_EXPANSIONS:
+                    break
+        if fuzzy and not expansions and len(term) >= 4:
+            candidates = set(self._delete_map.get(term, ()))
+            for variant in _deletes(term) | {term}:
+                candidates.update(self._delete_map.get(variant, ()))
+                if variant in self._postings:
+                    candidates.add(variant)
+            for candidate in candidates:
+                if candidate in self._postings and _edit_distance_le1(term, candidate):
+                    expansions[candidate] = self.FUZZY_WEIGHT
+        return expansions
+
+    def _idf(self, term: str) -> float:
+        n = max(len(self._doc_ids), 1)
+        df = max(min(self._df.get(term, 0), n), 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _score_term(self, term: str, weight: float, scores: Dict[int, float], restrict: Optional[Dict[int, float]]):
+        docs, tfs = self._postings[term]
+        avgdl = self._total_len / max(len(self._doc_ids), 1) or 1.0
+        # BM25: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avgdl))
+        scale = self._idf(term) * weight * (self.K1 + 1)
+        base = self.K1 * (1 - self.B)
+        per_len = self.K1 * self.B / avgdl
+        doc_len = self._doc_len
+        dead = self._dead
+        get = scores.get
+
+        if restrict is not None and len(restrict) * 8 < len(docs):
+            # Aday kümesi küçükse postings'i taramak yerine ikili arama
+            size = len(docs)
+            for doc in restrict:
+                i = bisect.bisect_left(docs, doc)
+                if i < size and docs[i] == doc:
+                    tf = tfs[i]
+                    value = scale * tf / (tf + base + per_len * doc_len[doc])
+                    if value > get(doc, 0.0):
+                        scores[doc] = value
+            return
+        for doc, tf in zip(docs, tfs):
+            if dead and doc in dead:
+                continue
+            if restrict is not None and doc not in restrict:
+                continue
+            value = scale * tf / (tf + base + per_len * doc_len[doc])
+            if value > get(doc, 0.0):
+                scores[doc] = value
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        prefix: bool = True,
+        fuzzy: bool = True,
+        match_all: bool = True,
+        allowed: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 ile sıralı (story_id, skor) listesi döner.
+
+        Son sorgu kelimesi önek olarak da eşleşir (yazarken arama); sözlükte
+        karşılığı olmayan kelimeler 1 harf hatayla eşleşir. ``match_all``
+        her kelimenin eşleşmesini ister (AND), aksi halde OR.
+        """
+        pairs = analyze(query)
+        if not pairs:
+            return []
+        groups = []
+        for index, (surface, term) in enumerate(pairs):
+            is_last = index == len(pairs) - 1
+            expansions = self._expand(surface, term, prefix and is_last, fuzzy)
+            if not expansions:
+                if match_all:
+                    return []
+                continue
+            groups.append(expansions)
+        if not groups:
+            return []
+
+        # En seçici grup önce: AND'de aday kümesi hızla küçülür
+        groups.sort(key=lambda g: sum(len(self._postings[t][0]) for t in g))
+        totals: Optional[Dict[int, float]] = None
+        for expansions in groups:
+            group_scores: Dict[int, float] = {}
+            restrict = totals if match_all else None
+            for term, weight in expansions.items():
+                self._score_term(term, weight, group_scores, restrict)
+            if totals is None:
+                totals = group_scores
+            elif match_all:
+                totals = {doc: totals[doc] + s for doc, s in group_scores.items() if doc in totals}
+            else:
+                for doc, s in group_scores.items():
+                    totals[doc] = totals.get(doc, 0.0) + s
+            if match_all and not totals:
+                return []
+
+        results = (
+            (self._doc_story[doc], score)
+            for doc, score in totals.items()
+            if doc in self._doc_story
+        )
+        if allowed is not None:
+            results = ((sid, score) for sid, score in results if sid in allowed)
+        if limit is not None:
+            return heapq.nlargest(limit, results, key=lambda item: item[1])
+        return sorted(results, key=lambda item: item[1], reverse=True)
+
+    def matches(self, query: str, match_all: bool = True) -> Set[str]:
+        return {story_id for story_id, _ in self.search(query, match_all=match_all)}
+
+    # ------------------------------------------------------------------ #
+    # Kalıcılık
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _pack(values: array) -> str:
+        return base64.b64encode(values.tobytes()).decode("ascii")
+
+    @staticmethod
+    def _unpack(data: str) -> array:
+        values = array("I")
+        values.frombytes(base64.b64decode(data))
+        return values
+
+    def save(self):
+        if not self.path:
+            return
+        self.compact()
+        payload = {
+            "version": self.FORMAT_VERSION,
+            "itemsize": array("I").itemsize,
+            "docs": {sid: [doc, self._doc_fp[sid]] for sid, doc in self._doc_ids.items()},
+            "doc_len": self._pack(self._doc_len),
+            "next_doc": self._next_doc,
+            "postings": {t: [self._pack(d), self._pack(f)] for t, (d, f) in self._postings.items()},
+            "surfaces": self._surfaces,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def load(self) -> bool:
+        """Kalıcı indeksi yükler; dosya yok ya da uyumsuzsa False döner."""
+        if not self.path:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if payload.get("version") != self.FORMAT_VERSION or payload.get("itemsize") != array("I").itemsize:
+            return False
+
+        self._clear()
+        for story_id, (doc, fp) in payload["docs"].items():
+            self._doc_ids[story_id] = doc
+            self._doc_story[doc] = story_id
+            self._doc_fp[story_id] = fp
+        self._doc_len = self._unpack(payload["doc_len"])
+        self._next_doc = payload["next_doc"]
+        self._dead = set(range(self._next_doc)) - set(self._doc_story)
+        self._total_len = sum(self._doc_len[doc] for doc in self._doc_story)
+        for term, (docs, tfs) in payload["postings"].items():
+            self._postings[term] = (self._unpack(docs), self._unpack(tfs))
+            self._df[term] = len(self._postings[term][0])
+            self._add_term(term)
+        self._surfaces = payload["surfaces"]
+        self._sorted_surfaces = sorted(self._surfaces)
+        self.dirty = False
+        return True
@@ -1,3 +1,5 @@
+from typing import AsyncIterator, Optional
+
 from openai import AsyncOpenAI
 
 try:
@@ -76,7 +78,7 @@ class StoryService:
             age_group=age_group, pedagogical_theme=pedagogical_theme
         )
 
-        effective_model = (model_override or getattr(settings, "GPT_MODEL", "") or "").strip() or settings.GPT_MODEL
+        effective_model = self._effective_model(model_override)
         gpt_model_lower = effective_model.lower()
         use_wiro_run = "gpt-oss" in gpt_model_lower or "gpt-5-nano" in gpt_model_lower
 
@@ -148,6 +150,78 @@ class StoryService:
 
         return self._generate_fallback_story(theme, language)
 
+    async def stream_story(
+        self,
+        theme: str,
+        language: str = "tr",
+        story_type: str = "masal",
+        creativity: float = 0.8,
+        pacing: str = "medium",
+        perspective: str = "third",
+        vocabulary: str = "normal",
+        age_group: str = "3-6",
+        pedagogical_theme: str = None,
+        model_override: str = None
+    ) -> AsyncIterator[str]:
+        """
+        Hikayeyi parça parça (token delta) üretir; ilk paragraf tüm metin
+        bitmeden istemciye ulaşır.
+
+        Önce OpenAI uyumlu streaming denenir (Wiro modelleri dahil). Akış hiç
+        başlamadan başarısız olursa generate_story (Wiro run_and_wait) sonucu
+        paragraf paragraf verilir.
+        """
+        prompt = self._create_prompt(
+            theme, language, story_type, pacing, perspective, vocabulary,
+            age_group=age_group, pedagogical_theme=pedagogical_theme
+        )
+        effective_model = self._effective_model(model_override)
+
+        if self.final_client:
+            produced = False
+            try:
+                stream = await self.final_client.chat.completions.create(
+                    model=effective_model,
+                    messages=[
+                        {"role": "system", "content": "Sen usta bir hikaye yazarısın."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=2000,
+                    temperature=creativity,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        produced = True
+                        yield delta
+                if produced:
+                    return
+            except Exception as e:
+                if produced:
+                    # Yarım kalan akış tekrar başlatılamaz; istemci hatayı görsün
+                    raise
+                print(f"Streaming story generation error: {e}")
+
+        story_text = await self.generate_story(
+            theme, language, story_type,
+            creativity=creativity,
+            pacing=pacing,
+            perspective=perspective,
+            vocabulary=vocabulary,
+            age_group=age_group,
+            pedagogical_theme=pedagogical_theme,
+            model_override=model_override
+        )
+        paragraphs = [p for p in story_text.split("\n\n") if p.strip()] or [story_text]
+        for index, paragraph in enumerate(paragraphs):
+            yield paragraph if index == len(paragraphs) - 1 else paragraph + "\n\n"
+
+    def _effective_model(self, model_override: Optional[str]) -> str:
+        return (model_override or getattr(settings, "GPT_MODEL", "") or "").strip() or settings.GPT_MODEL
+
     def _create_prompt(
         self,
         theme: str,
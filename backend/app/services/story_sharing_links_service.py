@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import json
 import os
 import uuid
@@ -12,6 +12,7 @@ from io import BytesIO
 import base64
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.document_store import get_document_store
 
 
 class StorySharingLinksService:
@@ -21,6 +22,9 @@ class StorySharingLinksService:
         self.sharing_links_file = os.path.join(settings.STORAGE_PATH, "sharing_links.json")
         self.qr_codes_path = os.path.join(settings.STORAGE_PATH, "qr_codes")
         self._ensure_files()
+        self.sharing_links_store = get_document_store(
+            self.sharing_links_file, default_factory=list, item_key="link_id"
+        )
     
     def _ensure_files(self):
         """Dosyaları oluşturur."""
@@ -59,9 +63,7 @@ class StorySharingLinksService:
             "created_at": datetime.now().isoformat()
         }
         
-        links = self._load_links()
-        links.append(link_data)
-        self._save_links(links)
+        self.sharing_links_store.append(link_data)
         
         # QR kod oluştur
         qr_code_data = await self.generate_qr_code(share_url, link_id)
@@ -114,26 +116,26 @@ class StorySharingLinksService:
         password: Optional[str] = None
     ) -> Dict:
         """Paylaşılan hikayeye erişir."""
-        links = self._load_links()
-        link = next((l for l in links if l["link_id"] == link_id), None)
+        def access(link: Dict) -> Dict:
+            # Süre kontrolü
+            if link.get("expires_at"):
+                expires_at = datetime.fromisoformat(link["expires_at"])
+                if datetime.now() > expires_at:
+                    raise ValueError("Link'in süresi dolmuş")
+            
+            # Şifre kontrolü
+            if link.get("password") and link["password"] != password:
+                raise ValueError("Yanlış şifre")
+            
+            # Erişim sayısını artır
+            link["access_count"] = link.get("access_count", 0) + 1
+            return link
+        
+        link = self.sharing_links_store.update_item(link_id, access)
         
         if not link:
             raise ValueError("Link bulunamadı")
         
-        # Süre kontrolü
-        if link.get("expires_at"):
-            expires_at = datetime.fromisoformat(link["expires_at"])
-            if datetime.now() > expires_at:
-                raise ValueError("Link'in süresi dolmuş")
-        
-        # Şifre kontrolü
-        if link.get("password") and link["password"] != password:
-            raise ValueError("Yanlış şifre")
-        
-        # Erişim sayısını artır
-        link["access_count"] = link.get("access_count", 0) + 1
-        self._save_links(links)
-        
         return {
             "story_id": link["story_id"],
             "allow_editing": link.get("allow_editing", False),
@@ -142,8 +144,7 @@ class StorySharingLinksService:
     
     async def revoke_sharing_link(self, link_id: str, user_id: str) -> Dict:
         """Paylaşım linkini iptal eder."""
-        links = self._load_links()
-        link = next((l for l in links if l["link_id"] == link_id), None)
+        link = self.sharing_links_store.get_item(link_id)
         
         if not link:
             raise ValueError("Link bulunamadı")
@@ -151,15 +152,13 @@ class StorySharingLinksService:
         if link["user_id"] != user_id:
             raise ValueError("Bu linki iptal etme yetkiniz yok")
         
-        links = [l for l in links if l["link_id"] != link_id]
-        self._save_links(links)
+        self.sharing_links_store.remove_items(lambda l: l["link_id"] == link_id)
         
         return {"message": "Link iptal edildi"}
     
     async def get_sharing_stats(self, link_id: str) -> Dict:
         """Paylaşım istatistiklerini getirir."""
-        links = self._load_links()
-        link = next((l for l in links if l["link_id"] == link_id), None)
+        link = self.sharing_links_store.get_item(link_id)
         
         if not link:
             raise ValueError("Link bulunamadı")
@@ -170,17 +169,3 @@ class StorySharingLinksService:
             "created_at": link.get("created_at"),
             "expires_at": link.get("expires_at")
         }
-    
-    def _load_links(self) -> List[Dict]:
-        """Linkleri yükler."""
-        try:
-            with open(self.sharing_links_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_links(self, links: List[Dict]):
-        """Linkleri kaydeder."""
-        with open(self.sharing_links_file, 'w', encoding='utf-8') as f:
-            json.dump(links, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -11,16 +11,8 @@ class StorySmartSchedulingService:
     """Hikaye zamanlayıcı ve hatırlatıcılar servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.schedules_file = os.path.join(settings.STORAGE_PATH, "smart_schedules.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.schedules_file):
-            with open(self.schedules_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.schedules_store = get_document_store(self.schedules_file, default_factory=list)
     
     async def create_smart_reminder(
         self,
@@ -44,9 +36,7 @@ class StorySmartSchedulingService:
             "created_at": datetime.now().isoformat()
         }
         
-        schedules = self._load_schedules()
-        schedules.append(reminder)
-        self._save_schedules(schedules)
+        self.schedules_store.append(reminder)
         
         return {
             "reminder_id": reminder_id,
@@ -76,9 +66,7 @@ class StorySmartSchedulingService:
             "created_at": datetime.now().isoformat()
         }
         
-        schedules = self._load_schedules()
-        schedules.append(schedule)
-        self._save_schedules(schedules)
+        self.schedules_store.append(schedule)
         
         return {
             "schedule_id": schedule_id,
@@ -92,15 +80,13 @@ class StorySmartSchedulingService:
         hours_ahead: int = 24
     ) -> List[Dict]:
         """Yaklaşan hatırlatıcıları getirir."""
-        schedules = self._load_schedules()
         cutoff = datetime.now() + timedelta(hours=hours_ahead)
         
-        upcoming = [
-            s for s in schedules
-            if s.get("user_id") == user_id
+        upcoming = self.schedules_store.items(
+            lambda s: s.get("user_id") == user_id
             and s.get("status") == "pending"
             and datetime.fromisoformat(s.get("suggested_time", datetime.now().isoformat())) <= cutoff
-        ]
+        )
         
         upcoming.sort(key=lambda x: x.get("suggested_time", ""))
         
@@ -125,17 +111,3 @@ class StorySmartSchedulingService:
             suggested = now + timedelta(hours=3)
         
         return suggested.isoformat()
-    
-    def _load_schedules(self) -> List[Dict]:
-        """Zamanlamaları yükler."""
-        try:
-            with open(self.schedules_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_schedules(self, schedules: List[Dict]):
-        """Zamanlamaları kaydeder."""
-        with open(self.schedules_file, 'w', encoding='utf-8') as f:
-            json.dump(schedules, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.llm_gateway import llm_gateway
+from app.core.document_store import get_document_store
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StorySmartTaggingService:
     """Hikaye akıllı etiketleme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.tags_file = os.path.join(settings.STORAGE_PATH, "story_tags.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.tags_file):
-            with open(self.tags_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.tags_file, default_factory=list)
     
     async def auto_tag_story(
         self,
@@ -33,14 +25,16 @@ class StorySmartTaggingService:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir içerik etiketleme uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
-            max_tokens=300
+            max_tokens=300,
+            cache=False,
+            cache_namespace="story_smart_tagging"
         )
         
         tags_text = response.choices[0].message.content
@@ -56,9 +50,7 @@ class StorySmartTaggingService:
             "created_at": datetime.now().isoformat()
         }
         
-        tags_list = self._load_tags()
-        tags_list.append(tag_record)
-        self._save_tags(tags_list)
+        self.store.append(tag_record)
         
         return {
             "story_id": story_id,
@@ -108,14 +100,16 @@ class StorySmartTaggingService:
 
 5 yeni etiket öner."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir etiket öneri uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=200
+            max_tokens=200,
+            cache=False,
+            cache_namespace="story_smart_tagging"
         )
         
         suggestions_text = response.choices[0].message.content
@@ -128,7 +122,7 @@ class StorySmartTaggingService:
         limit: int = 20
     ) -> List[Dict]:
         """Popüler etiketleri getirir."""
-        tags_list = self._load_tags()
+        tags_list = self.store.items()
         
         # Tüm etiketleri topla
         all_tags = {}
@@ -143,17 +137,3 @@ class StorySmartTaggingService:
             {"tag": tag, "count": count}
             for tag, count in popular[:limit]
         ]
-    
-    def _load_tags(self) -> List[Dict]:
-        """Etiketleri yükler."""
-        try:
-            with open(self.tags_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_tags(self, tags: List[Dict]):
-        """Etiketleri kaydeder."""
-        with open(self.tags_file, 'w', encoding='utf-8') as f:
-            json.dump(tags, f, ensure_ascii=False, indent=2)
-
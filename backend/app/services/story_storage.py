@@ -1,34 +1,19 @@
-import json
-import os
-from typing import List, Optional, Dict
-from datetime import datetime
-from pathlib import Path
+from typing import List, Optional, Dict, Tuple
+from datetime import date, datetime
 from app.core.config import settings
+from app.core.leaderboard_store import LIKES_BOARD, STORIES_BOARD, leaderboards
+from app.services.story_log_store import get_story_store
 
 
 class StoryStorage:
+    """
+    Hikâye deposu. Kayıtlar `StoryLogStore` üzerinde append-only log ve bellek
+    içi indekslerle tutulur; aynı dizini kullanan tüm örnekler tek motoru paylaşır.
+    """
+
     def __init__(self):
         self.storage_file = f"{settings.STORAGE_PATH}/stories.json"
-        self._ensure_storage_file()
-    
-    def _ensure_storage_file(self):
-        """Storage dosyasının var olduğundan emin olur."""
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-    
-    def _load_stories(self) -> List[Dict]:
-        """Tüm hikâyeleri yükler."""
-        try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_stories(self, stories: List[Dict]):
-        """Hikâyeleri kaydeder."""
-        with open(self.storage_file, 'w', encoding='utf-8') as f:
-            json.dump(stories, f, ensure_ascii=False, indent=2)
+        self.store = get_story_store(settings.STORAGE_PATH)
     
     def save_story(self, story_data: Dict) -> Dict:
         """
@@ -40,15 +25,6 @@ class StoryStorage:
         Returns:
             Kaydedilen hikâye verisi
         """
-        stories = self._load_stories()
-        
-        # Hikâye zaten varsa güncelle, yoksa ekle
-        story_id = story_data.get('story_id')
-        existing_index = next(
-            (i for i, s in enumerate(stories) if s.get('story_id') == story_id),
-            None
-        )
-        
         story_entry = {
             **story_data,
             'created_at': story_data.get('created_at', datetime.now().isoformat()),
@@ -56,30 +32,38 @@ class StoryStorage:
             'is_favorite': story_data.get('is_favorite', False),
             'story_type': story_data.get('story_type', 'masal'),
         }
-        
-        if existing_index is not None:
-            # Mevcut hikâyeyi güncelle
-            story_entry['is_favorite'] = stories[existing_index].get('is_favorite', False)
-            stories[existing_index] = story_entry
-        else:
-            # Yeni hikâye ekle
-            stories.append(story_entry)
-        
-        self._save_stories(stories)
-        return story_entry
+
+        created = []
+
+        def merge(existing: Optional[Dict], entry: Dict) -> Dict:
+            # Hikâye zaten varsa favori durumu korunur
+            if existing is not None:
+                entry['is_favorite'] = existing.get('is_favorite', False)
+            else:
+                created.append(True)
+            return entry
+
+        saved = self.store.put(story_entry, merge=merge)
+        if created:
+            leaderboards.incr(STORIES_BOARD, saved.get('user_id'), 1)
+        return saved
     
     def get_story(self, story_id: str) -> Optional[Dict]:
         """Belirli bir hikâyeyi getirir."""
-        stories = self._load_stories()
-        return next((s for s in stories if s.get('story_id') == story_id), None)
-    
+        return self.store.get(story_id)
+
+    def get_user_stories(self, user_id: str) -> List[Dict]:
+        """Kullanıcının hikâyelerini yeniden eskiye getirir."""
+        return self.store.user_stories(user_id)
+
     def get_all_stories(
         self, 
         limit: Optional[int] = None, 
         favorite_only: bool = False,
         search_query: Optional[str] = None,
         story_type: Optional[str] = None,
-        sort_by: str = "date_desc"  # "date_desc", "date_asc", "title_asc", "title_desc"
+        sort_by: Optional[str] = None,  # "relevance", "date_desc", "date_asc", "title_asc", "title_desc"
+        public_only: bool = False
     ) -> List[Dict]:
         """
         Tüm hikâyeleri getirir.
@@ -87,36 +71,40 @@ class StoryStorage:
         Args:
             limit: Maksimum hikâye sayısı
             favorite_only: Sadece favorileri getir
-            search_query: Arama sorgusu (tema ve metinde ara)
+            search_query: Arama sorgusu (tema ve metinde tam metin arama)
             story_type: Hikâye türü filtresi
-            sort_by: Sıralama türü
+            sort_by: Sıralama türü (arama varsa varsayılan "relevance", yoksa "date_desc")
+            public_only: Sadece herkese açık hikâyeleri getir
         
         Returns:
             Hikâye listesi
         """
-        stories = self._load_stories()
-        
-        # Filtreleme
-        if favorite_only:
-            stories = [s for s in stories if s.get('is_favorite', False)]
-        
-        if story_type:
-            stories = [s for s in stories if s.get('story_type') == story_type]
-        
+        if sort_by is None:
+            sort_by = "relevance" if search_query else "date_desc"
+
         if search_query:
-            query_lower = search_query.lower()
-            stories = [
-                s for s in stories
-                if query_lower in s.get('theme', '').lower() or
-                   query_lower in s.get('story_text', '').lower()
-            ]
-        
-        # Sıralama
-        if sort_by == "date_desc":
-            stories.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        elif sort_by == "date_asc":
-            stories.sort(key=lambda x: x.get('created_at', ''))
-        elif sort_by == "title_asc":
+            # Ters indeks: sonuç kümesi küçük, skor sırası hazır gelir
+            stories = self.store.search(
+                search_query,
+                story_type=story_type,
+                favorite_only=favorite_only,
+                public_only=public_only,
+                limit=limit if sort_by == "relevance" else None,
+            )
+            if sort_by in ("date_desc", "date_asc"):
+                stories.sort(key=lambda x: x.get('created_at', ''), reverse=sort_by == "date_desc")
+        else:
+            # Tarih sıralaması indeksten gelir; limit varsa tarama erken biter
+            by_date = sort_by not in ("title_asc", "title_desc")
+            stories = self.store.query(
+                story_type=story_type,
+                favorite_only=favorite_only,
+                public_only=public_only,
+                newest_first=sort_by != "date_asc",
+                limit=limit if by_date else None,
+            )
+        
+        if sort_by == "title_asc":
             stories.sort(key=lambda x: (x.get('theme') or '').lower())
         elif sort_by == "title_desc":
             stories.sort(key=lambda x: (x.get('theme') or '').lower(), reverse=True)
@@ -125,46 +113,104 @@ class StoryStorage:
             stories = stories[:limit]
         
         return stories
+
+    def search_stories(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        match_all: bool = True,
+        public_only: bool = False,
+    ) -> List[Dict]:
+        """
+        Tema ve metinde BM25 sıralı tam metin arama. ``match_all=False`` ile
+        kelimelerden herhangi birini içeren hikâyeler de döner.
+        """
+        return self.store.search(query, public_only=public_only, limit=limit, match_all=match_all)
     
+    def find_similar_stories(
+        self,
+        text: str,
+        exclude_story_id: Optional[str] = None,
+        threshold: float = 0.3,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict], int]:
+        """
+        Metne yakın kopya hikâyeleri MinHash/LSH indeksiyle bulur.
+
+        Returns:
+            (benzer hikâyeler, doğrulanan aday sayısı); her hikâyede
+            `similarity` (shingle Jaccard) ve `containment` alanları bulunur
+        """
+        matches, checked = self.store.near_duplicates(text, exclude_story_id, threshold, limit)
+        return [
+            {**story, 'similarity': similarity, 'containment': covered}
+            for story, similarity, covered in matches
+        ], checked
+
+    def recommend_stories(
+        self,
+        user_id: str,
+        themes: Optional[List[str]] = None,
+        story_types: Optional[List[str]] = None,
+        limit: int = 10,
+        require_theme: bool = False,
+    ) -> List[Dict]:
+        """
+        Kullanıcıya önerilen hikâyeler (kendi hikâyeleri hariç), öneri skoruna
+        göre azalan. Skor tema/tür tercihi, okunan temalar, beğeni, yenilik ve
+        trend özelliklerinden vektörel hesaplanır; `recommendation_score` alanında döner.
+        """
+        ranked = self.store.recommend(
+            user_id, themes or (), story_types or (), limit=limit, require_theme=require_theme,
+        )
+        return [{**story, 'recommendation_score': score} for story, score in ranked]
+
+    def get_similar_stories(self, story_id: str, limit: int = 5) -> List[Dict]:
+        """Tema, tür ve dile göre benzer hikâyeler; `similarity` alanıyla döner."""
+        return [
+            {**story, 'similarity': score}
+            for story, score in self.store.similar(story_id, limit=limit)
+        ]
+
+    def get_user_themes(self, user_id: str) -> List[Tuple[str, int]]:
+        """Kullanıcının hikâye temaları ve sayıları (çoktan aza, küçük harfli)."""
+        return self.store.user_themes(user_id)
+
     def toggle_favorite(self, story_id: str) -> Optional[Dict]:
         """Favori durumunu değiştirir."""
-        stories = self._load_stories()
-        story = next((s for s in stories if s.get('story_id') == story_id), None)
-        
-        if story:
+        def toggle(story: Dict):
             story['is_favorite'] = not story.get('is_favorite', False)
             story['updated_at'] = datetime.now().isoformat()
-            self._save_stories(stories)
-            return story
-        
-        return None
+
+        return self.store.update(story_id, toggle)
     
     def delete_story(self, story_id: str) -> bool:
         """Bir hikâyeyi siler."""
-        stories = self._load_stories()
-        initial_count = len(stories)
-        stories = [s for s in stories if s.get('story_id') != story_id]
-        
-        if len(stories) < initial_count:
-            self._save_stories(stories)
-            return True
-        
-        return False
+        story = self.store.get(story_id)
+        if not self.store.delete(story_id):
+            return False
+        user_id = story.get('user_id')
+        if user_id:
+            from app.services.like_service import LikeService
+            leaderboards.incr(STORIES_BOARD, user_id, -1)
+            leaderboards.incr(LIKES_BOARD, user_id, -LikeService().get_story_likes(story_id)['like_count'])
+        return True
     
     def get_statistics(self) -> Dict:
         """Hikâye istatistiklerini getirir."""
-        stories = self._load_stories()
         return {
-            'total_stories': len(stories),
-            'favorite_stories': len([s for s in stories if s.get('is_favorite', False)]),
-            'story_types': self._count_story_types(stories),
+            'total_stories': self.store.count(),
+            'favorite_stories': self.store.favorite_count(),
+            'story_types': self.store.type_counts(),
         }
-    
-    def _count_story_types(self, stories: List[Dict]) -> Dict[str, int]:
-        """Hikâye türlerine göre sayım yapar."""
-        types = {}
-        for story in stories:
-            story_type = story.get('story_type', 'masal')
-            types[story_type] = types.get(story_type, 0) + 1
-        return types
 
+    def get_library_aggregates(self, today: Optional[date] = None) -> Dict:
+        """
+        Kaydetme/silmede güncellenen kütüphane sayaçları: tür, dil, stil ve tema
+        sayımları, toplam metin uzunluğu, bugün / son 7 / son 30 gün sayıları.
+        """
+        return self.store.aggregates(today or date.today())
+
+    def reconcile_aggregates(self) -> List[str]:
+        """Sayaçları hikâyelerden yeniden sayıp düzeltir; sapan alanları döndürür."""
+        return self.store.reconcile_aggregates()
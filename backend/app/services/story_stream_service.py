@@ -0,0 +1,118 @@
+"""
+Streaming story generation.
+
+Runs the text stage as a token stream (``StoryService.stream_story``) so the
+first paragraph reaches the client while the rest is still being written,
+then produces image and audio concurrently. Progress is published through a
+``StoryStream`` (Socket.IO room + SSE replay log):
+
+    story_delta            {"delta"}                      text chunks
+    story_text_completed   {"story_id", "story_text"}
+    story_media            {"kind": "image"|"audio", "url"}
+    story_completed        StoryResponse fields
+    story_failed           {"message"}
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from app.core.story_stream import StoryStream, StoryStreamHub, story_stream_hub
+
+logger = logging.getLogger(__name__)
+
+_TEXT_PARAMS = ("theme", "language", "story_type", "creativity", "pacing", "perspective", "vocabulary")
+
+
+class StoryStreamService:
+    def __init__(
+        self,
+        story_service,
+        image_service,
+        tts_service,
+        story_storage,
+        user_profile_service,
+        hub: Optional[StoryStreamHub] = None,
+    ):
+        self.story_service = story_service
+        self.image_service = image_service
+        self.tts_service = tts_service
+        self.story_storage = story_storage
+        self.user_profile_service = user_profile_service
+        self.hub = hub or story_stream_hub
+        # Keep references so running generations are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, request: Dict[str, Any], user_id: Optional[str] = None) -> StoryStream:
+        """Starts a streamed generation in the background and returns its stream."""
+        stream = self.hub.create(user_id=user_id)
+        task = asyncio.create_task(self.run(stream, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return stream
+
+    async def run(self, stream: StoryStream, request: Dict[str, Any]):
+        story_id = str(uuid.uuid4())
+        try:
+            text_kwargs = {key: request[key] for key in _TEXT_PARAMS if key in request}
+            async for delta in self.story_service.stream_story(
+                model_override=request.get("model"), **text_kwargs
+            ):
+                await stream.push_delta(delta)
+            await stream.flush()
+
+            story_text = stream.text.strip()
+            await stream.publish("story_text_completed", {"story_id": story_id, "story_text": story_text})
+
+            image_url, audio_url = await asyncio.gather(
+                self._media(stream, "image", self.image_service.generate_image(
+                    story_text,
+                    request.get("theme"),
+                    image_style=request.get("image_style", "fantasy"),
+                    image_size=request.get("image_size", "1024x1024")
+                )),
+                self._media(stream, "audio", self.tts_service.generate_speech(
+                    story_text,
+                    request.get("language", "tr"),
+                    story_id,
+                    audio_speed=request.get("audio_speed", 1.0),
+                    audio_slow=request.get("audio_slow", False)
+                )),
+            )
+
+            created_at = datetime.now().isoformat()
+            story_data = {
+                'story_id': story_id,
+                'story_text': story_text,
+                'image_url': image_url,
+                'audio_url': audio_url,
+                'theme': request.get("theme"),
+                'language': request.get("language", "tr"),
+                'story_type': request.get("story_type", "masal"),
+                'created_at': created_at,
+            }
+            if request.get("save", True):
+                saved_story = self.story_storage.save_story(story_data)
+                story_data['is_favorite'] = saved_story.get('is_favorite', False)
+
+            # Gamification: Award XP
+            xp_result = self.user_profile_service.add_xp(50)
+
+            await stream.publish("story_completed", {
+                **story_data,
+                "is_favorite": story_data.get('is_favorite', False),
+                "xp_gained": xp_result['xp_gained'],
+                "new_level": xp_result['level'],
+                "leveled_up": xp_result['leveled_up'],
+                "level_message": xp_result['message'],
+            })
+        except Exception as e:
+            logger.error(f"Streamed story generation {stream.stream_id} failed: {e}")
+            await stream.flush()
+            await stream.publish("story_failed", {"message": f"Hikâye üretilirken hata oluştu: {str(e)}"})
+
+    async def _media(self, stream: StoryStream, kind: str, job) -> str:
+        url = await job
+        await stream.publish("story_media", {"kind": kind, "url": url})
+        return url
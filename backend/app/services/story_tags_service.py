@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-import json
 import os
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 from app.services.story_storage import StoryStorage
 
 
@@ -10,13 +10,7 @@ class StoryTagsService:
     def __init__(self):
         self.story_storage = StoryStorage()
         self.tags_file = os.path.join(settings.STORAGE_PATH, "story_tags.json")
-        self._ensure_file()
-    
-    def _ensure_file(self):
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.tags_file):
-            with open(self.tags_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.tags_file)
     
     def add_tag(
         self,
@@ -25,23 +19,15 @@ class StoryTagsService:
         user_id: str
     ) -> Dict:
         """Etiket ekler."""
-        with open(self.tags_file, 'r', encoding='utf-8') as f:
-            tags_data = json.load(f)
-        
-        if story_id not in tags_data:
-            tags_data[story_id] = {
-                "tags": [],
-                "created_by": user_id
-            }
-        
-        if tag not in tags_data[story_id]["tags"]:
-            tags_data[story_id]["tags"].append(tag)
-            tags_data[story_id]["updated_at"] = datetime.now().isoformat()
-        
-        with open(self.tags_file, 'w', encoding='utf-8') as f:
-            json.dump(tags_data, f, ensure_ascii=False, indent=2)
+        def add(story_tags: Dict) -> Dict:
+            if tag not in story_tags["tags"]:
+                story_tags["tags"].append(tag)
+                story_tags["updated_at"] = datetime.now().isoformat()
+            return story_tags
+
+        story_tags = self.store.update(story_id, add, default={"tags": [], "created_by": user_id})
         
-        return {"story_id": story_id, "tag": tag, "tags": tags_data[story_id]["tags"]}
+        return {"story_id": story_id, "tag": tag, "tags": story_tags["tags"]}
     
     def remove_tag(
         self,
@@ -49,45 +35,31 @@ class StoryTagsService:
         tag: str
     ) -> Dict:
         """Etiketi kaldırır."""
-        with open(self.tags_file, 'r', encoding='utf-8') as f:
-            tags_data = json.load(f)
-        
-        if story_id in tags_data:
-            if tag in tags_data[story_id]["tags"]:
-                tags_data[story_id]["tags"].remove(tag)
-                tags_data[story_id]["updated_at"] = datetime.now().isoformat()
-        
-        with open(self.tags_file, 'w', encoding='utf-8') as f:
-            json.dump(tags_data, f, ensure_ascii=False, indent=2)
+        if not self.store.contains(story_id):
+            return {"story_id": story_id, "tags": []}
+
+        def remove(story_tags: Dict) -> Dict:
+            if tag in story_tags["tags"]:
+                story_tags["tags"].remove(tag)
+                story_tags["updated_at"] = datetime.now().isoformat()
+            return story_tags
+
+        story_tags = self.store.update(story_id, remove)
         
-        return {"story_id": story_id, "tags": tags_data.get(story_id, {}).get("tags", [])}
+        return {"story_id": story_id, "tags": story_tags.get("tags", [])}
     
     def get_story_tags(self, story_id: str) -> List[str]:
         """Hikâye etiketlerini getirir."""
-        with open(self.tags_file, 'r', encoding='utf-8') as f:
-            tags_data = json.load(f)
-        
-        return tags_data.get(story_id, {}).get("tags", [])
+        return self.store.get(story_id, {}).get("tags", [])
     
     def get_stories_by_tag(self, tag: str) -> List[str]:
         """Etikete göre hikâyeleri getirir."""
-        with open(self.tags_file, 'r', encoding='utf-8') as f:
-            tags_data = json.load(f)
-        
-        story_ids = []
-        for story_id, data in tags_data.items():
-            if tag in data.get("tags", []):
-                story_ids.append(story_id)
-        
-        return story_ids
+        return [story_id for story_id, _ in self.store.scan(lambda data: tag in data.get("tags", []))]
     
     def get_popular_tags(self, limit: int = 20) -> List[Dict]:
         """Popüler etiketleri getirir."""
-        with open(self.tags_file, 'r', encoding='utf-8') as f:
-            tags_data = json.load(f)
-        
         tag_counts = {}
-        for story_id, data in tags_data.items():
+        for story_id, data in self.store.scan():
             for tag in data.get("tags", []):
                 tag_counts[tag] = tag_counts.get(tag, 0) + 1
         
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,20 +11,12 @@ class StoryTemplatesShortcutsService:
     """Hikaye şablon ve kısayollar servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.templates_file = os.path.join(settings.STORAGE_PATH, "story_templates_shortcuts.json")
         self.shortcuts_file = os.path.join(settings.STORAGE_PATH, "story_shortcuts.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.templates_file):
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-        if not os.path.exists(self.shortcuts_file):
-            with open(self.shortcuts_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.templates_store = get_document_store(
+            self.templates_file, default_factory=list, item_key="template_id"
+        )
+        self.shortcuts_store = get_document_store(self.shortcuts_file, default_factory=dict)
     
     async def create_template(
         self,
@@ -46,9 +38,7 @@ class StoryTemplatesShortcutsService:
             "created_at": datetime.now().isoformat()
         }
         
-        templates = self._load_templates()
-        templates.append(template)
-        self._save_templates(templates)
+        self.templates_store.append(template)
         
         return {
             "template_id": template_id,
@@ -62,8 +52,7 @@ class StoryTemplatesShortcutsService:
         user_inputs: Dict
     ) -> Dict:
         """Şablonu kullanarak hikaye oluşturur."""
-        templates = self._load_templates()
-        template = next((t for t in templates if t["template_id"] == template_id), None)
+        template = self.templates_store.get_item(template_id)
         
         if not template:
             raise ValueError("Şablon bulunamadı")
@@ -71,10 +60,13 @@ class StoryTemplatesShortcutsService:
         # Şablon yapısını kullanıcı girdileriyle doldur
         story_text = self._fill_template(template["structure"], user_inputs)
         
-        # Kullanım sayısını artır
-        template["usage_count"] += 1
-        template["last_used_at"] = datetime.now().isoformat()
-        self._save_templates(templates)
+        def count_use(template: Dict) -> Dict:
+            # Kullanım sayısını artır
+            template["usage_count"] += 1
+            template["last_used_at"] = datetime.now().isoformat()
+            return template
+        
+        self.templates_store.update_item(template_id, count_use)
         
         return {
             "template_id": template_id,
@@ -101,11 +93,9 @@ class StoryTemplatesShortcutsService:
             "created_at": datetime.now().isoformat()
         }
         
-        shortcuts = self._load_shortcuts()
-        if user_id not in shortcuts:
-            shortcuts[user_id] = []
-        shortcuts[user_id].append(shortcut)
-        self._save_shortcuts(shortcuts)
+        self.shortcuts_store.update(
+            user_id, lambda user_shortcuts: user_shortcuts + [shortcut], default=[]
+        )
         
         return {
             "shortcut_id": shortcut_id,
@@ -119,8 +109,7 @@ class StoryTemplatesShortcutsService:
         shortcut_key: str
     ) -> Dict:
         """Kısayolu çalıştırır."""
-        shortcuts = self._load_shortcuts()
-        user_shortcuts = shortcuts.get(user_id, [])
+        user_shortcuts = self.shortcuts_store.get(user_id, [])
         
         shortcut = next((s for s in user_shortcuts if s["key"] == shortcut_key), None)
         
@@ -157,36 +146,9 @@ class StoryTemplatesShortcutsService:
         limit: int = 10
     ) -> List[Dict]:
         """Popüler şablonları getirir."""
-        templates = self._load_templates()
+        templates = self.templates_store.items()
         
         # Kullanım sayısına göre sırala
         templates.sort(key=lambda x: x.get("usage_count", 0), reverse=True)
         
         return templates[:limit]
-    
-    def _load_templates(self) -> List[Dict]:
-        """Şablonları yükler."""
-        try:
-            with open(self.templates_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_templates(self, templates: List[Dict]):
-        """Şablonları kaydeder."""
-        with open(self.templates_file, 'w', encoding='utf-8') as f:
-            json.dump(templates, f, ensure_ascii=False, indent=2)
-    
-    def _load_shortcuts(self) -> Dict:
-        """Kısayolları yükler."""
-        try:
-            with open(self.shortcuts_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_shortcuts(self, shortcuts: Dict):
-        """Kısayolları kaydeder."""
-        with open(self.shortcuts_file, 'w', encoding='utf-8') as f:
-            json.dump(shortcuts, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryTheaterService:
     """Hikaye performans ve tiyatro formatı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.theater_scripts_file = os.path.join(settings.STORAGE_PATH, "theater_scripts.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.theater_scripts_file):
-            with open(self.theater_scripts_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.theater_scripts_store = get_document_store(self.theater_scripts_file, default_factory=list)
     
     async def create_theater_script(
         self,
@@ -38,14 +30,16 @@ Diyaloglar, sahne talimatları ve karakter tanımlamaları ekle:
 
 Tiyatro formatında döndür."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir tiyatro senaryo yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_theater"
         )
         
         script_text = response.choices[0].message.content
@@ -65,9 +59,7 @@ Tiyatro formatında döndür."""
             "created_at": datetime.now().isoformat()
         }
         
-        scripts = self._load_scripts()
-        scripts.append(script)
-        self._save_scripts(scripts)
+        self.theater_scripts_store.append(script)
         
         return {
             "script_id": script_id,
@@ -89,14 +81,16 @@ Basit diyaloglar ve görsel talimatlar ekle:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir kukla gösterisi yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1500
+            max_tokens=1500,
+            cache=False,
+            cache_namespace="story_theater"
         )
         
         puppet_script = response.choices[0].message.content
@@ -160,17 +154,3 @@ Basit diyaloglar ve görsel talimatlar ekle:
                 if i == 0 or words[i-1][-1] in '.!?':
                     characters.add(word.strip('.,!?;:'))
         return min(len(characters), 5)
-    
-    def _load_scripts(self) -> List[Dict]:
-        """Senaryoları yükler."""
-        try:
-            with open(self.theater_scripts_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_scripts(self, scripts: List[Dict]):
-        """Senaryoları kaydeder."""
-        with open(self.theater_scripts_file, 'w', encoding='utf-8') as f:
-            json.dump(scripts, f, ensure_ascii=False, indent=2)
-
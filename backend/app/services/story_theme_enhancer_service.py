@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -11,7 +11,6 @@ class StoryThemeEnhancerService:
     """Hikaye tema geliştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.themes_file = os.path.join(settings.STORAGE_PATH, "theme_enhancements.json")
         self._ensure_files()
     
@@ -24,9 +23,9 @@ class StoryThemeEnhancerService:
     async def enhance_theme(self, story_id: str, story_text: str, theme: Optional[str] = None) -> Dict:
         theme_id = str(uuid.uuid4())
         prompt = f"Aşağıdaki hikayenin temasını güçlendir{f': {theme}' if theme else ''}:\n\n{story_text}"
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4", messages=[{"role": "system", "content": "Sen bir tema uzmanısın."}, {"role": "user", "content": prompt}],
-            temperature=0.7, max_tokens=2000
+            temperature=0.7, max_tokens=2000, cache=False, cache_namespace="story_theme_enhancer"
         )
         enhanced = response.choices[0].message.content
         return {"theme_id": theme_id, "enhanced_text": enhanced, "theme": theme}
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryTimelineVisualizationService:
     """Hikaye zaman çizelgesi görselleştirme servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.timelines_file = os.path.join(settings.STORAGE_PATH, "story_timelines.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.timelines_file):
-            with open(self.timelines_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.timelines_store = get_document_store(self.timelines_file, default_factory=dict)
     
     async def create_timeline(
         self,
@@ -38,14 +30,16 @@ Hikaye:
 
 JSON formatında döndür."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye analiz uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=True,
+            cache_namespace="story_timeline_visualization"
         )
         
         # Basit parse
@@ -57,9 +51,7 @@ JSON formatında döndür."""
             "created_at": datetime.now().isoformat()
         }
         
-        timelines = self._load_timelines()
-        timelines[story_id] = timeline
-        self._save_timelines(timelines)
+        self.timelines_store.put(story_id, timeline)
         
         return timeline
     
@@ -82,8 +74,7 @@ JSON formatında döndür."""
     
     async def get_timeline(self, story_id: str) -> Optional[Dict]:
         """Zaman çizelgesini getirir."""
-        timelines = self._load_timelines()
-        return timelines.get(story_id)
+        return self.timelines_store.get(story_id)
     
     async def add_custom_event(
         self,
@@ -92,15 +83,6 @@ JSON formatında döndür."""
         order: Optional[int] = None
     ) -> Dict:
         """Özel olay ekler."""
-        timelines = self._load_timelines()
-        timeline = timelines.get(story_id)
-        
-        if not timeline:
-            raise ValueError("Zaman çizelgesi bulunamadı")
-        
-        if order is None:
-            order = len(timeline["events"])
-        
         event = {
             "event_id": str(uuid.uuid4()),
             "order": order,
@@ -110,24 +92,18 @@ JSON formatında döndür."""
             "is_custom": True
         }
         
-        timeline["events"].append(event)
-        timeline["events"].sort(key=lambda x: x["order"])
-        timeline["updated_at"] = datetime.now().isoformat()
+        def add_event(timeline: Optional[Dict]) -> Dict:
+            if not timeline:
+                raise ValueError("Zaman çizelgesi bulunamadı")
+            
+            if event["order"] is None:
+                event["order"] = len(timeline["events"])
+            
+            timeline["events"].append(event)
+            timeline["events"].sort(key=lambda x: x["order"])
+            timeline["updated_at"] = datetime.now().isoformat()
+            return timeline
         
-        self._save_timelines(timelines)
+        self.timelines_store.update(story_id, add_event)
         
         return {"message": "Olay eklendi", "event": event}
-    
-    def _load_timelines(self) -> Dict:
-        """Zaman çizelgelerini yükler."""
-        try:
-            with open(self.timelines_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_timelines(self, timelines: Dict):
-        """Zaman çizelgelerini kaydeder."""
-        with open(self.timelines_file, 'w', encoding='utf-8') as f:
-            json.dump(timelines, f, ensure_ascii=False, indent=2)
-
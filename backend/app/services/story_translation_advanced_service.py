@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryTranslationAdvancedService:
     """Hikaye içerik çevirisi geliştirmeleri servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.translations_file = os.path.join(settings.STORAGE_PATH, "advanced_translations.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.translations_file):
-            with open(self.translations_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.translations_store = get_document_store(self.translations_file, default_factory=list)
     
     async def translate_with_context(
         self,
@@ -40,14 +32,16 @@ class StoryTranslationAdvancedService:
 Hikaye:
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"Sen bir {target_language} çevirmenisin."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.6,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_translation_advanced"
         )
         
         translated_text = response.choices[0].message.content
@@ -64,9 +58,7 @@ Hikaye:
             "created_at": datetime.now().isoformat()
         }
         
-        translations = self._load_translations()
-        translations.append(translation)
-        self._save_translations(translations)
+        self.translations_store.append(translation)
         
         return {
             "translation_id": translation_id,
@@ -85,14 +77,16 @@ Hikaye:
 
 {translated_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"Sen bir {original_language} çevirmenisin."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_translation_advanced"
         )
         
         back_translated = response.choices[0].message.content
@@ -102,17 +96,3 @@ Hikaye:
             "back_translated_text": back_translated,
             "message": "Geri çeviri tamamlandı"
         }
-    
-    def _load_translations(self) -> List[Dict]:
-        """Çevirileri yükler."""
-        try:
-            with open(self.translations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_translations(self, translations: List[Dict]):
-        """Çevirileri kaydeder."""
-        with open(self.translations_file, 'w', encoding='utf-8') as f:
-            json.dump(translations, f, ensure_ascii=False, indent=2)
-
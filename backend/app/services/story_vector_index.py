@@ -0,0 +1,438 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, thread kilidi yeterli
+    fcntl = None
+
+# Filtre sonrası aday sayısı bunun altındaysa IVF yerine tam tarama yapılır
+EXACT_SEARCH_MAX = 4096
+# IVF eğitimi için gereken en az canlı vektör
+TRAIN_MIN_ROWS = 2048
+TRAIN_SAMPLE = 20000
+TRAIN_ITERATIONS = 12
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getirir (kosinüs benzerliği = iç çarpım)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = TRAIN_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Birim vektörler üzerinde k-means; merkezler de birim uzunlukta döner."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = ~sums.any(axis=1)
+        # Boş kalan merkezler rastgele bir vektörle yeniden başlatılır
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class StoryVectorIndex:
+    """
+    Hikâye embedding'leri için süreç içi yaklaşık en yakın komşu (IVF) indeksi.
+
+    pgvector olmayan kurulumlarda (SQLite, yerel geliştirme) anlamsal arama
+    bu indeksle yapılır.
+
+    Disk düzeni (``directory`` altında):
+        vectors.f32 -> birim uzunlukta float32 matris, bellek eşlemeli (memmap);
+                       kapasite doldukça dosya büyütülüp yeniden eşlenir
+        rows.log    -> satır başına bir JSON kaydı: satır -> hikâye, dil, tür
+                       ya da silme işareti (append-only)
+        ivf.npz     -> IVF merkezleri ve eğitim anındaki satır atamaları
+        index.lock  -> süreçler arası yazma kilidi
+
+    - Güncelleme yeni satır yazar, eski satır ölü işaretlenir; `train`
+      matrisi sıkıştırır
+    - Aramada önce dil / tür maskesi uygulanır; aday az ise (ya da indeks
+      eğitilmemişse) tam tarama, değilse en yakın `nprobe` listesi taranır.
+      Sonuç k'dan azsa tam taramaya düşülür
+    - Diğer worker'ların eklediği satırlar her aramadan önce log'un
+      kuyruğundan okunur
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, directory: str, dimensions: int, nprobe: int = 8):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.nprobe = nprobe
+        self.vectors_file = os.path.join(directory, "vectors.f32")
+        self.log_file = os.path.join(directory, "rows.log")
+        self.ivf_file = os.path.join(directory, "ivf.npz")
+        self.lock_file = os.path.join(directory, "index.lock")
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._reset()
+            self._refresh()
+
+    # ------------------------------------------------------------------ #
+    # Durum ve disk senkronizasyonu
+    # ------------------------------------------------------------------ #
+
+    def _reset(self):
+        self._vectors: Optional[np.memmap] = None
+        self._rows = 0
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._languages: Dict[str, int] = {}
+        self._types: Dict[str, int] = {}
+        self._language = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        self._type = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(self.INITIAL_CAPACITY, dtype=np.bool_)
+        self._assign = np.full(self.INITIAL_CAPACITY, -1, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_rows = 0
+        self._log_offset = 0
+        self._log_inode: Optional[int] = None
+        self._ivf_mtime: Optional[int] = None
+
+    @contextmanager
+    def _write_lock(self):
+        """Thread ve (destekleniyorsa) süreçler arası yazma kilidi."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_file, "a") as lock_fp:
+                fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+
+    def _map(self, rows_needed: int, grow: bool = False):
+        """vectors.f32'yi en az `rows_needed` satır alacak şekilde eşler."""
+        row_bytes = self.dimensions * 4
+        size = os.path.getsize(self.vectors_file) if os.path.exists(self.vectors_file) else 0
+        capacity = size // row_bytes
+        if capacity < rows_needed:
+            if not grow:
+                raise RuntimeError("vector file is shorter than the row log")
+            capacity = max(self.INITIAL_CAPACITY, capacity)
+            while capacity < rows_needed:
+                capacity *= 2
+            with open(self.vectors_file, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        if self._vectors is None or len(self._vectors) != capacity:
+            self._vectors = np.memmap(self.vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+        if len(self._alive) < capacity:
+            self._grow_columns(capacity)
+
+    def _grow_columns(self, capacity: int):
+        for name, fill in (("_language", 0), ("_type", 0), ("_alive", False), ("_assign", -1)):
+            old = getattr(self, name)
+            column = np.full(capacity, fill, dtype=old.dtype)
+            column[:len(old)] = old
+            setattr(self, name, column)
+
+    def _code(self, vocabulary: Dict[str, int], value: Optional[str]) -> int:
+        value = (value or "").strip().lower()
+        code = vocabulary.get(value)
+        if code is None:
+            code = len(vocabulary) + 1
+            vocabulary[value] = code
+        return code
+
+    def _apply(self, record: Dict):
+        row = record["r"]
+        if record.get("del"):
+            self._alive[row] = False
+            story_id = self._ids[row] if row < len(self._ids) else None
+            if story_id is not None and self._row_of.get(story_id) == row:
+                del self._row_of[story_id]
+            return
+        while len(self._ids) <= row:
+            self._ids.append(None)
+        story_id = record["id"]
+        previous = self._row_of.get(story_id)
+        if previous is not None and previous != row:
+            self._alive[previous] = False
+        self._ids[row] = story_id
+        self._row_of[story_id] = row
+        self._language[row] = self._code(self._languages, record.get("lang"))
+        self._type[row] = self._code(self._types, record.get("type"))
+        self._alive[row] = True
+        self._rows = max(self._rows, row + 1)
+
+    def _refresh(self):
+        """Log'un yeni satırlarını ve (değiştiyse) IVF dosyasını okur."""
+        try:
+            st = os.stat(self.log_file)
+        except FileNotFoundError:
+            if self._log_inode is not None:
+                self._reset()
+            return
+        if self._log_inode is not None and (st.st_ino != self._log_inode or st.st_size < self._log_offset):
+            # Başka bir süreç sıkıştırdı ya da temizledi: baştan yükle
+            self._reset()
+        self._log_inode = st.st_ino
+        if st.st_size > self._log_offset:
+            with open(self.log_file, "rb") as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            records = [json.loads(line) for line in complete.splitlines() if line.strip()]
+            if records:
+                self._map(max(r["r"] for r in records) + 1)
+            for record in records:
+                self._apply(record)
+            self._log_offset += len(complete)
+            self._assign_new_rows()
+        self._load_ivf()
+
+    def _load_ivf(self):
+        try:
+            mtime = os.stat(self.ivf_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._ivf_mtime:
+            return
+        with np.load(self.ivf_file) as data:
+            self._centroids = data["centroids"].astype(np.float32)
+            assignments = data["assignments"]
+        self._ivf_mtime = mtime
+        self._trained_rows = min(len(assignments), self._rows)
+        self._assign[:self._trained_rows] = assignments[:self._trained_rows]
+        self._assign[self._trained_rows:] = -1
+        self._assign_new_rows()
+
+    def _assign_new_rows(self):
+        if self._centroids is None:
+            return
+        pending = np.flatnonzero(self._assign[:self._rows] < 0)
+        for start in range(0, len(pending), 4096):
+            rows = pending[start:start + 4096]
+            self._assign[rows] = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+
+    def refresh(self):
+        with self._lock:
+            self._refresh()
+
+    # ------------------------------------------------------------------ #
+    # Yazma
+    # ------------------------------------------------------------------ #
+
+    def add_many(self, items: Iterable[Tuple[str, Sequence[float], Optional[str], Optional[str]]]) -> int:
+        """(story_id, vektör, dil, tür) kayıtlarını ekler ya da günceller."""
+        items = list(items)
+        if not items:
+            return 0
+        vectors = normalize_rows(np.asarray([vector for _, vector, _, _ in items], dtype=np.float32))
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Embedding boyutu {vectors.shape[1]}, beklenen {self.dimensions}")
+        with self._write_lock():
+            self._refresh()
+            first = self._rows
+            self._map(first + len(items), grow=True)
+            self._vectors[first:first + len(items)] = vectors
+            self._vectors.flush()
+            records = [
+                {"r": first + i, "id": str(story_id), "lang": language, "type": story_type}
+                for i, (story_id, _, language, story_type) in enumerate(items)
+            ]
+            self._append(records)
+        return len(items)
+
+    def add(self, story_id: str, vector: Sequence[float], language: Optional[str] = None, story_type: Optional[str] = None):
+        self.add_many([(story_id, vector, language, story_type)])
+
+    def clear(self):
+        """Tüm vektörleri siler (indeks yeniden kurulurken)."""
+        with self._write_lock():
+            for path in (self.log_file, self.vectors_file, self.ivf_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._reset()
+
+    def remove(self, story_id: str) -> bool:
+        with self._write_lock():
+            self._refresh()
+            row = self._row_of.get(str(story_id))
+            if row is None:
+                return False
+            self._append([{"r": row, "del": 1}])
+            return True
+
+    def _append(self, records: List[Dict]):
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        with open(self.log_file, "ab") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Kendi yazdığımız kayıtlar log'dan tekrar okunmadan uygulanır
+        if self._log_inode is None:
+            self._log_inode = os.stat(self.log_file).st_ino
+        for record in records:
+            self._apply(record)
+        self._log_offset += len(payload)
+        self._assign_new_rows()
+
+    # ------------------------------------------------------------------ #
+    # IVF eğitimi
+    # ------------------------------------------------------------------ #
+
+    def needs_training(self) -> bool:
+        live = len(self)
+        if live < TRAIN_MIN_ROWS:
+            return False
+        # İlk eğitim ya da eğitimden bu yana satır sayısı iki katına çıktıysa
+        return self._centroids is None or self._rows >= 2 * max(self._trained_rows, 1)
+
+    def train(self, n_lists: Optional[int] = None, seed: int = 0) -> int:
+        """
+        Canlı satırları sıkıştırıp yeniden yazar ve IVF merkezlerini eğitir.
+        Dönen değer liste sayısıdır (eğitim için vektör yetersizse 0).
+        """
+        with self._write_lock():
+            self._refresh()
+            rows = np.flatnonzero(self._alive[:self._rows])
+            vectors = np.asarray(self._vectors[rows]) if len(rows) else np.zeros((0, self.dimensions), np.float32)
+            languages = {code: value or None for value, code in self._languages.items()}
+            types = {code: value or None for value, code in self._types.items()}
+            records = [
+                {"r": new_row, "id": self._ids[row],
+                 "lang": languages.get(int(self._language[row])), "type": types.get(int(self._type[row]))}
+                for new_row, row in enumerate(rows)
+            ]
+
+            centroids, assignments = None, None
+            if len(rows) >= TRAIN_MIN_ROWS or (n_lists and len(rows) >= n_lists):
+                n_lists = n_lists or int(np.clip(np.sqrt(len(rows)), 16, 1024))
+                rng = np.random.default_rng(seed)
+                sample = vectors[rng.choice(len(vectors), min(len(vectors), TRAIN_SAMPLE), replace=False)]
+                centroids = spherical_kmeans(sample, n_lists, seed=seed)
+                assignments = np.concatenate([
+                    np.argmax(vectors[start:start + 4096] @ centroids.T, axis=1)
+                    for start in range(0, len(vectors), 4096)
+                ]).astype(np.int32)
+
+            # Yeni dosyalar yazılıp atomik olarak yerine konur
+            capacity = max(self.INITIAL_CAPACITY, len(rows))
+            tmp_vectors = self.vectors_file + ".tmp"
+            compact = np.memmap(tmp_vectors, dtype=np.float32, mode="w+", shape=(capacity, self.dimensions))
+            compact[:len(rows)] = vectors
+            compact.flush()
+            del compact
+            tmp_log = self.log_file + ".tmp"
+            with open(tmp_log, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+            self._vectors = None
+            os.replace(tmp_vectors, self.vectors_file)
+            os.replace(tmp_log, self.log_file)
+            if centroids is not None:
+                tmp_ivf = self.ivf_file + ".tmp.npz"
+                np.savez(tmp_ivf, centroids=centroids, assignments=assignments)
+                os.replace(tmp_ivf, self.ivf_file)
+            elif os.path.exists(self.ivf_file):
+                os.remove(self.ivf_file)
+
+            self._reset()
+            self._refresh()
+            return 0 if centroids is None else len(centroids)
+
+    # ------------------------------------------------------------------ #
+    # Arama
+    # ------------------------------------------------------------------ #
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 10,
+        language: Optional[str] = None,
+        story_type: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, float]]:
+        """En benzer `k` hikâye: [(story_id, kosinüs benzerliği)], büyükten küçüğe."""
+        q = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            self._refresh()
+            n = self._rows
+            if not n or k <= 0:
+                return []
+            mask = self._alive[:n].copy()
+            for vocabulary, column, value in (
+                (self._languages, self._language, language),
+                (self._types, self._type, story_type),
+            ):
+                if value is None:
+                    continue
+                code = vocabulary.get(value.strip().lower())
+                if code is None:
+                    return []
+                mask &= column[:n] == code
+            for story_id in exclude:
+                row = self._row_of.get(str(story_id))
+                if row is not None and row < n:
+                    mask[row] = False
+
+            candidates = None
+            if self._centroids is not None and mask.sum() > EXACT_SEARCH_MAX:
+                probes = min(nprobe or self.nprobe, len(self._centroids))
+                closest = np.argpartition(-(self._centroids @ q), probes - 1)[:probes]
+                candidates = np.flatnonzero(mask & np.isin(self._assign[:n], closest))
+                if len(candidates) < k:
+                    candidates = None
+            if candidates is None:
+                candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []
+
+            scores = self._vectors[candidates] @ q
+            top = min(k, len(candidates))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            return [(self._ids[candidates[i]], float(scores[i])) for i in best]
+
+    def __contains__(self, story_id: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return str(story_id) in self._row_of
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            return {
+                "vectors": len(self._row_of),
+                "rows": self._rows,
+                "capacity": 0 if self._vectors is None else len(self._vectors),
+                "lists": 0 if self._centroids is None else len(self._centroids),
+                "trained_rows": self._trained_rows,
+                "dimensions": self.dimensions,
+            }
+
+
+_index: Optional[StoryVectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> StoryVectorIndex:
+    """VECTOR_INDEX_PATH için süreç içinde tek bir indeks örneği döner."""
+    global _index
+    from app.core.config import settings
+
+    directory = settings.VECTOR_INDEX_PATH or os.path.join(settings.STORAGE_PATH, "vector_index")
+    with _index_lock:
+        if _index is None or _index.directory != directory:
+            _index = StoryVectorIndex(directory, settings.EMBEDDING_DIMENSIONS, nprobe=settings.VECTOR_INDEX_NPROBE)
+        return _index
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.llm_gateway import llm_gateway
+from app.core.document_store import get_document_store
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryVersionControlService:
     """Hikaye versiyon kontrolü servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.versions_file = os.path.join(settings.STORAGE_PATH, "story_versions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.versions_file):
-            with open(self.versions_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.versions_file)
     
     async def create_version(
         self,
@@ -30,31 +22,30 @@ class StoryVersionControlService:
         description: Optional[str] = None
     ) -> Dict:
         """Yeni versiyon oluşturur."""
-        versions = self._load_versions()
-        
-        if story_id not in versions:
-            versions[story_id] = {
-                "story_id": story_id,
-                "versions": [],
-                "current_version": None
-            }
-        
-        version_number = len(versions[story_id]["versions"]) + 1
         version_id = str(uuid.uuid4())
-        
-        version = {
-            "version_id": version_id,
-            "version_number": version_number,
-            "version_name": version_name or f"Versiyon {version_number}",
-            "description": description,
-            "story_text": story_text,
-            "created_at": datetime.now().isoformat(),
-            "created_by": None
-        }
-        
-        versions[story_id]["versions"].append(version)
-        versions[story_id]["current_version"] = version_id
-        self._save_versions(versions)
+
+        def add_version(story_versions: Dict) -> Dict:
+            version_number = len(story_versions["versions"]) + 1
+            story_versions["versions"].append({
+                "version_id": version_id,
+                "version_number": version_number,
+                "version_name": version_name or f"Versiyon {version_number}",
+                "description": description,
+                "story_text": story_text,
+                "created_at": datetime.now().isoformat(),
+                "created_by": None
+            })
+            story_versions["current_version"] = version_id
+            return story_versions
+
+        story_versions = self.store.update(
+            story_id,
+            add_version,
+            default={"story_id": story_id, "versions": [], "current_version": None}
+        )
+        version_number = next(
+            v["version_number"] for v in story_versions["versions"] if v["version_id"] == version_id
+        )
         
         return {
             "version_id": version_id,
@@ -67,8 +58,7 @@ class StoryVersionControlService:
         story_id: str
     ) -> List[Dict]:
         """Versiyon geçmişini getirir."""
-        versions = self._load_versions()
-        story_versions = versions.get(story_id, {})
+        story_versions = self.store.get(story_id, {})
         
         return story_versions.get("versions", [])
     
@@ -78,8 +68,7 @@ class StoryVersionControlService:
         version_id: str
     ) -> Dict:
         """Versiyonu geri yükler."""
-        versions = self._load_versions()
-        story_versions = versions.get(story_id, {})
+        story_versions = self.store.get(story_id, {})
         
         version = next(
             (v for v in story_versions.get("versions", []) if v["version_id"] == version_id),
@@ -110,8 +99,7 @@ class StoryVersionControlService:
         version2_id: str
     ) -> Dict:
         """İki versiyonu karşılaştırır."""
-        versions = self._load_versions()
-        story_versions = versions.get(story_id, {})
+        story_versions = self.store.get(story_id, {})
         
         v1 = next((v for v in story_versions.get("versions", []) if v["version_id"] == version1_id), None)
         v2 = next((v for v in story_versions.get("versions", []) if v["version_id"] == version2_id), None)
@@ -152,17 +140,3 @@ class StoryVersionControlService:
         union = words1.union(words2)
         
         return len(intersection) / len(union) if union else 0.0
-    
-    def _load_versions(self) -> Dict:
-        """Versiyonları yükler."""
-        try:
-            with open(self.versions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_versions(self, versions: Dict):
-        """Versiyonları kaydeder."""
-        with open(self.versions_file, 'w', encoding='utf-8') as f:
-            json.dump(versions, f, ensure_ascii=False, indent=2)
-
@@ -1,9 +1,9 @@
 from typing import List, Dict, Optional
-import json
 import os
 import uuid
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
 from app.services.story_storage import StoryStorage
 
 
@@ -11,14 +11,7 @@ class StoryVersioningService:
     def __init__(self):
         self.story_storage = StoryStorage()
         self.versions_file = os.path.join(settings.STORAGE_PATH, "story_versions.json")
-        self._ensure_file()
-    
-    def _ensure_file(self):
-        """Versiyon dosyasını oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.versions_file):
-            with open(self.versions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.versions_file, default_factory=list, item_key="version_id")
     
     def create_version(
         self,
@@ -67,31 +60,19 @@ class StoryVersioningService:
     
     def _save_version(self, version: Dict):
         """Versiyonu kaydeder."""
-        with open(self.versions_file, 'r', encoding='utf-8') as f:
-            versions = json.load(f)
-        
-        versions.append(version)
-        
-        with open(self.versions_file, 'w', encoding='utf-8') as f:
-            json.dump(versions, f, ensure_ascii=False, indent=2)
+        self.store.append(version)
     
     def get_story_versions(self, story_id: str) -> List[Dict]:
         """Hikâyenin tüm versiyonlarını getirir."""
-        with open(self.versions_file, 'r', encoding='utf-8') as f:
-            versions = json.load(f)
-        
         return sorted(
-            [v for v in versions if v.get('story_id') == story_id],
+            self.store.items(lambda v: v.get('story_id') == story_id),
             key=lambda x: x.get('version_number', 0),
             reverse=True
         )
     
     def get_version(self, version_id: str) -> Optional[Dict]:
         """Belirli bir versiyonu getirir."""
-        with open(self.versions_file, 'r', encoding='utf-8') as f:
-            versions = json.load(f)
-        
-        return next((v for v in versions if v.get('version_id') == version_id), None)
+        return self.store.get_item(version_id)
     
     def restore_version(self, version_id: str) -> Dict:
         """
@@ -177,16 +158,4 @@ class StoryVersioningService:
     
     def delete_version(self, version_id: str) -> bool:
         """Versiyonu siler."""
-        with open(self.versions_file, 'r', encoding='utf-8') as f:
-            versions = json.load(f)
-        
-        original_count = len(versions)
-        versions = [v for v in versions if v.get('version_id') != version_id]
-        
-        if len(versions) < original_count:
-            with open(self.versions_file, 'w', encoding='utf-8') as f:
-                json.dump(versions, f, ensure_ascii=False, indent=2)
-            return True
-        
-        return False
-
+        return self.store.remove_items(lambda v: v.get('version_id') == version_id) > 0
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -11,16 +11,21 @@ class StoryViralFeaturesService:
     """Hikaye sosyal paylaşım ve viral özellikler servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.viral_data_file = os.path.join(settings.STORAGE_PATH, "viral_data.json")
-        self._ensure_files()
+        self.sharing_events_file = os.path.join(settings.STORAGE_PATH, "viral_sharing_events.json")
+        self.viral_data_store = get_document_store(self.viral_data_file, default_factory=dict)
+        # Paylaşım olayları yalnızca eklenen ayrı bir listede tutulur
+        self.sharing_events_store = get_document_store(self.sharing_events_file, default_factory=list)
+        self._migrate_sharing_events()
     
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.viral_data_file):
-            with open(self.viral_data_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+    def _migrate_sharing_events(self):
+        """Eski viral_data.json içindeki paylaşım olaylarını ayrı dosyaya taşır."""
+        legacy_events = self.viral_data_store.get("sharing_events")
+        if legacy_events is None:
+            return
+        for event in legacy_events:
+            self.sharing_events_store.append(event)
+        self.viral_data_store.delete("sharing_events")
     
     async def create_viral_content(
         self,
@@ -36,14 +41,16 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
 
 {story_text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir sosyal medya içerik uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_viral_features"
         )
         
         viral_content = response.choices[0].message.content
@@ -59,11 +66,9 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
             "created_at": datetime.now().isoformat()
         }
         
-        viral_data = self._load_viral_data()
-        if story_id not in viral_data:
-            viral_data[story_id] = []
-        viral_data[story_id].append(content)
-        self._save_viral_data(viral_data)
+        self.viral_data_store.update(
+            story_id, lambda story_content: story_content + [content], default=[]
+        )
         
         return {
             "viral_id": viral_id,
@@ -78,14 +83,13 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
         user_id: Optional[str] = None
     ) -> Dict:
         """Paylaşımı takip eder."""
-        viral_data = self._load_viral_data()
-        
-        if story_id not in viral_data:
-            viral_data[story_id] = []
+        def share(story_content: List[Dict]) -> List[Dict]:
+            # Paylaşım sayısını artır
+            for content in story_content:
+                content["shares"] = content.get("shares", 0) + 1
+            return story_content
         
-        # Paylaşım sayısını artır
-        for content in viral_data[story_id]:
-            content["shares"] = content.get("shares", 0) + 1
+        story_content = self.viral_data_store.update(story_id, share, default=[])
         
         sharing_event = {
             "event_id": str(uuid.uuid4()),
@@ -95,15 +99,11 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
             "timestamp": datetime.now().isoformat()
         }
         
-        if "sharing_events" not in viral_data:
-            viral_data["sharing_events"] = []
-        viral_data["sharing_events"].append(sharing_event)
-        
-        self._save_viral_data(viral_data)
+        self.sharing_events_store.append(sharing_event)
         
         return {
             "message": "Paylaşım kaydedildi",
-            "total_shares": sum(c.get("shares", 0) for c in viral_data.get(story_id, []))
+            "total_shares": sum(c.get("shares", 0) for c in story_content)
         }
     
     async def get_viral_stats(
@@ -111,22 +111,18 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
         story_id: str
     ) -> Dict:
         """Viral istatistikleri getirir."""
-        viral_data = self._load_viral_data()
-        story_content = viral_data.get(story_id, [])
+        story_content = self.viral_data_store.get(story_id, [])
         
         total_shares = sum(c.get("shares", 0) for c in story_content)
         total_likes = sum(c.get("likes", 0) for c in story_content)
         total_views = sum(c.get("views", 0) for c in story_content)
         
         # Son 24 saatteki paylaşımlar
-        recent_shares = 0
-        if "sharing_events" in viral_data:
-            cutoff = datetime.now() - timedelta(hours=24)
-            recent_shares = len([
-                e for e in viral_data["sharing_events"]
-                if e.get("story_id") == story_id
-                and datetime.fromisoformat(e["timestamp"]) >= cutoff
-            ])
+        cutoff = datetime.now() - timedelta(hours=24)
+        recent_shares = len(self.sharing_events_store.items(
+            lambda e: e.get("story_id") == story_id
+            and datetime.fromisoformat(e["timestamp"]) >= cutoff
+        ))
         
         return {
             "story_id": story_id,
@@ -169,17 +165,3 @@ Paylaşılabilir, ilgi çekici ve akılda kalıcı olsun:
             "image_prompt": image_prompt,
             "message": "Paylaşılabilir görsel oluşturuldu"
         }
-    
-    def _load_viral_data(self) -> Dict:
-        """Viral verileri yükler."""
-        try:
-            with open(self.viral_data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_viral_data(self, viral_data: Dict):
-        """Viral verileri kaydeder."""
-        with open(self.viral_data_file, 'w', encoding='utf-8') as f:
-            json.dump(viral_data, f, ensure_ascii=False, indent=2)
-
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryVoiceCommandsService:
     """Hikaye sesli komutlar servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.commands_file = os.path.join(settings.STORAGE_PATH, "voice_commands.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.commands_file):
-            with open(self.commands_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.commands_store = get_document_store(self.commands_file, default_factory=list)
     
     async def process_voice_command(
         self,
@@ -46,9 +38,7 @@ class StoryVoiceCommandsService:
             "timestamp": datetime.now().isoformat()
         }
         
-        commands = self._load_commands()
-        commands.append(command_record)
-        self._save_commands(commands)
+        self.commands_store.append(command_record)
         
         return {
             "command_id": command_id,
@@ -98,14 +88,16 @@ class StoryVoiceCommandsService:
         prompt = f"""Kullanıcı şunu söyledi: {audio_text}
 Bu komuttan bir hikaye oluştur. Kısa ve çocuklar için uygun olsun."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=500
+            max_tokens=500,
+            cache=False,
+            cache_namespace="story_voice_commands"
         )
         
         story_text = response.choices[0].message.content
@@ -148,17 +140,3 @@ Bu komuttan bir hikaye oluştur. Kısa ve çocuklar için uygun olsun."""
             "story_id": context.get("story_id") if context else None,
             "message": "Hikaye paylaşılıyor"
         }
-    
-    def _load_commands(self) -> List[Dict]:
-        """Komutları yükler."""
-        try:
-            with open(self.commands_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_commands(self, commands: List[Dict]):
-        """Komutları kaydeder."""
-        with open(self.commands_file, 'w', encoding='utf-8') as f:
-            json.dump(commands, f, ensure_ascii=False, indent=2)
-
@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.image_service import ImageService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,11 @@ class StoryVrExperienceService:
     """Hikaye sanal gerçeklik deneyimi servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.image_service = ImageService()
         self.vr_experiences_file = os.path.join(settings.STORAGE_PATH, "vr_experiences.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.vr_experiences_file):
-            with open(self.vr_experiences_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.vr_experiences_store = get_document_store(
+            self.vr_experiences_file, default_factory=list, item_key="scene_id"
+        )
     
     async def create_vr_scene(
         self,
@@ -55,9 +49,7 @@ class StoryVrExperienceService:
             "created_at": datetime.now().isoformat()
         }
         
-        experiences = self._load_experiences()
-        experiences.append(scene)
-        self._save_experiences(experiences)
+        self.vr_experiences_store.append(scene)
         
         return {
             "scene_id": scene_id,
@@ -111,12 +103,6 @@ class StoryVrExperienceService:
         interaction_data: Dict
     ) -> Dict:
         """Sahneye etkileşim ekler."""
-        experiences = self._load_experiences()
-        scene = next((s for s in experiences if s["scene_id"] == scene_id), None)
-        
-        if not scene:
-            raise ValueError("Sahne bulunamadı")
-        
         interaction = {
             "interaction_id": str(uuid.uuid4()),
             "type": interaction_type,
@@ -124,8 +110,12 @@ class StoryVrExperienceService:
             "created_at": datetime.now().isoformat()
         }
         
-        scene["interactions"].append(interaction)
-        self._save_experiences(experiences)
+        def add(scene: Dict) -> Dict:
+            scene["interactions"].append(interaction)
+            return scene
+        
+        if not self.vr_experiences_store.update_item(scene_id, add):
+            raise ValueError("Sahne bulunamadı")
         
         return {
             "interaction_id": interaction["interaction_id"],
@@ -158,17 +148,3 @@ class StoryVrExperienceService:
             scenes = [s.strip() + '.' for s in sentences if s.strip()][:10]
         
         return scenes
-    
-    def _load_experiences(self) -> List[Dict]:
-        """Deneyimleri yükler."""
-        try:
-            with open(self.vr_experiences_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_experiences(self, experiences: List[Dict]):
-        """Deneyimleri kaydeder."""
-        with open(self.vr_experiences_file, 'w', encoding='utf-8') as f:
-            json.dump(experiences, f, ensure_ascii=False, indent=2)
-
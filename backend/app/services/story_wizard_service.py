@@ -1,8 +1,8 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 from app.services.story_service import StoryService
-import json
 import os
 import uuid
 from datetime import datetime
@@ -12,17 +12,11 @@ class StoryWizardService:
     """Hikaye oluşturma sihirbazı servisi - adım adım hikaye oluşturma"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_service = StoryService()
         self.wizard_sessions_file = os.path.join(settings.STORAGE_PATH, "wizard_sessions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.wizard_sessions_file):
-            with open(self.wizard_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.wizard_sessions_store = get_document_store(
+            self.wizard_sessions_file, default_factory=list, item_key="session_id"
+        )
     
     async def start_wizard_session(
         self,
@@ -45,9 +39,7 @@ class StoryWizardService:
             "updated_at": datetime.now().isoformat()
         }
         
-        sessions = self._load_sessions()
-        sessions.append(session)
-        self._save_sessions(sessions)
+        self.wizard_sessions_store.append(session)
         
         return {
             "session_id": session_id,
@@ -63,41 +55,49 @@ class StoryWizardService:
         answer: str
     ) -> Dict:
         """Sihirbaz adımını günceller."""
-        sessions = self._load_sessions()
-        session = next((s for s in sessions if s["session_id"] == session_id), None)
-        
-        if not session:
-            raise ValueError("Oturum bulunamadı")
-        
+        changes = {}
         if step == 1:
-            session["theme"] = answer
-            session["step"] = 2
+            changes["theme"] = answer
+            changes["step"] = 2
             next_question = "Hikayenizde hangi karakterler olacak? (virgülle ayırın)"
         elif step == 2:
             characters = [c.strip() for c in answer.split(",")]
-            session["characters"] = characters
-            session["step"] = 3
+            changes["characters"] = characters
+            changes["step"] = 3
             next_question = "Hikaye nerede geçiyor? (mekan/ortam)"
         elif step == 3:
-            session["setting"] = answer
-            session["step"] = 4
+            changes["setting"] = answer
+            changes["step"] = 4
             next_question = "Hikayenin ana olay örgüsü nedir? (kısa özet)"
         elif step == 4:
-            session["plot_points"] = [answer]
-            session["step"] = 5
+            changes["plot_points"] = [answer]
+            changes["step"] = 5
             next_question = "Hikaye stili nedir? (masal, macera, fantastik, vb.)"
         elif step == 5:
-            session["style"] = answer
-            session["step"] = 6
+            changes["style"] = answer
+            changes["step"] = 6
             next_question = "Hikaye uzunluğu? (kısa, orta, uzun)"
         elif step == 6:
-            session["length"] = answer
-            session["step"] = 7
+            changes["length"] = answer
+            changes["step"] = 7
+        else:
+            next_question = "Tamamlandı"
+        
+        def apply(session: Dict) -> Dict:
+            session.update(changes)
             session["updated_at"] = datetime.now().isoformat()
+            return session
+        
+        session = self.wizard_sessions_store.update_item(session_id, apply)
+        if not session:
+            raise ValueError("Oturum bulunamadı")
+        
+        if step == 6:
             # Hikayeyi oluştur
             story_result = await self._generate_story_from_wizard(session)
-            session["story_id"] = story_result.get("story_id")
-            self._save_sessions(sessions)
+            self.wizard_sessions_store.update_item(
+                session_id, lambda s: {**s, "story_id": story_result.get("story_id")}
+            )
             return {
                 "session_id": session_id,
                 "step": 7,
@@ -105,11 +105,6 @@ class StoryWizardService:
                 "story_id": story_result.get("story_id"),
                 "message": "Hikayeniz başarıyla oluşturuldu!"
             }
-        else:
-            next_question = "Tamamlandı"
-        
-        session["updated_at"] = datetime.now().isoformat()
-        self._save_sessions(sessions)
         
         return {
             "session_id": session_id,
@@ -130,14 +125,16 @@ Uzunluk: {session.get('length', 'orta')}
 
 Hikayeyi Türkçe olarak yaz ve çocuklar için uygun bir dil kullan."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir çocuk hikayesi yazarısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_wizard"
         )
         
         story_text = response.choices[0].message.content
@@ -152,28 +149,11 @@ Hikayeyi Türkçe olarak yaz ve çocuklar için uygun bir dil kullan."""
         
         return result
     
-    def _load_sessions(self) -> List[Dict]:
-        """Oturumları yükler."""
-        try:
-            with open(self.wizard_sessions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_sessions(self, sessions: List[Dict]):
-        """Oturumları kaydeder."""
-        with open(self.wizard_sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, ensure_ascii=False, indent=2)
-    
     async def get_wizard_session(self, session_id: str) -> Optional[Dict]:
         """Sihirbaz oturumunu getirir."""
-        sessions = self._load_sessions()
-        return next((s for s in sessions if s["session_id"] == session_id), None)
+        return self.wizard_sessions_store.get_item(session_id)
     
     async def cancel_wizard_session(self, session_id: str) -> Dict:
         """Sihirbaz oturumunu iptal eder."""
-        sessions = self._load_sessions()
-        sessions = [s for s in sessions if s["session_id"] != session_id]
-        self._save_sessions(sessions)
+        self.wizard_sessions_store.remove_items(lambda s: s["session_id"] == session_id)
         return {"message": "Oturum iptal edildi"}
-
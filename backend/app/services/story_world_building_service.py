@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,8 @@ class StoryWorldBuildingService:
     """Hikaye dünya yapımı (world building) servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.worlds_file = os.path.join(settings.STORAGE_PATH, "story_worlds.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.worlds_file):
-            with open(self.worlds_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.worlds_store = get_document_store(self.worlds_file, default_factory=list, item_key="world_id")
     
     async def create_world(
         self,
@@ -43,14 +35,16 @@ Hikaye:
 
 Dünya türü: {world_type}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir dünya yapımı uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            cache=False,
+            cache_namespace="story_world_building"
         )
         
         world_description = response.choices[0].message.content
@@ -70,9 +64,7 @@ Dünya türü: {world_type}"""
         world["locations"] = await self._extract_locations(world_description)
         world["characters"] = await self._extract_world_characters(world_description)
         
-        worlds = self._load_worlds()
-        worlds.append(world)
-        self._save_worlds(worlds)
+        self.worlds_store.append(world)
         
         return {
             "world_id": world_id,
@@ -89,12 +81,6 @@ Dünya türü: {world_type}"""
         location_type: str = "city"
     ) -> Dict:
         """Dünyaya yer ekler."""
-        worlds = self._load_worlds()
-        world = next((w for w in worlds if w["world_id"] == world_id), None)
-        
-        if not world:
-            raise ValueError("Dünya bulunamadı")
-        
         location = {
             "location_id": str(uuid.uuid4()),
             "name": location_name,
@@ -103,8 +89,12 @@ Dünya türü: {world_type}"""
             "created_at": datetime.now().isoformat()
         }
         
-        world["locations"].append(location)
-        self._save_worlds(worlds)
+        def add(world: Dict) -> Dict:
+            world["locations"].append(location)
+            return world
+        
+        if not self.worlds_store.update_item(world_id, add):
+            raise ValueError("Dünya bulunamadı")
         
         return {
             "location_id": location["location_id"],
@@ -119,12 +109,6 @@ Dünya türü: {world_type}"""
         description: str
     ) -> Dict:
         """Dünyaya karakter ekler."""
-        worlds = self._load_worlds()
-        world = next((w for w in worlds if w["world_id"] == world_id), None)
-        
-        if not world:
-            raise ValueError("Dünya bulunamadı")
-        
         character = {
             "character_id": str(uuid.uuid4()),
             "name": character_name,
@@ -133,8 +117,12 @@ Dünya türü: {world_type}"""
             "created_at": datetime.now().isoformat()
         }
         
-        world["characters"].append(character)
-        self._save_worlds(worlds)
+        def add(world: Dict) -> Dict:
+            world["characters"].append(character)
+            return world
+        
+        if not self.worlds_store.update_item(world_id, add):
+            raise ValueError("Dünya bulunamadı")
         
         return {
             "character_id": character["character_id"],
@@ -175,19 +163,4 @@ Dünya türü: {world_type}"""
     
     async def get_world(self, world_id: str) -> Optional[Dict]:
         """Dünyayı getirir."""
-        worlds = self._load_worlds()
-        return next((w for w in worlds if w["world_id"] == world_id), None)
-    
-    def _load_worlds(self) -> List[Dict]:
-        """Dünyaları yükler."""
-        try:
-            with open(self.worlds_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_worlds(self, worlds: List[Dict]):
-        """Dünyaları kaydeder."""
-        with open(self.worlds_file, 'w', encoding='utf-8') as f:
-            json.dump(worlds, f, ensure_ascii=False, indent=2)
-
+        return self.worlds_store.get_item(world_id)
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, Optional
 from app.core.config import settings
-import json
+from app.core.document_store import get_document_store
+from app.core.llm_gateway import llm_gateway
 import os
 import uuid
 from datetime import datetime
@@ -11,16 +11,10 @@ class StoryWritingAssistantService:
     """Hikaye AI yazım asistanı servisi"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.assistant_sessions_file = os.path.join(settings.STORAGE_PATH, "writing_assistant_sessions.json")
-        self._ensure_files()
-    
-    def _ensure_files(self):
-        """Dosyaları oluşturur."""
-        os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-        if not os.path.exists(self.assistant_sessions_file):
-            with open(self.assistant_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+        self.assistant_sessions_store = get_document_store(
+            self.assistant_sessions_file, default_factory=list, item_key="session_id"
+        )
     
     async def start_writing_session(
         self,
@@ -41,9 +35,7 @@ class StoryWritingAssistantService:
             "created_at": datetime.now().isoformat()
         }
         
-        sessions = self._load_sessions()
-        sessions.append(session)
-        self._save_sessions(sessions)
+        self.assistant_sessions_store.append(session)
         
         # İlk öneri
         initial_suggestion = await self._generate_initial_suggestion(story_idea, writing_style)
@@ -61,8 +53,7 @@ class StoryWritingAssistantService:
         context: Optional[str] = None
     ) -> Dict:
         """Yazım önerisi alır."""
-        sessions = self._load_sessions()
-        session = next((s for s in sessions if s["session_id"] == session_id), None)
+        session = self.assistant_sessions_store.get_item(session_id)
         
         if not session:
             raise ValueError("Oturum bulunamadı")
@@ -75,26 +66,30 @@ Mevcut metin:
 
 {len(current_text.split())} kelimelik bir devam önerisi yap."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"Sen bir {session['writing_style']} hikayesi yazım asistanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=300
+            max_tokens=300,
+            cache=False,
+            cache_namespace="story_writing_assistant"
         )
         
         suggestion = response.choices[0].message.content
         
-        session["suggestions"].append({
-            "suggestion_id": str(uuid.uuid4()),
-            "text": suggestion,
-            "timestamp": datetime.now().isoformat()
-        })
-        session["updated_at"] = datetime.now().isoformat()
+        def add_suggestion(session: Dict) -> Dict:
+            session["suggestions"].append({
+                "suggestion_id": str(uuid.uuid4()),
+                "text": suggestion,
+                "timestamp": datetime.now().isoformat()
+            })
+            session["updated_at"] = datetime.now().isoformat()
+            return session
         
-        self._save_sessions(sessions)
+        session = self.assistant_sessions_store.update_item(session_id, add_suggestion) or session
         
         return {
             "suggestion": suggestion,
@@ -108,8 +103,7 @@ Mevcut metin:
         improvement_type: str = "general"
     ) -> Dict:
         """Metni iyileştirir."""
-        sessions = self._load_sessions()
-        session = next((s for s in sessions if s["session_id"] == session_id), None)
+        session = self.assistant_sessions_store.get_item(session_id)
         
         if not session:
             raise ValueError("Oturum bulunamadı")
@@ -126,14 +120,16 @@ Mevcut metin:
 
 {text}"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir metin editörüsün."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=False,
+            cache_namespace="story_writing_assistant"
         )
         
         improved_text = response.choices[0].message.content
@@ -155,14 +151,15 @@ Mevcut metin:
 
 Hataları liste halinde göster."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir dilbilgisi uzmanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=500
+            max_tokens=500,
+            cache_namespace="story_writing_assistant"
         )
         
         corrections = response.choices[0].message.content
@@ -183,28 +180,16 @@ Hataları liste halinde göster."""
 
 Kısa ve ilgi çekici bir başlangıç."""
 
-        response = self.openai_client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Sen bir hikaye yazım asistanısın."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
-            max_tokens=200
+            max_tokens=200,
+            cache=False,
+            cache_namespace="story_writing_assistant"
         )
         
         return response.choices[0].message.content
-    
-    def _load_sessions(self) -> List[Dict]:
-        """Oturumları yükler."""
-        try:
-            with open(self.assistant_sessions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_sessions(self, sessions: List[Dict]):
-        """Oturumları kaydeder."""
-        with open(self.assistant_sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, ensure_ascii=False, indent=2)
-
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class TemplatesEnhancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.templates_file = os.path.join(settings.STORAGE_PATH, "templates_enhanced.json")
         self.marketplace_file = os.path.join(settings.STORAGE_PATH, "template_marketplace.json")
         self._ensure_files()
@@ -43,13 +42,15 @@ Kategori: {category}
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir şablon uzmanısın. Hikâye şablonları oluşturuyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="templates_enhanced"
             )
             
             result_text = response.choices[0].message.content
@@ -1,6 +1,6 @@
 from typing import List, Dict, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.story_storage import StoryStorage
 import json
 import re
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class TimelineService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.story_storage = StoryStorage()
     
     async def generate_timeline(
@@ -66,13 +65,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir hikâye analiz uzmanısın. Olayları zaman çizelgesine dönüştürüyorsun."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="timeline"
             )
             
             timeline_text = response.choices[0].message.content
@@ -156,13 +156,14 @@ JSON formatında döndür:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir karakter analiz uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                cache_namespace="timeline"
             )
             
             relationship_text = response.choices[0].message.content
@@ -1,4 +1,8 @@
+import asyncio
+import io
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 try:
     from gtts import gTTS
     GTTS_AVAILABLE = True
@@ -17,6 +21,55 @@ from typing import Optional, Dict, List
 from app.core.config import settings
 from openai import OpenAI
 from app.services.cloud_storage_service import cloud_storage_service
+from app.services.audio_chunk_cache import AudioChunkCache, chunk_key, concat_mp3, mp3_duration, split_into_chunks
+
+# gTTS / OpenAI istemcisi / pydub bloklayıcı: parçalar bu havuzda üretilir
+_tts_executor = ThreadPoolExecutor(max_workers=max(1, settings.TTS_CONCURRENCY), thread_name_prefix="tts")
+_chunk_cache: Optional[AudioChunkCache] = None
+# Olay döngüsü başına sağlayıcı semaforları (Celery her görevde yeni döngü açar)
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# TTS_PROVIDER_CONCURRENCY'de adı geçmeyen sağlayıcılar için eşzamanlı istek sınırı
+DEFAULT_PROVIDER_LIMIT = 2
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """"openai=4,elevenlabs=2" biçimini sözlüğe çevirir; hatalı girdiler atlanır."""
+    limits = {}
+    for item in (value or "").split(","):
+        name, _, count = item.partition("=")
+        if name.strip() and count.strip().isdigit():
+            limits[name.strip().lower()] = max(1, int(count))
+    return limits
+
+
+def provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """
+    Sağlayıcıya giden TTS isteklerini süreç genelinde sınırlayan semafor.
+
+    Tüm hikâyeler, sesli kitaplar ve podcast'ler aynı semaforu paylaşır; eşzamanlı
+    yapılar sağlayıcı yükünü katlamaz.
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _provider_semaphores.setdefault(loop, {})
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        limit = parse_limits(settings.TTS_PROVIDER_CONCURRENCY).get(provider, DEFAULT_PROVIDER_LIMIT)
+        semaphore = semaphores[provider] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+def get_audio_chunk_cache() -> AudioChunkCache:
+    """Süreç genelinde paylaşılan parça önbelleği."""
+    global _chunk_cache
+    if _chunk_cache is None:
+        _chunk_cache = AudioChunkCache(
+            settings.TTS_CHUNK_CACHE_PATH or os.path.join(settings.STORAGE_PATH, "audio", "chunks"),
+            max_bytes=settings.TTS_CHUNK_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _chunk_cache
 
 
 class TTSService:
@@ -78,108 +131,184 @@ class TTSService:
             character_id: Karakter ID'si (karakter özelliklerine göre ses seçimi için)
         """
         try:
-            # OpenAI TTS kullanılabilirse ve ses OpenAI sesi ise onu kullan
-            is_openai_voice = voice in self.voice_options
-            
-            if self.openai_client and is_openai_voice:
-                return await self._generate_with_openai_tts(
-                    text, language, story_id, voice, emotion, audio_speed
-                )
-            
-            # ElevenLabs entegrasyonu (Wiro veya Direct)
-            is_wiro_tts = "elevenlabs" in settings.TTS_MODEL.lower() and "wiro" in settings.GPT_BASE_URL
-            
-            if (is_wiro_tts or settings.ELEVENLABS_API_KEY) and voice and not is_openai_voice:
-                 return await self._generate_with_elevenlabs(
-                    text, voice, story_id
-                 )
-            
-            # Karakter bazlı ses seçimi (eğer voice None ise)
-            selected_voice = voice or self._select_voice_for_character(character_id)
-            
-            # Eğer seçilen ses OpenAI sesi ise tekrar dene
-            if self.openai_client and selected_voice in self.voice_options:
-                 return await self._generate_with_openai_tts(
-                    text, language, story_id, selected_voice, emotion, audio_speed
-                )
-
-            # Duygu tonunu metne ekle (eğer belirtilmişse)
-            processed_text = self._add_emotion_to_text(text, emotion)
-            
-            # Dil kodunu kontrol et
-            lang_code = self.supported_languages.get(language, "tr")
-            
-            # Hızı sınırla
-            audio_speed = max(0.5, min(2.0, audio_speed))
-            
-            # gTTS ile ses üret
-            tts = gTTS(text=processed_text, lang=lang_code, slow=audio_slow)
-            
-            # Geçici dosya
-            temp_audio_id = str(uuid.uuid4())
-            temp_audio_path = f"{settings.STORAGE_PATH}/audio/{temp_audio_id}.mp3"
-            
-            tts.save(temp_audio_path)
-            
-            # Ses hızını ayarla (eğer 1.0 değilse)
-            if audio_speed != 1.0:
-                audio = AudioSegment.from_mp3(temp_audio_path)
-                # Hızı değiştir (frame_rate değiştirerek)
-                new_frame_rate = int(audio.frame_rate * audio_speed)
-                audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_frame_rate})
-                audio = audio.set_frame_rate(audio.frame_rate)
-                
-                # Final dosya
-                audio_id = story_id or str(uuid.uuid4())
-                audio_path = f"{settings.STORAGE_PATH}/audio/{audio_id}.mp3"
-                audio.export(audio_path, format="mp3")
-                
-                # Geçici dosyayı sil
-                try:
-                    os.remove(temp_audio_path)
-                except:
-                    pass
-            else:
-                # Hız değişikliği yoksa sadece ismi değiştir
-                audio_id = story_id or str(uuid.uuid4())
-                audio_path = f"{settings.STORAGE_PATH}/audio/{audio_id}.mp3"
-                os.rename(temp_audio_path, audio_path)
-            
-            # URL döndür
-            # Cloudinary upload (Supabase Storage)
-            cloudinary_url = await cloud_storage_service.upload_audio(
-                audio_path,
-                folder="audio",
-                public_id=f"story_audio_{audio_id}"
+            result = await self.synthesize(
+                text, language, story_id, audio_speed, audio_slow, voice, emotion, character_id
             )
-            return cloudinary_url
-        
+            return result["audio_url"]
         except Exception as e:
             print(f"TTS hatası: {e}")
             # Hata durumunda boş bir ses dosyası oluştur
             return self._create_empty_audio(story_id)
     
-    async def _generate_with_elevenlabs(self, text: str, voice_id: str, story_id: str) -> str:
+    def provider_for(self, voice: Optional[str] = None, character_id: Optional[str] = None) -> str:
+        """Çağrının gideceği TTS sağlayıcısı: "openai", "elevenlabs" ya da "gtts"."""
+        is_openai_voice = voice in self.voice_options
+        if self.openai_client and is_openai_voice:
+            return "openai"
+        
+        # ElevenLabs entegrasyonu (Wiro veya Direct)
+        is_wiro_tts = "elevenlabs" in settings.TTS_MODEL.lower() and "wiro" in settings.GPT_BASE_URL
+        if (is_wiro_tts or settings.ELEVENLABS_API_KEY) and voice and not is_openai_voice:
+            return "elevenlabs"
+        
+        # Karakter bazlı ses seçimi (eğer voice None ise) OpenAI sesine düşebilir
+        selected_voice = voice or self._select_voice_for_character(character_id)
+        if self.openai_client and selected_voice in self.voice_options:
+            return "openai"
+        return "gtts"
+    
+    async def synthesize(
+        self,
+        text: str,
+        language: str,
+        audio_id: Optional[str] = None,
+        audio_speed: float = 1.0,
+        audio_slow: bool = False,
+        voice: Optional[str] = None,
+        emotion: Optional[str] = None,
+        character_id: Optional[str] = None
+    ) -> Dict:
+        """
+        generate_speech ile aynı seslendirme; hata yutulmaz ve ölçülen süre de döner.
+        
+        Returns:
+            {"audio_url": ..., "duration": saniye (MP3 çerçevelerinden ölçülür)}
+        """
+        provider = self.provider_for(voice, character_id)
+        if provider == "openai":
+            selected_voice = voice or self._select_voice_for_character(character_id)
+            return await self._generate_with_openai_tts(
+                text, language, audio_id, selected_voice, emotion, audio_speed
+            )
+        if provider == "elevenlabs":
+            return await self._generate_with_elevenlabs(text, voice, audio_id)
+        
+        # Duygu tonunu metne ekle (eğer belirtilmişse)
+        processed_text = self._add_emotion_to_text(text, emotion)
+        
+        # Dil kodunu kontrol et
+        lang_code = self.supported_languages.get(language, "tr")
+        
+        # Hızı sınırla
+        audio_speed = max(0.5, min(2.0, audio_speed))
+        
+        audio_id = audio_id or str(uuid.uuid4())
+        audio_path = await self._synthesize(
+            processed_text,
+            audio_id,
+            lambda chunk: self._run_blocking(self._render_gtts_chunk, chunk, lang_code, audio_slow, audio_speed),
+            engine="gtts", language=lang_code, slow=audio_slow, speed=audio_speed,
+        )
+        return await self._publish(audio_path, audio_id)
+    
+    async def _synthesize(self, text: str, audio_id: str, render, **voice_params) -> str:
+        """
+        Metni parçalara böler, önbellekte olmayan parçaları eşzamanlı üretir ve
+        hepsini {STORAGE_PATH}/audio/{audio_id}.mp3 dosyasında birleştirir.
+        
+        Args:
+            text: Seslendirilecek metin
+            audio_id: Çıktı dosyasının adı
+            render: Parça metnini alıp MP3 baytlarını döndüren coroutine fonksiyonu
+            voice_params: Sesi belirleyen parametreler (motor, ses, dil, hız...);
+                parça önbelleğinin anahtarına girer. ``engine`` sağlayıcı adıdır:
+                istekler çağrı başına TTS_CONCURRENCY ile, sağlayıcı başına da
+                süreç genelinde (provider_semaphore) sınırlanır
+        """
+        chunks = split_into_chunks(text, settings.TTS_CHUNK_MAX_CHARS)
+        if not chunks:
+            raise ValueError("Seslendirilecek metin boş")
+        
+        cache = get_audio_chunk_cache()
+        keys = [chunk_key(chunk, **voice_params) for chunk in chunks]
+        semaphore = asyncio.Semaphore(max(1, settings.TTS_CONCURRENCY))
+        
+        provider_limit = provider_semaphore(voice_params["engine"])
+        
+        async def produce(key: str, chunk: str):
+            async with semaphore, provider_limit:
+                data = await render(chunk)
+            cache.put(key, data)
+        
+        # Aynı parça metinde tekrar ediyorsa (nakarat) bir kez üretilir
+        pending = {}
+        for key, chunk in zip(keys, chunks):
+            if key not in pending and cache.get(key) is None:
+                pending[key] = asyncio.ensure_future(produce(key, chunk))
+        if pending:
+            try:
+                await asyncio.gather(*pending.values())
+            except BaseException:
+                for task in pending.values():
+                    task.cancel()
+                raise
+        
+        audio_path = f"{settings.STORAGE_PATH}/audio/{audio_id}.mp3"
+        await self._run_blocking(self._stitch, [cache.path(key) for key in keys], audio_path)
+        if pending and cache.max_bytes:
+            asyncio.get_running_loop().run_in_executor(_tts_executor, cache.prune)
+        return audio_path
+    
+    @staticmethod
+    async def _run_blocking(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(_tts_executor, func, *args)
+    
+    @staticmethod
+    def _stitch(chunk_paths: List[str], audio_path: str):
+        """Parçaları çözmeden tek dosyaya akıtır; yarım dosya görünmesin diye geçici dosyadan taşır."""
+        temp_path = f"{audio_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, "wb") as output:
+                concat_mp3(chunk_paths, output)
+            os.replace(temp_path, audio_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    async def _publish(self, audio_path: str, audio_id: str) -> Dict:
+        """Süreyi ölçer (yükleme yerel dosyayı silebilir) ve sesi buluta yükler."""
+        duration = await self._run_blocking(mp3_duration, audio_path)
+        # Cloudinary upload (Supabase Storage); bulut kapalıysa yerel yol döner
+        audio_url = await cloud_storage_service.upload_audio(
+            audio_path,
+            folder="audio",
+            public_id=f"story_audio_{audio_id}"
+        )
+        return {"audio_url": audio_url, "duration": round(duration, 2)}
+    
+    def _render_gtts_chunk(self, text: str, lang_code: str, audio_slow: bool, audio_speed: float) -> bytes:
+        """Tek bir parçayı gTTS ile üretir; hız 1.0 değilse yalnız bu parçayı yeniden kodlar."""
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang_code, slow=audio_slow).write_to_fp(buffer)
+        if audio_speed == 1.0:
+            return buffer.getvalue()
+        
+        buffer.seek(0)
+        audio = AudioSegment.from_file(buffer, format="mp3")
+        # Hızı değiştir (frame_rate değiştirerek), sonra özgün örnekleme hızına geri örnekle
+        original_rate = audio.frame_rate
+        audio = audio._spawn(audio.raw_data, overrides={"frame_rate": int(original_rate * audio_speed)})
+        audio = audio.set_frame_rate(original_rate)
+        
+        output = io.BytesIO()
+        audio.export(output, format="mp3")
+        return output.getvalue()
+    
+    async def _generate_with_elevenlabs(self, text: str, voice_id: str, story_id: str) -> Dict:
         """ElevenLabs ile ses üretir."""
         from app.services.voice_cloning_service import voice_cloning_service
         try:
-            audio_bytes = await voice_cloning_service.generate_speech(text, voice_id)
-            
-            # Ses dosyasını kaydet
             audio_id = story_id or str(uuid.uuid4())
-            audio_path = f"{settings.STORAGE_PATH}/audio/{audio_id}.mp3"
-            
-            with open(audio_path, "wb") as f:
-                f.write(audio_bytes)
-            
-            # Upload to Cloudinary (will delete local file if successful)
-            cloudinary_url = await cloud_storage_service.upload_audio(
-                audio_path,
-                folder="audio",
-                public_id=f"story_audio_{audio_id}"
+            audio_path = await self._synthesize(
+                text,
+                audio_id,
+                lambda chunk: voice_cloning_service.generate_speech(chunk, voice_id),
+                engine="elevenlabs", model=settings.TTS_MODEL, voice=voice_id, format=settings.TTS_FORMAT,
             )
             
-            return cloudinary_url
+            # Upload to Cloudinary (will delete local file if successful)
+            return await self._publish(audio_path, audio_id)
         except Exception as e:
             print(f"ElevenLabs TTS hatası: {e}")
             raise
@@ -192,39 +321,38 @@ class TTSService:
         voice: str,
         emotion: Optional[str],
         audio_speed: float
-    ) -> str:
+    ) -> Dict:
         """OpenAI TTS API ile ses üretir."""
         try:
             # Duygu tonunu metne ekle
             processed_text = self._add_emotion_to_text(text, emotion)
             
-            # OpenAI TTS API
-            response = self.openai_client.audio.speech.create(
-                model="tts-1",
-                voice=voice if voice in self.voice_options else "alloy",
-                input=processed_text,
-                speed=audio_speed
-            )
+            voice = voice if voice in self.voice_options else "alloy"
             
-            # Ses dosyasını kaydet
+            # OpenAI TTS API (parça başına bir istek; 4096 karakter sınırına da takılmaz)
             audio_id = story_id or str(uuid.uuid4())
-            audio_path = f"{settings.STORAGE_PATH}/audio/{audio_id}.mp3"
-            
-            with open(audio_path, "wb") as f:
-                f.write(response.content)
-            
-            # Upload to Cloudinary (will delete local file if successful)
-            cloudinary_url = await cloud_storage_service.upload_audio(
-                audio_path,
-                folder="audio",
-                public_id=f"story_audio_{audio_id}"
+            audio_path = await self._synthesize(
+                processed_text,
+                audio_id,
+                lambda chunk: self._run_blocking(self._render_openai_chunk, chunk, voice, audio_speed),
+                engine="openai", model="tts-1", voice=voice, speed=audio_speed,
             )
             
-            return cloudinary_url
+            # Upload to Cloudinary (will delete local file if successful)
+            return await self._publish(audio_path, audio_id)
         except Exception as e:
             print(f"OpenAI TTS hatası: {e}")
             raise
     
+    def _render_openai_chunk(self, text: str, voice: str, audio_speed: float) -> bytes:
+        response = self.openai_client.audio.speech.create(
+            model="tts-1",
+            voice=voice,
+            input=text,
+            speed=audio_speed
+        )
+        return response.content
+    
     def _select_voice_for_character(self, character_id: Optional[str]) -> str:
         """Karakter özelliklerine göre ses seçer."""
         if not character_id:
@@ -254,6 +382,7 @@ class TTSService:
             # Metnin başına veya sonuna duygu ipucu eklenebilir
             # gTTS bunu desteklemez ama OpenAI TTS için hazırlık
             return text
+        return text
     
     def get_available_voices(self) -> List[Dict]:
         """Kullanılabilir ses seçeneklerini döndürür."""
@@ -1,34 +1,69 @@
-import json
-import os
+import threading
 import uuid
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from datetime import datetime
 from app.core.config import settings
+from app.core.document_store import get_document_store
+from app.core.leaderboard_store import XP_BOARD, leaderboards
+
+
+# Kullanıcı dosyası başına süreç içi user_id -> device_id dizini
+_device_indexes: Dict[str, Dict[str, str]] = {}
+_device_indexes_lock = threading.Lock()
 
 
 class UserService:
     def __init__(self):
         self.users_file = f"{settings.STORAGE_PATH}/users.json"
-        self._ensure_users_file()
-    
-    def _ensure_users_file(self):
-        """Users dosyasının var olduğundan emin olur."""
-        if not os.path.exists(self.users_file):
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.store = get_document_store(self.users_file)
+        with _device_indexes_lock:
+            self._device_ids = _device_indexes.setdefault(self.store.path, {})
     
     def _load_users(self) -> Dict[str, Dict]:
         """Tüm kullanıcıları yükler."""
-        try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return self.store.read()
+    
+    def _device_id(self, user_id: str) -> Optional[str]:
+        """
+        user_id'nin anahtarı (device_id). Dizinde yoksa (ör. başka bir worker'ın
+        kaydettiği kullanıcı) dizin tek taramayla yenilenir.
+        """
+        device_id = self._device_ids.get(user_id)
+        if device_id is None:
+            self._device_ids.update({
+                user['user_id']: key for key, user in self.store.scan() if user.get('user_id')
+            })
+            device_id = self._device_ids.get(user_id)
+        return device_id
     
-    def _save_users(self, users: Dict[str, Dict]):
-        """Kullanıcıları kaydeder."""
-        with open(self.users_file, 'w', encoding='utf-8') as f:
-            json.dump(users, f, ensure_ascii=False, indent=2)
+    def _find_by_user_id(self, user_id: str) -> Optional[Dict]:
+        """user_id'ye göre kullanıcıyı bulur (anahtar device_id'dir)."""
+        device_id = self._device_id(user_id)
+        user = self.store.get(device_id) if device_id else None
+        if user is None or user.get('user_id') != user_id:
+            return None
+        return user
+    
+    def _update_user(self, user_id: str, mutate: Callable[[Dict], Optional[bool]]) -> Optional[Dict]:
+        """
+        Kullanıcıyı depo kilidi altında oku-değiştir-yaz ile günceller;
+        `mutate` False dönerse updated_at değişmez.
+        """
+        device_id = self._device_id(user_id)
+        if device_id is None:
+            return None
+
+        def update(user: Optional[Dict]) -> Optional[Dict]:
+            if user is None or user.get('user_id') != user_id:
+                return user
+            if mutate(user) is not False:
+                user['updated_at'] = datetime.now().isoformat()
+            return user
+
+        user = self.store.update(device_id, update)
+        if user is None or user.get('user_id') != user_id:
+            return None
+        return user
     
     def register_user(self, device_id: str, name: Optional[str] = None) -> Dict:
         """
@@ -41,11 +76,10 @@ class UserService:
         Returns:
             Kullanıcı verisi
         """
-        users = self._load_users()
-        
         # Eğer kullanıcı zaten varsa döndür
-        if device_id in users:
-            return users[device_id]
+        existing = self.store.get(device_id)
+        if existing is not None:
+            return existing
         
         # Yeni kullanıcı oluştur
         user_id = str(uuid.uuid4())
@@ -59,37 +93,22 @@ class UserService:
             'updated_at': datetime.now().isoformat(),
         }
         
-        users[device_id] = user
-        self._save_users(users)
+        self.store.put(device_id, user)
+        self._device_ids[user_id] = device_id
         
         return user
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Belirli bir kullanıcıyı getirir."""
-        users = self._load_users()
-        return next((u for u in users.values() if u.get('user_id') == user_id), None)
+        return self._find_by_user_id(user_id)
     
     def get_user_by_device_id(self, device_id: str) -> Optional[Dict]:
         """Device ID'ye göre kullanıcıyı getirir."""
-        users = self._load_users()
-        return users.get(device_id)
+        return self.store.get(device_id)
     
     def update_user(self, user_id: str, updates: Dict) -> Optional[Dict]:
         """Kullanıcıyı günceller."""
-        users = self._load_users()
-        user = next((u for u in users.values() if u.get('user_id') == user_id), None)
-        
-        if not user:
-            return None
-        
-        user.update(updates)
-        user['updated_at'] = datetime.now().isoformat()
-        
-        # Device ID'ye göre kaydet
-        users[user['device_id']] = user
-        self._save_users(users)
-        
-        return user
+        return self._update_user(user_id, lambda user: user.update(updates))
     
     def get_user_statistics(self, user_id: str) -> Dict:
         """Kullanıcı istatistiklerini getirir."""
@@ -108,31 +127,26 @@ class UserService:
     
     def add_xp(self, user_id: str, xp_amount: int) -> Dict:
         """Kullanıcıya XP ekler ve seviyeyi hesaplar."""
-        users = self._load_users()
-        user = next((u for u in users.values() if u.get('user_id') == user_id), None)
+        result = {}
+
+        def gain(user: Dict):
+            result['previous_level'] = user.get('level', 1)
+            user['xp'] = user.get('xp', 0) + xp_amount
+            user['level'] = self._calculate_level(user['xp'])
+
+        user = self._update_user(user_id, gain)
         
         if not user:
             return None
         
-        current_xp = user.get('xp', 0)
-        current_level = user.get('level', 1)
-        
-        new_xp = current_xp + xp_amount
-        new_level = self._calculate_level(new_xp)
-        
-        user['xp'] = new_xp
-        user['level'] = new_level
-        user['updated_at'] = datetime.now().isoformat()
-        
-        users[user['device_id']] = user
-        self._save_users(users)
+        leaderboards.set(XP_BOARD, user_id, user['xp'])
         
         return {
             'user_id': user_id,
-            'xp': new_xp,
-            'level': new_level,
+            'xp': user['xp'],
+            'level': user['level'],
             'xp_gained': xp_amount,
-            'leveled_up': new_level > current_level
+            'leveled_up': user['level'] > result['previous_level']
         }
     
     def _calculate_level(self, xp: int) -> int:
@@ -147,58 +161,59 @@ class UserService:
     
     def record_activity(self, user_id: str) -> Dict:
         """Günlük aktiviteyi kaydeder ve streak'i günceller."""
-        users = self._load_users()
-        user = next((u for u in users.values() if u.get('user_id') == user_id), None)
+        today = datetime.now().date().isoformat()
+        result = {}
+
+        def touch(user: Dict):
+            last_activity = user.get('last_activity_date')
+            current_streak = user.get('streak', 0)
+            result['previous_streak'] = current_streak if last_activity else 0
+            
+            if last_activity == today:
+                # Bugün zaten aktivite kaydedilmiş
+                result['already_recorded'] = True
+                return False
+            
+            # Son aktivite bugün değilse streak'i kontrol et
+            if last_activity:
+                last_date = datetime.fromisoformat(last_activity).date()
+                days_diff = (datetime.fromisoformat(today).date() - last_date).days
+                
+                if days_diff == 1:
+                    # Streak devam ediyor
+                    current_streak += 1
+                elif days_diff > 1:
+                    # Streak kırıldı
+                    current_streak = 1
+            else:
+                # İlk aktivite
+                current_streak = 1
+            
+            user['streak'] = current_streak
+            user['last_activity_date'] = today
+
+        user = self._update_user(user_id, touch)
         
         if not user:
             return None
         
-        today = datetime.now().date().isoformat()
-        last_activity = user.get('last_activity_date')
-        current_streak = user.get('streak', 0)
-        
-        if last_activity == today:
-            # Bugün zaten aktivite kaydedilmiş
+        if result.get('already_recorded'):
             return {
                 'user_id': user_id,
-                'streak': current_streak,
+                'streak': user.get('streak', 0),
                 'last_activity_date': today
             }
         
-        # Son aktivite bugün değilse streak'i kontrol et
-        if last_activity:
-            last_date = datetime.fromisoformat(last_activity).date()
-            today_date = datetime.now().date()
-            days_diff = (today_date - last_date).days
-            
-            if days_diff == 1:
-                # Streak devam ediyor
-                current_streak += 1
-            elif days_diff > 1:
-                # Streak kırıldı
-                current_streak = 1
-        else:
-            # İlk aktivite
-            current_streak = 1
-        
-        user['streak'] = current_streak
-        user['last_activity_date'] = today
-        user['updated_at'] = datetime.now().isoformat()
-        
-        users[user['device_id']] = user
-        self._save_users(users)
-        
         return {
             'user_id': user_id,
-            'streak': current_streak,
+            'streak': user['streak'],
             'last_activity_date': today,
-            'streak_increased': current_streak > (user.get('streak', 0) if last_activity else 0)
+            'streak_increased': user['streak'] > result['previous_streak']
         }
     
     def get_streak(self, user_id: str) -> Dict:
         """Kullanıcının streak bilgisini getirir."""
-        users = self._load_users()
-        user = next((u for u in users.values() if u.get('user_id') == user_id), None)
+        user = self._find_by_user_id(user_id)
         
         if not user:
             return {'streak': 0, 'last_activity_date': None}
@@ -211,8 +226,7 @@ class UserService:
     
     def get_user_xp(self, user_id: str) -> Dict:
         """Kullanıcının XP bilgisini getirir."""
-        users = self._load_users()
-        user = next((u for u in users.values() if u.get('user_id') == user_id), None)
+        user = self._find_by_user_id(user_id)
         
         if not user:
             return {'xp': 0, 'level': 1, 'xp_to_next_level': 100}
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import json
 import os
 import uuid
@@ -9,7 +9,6 @@ from datetime import datetime
 
 class VisualMediaAdvancedService:
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.videos_dir = os.path.join(settings.STORAGE_PATH, "videos")
         self.animations_dir = os.path.join(settings.STORAGE_PATH, "animations")
         self.ar_vr_dir = os.path.join(settings.STORAGE_PATH, "ar_vr")
@@ -129,13 +128,15 @@ Sahne: {scene_description}
 }}
 """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Sen bir 3D görselleştirme uzmanısın."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                cache=False,
+                cache_namespace="visual_media_advanced"
             )
             
             result_text = response.choices[0].message.content
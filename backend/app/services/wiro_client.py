@@ -1,24 +1,292 @@
 import os
 import time
 import hmac
+import random
 import hashlib
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
 
 import httpx
 from app.core.config import settings
 from app.core.resilience import retry_on_failure, wiro_circuit_breaker
 
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_DONE_STATUSES = ("task_postprocess_end", "task_cancel")
+
+
+def _task_outcome(detail: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Returns the run_and_wait result fields for a finished task, None while running."""
+    try:
+        status = detail["tasklist"][0]["status"]
+        debugerror = detail["tasklist"][0].get("debugerror", "")
+    except Exception:
+        status = None
+        debugerror = ""
+
+    if status in _DONE_STATUSES:
+        return {"detail": detail}
+    if status == "task_error" or debugerror:
+        return {"detail": detail, "error_message": debugerror or "Wiro task error"}
+    return None
+
+
+@dataclass
+class _PolledTask:
+    taskid: Optional[str]
+    tasktoken: Optional[str]
+    deadline: float
+    interval: float
+    next_due: float
+    model: Optional[str] = None
+    started: float = 0.0
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    in_flight: Optional[asyncio.Task] = None
+    failures: int = 0
+
+
+class _TaskPoller:
+    """
+    Single polling loop for all in-flight Wiro tasks of an event loop.
+
+    Instead of one ``sleep(1); Task/Detail`` loop per caller, tasks register
+    here and one loop schedules every task that is due. Each poll runs as its
+    own asyncio task (bounded by ``concurrency``, at most one in flight per
+    task) with a short single-attempt timeout, so a slow or failing task never
+    delays the polls or deadlines of the others; a failed poll is simply
+    retried on the next cycle, up to ``max_failures`` in a row. Callers
+    waiting on the same task share one poll.
+
+    Poll schedule is adaptive: the poller keeps a moving average of how long
+    each model's tasks take and sends the first poll shortly before that;
+    afterwards it backs off exponentially (with jitter) from ``initial`` to
+    ``maximum`` seconds, so quick text tasks return fast while long
+    video/audio jobs stop hammering the provider.
+    """
+
+    def __init__(
+        self,
+        client: "WiroClient",
+        initial: float,
+        maximum: float,
+        backoff: float,
+        concurrency: int,
+        poll_timeout: float = 10.0,
+        max_failures: int = 3,
+    ):
+        self.client = client
+        self.initial = initial
+        self.maximum = maximum
+        self.backoff = backoff
+        self.poll_timeout = poll_timeout
+        self.max_failures = max_failures
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Dict[str, _PolledTask] = {}
+        self._polls: Set[asyncio.Task] = set()
+        # Moving average of observed task durations per model
+        self._expected: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def wait(
+        self,
+        taskid: Optional[str],
+        tasktoken: Optional[str],
+        timeout_s: float,
+        initial: Optional[float] = None,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        key = f"id:{taskid}" if taskid else f"token:{tasktoken}"
+        now = time.monotonic()
+        entry = self._tasks.get(key)
+        if entry is None:
+            interval = initial if initial is not None else self.initial
+            first_delay = max(interval, 0.9 * self._expected.get(model, 0.0))
+            entry = _PolledTask(
+                taskid, tasktoken, deadline=now + timeout_s, interval=interval,
+                next_due=now + first_delay, model=model, started=now,
+            )
+            self._tasks[key] = entry
+        else:
+            entry.deadline = max(entry.deadline, now + timeout_s)
+
+        future = asyncio.get_running_loop().create_future()
+        entry.waiters.append(future)
+        self._wakeup.set()
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        while self._tasks:
+            now = time.monotonic()
+            for key, entry in list(self._tasks.items()):
+                if not any(not w.done() for w in entry.waiters):
+                    # Every caller gave up (cancelled)
+                    self._tasks.pop(key, None)
+                elif entry.deadline <= now:
+                    self._resolve(key, {"detail": {"status": "timeout"}})
+                elif entry.in_flight is None and entry.next_due <= now:
+                    entry.in_flight = asyncio.create_task(self._poll(key, entry))
+                    self._polls.add(entry.in_flight)
+                    entry.in_flight.add_done_callback(self._polls.discard)
+            if not self._tasks:
+                break
+            next_due = min(
+                e.deadline if e.in_flight is not None else min(e.next_due, e.deadline)
+                for e in self._tasks.values()
+            )
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_due - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, key: str, entry: _PolledTask):
+        try:
+            async with self._semaphore:
+                if self._tasks.get(key) is not entry:
+                    return
+                detail = await self.client.poll_detail(entry.taskid, entry.tasktoken, timeout=self.poll_timeout)
+        except Exception as e:
+            entry.failures += 1
+            if entry.failures >= self.max_failures:
+                self._resolve(key, error=e, entry=entry)
+            else:
+                logger.warning("Wiro poll failed for %s (%s/%s): %s", key, entry.failures, self.max_failures, e)
+                self._reschedule(entry)
+            return
+        finally:
+            entry.in_flight = None
+            self._wakeup.set()
+
+        entry.failures = 0
+        outcome = _task_outcome(detail)
+        if outcome is not None:
+            self._observe(entry)
+            self._resolve(key, outcome, entry=entry)
+            return
+        self._reschedule(entry)
+
+    def _reschedule(self, entry: _PolledTask):
+        entry.interval = min(entry.interval * self.backoff, self.maximum)
+        # Jitter keeps many tasks started together from polling in lockstep
+        entry.next_due = time.monotonic() + entry.interval * random.uniform(0.9, 1.1)
+
+    def _observe(self, entry: _PolledTask):
+        if entry.model is None:
+            return
+        duration = time.monotonic() - entry.started
+        previous = self._expected.get(entry.model)
+        self._expected[entry.model] = duration if previous is None else 0.8 * previous + 0.2 * duration
+
+    def expected_duration(self, model: str) -> Optional[float]:
+        return self._expected.get(model)
+
+    def _resolve(
+        self,
+        key: str,
+        outcome: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+        entry: Optional[_PolledTask] = None,
+    ):
+        if entry is not None and self._tasks.get(key) is not entry:
+            # Already resolved (e.g. timed out while this poll was in flight)
+            return
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return
+        if entry.in_flight is not None and entry.in_flight is not asyncio.current_task():
+            # Nobody needs the answer of a poll still running for a resolved task
+            entry.in_flight.cancel()
+        for waiter in entry.waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(outcome)
+
+
 class WiroClient:
-    def __init__(self, base_url: str = "https://api.wiro.ai/v1"):
-        self.base_url = base_url.rstrip("/")
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+    ):
+        self.base_url = (base_url or settings.WIRO_BASE_URL).rstrip("/")
         # Use settings for consistency, fallback to env if not in settings yet
         self.api_key = getattr(settings, "WIRO_API_KEY", os.environ.get("WIRO_API_KEY", ""))
         self.api_secret = getattr(settings, "WIRO_API_SECRET", os.environ.get("WIRO_API_SECRET", ""))
 
+        self.transport = transport
+        wants_http2 = settings.WIRO_HTTP2 if http2 is None else http2
+        if wants_http2 and not HTTP2_AVAILABLE:
+            logger.warning("WIRO_HTTP2 enabled but the h2 package is missing; using HTTP/1.1 keep-alive")
+        self.http2 = wants_http2 and HTTP2_AVAILABLE
+        self.max_connections = max_connections or settings.WIRO_MAX_CONNECTIONS
+
+        # Pooled client and poller are bound to the loop that created them
+        # (uvicorn has one loop, Celery tasks may create a fresh loop per run)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._poller: Optional[_TaskPoller] = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60,
+                ),
+                timeout=httpx.Timeout(120, connect=10),
+                transport=self.transport,
+            )
+            self._poller = _TaskPoller(
+                self,
+                initial=settings.WIRO_POLL_INITIAL_SECONDS,
+                maximum=settings.WIRO_POLL_MAX_SECONDS,
+                backoff=settings.WIRO_POLL_BACKOFF,
+                concurrency=settings.WIRO_POLL_CONCURRENCY,
+                poll_timeout=settings.WIRO_POLL_TIMEOUT_SECONDS,
+            )
+            self._loop = loop
+        return self._client
+
+    @property
+    def poller(self) -> _TaskPoller:
+        self._ensure_client()
+        return self._poller
+
+    async def _post(self, path: str, timeout: float, **kwargs) -> Dict[str, Any]:
+        client = self._ensure_client()
+        r = await client.post(f"{self.base_url}/{path}", headers=self._signed_headers(), timeout=timeout, **kwargs)
+        r.raise_for_status()
+        return r.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._poller = None
+            self._loop = None
+
     def _signed_headers(self) -> Dict[str, str]:
         if not self.api_secret:
             return {"x-api-key": self.api_key}
@@ -43,27 +311,23 @@ class WiroClient:
         Wiro Run Task Endpoint:
         POST /v1/Run/<provider>/<model_slug>
         """
-        url = f"{self.base_url}/Run/{provider}/{model_slug}"
-        headers = self._signed_headers()
+        path = f"Run/{provider}/{model_slug}"
         logger.info("Wiro run request: provider=%s model_slug=%s", provider, model_slug)
 
-        async with httpx.AsyncClient(timeout=120) as client:
-            if files:
-                # Use multipart/form-data when files are present
-                r = await client.post(url, headers=headers, data=inputs, files=files)
-            elif is_json:
-                # Explicit JSON request (e.g. gpt-oss-20b)
-                r = await client.post(url, headers=headers, json=inputs)
-            else:
-                # Form data (e.g. gpt-5-nano: prompt, reasoning, verbosity, webSearch)
-                r = await client.post(url, headers=headers, data=inputs)
-            
-            r.raise_for_status()
-            out = r.json()
-            taskid = out.get("taskid") or out.get("taskId")
-            if taskid:
-                logger.info("Wiro run completed: provider=%s model_slug=%s taskid=%s", provider, model_slug, taskid)
-            return out
+        if files:
+            # Use multipart/form-data when files are present
+            out = await self._post(path, timeout=120, data=inputs, files=files)
+        elif is_json:
+            # Explicit JSON request (e.g. gpt-oss-20b)
+            out = await self._post(path, timeout=120, json=inputs)
+        else:
+            # Form data (e.g. gpt-5-nano: prompt, reasoning, verbosity, webSearch)
+            out = await self._post(path, timeout=120, data=inputs)
+
+        taskid = out.get("taskid") or out.get("taskId")
+        if taskid:
+            logger.info("Wiro run completed: provider=%s model_slug=%s taskid=%s", provider, model_slug, taskid)
+        return out
 
     @wiro_circuit_breaker.call
     @retry_on_failure(max_retries=3, delay=1.0)
@@ -74,14 +338,17 @@ class WiroClient:
         if not taskid and not tasktoken:
             raise ValueError("taskid veya tasktoken gerekli")
 
-        url = f"{self.base_url}/Task/Detail"
-        headers = self._signed_headers()
         payload = {"taskid": taskid} if taskid else {"tasktoken": tasktoken}
+        return await self._post("Task/Detail", timeout=60, json=payload)
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            r = await client.post(url, headers=headers, json=payload)
-            r.raise_for_status()
-            return r.json()
+    @wiro_circuit_breaker.call
+    async def poll_detail(self, taskid: Optional[str], tasktoken: Optional[str], timeout: float) -> Dict[str, Any]:
+        """
+        Single-attempt Task/Detail for the poller: short timeout and no retry,
+        the next poll cycle is the retry.
+        """
+        payload = {"taskid": taskid} if taskid else {"tasktoken": tasktoken}
+        return await self._post("Task/Detail", timeout=timeout, json=payload)
 
     async def run_and_wait(
         self,
@@ -90,15 +357,17 @@ class WiroClient:
         inputs: Dict[str, Any],
         files: Optional[Dict[str, Any]] = None,
         is_json: bool = False,
-        poll_interval_s: float = 1.0,
+        poll_interval_s: Optional[float] = None,
         timeout_s: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
-        Runs a task and polls until completion or timeout.
+        Runs a task and waits for completion or timeout. Polling is shared
+        with every other in-flight task (see ``_TaskPoller``); ``poll_interval_s``
+        overrides the initial poll delay, which then backs off exponentially.
         """
         if timeout_s is None:
             timeout_s = getattr(settings, "WIRO_TASK_TIMEOUT_SECONDS", 120)
-        start = time.time()
+        start = time.monotonic()
         run_resp = await self.run(provider, model_slug, inputs, files=files, is_json=is_json)
 
         taskid = str(run_resp.get("taskid") or "")
@@ -107,57 +376,25 @@ class WiroClient:
         if not taskid and not tasktoken:
             return {"run_response": run_resp, "detail": None}
 
-        while True:
-            if time.time() - start > timeout_s:
-                return {"run_response": run_resp, "detail": {"status": "timeout"}}
-
-            detail = await self.task_detail(taskid=taskid) if taskid else await self.task_detail(tasktoken=tasktoken)
-
-            try:
-                status = detail["tasklist"][0]["status"]
-                debugerror = detail["tasklist"][0].get("debugerror", "")
-            except Exception:
-                status = None
-                debugerror = ""
-
-            if status in ("task_postprocess_end", "task_cancel"):
-                return {"run_response": run_resp, "detail": detail}
-            if status == "task_error" or debugerror:
-                return {
-                    "run_response": run_resp,
-                    "detail": detail,
-                    "error_message": debugerror or "Wiro task error",
-                }
-
-            await asyncio.sleep(poll_interval_s)
+        remaining = max(0.0, timeout_s - (time.monotonic() - start))
+        outcome = await self.poller.wait(
+            taskid or None, tasktoken, remaining, initial=poll_interval_s, model=f"{provider}/{model_slug}"
+        )
+        return {"run_response": run_resp, **outcome}
 
     @wiro_circuit_breaker.call
     async def kill_task(self, taskid: str) -> Dict[str, Any]:
         """
         POST /v1/Task/Kill
         """
-        url = f"{self.base_url}/Task/Kill"
-        headers = self._signed_headers()
-        payload = {"taskid": taskid}
-        
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.post(url, headers=headers, json=payload)
-            r.raise_for_status()
-            return r.json()
+        return await self._post("Task/Kill", timeout=30, json={"taskid": taskid})
 
     @wiro_circuit_breaker.call
     async def cancel_task(self, taskid: str) -> Dict[str, Any]:
         """
         POST /v1/Task/Cancel (For tasks on queue)
         """
-        url = f"{self.base_url}/Task/Cancel"
-        headers = self._signed_headers()
-        payload = {"taskid": taskid}
-        
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.post(url, headers=headers, json=payload)
-            r.raise_for_status()
-            return r.json()
+        return await self._post("Task/Cancel", timeout=30, json={"taskid": taskid})
 
 # Create a global instance
 wiro_client = WiroClient()
@@ -0,0 +1,161 @@
+"""
+Stage Graph
+
+Small dependency-driven runner for multi-stage jobs. Each stage declares the
+stages it needs; a stage starts as soon as all of its dependencies finished,
+so independent stages (e.g. image generation and speech synthesis, which both
+only need the story text) run concurrently on the same event loop.
+
+    graph = StageGraph([
+        Stage("text", generate_text, weight=30),
+        Stage("image", generate_image, depends_on=("text",), weight=35),
+        Stage("audio", generate_audio, depends_on=("text",), weight=25),
+    ], on_progress=report)
+    results = await graph.run()
+
+Every stage receives the results dict of the stages finished so far and its
+return value is stored under its name (dict results are also attached to the
+stage's completion progress event). ``timings`` holds per-stage latency.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from app.core.metrics import story_pipeline_stage_duration_seconds
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    # Share of the overall progress bar this stage accounts for
+    weight: int = 1
+    # User-facing messages emitted when the stage starts / finishes
+    message: Optional[str] = None
+    done_message: Optional[str] = None
+    # Optional stages log failures instead of failing the whole graph
+    optional: bool = False
+
+
+ProgressCallback = Callable[[int, str, Optional[Dict[str, Any]]], None]
+
+
+class StageGraph:
+    """Runs stages in dependency order with maximal concurrency."""
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        on_progress: Optional[ProgressCallback] = None,
+        base_percent: int = 0,
+        max_percent: int = 99,
+        pipeline: str = "story",
+    ):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stages: {missing}")
+        self._check_acyclic()
+
+        self.on_progress = on_progress
+        self.base_percent = base_percent
+        self.max_percent = max_percent
+        self.pipeline = pipeline
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self._done_weight = 0
+        self._total_weight = sum(stage.weight for stage in stages) or 1
+
+    def _check_acyclic(self):
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through {name!r}")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def percent(self) -> int:
+        span = self.max_percent - self.base_percent
+        return self.base_percent + int(span * self._done_weight / self._total_weight)
+
+    def _report(self, message: str, data: Optional[Dict[str, Any]] = None):
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(self.percent(), message, data)
+        except Exception as e:
+            # Progress reporting must never fail the job
+            logger.warning(f"Stage progress callback failed: {e}")
+
+    async def _run_stage(self, stage: Stage) -> Any:
+        if stage.message:
+            self._report(stage.message, {"stage": stage.name, "state": "started"})
+        started = time.perf_counter()
+        try:
+            return await stage.run(self.results)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[stage.name] = elapsed
+            story_pipeline_stage_duration_seconds.labels(pipeline=self.pipeline, stage=stage.name).observe(elapsed)
+
+    async def run(self) -> Dict[str, Any]:
+        """Runs all stages; raises the first non-optional failure after cancelling the rest."""
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, Stage] = {}
+
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in self.results for dep in stage.depends_on):
+                        del pending[name]
+                        running[asyncio.ensure_future(self._run_stage(stage))] = stage
+
+                if not running:
+                    # Remaining stages depend on an optional stage that failed
+                    for name in pending:
+                        logger.warning(f"Stage {name!r} skipped: dependency unavailable")
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        if not stage.optional:
+                            raise error
+                        logger.error(f"Optional stage {stage.name!r} failed: {error}")
+                        pending = {
+                            name: s for name, s in pending.items() if stage.name not in s.depends_on
+                        }
+                        continue
+                    result = task.result()
+                    self.results[stage.name] = result
+                    self._done_weight += stage.weight
+                    data = {"stage": stage.name, "state": "done", "seconds": round(self.timings[stage.name], 3)}
+                    if isinstance(result, dict):
+                        data.update(result)
+                    self._report(stage.done_message or stage.message or stage.name, data)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return self.results
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from app.core.database import SessionLocal
@@ -11,6 +12,9 @@ from app.services.image_service import ImageService
 from app.services.tts_service import TTSService
 from app.services.search_service import SearchService
 from app.services.supabase_job_service import supabase_job_service
+from app.core.job_progress import job_progress
+from app.core.metrics import MetricsCollector
+from app.tasks.stage_graph import Stage, StageGraph
 import uuid
 
 logger = get_task_logger(__name__)
@@ -22,30 +26,19 @@ logger = get_task_logger(__name__)
 @shared_task(bind=True, name="app.tasks.story_tasks.generate_full_story", autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 3})
 def generate_full_story_task(self, job_id: str):
     """
-    Orchestrates the full story generation process:
-    1. Text Generation
-    2. Image Generation
-    3. Audio Generation
-    4. Finalize
+    Orchestrates the full story generation process as a stage graph:
+    1. Text Generation (creates the story row)
+    2. Image Generation  } run concurrently, both only need the story text
+    3. Audio Generation  }
+    4. Semantic Embedding (optional, also only needs the story)
+    5. Finalize
     """
     job_repo = JobRepository()
     story_repo = StoryRepository()
     
-    # Initialize Socket.IO Redis Manager for emitting events from worker
-    # Note: We use the synchronous RedisManager here because Celery task is sync wrapper
-    import socketio
-    socket_mgr = socketio.RedisManager('redis://localhost:6379/0', write_only=True)
-    
-    def emit_progress(job_id, percent, step, data=None):
-        """Helper to emit progress to specific job room"""
-        payload = {
-            "job_id": str(job_id),
-            "status": "RUNNING" if percent < 100 else "SUCCEEDED",
-            "percent": percent,
-            "message": step,
-            "data": data
-        }
-        socket_mgr.emit('job_progress', payload, room=str(job_id))
+    def report_progress(percent, step, data=None):
+        """Stage graph progress -> job progress bus (DB, Socket.IO room, Supabase)"""
+        job_progress.publish(job_id, JobStatus.RUNNING, percent=percent, message=step, data=data)
 
     # Get or create event loop safely (fixes "RuntimeError: no running event loop")
     try:
@@ -54,17 +47,15 @@ def generate_full_story_task(self, job_id: str):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
     
+    started = time.perf_counter()
     try:
-        # Update Job Status -> Running
-        job = job_repo.update_job_status(
-            uuid.UUID(job_id), 
-            JobStatus.RUNNING, 
-            celery_task_id=self.request.id,
-            percent=0,
-            error_message=None
-        )
+        job = job_repo.get_job_by_id(uuid.UUID(job_id))
+        
+        if not job:
+            logger.error(f"Job {job_id} not found")
+            return
         
-        # Sync with Supabase for Realtime Tracking
+        # Sync with Supabase for Realtime Tracking (creates the row the bus updates)
         supabase_job_service.upsert_job(
             job_id=job_id,
             user_id=str(job.user_id) if hasattr(job, 'user_id') else "anon",
@@ -73,95 +64,96 @@ def generate_full_story_task(self, job_id: str):
             message="Başlatılıyor..."
         )
         
-        if not job:
-            logger.error(f"Job {job_id} not found")
-            return
+        # Update Job Status -> Running
+        job_progress.publish(
+            job_id,
+            JobStatus.RUNNING,
+            percent=0,
+            message="Başlatılıyor...",
+            celery_task_id=self.request.id
+        )
         
         input_data = job.input_data
         user_id = job.user_id
-        
-        # --- Step 1: Text Generation ---
-        job_repo.update_job_status(uuid.UUID(job_id), JobStatus.RUNNING, percent=10, step="Hikaye yazılıyor...")
-        emit_progress(job_id, 10, "Hikaye yazılıyor...")
-        supabase_job_service.update_progress(job_id, 10, "Hikaye yazılıyor...")
-        
-        story_service = StoryService()
-        story_text = loop.run_until_complete(story_service.generate_story(
-            theme=input_data.get('theme'),
-            language=input_data.get('language', 'tr'),
-            story_type=input_data.get('story_type', 'masal'),
-            creativity=input_data.get('creativity', 0.8),
-            pacing=input_data.get('pacing', 'medium'),
-            perspective=input_data.get('perspective', 'third'),
-            vocabulary=input_data.get('vocabulary', 'normal'),
-            age_group=input_data.get('age_group', '3-6'),
-            pedagogical_theme=input_data.get('pedagogical_theme'),
-            model_override=input_data.get('model')
-        ))
-        
-        # Create partial story in DB
+        language = input_data.get('language', 'tr')
         story_id = uuid.uuid4()
-        story_data = {
-            'story_id': str(story_id),
-            'theme': input_data.get('theme'),
-            'story_text': story_text,
-            'language': input_data.get('language', 'tr'),
-            'story_type': input_data.get('story_type', 'masal'),
-            # Placeholders
-            'image_url': None,
-            'audio_url': None
-        }
-        
-        story = story_repo.create_story(story_data, user_id)
-        
-        # Link story to job
-        # Link story to job
-        job.story_id = story_id
-        job_repo.update_job_status(uuid.UUID(job_id), JobStatus.RUNNING, percent=30, step="Görsel üretiliyor...")
-        emit_progress(job_id, 30, "Görsel üretiliyor...", data={"story_text_preview": story_text[:100] + "..."})
-        supabase_job_service.update_progress(job_id, 30, "Görsel üretiliyor...")
-        
-        # --- Step 2: Image Generation ---
-        image_service = ImageService()
-        image_url = loop.run_until_complete(image_service.generate_image(
-            story_text=story_text,
-            theme=input_data.get('theme'),
-            image_style=input_data.get('image_style', 'fantasy'),
-            image_size=input_data.get('image_size', '1024x1024')
-        ))
-        
-        # Update story with image
-        story_repo.update_story(story_id, {'image_url': image_url})
-        job_repo.update_job_status(uuid.UUID(job_id), JobStatus.RUNNING, percent=60, step="Seslendiriliyor...")
-        emit_progress(job_id, 60, "Seslendiriliyor...", data={"image_url": image_url})
-        supabase_job_service.update_progress(job_id, 60, "Seslendirme yapılıyor...")
-        
-        # --- Step 3: Audio Generation ---
-        tts_service = TTSService()
-        audio_url = loop.run_until_complete(tts_service.generate_speech(
-            text=story_text,
-            language=input_data.get('language', 'tr'),
-            story_id=str(story_id),
-            audio_speed=input_data.get('audio_speed', 1.0),
-            audio_slow=input_data.get('audio_slow', False)
-        ))
-        
-        # Update story with audio
-        story_repo.update_story(story_id, {'audio_url': audio_url})
-        
-        # --- Step 4: Semantic Embedding ---
-        job_repo.update_job_status(uuid.UUID(job_id), JobStatus.RUNNING, percent=90, step="İndeksleme yapılıyor...")
-        emit_progress(job_id, 90, "İndeksleme yapılıyor...")
-        supabase_job_service.update_progress(job_id, 95, "Son dokunuşlar...")
-        
-        db = SessionLocal()
-        try:
-            search_service = SearchService(db)
-            search_service.update_story_embedding(str(story_id))
-        except Exception as e:
-            logger.error(f"Embedding error: {e}")
-        finally:
-            db.close()
+        # Full text is shared between stages but kept out of progress payloads
+        story_state = {}
+        
+        # --- Stage: Text Generation ---
+        async def text_stage(results):
+            story_service = StoryService()
+            story_text = await story_service.generate_story(
+                theme=input_data.get('theme'),
+                language=language,
+                story_type=input_data.get('story_type', 'masal'),
+                creativity=input_data.get('creativity', 0.8),
+                pacing=input_data.get('pacing', 'medium'),
+                perspective=input_data.get('perspective', 'third'),
+                vocabulary=input_data.get('vocabulary', 'normal'),
+                age_group=input_data.get('age_group', '3-6'),
+                pedagogical_theme=input_data.get('pedagogical_theme'),
+                model_override=input_data.get('model')
+            )
+            story_state['story_text'] = story_text
+            
+            # Create partial story in DB
+            story_repo.create_story({
+                'story_id': str(story_id),
+                'theme': input_data.get('theme'),
+                'story_text': story_text,
+                'language': language,
+                'story_type': input_data.get('story_type', 'masal'),
+                # Placeholders
+                'image_url': None,
+                'audio_url': None
+            }, user_id)
+            
+            # Link story to job (progress updates are written through the bus)
+            job.story_id = story_id
+            job_repo.db.commit()
+            return {"story_id": str(story_id), "story_text_preview": story_text[:100] + "..."}
+        
+        # --- Stage: Image Generation ---
+        async def image_stage(results):
+            image_url = await ImageService().generate_image(
+                story_text=story_state['story_text'],
+                theme=input_data.get('theme'),
+                image_style=input_data.get('image_style', 'fantasy'),
+                image_size=input_data.get('image_size', '1024x1024')
+            )
+            story_repo.update_story(story_id, {'image_url': image_url})
+            return {"image_url": image_url}
+        
+        # --- Stage: Audio Generation ---
+        async def audio_stage(results):
+            audio_url = await TTSService().generate_speech(
+                text=story_state['story_text'],
+                language=language,
+                story_id=str(story_id),
+                audio_speed=input_data.get('audio_speed', 1.0),
+                audio_slow=input_data.get('audio_slow', False)
+            )
+            story_repo.update_story(story_id, {'audio_url': audio_url})
+            return {"audio_url": audio_url}
+        
+        # --- Stage: Semantic Embedding ---
+        async def index_stage(results):
+            await asyncio.to_thread(_update_story_embedding, str(story_id))
+        
+        graph = StageGraph([
+            Stage("text", text_stage, weight=30, message="Hikaye yazılıyor..."),
+            Stage("image", image_stage, depends_on=("text",), weight=35,
+                  message="Görsel üretiliyor...", done_message="Görsel hazır"),
+            Stage("audio", audio_stage, depends_on=("text",), weight=25,
+                  message="Seslendiriliyor...", done_message="Seslendirme hazır"),
+            Stage("index", index_stage, depends_on=("text",), weight=10,
+                  message="İndeksleme yapılıyor...", optional=True),
+        ], on_progress=report_progress, base_percent=5, max_percent=95)
+        results = loop.run_until_complete(graph.run())
+        
+        stage_timings = {name: round(seconds, 3) for name, seconds in graph.timings.items()}
+        logger.info(f"Job {job_id} stage timings: {stage_timings}")
         
         # --- Finalize ---
         # User XP update or credit deduction could happen here
@@ -169,35 +161,32 @@ def generate_full_story_task(self, job_id: str):
         # Complete Job
         result_data = {
             "story_id": str(story_id),
-            "image_url": image_url,
-            "audio_url": audio_url
+            "image_url": results["image"]["image_url"],
+            "audio_url": results["audio"]["audio_url"],
+            "stage_timings": stage_timings
         }
         
-        job_repo.update_job_status(
-            uuid.UUID(job_id), 
-            JobStatus.SUCCEEDED, 
+        # Terminal states are delivered to every sink before publish returns
+        job_progress.publish(
+            job_id,
+            JobStatus.SUCCEEDED,
             result_data=result_data,
             percent=100,
-            step="Tamamlandı"
+            message="Tamamlandı"
         )
-        emit_progress(job_id, 100, "Tamamlandı", data=result_data)
-        supabase_job_service.update_progress(job_id, 100, "Tamamlandı", status="completed")
+        MetricsCollector.track_background_job("story_generation", "succeeded", time.perf_counter() - started)
         
         logger.info(f"Job {job_id} completed successfully.")
         
     except Exception as e:
         logger.error(f"Job {job_id} failed: {e}")
-        job_repo.update_job_status(
-            uuid.UUID(job_id), 
-            JobStatus.FAILED, 
+        MetricsCollector.track_background_job("story_generation", "failed", time.perf_counter() - started)
+        job_progress.publish(
+            job_id,
+            JobStatus.FAILED,
             error_message=str(e),
-            step="Hata oluştu"
-        )
-        socket_mgr.emit('job_progress', 
-            {"job_id": str(job_id), "status": "FAILED", "message": str(e)}, 
-            room=str(job_id)
+            message="Hata oluştu"
         )
-        supabase_job_service.update_progress(job_id, 0, f"Hata: {str(e)}", status="failed")
         raise  # Re-raise for Celery retry mechanism
     finally:
         # Cleanup: Close database connections and event loop to prevent resource leaks
@@ -208,3 +197,12 @@ def generate_full_story_task(self, job_id: str):
             logger.warning(f"Cleanup error for job {job_id}: {cleanup_error}")
         finally:
             loop.close()
+
+
+def _update_story_embedding(story_id: str):
+    """Runs in a worker thread with its own DB session."""
+    db = SessionLocal()
+    try:
+        SearchService(db).update_story_embedding(story_id)
+    finally:
+        db.close()
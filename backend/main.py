@@ -12,7 +12,15 @@ from app.routers import story, health, character, user, achievement, leaderboard
 from app.routers import auth_router, gdpr_router
 from app.core.config import settings
 from app.services.cloud_storage_service import cloud_storage_service
+from app.core.document_store import flush_all_document_stores
+from app.core.llm_gateway import llm_gateway
+from app.core.service_registry import service_registry
+from app.services.wiro_client import wiro_client
+from app.core.supabase_jwt import token_verifier
+from app.services.image_derivatives import get_image_derivative_store
+from app.services.export_engine import shutdown_export_executor
 from contextlib import asynccontextmanager
+import asyncio
 
 # Import exception handlers and middleware
 from app.core.exceptions import MasalFabrikasiException
@@ -22,16 +30,15 @@ from app.core.exception_handlers import (
     http_exception_handler,
     generic_exception_handler
 )
-from app.middleware.request_tracking import RequestTrackingMiddleware
 
 load_dotenv()
 
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.rate_limiter import limiter
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 from app.core.logging_config import setup_logging
-from app.core.middleware import RequestIDMiddleware, RequestLoggingMiddleware
+from app.core.middleware import ObservabilityMiddleware
 from app.core.exception_handlers import (
     http_exception_handler,
     validation_exception_handler,
@@ -50,6 +57,7 @@ logger = setup_logging(
     level="INFO" if not settings.DEBUG else "DEBUG",
     use_json=not settings.DEBUG  # JSON in production, readable in dev
 )
+from app.core.logging import enable_async_logging, disable_async_logging
 
 load_dotenv()
 
@@ -59,11 +67,22 @@ validate_environment()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Log handler'ları arka plan thread'inde çalışsın; istek yolu sadece kuyruğa yazar
+    enable_async_logging()
     # Startup: Bucketları kontrol et ve oluştur
     if settings.USE_CLOUD_STORAGE:
         await cloud_storage_service.initialize_buckets()
+    # Sık kullanılan servisleri önceden yükle (diğerleri ilk istekte yüklenir)
+    await asyncio.to_thread(service_registry.preload_from_setting, settings.PRELOAD_SERVICES)
     yield
-    # Shutdown logic (varsa)
+    # Shutdown: bekleyen JSON doküman yazımlarını diske aktar, LLM/Wiro/Auth bağlantılarını kapat
+    await asyncio.to_thread(flush_all_document_stores)
+    await llm_gateway.aclose()
+    await wiro_client.aclose()
+    await token_verifier.aclose()
+    get_image_derivative_store().shutdown()
+    shutdown_export_executor()
+    disable_async_logging()  # kuyruktaki kayıtlar boşaltılır
 
 app = FastAPI(
     lifespan=lifespan,
@@ -116,9 +135,6 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
-# Add Request Tracking Middleware
-app.add_middleware(RequestTrackingMiddleware)
-
 # Rate Limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -128,16 +144,16 @@ app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
-# Middleware
-app.add_middleware(RequestIDMiddleware)
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(SlowAPIMiddleware)
+# Middleware (hepsi saf ASGI: yanıt gövdesi tamponlanmaz, streaming bozulmaz)
+app.add_middleware(SlowAPIASGIMiddleware)
 from fastapi.middleware.gzip import GZipMiddleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
-from app.middleware.pagination_middleware import PaginationEnforcementMiddleware
-app.add_middleware(PaginationEnforcementMiddleware)
 
-# CORS yapılandırması
+# Request ID, süre/metrik, erişim logu ve sayfalama limiti tek geçişte.
+# CORS'un içinde kalır: kısa devre 400 yanıtları da CORS başlıklarını alır
+app.add_middleware(ObservabilityMiddleware)
+
+# CORS yapılandırması (en dışta)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -218,6 +234,10 @@ app.include_router(interactive_router.router, prefix="/api/interactive", tags=["
 from app.routers import parental_router
 app.include_router(parental_router.router, prefix="/api/parental", tags=["Parental Dashboard"])
 
+# Import Image derivatives router (content-hashed thumbnails)
+from app.routers import image_router
+app.include_router(image_router.router, prefix="/api/images", tags=["Media"])
+
 # Import Community router
 from app.routers import community_router
 app.include_router(community_router.router, prefix="/api/community", tags=["Community Library"])
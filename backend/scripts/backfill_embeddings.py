@@ -0,0 +1,66 @@
+"""
+Embedding backfill: embeds stories that have no embedding yet (or all of them
+with --reembed) in batches, several requests in flight, one commit per batch.
+
+With --checkpoint the id of the last fully processed batch is written after
+every batch; --resume continues from it after an interruption. When the
+in-process vector index is the search backend (no pgvector) it is filled as
+batches complete and trained at the end; --rebuild-index only rebuilds it
+from the embeddings already in the database.
+
+Usage (from backend/):
+    python scripts/backfill_embeddings.py --checkpoint storage/embedding_backfill.json
+    python scripts/backfill_embeddings.py --checkpoint storage/embedding_backfill.json --resume
+    python scripts/backfill_embeddings.py --reembed --batch-size 100 --concurrency 8
+    python scripts/backfill_embeddings.py --rebuild-index
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.search_service import SearchService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=None, help="stories per embedding request (default EMBEDDING_BATCH_SIZE)")
+    parser.add_argument("--concurrency", type=int, default=None, help="requests in flight (default EMBEDDING_CONCURRENCY)")
+    parser.add_argument("--max-stories", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file for --resume")
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--reembed", action="store_true", help="also re-embed stories that already have an embedding")
+    parser.add_argument("--rebuild-index", action="store_true", help="only rebuild the in-process vector index")
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    try:
+        service = SearchService(db)
+        if args.rebuild_index:
+            print(json.dumps({"indexed": service.rebuild_index(), **service.index.stats()}, indent=2))
+            return
+        report = asyncio.run(service.backfill_embeddings(
+            resume=args.resume,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            checkpoint_path=args.checkpoint,
+            reembed=args.reembed,
+            max_stories=args.max_stories,
+        ))
+        print(json.dumps({k: v for k, v in report.items() if k != "failed_ids"} | {"failed": len(report["failed_ids"])}, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
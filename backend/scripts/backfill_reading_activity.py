@@ -0,0 +1,49 @@
+"""
+Reading activity backfill: builds the per-user daily activity rollup
+(user_daily_activity) from existing stories. New stories keep it current
+through the Story insert/delete hooks; run this once after the 008
+migration, or later to repair the rollup for one user or for everyone.
+
+Usage (from backend/):
+    python scripts/backfill_reading_activity.py
+    python scripts/backfill_reading_activity.py --user-id 3f2c...
+    python scripts/backfill_reading_activity.py --users-per-batch 1000 --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.reading_analytics_service import ReadingAnalyticsService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=uuid.UUID, default=None, help="rebuild only this user")
+    parser.add_argument("--users-per-batch", type=int, default=500, help="users per delete/insert/commit round")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        report = ReadingAnalyticsService(db).rebuild_daily_activity(args.user_id, args.users_per_batch)
+        report["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['users']} users, {report['stories']} stories -> {report['rows']} rollup rows "
+              f"in {report['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Middleware microbenchmark: per-request overhead of the HTTP middleware stack.
+
+Requests are driven straight through the ASGI callable (no sockets, no HTTP
+client) against a tiny FastAPI app with one JSON endpoint, so the numbers are
+dominated by the middleware layers:
+
+- bare:   no middleware - the baseline the overheads are measured against
+- legacy: the former stack (RequestTracking, RequestID, RequestLogging,
+          SlowAPIMiddleware, GZip, PaginationEnforcement); the BaseHTTPMiddleware
+          layers are reproduced here since they were removed from the app
+- single: ObservabilityMiddleware + SlowAPIASGIMiddleware + GZip, as in main.py
+
+Log output goes to /dev/null so terminal I/O does not dominate.
+
+Usage (from backend/):
+    python scripts/benchmark_middleware.py
+    python scripts/benchmark_middleware.py --requests 20000 --json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, HTTPException, Request  # noqa: E402
+from fastapi.middleware.gzip import GZipMiddleware  # noqa: E402
+from slowapi.middleware import SlowAPIASGIMiddleware, SlowAPIMiddleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.logging import disable_async_logging, enable_async_logging  # noqa: E402
+from app.core.middleware import MAX_PAGE_SIZE, ObservabilityMiddleware  # noqa: E402
+from app.core.rate_limiter import limiter  # noqa: E402
+
+legacy_logger = logging.getLogger("benchmark.legacy")
+
+
+# --- Former BaseHTTPMiddleware stack (behaviour kept as it was) ---
+class RequestTrackingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Process-Time"] = str(process_time)
+        print(f"[{request_id}] {request.method} {request.url.path} - {response.status_code} ({process_time:.3f}s)")
+        return response
+
+
+class RequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        request_id = getattr(request.state, "request_id", "unknown")
+        legacy_logger.info(f"{request.method} {request.url.path}", extra={
+            "request_id": request_id, "method": request.method, "path": request.url.path,
+            "client_host": request.client.host if request.client else None,
+        })
+        response = await call_next(request)
+        legacy_logger.info(f"Response {response.status_code}", extra={
+            "request_id": request_id, "status_code": response.status_code,
+            "duration_ms": round((time.time() - start_time) * 1000, 2),
+        })
+        return response
+
+
+class PaginationEnforcementMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "GET":
+            query_params = dict(request.query_params)
+            for name in ("limit", "page_size"):
+                value = query_params.get(name)
+                if value:
+                    try:
+                        if int(value) > MAX_PAGE_SIZE:
+                            return HTTPException(status_code=400, detail=f"{name} cannot exceed {MAX_PAGE_SIZE}")
+                    except ValueError:
+                        pass
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+
+    @app.get("/api/stories")
+    async def stories(limit: int = 20):
+        return {"stories": [{"story_id": str(i), "theme": "orman"} for i in range(min(limit, 5))]}
+
+    if stack == "legacy":
+        app.add_middleware(RequestTrackingMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(SlowAPIMiddleware)
+        app.add_middleware(GZipMiddleware, minimum_size=1000)
+        app.add_middleware(PaginationEnforcementMiddleware)
+    elif stack == "single":
+        app.add_middleware(SlowAPIASGIMiddleware)
+        app.add_middleware(GZipMiddleware, minimum_size=1000)
+        app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> list:
+    scope_template = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/stories", "raw_path": b"/api/stories",
+        "root_path": "", "query_string": b"limit=10", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    never = asyncio.Event()
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    timings = []
+    for _ in range(requests):
+        body_sent = False
+
+        async def receive():
+            # Like a server: the body once, then block until the client disconnects
+            nonlocal body_sent
+            if body_sent:
+                await never.wait()
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        started = time.perf_counter()
+        await app(dict(scope_template), receive, send)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    for name in ("benchmark.legacy", "masal_fabrikasi"):
+        target = logging.getLogger(name)
+        target.handlers = [logging.StreamHandler(devnull)]
+        target.setLevel(logging.INFO)
+        target.propagate = False
+    enable_async_logging("benchmark.legacy", "masal_fabrikasi")
+
+    results = {}
+    try:
+        for stack in ("bare", "legacy", "single"):
+            app = build_app(stack)
+            with contextlib.redirect_stdout(devnull):
+                asyncio.run(drive(app, args.warmup))
+                timings = asyncio.run(drive(app, args.requests))
+            results[stack] = {
+                "mean_us": statistics.fmean(timings) * 1e6,
+                "p50_us": percentile(timings, 0.50) * 1e6,
+                "p99_us": percentile(timings, 0.99) * 1e6,
+            }
+    finally:
+        disable_async_logging()
+        devnull.close()
+
+    base = results["bare"]["mean_us"]
+    for stats in results.values():
+        stats["overhead_us"] = stats["mean_us"] - base
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.requests} requests per stack")
+    print(f"{'stack':<8} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10} {'overhead µs':>12}")
+    for stack, stats in results.items():
+        print(f"{stack:<8} {stats['mean_us']:>10.1f} {stats['p50_us']:>10.1f} "
+              f"{stats['p99_us']:>10.1f} {stats['overhead_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Story search benchmark: inverted index vs. the previous substring scan.
+
+Builds synthetic Turkish-like stories (Zipf-distributed vocabulary with
+inflectional suffixes) at several corpus sizes and measures, per size:
+
+- index build time and persisted index size
+- query latency (p50/p95) for StorySearchIndex.search
+- query latency of the old ``query in theme or query in story_text`` scan
+
+Usage (from backend/):
+    python scripts/benchmark_search.py
+    python scripts/benchmark_search.py --sizes 1000 10000 100000 --queries 200 --json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.story_search_index import StorySearchIndex  # noqa: E402
+
+SYLLABLES = ["ka", "le", "mi", "ro", "su", "ta", "ne", "bo", "ya", "dü", "şe", "ğa", "çi", "öz", "ır", "pa", "ge", "lu"]
+SUFFIXES = ["", "", "", "lar", "ler", "ın", "in", "da", "de", "dan", "ı", "i", "yla", "ları"]
+
+
+def build_vocabulary(size: int, rng: random.Random):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_corpus(count: int, vocabulary, rng: random.Random):
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    stories = []
+    for i in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(150, 400))
+        text = " ".join(word + rng.choice(SUFFIXES) for word in words)
+        theme = " ".join(rng.choices(vocabulary, weights=weights, k=2))
+        stories.append({"story_id": str(i), "theme": theme, "story_text": text})
+    return stories
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def timed(fn, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": statistics.median(latencies), "p95_ms": percentile(latencies, 0.95)}
+
+
+def measure(count: int, query_count: int, scan_limit: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(5000, rng)
+    stories = make_corpus(count, vocabulary, rng)
+    # Orta frekanslı iki kelimelik sorgular + yazım hatalı tek kelimeler
+    mid = vocabulary[20:800]
+    queries = [f"{rng.choice(mid)} {rng.choice(mid)}" for _ in range(query_count // 2)]
+    queries += [rng.choice(mid)[:-1] + "x" for _ in range(query_count - len(queries))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StorySearchIndex(os.path.join(tmp, "stories.idx"))
+        started = time.perf_counter()
+        for story in stories:
+            index.add(story)
+        build_seconds = time.perf_counter() - started
+        index.save()
+        index_mb = os.path.getsize(index.path) / 1e6
+
+        started = time.perf_counter()
+        StorySearchIndex(index.path).load()
+        load_seconds = time.perf_counter() - started
+
+    report = {
+        "stories": count,
+        "build_seconds": build_seconds,
+        "load_seconds": load_seconds,
+        "index_mb": index_mb,
+        "index": timed(lambda q: index.search(q, limit=20), queries),
+    }
+
+    if count <= scan_limit:
+        def scan(query):
+            query_lower = query.lower()
+            return [s for s in stories if query_lower in s["theme"].lower() or query_lower in s["story_text"].lower()]
+
+        report["scan"] = timed(scan, queries[:50])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-limit", type=int, default=10000, help="skip the linear scan above this size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = parser.parse_args()
+
+    reports = [measure(size, args.queries, args.scan_limit, args.seed) for size in args.sizes]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    print(f"{'stories':>8}{'build (s)':>11}{'load (s)':>10}{'idx MB':>8}{'p50 ms':>9}{'p95 ms':>9}{'scan p50':>10}")
+    for r in reports:
+        scan = f"{r['scan']['p50_ms']:>10.1f}" if "scan" in r else f"{'-':>10}"
+        print(f"{r['stories']:>8}{r['build_seconds']:>11.1f}{r['load_seconds']:>10.2f}{r['index_mb']:>8.1f}"
+              f"{r['index']['p50_ms']:>9.2f}{r['index']['p95_ms']:>9.2f}{scan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Startup benchmark: import time and RSS of the FastAPI app.
+
+Each mode runs in a fresh interpreter so module caches do not leak between
+measurements:
+
+- lazy:  import main (services resolve on first request) - current behaviour
+- eager: import main, then resolve every registered service - equivalent to
+         the old import-time instantiation of all router services
+
+Usage (from backend/):
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 5 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_CODE = r"""
+import json, os, sys, time
+sys.path.insert(0, os.getcwd())
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+started = time.perf_counter()
+import main  # noqa: F401
+from app.core.service_registry import service_registry
+if sys.argv[1] == "eager":
+    service_registry.preload()
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": rss_mb(),
+    "registered": len(service_registry.names()),
+    "loaded": len(service_registry.loaded_names()),
+}))
+"""
+
+
+def run_once(mode: str) -> dict:
+    env = dict(os.environ)
+    # Preloading is a lifespan concern; measure the bare import here
+    env["PRELOAD_SERVICES"] = ""
+    env.setdefault("USE_CLOUD_STORAGE", "false")
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, mode],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "seconds_median": statistics.median(s["seconds"] for s in samples),
+        "rss_mb_median": statistics.median(s["rss_mb"] for s in samples),
+        "registered": samples[0]["registered"],
+        "loaded": samples[0]["loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = parser.parse_args()
+
+    report = {mode: summarize([run_once(mode) for _ in range(args.runs)]) for mode in ("eager", "lazy")}
+    report["saved_seconds"] = report["eager"]["seconds_median"] - report["lazy"]["seconds_median"]
+    report["saved_rss_mb"] = report["eager"]["rss_mb_median"] - report["lazy"]["rss_mb_median"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'mode':<8}{'import (s)':>12}{'RSS (MB)':>12}{'services loaded':>18}")
+    for mode in ("eager", "lazy"):
+        r = report[mode]
+        print(f"{mode:<8}{r['seconds_median']:>12.2f}{r['rss_mb_median']:>12.1f}{r['loaded']:>10}/{r['registered']}")
+    print(f"\nLazy registry saves {report['saved_seconds']:.2f}s and {report['saved_rss_mb']:.1f} MB per worker")
+
+
+if __name__ == "__main__":
+    main()
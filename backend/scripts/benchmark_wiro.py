@@ -0,0 +1,143 @@
+"""
+Wiro client benchmark against the local fake Wiro server.
+
+Starts ``scripts/fake_wiro_server.py`` on a free port and runs the same batch
+of overlapping ``run_and_wait`` calls (arriving over ``--spread`` seconds)
+twice:
+
+- legacy: a new httpx.AsyncClient (new TCP/TLS connection) per request and a
+          fixed 1s Task/Detail poll per task - the previous WiroClient
+- pooled: the shared keep-alive client and the batched, backing-off poller
+
+Usage (from backend/):
+    python scripts/benchmark_wiro.py
+    python scripts/benchmark_wiro.py --tasks 50 --task-seconds 4 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.wiro_client import WiroClient, _task_outcome  # noqa: E402
+
+
+class LegacyWiroClient(WiroClient):
+    """Reproduces the old behaviour: one client per request, fixed polling."""
+
+    async def _post(self, path, timeout, **kwargs):
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            r = await client.post(f"{self.base_url}/{path}", headers=self._signed_headers(), **kwargs)
+            r.raise_for_status()
+            return r.json()
+
+    async def run_and_wait(self, provider, model_slug, inputs, files=None, is_json=False,
+                           poll_interval_s=1.0, timeout_s=120):
+        start = time.monotonic()
+        run_resp = await self.run(provider, model_slug, inputs, files=files, is_json=is_json)
+        taskid = str(run_resp.get("taskid") or "")
+        while True:
+            if time.monotonic() - start > timeout_s:
+                return {"run_response": run_resp, "detail": {"status": "timeout"}}
+            outcome = _task_outcome(await self.task_detail(taskid=taskid))
+            if outcome is not None:
+                return {"run_response": run_resp, **outcome}
+            await asyncio.sleep(poll_interval_s)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, task_seconds: float, jitter: float) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "scripts/fake_wiro_server.py", "--port", str(port),
+         "--task-seconds", str(task_seconds), "--jitter", str(jitter)],
+        cwd=BACKEND_DIR,
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=0.5)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("fake Wiro server did not start")
+
+
+async def run_batch(client: WiroClient, tasks: int, spread: float) -> dict:
+    latencies = []
+
+    async def one(i):
+        # Requests arrive over ``spread`` seconds, like real traffic
+        await asyncio.sleep(spread * i / max(tasks, 1))
+        started = time.perf_counter()
+        result = await client.run_and_wait("openai", "gpt-oss-20b", {"prompt": f"masal {i}"}, is_json=True)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(tasks)))
+    wall = time.perf_counter() - started
+    await client.aclose()
+    failed = sum(1 for r in results if r.get("error_message") or (r.get("detail") or {}).get("status") == "timeout")
+    return {
+        "wall_seconds": wall,
+        "latency_p50": statistics.median(latencies),
+        "latency_max": max(latencies),
+        "failed": failed,
+    }
+
+
+def measure(mode: str, base: str, tasks: int, spread: float) -> dict:
+    httpx.post(f"{base}/stats/reset")
+    client_cls = LegacyWiroClient if mode == "legacy" else WiroClient
+    report = asyncio.run(run_batch(client_cls(base_url=f"{base}/v1"), tasks, spread))
+    report.update(httpx.get(f"{base}/stats").json())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=30, help="number of run_and_wait calls")
+    parser.add_argument("--task-seconds", type=float, default=3.0)
+    parser.add_argument("--jitter", type=float, default=2.0)
+    parser.add_argument("--spread", type=float, default=10.0, help="seconds over which tasks arrive")
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port, args.task_seconds, args.jitter)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        report = {mode: measure(mode, base, args.tasks, args.spread) for mode in ("legacy", "pooled")}
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.tasks} tasks over {args.spread}s, {args.task_seconds}s (+0-{args.jitter}s) each\n")
+    print(f"{'mode':<8}{'wall (s)':>10}{'p50 (s)':>10}{'max (s)':>10}{'Detail req':>12}{'connections':>13}{'failed':>8}")
+    for mode in ("legacy", "pooled"):
+        r = report[mode]
+        print(f"{mode:<8}{r['wall_seconds']:>10.2f}{r['latency_p50']:>10.2f}{r['latency_max']:>10.2f}"
+              f"{r['detail_requests']:>12}{r['connections']:>13}{r['failed']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+Fake external providers for offline load tests.
+
+One Starlette app standing in for every external service the backend calls in
+the load-test scenarios, so runs are reproducible and spend no API credits:
+
+- wiro:     Run / Task endpoints (from ``fake_wiro_server``)
+- openai:   OpenAI-compatible API - chat completions (incl. streaming), images,
+            speech, embeddings. Served under ``/v1`` and ``/wiro/v1``; the
+            backend takes its Wiro code paths when the base URL contains "wiro"
+- gemini:   ``models/{model}:embedContent`` / ``:batchEmbedContents`` and the
+            OpenAI-compatible chat path under ``/v1beta/openai``
+- supabase: auth (``/auth/v1/user``, JWKS), PostgREST-style tables under
+            ``/rest/v1`` and storage objects under ``/storage/v1``
+
+Each provider has its own latency (base + uniform jitter, ms) and error rate,
+set on the command line or at runtime with ``POST /faults``; ``GET /stats``
+reports calls and injected errors per provider.
+
+Usage (from backend/):
+    python scripts/fake_providers.py --port 8766
+    python scripts/fake_providers.py --latency openai=800:400,wiro=120 --error-rate openai=0.02
+
+In-process (tests):
+    from scripts.fake_providers import create_app
+    transport = httpx.ASGITransport(app=create_app(latency={"openai": (0, 0)}))
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+import jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+try:
+    from scripts.fake_wiro_server import create_app as create_wiro_app
+except ImportError:  # run as a plain script from scripts/
+    from fake_wiro_server import create_app as create_wiro_app
+
+PROVIDERS = ("wiro", "openai", "gemini", "supabase")
+
+STORY_SENTENCES = (
+    "Bir varmış bir yokmuş, uzak bir ormanın kıyısında küçük bir tilki yaşarmış.",
+    "Tilki her gece yıldızları sayar, sabah olunca gördüklerini arkadaşlarına anlatırmış.",
+    "Bir gün gökyüzünden parlak bir taş düşmüş ve ormanın ortasına konmuş.",
+    "Hayvanlar taşın etrafında toplanmış, kimse ona dokunmaya cesaret edememiş.",
+    "Tilki yavaşça yaklaşmış ve taşın aslında yolunu kaybetmiş bir yıldız olduğunu anlamış.",
+    "Bütün orman el ele verip yıldızı en yüksek tepeye taşımış.",
+    "O gece yıldız yeniden gökyüzüne dönmüş ve ormanı sonsuza dek aydınlatmış.",
+)
+# 1x1 PNG
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+FAKE_MP3 = b"ID3\x03\x00\x00\x00\x00\x00\x00" + b"\xff\xfb\x90\x64" + bytes(2048)
+
+
+class FaultProfile:
+    """Latency and error rate per provider, plus call counters."""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, Tuple[float, float]]] = None,
+        error_rate: Optional[Dict[str, float]] = None,
+        token_ms: float = 2.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = {p: (0.0, 0.0) for p in PROVIDERS}
+        self.latency.update(latency or {})
+        self.error_rate = {p: 0.0 for p in PROVIDERS}
+        self.error_rate.update(error_rate or {})
+        self.token_ms = token_ms
+        self.random = random.Random(seed)
+        self.calls = {p: 0 for p in PROVIDERS}
+        self.errors = {p: 0 for p in PROVIDERS}
+
+    def update(self, payload: Dict):
+        for provider, value in (payload.get("latency") or {}).items():
+            base, jitter = (value, 0.0) if isinstance(value, (int, float)) else value
+            self.latency[provider] = (float(base), float(jitter))
+        for provider, rate in (payload.get("error_rate") or {}).items():
+            self.error_rate[provider] = float(rate)
+        if "token_ms" in payload:
+            self.token_ms = float(payload["token_ms"])
+
+    def delay(self, provider: str) -> float:
+        base, jitter = self.latency[provider]
+        return (base + self.random.uniform(0, jitter)) / 1000
+
+    def should_fail(self, provider: str) -> bool:
+        return self.random.random() < self.error_rate[provider]
+
+    def stats(self) -> Dict:
+        return {
+            "calls": dict(self.calls),
+            "errors": dict(self.errors),
+            "latency_ms": {p: list(v) for p, v in self.latency.items()},
+            "error_rate": dict(self.error_rate),
+        }
+
+
+def provider_for(path: str) -> Optional[str]:
+    if "/Run/" in path or "/Task/" in path:
+        return "wiro"
+    if path.startswith("/v1beta/"):
+        return "gemini"
+    if path.startswith(("/auth/", "/rest/", "/storage/")):
+        return "supabase"
+    if path.startswith(("/v1/", "/wiro/v1/")):
+        return "openai"
+    return None
+
+
+class FaultInjectionMiddleware:
+    """Adds the provider's latency and answers with 503 at its error rate."""
+
+    def __init__(self, app, faults: FaultProfile):
+        self.app = app
+        self.faults = faults
+
+    async def __call__(self, scope, receive, send):
+        provider = provider_for(scope["path"]) if scope["type"] == "http" else None
+        if provider is None:
+            await self.app(scope, receive, send)
+            return
+        self.faults.calls[provider] += 1
+        delay = self.faults.delay(provider)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.faults.should_fail(provider):
+            self.faults.errors[provider] += 1
+            response = JSONResponse(
+                {"error": {"message": f"injected {provider} failure", "type": "server_error"}}, status_code=503
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def story_text(words: int) -> str:
+    sentences, count = [], 0
+    while count < words:
+        sentence = STORY_SENTENCES[len(sentences) % len(STORY_SENTENCES)]
+        sentences.append(sentence)
+        count += len(sentence.split())
+    return " ".join(sentences)
+
+
+def fake_embedding(text: str, dims: int = 768) -> list:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    rng = random.Random(digest)
+    return [round(rng.uniform(-1, 1), 6) for _ in range(dims)]
+
+
+def create_app(
+    latency: Optional[Dict[str, Tuple[float, float]]] = None,
+    error_rate: Optional[Dict[str, float]] = None,
+    wiro_task_seconds: float = 0.5,
+    token_ms: float = 2.0,
+    jwt_secret: str = "",
+    seed: Optional[int] = None,
+) -> Starlette:
+    faults = FaultProfile(latency, error_rate, token_ms, seed)
+    tables: Dict[str, list] = {}
+    objects: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+    buckets: Dict[str, Dict] = {}
+
+    # ---- OpenAI compatible ----
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake-model")
+        words = min(int(body.get("max_tokens") or 300), 400) // 2
+        text = story_text(words)
+        created = int(time.time())
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 50, "completion_tokens": words, "total_tokens": 50 + words},
+            })
+
+        async def chunks():
+            def chunk(delta, finish=None):
+                payload = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            for word in text.split(" "):
+                if faults.token_ms:
+                    await asyncio.sleep(faults.token_ms / 1000)
+                yield chunk({"content": word + " "})
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    async def images(request: Request):
+        body = await request.json()
+        count = int(body.get("n") or 1)
+        if body.get("response_format") == "b64_json":
+            data = [{"b64_json": base64.b64encode(TINY_PNG).decode()} for _ in range(count)]
+        else:
+            data = [{"url": f"https://cdn.fake-providers.local/img/{uuid.uuid4().hex}.png"} for _ in range(count)]
+        return JSONResponse({"created": int(time.time()), "data": data})
+
+    async def speech(request: Request):
+        await request.body()
+        return Response(FAKE_MP3, media_type="audio/mpeg")
+
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input") or []
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        return JSONResponse({
+            "object": "list", "model": body.get("model", "fake-embedding"),
+            "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(str(t))} for i, t in enumerate(inputs)],
+            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+        })
+
+    # ---- Gemini ----
+    async def gemini_models(request: Request):
+        model, _, method = request.path_params["target"].partition(":")
+        body = await request.json()
+
+        def text_of(item):
+            return " ".join(part.get("text", "") for part in (item.get("content") or {}).get("parts", []))
+
+        if method == "embedContent":
+            return JSONResponse({"embedding": {"values": fake_embedding(text_of(body))}})
+        if method == "batchEmbedContents":
+            return JSONResponse({"embeddings": [{"values": fake_embedding(text_of(r))} for r in body.get("requests", [])]})
+        return JSONResponse({"error": {"message": f"unsupported method {method} for {model}"}}, status_code=404)
+
+    # ---- Supabase ----
+    async def auth_user(request: Request):
+        token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        try:
+            if jwt_secret:
+                claims = jwt.decode(token, jwt_secret, algorithms=["HS256"], audience="authenticated")
+            else:
+                claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError as e:
+            return JSONResponse({"msg": f"invalid token: {e}"}, status_code=401)
+        return JSONResponse({
+            "id": claims.get("sub"), "aud": claims.get("aud", "authenticated"), "role": claims.get("role", "authenticated"),
+            "email": claims.get("email"), "app_metadata": claims.get("app_metadata", {}),
+            "user_metadata": claims.get("user_metadata", {}),
+        })
+
+    async def jwks(request: Request):
+        return JSONResponse({"keys": []})
+
+    def _filters(request: Request):
+        return [
+            (column, value.split(".", 1)[1])
+            for column, value in request.query_params.items()
+            if column not in ("select", "order", "limit", "offset") and value.startswith("eq.")
+        ]
+
+    def _matches(row: Dict, filters) -> bool:
+        return all(str(row.get(column)) == value for column, value in filters)
+
+    async def rest_table(request: Request):
+        rows = tables.setdefault(request.path_params["table"], [])
+        filters = _filters(request)
+        if request.method == "GET":
+            found = [row for row in rows if _matches(row, filters)]
+            limit = request.query_params.get("limit")
+            return JSONResponse(found[: int(limit)] if limit else found)
+        if request.method == "POST":
+            payload = await request.json()
+            new_rows = payload if isinstance(payload, list) else [payload]
+            for row in new_rows:
+                row.setdefault("id", str(uuid.uuid4()))
+            rows.extend(new_rows)
+            return JSONResponse(new_rows, status_code=201)
+        if request.method == "PATCH":
+            changes = await request.json()
+            updated = [row for row in rows if _matches(row, filters)]
+            for row in updated:
+                row.update(changes)
+            return JSONResponse(updated)
+        kept = [row for row in rows if not _matches(row, filters)]
+        removed = [row for row in rows if _matches(row, filters)]
+        tables[request.path_params["table"]] = kept
+        return JSONResponse(removed)
+
+    async def storage_object(request: Request):
+        key = (request.path_params["bucket"], request.path_params["path"])
+        if request.method in ("POST", "PUT"):
+            objects[key] = (await request.body(), request.headers.get("content-type", "application/octet-stream"))
+            return JSONResponse({"Key": "/".join(key), "Id": uuid.uuid4().hex})
+        if request.method == "DELETE":
+            objects.pop(key, None)
+            return JSONResponse({"message": "deleted"})
+        if key not in objects:
+            return JSONResponse({"statusCode": "404", "error": "not_found", "message": "Object not found"}, status_code=404)
+        body, content_type = objects[key]
+        return Response(body, media_type=content_type)
+
+    async def storage_buckets(request: Request):
+        if request.method == "POST":
+            payload = await request.json()
+            bucket_id = payload.get("id") or payload.get("name")
+            buckets[bucket_id] = {"id": bucket_id, "name": bucket_id, "public": bool(payload.get("public"))}
+            return JSONResponse({"name": bucket_id})
+        return JSONResponse(list(buckets.values()))
+
+    async def storage_bucket(request: Request):
+        bucket = buckets.get(request.path_params["bucket"])
+        if bucket is None:
+            return JSONResponse({"statusCode": "404", "error": "not_found", "message": "Bucket not found"}, status_code=404)
+        return JSONResponse(bucket)
+
+    # ---- Control ----
+    async def stats(request: Request):
+        return JSONResponse({**faults.stats(), "wiro": wiro_app.state.wiro.stats()})
+
+    async def set_faults(request: Request):
+        faults.update(await request.json())
+        return JSONResponse(faults.stats())
+
+    async def reset(request: Request):
+        for provider in PROVIDERS:
+            faults.calls[provider] = faults.errors[provider] = 0
+        wiro_app.state.wiro.reset()
+        return JSONResponse({"result": True})
+
+    wiro_app = create_wiro_app(task_seconds=wiro_task_seconds)
+    provider_routes = [
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1/images/generations", images, methods=["POST"]),
+        Route("/v1/audio/speech", speech, methods=["POST"]),
+        Route("/v1/embeddings", embeddings, methods=["POST"]),
+        *wiro_app.routes,
+    ]
+    app = Starlette(routes=[
+        Route("/stats", stats, methods=["GET"]),
+        Route("/stats/reset", reset, methods=["POST"]),
+        Route("/faults", set_faults, methods=["POST"]),
+        Route("/v1beta/openai/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1beta/models/{target}", gemini_models, methods=["POST"]),
+        Route("/auth/v1/user", auth_user, methods=["GET"]),
+        Route("/auth/v1/.well-known/jwks.json", jwks, methods=["GET"]),
+        Route("/rest/v1/{table}", rest_table, methods=["GET", "POST", "PATCH", "DELETE"]),
+        Route("/storage/v1/bucket", storage_buckets, methods=["GET", "POST"]),
+        Route("/storage/v1/bucket/{bucket}", storage_bucket, methods=["GET"]),
+        Route("/storage/v1/object/public/{bucket}/{path:path}", storage_object, methods=["GET"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", storage_object, methods=["GET", "POST", "PUT", "DELETE"]),
+        Mount("/wiro", routes=provider_routes),
+        *provider_routes,
+    ])
+    app.add_middleware(FaultInjectionMiddleware, faults=faults)
+    app.state.faults = faults
+    app.state.wiro = wiro_app.state.wiro
+    app.state.tables = tables
+    return app
+
+
+def parse_latency(spec: str) -> Dict[str, Tuple[float, float]]:
+    """``openai=800:200,wiro=150`` -> {"openai": (800, 200), "wiro": (150, 0)}"""
+    result = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        provider, _, value = item.partition("=")
+        base, _, jitter = value.partition(":")
+        if provider not in PROVIDERS:
+            raise ValueError(f"unknown provider {provider!r} (expected one of {', '.join(PROVIDERS)})")
+        result[provider] = (float(base), float(jitter or 0))
+    return result
+
+
+def parse_error_rate(spec: str) -> Dict[str, float]:
+    """``openai=0.02,supabase=0.001`` -> {"openai": 0.02, "supabase": 0.001}"""
+    result = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        provider, _, value = item.partition("=")
+        if provider not in PROVIDERS:
+            raise ValueError(f"unknown provider {provider!r} (expected one of {', '.join(PROVIDERS)})")
+        result[provider] = float(value)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", default="", help="provider=base_ms[:jitter_ms],...")
+    parser.add_argument("--error-rate", default="", help="provider=rate,...")
+    parser.add_argument("--wiro-task-seconds", type=float, default=0.5)
+    parser.add_argument("--token-ms", type=float, default=2.0, help="delay between streamed chat tokens")
+    parser.add_argument("--jwt-secret", default="", help="verify Supabase tokens with this HS256 secret")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(
+            parse_latency(args.latency), parse_error_rate(args.error_rate),
+            args.wiro_task_seconds, args.token_ms, args.jwt_secret, args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Fake Wiro API for local benchmarks and tests.
+
+Implements the endpoints WiroClient uses (Run, Task/Detail, Task/Kill,
+Task/Cancel). Tasks finish ``task_seconds`` after they were started, so
+polling behaviour can be measured without touching the real provider.
+``GET /stats`` reports request counts and the number of distinct client
+connections (remote host:port pairs) seen so far.
+
+Usage (from backend/):
+    python scripts/fake_wiro_server.py --port 8765 --task-seconds 3
+    WIRO base_url: http://127.0.0.1:8765/v1
+
+In-process (tests):
+    from scripts.fake_wiro_server import create_app
+    transport = httpx.ASGITransport(app=create_app(task_seconds=0.2))
+"""
+import argparse
+import random
+import time
+import uuid
+from typing import Dict, Set, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class FakeWiroState:
+    def __init__(self, task_seconds: float = 3.0, jitter: float = 0.0, error_rate: float = 0.0):
+        self.task_seconds = task_seconds
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tasks: Dict[str, Dict] = {}
+        self.run_requests = 0
+        self.detail_requests = 0
+        self.connections: Set[Tuple[str, int]] = set()
+
+    def reset(self):
+        self.tasks.clear()
+        self.run_requests = 0
+        self.detail_requests = 0
+        self.connections.clear()
+
+    def track(self, request: Request):
+        if request.client:
+            self.connections.add((request.client.host, request.client.port))
+
+    def stats(self) -> Dict:
+        return {
+            "run_requests": self.run_requests,
+            "detail_requests": self.detail_requests,
+            "connections": len(self.connections),
+            "tasks": len(self.tasks),
+        }
+
+
+async def _payload(request: Request) -> Dict:
+    if request.headers.get("content-type", "").startswith("application/json"):
+        return await request.json()
+    return dict(await request.form())
+
+
+def create_app(task_seconds: float = 3.0, jitter: float = 0.0, error_rate: float = 0.0) -> Starlette:
+    state = FakeWiroState(task_seconds, jitter, error_rate)
+
+    async def run(request: Request):
+        state.track(request)
+        state.run_requests += 1
+        inputs = await _payload(request)
+        taskid = str(len(state.tasks) + 1)
+        duration = state.task_seconds + random.uniform(0, state.jitter)
+        state.tasks[taskid] = {
+            "started": time.monotonic(),
+            "duration": duration,
+            "failed": random.random() < state.error_rate,
+            "prompt": str(inputs.get("prompt", "")),
+            "model": f"{request.path_params['provider']}/{request.path_params['slug']}",
+            "token": uuid.uuid4().hex,
+        }
+        return JSONResponse({"result": True, "errors": [], "taskid": taskid, "socketaccesstoken": state.tasks[taskid]["token"]})
+
+    async def task_detail(request: Request):
+        state.track(request)
+        state.detail_requests += 1
+        payload = await _payload(request)
+        taskid = str(payload.get("taskid") or "")
+        if not taskid:
+            token = payload.get("tasktoken")
+            taskid = next((tid for tid, t in state.tasks.items() if t["token"] == token), "")
+        task = state.tasks.get(taskid)
+        if task is None:
+            return JSONResponse({"result": False, "errors": ["task not found"], "tasklist": []}, status_code=404)
+
+        elapsed = time.monotonic() - task["started"]
+        item = {"id": taskid, "status": "task_start", "debugoutput": "", "debugerror": "", "outputs": []}
+        if task.get("cancelled"):
+            item["status"] = "task_cancel"
+        elif elapsed >= task["duration"]:
+            if task["failed"]:
+                item.update(status="task_error", debugerror="fake failure")
+            else:
+                item.update(
+                    status="task_postprocess_end",
+                    debugoutput=f"Bir varmış bir yokmuş... ({task['model']})",
+                    outputs=[{"url": f"https://cdn.fake-wiro.local/{taskid}.png"}],
+                )
+        elif elapsed < task["duration"] / 4:
+            item["status"] = "task_queue"
+        return JSONResponse({"result": True, "errors": [], "tasklist": [item]})
+
+    async def cancel(request: Request):
+        state.track(request)
+        payload = await _payload(request)
+        task = state.tasks.get(str(payload.get("taskid")))
+        if task is not None:
+            task["cancelled"] = True
+        return JSONResponse({"result": task is not None, "errors": []})
+
+    async def stats(request: Request):
+        return JSONResponse(state.stats())
+
+    async def reset(request: Request):
+        state.reset()
+        return JSONResponse({"result": True})
+
+    app = Starlette(routes=[
+        Route("/v1/Run/{provider}/{slug}", run, methods=["POST"]),
+        Route("/v1/Task/Detail", task_detail, methods=["POST"]),
+        Route("/v1/Task/Kill", cancel, methods=["POST"]),
+        Route("/v1/Task/Cancel", cancel, methods=["POST"]),
+        Route("/stats", stats, methods=["GET"]),
+        Route("/stats/reset", reset, methods=["POST"]),
+    ])
+    app.state.wiro = state
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--task-seconds", type=float, default=3.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(args.task_seconds, args.jitter, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""
+Offline load-test suite: scenario profiles against the API with stubbed providers.
+
+Every external AI / Supabase call is answered by ``scripts/fake_providers.py``,
+so runs cost nothing, need no network and are reproducible (fixed seed,
+configured latency and error rates). Profiles:
+
+- library:  catalogue browsing - story list, detail, public / trending, templates
+- bedtime:  generation burst - every virtual user starts at once and requests a
+            story (synchronous generate-story and the streaming endpoint)
+- analysis: advanced-feature analysis endpoints (``/api/<feature>/process``)
+- fanout:   streaming progress fan-out - one generation, many subscribers
+            (SSE by default, Socket.IO with ``--transport socketio``, which
+            needs the app's Redis); measures time to first delta and completion
+
+The report is JSON: per scenario and endpoint count, errors, error rate,
+throughput and latency p50 / p95 / p99 / mean / max (ms), plus the stub call
+counts. With ``--baseline`` the run fails (exit code 1) when a p95 or the
+throughput regresses by more than ``--max-regression``, or the error rate
+grows by more than ``--max-error-increase``; use it as a pre-deploy gate.
+
+Usage (from backend/):
+    # Start the stubs and the API locally, run every profile
+    python scripts/load_test.py --spawn --profile all --output reports/load.json
+
+    # Gate against a previous report
+    python scripts/load_test.py --spawn --profile library,bedtime \\
+        --baseline reports/load.json --max-regression 0.2
+
+    # Slow / flaky providers
+    python scripts/load_test.py --spawn --latency openai=1500:500,wiro=200 --error-rate openai=0.05
+
+    # Existing deployment that already points at the stubs
+    python scripts/load_test.py --target http://127.0.0.1:8000 --token <jwt> --stub-url http://127.0.0.1:8766
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+
+PROFILES = ("library", "bedtime", "analysis", "fanout")
+ANALYSIS_FEATURES = (
+    "character-depth", "plot-complexity", "dialogue-realism",
+    "setting-richness", "tone-consistency", "world-detail",
+)
+THEMES = ("uzaya giden kedi", "konuşan ağaç", "kayıp yıldız", "cesur tavşan", "denizaltı şehri")
+SEED_SNIPPET = """
+import sys
+from app.services.story_storage import StoryStorage
+storage = StoryStorage()
+for i in range(int(sys.argv[1])):
+    storage.save_story({
+        "story_id": f"seed-{i:04d}",
+        "theme": "tema %d" % i,
+        "story_text": "Bir varmış bir yokmuş. " * 40,
+        "image_url": f"/storage/images/seed-{i:04d}.png",
+        "audio_url": f"/storage/audio/seed-{i:04d}.mp3",
+        "language": "tr",
+        "story_type": "masal",
+        "user_id": "load-user-%d" % (i % 10),
+        "is_public": i % 3 == 0,
+    })
+"""
+
+
+class Recorder:
+    """Collects (endpoint, latency, ok) samples of one scenario."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def add(self, endpoint: str, seconds: float, ok: bool):
+        self.samples[endpoint].append((seconds, ok))
+
+    async def call(self, endpoint: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.add(endpoint, time.perf_counter() - started, False)
+            return None
+        self.add(endpoint, time.perf_counter() - started, response.status_code < 400)
+        return response
+
+    def close(self):
+        self.finished = time.perf_counter()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of ``values`` (``fraction`` in 0..1)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples: List[Tuple[float, bool]], duration: float) -> Dict:
+    latencies = [seconds * 1000 for seconds, _ in samples]
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / duration, 2) if duration > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        },
+    }
+
+
+def scenario_report(recorder: Recorder) -> Dict:
+    duration = (recorder.finished or time.perf_counter()) - recorder.started
+    merged = [sample for samples in recorder.samples.values() for sample in samples]
+    return {
+        "duration_s": round(duration, 3),
+        "total": summarize(merged, duration),
+        "endpoints": {name: summarize(samples, duration) for name, samples in sorted(recorder.samples.items())},
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_regression: float, max_error_increase: float = 0.01) -> List[str]:
+    """Regressions of ``report`` against ``baseline``; empty when within limits."""
+    problems = []
+    for scenario, current in report.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for name, stats in current["endpoints"].items():
+            before = previous["endpoints"].get(name)
+            if not before or not before["count"]:
+                continue
+            label = f"{scenario} {name}"
+            old_p95, new_p95 = before["latency_ms"]["p95"], stats["latency_ms"]["p95"]
+            if old_p95 > 0 and new_p95 > old_p95 * (1 + max_regression):
+                problems.append(f"{label}: p95 {old_p95:.1f}ms -> {new_p95:.1f}ms")
+            if stats["error_rate"] > before["error_rate"] + max_error_increase:
+                problems.append(f"{label}: error rate {before['error_rate']:.2%} -> {stats['error_rate']:.2%}")
+        old_rps, new_rps = previous["total"]["throughput_rps"], current["total"]["throughput_rps"]
+        if old_rps > 0 and new_rps < old_rps * (1 - max_regression):
+            problems.append(f"{scenario}: throughput {old_rps:.1f} -> {new_rps:.1f} req/s")
+    return problems
+
+
+# --- Scenarios ---
+class Context:
+    def __init__(self, client: httpx.AsyncClient, args, story_ids: List[str]):
+        self.client = client
+        self.args = args
+        self.story_ids = story_ids
+        self.random = random.Random(args.seed)
+
+    def think(self):
+        return asyncio.sleep(self.random.uniform(0, self.args.think_ms) / 1000) if self.args.think_ms else asyncio.sleep(0)
+
+
+async def _read_stream(client: httpx.AsyncClient, sse_url: str, recorder: Recorder, started: float, prefix: str):
+    """Consumes an SSE stream until a terminal event; records first delta and completion."""
+    first_delta, outcome = None, None
+    try:
+        async with client.stream("GET", sse_url, timeout=None) as response:
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    if event == "story_delta" and first_delta is None:
+                        first_delta = time.perf_counter()
+                        recorder.add(f"{prefix} first_delta", first_delta - started, True)
+                    if event in ("story_completed", "story_failed"):
+                        outcome = event
+                        break
+    except httpx.HTTPError:
+        pass
+    recorder.add(f"{prefix} completion", time.perf_counter() - started, outcome == "story_completed")
+
+
+async def _start_stream(ctx: Context, recorder: Recorder) -> Optional[Dict]:
+    body = {"theme": ctx.random.choice(THEMES), "save": False}
+    response = await recorder.call("POST /api/generate-story/stream", ctx.client.post("/api/generate-story/stream", json=body))
+    if response is None or response.status_code >= 400:
+        return None
+    return response.json()
+
+
+async def library_user(ctx: Context, recorder: Recorder, deadline: float):
+    steps: List[Tuple[int, str, Callable[[], str]]] = [
+        (5, "GET /api/stories", lambda: f"/api/stories?limit={ctx.random.choice((10, 20, 50))}"),
+        (3, "GET /api/stories/{story_id}", lambda: f"/api/stories/{ctx.random.choice(ctx.story_ids)}"),
+        (1, "GET /api/stories/public", lambda: "/api/stories/public"),
+        (1, "GET /api/stories/trending", lambda: "/api/stories/trending"),
+        (1, "GET /api/templates", lambda: "/api/templates"),
+    ]
+    weights = [weight for weight, _, _ in steps]
+    while time.perf_counter() < deadline:
+        _, name, path = ctx.random.choices(steps, weights)[0]
+        await recorder.call(name, ctx.client.get(path()))
+        await ctx.think()
+
+
+async def bedtime_user(ctx: Context, recorder: Recorder, deadline: float):
+    # Burst: all users fire at t=0, then repeat until the deadline
+    while time.perf_counter() < deadline:
+        body = {"theme": ctx.random.choice(THEMES), "use_async": False, "save": False}
+        await recorder.call("POST /api/generate-story", ctx.client.post("/api/generate-story", json=body))
+        started = time.perf_counter()
+        stream = await _start_stream(ctx, recorder)
+        if stream:
+            await _read_stream(ctx.client, stream["sse_url"], recorder, started, "stream")
+        await ctx.think()
+
+
+async def analysis_user(ctx: Context, recorder: Recorder, deadline: float):
+    text = "Bir varmış bir yokmuş, küçük bir tilki yıldızları sayarmış. " * 20
+    while time.perf_counter() < deadline:
+        feature = ctx.random.choice(ANALYSIS_FEATURES)
+        body = {"story_id": ctx.random.choice(ctx.story_ids), "story_text": text}
+        await recorder.call(f"POST /api/{feature}/process", ctx.client.post(f"/api/{feature}/process", json=body))
+        await ctx.think()
+
+
+async def _socketio_subscriber(ctx: Context, stream: Dict, recorder: Recorder, started: float):
+    import socketio  # python-socketio[asyncio_client]
+
+    client = socketio.AsyncClient(reconnection=False)
+    done = asyncio.Event()
+    state = {"first": None, "outcome": None}
+
+    @client.on("story_delta")
+    async def on_delta(data):
+        if state["first"] is None:
+            state["first"] = time.perf_counter()
+            recorder.add("fanout first_delta", state["first"] - started, True)
+
+    @client.on("story_completed")
+    async def on_completed(data):
+        state["outcome"] = "story_completed"
+        done.set()
+
+    @client.on("story_failed")
+    async def on_failed(data):
+        state["outcome"] = "story_failed"
+        done.set()
+
+    try:
+        await client.connect(str(ctx.client.base_url), socketio_path="/ws/socket.io", transports=["websocket"])
+        await client.emit("join_story_stream", stream["room"])
+        await asyncio.wait_for(done.wait(), timeout=ctx.args.stream_timeout)
+    except Exception:
+        pass
+    finally:
+        recorder.add("fanout completion", time.perf_counter() - started, state["outcome"] == "story_completed")
+        with contextlib.suppress(Exception):
+            await client.disconnect()
+
+
+async def fanout_user(ctx: Context, recorder: Recorder, deadline: float):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        stream = await _start_stream(ctx, recorder)
+        if stream:
+            if ctx.args.transport == "socketio":
+                subscribers = [_socketio_subscriber(ctx, stream, recorder, started) for _ in range(ctx.args.subscribers)]
+            else:
+                subscribers = [
+                    _read_stream(ctx.client, stream["sse_url"], recorder, started, "fanout")
+                    for _ in range(ctx.args.subscribers)
+                ]
+            await asyncio.gather(*subscribers)
+        await ctx.think()
+
+
+SCENARIOS = {
+    "library": library_user,
+    "bedtime": bedtime_user,
+    "analysis": analysis_user,
+    "fanout": fanout_user,
+}
+
+
+async def run_scenario(name: str, args, client: httpx.AsyncClient, story_ids: List[str]) -> Dict:
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.duration
+    users = []
+    for index in range(args.users):
+        ctx = Context(client, args, story_ids)
+        ctx.random.seed(f"{args.seed}-{name}-{index}")
+        users.append(SCENARIOS[name](ctx, recorder, deadline))
+    await asyncio.gather(*users)
+    recorder.close()
+    return scenario_report(recorder)
+
+
+async def run(args, target: str, token: str, story_ids: List[str], stub_url: Optional[str]) -> Dict:
+    limits = httpx.Limits(max_connections=args.users * (args.subscribers + 1) + 10)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "profiles": args.profile, "users": args.users, "duration_s": args.duration,
+            "think_ms": args.think_ms, "seed": args.seed, "latency": args.latency,
+            "error_rate": args.error_rate, "transport": args.transport, "subscribers": args.subscribers,
+        },
+        "scenarios": {},
+    }
+    async with httpx.AsyncClient(base_url=target, headers=headers, limits=limits, timeout=args.request_timeout) as client:
+        stub = httpx.AsyncClient(base_url=stub_url) if stub_url else None
+        for name in args.profile:
+            if stub:
+                await stub.post("/stats/reset")
+            scenario = await run_scenario(name, args, client, story_ids)
+            if stub:
+                scenario["providers"] = (await stub.get("/stats")).json()
+            report["scenarios"][name] = scenario
+        if stub:
+            await stub.aclose()
+    return report
+
+
+# --- Local stack ---
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def mint_token(secret: str, user_id: str = "load-test-user", ttl: int = 6 * 3600) -> str:
+    now = int(time.time())
+    claims = {"sub": user_id, "aud": "authenticated", "role": "authenticated", "email": f"{user_id}@load.test",
+              "iat": now, "exp": now + ttl}
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        with contextlib.suppress(httpx.HTTPError):
+            httpx.get(url, timeout=1.0)
+            return
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up in {timeout:.0f}s")
+
+
+def stack_env(stub_url: str, storage_path: str, secret: str, keep_rate_limits: bool) -> Dict[str, str]:
+    """Environment that points every provider of the app at the stub server."""
+    env = dict(os.environ)
+    env.update({
+        "ENVIRONMENT": "load-test",
+        "DEBUG": "false",
+        "STORAGE_PATH": storage_path,
+        "DATABASE_URL": f"sqlite:///{storage_path}/load_test.db",
+        "USE_CLOUD_STORAGE": "false",
+        "GPT_BASE_URL": f"{stub_url}/wiro/v1",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "STT_BASE_URL": f"{stub_url}/wiro/v1",
+        "WIRO_BASE_URL": f"{stub_url}/v1",
+        "EMBEDDING_BASE_URL": f"{stub_url}/v1beta",
+        "SUPABASE_URL": stub_url,
+        "SUPABASE_JWT_SECRET": secret,
+        "WIRO_HTTP2": "false",
+        "WIRO_POLL_INITIAL_SECONDS": "0.1",
+    })
+    for key in ("GPT_API_KEY", "GEMINI_API_KEY", "EMBEDDING_API_KEY", "OPENAI_API_KEY", "STT_API_KEY",
+                "IMAGEN_API_KEY", "ELEVENLABS_API_KEY", "WIRO_API_KEY", "WIRO_API_SECRET",
+                "SUPABASE_ANON_KEY", "SUPABASE_SERVICE_KEY"):
+        env[key] = "load-test"
+    if not keep_rate_limits:
+        env["RATELIMIT_ENABLED"] = "false"
+    return env
+
+
+@contextlib.contextmanager
+def spawn_stack(args):
+    """Starts the stubs and the API in subprocesses; yields (target, token, story_ids, stub_url)."""
+    secret = uuid.uuid4().hex
+    stub_port, api_port = free_port(), free_port()
+    stub_url, target = f"http://127.0.0.1:{stub_port}", f"http://127.0.0.1:{api_port}"
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="masal-load-") as storage_path:
+        env = stack_env(stub_url, storage_path, secret, args.keep_rate_limits)
+        output = None if args.verbose else subprocess.DEVNULL
+        try:
+            stubs = subprocess.Popen(
+                [sys.executable, os.path.join(BACKEND_DIR, "scripts", "fake_providers.py"),
+                 "--port", str(stub_port), "--latency", args.latency, "--error-rate", args.error_rate,
+                 "--jwt-secret", secret, "--seed", str(args.seed), "--token-ms", str(args.token_ms),
+                 "--wiro-task-seconds", str(args.wiro_task_seconds)],
+                cwd=BACKEND_DIR, stdout=output, stderr=output,
+            )
+            processes.append(stubs)
+            wait_until_up(f"{stub_url}/stats", stubs)
+
+            subprocess.run([sys.executable, "-c", SEED_SNIPPET, str(args.seed_stories)],
+                           cwd=BACKEND_DIR, env=env, check=True, stdout=output, stderr=output)
+            api = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port),
+                 "--workers", str(args.workers), "--log-level", "warning"],
+                cwd=BACKEND_DIR, env=env, stdout=output, stderr=output,
+            )
+            processes.append(api)
+            wait_until_up(f"{target}/api/health", api, timeout=120)
+            story_ids = [f"seed-{i:04d}" for i in range(args.seed_stories)]
+            yield target, mint_token(secret), story_ids, stub_url
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                with contextlib.suppress(subprocess.TimeoutExpired):
+                    process.wait(timeout=10)
+                if process.poll() is None:
+                    process.kill()
+
+
+def print_report(report: Dict):
+    print(f"{'scenario':<10} {'endpoint':<42} {'count':>7} {'err%':>6} {'rps':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for scenario, data in report["scenarios"].items():
+        for name, stats in [*data["endpoints"].items(), ("(total)", data["total"])]:
+            latency = stats["latency_ms"]
+            print(f"{scenario:<10} {name[:42]:<42} {stats['count']:>7} {stats['error_rate'] * 100:>6.1f} "
+                  f"{stats['throughput_rps']:>8.1f} {latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f}")
+        if "providers" in data:
+            print(f"{'':<10} stub calls {data['providers']['calls']} errors {data['providers']['errors']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--spawn", action="store_true", help="start fake providers + API locally")
+    where.add_argument("--target", help="base URL of a running API (already wired to the stubs)")
+    parser.add_argument("--token", default="", help="bearer token for --target")
+    parser.add_argument("--stub-url", default="", help="fake providers URL for --target (stats in the report)")
+    parser.add_argument("--profile", default="library", help=f"comma separated: {', '.join(PROFILES)} or all")
+    parser.add_argument("--users", type=int, default=20, help="virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="max random pause between steps")
+    parser.add_argument("--subscribers", type=int, default=10, help="fanout: subscribers per stream")
+    parser.add_argument("--transport", choices=("sse", "socketio"), default="sse")
+    parser.add_argument("--stream-timeout", type=float, default=120.0)
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--latency", default="openai=600:300,wiro=150:50,gemini=80:20,supabase=20:10",
+                        help="stub latency, provider=base_ms[:jitter_ms],...")
+    parser.add_argument("--error-rate", default="", help="stub error rates, provider=rate,...")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="stub delay between streamed tokens")
+    parser.add_argument("--wiro-task-seconds", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-stories", type=int, default=200, help="--spawn: stories written before the run")
+    parser.add_argument("--workers", type=int, default=1, help="--spawn: uvicorn workers")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="--spawn: leave slowapi limits on")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 / throughput change (0.2 = 20%%)")
+    parser.add_argument("--max-error-increase", type=float, default=0.01)
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of the table")
+    parser.add_argument("--verbose", action="store_true", help="--spawn: show subprocess output")
+    args = parser.parse_args(argv)
+
+    profiles = PROFILES if args.profile == "all" else tuple(p.strip() for p in args.profile.split(",") if p.strip())
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+    args.profile = list(profiles)
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        if args.spawn:
+            target, token, story_ids, stub_url = stack.enter_context(spawn_stack(args))
+        else:
+            target, token, stub_url = args.target, args.token, args.stub_url or None
+            story_ids = [f"seed-{i:04d}" for i in range(args.seed_stories)]
+        report = asyncio.run(run(args, target, token, story_ids, stub_url))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.max_regression, args.max_error_increase)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Library statistics reconcile: recounts the write-time aggregates behind
+/stories/stats/detailed from the live stories and repairs any drift.
+The counters are rebuilt on startup and checked on every log compaction;
+run this from cron or after manual edits to the storage directory.
+
+Usage (from backend/):
+    python scripts/reconcile_story_stats.py
+    python scripts/reconcile_story_stats.py --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.statistics_service import StatisticsService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    service = StatisticsService()
+    started = time.perf_counter()
+    drift = service.reconcile()
+    report = {
+        "stories": service.story_storage.store.count(),
+        "drift": drift,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        fields = ", ".join(drift) if drift else "none"
+        print(f"{report['stories']} stories reconciled in {report['elapsed_seconds']}s; drifted fields: {fields}")
+
+
+if __name__ == "__main__":
+    main()
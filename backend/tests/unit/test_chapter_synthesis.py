@@ -0,0 +1,199 @@
+"""
+Unit tests for the audiobook/podcast chapter synthesis scheduler
+
+Tests cover:
+- Chapters run concurrently, each under its own output key
+- TTS requests are bounded per provider across concurrent builds, at the chunk level
+- A failed build keeps finished chapters in the manifest and resumes from them,
+  re-synthesizing chapters whose audio file is gone
+- MP3 durations measured from frame headers (MPEG-1 and MPEG-2 Layer III)
+- Audiobook and podcast services report measured durations and stable ids
+"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceError
+from app.services import tts_service
+from app.services.audio_chunk_cache import AudioChunkCache, mp3_duration
+from app.services.chapter_synthesis import ChapterSynthesisScheduler
+from app.services.cloud_storage_service import cloud_storage_service
+from app.services.story_audiobook_service import StoryAudiobookService
+from app.services.story_podcast_service import StoryPodcastService
+from app.services.tts_service import TTSService, parse_limits
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz: 417 baytlık çerçeve, 1152 örnek
+MPEG1_FRAME = b"\xff\xfb\x90\x64" + b"\0" * 413
+# MPEG-2 Layer III, 32 kbps, 24 kHz (gTTS çıktısı): 96 baytlık çerçeve, 576 örnek
+MPEG2_FRAME = b"\xff\xf3\x44\xc4" + b"\0" * 92
+
+
+class FakeTTS:
+    """Writes each chapter to {root}/audio/{audio_id}.mp3, like local (non-cloud) mode."""
+
+    def __init__(self, root, fail=(), delay=0.02):
+        self.root = root
+        self.fail = set(fail)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def provider_for(self, voice=None, character_id=None):
+        return "elevenlabs" if voice == "clone" else "openai"
+
+    async def synthesize(self, text, language, audio_id=None, voice=None, emotion=None, character_id=None):
+        self.calls.append((audio_id, text))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if text in self.fail:
+                raise RuntimeError("quota exceeded")
+            path = self.root / "audio" / f"{audio_id}.mp3"
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(MPEG2_FRAME)
+            return {"audio_url": str(path), "duration": float(len(text))}
+        finally:
+            self.in_flight -= 1
+
+
+def _chapters(count, voice="alloy"):
+    return [{"text": f"bölüm {i}", "voice": voice} for i in range(count)]
+
+
+class TestScheduler:
+    """Tests for ChapterSynthesisScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_chapters_run_concurrently(self, tmp_path):
+        tts = FakeTTS(tmp_path)
+        scheduler = ChapterSynthesisScheduler(tts, str(tmp_path / "manifests"))
+
+        manifest = await scheduler.run("b1", _chapters(6) + _chapters(3, voice="clone"))
+
+        assert tts.max_in_flight == 9  # sınır sağlayıcı isteklerinde, bölümlerde değil
+        assert manifest["status"] == "completed"
+        assert [c["provider"] for c in manifest["chapters"]].count("elevenlabs") == 3
+        assert [c["audio_id"] for c in manifest["chapters"]][:2] == ["b1_001", "b1_002"]
+        assert len({c["audio_id"] for c in manifest["chapters"]}) == 9
+        assert manifest["total_duration"] == sum(len(c["text"]) for c in _chapters(9))
+
+    @pytest.mark.asyncio
+    async def test_failed_build_resumes(self, tmp_path):
+        chapters = _chapters(5)
+        tts = FakeTTS(tmp_path, fail={"bölüm 2"})
+        scheduler = ChapterSynthesisScheduler(tts, str(tmp_path / "manifests"))
+
+        with pytest.raises(ExternalServiceError) as raised:
+            await scheduler.run("b1", chapters)
+        assert raised.value.details["failed_chapters"] == [3]
+        saved = scheduler.load_manifest("b1")
+        assert saved["status"] == "failed"
+        assert [c["status"] for c in saved["chapters"]] == ["done", "done", "failed", "done", "done"]
+
+        tts = FakeTTS(tmp_path)
+        scheduler.tts_service = tts
+        chapters[4] = {"text": "bölüm 4 (düzenlendi)", "voice": "alloy"}
+        (tmp_path / "audio" / "b1_001.mp3").unlink()  # çıktısı silinmiş bölüm
+        manifest = await scheduler.run("b1", chapters)
+
+        assert sorted(tts.calls) == [
+            ("b1_001", "bölüm 0"), ("b1_003", "bölüm 2"), ("b1_005", "bölüm 4 (düzenlendi)"),
+        ]
+        assert manifest["status"] == "completed"
+        assert "error" not in manifest["chapters"][2]
+
+    def test_parse_limits(self):
+        assert parse_limits("openai=4, gtts = 2,bad,x=y,zero=0") == {"openai": 4, "gtts": 2, "zero": 1}
+
+
+class TestProviderLimits:
+    """Tests for process-wide, chunk-level provider limits in TTSService."""
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_across_builds(self, tmp_path, monkeypatch):
+        (tmp_path / "audio").mkdir()
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(settings, "TTS_CHUNK_MAX_CHARS", 20)
+        monkeypatch.setattr(settings, "TTS_CONCURRENCY", 4)
+        monkeypatch.setattr(settings, "TTS_PROVIDER_CONCURRENCY", "elevenlabs=2")
+        monkeypatch.setattr(tts_service, "_chunk_cache", AudioChunkCache(str(tmp_path / "chunks")))
+        in_flight = {"now": 0, "max": 0}
+
+        async def render(chunk):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return MPEG2_FRAME
+
+        service = TTSService()
+        await asyncio.gather(*(
+            service._synthesize(
+                "\n\n".join(f"Kitap {book}, paragraf {i}." for i in range(6)), f"b{book}", render,
+                engine="elevenlabs", voice="clone",
+            )
+            for book in range(3)
+        ))
+
+        assert in_flight["max"] == 2
+
+
+class TestDurations:
+    """Tests for mp3_duration and TTSService.synthesize durations."""
+
+    def test_mp3_duration_counts_frames(self, tmp_path):
+        path = tmp_path / "a.mp3"
+        path.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x02ab" + MPEG1_FRAME * 100 + b"junk" + MPEG2_FRAME * 50)
+
+        assert mp3_duration(str(path)) == pytest.approx(100 * 1152 / 44100 + 50 * 576 / 24000)
+
+    @pytest.mark.asyncio
+    async def test_synthesize_returns_measured_duration(self, tmp_path, monkeypatch):
+        (tmp_path / "audio").mkdir()
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(tts_service, "_chunk_cache", AudioChunkCache(str(tmp_path / "chunks")))
+        monkeypatch.setattr(cloud_storage_service, "enabled", False)
+        service = TTSService()
+        service.openai_client = None
+        monkeypatch.setattr(service, "_render_gtts_chunk", lambda *args: MPEG2_FRAME * 250)
+
+        result = await service.synthesize("Bir varmış. Bir yokmuş.", "tr", "s1", voice=None)
+
+        assert result == {"audio_url": f"{tmp_path}/audio/s1.mp3", "duration": 6.0}
+
+
+class TestServices:
+    """Tests for StoryAudiobookService and StoryPodcastService."""
+
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        return tmp_path
+
+    @pytest.mark.asyncio
+    async def test_audiobook_and_podcast_durations(self, storage):
+        text = "\n\n".join(f"Paragraf {i}. " + "kelime " * 130 for i in range(4))
+        audiobooks = StoryAudiobookService()
+        audiobooks.scheduler.tts_service = FakeTTS(storage)
+
+        first = await audiobooks.create_audiobook("story-1", text)
+        again = await audiobooks.create_audiobook("story-1", text)
+
+        assert first["chapters_count"] == 2 and again["audiobook_id"] == first["audiobook_id"]
+        assert len(audiobooks.scheduler.tts_service.calls) == 2  # ikinci çağrı manifest'ten gelir
+        book = await audiobooks.get_audiobook(first["audiobook_id"])
+        assert len(audiobooks.audiobooks_store.items()) == 1
+        assert first["total_duration"] == sum(ch["duration"] for ch in book["chapters"])
+        assert [ch["duration"] for ch in book["chapters"]] == [len(ch["text"]) for ch in book["chapters"]]
+
+        podcasts = StoryPodcastService()
+        podcasts.scheduler.tts_service = FakeTTS(storage)
+        podcast = await podcasts.create_podcast("story-1", text)
+        saved = await podcasts.get_podcast(podcast["podcast_id"])
+        assert podcast["duration"] == sum(ch["duration"] for ch in saved["chapters"])
+        assert {ch["audio_url"] for ch in saved["chapters"]} == {
+            f"{storage}/audio/{podcast['podcast_id']}_{n:03d}.mp3" for n in range(1, podcast["chapters_count"] + 1)
+        }
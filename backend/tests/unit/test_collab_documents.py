@@ -0,0 +1,197 @@
+"""
+Unit tests for the collaborative document engine
+
+Tests cover:
+- Text operation apply/transform convergence (including randomized ops)
+- Concurrent submits against stale versions and idempotent resends
+- Compaction, batched persistence and reload from snapshot + op log
+- Late-joiner state (snapshot + tail, or ops since a version)
+- RealtimeCollaborationService on top of the engine
+- Change history of closed sessions comes from the op log without loading documents
+"""
+import random
+
+import pytest
+
+from app.core.collab_documents import (
+    CollabDocument, CollabHub, CollabResyncRequired, apply, operation_from_change, transform,
+)
+
+
+def _random_op(rng, length):
+    op, cursor = [], 0
+    while cursor < length:
+        roll = rng.random()
+        size = rng.randint(1, max(1, min(4, length - cursor)))
+        if roll < 0.4:
+            op.append(size)
+        elif roll < 0.7:
+            op.append(-size)
+        else:
+            op.append(rng.choice(["a", "bc", "ğü", "xyz"]))
+            continue
+        cursor += size
+    if rng.random() < 0.5:
+        op.append("son")
+    return [c for c in op if c not in (0, "")]
+
+
+class TestTextOperations:
+    """Tests for apply and transform."""
+
+    def test_insert_tie_keeps_first_applied_first(self):
+        text = "masal"
+        a = operation_from_change("insert", {"position": 5, "text": " bir"}, 5)
+        b = operation_from_change("insert", {"position": 5, "text": " iki"}, 5)
+
+        a_prime, b_prime = transform(a, b)
+
+        assert apply(apply(text, a), b_prime) == apply(apply(text, b), a_prime) == "masal bir iki"
+
+    def test_overlapping_deletes_and_insert_inside_delete(self):
+        text = "0123456789"
+        a = operation_from_change("delete", {"position": 2, "length": 5}, 10)
+        b = operation_from_change("replace", {"position": 4, "length": 4, "text": "X"}, 10)
+
+        a_prime, b_prime = transform(a, b)
+
+        assert apply(apply(text, a), b_prime) == apply(apply(text, b), a_prime) == "01X89"
+
+    def test_random_ops_converge(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            text = "".join(rng.choice("abcdef ") for _ in range(rng.randint(0, 20)))
+            a, b = _random_op(rng, len(text)), _random_op(rng, len(text))
+            a_prime, b_prime = transform(a, b)
+            assert apply(apply(text, a), b_prime) == apply(apply(text, b), a_prime)
+
+    def test_rejects_invalid_changes(self):
+        with pytest.raises(ValueError):
+            operation_from_change("delete", {"position": 3, "length": 5}, 4)
+        with pytest.raises(ValueError):
+            apply("abc", [2, "x"])
+        with pytest.raises(ValueError):
+            operation_from_change("operation", {"operation": [1, None]}, 1)
+
+
+class TestCollabDocument:
+    """Tests for version handling, compaction and persistence."""
+
+    def test_stale_submits_are_transformed(self, tmp_path):
+        doc = CollabDocument("s1", str(tmp_path), "Bir varmış")
+
+        doc.submit("ayse", operation_from_change("insert", {"position": 0, "text": "Evvel "}, 10), base_version=0)
+        entry, _ = doc.submit("mehmet", operation_from_change("insert", {"position": 10, "text": "!"}, 10), base_version=0)
+
+        assert doc.text == "Evvel Bir varmış!"
+        assert entry["version"] == 2 and entry["base_version"] == 0
+        with pytest.raises(CollabResyncRequired):
+            doc.submit("ayse", [len(doc.text)], base_version=5)
+
+    def test_resend_is_applied_once(self, tmp_path):
+        doc = CollabDocument("s1", str(tmp_path), "abc")
+        first, duplicate = doc.submit("ayse", [3, "d"], base_version=0, client_seq=1, client_id="tab-1")
+        again, duplicate_again = doc.submit("ayse", [3, "d"], base_version=0, client_seq=1, client_id="tab-1")
+        doc.submit("ayse", [3, "e"], base_version=0, client_seq=1, client_id="tab-2")
+
+        assert (duplicate, duplicate_again) == (False, True)
+        assert again["change_id"] == first["change_id"]
+        assert doc.text == "abcde"
+        assert doc.vector == {"tab-1": 1, "tab-2": 1}
+
+    def test_compaction_persistence_and_late_join(self, tmp_path):
+        hub = CollabHub(str(tmp_path), flush_interval=3600, compact_ops=10, history_ops=3)
+        hub.open("s1", "")
+        for i in range(12):
+            hub.submit("s1", "ayse", [i, str(i % 10)], client_seq=i + 1)
+        doc = hub.get("s1")
+
+        assert doc.snapshot_version == 7 and len(doc.ops) == 5
+        state = doc.state()
+        text = state["snapshot"]["text"]
+        for entry in state["ops"]:
+            text = apply(text, entry["operation"])
+        assert text == doc.text == "012345678901"
+        assert [e["version"] for e in doc.state(since=10)["ops"]] == [11, 12]
+        assert "snapshot" in doc.state(since=2)
+        with pytest.raises(CollabResyncRequired):
+            hub.submit("s1", "ayse", [12, "x"], base_version=2)
+
+        hub.submit("s1", "mehmet", [12, "!"])
+        hub.flush_all()
+        hub.submit("s1", "mehmet", [13, "?"])
+        hub.release("s1")
+
+        reloaded = CollabHub(str(tmp_path)).get("s1")
+        assert reloaded.text == "012345678901!?"
+        assert reloaded.version == 14
+        assert reloaded.vector["ayse"] == 12
+        assert reloaded.length_at(12) == 12
+
+    def test_rejects_unsafe_session_ids(self, tmp_path):
+        with pytest.raises(ValueError):
+            CollabDocument("../escape", str(tmp_path))
+
+
+class TestRealtimeCollaborationService:
+    """Tests for the service flow."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.services.realtime_collaboration_service import RealtimeCollaborationService
+        from app.services.story_storage import StoryStorage
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        StoryStorage().save_story({"story_id": "story-1", "story_text": "Bir varmış bir yokmuş."})
+        return RealtimeCollaborationService()
+
+    def test_concurrent_editing_flow(self, service):
+        session = service.create_collaboration_session("story-1", "ayse")
+        session_id = session["session_id"]
+        service.join_session(session_id, "mehmet")
+
+        service.apply_change(session_id, "ayse", "insert", {"position": 0, "text": "Evvel zaman içinde, ", "base_version": 0})
+        change = service.apply_change(session_id, "mehmet", "delete", {"position": 10, "length": 12, "base_version": 0})
+
+        state = service.get_document(session_id, since=0)
+        assert state["version"] == 2
+        assert [op["user_id"] for op in state["ops"]] == ["ayse", "mehmet"]
+        assert change["operation"] == [30, -12]
+        assert service._document(session).text == "Evvel zaman içinde, Bir varmış"
+
+        with pytest.raises(ValueError):
+            service.apply_change(session_id, "stranger", "insert", {"position": 0, "text": "x"})
+
+        history = service.get_change_history("story-1")
+        assert [c["change_type"] for c in history] == ["insert", "delete"]
+
+        service.leave_session(session_id, "ayse")
+        service.leave_session(session_id, "mehmet")
+        assert session_id not in service.documents._docs
+        assert service.get_document(session_id)["version"] == 2  # reloaded from disk
+
+    def test_history_reads_closed_sessions_from_the_log(self, service):
+        closed = service.create_collaboration_session("story-1", "ayse")["session_id"]
+        for i in range(5):
+            service.apply_change(closed, "ayse", "insert", {"position": 0, "text": str(i)})
+        service.leave_session(closed, "ayse")
+        live = service.create_collaboration_session("story-1", "mehmet")["session_id"]
+        service.apply_change(live, "mehmet", "delete", {"position": 0, "length": 3})
+
+        history = service.get_change_history("story-1", limit=3)
+
+        assert closed not in service.documents._docs
+        assert [(c["session_id"], c["version"]) for c in history] == [(closed, 4), (closed, 5), (live, 1)]
+
+    def test_suggestions_and_active_sessions(self, service):
+        session_id = service.create_collaboration_session("story-1", "ayse")["session_id"]
+        suggestion = service.add_suggestion(session_id, "mehmet", "Daha kısa olsun")
+
+        accepted = service.accept_suggestion(session_id, suggestion["suggestion_id"], "ayse")
+
+        assert accepted["status"] == "accepted"
+        assert [s["session_id"] for s in service.get_active_sessions("story-1")] == [session_id]
+        assert service.get_active_sessions("other") == []
+        with pytest.raises(ValueError):
+            service.accept_suggestion(session_id, "missing", "ayse")
@@ -0,0 +1,281 @@
+"""
+Unit tests for JSONDocumentStore
+
+Tests cover:
+- Keyed get/put/update/delete/scan on dict documents
+- Append/items on list documents
+- Atomic get_item/update_item/remove_items on list documents, merged by item id
+- Write-behind flushing to disk
+- mtime-based cache invalidation
+- Key-level merge with writes from another store on the same file
+- Flushes do not hold the store lock during disk I/O; failed flushes are retried
+- UserService atomic updates and user_id index
+- MarketService balance checks under concurrent spends, legacy file migration
+"""
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from app.core.document_store import JSONDocumentStore
+
+
+def _read_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestJSONDocumentStore:
+    """Tests for the shared JSON document store."""
+
+    def test_creates_file_with_default(self, tmp_path):
+        path = os.path.join(tmp_path, "likes.json")
+        JSONDocumentStore(path)
+
+        assert _read_file(path) == {}
+
+    def test_keyed_access(self, tmp_path):
+        store = JSONDocumentStore(os.path.join(tmp_path, "users.json"))
+
+        store.put("a", {"xp": 1})
+        store.update("a", lambda user: {**user, "xp": user["xp"] + 5})
+
+        assert store.get("a") == {"xp": 6}
+        assert store.get("missing", 0) == 0
+        assert [key for key, _ in store.scan(lambda user: user["xp"] > 5)] == ["a"]
+        assert store.delete("a") is True
+        assert store.delete("a") is False
+
+    def test_returned_values_are_copies(self, tmp_path):
+        store = JSONDocumentStore(os.path.join(tmp_path, "likes.json"))
+        store.put("story", ["u1"])
+
+        store.get("story").append("u2")
+
+        assert store.get("story") == ["u1"]
+
+    def test_flush_writes_pending_changes(self, tmp_path):
+        path = os.path.join(tmp_path, "likes.json")
+        store = JSONDocumentStore(path)
+        store.put("story", ["u1"])
+
+        store.flush()
+
+        assert _read_file(path) == {"story": ["u1"]}
+
+    def test_list_documents(self, tmp_path):
+        path = os.path.join(tmp_path, "tags.json")
+        store = JSONDocumentStore(path, default_factory=list)
+
+        store.append({"story_id": "a"})
+        store.append({"story_id": "b"})
+        store.flush()
+
+        assert store.items(lambda item: item["story_id"] == "b") == [{"story_id": "b"}]
+        assert len(_read_file(path)) == 2
+
+    def test_list_item_updates(self, tmp_path):
+        path = os.path.join(tmp_path, "schedules.json")
+        store = JSONDocumentStore(path, default_factory=list, item_key="schedule_id")
+        store.append({"schedule_id": "a", "done": False})
+        store.append({"schedule_id": "b", "done": False})
+
+        assert store.update_item("a", lambda item: {**item, "done": True}) == {"schedule_id": "a", "done": True}
+        assert store.update_item("missing", lambda item: item) is None
+        assert store.remove_items(lambda item: item["schedule_id"] == "b") == 1
+        store.flush()
+
+        assert store.get_item("a") == {"schedule_id": "a", "done": True}
+        assert store.get_item("b") is None
+        assert _read_file(path) == [{"schedule_id": "a", "done": True}]
+
+    def test_failed_item_mutation_leaves_item_unchanged(self, tmp_path):
+        store = JSONDocumentStore(os.path.join(tmp_path, "sessions.json"), default_factory=list, item_key="id")
+        store.append({"id": "s", "owner": "u1"})
+
+        def forbidden(item):
+            raise ValueError("not yours")
+
+        with pytest.raises(ValueError):
+            store.update_item("s", forbidden)
+
+        assert store.get_item("s") == {"id": "s", "owner": "u1"}
+
+    def test_concurrent_stores_merge_list_items_by_id(self, tmp_path):
+        path = os.path.join(tmp_path, "sessions.json")
+        first = JSONDocumentStore(path, default_factory=list, item_key="id")
+        first.append({"id": "a", "n": 0})
+        first.append({"id": "b", "n": 0})
+        first.append({"id": "c", "n": 0})
+        first.flush()
+        second = JSONDocumentStore(path, default_factory=list, item_key="id")
+
+        first.update_item("a", lambda item: {**item, "n": 1})
+        second.update_item("b", lambda item: {**item, "n": 2})
+        second.remove_items(lambda item: item["id"] == "c")
+        second.append({"id": "d", "n": 0})
+        first.flush()
+        second.flush()
+
+        assert _read_file(path) == [
+            {"id": "a", "n": 1},
+            {"id": "b", "n": 2},
+            {"id": "d", "n": 0},
+        ]
+
+    def test_external_change_invalidates_cache(self, tmp_path):
+        path = os.path.join(tmp_path, "likes.json")
+        store = JSONDocumentStore(path)
+        assert store.get("story") is None
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"story": ["u9"]}, f)
+        os.utime(path, ns=(1, 1))
+
+        assert store.get("story") == ["u9"]
+
+    def test_concurrent_stores_merge_by_key(self, tmp_path):
+        path = os.path.join(tmp_path, "likes.json")
+        first = JSONDocumentStore(path)
+        second = JSONDocumentStore(path)
+
+        first.put("a", ["u1"])
+        second.put("b", ["u2"])
+        first.flush()
+        second.flush()
+
+        assert _read_file(path) == {"a": ["u1"], "b": ["u2"]}
+
+    def test_update_of_missing_key_can_skip_the_write(self, tmp_path):
+        store = JSONDocumentStore(os.path.join(tmp_path, "sessions.json"))
+
+        assert store.update("gone", lambda session: session) is None
+
+        assert store.contains("gone") is False
+
+    def test_writes_proceed_while_flush_is_on_disk(self, tmp_path, monkeypatch):
+        path = os.path.join(tmp_path, "likes.json")
+        store = JSONDocumentStore(path)
+        store.put("a", ["u1"])
+        syncing, release = threading.Event(), threading.Event()
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            syncing.set()
+            release.wait(2)
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", slow_fsync)
+        flusher = threading.Thread(target=store.flush)
+        flusher.start()
+        assert syncing.wait(2)
+
+        store.put("b", ["u2"])  # the store lock is free during fsync
+        assert store.get("a") == ["u1"]
+        release.set()
+        flusher.join()
+
+        assert _read_file(path) == {"a": ["u1"]}
+        store.flush()
+        assert _read_file(path) == {"a": ["u1"], "b": ["u2"]}
+
+    def test_failed_flush_keeps_changes_pending(self, tmp_path, monkeypatch):
+        path = os.path.join(tmp_path, "likes.json")
+        store = JSONDocumentStore(path)
+        store.put("a", ["u1"])
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        with pytest.raises(OSError):
+            store.flush()
+        monkeypatch.undo()
+        store.flush()
+
+        assert _read_file(path) == {"a": ["u1"]}
+
+
+class TestUserService:
+    """Tests for UserService on the document store."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.core.leaderboard_store import LeaderboardStore
+        from app.services.user_service import UserService
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.user_service.leaderboards", LeaderboardStore(backend="memory"))
+        return UserService()
+
+    def test_concurrent_updates_are_not_lost(self, service):
+        user_id = service.register_user("device-1", name="Ayşe")["user_id"]
+
+        threads = [threading.Thread(target=service.add_xp, args=(user_id, 10)) for _ in range(20)]
+        threads += [threading.Thread(target=service.update_user, args=(user_id, {"bio": "Masalcı"}))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        user = service.get_user(user_id)
+        assert user["xp"] == 200 and user["level"] == 2 and user["bio"] == "Masalcı"
+        assert service.record_activity(user_id)["streak_increased"] is True
+        assert "streak_increased" not in service.record_activity(user_id)
+
+    def test_lookup_uses_the_device_index(self, service, monkeypatch):
+        user_id = service.register_user("device-1")["user_id"]
+        # Registered by another worker: not in this process's index yet
+        service.store.put("device-2", {"user_id": "u2", "device_id": "device-2", "name": "Mehmet"})
+
+        assert service.get_user("u2")["name"] == "Mehmet"
+        assert service.update_user("missing", {"bio": "x"}) is None
+
+        monkeypatch.setattr(service.store, "scan", lambda *args: pytest.fail("full scan"))
+        assert service.get_user(user_id)["device_id"] == "device-1"
+        assert service.add_xp("u2", 5)["xp"] == 5
+
+
+class TestMarketService:
+    """Tests for MarketService on the document store."""
+
+    def test_concurrent_spends_never_overdraw(self, tmp_path, monkeypatch):
+        from app.services.market_service import MarketService
+
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("data")
+        service = MarketService()
+        asyncio.run(service.add_credits("u1", 40))  # 10 hediye + 40
+
+        results = []
+
+        def spend():
+            results.append(asyncio.run(service.spend_credits("u1", 10, "sticker")))
+
+        threads = [threading.Thread(target=spend) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 5
+        assert asyncio.run(service.get_user_balance("u1")) == 0
+        assert len(service.transactions_store.items(lambda t: t["type"] == "purchase")) == 5
+
+    def test_legacy_market_file_is_migrated(self, tmp_path, monkeypatch):
+        from app.services.market_service import MarketService
+
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("data")
+        legacy = {"users": {"u1": {"credits": 120, "is_premium": False}}, "transactions": [{"user_id": "u1"}]}
+        with open("data/market_data.json", "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        service = MarketService()
+
+        assert asyncio.run(service.upgrade_to_premium("u1")) is True
+        assert asyncio.run(service.get_user_premium_status("u1")) is True
+        assert len(service.transactions_store.items()) == 2
@@ -0,0 +1,130 @@
+"""
+Unit tests for the embedding backfill and the query-embedding cache
+
+Tests cover:
+- Batched, concurrent backfill: batch sizes, requests in flight, index updates
+- Checkpoint written after every batch and resume from it
+- Failed batches retried, then recorded without stopping the run
+- Query cache normalization, LRU eviction and TTL
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from app.services.search_service import EmbeddingBackfill, QueryEmbeddingCache
+from app.services.story_vector_index import StoryVectorIndex
+
+DIM = 8
+
+
+class MemoryBackfill(EmbeddingBackfill):
+    """Backfill over an in-memory story table instead of the database."""
+
+    def __init__(self, stories, **kwargs):
+        super().__init__(db=None, **kwargs)
+        self.stories = stories
+        self.stored = {}
+
+    def fetch(self, after_id, limit):
+        rows = [s for s in self.stories if (after_id is None or s[0] > after_id) and s[0] not in self.stored]
+        return rows[:limit]
+
+    def store(self, rows, vectors):
+        for row, vector in zip(rows, vectors):
+            self.stored[row[0]] = vector
+
+
+def _stories(n):
+    return [(f"id-{i:04d}", f"hikaye {i}", "tr" if i % 2 else "en", "masal") for i in range(n)]
+
+
+class FakeEmbedder:
+    def __init__(self, delay=0.01, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, texts):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on & set(texts):
+                raise RuntimeError("quota exceeded")
+            self.batches.append(len(texts))
+            return [[float(len(t))] + [1.0] * (DIM - 1) for t in texts]
+        finally:
+            self.in_flight -= 1
+
+
+class TestBackfill:
+    """Tests for EmbeddingBackfill."""
+
+    @pytest.mark.asyncio
+    async def test_batches_run_concurrently_and_fill_index(self, tmp_path):
+        embedder = FakeEmbedder()
+        index = StoryVectorIndex(str(tmp_path / "idx"), DIM)
+        job = MemoryBackfill(_stories(95), embed_batch=embedder, index=index, batch_size=10, concurrency=4)
+
+        report = await job.run()
+
+        assert report["updated"] == report["processed"] == 95 and report["batches"] == 10
+        assert sorted(embedder.batches) == [5] + [10] * 9
+        assert embedder.max_in_flight == 4
+        assert len(job.stored) == 95 and len(index) == 95
+        assert [sid for sid, _ in index.search(np.ones(DIM), k=3, language="tr")][0].startswith("id-")
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_and_resume(self, tmp_path):
+        checkpoint = tmp_path / "backfill.json"
+        stories = _stories(50)
+        first = MemoryBackfill(stories, embed_batch=FakeEmbedder(), batch_size=10, concurrency=2,
+                               checkpoint_path=str(checkpoint), max_stories=20)
+        await first.run()
+        saved = json.loads(checkpoint.read_text())
+        assert saved["last_id"] == "id-0019" and saved["processed"] == 20
+
+        embedder = FakeEmbedder()
+        second = MemoryBackfill(stories, embed_batch=embedder, batch_size=10, concurrency=2,
+                                checkpoint_path=str(checkpoint))
+        report = await second.run(resume=True)
+
+        assert sum(embedder.batches) == 30 and min(second.stored) == "id-0020"
+        assert report["processed"] == 50 and report["last_id"] == "id-0049"
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_recorded_and_run_continues(self, tmp_path):
+        embedder = FakeEmbedder(delay=0, fail_on={"hikaye 12"})
+        job = MemoryBackfill(_stories(30), embed_batch=embedder, batch_size=10, concurrency=3,
+                             retries=1, retry_delay=0, checkpoint_path=str(tmp_path / "cp.json"))
+
+        report = await job.run()
+
+        assert report["updated"] == 20 and report["processed"] == 30
+        assert report["failed_ids"] == [f"id-{i:04d}" for i in range(10, 20)]
+        assert report["last_id"] == "id-0029"
+
+
+class TestQueryEmbeddingCache:
+    """Tests for the query-embedding cache."""
+
+    def test_normalized_keys_lru_and_ttl(self, monkeypatch):
+        cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+        cache.set("m", "Uzay  Macerası", [1.0])
+
+        assert cache.get("m", "uzay macerası") == [1.0]
+        assert cache.get("other-model", "uzay macerası") is None
+
+        cache.set("m", "ejderha", [2.0])
+        cache.get("m", "uzay macerası")
+        cache.set("m", "deniz", [3.0])  # en az kullanılan "ejderha" düşer
+        assert cache.get("m", "ejderha") is None and len(cache) == 2
+
+        import app.services.search_service as search_service
+        now = search_service.time.monotonic()
+        monkeypatch.setattr(search_service.time, "monotonic", lambda: now + 61)
+        assert cache.get("m", "deniz") is None
@@ -0,0 +1,169 @@
+"""
+Unit tests for content-hashed PDF/EPUB export artifacts
+
+Tests cover:
+- Repeat exports reuse the stored artifact; edits produce a new one
+- Rendering in a real process pool, concurrent requests share one render
+- Story images are resolved from storage without HTTP; cloud-only images are
+  fetched once and their content is part of the artifact key
+- Image downloads share one pooled client per event loop and log failures
+- Collection ebooks and failed renders leaving no partial files
+"""
+import asyncio
+import os
+import zipfile
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import export_engine, export_service, image_derivatives
+from app.services.ebook_service import EbookService
+from app.services.export_engine import ExportArtifactStore, local_image_path
+from app.services.export_service import ExportService
+
+
+def _story(story_id="s1", **extra):
+    return {
+        "story_id": story_id,
+        "theme": "Ejderha",
+        "story_text": "Bir varmış bir yokmuş.\n\nKüçük bir ejderha varmış.",
+        "created_at": "2024-01-01T00:00:00",
+        **extra,
+    }
+
+
+def _file(storage, url):
+    return os.path.join(storage, url.removeprefix("/storage/"))
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_WORKERS", 0)
+    return tmp_path
+
+
+class TestExportService:
+    """Tests for ExportService PDF/EPUB exports."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_export_reuses_artifact(self, storage):
+        service = ExportService()
+        first = await service.export_to_pdf(_story())
+        path = _file(storage, first)
+        mtime = os.stat(path).st_mtime_ns
+
+        assert await service.export_to_pdf(_story()) == first
+        assert os.stat(path).st_mtime_ns == mtime
+        assert open(path, "rb").read(5) == b"%PDF-"
+
+        edited = await service.export_to_pdf(_story(story_text="Başka bir masal."))
+        assert edited != first
+
+        epub_path = await service.export_to_epub(_story())
+        assert epub_path.endswith(".epub") and await service.export_to_epub(_story()) == epub_path
+        with zipfile.ZipFile(_file(storage, epub_path)) as book:
+            assert any("Küçük bir ejderha" in book.read(name).decode("utf-8")
+                       for name in book.namelist() if name.endswith("chapter.xhtml"))
+
+    @pytest.mark.asyncio
+    async def test_process_pool_and_concurrent_requests(self, storage, monkeypatch):
+        monkeypatch.setattr(settings, "EXPORT_WORKERS", 1)
+        service = ExportService()
+        try:
+            paths = await asyncio.gather(*(service.export_to_pdf(_story()) for _ in range(3)))
+        finally:
+            export_engine.shutdown_export_executor()
+
+        assert len(set(paths)) == 1
+        assert sorted(os.listdir(storage / "exports")) == [os.path.basename(paths[0])]
+
+
+class TestImages:
+    """Tests for reading story images straight from storage."""
+
+    def test_local_image_path(self, storage):
+        (storage / "images").mkdir()
+        (storage / "images" / "a.png").write_bytes(b"png")
+
+        assert local_image_path("/storage/images/a.png") == str((storage / "images" / "a.png").resolve())
+        assert local_image_path("http://localhost:8000/storage/images/a.png").endswith("a.png")
+        assert local_image_path("/storage/images/missing.png") is None
+        assert local_image_path("/storage/../etc/passwd") is None
+        assert local_image_path(None) is None
+
+
+class TestRemoteImages:
+    """Tests for PDF exports of images that only exist in cloud storage."""
+
+    @pytest.mark.asyncio
+    async def test_cloud_image_is_fetched_and_keyed(self, storage, monkeypatch):
+        monkeypatch.setattr(image_derivatives, "_store", None)
+        responses = [None, b"legacy-image"]
+        monkeypatch.setattr(export_engine, "_download", lambda url: asyncio.sleep(0, responses[0]))
+        rendered = []
+
+        def fake_render(content, image_path, output_path):
+            rendered.append(image_path and open(image_path, "rb").read())
+            open(output_path, "wb").write(b"%PDF-")
+
+        monkeypatch.setattr(export_service, "render_story_pdf", fake_render)
+        service = ExportService()
+        story = _story(image_url="https://cdn.example.com/stories/5f1c2a9e-legacy.png")
+
+        imageless = await service.export_to_pdf(story)
+        responses.pop(0)
+        with_image = await service.export_to_pdf(story)
+
+        assert with_image != imageless
+        assert await service.export_to_pdf(story) == with_image
+        assert rendered == [None, b"legacy-image"]
+
+    @pytest.mark.asyncio
+    async def test_downloads_share_a_pooled_client(self, monkeypatch, caplog):
+        def handler(request):
+            if request.url.path == "/ok.png":
+                return httpx.Response(200, content=b"png")
+            return httpx.Response(404)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setitem(export_engine._download_clients, asyncio.get_running_loop(), client)
+
+        assert export_engine._download_client() is client
+        assert await export_engine._download("https://cdn.example.com/ok.png") == b"png"
+        assert await export_engine._download("https://cdn.example.com/missing.png") is None
+        assert "Görsel indirilemedi (404)" in caplog.text
+        assert export_engine._download_client() is client
+        await client.aclose()
+
+
+class TestEbookService:
+    """Tests for EbookService collection ebooks."""
+
+    @pytest.mark.asyncio
+    async def test_collection_is_rendered_once(self, storage):
+        service = EbookService()
+        for i in range(3):
+            service.story_storage.save_story(_story(f"s{i}", theme=f"Tema {i}"))
+
+        first = await service.create_collection_ebook(["s0", "s1", "missing", "s2"], "Koleksiyon")
+        again = await service.create_collection_ebook(["s0", "s1", "missing", "s2"], "Koleksiyon")
+
+        assert again["ebook_id"] == first["ebook_id"] and first["story_count"] == 4
+        with zipfile.ZipFile(_file(storage, first["file_path"])) as book:
+            chapters = [name for name in book.namelist() if "chapter_" in name]
+        assert len(chapters) == 3
+        assert (await service.create_epub("s0"))["ebook_id"] != first["ebook_id"]
+
+    @pytest.mark.asyncio
+    async def test_failed_render_leaves_no_file(self, storage):
+        store = ExportArtifactStore(str(storage / "out"))
+
+        def broken(output_path):
+            open(output_path, "wb").write(b"half")
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            await store.render("k", "pdf", broken)
+        assert os.listdir(storage / "out") == []
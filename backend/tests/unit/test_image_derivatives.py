@@ -0,0 +1,151 @@
+"""
+Unit tests for the responsive image derivative pipeline
+
+Tests cover:
+- Ingest: content-addressed original, every width/format rendered, no upscaling
+- Rendering in a real process pool
+- Lazy generation of a missing size and rejection of unknown sizes / digests
+- Digest extraction from local and cloud URLs, srcset fields
+- Route serves derivatives with immutable cache headers
+"""
+import importlib
+import io
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import image_router
+from app.services import image_derivatives
+from app.services.image_derivatives import ImageDerivativeStore, content_digest, digest_from_url
+
+
+def _load_real_pillow():
+    """conftest replaces PIL with a MagicMock; the renderer needs the real Pillow."""
+    is_pil = lambda name: name == "PIL" or name.startswith("PIL.")
+    mocked = {name: sys.modules.pop(name) for name in list(sys.modules) if is_pil(name)}
+    try:
+        importlib.import_module("PIL.Image")
+        importlib.import_module("PIL.features")
+        importlib.import_module("PIL.ImageFile")
+        return {name: module for name, module in sys.modules.items() if is_pil(name)}
+    finally:
+        for name in [name for name in sys.modules if is_pil(name)]:
+            del sys.modules[name]
+        sys.modules.update(mocked)
+
+
+REAL_PILLOW = _load_real_pillow()
+Image = REAL_PILLOW["PIL.Image"]
+
+
+@pytest.fixture(autouse=True)
+def real_pillow(monkeypatch):
+    # Pillow alt modülleri çağrı anında içe aktarır: test boyunca gerçek modüller kayıtlı kalsın
+    for name, module in REAL_PILLOW.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(image_derivatives, "Image", Image)
+    monkeypatch.setattr(image_derivatives, "features", REAL_PILLOW["PIL.features"])
+
+
+def _png(size=(800, 600), mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color=(200, 120, 40, 128)[: len(mode)]).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageDerivativeStore(str(tmp_path / "derived"), widths=[160, 320, 1024], formats=["webp"], workers=0)
+
+
+class TestIngest:
+    """Tests for ImageDerivativeStore.ingest."""
+
+    @pytest.mark.asyncio
+    async def test_renders_all_sizes_without_upscaling(self, store):
+        data = _png()
+        digest = await store.ingest(data)
+
+        assert digest == content_digest(data)
+        assert store.original_path(digest).endswith("original.png")
+        widths = {}
+        for width in (160, 320, 1024):
+            with Image.open(os.path.join(store._dir(digest), f"{width}w.webp")) as img:
+                widths[width] = img.size
+        assert widths == {160: (160, 120), 320: (320, 240), 1024: (800, 600)}
+
+    @pytest.mark.asyncio
+    async def test_process_pool_and_alpha(self, tmp_path):
+        store = ImageDerivativeStore(str(tmp_path), widths=[64], formats=["webp"], workers=1)
+        try:
+            digest = await store.ingest(_png((128, 128), mode="RGBA"))
+        finally:
+            store.shutdown()
+        with Image.open(os.path.join(store._dir(digest), "64w.webp")) as img:
+            assert img.size == (64, 64) and img.mode == "RGBA"
+
+
+class TestResolve:
+    """Tests for lazy generation and request validation."""
+
+    @pytest.mark.asyncio
+    async def test_missing_size_is_generated_on_request(self, store):
+        digest = await store.ingest(_png())
+        path = os.path.join(store._dir(digest), "320w.webp")
+        os.remove(path)
+
+        assert await store.resolve(digest, "320w.webp") == path
+        assert os.path.exists(path)
+        assert await store.resolve(digest, "original.png") == store.original_path(digest)
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_sizes_and_digests(self, store):
+        digest = await store.ingest(_png())
+
+        assert await store.resolve(digest, "333w.webp") is None
+        assert await store.resolve(digest, "320w.gif") is None
+        assert await store.resolve(digest, "../original.png") is None
+        assert await store.resolve("0" * 32, "320w.webp") is None
+        assert await store.resolve("..", "320w.webp") is None
+
+
+class TestUrls:
+    """Tests for digest extraction and srcset fields."""
+
+    @pytest.mark.asyncio
+    async def test_srcsets_for_url(self, store):
+        digest = await store.ingest(_png())
+
+        assert digest_from_url(f"/storage/images/{digest}.png") == digest
+        assert digest_from_url(f"https://x.supabase.co/storage/v1/object/public/images/stories/story_{digest}.webp?") == digest
+        assert digest_from_url("/storage/images/0b5c7c1e-7f0e-4f43-9e1a-1d2c3b4a5f60.png") is None
+        assert digest_from_url(None) is None
+
+        fields = store.srcsets_for_url(f"/storage/images/{digest}.png")
+        assert fields["image_srcset"] == (
+            f"/api/images/{digest}/160w.webp 160w, /api/images/{digest}/320w.webp 320w, "
+            f"/api/images/{digest}/1024w.webp 1024w"
+        )
+        assert fields["image_srcset_avif"] is None
+        assert store.srcsets_for_url("/storage/images/legacy.png") == {"image_srcset": None, "image_srcset_avif": None}
+
+
+class TestRoute:
+    """Tests for GET /api/images/{digest}/{name}."""
+
+    @pytest.mark.asyncio
+    async def test_serves_with_immutable_cache_headers(self, store, monkeypatch):
+        digest = await store.ingest(_png())
+        monkeypatch.setattr(image_derivatives, "_store", store)
+        app = FastAPI()
+        app.include_router(image_router.router, prefix="/api/images")
+        client = TestClient(app)
+
+        response = client.get(f"/api/images/{digest}/160w.webp")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert client.get(f"/api/images/{digest}/999w.webp").status_code == 404
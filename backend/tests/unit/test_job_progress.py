@@ -0,0 +1,201 @@
+"""
+Unit tests for the coalescing job progress bus
+
+Tests cover:
+- Bursts of updates reach sockets and storage as a few deliveries of the latest state
+- Stage results survive coalescing
+- Terminal states are delivered synchronously; failed sinks are retried
+- The state cache reconnects to Redis after a backoff and drops stale keys
+- GET /jobs/{job_id} answers from the hot state cache
+"""
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.core.job_progress import JobProgressBus, JobStateCache, socket_payload
+from app.models import JobStatus
+from app.routers import story as story_router
+
+
+class Recorder:
+    def __init__(self, fail_times=0):
+        self.states = []
+        self.fail_times = fail_times
+        self.lock = threading.Lock()
+
+    def __call__(self, state):
+        with self.lock:
+            if self.fail_times:
+                self.fail_times -= 1
+                raise ConnectionError("db down")
+            self.states.append(state)
+
+
+def _bus(emitted, persisted, **kwargs):
+    return JobProgressBus(
+        emitters=[emitted],
+        persisters=[persisted],
+        state_cache=JobStateCache(backend="memory"),
+        emit_interval=kwargs.pop("emit_interval", 0.05),
+        persist_interval=kwargs.pop("persist_interval", 0.2),
+    )
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestCoalescing:
+    """Tests for rate-bounded, latest-state delivery."""
+
+    def test_burst_is_coalesced(self):
+        emitted, persisted = Recorder(), Recorder()
+        bus = _bus(emitted, persisted)
+        try:
+            for percent in range(1, 101):
+                bus.publish("job-1", JobStatus.RUNNING, percent=percent, message=f"adım {percent}")
+            _wait(lambda: persisted.states and persisted.states[-1]["percent"] == 100)
+        finally:
+            bus.close()
+
+        assert emitted.states[-1]["percent"] == 100
+        assert len(emitted.states) <= 5 and len(persisted.states) <= 3
+        assert bus.state("job-1")["version"] == 100
+
+    def test_stage_results_survive_coalescing(self):
+        emitted, persisted = Recorder(), Recorder()
+        bus = _bus(emitted, persisted, emit_interval=10)
+        bus.publish("job-1", "running", percent=40, data={"stage": "image", "state": "done", "image_url": "i.png"})
+        bus.publish("job-1", "running", percent=60, data={"stage": "audio", "state": "started"})
+        bus.publish("job-1", "running", percent=80, data={"stage": "audio", "state": "done", "audio_url": "a.mp3"})
+        bus.flush("job-1")
+
+        payload = socket_payload(emitted.states[-1])
+        assert payload["status"] == "RUNNING" and payload["percent"] == 80
+        assert payload["stages"]["image"]["image_url"] == "i.png"
+        assert payload["stages"]["audio"] == {"stage": "audio", "state": "done", "audio_url": "a.mp3"}
+
+
+class TestDelivery:
+    """Tests for terminal states and sink failures."""
+
+    def test_terminal_state_is_delivered_synchronously(self):
+        emitted, persisted = Recorder(), Recorder()
+        bus = _bus(emitted, persisted, emit_interval=10, persist_interval=10)
+        bus.publish("job-1", JobStatus.RUNNING, percent=5, message="Başlatılıyor...", celery_task_id="c1")
+        bus.publish("job-1", JobStatus.SUCCEEDED, message="Tamamlandı", result_data={"story_id": "s1"})
+
+        final = persisted.states[-1]
+        assert final["status"] == "succeeded" and final["percent"] == 100
+        assert final["celery_task_id"] == "c1" and final["completed_at"]
+        assert "job-1" not in bus._jobs
+
+    def test_failed_sink_is_retried_with_latest_state(self):
+        emitted, persisted = Recorder(), Recorder(fail_times=1)
+        bus = _bus(emitted, persisted, persist_interval=0.05)
+        try:
+            bus.publish("job-1", JobStatus.RUNNING, percent=10)
+            bus.publish("job-1", JobStatus.RUNNING, percent=20)
+            _wait(lambda: persisted.states)
+        finally:
+            bus.close()
+
+        assert [s["percent"] for s in persisted.states] == [20]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.fail_writes = False
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def setex(self, key, ttl, value):
+        if self.fail_writes:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def delete(self, *keys):
+        self.ops.append(("delete", keys))
+
+    def setex(self, *args):
+        self.ops.append(("setex", args))
+
+    def execute(self):
+        for name, args in self.ops:
+            getattr(self.client, name)(*args)
+
+
+class TestStateCache:
+    """Tests for JobStateCache reconnects and stale entries."""
+
+    def test_reconnects_after_backoff_and_drops_stale_keys(self, monkeypatch):
+        redis = FakeRedis()
+        attempts = []
+
+        def connect():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("redis starting")
+            return redis
+
+        cache = JobStateCache(retry_seconds=0.05)
+        monkeypatch.setattr(cache, "_connect", connect)
+        redis.data["job_state:job-1"] = '{"job_id": "job-1", "percent": 5}'
+
+        cache.set({"job_id": "job-1", "percent": 40})  # Redis yok: süreç içi yedek
+        assert cache.get("job-1")["percent"] == 40
+        time.sleep(0.06)
+        cache.set({"job_id": "job-2", "percent": 10})
+
+        assert len(attempts) == 2
+        assert "job_state:job-1" not in redis.data  # eski kayıt DB'yi gölgelemez
+        assert cache.get("job-2")["percent"] == 10
+
+    def test_failed_write_deletes_key(self):
+        redis = FakeRedis()
+        cache = JobStateCache(client=redis, retry_seconds=60)
+        cache.set({"job_id": "job-1", "percent": 5})
+        redis.fail_writes = True
+
+        cache.set({"job_id": "job-1", "percent": 40})
+
+        assert "job_state:job-1" not in redis.data
+
+
+class TestJobStatusEndpoint:
+    """Tests for GET /jobs/{job_id} reading the hot state."""
+
+    def test_reads_hot_state_without_database(self, monkeypatch):
+        bus = _bus(Recorder(), Recorder(), emit_interval=10, persist_interval=10)
+        monkeypatch.setattr(story_router, "job_progress", bus)
+        job_id = str(uuid.uuid4())
+
+        bus.publish(job_id, JobStatus.RUNNING, percent=35, message="Görsel üretiliyor...")
+        running = story_router.get_job_status(job_id, db=None)
+        assert running.status == "running" and running.message == "Görsel üretiliyor... (%35)"
+
+        bus.publish(job_id, JobStatus.SUCCEEDED, message="Tamamlandı", result_data={
+            "story_id": "s1", "image_url": "/storage/images/s1.png", "audio_url": "/storage/audio/s1.mp3",
+        })
+        done = story_router.get_job_status(job_id, db=None)
+        assert done.story_id == "s1" and done.audio_url == "/storage/audio/s1.mp3"
@@ -0,0 +1,199 @@
+"""
+Unit tests for incremental leaderboards
+
+Tests cover:
+- In-process sorted set ordering, rank and range
+- Seeding, re-seeding and incremental updates on the memory backend
+- Fallback when Redis is unreachable
+- Redis updates issued from the event loop run off-loop and in order
+- LeaderboardService wiring: story save/delete, like/unlike and add_xp
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.leaderboard_store import (
+    LIKES_BOARD, STORIES_BOARD, XP_BOARD, LeaderboardStore, MemorySortedSet,
+)
+
+
+class TestMemorySortedSet:
+    """Tests for the in-process sorted set."""
+
+    def test_order_rank_and_range(self):
+        board = MemorySortedSet()
+        board.set("a", 5)
+        board.set("b", 9)
+        board.incr("c", 7)
+        board.incr("a", 5)
+
+        assert board.range(0, 10) == [("a", 10), ("b", 9), ("c", 7)]
+        assert board.rank("b") == 1
+        assert board.rank("missing") is None
+        assert board.range(1, 1) == [("b", 9)]
+
+        board.remove("a")
+        assert board.rank("b") == 0 and len(board) == 2
+
+
+class TestLeaderboardStore:
+    """Tests for the store on the memory backend."""
+
+    def test_seed_then_incremental_updates(self):
+        store = LeaderboardStore(backend="memory", reseed_seconds=3600)
+        store.incr(STORIES_BOARD, "u1", 1)  # before seeding: left to the loader
+
+        store.ensure_seeded(STORIES_BOARD, lambda: {"u1": 2, "u2": 1})
+        store.incr(STORIES_BOARD, "u2", 2)
+        store.incr(STORIES_BOARD, "u1", -2)
+
+        assert store.top(STORIES_BOARD, 10) == [("u2", 3)]
+        assert store.rank(STORIES_BOARD, "u1") is None
+
+    def test_reseed_after_interval(self):
+        store = LeaderboardStore(backend="memory", reseed_seconds=0)
+        store.ensure_seeded(XP_BOARD, lambda: {"u1": 10})
+        store.ensure_seeded(XP_BOARD, lambda: {"u1": 10, "u2": 50})
+
+        assert store.top(XP_BOARD, 1) == [("u2", 50)]
+
+    def test_around(self):
+        store = LeaderboardStore(backend="memory", reseed_seconds=3600)
+        store.ensure_seeded(XP_BOARD, lambda: {f"u{i}": i for i in range(1, 11)})
+
+        rank, entries = store.around(XP_BOARD, "u5", 2)
+
+        assert rank == 5
+        assert [member for member, _ in entries] == ["u7", "u6", "u5", "u4", "u3"]
+
+    def test_falls_back_when_redis_unreachable(self):
+        store = LeaderboardStore(redis_url="redis://127.0.0.1:1/0", backend="auto")
+        assert store.using_redis is False
+
+        with pytest.raises(Exception):
+            LeaderboardStore(redis_url="redis://127.0.0.1:1/0", backend="redis").using_redis
+
+
+class SlowRedis:
+    """Blocking stand-in for the synchronous Redis client."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.scores = {}
+        self.threads = set()
+
+    def zincrby(self, key, delta, member):
+        time.sleep(self.delay)
+        self.threads.add(threading.get_ident())
+        board = self.scores.setdefault(key, {})
+        board[member] = board.get(member, 0) + delta
+        return board[member]
+
+    def zadd(self, key, mapping):
+        time.sleep(self.delay)
+        self.threads.add(threading.get_ident())
+        self.scores.setdefault(key, {}).update(mapping)
+
+
+class TestEventLoopUpdates:
+    """Tests for updates issued from async code."""
+
+    def test_updates_do_not_block_the_loop(self):
+        client = SlowRedis(delay=0.05)
+        store = LeaderboardStore(client=client)
+
+        async def handler():
+            started = time.perf_counter()
+            for _ in range(10):
+                store.incr(STORIES_BOARD, "u1", 1)
+            store.set(XP_BOARD, "u1", 40)
+            store.set(XP_BOARD, "u1", 90)
+            return time.perf_counter() - started, threading.get_ident()
+
+        elapsed, loop_thread = asyncio.run(handler())
+        store._writer.shutdown(wait=True)
+
+        assert elapsed < 0.05
+        assert loop_thread not in client.threads
+        assert client.scores == {"leaderboard:stories": {"u1": 10}, "leaderboard:xp": {"u1": 90}}
+
+    def test_sync_callers_write_inline(self):
+        client = SlowRedis(delay=0)
+        store = LeaderboardStore(client=client)
+
+        store.incr(STORIES_BOARD, "u1", 1)
+
+        assert client.scores == {"leaderboard:stories": {"u1": 1}}
+        assert store._writer is None
+
+
+class TestLeaderboardService:
+    """Tests for the service and the write-path hooks."""
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        store = LeaderboardStore(backend="memory", reseed_seconds=3600)
+        for module in ("app.services.story_storage", "app.services.like_service", "app.services.user_service"):
+            monkeypatch.setattr(f"{module}.leaderboards", store)
+
+        from app.services.leaderboard_service import LeaderboardService
+
+        service = LeaderboardService(store=store)
+        users = {
+            name: service.user_service.register_user(f"device-{name}", name=name)["user_id"]
+            for name in ("Ayşe", "Mehmet")
+        }
+        return service, users
+
+    def test_boards_follow_writes(self, env):
+        service, users = env
+        ayse, mehmet = users["Ayşe"], users["Mehmet"]
+        storage = service.story_storage
+
+        storage.save_story({"story_id": "s1", "user_id": ayse, "theme": "a"})
+        assert service.get_stories_leaderboard() == [{"rank": 1, "user_id": ayse, "name": "Ayşe", "count": 1}]
+
+        storage.save_story({"story_id": "s2", "user_id": mehmet, "theme": "b"})
+        storage.save_story({"story_id": "s3", "user_id": mehmet, "theme": "c"})
+        storage.save_story({"story_id": "s3", "user_id": mehmet, "theme": "c2"})  # update, not a new story
+        assert [(e["name"], e["count"]) for e in service.get_stories_leaderboard()] == [("Mehmet", 2), ("Ayşe", 1)]
+
+        service.get_likes_leaderboard()
+        service.like_service.like_story("s1", "reader-1")
+        service.like_service.like_story("s1", "reader-2")
+        service.like_service.like_story("s2", "reader-1")
+        service.like_service.like_story("s1", "reader-2")  # unlike
+        assert sorted((e["name"], e["count"]) for e in service.get_likes_leaderboard()) == [("Ayşe", 1), ("Mehmet", 1)]
+
+        service.get_xp_leaderboard()
+        service.user_service.add_xp(mehmet, 250)
+        assert service.get_xp_leaderboard()[0] == {
+            "rank": 1, "user_id": mehmet, "name": "Mehmet", "xp": 250, "level": 2,
+        }
+
+        storage.delete_story("s2")
+        assert service.get_user_rank(STORIES_BOARD, mehmet)["score"] == 1
+        assert service.get_user_rank(LIKES_BOARD, mehmet)["rank"] is None
+
+    def test_seed_from_existing_data_and_around(self, env):
+        service, users = env
+        ayse, mehmet = users["Ayşe"], users["Mehmet"]
+        service.story_storage.save_story({"story_id": "s1", "user_id": ayse})
+        service.like_service.like_story("s1", "reader-1")
+        service.user_service.add_xp(ayse, 40)
+        service.user_service.add_xp(mehmet, 90)
+
+        service.rebuild()
+
+        assert service.get_likes_leaderboard() == [{"rank": 1, "user_id": ayse, "name": "Ayşe", "count": 1}]
+        around = service.get_around_user(XP_BOARD, ayse, radius=1)
+        assert around["rank"] == 2
+        assert [e["name"] for e in around["leaderboard"]] == ["Mehmet", "Ayşe"]
+
+        with pytest.raises(ValueError):
+            service.get_leaderboard("unknown")
@@ -0,0 +1,162 @@
+"""
+Unit tests for the LLM response cache
+
+Tests cover:
+- Key stability and sensitivity to model, messages and sampling parameters
+- Byte-budget LRU eviction
+- Memory and Redis tiers
+- Gateway cache policy (deterministic calls cached, creative calls bypass)
+- Service transforms are cached per service namespace
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from app.core.llm_cache import LLMResponseCache, _SizedLRU
+from app.core.llm_gateway import LLMGateway
+
+
+class FakeRedisCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=300):
+        self.data[key] = value
+
+
+def _completion(text):
+    return ChatCompletion.model_validate({
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": text},
+        }],
+    })
+
+
+MESSAGES = [{"role": "user", "content": "Bu hikâyenin okunabilirliğini analiz et"}]
+
+
+class TestLLMResponseCache:
+    """Tests for the two-tier response cache."""
+
+    def test_key_is_stable_and_parameter_sensitive(self):
+        key = LLMResponseCache.make_key("gpt-4", MESSAGES, {"temperature": 0.3})
+
+        assert key == LLMResponseCache.make_key("gpt-4", MESSAGES, {"temperature": 0.3, "timeout": 5})
+        assert key != LLMResponseCache.make_key("gpt-4", MESSAGES, {"temperature": 0.5})
+        assert key != LLMResponseCache.make_key("gpt-3.5-turbo", MESSAGES, {"temperature": 0.3})
+        assert key != LLMResponseCache.make_key("gpt-4", MESSAGES, {"temperature": 0.3}, namespace="other")
+
+    def test_sized_lru_evicts_oldest(self):
+        lru = _SizedLRU(max_bytes=40)
+        lru.set("a", "x" * 10)
+        lru.set("b", "y" * 10)
+        lru.get("a")
+        lru.set("c", "z" * 10)
+        lru.set("d", "w" * 10)
+        lru.set("e", "v" * 10)
+
+        assert lru.get("b") is None
+        assert lru.get("a") is not None
+        assert lru.current_bytes <= 40
+
+    def test_sized_lru_skips_oversized_entries(self):
+        lru = _SizedLRU(max_bytes=40)
+        lru.set("big", "x" * 20)
+
+        assert lru.get("big") is None
+        assert len(lru) == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_promoted_to_memory(self):
+        redis_cache = FakeRedisCache()
+        cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60, redis_cache=redis_cache)
+        redis_cache.data["llm:v1:k"] = {"answer": 42}
+
+        assert await cache.get("llm:v1:k") == {"answer": 42}
+        redis_cache.data.clear()
+        assert await cache.get("llm:v1:k") == {"answer": 42}
+        assert await cache.get("llm:v1:missing") is None
+
+
+class TestGatewayCaching:
+    """Tests for cache policy in LLMGateway.chat_completion."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_call_is_served_from_cache(self):
+        gateway = LLMGateway(api_key="k", model_timeouts={})
+        cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60, redis_cache=FakeRedisCache())
+        create = AsyncMock(return_value=_completion("analiz"))
+
+        with patch("app.core.llm_gateway.llm_response_cache", cache), \
+                patch.object(gateway.client.chat.completions, "create", create):
+            first = await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.3)
+            second = await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.3)
+
+        assert create.await_count == 1
+        assert second.choices[0].message.content == first.choices[0].message.content == "analiz"
+        await gateway.aclose()
+
+    @pytest.mark.asyncio
+    async def test_creative_calls_bypass_cache(self):
+        gateway = LLMGateway(api_key="k", model_timeouts={})
+        cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60, redis_cache=FakeRedisCache())
+        create = AsyncMock(return_value=_completion("hikaye"))
+
+        with patch("app.core.llm_gateway.llm_response_cache", cache), \
+                patch.object(gateway.client.chat.completions, "create", create):
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.3, cache=False)
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.3, cache=False)
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.95)
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.95)
+
+        assert create.await_count == 4
+        assert len(cache.memory) == 0
+        await gateway.aclose()
+
+    @pytest.mark.asyncio
+    async def test_creative_temperature_is_not_cached_by_default(self):
+        gateway = LLMGateway(api_key="k", model_timeouts={})
+        cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60, redis_cache=FakeRedisCache())
+        create = AsyncMock(return_value=_completion("bir varmış"))
+
+        with patch("app.core.llm_gateway.llm_response_cache", cache), \
+                patch.object(gateway.client.chat.completions, "create", create):
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.8)
+            await gateway.chat_completion("gpt-4", MESSAGES, temperature=0.8)
+
+        assert create.await_count == 2
+        assert len(cache.memory) == 0
+        await gateway.aclose()
+
+    @pytest.mark.asyncio
+    async def test_service_transform_is_cached_under_its_namespace(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.services.story_auto_summary_service import StoryAutoSummaryService
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        gateway = LLMGateway(api_key="k", model_timeouts={})
+        cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60, redis_cache=FakeRedisCache())
+        create = AsyncMock(return_value=_completion("Kısaca: kedi eve döner."))
+        service = StoryAutoSummaryService()
+
+        with patch("app.core.llm_gateway.llm_response_cache", cache), \
+                patch("app.services.story_auto_summary_service.llm_gateway", gateway), \
+                patch.object(gateway.client.chat.completions, "create", create):
+            first = await service.create_tldr("s1", "Kedi eve döner.")
+            second = await service.create_tldr("s1", "Kedi eve döner.")
+            messages = create.await_args.kwargs["messages"]
+            await gateway.chat_completion("gpt-4", messages, temperature=0.3, max_tokens=100)
+
+        assert first["tldr"] == second["tldr"] == "Kısaca: kedi eve döner."
+        assert create.await_count == 2  # same prompt, other namespace: separate entry
+        await gateway.aclose()
@@ -0,0 +1,82 @@
+"""
+Unit tests for LLMGateway
+
+Tests cover:
+- Per-model timeout resolution
+- Bounded concurrency of in-flight completions
+- Templated story services routing through the shared gateway
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.llm_gateway import LLMGateway, _parse_model_timeouts, llm_gateway
+
+
+def _response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class TestLLMGateway:
+    """Tests for the shared async LLM gateway."""
+
+    def test_parse_model_timeouts(self):
+        assert _parse_model_timeouts("gpt-4=120, gpt-3.5-turbo=30,bad") == {
+            "gpt-4": 120.0,
+            "gpt-3.5-turbo": 30.0,
+        }
+
+    def test_timeout_for_falls_back_to_default(self):
+        gateway = LLMGateway(api_key="k", default_timeout=10, model_timeouts={"gpt-4": 90})
+
+        assert gateway.timeout_for("gpt-4") == 90
+        assert gateway.timeout_for("other") == 10
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        gateway = LLMGateway(api_key="k", max_concurrency=2, model_timeouts={})
+        client = gateway.client
+        in_flight = 0
+        peak = 0
+
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response("ok")
+
+        with patch.object(client.chat.completions, "create", side_effect=fake_create):
+            results = await asyncio.gather(
+                *[gateway.chat("gpt-4", [{"role": "user", "content": "x"}]) for _ in range(6)]
+            )
+
+        assert results == ["ok"] * 6
+        assert peak == 2
+        await gateway.aclose()
+
+    @pytest.mark.asyncio
+    async def test_passes_model_timeout(self):
+        gateway = LLMGateway(api_key="k", default_timeout=5, model_timeouts={"gpt-4": 42})
+        client = gateway.client
+        create = AsyncMock(return_value=_response("ok"))
+
+        with patch.object(client.chat.completions, "create", create):
+            await gateway.chat_completion("gpt-4", [], temperature=0.3)
+
+        assert create.call_args.kwargs["timeout"] == 42
+        assert create.call_args.kwargs["temperature"] == 0.3
+        await gateway.aclose()
+
+    @pytest.mark.asyncio
+    async def test_templated_service_uses_gateway(self):
+        from app.services.story_tension_builder_service import StoryTensionBuilderService
+
+        service = StoryTensionBuilderService()
+        with patch.object(llm_gateway, "chat_completion", AsyncMock(return_value=_response("gergin"))):
+            result = await service.build_tension("s1", "Bir varmış bir yokmuş")
+
+        assert result["enhanced_text"] == "gergin"
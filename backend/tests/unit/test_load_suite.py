@@ -0,0 +1,127 @@
+"""
+Unit tests for the offline load-test suite
+
+Tests cover:
+- Fake providers: OpenAI-compatible chat (plain and streaming), Gemini embeddings,
+  Supabase auth / tables, and Wiro routes under the ``/wiro/v1`` prefix
+- Per-provider latency and error injection, runtime fault updates and stats
+- Report percentiles and the baseline regression gate
+"""
+import time
+
+import httpx
+import jwt
+import pytest
+from openai import AsyncOpenAI
+
+from scripts.fake_providers import create_app, parse_latency
+from scripts.load_test import Recorder, compare, mint_token, percentile, scenario_report
+
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+
+
+class TestFakeProviders:
+    """Tests for the provider stand-ins."""
+
+    @pytest.mark.asyncio
+    async def test_openai_client_chat_and_stream(self):
+        http = _client(create_app(token_ms=0))
+        client = AsyncOpenAI(api_key="x", base_url="http://stub/wiro/v1", http_client=http)
+
+        completion = await client.chat.completions.create(
+            model="openai/gpt-oss-20b", messages=[{"role": "user", "content": "masal"}], max_tokens=60
+        )
+        stream = await client.chat.completions.create(
+            model="openai/gpt-oss-20b", messages=[{"role": "user", "content": "masal"}], max_tokens=60, stream=True
+        )
+        streamed = "".join([chunk.choices[0].delta.content or "" async for chunk in stream])
+
+        assert completion.choices[0].message.content.startswith("Bir varmış")
+        assert streamed.strip() == completion.choices[0].message.content
+        await http.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gemini_supabase_and_wiro_routes(self):
+        secret = "s3cret"
+        app = create_app(jwt_secret=secret, wiro_task_seconds=0)
+        async with _client(app) as client:
+            single = await client.post(
+                "/v1beta/models/gemini-embedding-001:embedContent", json={"content": {"parts": [{"text": "tilki"}]}}
+            )
+            again = await client.post(
+                "/v1beta/models/gemini-embedding-001:batchEmbedContents",
+                json={"requests": [{"content": {"parts": [{"text": "tilki"}]}}]},
+            )
+            user = await client.get("/auth/v1/user", headers={"Authorization": f"Bearer {mint_token(secret, 'u1')}"})
+            forged = await client.get("/auth/v1/user", headers={"Authorization": f"Bearer {mint_token('other', 'u1')}"})
+            await client.post("/rest/v1/stories", json={"id": "s1", "user_id": "u1"})
+            rows = await client.get("/rest/v1/stories?user_id=eq.u1")
+            run = await client.post("/wiro/v1/Run/openai/gpt-oss-20b", json={"prompt": "x"})
+
+        assert single.json()["embedding"]["values"] == again.json()["embeddings"][0]["values"]
+        assert user.json()["id"] == "u1" and forged.status_code == 401
+        assert rows.json() == [{"id": "s1", "user_id": "u1"}]
+        assert run.json()["result"] is True
+
+
+class TestFaultInjection:
+    """Tests for latency / error injection."""
+
+    @pytest.mark.asyncio
+    async def test_latency_and_errors_are_per_provider(self):
+        app = create_app(latency=parse_latency("openai=60"), error_rate={"gemini": 1.0}, seed=1)
+        async with _client(app) as client:
+            started = time.perf_counter()
+            chat = await client.post("/v1/chat/completions", json={"messages": []})
+            elapsed = time.perf_counter() - started
+            embed = await client.post("/v1beta/models/m:embedContent", json={"content": {"parts": []}})
+
+            await client.post("/faults", json={"error_rate": {"gemini": 0}, "latency": {"openai": 0}})
+            recovered = await client.post("/v1beta/models/m:embedContent", json={"content": {"parts": []}})
+            stats = (await client.get("/stats")).json()
+
+        assert chat.status_code == 200 and elapsed >= 0.06
+        assert embed.status_code == 503 and recovered.status_code == 200
+        assert stats["calls"]["openai"] == 1 and stats["calls"]["gemini"] == 2
+        assert stats["errors"] == {"wiro": 0, "openai": 0, "gemini": 1, "supabase": 0}
+
+    def test_parse_latency_rejects_unknown_provider(self):
+        assert parse_latency("openai=800:200,wiro=150") == {"openai": (800.0, 200.0), "wiro": (150.0, 0.0)}
+        with pytest.raises(ValueError):
+            parse_latency("anthropic=10")
+
+
+class TestReport:
+    """Tests for report aggregation and the regression gate."""
+
+    def test_percentiles_and_scenario_summary(self):
+        assert percentile([], 0.5) == 0.0
+        assert percentile([1, 2, 3, 4, 5], 0.5) == 3
+        assert percentile(list(range(1, 101)), 0.95) == pytest.approx(95.05)
+
+        recorder = Recorder()
+        for ms in range(1, 101):
+            recorder.add("GET /api/stories", ms / 1000, ms % 10 != 0)
+        recorder.finished = recorder.started + 10
+        report = scenario_report(recorder)
+
+        stats = report["endpoints"]["GET /api/stories"]
+        assert (stats["count"], stats["errors"], stats["error_rate"], stats["throughput_rps"]) == (100, 10, 0.1, 10.0)
+        assert stats["latency_ms"]["p50"] == 50.5 and stats["latency_ms"]["max"] == 100.0
+
+    def test_regression_gate(self):
+        def report(p95, rps, error_rate=0.0):
+            stats = {"count": 10, "error_rate": error_rate, "throughput_rps": rps, "latency_ms": {"p95": p95}}
+            return {"scenarios": {"library": {"total": stats, "endpoints": {"GET /api/stories": stats}}}}
+
+        baseline = report(100, 50)
+        assert compare(report(115, 45), baseline, 0.2) == []
+        problems = compare(report(130, 30, 0.05), baseline, 0.2)
+        assert len(problems) == 3
+        assert problems[0] == "library GET /api/stories: p95 100.0ms -> 130.0ms"
+
+    def test_minted_token_matches_supabase_claims(self):
+        claims = jwt.decode(mint_token("k", "u9"), "k", algorithms=["HS256"], audience="authenticated")
+        assert claims["sub"] == "u9" and claims["exp"] > time.time()
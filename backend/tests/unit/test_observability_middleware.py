@@ -0,0 +1,164 @@
+"""
+Unit tests for the pure-ASGI observability middleware
+
+Tests cover:
+- Request ID assignment, incoming ID reuse and request.state access
+- Pagination limits answered with a real 400 response, inside CORS in the app stack
+- Streaming responses passing through chunk by chunk
+- Access log record and Prometheus metrics labelled by route template
+- Queue-backed async logging handlers
+"""
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.logging import disable_async_logging, enable_async_logging
+from app.core.metrics import registry
+from app.core.middleware import MAX_PAGE_SIZE, ObservabilityMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str, request: Request, limit: int = 10):
+        return {"item_id": item_id, "request_id": request.state.request_id, "limit": limit}
+
+    @app.post("/items")
+    async def create(limit: int = 10):
+        return {"limit": limit}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for part in (b"bir ", b"varmis ", b"bir yokmus"):
+                yield part
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=_app()), base_url="http://test")
+
+
+class TestRequestID:
+    """Tests for request ID handling."""
+
+    @pytest.mark.asyncio
+    async def test_assigns_and_exposes_request_id(self, client):
+        response = await client.get("/items/a")
+
+        assert response.headers["x-request-id"] == response.json()["request_id"]
+        assert float(response.headers["x-process-time"]) >= 0
+
+    @pytest.mark.asyncio
+    async def test_reuses_safe_incoming_id_only(self, client):
+        kept = await client.get("/items/a", headers={"X-Request-ID": "edge-123"})
+        replaced = await client.get("/items/a", headers={"X-Request-ID": "bad id\twith spaces"})
+
+        assert kept.headers["x-request-id"] == "edge-123"
+        assert replaced.headers["x-request-id"] not in ("", "bad id\twith spaces")
+
+
+class TestPagination:
+    """Tests for page size enforcement."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_limit_is_rejected(self, client):
+        response = await client.get(f"/items/a?limit={MAX_PAGE_SIZE + 1}")
+
+        assert response.status_code == 400
+        body = response.json()
+        assert body["error"]["message"] == f"limit cannot exceed {MAX_PAGE_SIZE}"
+        assert body["error"]["request_id"] == response.headers["x-request-id"]
+
+    @pytest.mark.asyncio
+    async def test_allowed_values_and_other_methods_pass(self, client):
+        assert (await client.get(f"/items/a?limit={MAX_PAGE_SIZE}")).status_code == 200
+        assert (await client.get("/items/a?limit=abc&page_size=5")).status_code == 422
+        assert (await client.post("/items?limit=500")).json() == {"limit": 500}
+
+    @pytest.mark.asyncio
+    async def test_rejection_carries_cors_headers_in_app_stack(self):
+        from main import app
+
+        origin = settings.CORS_ORIGINS[0]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(f"/api/stories?limit={MAX_PAGE_SIZE + 1}", headers={"Origin": origin})
+
+        assert response.status_code == 400
+        assert response.headers["access-control-allow-origin"] == origin
+
+
+class TestStreamingAndTelemetry:
+    """Tests for pass-through streaming, logs and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_chunks_are_not_buffered(self):
+        app = _app()
+        messages = []
+        scope = {
+            "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+            "root_path": "", "query_string": b"", "headers": [], "scheme": "http",
+            "http_version": "1.1", "client": ("127.0.0.1", 1), "server": ("test", 80),
+        }
+
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+        disconnected = asyncio.Event()
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+
+        bodies = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+        assert bodies == [b"bir ", b"varmis ", b"bir yokmus"]
+        assert (b"x-request-id", scope["state"]["request_id"].encode()) in messages[0]["headers"]
+
+    @pytest.mark.asyncio
+    async def test_access_log_and_route_metrics(self, client, caplog):
+        labels = {"method": "GET", "endpoint": "/items/{item_id}", "status": "200"}
+        before = registry.get_sample_value("http_requests_total", labels) or 0
+
+        with caplog.at_level(logging.INFO, logger="masal_fabrikasi.access"):
+            response = await client.get("/items/xyz")
+
+        record = next(r for r in caplog.records if r.name == "masal_fabrikasi.access")
+        assert record.request_id == response.headers["x-request-id"]
+        assert (record.route, record.status_code, record.path) == ("/items/{item_id}", 200, "/items/xyz")
+        assert registry.get_sample_value("http_requests_total", labels) == before + 1
+
+
+class TestAsyncLogging:
+    """Tests for queue-backed handlers."""
+
+    def test_records_reach_original_handlers(self):
+        target = logging.getLogger("masal_fabrikasi.test_async")
+        seen = []
+        handler = logging.Handler()
+        handler.emit = seen.append
+        target.handlers = [handler]
+        target.propagate = False
+
+        enable_async_logging("masal_fabrikasi.test_async")
+        try:
+            assert target.handlers != [handler]
+            target.info("merhaba %s", "dunya", extra={"request_id": "r1"})
+        finally:
+            disable_async_logging()
+
+        assert target.handlers == [handler]
+        assert [(r.getMessage(), r.request_id) for r in seen] == [("merhaba dunya", "r1")]
@@ -0,0 +1,121 @@
+"""
+Unit tests for request-scoped SQL profiling
+
+Tests cover:
+- Statement fingerprints (literals, placeholders, IN lists)
+- Query count / time accounting and N+1 detection inside a profile
+- EXPLAIN capture for the slowest SELECTs
+- Middleware integration: debug header, metrics and sync endpoints in the threadpool
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.middleware import ObservabilityMiddleware
+from app.core.query_monitor import (
+    begin_request_profile, current_profile, explain_slowest, fingerprint,
+    finish_request_profile, setup_query_logging,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    setup_query_logging(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE stories (id INTEGER PRIMARY KEY, user_id TEXT, created_at TEXT)"))
+        conn.execute(text("CREATE INDEX ix_stories_user ON stories (user_id)"))
+        for i in range(10):
+            conn.execute(text("INSERT INTO stories (user_id, created_at) VALUES (:u, :c)"), {"u": f"u{i % 2}", "c": f"2026-01-{i + 1:02d}"})
+    return engine
+
+
+def _streak_loop(engine, days=7):
+    # ReadingAnalyticsService tarzı: her gün için ayrı sorgu
+    with engine.connect() as conn:
+        for day in range(1, days + 1):
+            conn.execute(
+                text("SELECT id FROM stories WHERE user_id = :u AND created_at = :d LIMIT 1"),
+                {"u": "u0", "d": f"2026-01-{day:02d}"},
+            ).fetchall()
+        conn.execute(text("SELECT COUNT(*) FROM stories WHERE user_id = 'u0'")).scalar()
+
+
+class TestFingerprint:
+    """Tests for statement normalization."""
+
+    def test_literals_and_in_lists_collapse(self):
+        assert fingerprint("SELECT * FROM s WHERE id = 5 AND name = 'ayşe'") == \
+            fingerprint("SELECT *  FROM s WHERE id = 42 AND name = 'mehmet'")
+        assert fingerprint("SELECT * FROM s WHERE id IN (?, ?, ?)") == \
+            fingerprint("SELECT * FROM s WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM s WHERE id IN (...)"
+        assert fingerprint("SELECT col1 FROM t2 WHERE a = $1") == "SELECT col1 FROM t2 WHERE a = ?"
+
+
+class TestQueryProfile:
+    """Tests for accounting, N+1 detection and EXPLAIN."""
+
+    def test_counts_and_flags_repeated_statements(self, engine):
+        profile, token = begin_request_profile("req-1")
+        try:
+            _streak_loop(engine)
+        finally:
+            finish_request_profile(profile, token, "/api/analytics/{user_id}")
+
+        assert current_profile() is None
+        assert profile.count == 8
+        assert profile.total_time > 0
+        [suspect] = profile.n_plus_one()
+        assert suspect["count"] == 7
+        assert "created_at = ?" in suspect["fingerprint"]
+        assert profile.header_value().startswith("queries=8;")
+
+    def test_queries_outside_a_request_are_not_profiled(self, engine):
+        _streak_loop(engine, days=2)
+        assert current_profile() is None
+
+    def test_explain_slowest_selects(self, engine, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_EXPLAIN_SLOWEST", 2)
+        monkeypatch.setattr(settings, "QUERY_EXPLAIN_MIN_MS", 0)
+        profile, token = begin_request_profile("req-2")
+        try:
+            _streak_loop(engine, days=3)
+        finally:
+            finish_request_profile(profile, token, "/x")
+
+        plans = explain_slowest(profile)
+
+        assert len(plans) == 2
+        assert all(plan["plan"] for plan in plans)
+        assert profile.count == 4  # EXPLAIN sorguları profile eklenmez
+        assert profile.slowest == []
+
+
+class TestMiddlewareIntegration:
+    """Tests for the request surface."""
+
+    @pytest.mark.asyncio
+    async def test_header_and_metrics(self, engine, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_PROFILE_HEADER", True)
+        app = FastAPI()
+
+        @app.get("/analytics/{user_id}")
+        def analytics(user_id: str):
+            _streak_loop(engine)
+            return {"ok": True}
+
+        app.add_middleware(ObservabilityMiddleware)
+        labels = {"endpoint": "/analytics/{user_id}"}
+        before = registry.get_sample_value("db_n_plus_one_total", labels) or 0
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/analytics/u0")
+
+        header = dict(part.split("=") for part in response.headers["x-query-profile"].split(";"))
+        assert header["queries"] == "8" and header["n_plus_one"] == "1"
+        assert registry.get_sample_value("db_n_plus_one_total", labels) == before + 1
+        assert registry.get_sample_value("db_queries_per_request_sum", labels) >= 8
@@ -0,0 +1,163 @@
+"""
+Unit tests for the daily activity rollup behind ReadingAnalyticsService
+
+Tests cover:
+- Story insert/delete hooks keep user_daily_activity in sync, bucketed by UTC day
+- Streaks, weekly/monthly counts and distributions from the rollup
+- Stats + distribution on one service instance share a single rollup read
+- Backfill (rebuild_daily_activity) matches the hook-maintained rollup
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import Job, Story, StoryAnalysis, StoryAnalytics, UserDailyActivity, activity_key
+from app.services.reading_analytics_service import ReadingAnalyticsService
+
+
+def _at(days_ago, hour=20):
+    today = datetime.now(timezone.utc).replace(hour=hour, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=days_ago)
+
+
+@pytest.fixture
+def db_session():
+    # Yalnızca hikâye ve ilişkili tablolar (SQLite yabancı anahtarları zorlamaz)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [Story, UserDailyActivity, Job, StoryAnalytics, StoryAnalysis]
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in tables])
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def user_id():
+    return uuid.uuid4()
+
+
+def _add_stories(db, user_id, specs):
+    stories = [
+        Story(user_id=user_id, theme="tema", story_text="metin", created_at=_at(days_ago, hour),
+              story_type=story_type, language=language, is_favorite=favorite)
+        for days_ago, hour, story_type, language, favorite in specs
+    ]
+    db.add_all(stories)
+    db.commit()
+    return stories
+
+
+# Bugün, dün, 2 gün önce (seri = 3); 10-13 gün önce 4 günlük seri; 40 gün önce tek gün
+SPECS = [
+    (0, 20, "masal", "tr", True),
+    (0, 8, "fabl", "en", False),
+    (1, 20, "masal", "tr", False),
+    (2, 21, "masal", "tr", True),
+    (10, 20, "masal", "tr", False),
+    (11, 20, "macera", "tr", False),
+    (12, 20, "masal", "tr", False),
+    (13, 20, "masal", "tr", False),
+    (40, 9, "fabl", "en", False),
+]
+
+
+class TestRollupHooks:
+    """Tests for the Story insert/delete hooks."""
+
+    def test_insert_and_delete_update_rollup(self, db_session, user_id):
+        stories = _add_stories(db_session, user_id, SPECS[:3] + [(0, 20, "masal", "tr", False)])
+
+        rows = {(r.day, r.hour, r.story_type): r.story_count for r in db_session.query(UserDailyActivity)}
+        assert rows[(_at(0).date(), 20, "masal")] == 2
+        assert sum(rows.values()) == 4
+
+        db_session.delete(stories[0])
+        db_session.delete(stories[1])
+        db_session.commit()
+        rows = {(r.day, r.hour, r.story_type): r.story_count for r in db_session.query(UserDailyActivity)}
+        assert rows == {(_at(0).date(), 20, "masal"): 1, (_at(1).date(), 20, "masal"): 1}
+
+
+    def test_days_are_utc(self, db_session, user_id):
+        istanbul = timezone(timedelta(hours=3))
+        local_midnight = datetime(2024, 5, 10, 0, 30, tzinfo=istanbul)
+
+        key = activity_key(user_id, local_midnight, None, None)
+        assert (key["day"], key["hour"]) == (datetime(2024, 5, 9).date(), 21)
+        assert activity_key(user_id, datetime(2024, 5, 9, 21, 30), None, None) == key
+
+        db_session.add(Story(user_id=user_id, theme="tema", story_text="metin", created_at=local_midnight))
+        db_session.commit()
+        row = db_session.query(UserDailyActivity).one()
+        assert (row.day, row.hour) == (key["day"], 21)
+
+
+class TestReadingStats:
+    """Tests for stats and distribution computed from the rollup."""
+
+    def test_stats_and_distribution(self, db_session, user_id):
+        _add_stories(db_session, user_id, SPECS)
+        service = ReadingAnalyticsService(db_session)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            stats = service.get_reading_stats(user_id)
+            distribution = service.get_reading_distribution(user_id)
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+        assert stats["total_stories_read"] == 9
+        assert stats["stories_this_week"] == 4
+        assert stats["stories_this_month"] == 8
+        assert stats["favorite_count"] == 2
+        assert stats["current_streak_days"] == 3
+        assert stats["longest_streak_days"] == 4
+        # Bir özet okuması + favori sayımı; gün başına sorgu yok
+        assert len(statements) == 2
+
+        assert {d["type"]: d["count"] for d in distribution["by_type"]} == {"masal": 6, "fabl": 2, "macera": 1}
+        assert {d["language"]: d["count"] for d in distribution["by_language"]} == {"tr": 7, "en": 2}
+        assert {d["hour"]: d["count"] for d in distribution["by_hour"]} == {8: 1, 9: 1, 20: 6, 21: 1}
+        assert sum(d["count"] for d in distribution["by_day_of_week"]) == 9
+        assert len(distribution["by_day_of_week"]) == 7
+
+    def test_no_activity_today_breaks_current_streak(self, db_session, user_id):
+        _add_stories(db_session, user_id, SPECS[2:4])
+        stats = ReadingAnalyticsService(db_session).get_reading_stats(user_id)
+
+        assert stats["current_streak_days"] == 0
+        assert stats["longest_streak_days"] == 2
+
+
+class TestBackfill:
+    """Tests for rebuild_daily_activity."""
+
+    def test_rebuild_matches_hooks(self, db_session, user_id):
+        other = uuid.uuid4()
+        _add_stories(db_session, user_id, SPECS)
+        _add_stories(db_session, other, SPECS[:2])
+
+        snapshot = lambda: sorted(
+            (str(r.user_id), r.day, r.hour, r.story_type, r.language, r.story_count)
+            for r in db_session.query(UserDailyActivity)
+        )
+        expected = snapshot()
+        db_session.query(UserDailyActivity).delete()
+        db_session.add(UserDailyActivity(user_id=other, day=_at(99).date(), hour=1,
+                                         story_type="masal", language="tr", story_count=5))
+        db_session.commit()
+
+        report = ReadingAnalyticsService(db_session).rebuild_daily_activity(users_per_batch=1)
+
+        assert report == {"users": 2, "stories": 11, "rows": len(expected)}
+        assert snapshot() == expected
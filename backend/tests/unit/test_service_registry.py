@@ -0,0 +1,56 @@
+"""
+Unit tests for the lazy ServiceRegistry
+
+Tests cover:
+- Resolution on first attribute access and instance caching
+- Selective preloading
+- Every router-registered target pointing at an importable class
+"""
+import importlib
+
+import pytest
+
+from app.core.service_registry import LazyService, ServiceRegistry, service_registry
+
+
+class _Counter:
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.value = 42
+
+
+class TestServiceRegistry:
+    """Tests for lazy service resolution."""
+
+    def setup_method(self):
+        _Counter.created = 0
+        self.registry = ServiceRegistry()
+        self.registry.register("counter", f"{__name__}:_Counter")
+
+    def test_resolves_on_first_use_only(self):
+        proxy = LazyService(self.registry, "counter")
+        assert _Counter.created == 0
+        assert not self.registry.is_loaded("counter")
+
+        assert proxy.value == 42
+        assert proxy.value == 42
+        assert _Counter.created == 1
+        assert self.registry.is_loaded("counter")
+
+    def test_preload_from_setting(self):
+        assert self.registry.preload_from_setting("") == []
+        assert self.registry.preload_from_setting("counter, missing") == ["counter"]
+        assert _Counter.created == 1
+
+    def test_conflicting_registration_is_rejected(self):
+        with pytest.raises(ValueError):
+            self.registry.register("counter", f"{__name__}:TestServiceRegistry")
+
+    def test_router_targets_are_importable(self):
+        import app.routers.story_advanced_features  # noqa: F401
+
+        for name in service_registry.names():
+            module_path, class_name = service_registry._targets[name].split(":")
+            assert hasattr(importlib.import_module(module_path), class_name), name
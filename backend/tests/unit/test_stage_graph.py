@@ -0,0 +1,124 @@
+"""
+Unit tests for StageGraph
+
+Tests cover:
+- Independent stages running concurrently after their shared dependency
+- Monotonic progress reporting and per-stage timings
+- Failure handling (required vs optional stages)
+- Graph validation
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.tasks.stage_graph import Stage, StageGraph
+
+
+def _sleeper(seconds, value=None):
+    async def run(results):
+        await asyncio.sleep(seconds)
+        return value
+    return run
+
+
+class TestStageGraph:
+    """Tests for the dependency-driven stage runner."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        order = []
+
+        async def text(results):
+            order.append("text")
+            await asyncio.sleep(0.02)
+            return "metin"
+
+        async def image(results):
+            assert results["text"] == "metin"
+            await asyncio.sleep(0.1)
+            return {"image_url": "img.png"}
+
+        async def audio(results):
+            assert results["text"] == "metin"
+            await asyncio.sleep(0.1)
+            return {"audio_url": "ses.mp3"}
+
+        graph = StageGraph([
+            Stage("text", text),
+            Stage("image", image, depends_on=("text",)),
+            Stage("audio", audio, depends_on=("text",)),
+        ])
+        started = time.perf_counter()
+        results = await graph.run()
+        elapsed = time.perf_counter() - started
+
+        assert results["image"] == {"image_url": "img.png"}
+        assert results["audio"] == {"audio_url": "ses.mp3"}
+        # Sequential would take ~0.22s
+        assert elapsed < 0.18
+        assert set(graph.timings) == {"text", "image", "audio"}
+        assert graph.timings["image"] >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_progress_is_monotonic_and_weighted(self):
+        events = []
+        graph = StageGraph([
+            Stage("text", _sleeper(0.01), weight=30, message="Hikaye yazılıyor..."),
+            Stage("image", _sleeper(0.03, {"image_url": "x"}), depends_on=("text",), weight=70,
+                  message="Görsel üretiliyor...", done_message="Görsel hazır"),
+        ], on_progress=lambda percent, step, data: events.append((percent, step, data)), base_percent=10, max_percent=90)
+
+        await graph.run()
+
+        percents = [percent for percent, _, _ in events]
+        assert percents == sorted(percents)
+        assert events[-1][0] == 90
+        assert events[-1][1] == "Görsel hazır"
+        assert events[-1][2]["image_url"] == "x"
+        assert (34, "Görsel üretiliyor...") in [(p, s) for p, s, _ in events]
+
+    @pytest.mark.asyncio
+    async def test_required_failure_cancels_running_stages(self):
+        cancelled = asyncio.Event()
+
+        async def slow(results):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def broken(results):
+            raise RuntimeError("görsel servisi çöktü")
+
+        graph = StageGraph([Stage("audio", slow), Stage("image", broken)])
+
+        with pytest.raises(RuntimeError, match="görsel"):
+            await graph.run()
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_skips_dependents_only(self):
+        async def broken(results):
+            raise RuntimeError("embedding down")
+
+        graph = StageGraph([
+            Stage("text", _sleeper(0, "metin")),
+            Stage("index", broken, depends_on=("text",), optional=True),
+            Stage("reindex", _sleeper(0, "x"), depends_on=("index",)),
+            Stage("audio", _sleeper(0.01, "ses"), depends_on=("text",)),
+        ])
+
+        results = await graph.run()
+
+        assert results == {"text": "metin", "audio": "ses"}
+
+    def test_rejects_unknown_dependency_and_cycles(self):
+        with pytest.raises(ValueError, match="unknown"):
+            StageGraph([Stage("image", _sleeper(0), depends_on=("text",))])
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph([
+                Stage("a", _sleeper(0), depends_on=("b",)),
+                Stage("b", _sleeper(0), depends_on=("a",)),
+            ])
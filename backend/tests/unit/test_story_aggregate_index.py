@@ -0,0 +1,107 @@
+"""
+Unit tests for the write-time library aggregates behind StatisticsService
+
+Tests cover:
+- Counters follow StoryStorage saves, favorite toggles, edits and deletes
+- Detailed statistics (types, themes, styles, languages, length, 1/7/30-day windows)
+- Replay after restart and writes from another store instance
+- Reconcile repairs drift, compaction reconciles automatically
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services.statistics_service import StatisticsService
+from app.services.story_log_store import StoryLogStore
+
+
+def _days_ago(days):
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def _story(story_id, days_ago=0, **extra):
+    return {
+        "story_id": story_id,
+        "created_at": _days_ago(days_ago),
+        "story_text": "x" * 10,
+        "theme": "ejderha",
+        **extra,
+    }
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+    return StatisticsService()
+
+
+class TestDetailedStatistics:
+    """Tests for StatisticsService.get_detailed_statistics."""
+
+    def test_empty_library(self, service):
+        stats = service.get_detailed_statistics()
+
+        assert stats["total_stories"] == 0 and stats["top_themes"] == []
+
+    def test_counters_follow_saves_and_deletes(self, service):
+        storage = service.story_storage
+        storage.save_story(_story("a", 0, story_type="fabl", language="en"))
+        storage.save_story(_story("b", 3, image_style="watercolor", story_text="x" * 30))
+        storage.save_story(_story("c", 20, theme="deniz"))
+        storage.save_story(_story("d", 100, theme="deniz"))
+        storage.save_story(_story("e", 200, theme="orman"))
+        storage.toggle_favorite("c")
+
+        stats = service.get_detailed_statistics()
+        assert stats["total_stories"] == 5
+        assert stats["favorite_stories"] == 1
+        assert stats["story_types"] == {"fabl": 1, "masal": 4}
+        assert stats["languages"] == {"en": 1, "tr": 4}
+        assert stats["image_styles"] == {"watercolor": 1, "fantasy": 4}
+        assert stats["top_themes"][0] == {"theme": "ejderha", "count": 2}
+        assert stats["date_statistics"] == {"today": 1, "this_week": 2, "this_month": 3}
+        assert (stats["last_7_days"], stats["last_30_days"]) == (2, 3)
+        assert stats["average_story_length"] == pytest.approx(70 / 5)
+
+        # Düzenleme eski katkıyı geri alır; favori durumu korunur
+        storage.save_story(_story("c", 20, theme="orman", story_type="macera"))
+        storage.delete_story("a")
+        stats = service.get_detailed_statistics()
+        assert stats["total_stories"] == 4 and stats["favorite_stories"] == 1
+        assert stats["story_types"] == {"masal": 3, "macera": 1}
+        assert stats["languages"] == {"tr": 4}
+        assert {t["theme"]: t["count"] for t in stats["top_themes"]} == {"orman": 2, "ejderha": 1, "deniz": 1}
+        assert stats["date_statistics"]["today"] == 0
+
+
+class TestAggregateMaintenance:
+    """Tests for counters kept by StoryLogStore."""
+
+    def test_replay_and_other_instance(self, tmp_path):
+        first = StoryLogStore(str(tmp_path))
+        first.put(_story("a", 1))
+        second = StoryLogStore(str(tmp_path))
+        second.put(_story("b", 2, language="en"))
+        second.delete("a")
+
+        today = datetime.now().date()
+        assert first.aggregates(today)["languages"] == {"en": 1}
+        assert first.aggregates(today) == second.aggregates(today)
+
+    def test_reconcile_repairs_drift(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        for i in range(5):
+            store.put(_story(str(i), i, theme=f"tema {i % 2}"))
+        today = datetime.now().date()
+        expected = store.aggregates(today)
+        assert store.reconcile_aggregates() == []
+
+        store._aggregates.types["masal"] += 3
+        store._aggregates.days.clear()
+        assert store.reconcile_aggregates() == ["types", "days"]
+        assert store.aggregates(today) == expected
+
+        store._aggregates.favorites = 7
+        store.compact()
+        assert store.aggregates(today) == expected
@@ -0,0 +1,155 @@
+"""
+Unit tests for precomputed recommendation features
+
+Tests cover:
+- Vectorized scores match the per-story rules (theme, type, likes, recency, trending)
+- Top-k selection with recency tie-break and exclusion of the user's own stories
+- Incremental refresh on story save/update/delete and slot reuse
+- RecommendationService and StoryRecommendationEngineService on top of the index
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.story_feature_index import StoryFeatureIndex, theme_matches
+
+NOW = datetime.now()
+
+
+def _story(story_id, days_ago=30, **fields):
+    story = {
+        "story_id": story_id,
+        "user_id": "author",
+        "theme": "genel",
+        "story_type": "masal",
+        "language": "tr",
+        "created_at": (NOW - timedelta(days=days_ago)).isoformat(),
+    }
+    story.update(fields)
+    return story
+
+
+class TestThemeMatching:
+    """Tests for stemmed theme matching."""
+
+    def test_matches_inflected_and_multi_word_themes(self):
+        assert theme_matches("Ormandaki Ejderhalar", ["ejderha"])
+        assert theme_matches("Uzay Macerası", ["uzay macera"])
+        assert not theme_matches("Kayık", ["ay"])
+        assert not theme_matches("", ["ejderha"])
+
+
+class TestStoryFeatureIndex:
+    """Tests for scoring and maintenance."""
+
+    def test_scores_follow_rules(self):
+        index = StoryFeatureIndex()
+        index.add(_story("plain"))
+        index.add(_story("theme", theme="Ejderhalar Diyarı"))
+        index.add(_story("type", story_type="Fabl"))
+        index.add(_story("liked", like_count=40))
+        index.add(_story("recent", days_ago=1))
+        index.add(_story("trending", is_trending=True))
+        index.add(_story("read-theme", theme="deniz"))
+        index.add(_story("own", user_id="u1", theme="deniz"))
+
+        ranked = dict(index.recommend("u1", themes=["ejderha"], story_types=["fabl"], limit=10))
+
+        assert ranked == {
+            "plain": 0, "theme": 20, "type": 15, "liked": 30,
+            "recent": 10, "trending": 25, "read-theme": 15,
+        }
+
+    def test_top_k_ties_prefer_newer(self):
+        index = StoryFeatureIndex()
+        for i in range(20):
+            index.add(_story(f"s{i}", days_ago=30 + i, like_count=1))
+        index.add(_story("best", like_count=10))
+
+        ranked = index.recommend("nobody", limit=3)
+
+        assert [story_id for story_id, _ in ranked] == ["best", "s0", "s1"]
+        assert index.recommend("nobody", themes=["ejderha"], limit=3, require_theme=True) == []
+
+    def test_incremental_update_delete_and_reuse(self):
+        index = StoryFeatureIndex()
+        index.INITIAL_CAPACITY = 2
+        for i in range(5):
+            index.add(_story(f"s{i}", days_ago=30 + i))
+        index.add(_story("s1", days_ago=31, is_trending=True))
+        index.remove("s0")
+        index.add(_story("s5", theme="uzay"))
+
+        assert len(index) == 5
+        assert index._rows["s5"] == 0  # freed slot reused
+        assert index.recommend("nobody", limit=1)[0] == ("s1", 25.0)
+        assert "s0" not in dict(index.recommend("nobody", limit=10))
+        assert [sid for sid, _ in index.similar("s5")] == ["s1", "s2", "s3", "s4"]
+
+    def test_similar_scores(self):
+        index = StoryFeatureIndex()
+        index.add(_story("ref", theme="ejderha", story_type="fabl"))
+        index.add(_story("both", theme="Kırmızı Ejderhalar", story_type="fabl", language="en"))
+        index.add(_story("type", theme="uzay", story_type="fabl", language="en"))
+        index.add(_story("none", theme="uzay", language="en"))
+
+        assert index.similar("ref") == [("both", 50.0), ("type", 20.0)]
+        assert index.similar("missing") == []
+
+
+class TestRecommendationServices:
+    """Tests for the services using the store's features."""
+
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.services.story_storage import StoryStorage
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        storage = StoryStorage()
+        storage.save_story(_story("mine-1", user_id="u1", theme="ejderha"))
+        storage.save_story(_story("mine-2", user_id="u1", theme="ejderha", days_ago=1))
+        storage.save_story(_story("dragon", theme="Ejderhalar", days_ago=40))
+        storage.save_story(_story("space", theme="uzay", story_type="fabl"))
+        storage.save_story(_story("sea", theme="deniz", is_trending=True))
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_recommendations_and_preferences(self, storage):
+        from app.services.recommendation_service import RecommendationService
+
+        service = RecommendationService()
+        # "Ejderhalar" okunan "ejderha" temasıyla eşleşir
+        assert [s["story_id"] for s in await service.get_recommendations("u1")] == ["sea", "dragon", "space"]
+
+        await service.update_user_preferences("u1", {"story_types": ["fabl"]})
+        await service.update_user_preferences("u1", {"themes": ["uzay"]})
+        assert service._get_user_preferences("u1") == {"story_types": ["fabl"], "themes": ["uzay"]}
+        assert (await service.get_recommendations("u1", limit=1))[0]["story_id"] == "space"
+
+        storage.save_story(_story("hot", theme="uzay", is_trending=True, like_count=20))
+        assert (await service.get_recommendations("u1", limit=1))[0]["story_id"] == "hot"
+        storage.delete_story("hot")
+        assert "hot" not in [s["story_id"] for s in await service.get_recommendations("u1")]
+
+        similar = await service.get_similar_stories("mine-1")
+        assert [s["story_id"] for s in similar][:2] == ["mine-2", "dragon"]
+
+    @pytest.mark.asyncio
+    async def test_engine(self, storage):
+        from app.services.story_recommendation_engine_service import StoryRecommendationEngineService
+
+        engine = StoryRecommendationEngineService()
+
+        history = await engine.get_personalized_recommendations("u1", based_on="reading_history")
+        assert [s["story_id"] for s in history] == ["dragon"]
+
+        similar = await engine.get_personalized_recommendations("u1", based_on="similar_stories")
+        assert similar[0]["story_id"] == "mine-1"
+
+        cold = await engine.get_personalized_recommendations("new-user", limit=2)
+        assert [s["story_id"] for s in cold] == ["sea", "mine-2"]
+
+    def test_user_stories_newest_first(self, storage):
+        assert [s["story_id"] for s in storage.get_user_stories("u1")] == ["mine-2", "mine-1"]
+        assert storage.get_user_stories("nobody") == []
@@ -0,0 +1,104 @@
+"""
+Unit tests for StoryLogStore
+
+Tests cover:
+- Point lookups and secondary-index queries
+- Replay of the append-only log after restart
+- Import of a legacy stories.json snapshot
+- Compaction
+- Picking up records appended by another process
+"""
+import json
+import os
+
+from app.services.story_log_store import StoryLogStore
+
+
+def _story(story_id, created_at, **extra):
+    return {"story_id": story_id, "created_at": created_at, "story_type": "masal", **extra}
+
+
+class TestStoryLogStore:
+    """Tests for the indexed append-only story store."""
+
+    def test_put_and_get(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "2024-01-01T00:00:00", theme="ejderha"))
+
+        assert store.get("a")["theme"] == "ejderha"
+        assert store.get("missing") is None
+
+    def test_returned_story_is_a_copy(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "2024-01-01T00:00:00"))
+
+        story = store.get("a")
+        story["is_favorite"] = True
+
+        assert store.favorite_count() == 0
+
+    def test_query_uses_secondary_indexes(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "2024-01-01T00:00:00", is_public=True))
+        store.put(_story("b", "2024-01-03T00:00:00", story_type="macera", is_favorite=True))
+        store.put(_story("c", "2024-01-02T00:00:00", is_public=True, is_favorite=True))
+
+        assert [s["story_id"] for s in store.query()] == ["b", "c", "a"]
+        assert [s["story_id"] for s in store.query(newest_first=False)] == ["a", "c", "b"]
+        assert [s["story_id"] for s in store.query(public_only=True)] == ["c", "a"]
+        assert [s["story_id"] for s in store.query(favorite_only=True, story_type="masal")] == ["c"]
+        assert [s["story_id"] for s in store.query(limit=1)] == ["b"]
+        assert store.type_counts() == {"masal": 2, "macera": 1}
+
+    def test_update_and_delete_maintain_indexes(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "2024-01-01T00:00:00"))
+
+        store.update("a", lambda s: s.update(is_favorite=True))
+        assert store.favorite_count() == 1
+
+        assert store.delete("a") is True
+        assert store.delete("a") is False
+        assert store.count() == 0
+        assert store.query(favorite_only=True) == []
+
+    def test_log_is_replayed_after_restart(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "2024-01-01T00:00:00"))
+        store.put(_story("b", "2024-01-02T00:00:00"))
+        store.delete("a")
+
+        reopened = StoryLogStore(str(tmp_path))
+
+        assert reopened.get("a") is None
+        assert reopened.get("b") is not None
+
+    def test_legacy_snapshot_is_imported(self, tmp_path):
+        with open(os.path.join(tmp_path, "stories.json"), "w", encoding="utf-8") as f:
+            json.dump([_story("old", "2023-05-01T00:00:00")], f)
+
+        store = StoryLogStore(str(tmp_path))
+
+        assert store.get("old") is not None
+
+    def test_compaction_keeps_live_stories(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.COMPACT_MIN_RECORDS = 5
+        for i in range(12):
+            store.put(_story(f"s{i % 3}", f"2024-01-0{i % 3 + 1}T00:00:00", revision=i))
+
+        assert os.path.getsize(os.path.join(tmp_path, "stories.log")) < 2000
+        reopened = StoryLogStore(str(tmp_path))
+        assert reopened.count() == 3
+        assert reopened.get("s2")["revision"] == 11
+
+    def test_sees_writes_from_another_instance(self, tmp_path):
+        reader = StoryLogStore(str(tmp_path))
+        writer = StoryLogStore(str(tmp_path))
+
+        writer.put(_story("a", "2024-01-01T00:00:00"))
+        assert reader.get("a") is not None
+
+        writer.compact()
+        writer.delete("a")
+        assert reader.get("a") is None
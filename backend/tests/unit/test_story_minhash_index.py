@@ -0,0 +1,168 @@
+"""
+Unit tests for the MinHash/LSH near-duplicate index
+
+Tests cover:
+- Shingling and one-permutation MinHash estimates
+- LSH candidates for edited copies, none for unrelated stories
+- Containment candidates for short excerpts of long stories
+- Incremental update/delete and persistence
+- PlagiarismService and StoryPlagiarismCheckerService on top of the index
+"""
+import random
+
+import pytest
+
+from app.services.story_log_store import StoryLogStore
+from app.services.story_minhash_index import (
+    StoryMinHashIndex, estimate_jaccard, jaccard, shingles, signature,
+)
+
+WORDS = (
+    "ejderha prenses orman kale büyücü tavşan nehir dağ yıldız ay güneş köy "
+    "değirmen kuyu altın gümüş rüzgar bulut yağmur çiçek bahçe kuş balık deniz "
+    "gemi ada mağara hazine harita anahtar kapı pencere merdiven kule köprü"
+).split()
+
+
+def _text(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _edit(text, ratio, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * ratio)):
+        words[i] = "değişti"
+    return " ".join(words)
+
+
+class TestMinHash:
+    """Tests for shingles and signatures."""
+
+    def test_shingles_ignore_case_and_turkish_characters(self):
+        assert shingles("Işıklı Orman Çok Güzel") == shingles("ışıklı orman cok guzel")
+        assert len(shingles("bir iki üç dört")) == 2
+
+    def test_signature_estimates_jaccard(self):
+        a, b = shingles(_text(1)), shingles(_edit(_text(1), 0.1))
+        exact = jaccard(a, b)
+        estimate = estimate_jaccard(signature(a), signature(b))
+
+        assert 0.4 < exact < 0.9
+        assert abs(estimate - exact) < 0.15
+        assert estimate_jaccard(signature(a), signature(a)) == 1.0
+
+
+class TestStoryMinHashIndex:
+    """Tests for LSH maintenance and lookup."""
+
+    def test_finds_edited_copy_not_unrelated(self):
+        index = StoryMinHashIndex()
+        original = _text(1)
+        index.add({"story_id": "orig", "story_text": original})
+        for i in range(50):
+            index.add({"story_id": f"other-{i}", "story_text": _text(100 + i)})
+
+        candidates = index.candidates(signature(shingles(_edit(original, 0.1))))
+
+        assert "orig" in candidates
+        assert candidates["orig"] > 0.4
+        assert all(score < 0.3 for story_id, score in candidates.items() if story_id != "orig")
+
+    def test_short_excerpt_of_long_story_is_a_candidate(self):
+        index = StoryMinHashIndex()
+        originals = {f"long-{i}": _text(i, 1500) for i in range(10)}
+        for story_id, text in originals.items():
+            index.add({"story_id": story_id, "story_text": text})
+
+        for offset in range(0, 1350, 45):
+            for story_id, text in originals.items():
+                query = shingles(" ".join(text.split()[offset:offset + 150]))
+                assert jaccard(query, shingles(text)) < 0.15
+                assert story_id in index.candidates(signature(query), query=query, min_containment=0.1)
+
+    def test_update_delete_and_persistence(self, tmp_path):
+        index = StoryMinHashIndex(str(tmp_path / "stories.mh"))
+        index.add({"story_id": "a", "story_text": _text(1)})
+        index.add({"story_id": "b", "story_text": _text(2)})
+        index.add({"story_id": "a", "story_text": _text(3)})
+        index.remove("b")
+        index.save()
+
+        loaded = StoryMinHashIndex(index.path)
+        assert loaded.load() is True
+        assert len(loaded) == 1
+        assert "a" in loaded.candidates(signature(shingles(_text(3))))
+        assert loaded.candidates(signature(shingles(_text(1)))) == {}
+        excerpt = shingles(" ".join(_text(3).split()[:40]))
+        assert "a" in loaded.candidates(signature(excerpt), query=excerpt, min_containment=0.5)
+
+
+class TestPlagiarismServices:
+    """Tests for the services using the index."""
+
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.services.story_storage import StoryStorage
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        storage = StoryStorage()
+        storage.save_story({"story_id": "orig", "theme": "ejderha", "story_text": _text(1)})
+        for i in range(20):
+            storage.save_story({"story_id": f"other-{i}", "theme": "x", "story_text": _text(100 + i)})
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_check_plagiarism(self, storage):
+        from app.services.plagiarism_service import PlagiarismService
+
+        service = PlagiarismService()
+        result = await service.check_plagiarism(_edit(_text(1), 0.05))
+
+        assert result["similar_stories"][0]["story_id"] == "orig"
+        assert result["is_original"] is False
+        assert result["candidates_checked"] < result["total_comparisons"] == 21
+
+        report = service.get_originality_report("other-3")
+        assert report["is_original"] is True
+
+    def test_embedded_copy_detected_by_containment(self, storage):
+        excerpt = " ".join(_text(1).split()[:120])
+        matches, _ = storage.find_similar_stories(excerpt + " " + _text(999, 40))
+
+        assert matches[0]["story_id"] == "orig"
+        assert matches[0]["containment"] > 0.7
+
+    def test_short_excerpt_of_long_story_is_found(self, storage):
+        from app.services.story_plagiarism_checker_service import StoryPlagiarismCheckerService
+
+        storage.save_story({"story_id": "long", "theme": "uzun", "story_text": _text(7, 1500)})
+        excerpt = " ".join(_text(7, 1500).split()[700:850])
+
+        matches, _ = storage.find_similar_stories(excerpt, threshold=0.1)
+        similarity, story_id = StoryPlagiarismCheckerService()._calculate_similarity(excerpt, "new")
+
+        assert matches[0]["story_id"] == "long" and matches[0]["containment"] == 1.0
+        assert matches[0]["similarity"] < 0.15
+        assert story_id == "long"
+
+    def test_checker_similarity(self, storage):
+        from app.services.story_plagiarism_checker_service import StoryPlagiarismCheckerService
+
+        service = StoryPlagiarismCheckerService()
+
+        similarity, story_id = service._calculate_similarity(_text(1), "new")
+        assert similarity == 1.0 and story_id == "orig"
+        assert service._calculate_similarity(_text(1), "orig")[0] < 0.3
+
+    def test_store_reload_keeps_index(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put({"story_id": "a", "created_at": "1", "story_text": _text(1)})
+        store.compact()
+
+        other = StoryLogStore(str(tmp_path))
+        matches, checked = other.near_duplicates(_text(1))
+
+        assert [story["story_id"] for story, _, _ in matches] == ["a"] and checked == 1
@@ -0,0 +1,149 @@
+"""
+Unit tests for StorySearchIndex
+
+Tests cover:
+- Turkish lowercasing, folding and suffix stemming
+- BM25 ranking with AND / OR semantics
+- Prefix and one-typo fuzzy matching
+- Incremental update and delete
+- Persistence and reuse after restart
+- StoryStorage / StoryLogStore integration
+"""
+from app.services.story_log_store import StoryLogStore
+from app.services.story_search_index import StorySearchIndex, analyze_terms
+
+
+def _story(story_id, theme, text, **extra):
+    return {"story_id": story_id, "theme": theme, "story_text": text, **extra}
+
+
+def _ids(hits):
+    return [story_id for story_id, _ in hits]
+
+
+class TestAnalyzer:
+    """Tests for the Turkish analyzer."""
+
+    def test_inflections_share_a_stem(self):
+        assert len(set(analyze_terms("kediler kedinin kediyi kediye"))) == 1
+        assert analyze_terms("ormanda ormandaki ormanından") == ["orman"] * 3
+        assert analyze_terms("çocuğun") == analyze_terms("çocuk")
+
+    def test_turkish_case_folding_and_stopwords(self):
+        assert analyze_terms("IŞIK") == analyze_terms("ışık") == analyze_terms("isik")
+        assert analyze_terms("İstanbul'da") == analyze_terms("istanbul")
+        assert analyze_terms("ve bir ile") == []
+
+
+class TestStorySearchIndex:
+    """Tests for the inverted index."""
+
+    def _index(self):
+        index = StorySearchIndex()
+        index.add(_story("1", "Uçan ejderha", "Ejderha ormanda uçtu ve kedilerle oynadı."))
+        index.add(_story("2", "Kedi", "Kedinin adı Pamuk idi. Pamuk ormanda yaşardı."))
+        index.add(_story("3", "Deniz", "Bir balık denizde yüzdü."))
+        return index
+
+    def test_bm25_ranks_theme_matches_higher(self):
+        assert _ids(self._index().search("kedi")) == ["2", "1"]
+
+    def test_and_and_or_semantics(self):
+        index = self._index()
+
+        assert _ids(index.search("orman kedi")) == ["2", "1"]
+        assert index.search("ejderha balık") == []
+        assert set(_ids(index.search("ejderha balık", match_all=False))) == {"1", "3"}
+
+    def test_prefix_and_fuzzy(self):
+        index = self._index()
+
+        assert _ids(index.search("ejde")) == ["1"]
+        assert _ids(index.search("ejdreha")) == ["1"]
+        assert _ids(index.search("balk", prefix=False)) == ["3"]
+        assert index.search("ejdreha", fuzzy=False) == []
+
+    def test_limit_and_allowed(self):
+        index = self._index()
+
+        assert _ids(index.search("kedi", limit=1)) == ["2"]
+        assert _ids(index.search("kedi", allowed={"1"})) == ["1"]
+
+    def test_update_and_delete(self):
+        index = self._index()
+        old = _story("2", "Kedi", "Kedinin adı Pamuk idi. Pamuk ormanda yaşardı.")
+
+        index.add(_story("2", "Köpek", "Köpek koştu."), previous=old)
+        assert _ids(index.search("kedi")) == ["1"]
+        assert _ids(index.search("köpek")) == ["2"]
+
+        index.remove("3", _story("3", "Deniz", "Bir balık denizde yüzdü."))
+        assert index.search("deniz") == []
+        assert len(index) == 2
+
+        index.compact()
+        assert _ids(index.search("köpek")) == ["2"]
+
+    def test_unchanged_story_is_not_reindexed(self):
+        index = self._index()
+        index.dirty = False
+
+        index.add(_story("1", "Uçan ejderha", "Ejderha ormanda uçtu ve kedilerle oynadı.", is_favorite=True))
+
+        assert index.dirty is False
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "stories.idx")
+        index = self._index()
+        index.path = path
+        index.remove("3")
+        index.save()
+
+        loaded = StorySearchIndex(path)
+        assert loaded.load() is True
+        assert len(loaded) == 2
+        assert _ids(loaded.search("kedi")) == ["2", "1"]
+        assert _ids(loaded.search("ejdreha")) == ["1"]
+        assert loaded.search("deniz") == []
+
+
+class TestStoreSearch:
+    """Tests for search through StoryLogStore and StoryStorage."""
+
+    def test_store_search_with_filters(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "Kedi", "Kedi uyudu.", created_at="2024-01-01", is_public=True))
+        store.put(_story("b", "Kediler", "Kediler koştu.", created_at="2024-01-02"))
+
+        assert {s["story_id"] for s in store.search("kedi")} == {"a", "b"}
+        assert [s["story_id"] for s in store.search("kedi", public_only=True)] == ["a"]
+
+        store.delete("a")
+        assert [s["story_id"] for s in store.search("kedi")] == ["b"]
+
+    def test_index_survives_restart_and_external_changes(self, tmp_path):
+        store = StoryLogStore(str(tmp_path))
+        store.put(_story("a", "Ejderha", "Ejderha uçtu.", created_at="2024-01-01"))
+        store.compact()
+        assert (tmp_path / "stories.idx").exists()
+
+        store.put(_story("b", "Balık", "Balık yüzdü.", created_at="2024-01-02"))
+        other = StoryLogStore(str(tmp_path))
+
+        assert [s["story_id"] for s in other.search("ejderha")] == ["a"]
+        assert [s["story_id"] for s in other.search("balık")] == ["b"]
+
+    def test_story_storage_relevance_and_date_sort(self, tmp_path, monkeypatch):
+        from app.core.config import settings
+        from app.services.story_storage import StoryStorage
+
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        storage = StoryStorage()
+        storage.save_story(_story("a", "Orman", "Ejderha ormanda yaşardı.", created_at="2024-01-01"))
+        storage.save_story(_story("b", "Ejderha", "Ejderha ve ejderha yavrusu.", created_at="2024-01-02"))
+        storage.save_story(_story("c", "Deniz", "Balık.", created_at="2024-01-03"))
+
+        assert [s["story_id"] for s in storage.get_all_stories(search_query="ejderha")] == ["b", "a"]
+        assert [s["story_id"] for s in storage.get_all_stories(search_query="ejderha", sort_by="date_asc")] == ["a", "b"]
+        assert [s["story_id"] for s in storage.get_all_stories()] == ["c", "b", "a"]
+        assert {s["story_id"] for s in storage.search_stories("balık ejderha", match_all=False)} == {"a", "b", "c"}
@@ -0,0 +1,150 @@
+"""
+Unit tests for streamed story generation
+
+Tests cover:
+- Delta coalescing and Socket.IO fan-out
+- SSE replay from a sequence number
+- StoryStreamService event order (deltas, text, media, completion, failure)
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.story_stream import StoryStream, StoryStreamHub, format_sse
+from app.services.story_stream_service import StoryStreamService
+
+
+@pytest.fixture
+def socket_emit():
+    with patch("app.core.socket_manager.socket_manager.emit", new_callable=AsyncMock) as emit:
+        yield emit
+
+
+class FakeStoryService:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def stream_story(self, **kwargs):
+        for index, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and index == self.fail_after:
+                raise RuntimeError("model kesildi")
+            await asyncio.sleep(0)
+            yield chunk
+
+
+def _service(story_service, hub):
+    image_service = MagicMock()
+    image_service.generate_image = AsyncMock(return_value="https://cdn/img.png")
+    tts_service = MagicMock()
+    tts_service.generate_speech = AsyncMock(return_value="https://cdn/ses.mp3")
+    story_storage = MagicMock()
+    story_storage.save_story.return_value = {"is_favorite": False}
+    user_profile_service = MagicMock()
+    user_profile_service.add_xp.return_value = {
+        "xp_gained": 50, "level": 2, "leveled_up": False, "message": "",
+    }
+    return StoryStreamService(
+        story_service, image_service, tts_service, story_storage, user_profile_service, hub=hub
+    )
+
+
+class TestStoryStream:
+    """Tests for the stream buffer."""
+
+    @pytest.mark.asyncio
+    async def test_first_delta_is_immediate_and_rest_coalesced(self, socket_emit):
+        stream = StoryStream("s1", flush_interval=10)
+
+        await stream.push_delta("Bir ")
+        await stream.push_delta("varmış ")
+        await stream.push_delta("bir yokmuş.\n")
+        await stream.push_delta("Son")
+        await stream.flush()
+
+        deltas = [call.args[1]["delta"] for call in socket_emit.await_args_list]
+        assert deltas == ["Bir ", "varmış bir yokmuş.\n", "Son"]
+        assert all(call.kwargs["room"] == "s1" for call in socket_emit.await_args_list)
+        assert stream.text == "Bir varmış bir yokmuş.\nSon"
+
+    @pytest.mark.asyncio
+    async def test_subscribe_replays_from_sequence(self, socket_emit):
+        stream = StoryStream("s1", flush_interval=0)
+        for word in ("a", "b", "c"):
+            await stream.push_delta(word)
+        await stream.publish("story_completed", {"story_id": "x"})
+
+        events = [event async for event in stream.subscribe(last_seq=0)]
+
+        assert [event["seq"] for event in events] == [1, 2, 3]
+        assert events[-1]["event"] == "story_completed"
+        assert format_sse(events[0]).startswith("id: 1\nevent: story_delta\ndata: ")
+
+    @pytest.mark.asyncio
+    async def test_live_subscriber_receives_new_events(self, socket_emit):
+        stream = StoryStream("s1", flush_interval=0)
+
+        async def collect():
+            return [event["event"] async for event in stream.subscribe()]
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        await stream.push_delta("merhaba")
+        await stream.publish("story_failed", {"message": "x"})
+
+        assert await asyncio.wait_for(collector, 1) == ["story_delta", "story_failed"]
+
+
+class TestStoryStreamService:
+    """Tests for the streaming generation pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_event_order_and_completion(self, socket_emit):
+        hub = StoryStreamHub(retention_seconds=60)
+        service = _service(FakeStoryService(["Bir varmış", " bir yokmuş.\n\n", "Son."]), hub)
+        stream = hub.create(user_id="u1")
+
+        await service.run(stream, {"theme": "ejderha", "language": "tr", "save": True})
+
+        names = [event["event"] for event in stream.events]
+        assert names[0] == "story_delta"
+        assert names.index("story_text_completed") < names.index("story_media")
+        assert names.count("story_media") == 2
+        assert names[-1] == "story_completed"
+        completed = stream.events[-1]["data"]
+        assert completed["story_text"] == "Bir varmış bir yokmuş.\n\nSon."
+        assert completed["image_url"] == "https://cdn/img.png"
+        assert completed["xp_gained"] == 50
+        service.story_storage.save_story.assert_called_once()
+        assert hub.get(stream.stream_id) is stream
+
+    @pytest.mark.asyncio
+    async def test_failure_is_published(self, socket_emit):
+        hub = StoryStreamHub(retention_seconds=60)
+        service = _service(FakeStoryService(["Bir", " varmış", "..."], fail_after=2), hub)
+        stream = hub.create()
+
+        await service.run(stream, {"theme": "ejderha"})
+
+        assert stream.done
+        assert stream.events[-1]["event"] == "story_failed"
+        assert stream.text == "Bir varmış"
+        service.story_storage.save_story.assert_not_called()
+
+
+class TestStoryServiceStreaming:
+    """Tests for StoryService.stream_story."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_paragraphs_when_streaming_unavailable(self):
+        from app.services.story_service import StoryService
+
+        service = StoryService()
+        service.final_client = MagicMock()
+        service.final_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("stream yok"))
+
+        with patch.object(service, "generate_story", AsyncMock(return_value="Birinci.\n\nİkinci.")):
+            chunks = [chunk async for chunk in service.stream_story("ejderha")]
+
+        assert chunks == ["Birinci.\n\n", "İkinci."]
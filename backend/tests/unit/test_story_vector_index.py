@@ -0,0 +1,116 @@
+"""
+Unit tests for the in-process vector index
+
+Tests cover:
+- Exact search ranking and language / story_type filters
+- Upserts, removals and persistence through the memory-mapped files
+- Rows written by another process (instance) picked up before a search
+- IVF training: compaction, recall against exact search, filtered fallback
+"""
+import numpy as np
+import pytest
+
+from app.services import story_vector_index
+from app.services.story_vector_index import StoryVectorIndex
+
+DIM = 32
+
+
+def _clustered(n, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIM))
+    labels = rng.integers(0, clusters, n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, DIM))).astype(np.float32)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return StoryVectorIndex(str(tmp_path / "vectors"), DIM, nprobe=4)
+
+
+class TestExactSearch:
+    """Tests for the brute-force path used on small or filtered sets."""
+
+    def test_ranks_by_cosine_and_filters(self, index):
+        base = np.eye(DIM, dtype=np.float32)
+        index.add("a", base[0], "tr", "masal")
+        index.add("b", base[0] + 0.5 * base[1], "en", "masal")
+        index.add("c", base[1], "tr", "fabl")
+
+        assert [sid for sid, _ in index.search(base[0], k=3)] == ["a", "b", "c"]
+        assert index.search(base[0], k=1)[0][1] == pytest.approx(1.0)
+        assert [sid for sid, _ in index.search(base[0], k=3, language="tr")] == ["a", "c"]
+        assert [sid for sid, _ in index.search(base[0], k=3, language="TR", story_type="fabl")] == ["c"]
+        assert index.search(base[0], k=3, language="de") == []
+        assert [sid for sid, _ in index.search(base[0], k=3, exclude=["a"])] == ["b", "c"]
+
+    def test_upsert_remove_and_reload(self, index, tmp_path):
+        base = np.eye(DIM, dtype=np.float32)
+        index.add("a", base[0], "tr", "masal")
+        index.add("b", base[1], "tr", "masal")
+        index.add("a", base[2], "en", "masal")  # güncelleme
+        assert index.remove("b") and not index.remove("b")
+
+        reopened = StoryVectorIndex(str(tmp_path / "vectors"), DIM)
+
+        assert len(reopened) == 1 and "b" not in reopened
+        assert reopened.search(base[2], k=5) == [("a", pytest.approx(1.0))]
+        assert reopened.search(base[2], k=5, language="tr") == []
+
+    def test_sees_rows_added_by_another_instance(self, index, tmp_path):
+        other = StoryVectorIndex(str(tmp_path / "vectors"), DIM)
+        vectors = _clustered(1500)  # kapasiteyi (1024) aşar: dosya büyür, yeniden eşlenir
+        other.add_many((f"s{i}", v, "tr", "masal") for i, v in enumerate(vectors))
+
+        assert len(index.search(vectors[1400], k=1)) == 1
+        assert index.search(vectors[1400], k=1)[0][0] == "s1400"
+        assert len(index) == 1500
+
+    def test_rejects_wrong_dimensions(self, index):
+        with pytest.raises(ValueError):
+            index.add("a", [1.0, 2.0], "tr", "masal")
+
+
+class TestIVF:
+    """Tests for the trained (approximate) path."""
+
+    def test_recall_and_filters_after_training(self, index, monkeypatch):
+        monkeypatch.setattr(story_vector_index, "TRAIN_MIN_ROWS", 500)
+        monkeypatch.setattr(story_vector_index, "EXACT_SEARCH_MAX", 200)
+        vectors = _clustered(3000)
+        index.add_many(
+            (f"s{i}", v, "tr" if i % 10 else "en", "masal") for i, v in enumerate(vectors)
+        )
+        index.remove("s0")
+        assert index.needs_training()
+
+        lists = index.train(n_lists=32)
+
+        assert lists == 32 and not index.needs_training()
+        assert index.stats()["rows"] == 2999  # ölü satır sıkıştırıldı
+        queries = _clustered(50, seed=1)
+        recall = []
+        for q in queries:
+            approx = {sid for sid, _ in index.search(q, k=10)}
+            # Aynı veri üzerinde tam tarama ile karşılaştır
+            monkeypatch.setattr(story_vector_index, "EXACT_SEARCH_MAX", 10 ** 9)
+            truth = {sid for sid, _ in index.search(q, k=10)}
+            monkeypatch.setattr(story_vector_index, "EXACT_SEARCH_MAX", 200)
+            recall.append(len(approx & truth) / 10)
+        assert np.mean(recall) >= 0.9
+
+        # "en" yalnızca ~300 satır: filtre sonrası tam taramaya düşer
+        english = index.search(queries[0], k=20, language="en")
+        assert len(english) == 20 and all(int(sid[1:]) % 10 == 0 for sid, _ in english)
+
+    def test_new_rows_are_assigned_to_lists(self, index, tmp_path, monkeypatch):
+        monkeypatch.setattr(story_vector_index, "EXACT_SEARCH_MAX", 10)
+        vectors = _clustered(600)
+        index.add_many((f"s{i}", v, "tr", "masal") for i, v in enumerate(vectors[:500]))
+        index.train(n_lists=8)
+
+        index.add_many((f"s{i}", v, "tr", "masal") for i, v in enumerate(vectors[500:], start=500))
+        reopened = StoryVectorIndex(str(tmp_path / "vectors"), DIM, nprobe=2)
+
+        assert reopened.stats()["lists"] == 8
+        assert reopened.search(vectors[550], k=1)[0][0] == "s550"
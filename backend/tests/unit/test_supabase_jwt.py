@@ -0,0 +1,238 @@
+"""
+Unit tests for local Supabase JWT verification
+
+Tests cover:
+- HS256 verification with the project secret (expiry, audience, tampering)
+- RS256 verification through a cached JWKS, re-fetched on key rotation
+- Claims cache and revocation (per token, per user, custom checks)
+- Remote /auth/v1/user fallback when no key is available
+- get_current_user error mapping
+"""
+import json
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from app.core.exceptions import AuthenticationError, ExternalServiceError
+from app.core.supabase_jwt import SupabaseTokenVerifier
+
+SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+def _claims(**overrides):
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "aud": "authenticated",
+        "email": "ayse@example.com",
+        "role": "authenticated",
+        "app_metadata": {"role": "admin"},
+        "iat": now - 10,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return claims
+
+
+def _hs_token(**overrides):
+    return jwt.encode(_claims(**overrides), SECRET, algorithm="HS256")
+
+
+class _FakeSupabase:
+    """MockTransport handler serving JWKS and /auth/v1/user."""
+
+    def __init__(self, keys=(), user_status=200):
+        self.keys = list(keys)
+        self.user_status = user_status
+        self.jwks_requests = 0
+        self.user_requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/jwks.json"):
+            self.jwks_requests += 1
+            return httpx.Response(200, json={"keys": self.keys})
+        self.user_requests += 1
+        if self.user_status != 200:
+            return httpx.Response(self.user_status, json={"msg": "invalid"})
+        return httpx.Response(200, json={"id": "user-remote", "app_metadata": {}})
+
+
+def _verifier(handler=None, **kwargs):
+    kwargs.setdefault("jwt_secret", SECRET)
+    return SupabaseTokenVerifier(
+        supabase_url="https://proj.supabase.co",
+        transport=httpx.MockTransport(handler or _FakeSupabase()),
+        shared_revocations=False,
+        **kwargs,
+    )
+
+
+def _rsa_jwk(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public.update(kid=kid, alg="RS256", use="sig")
+    return private_key, public
+
+
+class TestLocalVerification:
+    """Tests for signature and claim checks."""
+
+    @pytest.mark.asyncio
+    async def test_hs256_token_maps_to_user(self):
+        user = await _verifier().verify(_hs_token())
+
+        assert user["id"] == user["user_id"] == "user-1"
+        assert user["email"] == "ayse@example.com"
+        assert user["role"] == "admin"
+
+    @pytest.mark.asyncio
+    async def test_rejects_expired_wrong_audience_and_tampered(self):
+        verifier = _verifier()
+
+        with pytest.raises(AuthenticationError, match="expired"):
+            await verifier.verify(_hs_token(exp=int(time.time()) - 120))
+        with pytest.raises(AuthenticationError):
+            await verifier.verify(_hs_token(aud="anon-service"))
+        with pytest.raises(AuthenticationError):
+            await verifier.verify(jwt.encode(_claims(), "another-secret-of-sufficient-length-123", algorithm="HS256"))
+        with pytest.raises(AuthenticationError):
+            await verifier.verify("not-a-jwt")
+
+    @pytest.mark.asyncio
+    async def test_rs256_via_cached_jwks_and_rotation(self):
+        old_key, old_jwk = _rsa_jwk("k1")
+        new_key, new_jwk = _rsa_jwk("k2")
+        supabase = _FakeSupabase(keys=[old_jwk])
+        verifier = _verifier(supabase, jwt_secret="")
+
+        for sub in ("a", "b", "c"):
+            token = jwt.encode(_claims(sub=sub), old_key, algorithm="RS256", headers={"kid": "k1"})
+            assert (await verifier.verify(token))["id"] == sub
+        assert supabase.jwks_requests == 1
+
+        supabase.keys = [old_jwk, new_jwk]
+        verifier._jwks_fetched_at -= 61  # past the re-fetch rate limit
+        token = jwt.encode(_claims(sub="d"), new_key, algorithm="RS256", headers={"kid": "k2"})
+        assert (await verifier.verify(token))["id"] == "d"
+        assert supabase.jwks_requests == 2
+        assert supabase.user_requests == 0
+        await verifier.aclose()
+
+
+class TestCacheAndRevocation:
+    """Tests for the claims cache and revocation hooks."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_verification(self, monkeypatch):
+        verifier = _verifier()
+        token = _hs_token()
+        await verifier.verify(token)
+
+        monkeypatch.setattr(verifier, "_decode", lambda *a: pytest.fail("decoded twice"))
+        assert (await verifier.verify(token))["id"] == "user-1"
+        assert len(verifier.cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_revoke_token_and_user(self):
+        verifier = _verifier()
+        token = _hs_token()
+        other = _hs_token(email="other@example.com")
+        await verifier.verify(token)
+
+        await verifier.revoke_token(token)
+        with pytest.raises(AuthenticationError, match="revoked"):
+            await verifier.verify(token)
+
+        await verifier.verify(other)
+        await verifier.revoke_user("user-1")
+        with pytest.raises(AuthenticationError, match="revoked"):
+            await verifier.verify(other)
+
+        # Tokens issued after the revocation are accepted again
+        fresh = _hs_token(iat=int(time.time()) + 5)
+        assert (await verifier.verify(fresh))["id"] == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_custom_revocation_check(self):
+        verifier = _verifier()
+
+        async def banned(claims):
+            return claims.get("sub") == "banned"
+
+        verifier.add_revocation_check(banned)
+
+        assert (await verifier.verify(_hs_token()))["id"] == "user-1"
+        with pytest.raises(AuthenticationError):
+            await verifier.verify(_hs_token(sub="banned"))
+
+
+class TestRemoteFallback:
+    """Tests for the /auth/v1/user fallback."""
+
+    @pytest.mark.asyncio
+    async def test_remote_used_only_without_keys(self):
+        supabase = _FakeSupabase(keys=[])
+        verifier = _verifier(supabase, jwt_secret="")
+
+        token = _hs_token()
+        user = await verifier.verify(token)
+        await verifier.verify(token)
+
+        assert user["user_id"] == "user-remote"
+        assert supabase.user_requests == 1
+        await verifier.aclose()
+
+    @pytest.mark.asyncio
+    async def test_remote_cache_keeps_token_iat_for_revocation(self):
+        supabase = _FakeSupabase(keys=[])
+        verifier = _verifier(supabase, jwt_secret="")
+        token = _hs_token(sub="user-remote", iat=int(time.time()) - 60)
+        await verifier.verify(token)
+
+        await verifier.revoke_user("user-remote", before=time.time() - 30)
+
+        with pytest.raises(AuthenticationError):
+            await verifier.verify(token)
+        await verifier.aclose()
+
+    @pytest.mark.asyncio
+    async def test_remote_token_without_iat_is_not_cached(self):
+        supabase = _FakeSupabase(keys=[])
+        verifier = _verifier(supabase, jwt_secret="")
+        claims = _claims()
+        del claims["iat"]
+        token = jwt.encode(claims, SECRET, algorithm="HS256")
+
+        await verifier.verify(token)
+        await verifier.verify(token)
+
+        assert supabase.user_requests == 2
+        await verifier.aclose()
+
+    @pytest.mark.asyncio
+    async def test_remote_rejection_and_disabled_fallback(self):
+        with pytest.raises(AuthenticationError):
+            await _verifier(_FakeSupabase(user_status=401), jwt_secret="").verify(_hs_token())
+        with pytest.raises(ExternalServiceError):
+            await _verifier(jwt_secret="", remote_fallback=False).verify(_hs_token())
+
+
+class TestAuthDependency:
+    """Tests for get_current_user."""
+
+    @pytest.mark.asyncio
+    async def test_error_mapping(self, monkeypatch):
+        from app.core import auth_dependencies
+
+        monkeypatch.setattr(auth_dependencies, "token_verifier", _verifier())
+
+        user = await auth_dependencies.get_current_user(f"Bearer {_hs_token()}")
+        assert user["id"] == "user-1"
+        assert await auth_dependencies.get_optional_user("Bearer bad") is None
+        with pytest.raises(HTTPException) as exc:
+            await auth_dependencies.get_current_user("Bearer bad")
+        assert exc.value.status_code == 401
@@ -0,0 +1,144 @@
+"""
+Unit tests for chunked TTS synthesis and the content-addressed chunk cache
+
+Tests cover:
+- Sentence chunking that never crosses a paragraph boundary
+- MP3 concatenation without decoding (ID3 tags stripped, frames kept in order)
+- Only chunks missing from the cache are rendered, concurrently and bounded
+- Editing one paragraph re-renders only that paragraph; other voices get their own keys
+- Cache pruning by size, least recently used first
+"""
+import asyncio
+import io
+import os
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import tts_service
+from app.services.audio_chunk_cache import AudioChunkCache, chunk_key, concat_mp3, split_into_chunks
+from app.services.tts_service import TTSService
+
+STORY = (
+    "Bir varmış bir yokmuş. Küçük bir ejderha varmış.\n\n"
+    "Ejderha her sabah denize bakarmış. Dalgaları sayarmış!\n\n"
+    "Sonunda bir gün uçmayı öğrenmiş."
+)
+
+
+def _id3v2(payload=b""):
+    size = len(payload)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + payload
+
+
+class FakeRenderer:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, chunk):
+        self.calls.append(chunk)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return _id3v2(b"x" * 20) + b"\xff\xfb" + chunk.encode("utf-8")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    (tmp_path / "audio").mkdir()
+    monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "TTS_CHUNK_MAX_CHARS", 60)
+    monkeypatch.setattr(settings, "TTS_CONCURRENCY", 2)
+    monkeypatch.setattr(tts_service, "_chunk_cache", AudioChunkCache(str(tmp_path / "chunks")))
+    return tmp_path
+
+
+class TestChunking:
+    """Tests for split_into_chunks and concat_mp3."""
+
+    def test_chunks_respect_paragraphs_and_limit(self):
+        chunks = split_into_chunks(STORY, max_chars=60)
+
+        assert chunks == [
+            "Bir varmış bir yokmuş. Küçük bir ejderha varmış.",
+            "Ejderha her sabah denize bakarmış. Dalgaları sayarmış!",
+            "Sonunda bir gün uçmayı öğrenmiş.",
+        ]
+        long_sentence = "kelime " * 40
+        assert all(len(c) <= 50 for c in split_into_chunks(long_sentence, max_chars=50))
+        assert split_into_chunks("  \n\n ") == []
+
+    def test_concat_strips_tags_and_keeps_order(self, tmp_path):
+        first, second = tmp_path / "a.mp3", tmp_path / "b.mp3"
+        first.write_bytes(_id3v2(b"meta") + b"\xff\xfbAAAA")
+        second.write_bytes(b"\xff\xfbBBBB" + b"TAG" + b"\0" * 125)
+        output = io.BytesIO()
+
+        written = concat_mp3([str(first), str(second)], output)
+
+        assert output.getvalue() == b"\xff\xfbAAAA\xff\xfbBBBB" and written == 12
+
+
+class TestChunkedSynthesis:
+    """Tests for TTSService._synthesize."""
+
+    @pytest.mark.asyncio
+    async def test_renders_missing_chunks_concurrently(self, storage):
+        render = FakeRenderer()
+        text = STORY + "\n\nBir varmış bir yokmuş. Küçük bir ejderha varmış."
+
+        path = await TTSService()._synthesize(text, "s1", render, engine="fake", voice="a", speed=1.0)
+
+        assert path == f"{storage}/audio/s1.mp3"
+        assert len(render.calls) == 3  # tekrar eden paragraf bir kez üretilir
+        assert render.max_in_flight == 2
+        audio = open(path, "rb").read()
+        assert not audio.startswith(b"ID3") and audio.count(b"\xff\xfb") == 4
+        assert audio.endswith("Küçük bir ejderha varmış.".encode("utf-8"))
+
+    @pytest.mark.asyncio
+    async def test_edit_rerenders_only_changed_paragraph(self, storage):
+        service = TTSService()
+        await service._synthesize(STORY, "s1", FakeRenderer(), engine="fake", voice="a", speed=1.0)
+
+        render = FakeRenderer()
+        edited = STORY.replace("Dalgaları sayarmış!", "Martıları sayarmış!")
+        await service._synthesize(edited, "s1", render, engine="fake", voice="a", speed=1.0)
+        assert render.calls == ["Ejderha her sabah denize bakarmış. Martıları sayarmış!"]
+
+        render = FakeRenderer()
+        await service._synthesize(edited, "s1", render, engine="fake", voice="a", speed=1.25)
+        assert len(render.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_leaves_no_partial_output(self, storage):
+        async def render(chunk):
+            if "ejderha" in chunk:
+                raise RuntimeError("quota exceeded")
+            return b"\xff\xfb" + chunk.encode("utf-8")
+
+        with pytest.raises(RuntimeError):
+            await TTSService()._synthesize(STORY, "s2", render, engine="fake")
+        assert not os.path.exists(f"{storage}/audio/s2.mp3")
+
+
+class TestAudioChunkCache:
+    """Tests for the on-disk cache."""
+
+    def test_prune_removes_least_recently_used(self, tmp_path):
+        cache = AudioChunkCache(str(tmp_path), max_bytes=250)
+        keys = [chunk_key(f"parça {i}", voice="a") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, b"x" * 100)
+            os.utime(cache.path(key), (time.time() - 100 + i, time.time() - 100 + i))
+        assert cache.get(keys[0])  # dokunuldu: artık en yeni
+
+        assert cache.prune() == 1
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) and cache.get(keys[2])
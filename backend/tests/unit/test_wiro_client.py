@@ -0,0 +1,133 @@
+"""
+Unit tests for WiroClient
+
+Tests cover:
+- One pooled httpx client reused across calls (per event loop)
+- Batched polling of concurrent tasks against the fake Wiro server
+- Adaptive first-poll delay learned from observed durations
+- Timeouts and task errors
+- A slow or failing poll does not hold up other tasks; failed polls are retried
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.wiro_client import WiroClient, _TaskPoller, _task_outcome
+from scripts.fake_wiro_server import create_app
+
+
+def _client(task_seconds=0.05, error_rate=0.0):
+    app = create_app(task_seconds=task_seconds, error_rate=error_rate)
+    client = WiroClient(base_url="http://fake-wiro/v1", transport=httpx.ASGITransport(app=app), http2=False)
+    return client, app.state.wiro
+
+
+class TestWiroClient:
+    """Tests for the pooled client and shared poller."""
+
+    def test_task_outcome_classification(self):
+        running = {"tasklist": [{"status": "task_start", "debugerror": ""}]}
+        done = {"tasklist": [{"status": "task_postprocess_end", "debugerror": ""}]}
+        failed = {"tasklist": [{"status": "task_start", "debugerror": "boom"}]}
+
+        assert _task_outcome(running) is None
+        assert _task_outcome(done) == {"detail": done}
+        assert _task_outcome(failed)["error_message"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_one_client_and_poller(self):
+        client, state = _client(task_seconds=0.1)
+        http_client = client._ensure_client()
+
+        results = await asyncio.gather(*(
+            client.run_and_wait("openai", "gpt-oss-20b", {"prompt": f"masal {i}"}, is_json=True, poll_interval_s=0.02)
+            for i in range(10)
+        ))
+
+        assert client._ensure_client() is http_client
+        assert all(r["detail"]["tasklist"][0]["status"] == "task_postprocess_end" for r in results)
+        assert state.run_requests == 10
+        # Backoff keeps polls per task well below a fixed 20ms schedule (~5 each)
+        assert state.detail_requests <= 10 * 5
+        assert len(client.poller) == 0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_learns_expected_duration_per_model(self):
+        client, state = _client(task_seconds=0.15)
+
+        await client.run_and_wait("openai", "gpt-oss-20b", {"prompt": "a"}, is_json=True, poll_interval_s=0.01)
+        expected = client.poller.expected_duration("openai/gpt-oss-20b")
+        polls_before = state.detail_requests
+        await client.run_and_wait("openai", "gpt-oss-20b", {"prompt": "b"}, is_json=True, poll_interval_s=0.01)
+
+        assert expected >= 0.15
+        # First poll is scheduled near the learned duration instead of after 10ms
+        assert state.detail_requests - polls_before <= 3
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_task_error(self):
+        client, _ = _client(task_seconds=5)
+        result = await client.run_and_wait("openai", "gpt-oss-20b", {"prompt": "a"}, poll_interval_s=0.01, timeout_s=0.05)
+        assert result["detail"] == {"status": "timeout"}
+        await client.aclose()
+
+        client, _ = _client(task_seconds=0.01, error_rate=1.0)
+        result = await client.run_and_wait("openai", "gpt-oss-20b", {"prompt": "a"}, poll_interval_s=0.01)
+        assert result["error_message"] == "fake failure"
+        await client.aclose()
+
+
+class StubDetails:
+    """poll_detail stand-in: "slow" hangs, "flaky" fails twice, others finish on the second poll."""
+
+    def __init__(self):
+        self.calls = {}
+
+    async def poll_detail(self, taskid, tasktoken, timeout):
+        self.calls[taskid] = self.calls.get(taskid, 0) + 1
+        if taskid == "slow":
+            await asyncio.sleep(timeout)
+            raise httpx.ReadTimeout("slow task")
+        if taskid == "flaky" and self.calls[taskid] <= 2:
+            raise httpx.ConnectError("connection reset")
+        status = "task_postprocess_end" if self.calls[taskid] >= 2 else "task_start"
+        return {"tasklist": [{"status": status, "debugerror": ""}]}
+
+
+class TestPollerIsolation:
+    """Tests for independent per-task polls."""
+
+    @pytest.mark.asyncio
+    async def test_slow_poll_does_not_stall_other_tasks(self):
+        details = StubDetails()
+        poller = _TaskPoller(details, initial=0.01, maximum=0.02, backoff=1.3, concurrency=8, poll_timeout=5)
+
+        slow = asyncio.create_task(poller.wait("slow", None, timeout_s=0.3))
+        started = time.monotonic()
+        fast = await asyncio.gather(*(poller.wait(f"t{i}", None, timeout_s=5) for i in range(5)))
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.2
+        assert all(r["detail"]["tasklist"][0]["status"] == "task_postprocess_end" for r in fast)
+        # The deadline fires while the slow poll is still in flight
+        assert (await slow)["detail"] == {"status": "timeout"}
+        assert time.monotonic() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_failed_polls_are_retried_then_surface(self):
+        details = StubDetails()
+        poller = _TaskPoller(details, initial=0.01, maximum=0.02, backoff=1.3, concurrency=8, max_failures=3)
+
+        result = await poller.wait("flaky", None, timeout_s=5)
+        assert result["detail"]["tasklist"][0]["status"] == "task_postprocess_end"
+
+        async def always_fail(taskid, tasktoken, timeout):
+            raise httpx.ConnectError("down")
+
+        details.poll_detail = always_fail
+        with pytest.raises(httpx.ConnectError):
+            await poller.wait("down", None, timeout_s=5)